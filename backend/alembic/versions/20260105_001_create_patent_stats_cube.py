@@ -0,0 +1,76 @@
+"""create patent stats cube
+
+Revision ID: 20260105_001
+Revises: 20260104_003
+Create Date: 2026-01-05
+
+NOTE:
+- tb_patent_stats_cube: (jurisdiction, main IPC subclass, application year, first applicant) counts.
+  Maintained incrementally by the collection service; trend/portfolio analytics read it instead of
+  scanning tb_patent_bibliographic_info.
+- Backfilled from tb_patent_applicants / tb_patent_ipc_classifications on upgrade.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260105_001"
+down_revision = "20260104_003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tb_patent_stats_cube",
+        sa.Column("cube_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("jurisdiction", sa.String(10), nullable=False, server_default="KR"),
+        sa.Column("ipc_subclass", sa.String(4), nullable=False, server_default=""),
+        sa.Column("application_year", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("applicant_name", sa.String(300), nullable=False, server_default=""),
+        sa.Column("patent_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_updated", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ux_patent_stats_cube_key",
+        "tb_patent_stats_cube",
+        ["jurisdiction", "ipc_subclass", "application_year", "applicant_name"],
+        unique=True,
+    )
+    op.create_index("idx_patent_stats_cube_applicant", "tb_patent_stats_cube", ["applicant_name"])
+
+    op.execute(
+        """
+        INSERT INTO tb_patent_stats_cube (jurisdiction, ipc_subclass, application_year, applicant_name, patent_count)
+        SELECT b.jurisdiction,
+               COALESCE(ipc.sub, ''),
+               COALESCE(EXTRACT(YEAR FROM b.application_date)::int, 0),
+               COALESCE(app.applicant_name, ''),
+               COUNT(*)
+        FROM tb_patent_bibliographic_info b
+        LEFT JOIN LATERAL (
+            SELECT LEFT(c.section || COALESCE(c.class_code, '') || COALESCE(c.subclass, ''), 4) AS sub
+            FROM tb_patent_ipc_classifications c
+            WHERE c.patent_id = b.patent_id
+            ORDER BY c.is_main_classification DESC, c.classification_order
+            LIMIT 1
+        ) ipc ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT a.applicant_name
+            FROM tb_patent_applicants a
+            WHERE a.patent_id = b.patent_id
+            ORDER BY a.applicant_order
+            LIMIT 1
+        ) app ON TRUE
+        WHERE b.del_yn = 'N'
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_patent_stats_cube_applicant", table_name="tb_patent_stats_cube")
+    op.drop_index("ux_patent_stats_cube_key", table_name="tb_patent_stats_cube")
+    op.drop_table("tb_patent_stats_cube")
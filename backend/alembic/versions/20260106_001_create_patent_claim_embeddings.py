@@ -0,0 +1,56 @@
+"""create patent claim embeddings
+
+Revision ID: 20260106_001
+Revises: 20260105_001
+Create Date: 2026-01-06
+
+NOTE:
+- tb_patent_claim_embeddings: one vector(1536) per claim for claim-level max-sim similarity search.
+- HNSW index (the table is filled incrementally; ivfflat lists would be trained on an empty table).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = "20260106_001"
+down_revision = "20260105_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "tb_patent_claim_embeddings",
+        sa.Column("claim_embedding_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "patent_id",
+            sa.BigInteger(),
+            sa.ForeignKey("tb_patent_bibliographic_info.patent_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("claim_no", sa.Integer(), nullable=False),
+        sa.Column("is_independent", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("claim_text", sa.Text(), nullable=False),
+        sa.Column("embedding_vector", Vector(1536), nullable=False),
+        sa.Column("created_date", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "ux_patent_claim_embedding",
+        "tb_patent_claim_embeddings",
+        ["patent_id", "claim_no"],
+        unique=True,
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_patent_claim_embedding "
+        "ON tb_patent_claim_embeddings USING hnsw (embedding_vector vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_patent_claim_embedding")
+    op.drop_index("ux_patent_claim_embedding", table_name="tb_patent_claim_embeddings")
+    op.drop_table("tb_patent_claim_embeddings")
@@ -0,0 +1,72 @@
+"""create rag answer cache
+
+Revision ID: 20260107_001
+Revises: 20260106_001
+Create Date: 2026-01-07
+
+NOTE:
+- tb_rag_answer_cache: semantic answer cache keyed by scope hash + permission/corpus version.
+- Query vectors per provider (azure 1536 / aws 1024) with HNSW cosine indexes.
+- GIN index on cited_file_ids for document-level invalidation.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = "20260107_001"
+down_revision = "20260106_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "tb_rag_answer_cache",
+        sa.Column("cache_id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("scope_hash", sa.String(64), nullable=False),
+        sa.Column("permission_version", sa.String(32), nullable=False),
+        sa.Column("corpus_version", sa.String(32), nullable=False),
+        sa.Column("query_text", sa.Text(), nullable=False),
+        sa.Column("azure_embedding_1536", Vector(1536), nullable=True),
+        sa.Column("aws_embedding_1024", Vector(1024), nullable=True),
+        sa.Column("answer", sa.Text(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=True),
+        sa.Column("cited_chunk_ids", postgresql.ARRAY(sa.String(100)), nullable=True),
+        sa.Column("cited_file_ids", postgresql.ARRAY(sa.BigInteger()), nullable=True),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_hit_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_date", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+    )
+    op.create_index(
+        "idx_rag_answer_cache_scope",
+        "tb_rag_answer_cache",
+        ["scope_hash", "permission_version", "corpus_version"],
+    )
+    op.create_index("idx_rag_answer_cache_expires", "tb_rag_answer_cache", ["expires_at"])
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rag_answer_cache_files "
+        "ON tb_rag_answer_cache USING gin (cited_file_ids)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rag_answer_cache_azure_1536 "
+        "ON tb_rag_answer_cache USING hnsw (azure_embedding_1536 vector_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_rag_answer_cache_aws_1024 "
+        "ON tb_rag_answer_cache USING hnsw (aws_embedding_1024 vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_rag_answer_cache_aws_1024")
+    op.execute("DROP INDEX IF EXISTS idx_rag_answer_cache_azure_1536")
+    op.execute("DROP INDEX IF EXISTS idx_rag_answer_cache_files")
+    op.drop_index("idx_rag_answer_cache_expires", table_name="tb_rag_answer_cache")
+    op.drop_index("idx_rag_answer_cache_scope", table_name="tb_rag_answer_cache")
+    op.drop_table("tb_rag_answer_cache")
@@ -0,0 +1,56 @@
+"""keyword search bm25 statistics and trigram indexes
+
+Revision ID: 20260108_001
+Revises: 20260107_001
+Create Date: 2026-01-08
+
+NOTE:
+- pg_trgm GIN indexes on tb_document_search_index.full_content / document_title so the
+  substring fallback (ILIKE '%q%') no longer forces a sequential scan.
+- tb_search_term_stats: per-profile document frequency (ts_stat) for BM25 idf.
+- tb_search_corpus_stats: per-profile document count / average length for BM25 length norm.
+  Both are refreshed periodically by keyword_index_service; empty tables fall back to idf=1.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260108_001"
+down_revision = "20260107_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_search_full_content_trgm "
+        "ON tb_document_search_index USING gin (full_content gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_search_document_title_trgm "
+        "ON tb_document_search_index USING gin (document_title gin_trgm_ops)"
+    )
+
+    op.create_table(
+        "tb_search_term_stats",
+        sa.Column("profile", sa.String(10), primary_key=True),
+        sa.Column("term", sa.Text(), primary_key=True),
+        sa.Column("doc_freq", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+    op.create_table(
+        "tb_search_corpus_stats",
+        sa.Column("profile", sa.String(10), primary_key=True),
+        sa.Column("doc_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("avg_doc_length", sa.Float(), nullable=False, server_default=sa.text("0")),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tb_search_corpus_stats")
+    op.drop_table("tb_search_term_stats")
+    op.execute("DROP INDEX IF EXISTS idx_search_document_title_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_search_full_content_trgm")
@@ -0,0 +1,93 @@
+"""search events table (monthly partitions) and daily rollups
+
+Revision ID: 20260109_001
+Revises: 20260108_001
+Create Date: 2026-01-09
+
+NOTE:
+- tb_search_events: raw search events written in batches by search_event_sink, off the
+  request path. RANGE partitioned by occurred_at (one partition per month); the sink creates
+  upcoming partitions and drops partitions older than search_events_retention_months.
+- tb_search_daily_rollup / tb_search_query_rollup: periodic rollups read by the analytics and
+  suggestion endpoints (search history is no longer written to tb_chat_history).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "20260109_001"
+down_revision = "20260108_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tb_search_events (
+            event_id BIGSERIAL NOT NULL,
+            occurred_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            user_emp_no VARCHAR(20) NOT NULL,
+            query_text TEXT NOT NULL,
+            query_norm VARCHAR(200) NOT NULL,
+            search_type VARCHAR(20) NOT NULL,
+            result_count INTEGER NOT NULL DEFAULT 0,
+            latency_ms DOUBLE PRECISION,
+            container_ids VARCHAR(50)[],
+            top_file_ids INTEGER[],
+            PRIMARY KEY (event_id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+        """
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_search_events_occurred_at ON tb_search_events (occurred_at)")
+    # 현재 월 + 다음 월 파티션 (이후 월은 search_event_sink 가 미리 생성)
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start DATE;
+        BEGIN
+            FOR offset_month IN 0..1 LOOP
+                month_start := (date_trunc('month', now()) + make_interval(months => offset_month))::date;
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF tb_search_events FOR VALUES FROM (%L) TO (%L)',
+                    'tb_search_events_' || to_char(month_start, 'YYYYMM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+
+    op.create_table(
+        "tb_search_daily_rollup",
+        sa.Column("rollup_date", sa.Date(), primary_key=True),
+        sa.Column("user_emp_no", sa.String(20), primary_key=True),
+        sa.Column("search_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("success_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total_latency_ms", sa.Float(), nullable=False, server_default=sa.text("0")),
+    )
+    op.create_table(
+        "tb_search_query_rollup",
+        sa.Column("rollup_date", sa.Date(), primary_key=True),
+        sa.Column("query_norm", sa.String(200), primary_key=True),
+        sa.Column("search_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("user_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_searched_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_search_query_rollup_prefix "
+        "ON tb_search_query_rollup (query_norm text_pattern_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_search_query_rollup_prefix")
+    op.drop_table("tb_search_query_rollup")
+    op.drop_table("tb_search_daily_rollup")
+    # 파티션은 부모 테이블과 함께 삭제됨
+    op.execute("DROP TABLE IF EXISTS tb_search_events")
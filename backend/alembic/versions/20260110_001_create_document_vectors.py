@@ -0,0 +1,72 @@
+"""document-level representative vectors (centroid + medoids)
+
+Revision ID: 20260110_001
+Revises: 20260109_001
+Create Date: 2026-01-10
+
+NOTE:
+- tb_document_vectors: per-document centroid (AVG of chunk embeddings) plus a few medoid chunk
+  vectors, maintained by document_vector_service whenever a document's chunk embeddings are
+  written or removed. Related-document recommendations run one ANN query against this table
+  and only then look at the chunks of the top candidates.
+- Existing documents are backfilled with centroids here; medoids are added on the next refresh.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision = "20260110_001"
+down_revision = "20260109_001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tb_document_vectors",
+        sa.Column("vector_sno", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("file_bss_info_sno", sa.Integer(), nullable=False),
+        sa.Column("knowledge_container_id", sa.String(50), nullable=True),
+        sa.Column("vector_kind", sa.String(10), nullable=False),
+        sa.Column("member_rank", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("chunk_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("azure_embedding_1536", Vector(1536), nullable=True),
+        sa.Column("aws_embedding_1024", Vector(1024), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.UniqueConstraint("file_bss_info_sno", "vector_kind", "member_rank", name="uq_document_vectors_member"),
+    )
+    op.create_index("idx_document_vectors_container", "tb_document_vectors", ["knowledge_container_id"])
+
+    # 기존 문서 centroid 백필 (프로바이더 컬럼별)
+    for column in ("azure_embedding_1536", "aws_embedding_1024"):
+        op.execute(
+            f"""
+            INSERT INTO tb_document_vectors (
+                file_bss_info_sno, knowledge_container_id, vector_kind, member_rank, chunk_count, {column}
+            )
+            SELECT c.file_bss_info_sno, MAX(c.knowledge_container_id), 'centroid', 0, COUNT(*), AVG(c.{column})
+            FROM vs_doc_contents_chunks c
+            WHERE c.{column} IS NOT NULL AND c.del_yn = 'N'
+            GROUP BY c.file_bss_info_sno
+            ON CONFLICT (file_bss_info_sno, vector_kind, member_rank) DO NOTHING
+            """
+        )
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_document_vectors_azure_1536 "
+        "ON tb_document_vectors USING hnsw (azure_embedding_1536 vector_cosine_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_document_vectors_aws_1024 "
+        "ON tb_document_vectors USING hnsw (aws_embedding_1024 vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_document_vectors_aws_1024")
+    op.execute("DROP INDEX IF EXISTS idx_document_vectors_azure_1536")
+    op.drop_index("idx_document_vectors_container", table_name="tb_document_vectors")
+    op.drop_table("tb_document_vectors")
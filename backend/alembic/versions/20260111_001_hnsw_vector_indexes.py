@@ -0,0 +1,89 @@
+"""replace ivfflat vector indexes with hnsw (per-provider partial indexes)
+
+Revision ID: 20260111_001
+Revises: 20260110_001
+Create Date: 2026-01-11
+
+NOTE:
+- IVFFlat lists were trained on the data present when each index was created and are never
+  retrained, so recall drifts as the corpus grows. HNSW keeps its graph quality on incremental
+  inserts.
+- Chunk / doc_embedding text vectors get per-provider partial indexes
+  (WHERE embedding_provider = 'azure' ...) matching the provider filter every search query carries.
+- Indexes are built with CREATE INDEX CONCURRENTLY (no write lock); the replaced IVFFlat indexes are
+  dropped only after the new index exists. Later rebuilds/tuning: scripts/vector_indexes.py
+  (app/services/search/vector_index_manager.py holds the same definitions).
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260111_001"
+down_revision = "20260110_001"
+branch_labels = None
+depends_on = None
+
+
+HNSW_OPTIONS = "WITH (m = 16, ef_construction = 128)"
+
+# (새 인덱스, 테이블, 컬럼, 부분 인덱스 조건, 대체되는 기존 인덱스)
+INDEXES = (
+    ("idx_vs_chunks_azure_1536_hnsw", "vs_doc_contents_chunks", "azure_embedding_1536",
+     "embedding_provider = 'azure'", "idx_vs_chunks_azure_1536_ivfflat"),
+    ("idx_vs_chunks_aws_1024_hnsw", "vs_doc_contents_chunks", "aws_embedding_1024",
+     "embedding_provider = 'aws'", "idx_vs_chunks_aws_1024_ivfflat"),
+    ("idx_vs_chunks_multimodal_512_hnsw", "vs_doc_contents_chunks", "multimodal_embedding",
+     None, "idx_vs_doc_chunks_multimodal_embedding"),
+    ("idx_doc_embedding_azure_1536_hnsw", "doc_embedding", "azure_vector_1536",
+     "provider = 'azure'", "idx_doc_embedding_azure_1536_ivfflat"),
+    ("idx_doc_embedding_aws_1024_hnsw", "doc_embedding", "aws_vector_1024",
+     "provider = 'aws'", "idx_doc_embedding_aws_1024_ivfflat"),
+    ("idx_doc_embedding_azure_clip_hnsw", "doc_embedding", "azure_clip_vector",
+     None, "idx_doc_embedding_azure_clip_ivfflat"),
+    ("idx_doc_embedding_aws_marengo_512_hnsw", "doc_embedding", "aws_marengo_vector_512",
+     None, "idx_doc_embedding_aws_marengo_vector_512"),
+    ("idx_patent_embedding_hnsw", "tb_patent_bibliographic_info", "embedding_vector",
+     None, "idx_patent_embedding"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("SET maintenance_work_mem = '1GB'")
+        for name, table, column, where, replaced in INDEXES:
+            sql = (
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} USING hnsw ({column} vector_cosine_ops) {HNSW_OPTIONS}"
+            )
+            if where:
+                sql += f" WHERE {where}"
+            op.execute(sql)
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {replaced}")
+
+
+# downgrade 시 복원할 기존 IVFFlat 정의 (이전 마이그레이션과 동일)
+RESTORE = {
+    "idx_vs_chunks_azure_1536_ivfflat": "ON vs_doc_contents_chunks USING ivfflat (azure_embedding_1536 vector_cosine_ops) "
+                                        "WITH (lists = 100) WHERE azure_embedding_1536 IS NOT NULL",
+    "idx_vs_chunks_aws_1024_ivfflat": "ON vs_doc_contents_chunks USING ivfflat (aws_embedding_1024 vector_cosine_ops) "
+                                      "WITH (lists = 100) WHERE aws_embedding_1024 IS NOT NULL",
+    "idx_vs_doc_chunks_multimodal_embedding": "ON vs_doc_contents_chunks USING ivfflat (multimodal_embedding vector_cosine_ops) "
+                                              "WITH (lists = 100)",
+    "idx_doc_embedding_azure_1536_ivfflat": "ON doc_embedding USING ivfflat (azure_vector_1536 vector_cosine_ops) "
+                                            "WITH (lists = 100) WHERE azure_vector_1536 IS NOT NULL",
+    "idx_doc_embedding_aws_1024_ivfflat": "ON doc_embedding USING ivfflat (aws_vector_1024 vector_cosine_ops) "
+                                          "WITH (lists = 100) WHERE aws_vector_1024 IS NOT NULL",
+    "idx_doc_embedding_azure_clip_ivfflat": "ON doc_embedding USING ivfflat (azure_clip_vector vector_cosine_ops) "
+                                            "WITH (lists = 100) WHERE azure_clip_vector IS NOT NULL",
+    "idx_doc_embedding_aws_marengo_vector_512": "ON doc_embedding USING ivfflat (aws_marengo_vector_512 vector_cosine_ops) "
+                                                "WITH (lists = 100)",
+    "idx_patent_embedding": "ON tb_patent_bibliographic_info USING ivfflat (embedding_vector vector_cosine_ops)",
+}
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column, _where, replaced in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {replaced} {RESTORE[replaced]}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,90 @@
+"""container tree change counters maintained by triggers
+
+Revision ID: 20260112_001
+Revises: 20260111_001
+Create Date: 2026-01-12
+
+NOTE:
+- tb_container_tree_versions: one change counter per container tree part (containers / permissions /
+  documents). ContainerTreeService reads these three rows instead of max(last_modified_date) and a
+  hashtext() sum over every permission row, which missed renames, moves, del_yn flips and reprocessing.
+- Triggers bump a part only when a column the snapshot uses changes:
+  - containers: name / parent / path / inheritance / user_count / is_active (not document_count etc.)
+  - permissions: emp_no / container / role / is_active (not access counters)
+  - documents: INSERT / DELETE, and UPDATEs that move a file, flip del_yn or enter/leave 'failed'
+- The counter row is updated in the writing transaction, so other workers see data and version together.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260112_001"
+down_revision = "20260111_001"
+branch_labels = None
+depends_on = None
+
+
+# (트리거 이름, 테이블, 파트, 이벤트, 행 단위 조건)
+TRIGGERS = (
+    ("trg_container_tree_containers", "tb_knowledge_containers", "containers",
+     "INSERT OR DELETE OR TRUNCATE OR UPDATE OF container_name, parent_container_id, container_type, description, "
+     "knowledge_category, access_level, org_level, org_path, inherit_parent_permissions, user_count, is_active",
+     None),
+    ("trg_container_tree_permissions", "tb_user_permissions", "permissions",
+     "INSERT OR DELETE OR TRUNCATE OR UPDATE OF user_emp_no, container_id, role_id, is_active",
+     None),
+    ("trg_container_tree_documents", "tb_file_bss_info", "documents",
+     "INSERT OR DELETE OR TRUNCATE",
+     None),
+    ("trg_container_tree_documents_update", "tb_file_bss_info", "documents",
+     "UPDATE OF knowledge_container_id, del_yn, processing_status",
+     "OLD.knowledge_container_id IS DISTINCT FROM NEW.knowledge_container_id "
+     "OR OLD.del_yn IS DISTINCT FROM NEW.del_yn "
+     "OR (OLD.processing_status = 'failed') IS DISTINCT FROM (NEW.processing_status = 'failed')"),
+)
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tb_container_tree_versions (
+            part VARCHAR(20) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO tb_container_tree_versions (part) VALUES ('containers'), ('permissions'), ('documents')
+        ON CONFLICT (part) DO NOTHING
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_container_tree_version()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE tb_container_tree_versions
+            SET version = version + 1, updated_at = now()
+            WHERE part = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for name, table, part, events, when in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        if when:
+            # row-level only where a WHEN condition is needed (pending → completed etc. do not bump)
+            op.execute(
+                f"CREATE TRIGGER {name} AFTER {events} ON {table} "
+                f"FOR EACH ROW WHEN ({when}) EXECUTE FUNCTION bump_container_tree_version('{part}')"
+            )
+        else:
+            op.execute(
+                f"CREATE TRIGGER {name} AFTER {events} ON {table} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION bump_container_tree_version('{part}')"
+            )
+
+
+def downgrade() -> None:
+    for name, table, _part, _events, _when in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_container_tree_version()")
+    op.execute("DROP TABLE IF EXISTS tb_container_tree_versions")
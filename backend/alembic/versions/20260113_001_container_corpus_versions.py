@@ -0,0 +1,89 @@
+"""per-container document change counters for the answer cache
+
+Revision ID: 20260113_001
+Revises: 20260112_001
+Create Date: 2026-01-13
+
+NOTE:
+- tb_container_corpus_versions: one change counter per knowledge container. The RAG answer cache
+  builds its corpus_version from these counters instead of per-container document counts, which did
+  not change when a document was replaced, reprocessed or swapped for another (delete + upload).
+- A row-level trigger on tb_file_bss_info bumps the old and new container on INSERT / DELETE and on
+  UPDATEs that move a file, flip del_yn, change processing_status or replace the stored file.
+  Access counters (last_accessed_date / access_count) do not bump.
+- Existing containers are seeded with version 0; missing rows are created on first bump.
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "20260113_001"
+down_revision = "20260112_001"
+branch_labels = None
+depends_on = None
+
+
+UPDATE_COLUMNS = "knowledge_container_id, del_yn, processing_status, path, file_psl_nm"
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tb_container_corpus_versions (
+            container_id VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO tb_container_corpus_versions (container_id)
+        SELECT container_id FROM tb_knowledge_containers
+        ON CONFLICT (container_id) DO NOTHING
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_container_corpus_version()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            target VARCHAR(50);
+        BEGIN
+            FOREACH target IN ARRAY ARRAY[
+                CASE WHEN TG_OP <> 'INSERT' THEN OLD.knowledge_container_id END,
+                CASE WHEN TG_OP <> 'DELETE' THEN NEW.knowledge_container_id END
+            ] LOOP
+                IF target IS NOT NULL THEN
+                    INSERT INTO tb_container_corpus_versions AS v (container_id, version)
+                    VALUES (target, 1)
+                    ON CONFLICT (container_id) DO UPDATE SET version = v.version + 1, updated_at = now();
+                END IF;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trg_container_corpus_version ON tb_file_bss_info")
+    op.execute("DROP TRIGGER IF EXISTS trg_container_corpus_version_update ON tb_file_bss_info")
+    op.execute("""
+        CREATE TRIGGER trg_container_corpus_version
+            AFTER INSERT OR DELETE ON tb_file_bss_info
+            FOR EACH ROW EXECUTE FUNCTION bump_container_corpus_version()
+    """)
+    op.execute(f"""
+        CREATE TRIGGER trg_container_corpus_version_update
+            AFTER UPDATE OF {UPDATE_COLUMNS} ON tb_file_bss_info
+            FOR EACH ROW
+            WHEN (
+                OLD.knowledge_container_id IS DISTINCT FROM NEW.knowledge_container_id
+                OR OLD.del_yn IS DISTINCT FROM NEW.del_yn
+                OR OLD.processing_status IS DISTINCT FROM NEW.processing_status
+                OR OLD.path IS DISTINCT FROM NEW.path
+                OR OLD.file_psl_nm IS DISTINCT FROM NEW.file_psl_nm
+            )
+            EXECUTE FUNCTION bump_container_corpus_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_container_corpus_version_update ON tb_file_bss_info")
+    op.execute("DROP TRIGGER IF EXISTS trg_container_corpus_version ON tb_file_bss_info")
+    op.execute("DROP FUNCTION IF EXISTS bump_container_corpus_version()")
+    op.execute("DROP TABLE IF EXISTS tb_container_corpus_versions")
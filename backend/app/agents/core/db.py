@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
 
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_async_engine
+from app.core.config import settings
+from app.core.database import get_async_engine, get_async_session_local
 
 
 @asynccontextmanager
@@ -15,3 +19,57 @@ async def get_db_session_context():
     async_session = async_sessionmaker(engine, expire_on_commit=False)
     async with async_session() as session:
         yield session
+
+
+class ToolExecutionContext:
+    """Per-request execution context for tools that run concurrently.
+
+    ``AsyncSession`` must not be shared between concurrently running
+    coroutines, so each parallel tool borrows its own short-lived session from
+    the pool. A semaphore caps how many pooled connections a single request may
+    hold at once (connection budget), so one agentic search cannot drain the
+    shared pool.
+
+    Timings are collected per tool:
+    - ``latency_ms``: wall time of the tool including session checkout
+    - ``queue_wait_ms``: time spent waiting for the connection budget
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        max_connections: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        budget = max_connections if max_connections is not None else settings.agent_tool_db_connection_budget
+        self.max_connections = max(1, int(budget))
+        self._semaphore = asyncio.Semaphore(self.max_connections)
+        self.latencies_ms: Dict[str, float] = {}
+        self.queue_wait_ms: Dict[str, float] = {}
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    @asynccontextmanager
+    async def session(self, tool_name: str) -> AsyncIterator[AsyncSession]:
+        """Yield a dedicated session for ``tool_name`` within the budget."""
+        wait_start = time.perf_counter()
+        async with self._semaphore:
+            self.queue_wait_ms[tool_name] = (time.perf_counter() - wait_start) * 1000
+            async with self.session_factory() as session:
+                try:
+                    yield session
+                finally:
+                    # Tools only read; release the connection back to the pool promptly.
+                    await session.rollback()
+
+    def record(self, tool_name: str, latency_ms: float) -> None:
+        self.latencies_ms[tool_name] = latency_ms
+
+    @property
+    def critical_path_ms(self) -> float:
+        """Latency of the parallel stage: the slowest tool, not the sum."""
+        return max(self.latencies_ms.values(), default=0.0)
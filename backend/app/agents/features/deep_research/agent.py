@@ -26,6 +26,7 @@ from app.agents.base.agent_protocol import (
     BaseAutonomousAgent,
 )
 from app.agents.features.search_rag.agent import paper_search_agent
+from app.services.search.query_plan import QueryPlan
 from app.services.core.ai_service import ai_service
 from app.core.contracts import AgentConstraints, SearchChunk
 
@@ -257,7 +258,9 @@ class DeepResearchAgent(BaseAutonomousAgent):
         attached_document_context: str,
         context: Dict[str, Any],
     ) -> Dict[str, Any]:
-        keywords = await paper_search_agent._extract_keywords(sub_question)
+        # 하위 질문마다 질의 계획 1개 - 키워드와 벡터 검색 임베딩을 동시에 계산해 공유
+        query_plan = QueryPlan.build(sub_question).prefetch()
+        keywords = await paper_search_agent._extract_keywords(sub_question, query_plan)
         strategy = [
             "vector_search",
             "keyword_search",
@@ -276,6 +279,7 @@ class DeepResearchAgent(BaseAutonomousAgent):
             db_session=db_session,
             context=context,
             attached_document_context=attached_document_context,
+            query_plan=query_plan,
         )
         return retrieval
 
@@ -447,7 +451,7 @@ class DeepResearchAgent(BaseAutonomousAgent):
             ctx_tool = paper_search_agent.tools.get("context_builder")
             if not ctx_tool:
                 raise RuntimeError("context_builder tool not available")
-            ctx_result = await ctx_tool._arun(chunks=all_chunks, max_tokens=min(6000, context.max_tokens))
+            ctx_result = await ctx_tool._arun(chunks=all_chunks, max_tokens=min(6000, context.max_tokens), query=query)
             evidence_context = getattr(ctx_result, "data", "") or ""
             used_chunks = getattr(ctx_result, "used_chunks", all_chunks)
         except Exception as e:
@@ -530,7 +534,7 @@ class DeepResearchAgent(BaseAutonomousAgent):
             all_chunks = _dedupe_chunks(all_chunks)
             try:
                 ctx_tool = paper_search_agent.tools.get("context_builder")
-                ctx_result = await ctx_tool._arun(chunks=all_chunks, max_tokens=min(6000, context.max_tokens))
+                ctx_result = await ctx_tool._arun(chunks=all_chunks, max_tokens=min(6000, context.max_tokens), query=query)
                 evidence_context = getattr(ctx_result, "data", "") or ""
                 used_chunks = getattr(ctx_result, "used_chunks", all_chunks)
                 sources_md, sources = _format_sources(list(used_chunks))
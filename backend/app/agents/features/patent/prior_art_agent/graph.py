@@ -19,6 +19,7 @@ async def prior_art_worker_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # Lazy imports to avoid import-time side effects.
     from app.agents.features.patent.prior_art_agent.tools.orchestrator import prior_art_orchestrator
+    from app.core.config import settings
 
     messages: Sequence[BaseMessage] = state["messages"]
     user_text = messages[-1].content
@@ -42,11 +43,24 @@ async def prior_art_worker_node(state: Dict[str, Any]) -> Dict[str, Any]:
         broad_query = ""
         balanced_query = ""
 
+        # 수집 DB 임베딩 후보가 충분하면 KIPRIS 검색 생략
+        local_step = await prior_art_orchestrator.execute_local_candidates(
+            attached_document_context or user_text,
+            ipc_code=analysis_result.get("ipc_code"),
+            max_results=50,
+        )
+        if local_step.get("returned"):
+            search_runs.append({k: local_step.get(k) for k in ("label", "query", "total_found", "returned")})
+            all_patents.extend(local_step.get("patents") or [])
+        run_live = local_step.get("returned", 0) < settings.patent_prior_art_local_min_candidates
+
         for idx, (label, query) in enumerate(planned, start=1):
             if idx == 1:
                 broad_query = query
             elif idx == 2:
                 balanced_query = query
+            if not run_live:
+                continue
 
             step = await prior_art_orchestrator.execute_search_step(
                 label=label,
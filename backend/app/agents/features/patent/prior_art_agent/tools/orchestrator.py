@@ -10,6 +10,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+from loguru import logger
+
 from app.agents.features.patent.prior_art_agent.tools.patent_analysis_tool import patent_analysis_tool
 from app.agents.features.patent.prior_art_agent.tools.search_tool import prior_art_search_tool
 from app.agents.features.patent.prior_art_agent.tools.report_tool import prior_art_report_tool
@@ -88,6 +90,66 @@ class PriorArtOrchestrator:
             "returned": len(patents)
         }
 
+    async def execute_local_candidates(
+        self,
+        reference_text: Optional[str],
+        *,
+        ipc_code: Optional[str] = None,
+        max_results: int = 20,
+    ) -> Dict[str, Any]:
+        """3단계(선행): 수집 DB 임베딩 기반 후보 검색
+
+        KIPRIS 호출 전에 로컬 벡터 인덱스에서 후보를 찾는다.
+        결과는 execute_search_step 과 같은 형태(KiprisPatentBasic 목록)로 반환해
+        스크리닝/리포트 단계를 그대로 재사용한다.
+        """
+        from app.clients.kipris import KiprisPatentBasic
+        from app.services.patent.similarity_service import (
+            SimilarityReference,
+            patent_similarity_service,
+            split_claims,
+        )
+
+        step: Dict[str, Any] = {
+            "label": "local_vector",
+            "query": "",
+            "patents": [],
+            "total_found": 0,
+            "returned": 0,
+        }
+        text = (reference_text or "").strip()
+        if not text or not patent_similarity_service.enabled:
+            return step
+
+        # 청구항 표기가 있는 문서면 청구항 단위 검색도 함께 수행
+        claims = [body for _, body in split_claims(text)]
+        reference = SimilarityReference(
+            abstract=text[:4000],
+            claims=claims if len(claims) > 1 else (),
+            ipc_codes=[ipc_code] if ipc_code else (),
+        )
+        try:
+            hits = await patent_similarity_service.find_similar(reference, top_k=max_results)
+        except Exception as e:
+            logger.warning(f"[PriorArt] 로컬 후보 검색 실패 (KIPRIS 검색으로 진행): {e}")
+            return step
+
+        patents = [
+            KiprisPatentBasic(
+                application_number=hit.application_number,
+                title=hit.title,
+                applicant=hit.applicant,
+                application_date=hit.application_date.strftime("%Y%m%d") if hit.application_date else "",
+                status="",
+                ipc_code=hit.ipc_codes[0] if hit.ipc_codes else "",
+                ipc_all=hit.ipc_codes,
+                abstract=hit.abstract,
+            )
+            for hit in hits
+        ]
+        step.update(patents=patents, total_found=len(patents), returned=len(patents))
+        return step
+
     def screen_results(
         self,
         all_results: List[Any],
@@ -5,12 +5,17 @@ Patent Portfolio Analysis Tool - 특허 포트폴리오 분석 도구
 - 기술 분야 커버리지
 - 시간별 출원 전략
 - 강점/약점 분석
+
+수집된 서지정보가 충분하면 로컬 통계 엔진(SQL 집계)으로 답하고,
+로컬 커버리지가 부족한 출원인만 실시간 특허 API 로 조회합니다.
+경쟁사 비교는 출원인별로 동시에 수행합니다.
 """
 from __future__ import annotations
 
 import asyncio
+import uuid
 from collections import Counter, defaultdict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from loguru import logger
 from pydantic import BaseModel, Field
@@ -24,7 +29,7 @@ from app.agents.features.patent.core import (
 )
 from app.agents.features.patent.core.utils import parse_ipc_code
 from app.agents.features.patent.clients import PatentSourceAggregator
-from app.core.contracts import ToolResult
+from app.core.contracts import ToolResult, ToolMetrics
 
 
 # =============================================================================
@@ -86,6 +91,7 @@ class PortfolioAnalysisOutput(ToolResult):
     competitor_comparison: List[CompetitorComparison] = Field(default_factory=list, description="경쟁사 비교")
     strategic_insights: List[str] = Field(default_factory=list, description="전략적 인사이트")
     execution_time_ms: float = Field(default=0.0, description="실행 시간")
+    data_source: str = Field(default="live", description="데이터 출처 (local: 수집 DB 집계 / live: 실시간 API)")
 
 
 # =============================================================================
@@ -154,21 +160,33 @@ class PatentPortfolioAnalysisTool(BaseTool):
                     if len(ipc_data[key]["titles"]) < 3:
                         ipc_data[key]["titles"].append(patent.title[:50])
         
-        if not ipc_data:
+        top = sorted(ipc_data.items(), key=lambda x: x[1]["count"], reverse=True)[:8]
+        return self._build_technology_areas(
+            [(ipc_key, data["count"]) for ipc_key, data in top],
+            sum(d["count"] for d in ipc_data.values()),
+            {ipc_key: data["titles"] for ipc_key, data in top},
+        )
+    
+    def _build_technology_areas(
+        self,
+        class_counts: List[Tuple[str, int]],
+        total: int,
+        titles: Dict[str, List[str]],
+    ) -> List[TechnologyArea]:
+        """(섹션+클래스, 건수) 상위 목록 → 기술 영역"""
+        if not class_counts or total <= 0:
             return []
         
-        total = sum(d["count"] for d in ipc_data.values())
         areas = []
-        
-        for ipc_key, data in sorted(ipc_data.items(), key=lambda x: x[1]["count"], reverse=True)[:8]:
+        for ipc_key, count in class_counts:
             section = ipc_key[0]
             areas.append(TechnologyArea(
                 ipc_section=section,
                 ipc_class=ipc_key,
                 description=IPC_SECTIONS.get(section, "기타"),
-                patent_count=data["count"],
-                percentage=round(data["count"] / total * 100, 1),
-                example_titles=data["titles"],
+                patent_count=count,
+                percentage=round(count / total * 100, 1),
+                example_titles=titles.get(ipc_key, [])[:3],
             ))
         
         return areas
@@ -189,16 +207,26 @@ class PatentPortfolioAnalysisTool(BaseTool):
                 except:
                     pass
         
+        return self._build_temporal_patterns(
+            [(year, data["count"]) for year, data in year_data.items()],
+            {year: data["ipcs"] for year, data in year_data.items()},
+        )
+    
+    def _build_temporal_patterns(
+        self,
+        year_counts: List[Tuple[Any, int]],
+        year_sections: Dict[Any, Counter],
+    ) -> List[TemporalPattern]:
+        """(연도, 건수) + 연도별 IPC 섹션 분포 → 시간별 패턴"""
         patterns = []
-        for year in sorted(year_data.keys()):
-            data = year_data[year]
+        for year, count in sorted(year_counts, key=lambda x: str(x[0])):
             top_techs = [
                 IPC_SECTIONS.get(ipc, ipc) 
-                for ipc, _ in data["ipcs"].most_common(2)
+                for ipc, _ in year_sections.get(year, Counter()).most_common(2)
             ]
             patterns.append(TemporalPattern(
-                period=year,
-                count=data["count"],
+                period=str(year),
+                count=count,
                 main_technologies=top_techs,
             ))
         
@@ -206,8 +234,9 @@ class PatentPortfolioAnalysisTool(BaseTool):
     
     def _analyze_strengths_weaknesses(
         self,
-        patents: List[PatentData],
+        total_patents: int,
         tech_areas: List[TechnologyArea],
+        temporal: List[TemporalPattern],
     ) -> List[PortfolioStrength]:
         """강점/약점 분석"""
         items = []
@@ -233,17 +262,14 @@ class PatentPortfolioAnalysisTool(BaseTool):
                 ))
         
         # 최근 활동성
-        recent_patents = [
-            p for p in patents 
-            if p.application_date and p.application_date[:4] >= "2023"
-        ]
-        if len(recent_patents) > len(patents) * 0.3:
+        recent_count = sum(t.count for t in temporal if t.period[:4] >= "2023")
+        if recent_count > total_patents * 0.3:
             items.append(PortfolioStrength(
                 category="strength",
-                description=f"최근 2년간 활발한 출원 활동 ({len(recent_patents)}건)",
+                description=f"최근 2년간 활발한 출원 활동 ({recent_count}건)",
                 evidence=[],
             ))
-        elif len(recent_patents) < len(patents) * 0.1:
+        elif recent_count < total_patents * 0.1:
             items.append(PortfolioStrength(
                 category="weakness",
                 description="최근 출원 활동 감소 추세",
@@ -252,59 +278,85 @@ class PatentPortfolioAnalysisTool(BaseTool):
         
         return items
     
-    async def _compare_competitors(
-        self,
-        main_applicant: str,
-        main_patents: List[PatentData],
-        competitors: List[str],
-        jurisdictions: List[PatentJurisdiction],
-    ) -> List[CompetitorComparison]:
-        """경쟁사 비교"""
-        comparisons = []
-        aggregator = self._get_aggregator()
-        
-        # 주 출원인의 주요 기술 분야
-        main_ipcs = Counter()
-        for p in main_patents:
+    @staticmethod
+    def _main_sections(patents: List[PatentData]) -> Counter:
+        """특허별 주 IPC 섹션 분포"""
+        sections = Counter()
+        for p in patents:
             for ipc in p.ipc_codes[:1]:
                 parsed = parse_ipc_code(ipc)
-                if parsed:
-                    main_ipcs[parsed["section"]] += 1
-        
-        for competitor in competitors[:3]:  # 최대 3개
+                if parsed and parsed["section"]:
+                    sections[parsed["section"]] += 1
+        return sections
+    
+    async def _competitor_sections(
+        self,
+        competitor: str,
+        jurisdictions: List[str],
+    ) -> Tuple[int, Counter]:
+        """경쟁사 (총 건수, 주 IPC 섹션 분포): 로컬 집계 우선, 없으면 실시간 API"""
+        analytics = self._get_analytics()
+        if analytics.enabled:
             try:
-                query = PatentSearchQuery(
-                    applicant=competitor,
-                    jurisdictions=jurisdictions,
-                    max_results=100,
+                profile = await analytics.applicant_profile(
+                    competitor, jurisdictions=jurisdictions, with_examples=False
                 )
-                result = await aggregator.search(query=query)
-                
-                # 경쟁사 주요 기술 분야
-                comp_ipcs = Counter()
-                for p in result.patents:
-                    for ipc in p.ipc_codes[:1]:
-                        parsed = parse_ipc_code(ipc)
-                        if parsed:
-                            comp_ipcs[parsed["section"]] += 1
-                
-                main_techs = [IPC_SECTIONS.get(s, s) for s, _ in comp_ipcs.most_common(3)]
-                
-                # 중복 분야 찾기
-                overlap = []
-                for section in main_ipcs:
-                    if section in comp_ipcs:
-                        overlap.append(IPC_SECTIONS.get(section, section))
-                
-                comparisons.append(CompetitorComparison(
-                    applicant=competitor,
-                    total_patents=len(result.patents),
-                    main_technologies=main_techs,
-                    overlap_areas=overlap[:3],
-                ))
-                
+                if profile is not None:
+                    return profile.total, profile.section_counts
             except Exception as e:
-                logger.warning(f"경쟁사 {competitor} 분석 실패: {e}")
+                logger.warning(f"경쟁사 {competitor} 로컬 집계 실패 → 실시간 API 폴백: {e}")
+        
+        query = PatentSearchQuery(
+            query=competitor,
+            applicant=competitor,
+            jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
+            max_results=100,
+        )
+        result = await self._get_aggregator().search(query=query)
+        return len(result.patents), self._main_sections(result.patents)
+    
+    async def _compare_competitors(
+        self,
+        main_sections: Counter,
+        competitors: List[str],
+        jurisdictions: List[str],
+    ) -> List[CompetitorComparison]:
+        """경쟁사 비교 (최대 3개, 동시 조회)"""
+        results = await asyncio.gather(
+            *(self._competitor_sections(c, jurisdictions) for c in competitors[:3]),
+            return_exceptions=True,
+        )
+        return self._build_competitor_comparisons(main_sections, competitors, results)
+    
+    def _build_competitor_comparisons(
+        self,
+        main_sections: Counter,
+        competitors: List[str],
+        results: List[Any],
+    ) -> List[CompetitorComparison]:
+        """경쟁사별 (총 건수, 섹션 분포) 조회 결과 → 비교"""
+        comparisons = []
+        for competitor, outcome in zip(competitors[:3], results):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"경쟁사 {competitor} 분석 실패: {outcome}")
+                continue
+            
+            total, comp_ipcs = outcome
+            main_techs = [IPC_SECTIONS.get(s, s) for s, _ in comp_ipcs.most_common(3)]
+            
+            # 중복 분야 찾기
+            overlap = [
+                IPC_SECTIONS.get(section, section)
+                for section in main_sections
+                if section in comp_ipcs
+            ]
+            
+            comparisons.append(CompetitorComparison(
+                applicant=competitor,
+                total_patents=total,
+                main_technologies=main_techs,
+                overlap_areas=overlap[:3],
+            ))
         
         return comparisons
     
@@ -346,6 +398,67 @@ class PatentPortfolioAnalysisTool(BaseTool):
         
         return insights
     
+    def _get_analytics(self):
+        from app.services.patent.analytics_service import patent_analytics_service
+        return patent_analytics_service
+    
+    async def _analyze_local(
+        self,
+        applicant: str,
+        date_from: Optional[str],
+        date_to: Optional[str],
+        jurisdictions: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """수집 DB 집계로 포트폴리오 분석. 로컬 커버리지가 부족하면 None."""
+        analytics = self._get_analytics()
+        if not analytics.enabled:
+            return None
+        try:
+            profile = await analytics.applicant_profile(
+                applicant, date_from=date_from, date_to=date_to, jurisdictions=jurisdictions
+            )
+        except Exception as e:
+            logger.warning(f"로컬 포트폴리오 집계 실패 → 실시간 API 폴백: {e}")
+            return None
+        if profile is None:
+            return None
+        
+        return {
+            "total": profile.total,
+            "tech_areas": self._build_technology_areas(
+                profile.ipc_classes, sum(profile.section_counts.values()), profile.class_titles
+            ),
+            "temporal": self._build_temporal_patterns(profile.yearly, profile.year_sections),
+            "main_sections": profile.section_counts,
+        }
+    
+    async def _analyze_live(
+        self,
+        applicant: str,
+        date_from: Optional[str],
+        date_to: Optional[str],
+        jurisdictions: List[str],
+        max_patents: int,
+    ) -> Dict[str, Any]:
+        """실시간 특허 API 검색 결과로 포트폴리오 분석"""
+        query = PatentSearchQuery(
+            query=applicant,
+            applicant=applicant,
+            date_from=date_from,
+            date_to=date_to,
+            jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
+            max_results=max_patents,
+        )
+        result = await self._get_aggregator().search(query=query)
+        patents = result.patents
+        
+        return {
+            "total": len(patents),
+            "tech_areas": self._analyze_technology_areas(patents),
+            "temporal": self._analyze_temporal_patterns(patents),
+            "main_sections": self._main_sections(patents),
+        }
+    
     def _run(self, **kwargs) -> PortfolioAnalysisOutput:
         return asyncio.run(self._arun(**kwargs))
     
@@ -360,71 +473,83 @@ class PatentPortfolioAnalysisTool(BaseTool):
     ) -> PortfolioAnalysisOutput:
         """비동기 실행"""
         start_time = datetime.now()
+        trace_id = str(uuid.uuid4())
         
         if jurisdictions is None:
             jurisdictions = ["KR"]
         
-        try:
-            aggregator = self._get_aggregator()
-            jur_enums = [PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__]
-            
-            # 주 출원인 특허 검색
-            query = PatentSearchQuery(
+        def _output(success: bool, data_source: str = "live", errors: Optional[List[str]] = None, **fields) -> PortfolioAnalysisOutput:
+            elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
+            return PortfolioAnalysisOutput(
+                success=success,
+                data=None,
+                metrics=ToolMetrics(
+                    latency_ms=elapsed_ms,
+                    provider="local_db" if data_source == "local" else "patent_api",
+                    items_returned=fields.get("total_patents", 0),
+                    trace_id=trace_id,
+                ),
+                errors=errors or [],
+                trace_id=trace_id,
+                tool_name=self.name,
                 applicant=applicant,
-                date_from=date_from,
-                date_to=date_to,
-                jurisdictions=jur_enums,
-                max_results=max_patents,
+                execution_time_ms=elapsed_ms,
+                data_source=data_source,
+                **fields,
             )
-            result = await aggregator.search(query=query)
-            patents = result.patents
+        
+        try:
+            # 주 출원인 분석과 경쟁사 조회를 동시에 수행 (경쟁사 중복 분야는 이후 계산)
+            competitor_task = None
+            if compare_with:
+                competitor_task = asyncio.gather(
+                    *(self._competitor_sections(c, jurisdictions) for c in compare_with[:3]),
+                    return_exceptions=True,
+                )
             
-            if not patents:
-                return PortfolioAnalysisOutput(
-                    success=True,
-                    applicant=applicant,
+            data_source = "local"
+            analysis = await self._analyze_local(applicant, date_from, date_to, jurisdictions)
+            if analysis is None:
+                data_source = "live"
+                analysis = await self._analyze_live(applicant, date_from, date_to, jurisdictions, max_patents)
+            
+            competitor_results = await competitor_task if competitor_task is not None else []
+            
+            total = analysis["total"]
+            if not total:
+                return _output(
+                    True,
+                    data_source,
                     total_patents=0,
                     strategic_insights=[f"'{applicant}'의 특허를 찾을 수 없습니다."],
                 )
             
-            # 분석 수행
-            tech_areas = self._analyze_technology_areas(patents)
-            temporal = self._analyze_temporal_patterns(patents)
-            strengths = self._analyze_strengths_weaknesses(patents, tech_areas)
-            
-            # 경쟁사 비교
-            competitors = []
-            if compare_with:
-                competitors = await self._compare_competitors(
-                    applicant, patents, compare_with, jur_enums
-                )
+            tech_areas = analysis["tech_areas"]
+            temporal = analysis["temporal"]
+            strengths = self._analyze_strengths_weaknesses(total, tech_areas, temporal)
+            competitors = self._build_competitor_comparisons(
+                analysis["main_sections"], compare_with or [], competitor_results
+            )
             
             # 전략적 인사이트
             insights = self._generate_strategic_insights(
-                len(patents), tech_areas, temporal, strengths, competitors
+                total, tech_areas, temporal, strengths, competitors
             )
             
-            execution_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            return PortfolioAnalysisOutput(
-                success=True,
-                applicant=applicant,
-                total_patents=len(patents),
+            return _output(
+                True,
+                data_source,
+                total_patents=total,
                 technology_areas=tech_areas,
                 temporal_patterns=temporal,
                 strengths_weaknesses=strengths,
                 competitor_comparison=competitors,
                 strategic_insights=insights,
-                execution_time_ms=execution_time,
             )
             
         except Exception as e:
             logger.error(f"포트폴리오 분석 실패: {e}")
-            return PortfolioAnalysisOutput(
-                success=False,
-                applicant=applicant,
-                error=str(e),
-            )
+            return _output(False, errors=[str(e)])
 
 
 # =============================================================================
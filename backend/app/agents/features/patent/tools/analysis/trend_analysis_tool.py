@@ -5,12 +5,16 @@ Patent Trend Analysis Tool - 특허 트렌드 분석 도구
 - 연도별 출원 추이
 - IPC 코드별 분포
 - 주요 출원인 분석
+
+수집된 서지정보가 충분하면 로컬 통계 엔진(SQL 집계)으로 답하고,
+로컬 커버리지가 부족할 때만 실시간 특허 API 로 폴백합니다.
 """
 from __future__ import annotations
 
 import asyncio
+import uuid
 from collections import Counter, defaultdict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from loguru import logger
 from pydantic import BaseModel, Field
@@ -24,7 +28,7 @@ from app.agents.features.patent.core import (
 )
 from app.agents.features.patent.core.utils import parse_ipc_code
 from app.agents.features.patent.clients import PatentSourceAggregator
-from app.core.contracts import ToolResult
+from app.core.contracts import ToolResult, ToolMetrics
 
 
 # =============================================================================
@@ -76,6 +80,7 @@ class TrendAnalysisOutput(ToolResult):
     date_range: Dict[str, str] = Field(default_factory=dict, description="분석 기간")
     key_findings: List[str] = Field(default_factory=list, description="주요 발견 사항")
     execution_time_ms: float = Field(default=0.0, description="실행 시간 (밀리초)")
+    data_source: str = Field(default="live", description="데이터 출처 (local: 수집 DB 집계 / live: 실시간 API)")
 
 
 # =============================================================================
@@ -143,15 +148,14 @@ class PatentTrendAnalysisTool(BaseTool):
                 except (ValueError, IndexError):
                     pass
         
-        if not year_counts:
-            return []
-        
+        return self._build_yearly_trends(sorted(year_counts.items()))
+    
+    def _build_yearly_trends(self, year_counts: List[Tuple[int, int]]) -> List[YearlyTrend]:
+        """(연도, 건수) 목록 → 전년 대비 성장률 포함 추이"""
         trends = []
-        sorted_years = sorted(year_counts.keys())
         prev_count = None
         
-        for year in sorted_years:
-            count = year_counts[year]
+        for year, count in year_counts:
             growth_rate = None
             if prev_count and prev_count > 0:
                 growth_rate = round((count - prev_count) / prev_count * 100, 1)
@@ -177,13 +181,16 @@ class PatentTrendAnalysisTool(BaseTool):
                     key = f"{parsed['section']}{parsed['class']}"
                     ipc_counts[key] += 1
         
-        if not ipc_counts:
+        return self._build_ipc_distribution(ipc_counts.most_common(10), sum(ipc_counts.values()))
+    
+    def _build_ipc_distribution(self, ipc_counts: List[Tuple[str, int]], total: int) -> List[IPCDistribution]:
+        """(섹션+클래스, 건수) 상위 목록 → 분포"""
+        if not ipc_counts or total <= 0:
             return []
         
-        total = sum(ipc_counts.values())
         distributions = []
         
-        for ipc_code, count in ipc_counts.most_common(10):  # 상위 10개
+        for ipc_code, count in ipc_counts:  # 상위 10개
             section = ipc_code[0] if ipc_code else "?"
             distributions.append(IPCDistribution(
                 ipc_code=ipc_code,
@@ -207,28 +214,38 @@ class PatentTrendAnalysisTool(BaseTool):
                 if len(applicant_data[applicant]["patents"]) < 3:
                     applicant_data[applicant]["patents"].append(patent.title)
         
-        if not applicant_data:
-            return []
-        
-        total = sum(d["count"] for d in applicant_data.values())
-        rankings = []
-        
         sorted_applicants = sorted(
             applicant_data.items(),
             key=lambda x: x[1]["count"],
             reverse=True
         )[:10]  # 상위 10명
         
-        for rank, (applicant, data) in enumerate(sorted_applicants, 1):
-            rankings.append(ApplicantRanking(
+        return self._build_applicant_rankings(
+            [(applicant, data["count"]) for applicant, data in sorted_applicants],
+            sum(d["count"] for d in applicant_data.values()),
+            {applicant: data["patents"] for applicant, data in sorted_applicants},
+        )
+    
+    def _build_applicant_rankings(
+        self,
+        applicant_counts: List[Tuple[str, int]],
+        total: int,
+        titles: Dict[str, List[str]],
+    ) -> List[ApplicantRanking]:
+        """(출원인, 건수) 상위 목록 → 순위"""
+        if not applicant_counts or total <= 0:
+            return []
+        
+        return [
+            ApplicantRanking(
                 rank=rank,
                 applicant=applicant,
-                count=data["count"],
-                percentage=round(data["count"] / total * 100, 1),
-                recent_patents=data["patents"],
-            ))
-        
-        return rankings
+                count=count,
+                percentage=round(count / total * 100, 1),
+                recent_patents=titles.get(applicant, [])[:3],
+            )
+            for rank, (applicant, count) in enumerate(applicant_counts, 1)
+        ]
     
     def _generate_key_findings(
         self,
@@ -268,6 +285,79 @@ class PatentTrendAnalysisTool(BaseTool):
         
         return findings
     
+    def _get_analytics(self):
+        from app.services.patent.analytics_service import patent_analytics_service
+        return patent_analytics_service
+    
+    async def _analyze_local(
+        self,
+        query: Optional[str],
+        applicant: Optional[str],
+        ipc_code: Optional[str],
+        date_from: Optional[str],
+        date_to: Optional[str],
+        jurisdictions: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """수집 DB 집계로 분석. 로컬 커버리지가 부족하면 None."""
+        from app.services.patent.analytics_service import AnalyticsFilter
+        
+        analytics = self._get_analytics()
+        if not analytics.enabled:
+            return None
+        try:
+            summary = await analytics.trend_summary(AnalyticsFilter(
+                keyword=query,
+                applicant=applicant,
+                ipc_code=ipc_code,
+                date_from=date_from,
+                date_to=date_to,
+                jurisdictions=jurisdictions,
+            ))
+        except Exception as e:
+            logger.warning(f"로컬 트렌드 집계 실패 → 실시간 API 폴백: {e}")
+            return None
+        if summary is None:
+            return None
+        
+        return {
+            "yearly_trends": self._build_yearly_trends(summary.yearly),
+            "ipc_distribution": self._build_ipc_distribution(summary.ipc_classes, summary.ipc_total),
+            "top_applicants": self._build_applicant_rankings(
+                summary.applicants, summary.applicant_total, summary.applicant_titles
+            ),
+            "total": summary.total,
+        }
+    
+    async def _analyze_live(
+        self,
+        query: Optional[str],
+        applicant: Optional[str],
+        ipc_code: Optional[str],
+        date_from: Optional[str],
+        date_to: Optional[str],
+        jurisdictions: List[str],
+        max_patents: int,
+    ) -> Dict[str, Any]:
+        """실시간 특허 API 검색 결과로 분석"""
+        search_query = PatentSearchQuery(
+            query=query or applicant or ipc_code,
+            applicant=applicant,
+            ipc_code=ipc_code,
+            date_from=date_from,
+            date_to=date_to,
+            jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
+            max_results=max_patents,
+        )
+        result = await self._get_aggregator().search(query=search_query)
+        patents = result.patents
+        
+        return {
+            "yearly_trends": self._analyze_yearly_trends(patents),
+            "ipc_distribution": self._analyze_ipc_distribution(patents),
+            "top_applicants": self._analyze_top_applicants(patents),
+            "total": len(patents),
+        }
+    
     def _run(self, **kwargs) -> TrendAnalysisOutput:
         return asyncio.run(self._arun(**kwargs))
     
@@ -283,70 +373,72 @@ class PatentTrendAnalysisTool(BaseTool):
     ) -> TrendAnalysisOutput:
         """비동기 실행"""
         start_time = datetime.now()
+        trace_id = str(uuid.uuid4())
         
         if jurisdictions is None:
             jurisdictions = ["KR"]
         
-        if not query and not applicant and not ipc_code:
+        def _output(success: bool, data_source: str = "live", errors: Optional[List[str]] = None, **fields) -> TrendAnalysisOutput:
+            elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
             return TrendAnalysisOutput(
-                success=False,
-                error="query, applicant, ipc_code 중 하나 이상 필요합니다.",
+                success=success,
+                data=None,
+                metrics=ToolMetrics(
+                    latency_ms=elapsed_ms,
+                    provider="local_db" if data_source == "local" else "patent_api",
+                    items_returned=fields.get("total_patents_analyzed", 0),
+                    trace_id=trace_id,
+                ),
+                errors=errors or [],
+                trace_id=trace_id,
+                tool_name=self.name,
+                execution_time_ms=elapsed_ms,
+                data_source=data_source,
+                **fields,
             )
         
+        if not query and not applicant and not ipc_code:
+            return _output(False, errors=["query, applicant, ipc_code 중 하나 이상 필요합니다."])
+        
         try:
-            # 검색 쿼리 생성
-            search_query = PatentSearchQuery(
-                keywords=[query] if query else [],
-                applicant=applicant,
-                ipc_codes=[ipc_code] if ipc_code else [],
-                date_from=date_from,
-                date_to=date_to,
-                jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
-                max_results=max_patents,
-            )
-            
-            # 데이터 수집
-            aggregator = self._get_aggregator()
-            result = await aggregator.search(query=search_query)
-            patents = result.patents
+            data_source = "local"
+            analysis = await self._analyze_local(query, applicant, ipc_code, date_from, date_to, jurisdictions)
+            if analysis is None:
+                data_source = "live"
+                analysis = await self._analyze_live(
+                    query, applicant, ipc_code, date_from, date_to, jurisdictions, max_patents
+                )
             
-            if not patents:
-                return TrendAnalysisOutput(
-                    success=True,
+            total = analysis["total"]
+            if not total:
+                return _output(
+                    True,
+                    data_source,
                     total_patents_analyzed=0,
                     key_findings=["검색 조건에 해당하는 특허가 없습니다."],
                 )
             
-            # 분석 수행
-            yearly_trends = self._analyze_yearly_trends(patents)
-            ipc_distribution = self._analyze_ipc_distribution(patents)
-            top_applicants = self._analyze_top_applicants(patents)
             key_findings = self._generate_key_findings(
-                yearly_trends, ipc_distribution, top_applicants, len(patents)
+                analysis["yearly_trends"], analysis["ipc_distribution"], analysis["top_applicants"], total
             )
             
-            execution_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            return TrendAnalysisOutput(
-                success=True,
-                yearly_trends=yearly_trends,
-                ipc_distribution=ipc_distribution,
-                top_applicants=top_applicants,
-                total_patents_analyzed=len(patents),
+            return _output(
+                True,
+                data_source,
+                yearly_trends=analysis["yearly_trends"],
+                ipc_distribution=analysis["ipc_distribution"],
+                top_applicants=analysis["top_applicants"],
+                total_patents_analyzed=total,
                 date_range={
                     "from": date_from or "미지정",
                     "to": date_to or "미지정",
                 },
                 key_findings=key_findings,
-                execution_time_ms=execution_time,
             )
             
         except Exception as e:
             logger.error(f"트렌드 분석 실패: {e}")
-            return TrendAnalysisOutput(
-                success=False,
-                error=str(e),
-            )
+            return _output(False, errors=[str(e)])
 
 
 # =============================================================================
@@ -2,11 +2,13 @@
 Patent Similarity Search Tool - 유사 특허 검색 도구
 
 특정 특허와 유사한 특허를 찾는 도구입니다.
-키워드 추출 및 IPC 코드 기반 유사도 검색을 수행합니다.
+수집된 특허는 저장된 임베딩(서지 + 청구항)으로 로컬 벡터 검색하고,
+로컬 결과가 없을 때만 키워드/IPC 기반 실시간 API 검색으로 폴백합니다.
 """
 from __future__ import annotations
 
 import asyncio
+import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from loguru import logger
@@ -24,7 +26,7 @@ from app.agents.features.patent.core.utils import (
     parse_ipc_code,
 )
 from app.agents.features.patent.clients import PatentSourceAggregator
-from app.core.contracts import ToolResult
+from app.core.contracts import ToolResult, ToolMetrics
 
 
 # =============================================================================
@@ -59,6 +61,7 @@ class SimilaritySearchOutput(ToolResult):
     reference_keywords: List[str] = Field(default_factory=list, description="참조 특허에서 추출된 키워드")
     total_count: int = Field(default=0, description="총 결과 수")
     execution_time_ms: float = Field(default=0.0, description="실행 시간 (밀리초)")
+    data_source: str = Field(default="live", description="데이터 출처 (local: 임베딩 벡터 검색 / live: 실시간 API)")
 
 
 # =============================================================================
@@ -97,6 +100,10 @@ class PatentSimilaritySearchTool(BaseTool):
             self._aggregator = PatentSourceAggregator()
         return self._aggregator
     
+    def _get_similarity(self):
+        from app.services.patent.similarity_service import patent_similarity_service
+        return patent_similarity_service
+    
     def _extract_reference_keywords(
         self,
         title: Optional[str],
@@ -124,7 +131,6 @@ class PatentSimilaritySearchTool(BaseTool):
     ) -> tuple[float, List[str], List[str]]:
         """유사도 계산"""
         matching_keywords = []
-        matching_ipc = []
         
         # 키워드 매칭
         patent_text = f"{patent.title} {patent.abstract}".lower()
@@ -133,20 +139,7 @@ class PatentSimilaritySearchTool(BaseTool):
                 matching_keywords.append(kw)
         
         # IPC 코드 매칭
-        if ref_ipc_codes and patent.ipc_codes:
-            for ref_ipc in ref_ipc_codes:
-                ref_parsed = parse_ipc_code(ref_ipc)
-                if not ref_parsed:
-                    continue
-                for pat_ipc in patent.ipc_codes:
-                    pat_parsed = parse_ipc_code(pat_ipc)
-                    if not pat_parsed:
-                        continue
-                    # 섹션+클래스+서브클래스 매칭
-                    if (ref_parsed.get("section") == pat_parsed.get("section") and
-                        ref_parsed.get("class") == pat_parsed.get("class")):
-                        matching_ipc.append(pat_ipc)
-                        break
+        matching_ipc = self._match_ipc_codes(patent.ipc_codes or [], ref_ipc_codes)
         
         # 유사도 점수 계산 (키워드 60%, IPC 40%)
         kw_score = len(matching_keywords) / max(len(ref_keywords), 1) if ref_keywords else 0
@@ -159,6 +152,109 @@ class PatentSimilaritySearchTool(BaseTool):
         
         return similarity, matching_keywords, matching_ipc
     
+    def _match_ipc_codes(self, patent_ipc_codes: List[str], ref_ipc_codes: List[str]) -> List[str]:
+        """참조 IPC 와 섹션+클래스가 같은 IPC 코드"""
+        matching = []
+        for ref_ipc in ref_ipc_codes:
+            ref_parsed = parse_ipc_code(ref_ipc)
+            if not ref_parsed:
+                continue
+            for pat_ipc in patent_ipc_codes:
+                pat_parsed = parse_ipc_code(pat_ipc)
+                if (pat_parsed and ref_parsed.get("section") == pat_parsed.get("section") and
+                        ref_parsed.get("class") == pat_parsed.get("class")):
+                    matching.append(pat_ipc)
+                    break
+        return matching
+    
+    async def _search_local(
+        self,
+        title: Optional[str],
+        abstract: Optional[str],
+        claims: Optional[List[str]],
+        ref_keywords: List[str],
+        ref_ipc_codes: List[str],
+        patent_number: Optional[str],
+        jurisdictions: List[str],
+        max_results: int,
+        min_similarity: float,
+    ) -> Optional[List[SimilarPatent]]:
+        """저장된 임베딩 기반 유사 특허 (로컬 비활성/결과 없음 → None)"""
+        from app.services.patent.similarity_service import SimilarityReference
+        
+        similarity = self._get_similarity()
+        if not similarity.enabled or not (title or abstract or claims):
+            return None
+        try:
+            hits = await similarity.find_similar(
+                SimilarityReference(
+                    title=title or "",
+                    abstract=abstract or "",
+                    claims=claims or [],
+                    ipc_codes=ref_ipc_codes,
+                    exclude_application_number=patent_number,
+                ),
+                top_k=max_results,
+                jurisdictions=jurisdictions,
+            )
+        except Exception as e:
+            logger.warning(f"로컬 유사 특허 검색 실패 → 실시간 검색으로 폴백: {e}")
+            return None
+        
+        similar_patents = []
+        for hit in hits:
+            if hit.score < min_similarity:
+                continue
+            patent_text = f"{hit.title} {hit.abstract}".lower()
+            similar_patents.append(SimilarPatent(
+                patent_number=hit.application_number,
+                title=hit.title,
+                abstract=hit.abstract,
+                applicant=hit.applicant,
+                ipc_codes=hit.ipc_codes,
+                application_date=hit.application_date.isoformat() if hit.application_date else None,
+                jurisdiction=PatentJurisdiction(hit.jurisdiction) if hit.jurisdiction in PatentJurisdiction.__members__ else PatentJurisdiction.KR,
+                similarity_score=round(hit.score, 3),
+                matching_keywords=[kw for kw in ref_keywords if kw.lower() in patent_text],
+                matching_ipc_codes=self._match_ipc_codes(hit.ipc_codes, ref_ipc_codes),
+            ))
+        return similar_patents or None
+    
+    async def _search_live(
+        self,
+        ref_keywords: List[str],
+        ref_ipc_codes: List[str],
+        patent_number: Optional[str],
+        jurisdictions: List[str],
+        max_results: int,
+        min_similarity: float,
+    ) -> List[SimilarPatent]:
+        """실시간 API 검색 + 키워드/IPC 유사도"""
+        search_query = PatentSearchQuery(
+            query=" ".join(ref_keywords[:5]),  # 상위 5개 키워드
+            ipc_code=ref_ipc_codes[0] if ref_ipc_codes else None,
+            jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
+            max_results=min(max_results * 2, 500),  # 필터링 고려 2배 요청
+        )
+        result = await self._get_aggregator().search(query=search_query)
+        
+        similar_patents = []
+        for patent in result.patents:
+            # 자기 자신 제외
+            if patent_number and patent.patent_number == patent_number:
+                continue
+            similarity, match_kw, match_ipc = self._calculate_similarity(
+                patent, ref_keywords, ref_ipc_codes
+            )
+            if similarity >= min_similarity:
+                similar_patents.append(SimilarPatent(
+                    **patent.model_dump(),
+                    similarity_score=round(similarity, 3),
+                    matching_keywords=match_kw,
+                    matching_ipc_codes=match_ipc,
+                ))
+        return similar_patents
+    
     def _run(self, **kwargs) -> SimilaritySearchOutput:
         return asyncio.run(self._arun(**kwargs))
     
@@ -175,80 +271,67 @@ class PatentSimilaritySearchTool(BaseTool):
     ) -> SimilaritySearchOutput:
         """비동기 실행"""
         start_time = datetime.now()
+        trace_id = str(uuid.uuid4())
         
         if jurisdictions is None:
             jurisdictions = ["KR"]
         
-        # 입력 검증
-        if not title and not abstract and not claims and not ipc_codes:
+        def _output(success: bool, data_source: str = "live", errors: Optional[List[str]] = None, **fields) -> SimilaritySearchOutput:
+            elapsed_ms = (datetime.now() - start_time).total_seconds() * 1000
             return SimilaritySearchOutput(
-                success=False,
-                error="제목, 초록, 청구항, IPC 코드 중 하나 이상 필요합니다.",
+                success=success,
+                data=None,
+                metrics=ToolMetrics(
+                    latency_ms=elapsed_ms,
+                    provider="local_db" if data_source == "local" else "patent_api",
+                    items_returned=fields.get("total_count", 0),
+                    trace_id=trace_id,
+                ),
+                errors=errors or [],
+                trace_id=trace_id,
+                tool_name=self.name,
+                execution_time_ms=elapsed_ms,
+                data_source=data_source,
+                **fields,
             )
         
+        # 입력 검증
+        if not title and not abstract and not claims and not ipc_codes:
+            return _output(False, errors=["제목, 초록, 청구항, IPC 코드 중 하나 이상 필요합니다."])
+        
         try:
             # 키워드 추출
             ref_keywords = self._extract_reference_keywords(title, abstract, claims)
             ref_ipc_codes = ipc_codes or []
             
-            if not ref_keywords and not ref_ipc_codes:
-                return SimilaritySearchOutput(
-                    success=False,
-                    error="참조 특허에서 검색 가능한 키워드를 추출할 수 없습니다.",
-                )
-            
-            # 검색 쿼리 생성 (상위 키워드로 검색)
-            search_query = PatentSearchQuery(
-                keywords=ref_keywords[:5],  # 상위 5개 키워드
-                ipc_codes=ref_ipc_codes[:2] if ref_ipc_codes else [],  # 상위 2개 IPC
-                jurisdictions=[PatentJurisdiction(j) for j in jurisdictions if j in PatentJurisdiction.__members__],
-                max_results=max_results * 2,  # 필터링 고려 2배 요청
+            data_source = "local"
+            similar_patents = await self._search_local(
+                title, abstract, claims, ref_keywords, ref_ipc_codes,
+                patent_number, jurisdictions, max_results, min_similarity,
             )
-            
-            # 검색 실행
-            aggregator = self._get_aggregator()
-            result = await aggregator.search(query=search_query)
-            
-            # 유사도 계산 및 정렬
-            similar_patents = []
-            for patent in result.patents:
-                # 자기 자신 제외
-                if patent_number and patent.patent_number == patent_number:
-                    continue
-                
-                similarity, match_kw, match_ipc = self._calculate_similarity(
-                    patent, ref_keywords, ref_ipc_codes
+            if similar_patents is None:
+                if not ref_keywords and not ref_ipc_codes:
+                    return _output(False, errors=["참조 특허에서 검색 가능한 키워드를 추출할 수 없습니다."])
+                data_source = "live"
+                similar_patents = await self._search_live(
+                    ref_keywords, ref_ipc_codes, patent_number, jurisdictions, max_results, min_similarity,
                 )
-                
-                if similarity >= min_similarity:
-                    similar = SimilarPatent(
-                        **patent.model_dump(),
-                        similarity_score=round(similarity, 3),
-                        matching_keywords=match_kw,
-                        matching_ipc_codes=match_ipc,
-                    )
-                    similar_patents.append(similar)
             
             # 유사도 순 정렬
             similar_patents.sort(key=lambda x: x.similarity_score, reverse=True)
             similar_patents = similar_patents[:max_results]
             
-            execution_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            return SimilaritySearchOutput(
-                success=True,
+            return _output(
+                True,
+                data_source,
                 similar_patents=similar_patents,
                 reference_keywords=ref_keywords,
                 total_count=len(similar_patents),
-                execution_time_ms=execution_time,
             )
             
         except Exception as e:
             logger.error(f"유사 특허 검색 실패: {e}")
-            return SimilaritySearchOutput(
-                success=False,
-                error=str(e),
-            )
+            return _output(False, errors=[str(e)])
 
 
 # =============================================================================
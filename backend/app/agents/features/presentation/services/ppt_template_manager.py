@@ -6,7 +6,6 @@ DeckSpec을 템플릿에 맞게 변환하여 적용
 from __future__ import annotations
 
 import json
-import subprocess
 import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -19,6 +18,7 @@ from pptx.enum.shapes import MSO_SHAPE_TYPE
 from loguru import logger
 from .ppt_models import DeckSpec, SlideSpec
 from .ppt_template_extractor import extract_presentation
+from .template_metadata_index import template_metadata_index
 
 
 @dataclass
@@ -48,7 +48,9 @@ class PPTTemplateManager:
     """PPT 템플릿 분석 및 적용 매니저"""
     
     def __init__(self):
+        # 분석 결과 캐시: 템플릿 지문(경로+mtime+크기) → TemplateSpec
         self.template_cache: Dict[str, TemplateSpec] = {}
+        self.metadata_index = template_metadata_index
         self._initialized = False  # 중복 초기화 방지 플래그
         # 템플릿 레지스트리 초기화
         self._initialize_registry()
@@ -131,6 +133,8 @@ class PPTTemplateManager:
                 
                 # 동적 분석 추가
                 self._add_dynamic_analysis_to_entry(entry, file_path, template_name)
+                # 메타데이터 인덱스 (영속 인덱스에 있으면 재파싱 없음)
+                self.metadata_index.get(file_path)
                 
                 self._registry[template_id] = entry
                 logger.info(f"📄 템플릿 자동 등록: {template_id} -> {file_path.name}")
@@ -231,18 +235,16 @@ class PPTTemplateManager:
                 slide_count = 0
                 
                 try:
-                    if path and Path(path).exists():
-                        file_size = Path(path).stat().st_size
-                        # 파일 크기 기반 품질 판단
-                        if file_size > 1_000_000:  # 1MB 이상
-                            quality_level = "professional"
-                        elif file_size > 100_000:  # 100KB 이상
-                            quality_level = "standard"
-                        
-                        # 슬라이드 수 확인
-                        from pptx import Presentation
-                        prs = Presentation(path)
-                        slide_count = len(prs.slides)
+                    # 슬라이드 수/크기는 메타데이터 인덱스에서 조회 (파일 변경 시에만 재파싱)
+                    index_entry = self.metadata_index.get(path)
+                    if index_entry:
+                        file_size = index_entry.file_size
+                        slide_count = index_entry.slide_count
+                    # 파일 크기 기반 품질 판단
+                    if file_size > 1_000_000:  # 1MB 이상
+                        quality_level = "professional"
+                    elif file_size > 100_000:  # 100KB 이상
+                        quality_level = "standard"
                         
                 except Exception as e:
                     logger.warning(f"템플릿 품질 분석 실패 {t['id']}: {e}")
@@ -529,8 +531,10 @@ class PPTTemplateManager:
         # 캐시에서도 제거
         all_deleted_paths = [str(template_path)] + deleted_files
         for deleted_path in all_deleted_paths:
-            if deleted_path in self.template_cache:
-                del self.template_cache[deleted_path]
+            self.metadata_index.invalidate(deleted_path)
+            for key, spec in list(self.template_cache.items()):
+                if str(spec.file_path) == deleted_path:
+                    del self.template_cache[key]
         
         logger.info(f"템플릿 제거됨: {template_id}")
         if related_templates_to_remove:
@@ -543,28 +547,16 @@ class PPTTemplateManager:
         return base_dir
 
     def _try_generate_thumbnail(self, file_path: Path, template_id: str) -> Optional[str]:
-        soffice = shutil.which('soffice') or shutil.which('libreoffice')
-        if not soffice:
+        from app.services.document.extraction.office_conversion_pool import office_conversion_pool
+        if not office_conversion_pool.is_available:
             return None
         try:
             out_dir = self.template_cache_directory() / 'thumbs'
             out_dir.mkdir(parents=True, exist_ok=True)
-            cmd = [soffice, '--headless', '--convert-to', 'png', '--outdir', str(out_dir), str(file_path)]
-            subprocess.run(cmd, timeout=25, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            candidates = sorted(out_dir.glob(file_path.stem + '*.png'))
-            if not candidates:
-                return None
-            first = candidates[0]
+            # 첫 슬라이드 PNG (공유 변환 워커 풀, 내용 해시 캐시)
+            rendered = office_conversion_pool.convert(file_path, 'png')
             target = out_dir / f"{template_id}.png"
-            if target.exists():
-                try:
-                    target.unlink()
-                except Exception:
-                    pass
-            try:
-                first.rename(target)
-            except Exception:
-                return str(first)
+            shutil.copyfile(rendered, target)
             return str(target)
         except Exception:
             return None
@@ -705,176 +697,60 @@ class PPTTemplateManager:
             except Exception:
                 pass
 
-            soffice = shutil.which('soffice') or shutil.which('libreoffice')
-            if not soffice:
+            from app.services.document.extraction.office_conversion_pool import (
+                OfficeConversionError,
+                office_conversion_pool,
+            )
+            if not office_conversion_pool.is_available:
                 logger.warning("PDF 변환 도구(soffice/libreoffice) 미설치")
                 return None
 
-            # outdir로 캐시 디렉토리 지정, 변환 파일명을 후처리로 target 이름으로 이동
+            # 공유 변환 워커 풀에서 변환 (동일 템플릿 동시 요청은 1회 변환 공유)
             try:
-                cmd = [soffice, '--headless', '--convert-to', 'pdf', '--outdir', str(cache_dir), str(pptx_path)]
-                subprocess.run(cmd, timeout=60, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except subprocess.TimeoutExpired:
-                logger.error("PDF 변환 타임아웃")
+                converted = office_conversion_pool.convert(pptx_path, 'pdf')
+            except OfficeConversionError as e:
+                logger.error(f"PDF 변환 실패: {e}")
                 return None
-            except subprocess.CalledProcessError as e:
-                logger.error(f"PDF 변환 실패 (코드 {e.returncode})")
-                return None
-            except Exception as e:
-                logger.error(f"PDF 변환 예외: {e}")
-                return None
-
-            # 변환 결과 파일 찾기 (원본 파일명 기반)
-            generated = cache_dir / f"{pptx_path.stem}.pdf"
-            if generated.exists():
-                try:
-                    # 기존 캐시 파일 제거 후 이동/이름 변경
-                    if target_pdf.exists():
-                        try:
-                            target_pdf.unlink()
-                        except Exception:
-                            pass
-                    generated.rename(target_pdf)
-                    return str(target_pdf)
-                except Exception as e:
-                    logger.warning(f"PDF 캐시 파일 이동 실패: {e}")
-                    return str(generated)
 
-            # 일부 환경에서 다른 이름으로 생성될 수 있으므로 fallback: 최신 pdf 선택
             try:
-                pdfs = sorted(cache_dir.glob('*.pdf'), key=lambda p: p.stat().st_mtime, reverse=True)
-                if pdfs:
-                    cand = pdfs[0]
-                    return str(cand)
-            except Exception:
-                pass
-            logger.error("PDF 변환 결과를 찾을 수 없음")
-            return None
+                tmp_pdf = target_pdf.with_suffix('.pdf.tmp')
+                shutil.copyfile(converted, tmp_pdf)
+                tmp_pdf.replace(target_pdf)
+                return str(target_pdf)
+            except Exception as e:
+                logger.warning(f"PDF 캐시 파일 복사 실패: {e}")
+                return str(converted)
         except Exception as e:
             logger.error(f"get_template_pdf_path 오류: {e}")
             return None
         
     def analyze_template(self, template_path: Path) -> Optional[TemplateSpec]:
-        """템플릿 파일 분석 및 레이아웃 정보 추출"""
-        cache_key = str(template_path)
-        
-        if cache_key in self.template_cache:
-            return self.template_cache[cache_key]
-            
-        try:
-            prs = Presentation(str(template_path))
-            
-            # 슬라이드 마스터 분석
-            slide_masters = prs.slide_masters
-            layouts = {}
-            
-            # 각 레이아웃 분석
-            for master in slide_masters:
-                for i, layout in enumerate(master.slide_layouts):
-                    layout_info = self._analyze_layout(layout, i)
-                    if layout_info:
-                        layouts[layout_info.name] = layout_info
-            
-            # 테마 색상 추출
-            theme_colors = self._extract_theme_colors(prs)
-            
-            template_spec = TemplateSpec(
-                file_path=template_path,
-                layouts=layouts,
-                slide_masters=list(slide_masters),
-                theme_colors=theme_colors,
-                default_fonts=self._extract_default_fonts(prs)
-            )
-            
-            self.template_cache[cache_key] = template_spec
-            logger.info(f"템플릿 분석 완료: {template_path} ({len(layouts)}개 레이아웃)")
-            
-            return template_spec
-            
-        except Exception as e:
-            logger.error(f"템플릿 분석 실패: {template_path} - {e}")
-            return None
-    
-    def _analyze_layout(self, layout, index: int) -> Optional[TemplateLayoutInfo]:
-        """개별 레이아웃 분석"""
-        try:
-            placeholders = {}
-            supports_chart = False
-            supports_table = False
-            max_bullets = 6
-            
-            # 플레이스홀더 분석
-            for shape in layout.placeholders:
-                ph_type = shape.placeholder_format.type
-                placeholders[str(ph_type)] = {
-                    'idx': shape.placeholder_format.idx,
-                    'type': str(ph_type),
-                    'left': shape.left,
-                    'top': shape.top,
-                    'width': shape.width,
-                    'height': shape.height
-                }
-                
-                # 차트/테이블 지원 여부 확인
-                if 'CHART' in str(ph_type) or 'OBJECT' in str(ph_type):
-                    supports_chart = True
-                    supports_table = True
-            
-            # 레이아웃 타입 간단 결정
-            layout_type = "title-content"  # 기본값
-            if len(placeholders) == 0:
-                layout_type = "blank"
-            elif any('TITLE' in ph_info.get('type', '') for ph_info in placeholders.values()):
-                if any('BODY' in ph_info.get('type', '') or 'OBJECT' in ph_info.get('type', '') for ph_info in placeholders.values()):
-                    layout_type = "title-content"
-                else:
-                    layout_type = "title-only"
-            elif any('BODY' in ph_info.get('type', '') for ph_info in placeholders.values()):
-                layout_type = "content-only"
-            
-            return TemplateLayoutInfo(
-                name=layout.name,
-                slide_index=index,
-                placeholders=placeholders,
-                layout_type=layout_type,
-                max_bullets=max_bullets,
-                supports_chart=supports_chart,
-                supports_table=supports_table
-            )
-            
-        except Exception as e:
-            logger.warning(f"레이아웃 분석 실패: {layout.name} - {e}")
+        """템플릿 파일 분석 및 레이아웃 정보 추출 (메타데이터 인덱스 기반)"""
+        index_entry = self.metadata_index.get(template_path)
+        if not index_entry:
+            logger.error(f"템플릿 분석 실패: {template_path}")
             return None
-
-    # 🔥 불필요한 legacy 함수 제거됨
-    
-    def _extract_theme_colors(self, prs: Any) -> Dict[str, str]:
-        """테마 색상 추출"""
-        theme_colors = {}
-        try:
-            theme = prs.slide_masters[0].theme
-            for i, color in enumerate(theme.theme_part.theme.color_scheme):
-                theme_colors[f'accent{i+1}'] = str(color.rgb) if hasattr(color, 'rgb') else '#000000'
-        except Exception:
-            # 기본 색상 사용
-            theme_colors = {
-                'accent1': '#0078D4',
-                'accent2': '#107C10',
-                'accent3': '#FFB900'
-            }
-        return theme_colors
+        
+        cached = self.template_cache.get(index_entry.fingerprint)
+        if cached:
+            return cached
+        
+        layouts = {
+            record['name']: TemplateLayoutInfo(**record)
+            for record in index_entry.layouts
+        }
+        template_spec = TemplateSpec(
+            file_path=Path(template_path),
+            layouts=layouts,
+            slide_masters=[],  # python-pptx 객체는 인덱스에 보관하지 않음
+            theme_colors=index_entry.theme_colors,
+            default_fonts=index_entry.default_fonts
+        )
+        
+        self.template_cache[index_entry.fingerprint] = template_spec
+        logger.info(f"템플릿 분석 완료: {template_path} ({len(layouts)}개 레이아웃)")
+        return template_spec
     
-    def _extract_default_fonts(self, prs: Any) -> Dict[str, str]:
-        """기본 폰트 정보 추출"""
-        try:
-            font_scheme = prs.slide_masters[0].theme.theme_part.theme.font_scheme
-            return {
-                'major': font_scheme.major_font.latin_typeface or 'Calibri',
-                'minor': font_scheme.minor_font.latin_typeface or 'Calibri'
-            }
-        except Exception:
-            return {'major': 'Calibri', 'minor': 'Calibri'}
-
     def _update_slide_title_only(self, slide, new_title: str):
         """슬라이드의 제목만 조심스럽게 업데이트 (나머지 내용 보존)"""
         try:
@@ -1102,7 +978,7 @@ class PPTTemplateManager:
             logger.info(f"🚨 매핑 편집 없이 바로 생성 - 원본 템플릿 내용 보존")
             logger.info(f"원본 템플릿 사용: {template_path}")
             # 원본 템플릿 그대로 사용 (정리하지 않음)
-            prs = Presentation(str(template_path))
+            prs = self.metadata_index.open_presentation(template_path)
             
             # 제목만 업데이트 (나머지 내용은 보존)
             for i, slide_spec in enumerate(adapted_deck.slides):
@@ -1131,7 +1007,7 @@ class PPTTemplateManager:
         except Exception as e:
             logger.warning(f"템플릿 콘텐츠 정리 실패, 원본 사용: {e}")
             # 정리 실패 시 원본 템플릿 사용
-            prs = Presentation(str(template_path))
+            prs = self.metadata_index.open_presentation(template_path)
         finally:
             # 임시 파일 정리
             try:
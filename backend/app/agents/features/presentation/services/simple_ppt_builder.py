@@ -10,11 +10,12 @@ AI가 생성한 매핑 JSON을 받아 PPT에 단순 적용하는 빌더.
 3. original_name 기반 shape 매칭
 """
 
+import json
 import logging
 import os
 import shutil
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pptx import Presentation
 from pptx.util import Pt
@@ -71,72 +72,16 @@ class SimplePPTBuilder:
             logger.info(f"  📐 동적 슬라이드: mode={dynamic_slide_ops.get('mode')}")
         
         try:
-            # 1. 템플릿 복사
-            prs = Presentation(self.template_path)
-            
-            # 🆕 v3.7: 동적 슬라이드 처리 (대체보다 먼저 실행)
-            slide_index_offset = {}  # 원본 인덱스 → 조정된 인덱스
-            if dynamic_slide_ops:
-                prs, slide_index_offset = self._apply_dynamic_slide_ops(prs, dynamic_slide_ops)
-            
-            # 🆕 v3.4: 슬라이드 대체 처리
-            slide_idx_mapping = {}  # 원본 인덱스 → 대체 인덱스
-            if slide_replacements:
-                prs, slide_idx_mapping = self._apply_slide_replacements(prs, slide_replacements)
+            # 1. 템플릿 복사 (+ 동적 슬라이드 / 슬라이드 대체)
+            deck = self.open(slide_replacements, dynamic_slide_ops)
             
             # 2. 매핑 적용
-            applied_count = 0
-            failed_count = 0
-            
-            # 슬라이드별로 그룹화
-            mappings_by_slide = {}
-            for m in mappings:
-                slide_idx = m.get('slideIndex', 0)
-                
-                # 🆕 v3.7: 동적 슬라이드로 인한 인덱스 조정
-                if slide_idx in slide_index_offset:
-                    slide_idx = slide_index_offset[slide_idx]
-                
-                # 🆕 v3.4: 대체된 슬라이드 인덱스 조정
-                if slide_idx in slide_idx_mapping:
-                    slide_idx = slide_idx_mapping[slide_idx]
-                if slide_idx not in mappings_by_slide:
-                    mappings_by_slide[slide_idx] = []
-                mappings_by_slide[slide_idx].append(m)
-            
-            # 각 슬라이드에 매핑 적용
-            for slide_idx, slide_mappings in mappings_by_slide.items():
-                if slide_idx >= len(prs.slides):
-                    logger.warning(f"⚠️ 슬라이드 인덱스 초과: {slide_idx}")
-                    continue
-                
-                slide = prs.slides[slide_idx]
-                
-                for mapping in slide_mappings:
-                    success = self._apply_mapping(slide, mapping)
-                    if success:
-                        applied_count += 1
-                    else:
-                        failed_count += 1
-                        # 🆕 v3.4: 실패한 매핑 상세 로그
-                        logger.warning(
-                            f"⚠️ 매핑 실패: slide={slide_idx}, "
-                            f"originalName='{mapping.get('originalName', '')}', "
-                            f"elementId='{mapping.get('elementId', '')}'"
-                        )
+            applied_count, failed_count = deck.apply(mappings)
             
             # 3. 파일 저장
-            if not output_filename:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                output_filename = f"ai_generated_{timestamp}.pptx"
-            
-            output_path = os.path.join(self.output_dir, output_filename)
-            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else self.output_dir, exist_ok=True)
-            
-            prs.save(output_path)
+            output_path = deck.save(output_filename)
             
             logger.info(f"✅ [SimplePPTBuilder] 완료: {applied_count}개 적용, {failed_count}개 실패")
-            logger.info(f"📄 저장: {output_path}")
             
             result = {
                 "success": True,
@@ -150,7 +95,7 @@ class SimplePPTBuilder:
             if dynamic_slide_ops:
                 result["dynamic_slides_applied"] = True
                 result["dynamic_slides_mode"] = dynamic_slide_ops.get('mode')
-                result["slide_count"] = len(prs.slides)
+                result["slide_count"] = len(deck.prs.slides)
             
             return result
             
@@ -161,6 +106,31 @@ class SimplePPTBuilder:
                 "error": str(e)
             }
     
+    def open(
+        self,
+        slide_replacements: Optional[List[Dict[str, Any]]] = None,
+        dynamic_slide_ops: Optional[Dict[str, Any]] = None,
+    ) -> "IncrementalDeck":
+        """
+        템플릿을 열고 슬라이드 구조 변경(동적 슬라이드, 대체)까지 적용한 덱 반환.
+        
+        매핑은 반환된 덱에 슬라이드 단위로 나누어 적용할 수 있다
+        (슬라이드 병렬 생성 시 도착 순서대로 반영).
+        """
+        prs = Presentation(self.template_path)
+        
+        # 🆕 v3.7: 동적 슬라이드 처리 (대체보다 먼저 실행)
+        slide_index_offset = {}  # 원본 인덱스 → 조정된 인덱스
+        if dynamic_slide_ops:
+            prs, slide_index_offset = self._apply_dynamic_slide_ops(prs, dynamic_slide_ops)
+        
+        # 🆕 v3.4: 슬라이드 대체 처리
+        slide_idx_mapping = {}  # 원본 인덱스 → 대체 인덱스
+        if slide_replacements:
+            prs, slide_idx_mapping = self._apply_slide_replacements(prs, slide_replacements)
+        
+        return IncrementalDeck(self, prs, slide_index_offset, slide_idx_mapping)
+    
     def _apply_mapping(self, slide, mapping: Dict[str, Any]) -> bool:
         """
         단일 매핑을 슬라이드에 적용.
@@ -703,6 +673,111 @@ class SimplePPTBuilder:
         return {}
 
 
+class IncrementalDeck:
+    """
+    열린 python-pptx 덱에 매핑을 나누어 적용하는 래퍼.
+    
+    SimplePPTBuilder.open()으로 생성하며, 같은 요소에 같은 내용이 다시 들어오면
+    건너뛰므로 부분 적용 후 전체 매핑으로 sync()해도 중복 작업이 없다.
+    """
+    
+    def __init__(
+        self,
+        builder: SimplePPTBuilder,
+        prs: Presentation,
+        slide_index_offset: Dict[int, int],
+        slide_idx_mapping: Dict[int, int],
+    ):
+        self.builder = builder
+        self.prs = prs
+        self._slide_index_offset = slide_index_offset
+        self._slide_idx_mapping = slide_idx_mapping
+        self._applied: Dict[str, Any] = {}  # elementId → 적용한 내용 시그니처
+    
+    def _resolve_slide_index(self, slide_idx: int) -> int:
+        # 🆕 v3.7: 동적 슬라이드로 인한 인덱스 조정
+        if slide_idx in self._slide_index_offset:
+            slide_idx = self._slide_index_offset[slide_idx]
+        # 🆕 v3.4: 대체된 슬라이드 인덱스 조정
+        if slide_idx in self._slide_idx_mapping:
+            slide_idx = self._slide_idx_mapping[slide_idx]
+        return slide_idx
+    
+    @staticmethod
+    def _signature(mapping: Dict[str, Any]) -> str:
+        return json.dumps(
+            [
+                mapping.get('isEnabled', True),
+                mapping.get('newContent', '') or mapping.get('generatedText', ''),
+                (mapping.get('metadata') or {}).get('tableData'),
+            ],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+    
+    def apply(self, mappings: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """매핑 적용. (적용 수, 실패 수) 반환"""
+        applied_count = 0
+        failed_count = 0
+        
+        # 슬라이드별로 그룹화
+        mappings_by_slide: Dict[int, List[Dict[str, Any]]] = {}
+        for m in mappings:
+            slide_idx = self._resolve_slide_index(m.get('slideIndex', 0))
+            mappings_by_slide.setdefault(slide_idx, []).append(m)
+        
+        # 각 슬라이드에 매핑 적용
+        for slide_idx, slide_mappings in mappings_by_slide.items():
+            if slide_idx >= len(self.prs.slides):
+                logger.warning(f"⚠️ 슬라이드 인덱스 초과: {slide_idx}")
+                continue
+            
+            slide = self.prs.slides[slide_idx]
+            
+            for mapping in slide_mappings:
+                success = self.builder._apply_mapping(slide, mapping)
+                if success:
+                    applied_count += 1
+                    element_key = mapping.get('elementId') or mapping.get('originalName', '')
+                    if element_key:
+                        self._applied[f"{slide_idx}:{element_key}"] = self._signature(mapping)
+                else:
+                    failed_count += 1
+                    # 🆕 v3.4: 실패한 매핑 상세 로그
+                    logger.warning(
+                        f"⚠️ 매핑 실패: slide={slide_idx}, "
+                        f"originalName='{mapping.get('originalName', '')}', "
+                        f"elementId='{mapping.get('elementId', '')}'"
+                    )
+        
+        return applied_count, failed_count
+    
+    def sync(self, mappings: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """아직 적용되지 않았거나 내용이 바뀐 매핑만 적용"""
+        pending = []
+        for m in mappings:
+            slide_idx = self._resolve_slide_index(m.get('slideIndex', 0))
+            element_key = m.get('elementId') or m.get('originalName', '')
+            if self._applied.get(f"{slide_idx}:{element_key}") != self._signature(m):
+                pending.append(m)
+        return self.apply(pending) if pending else (0, 0)
+    
+    def save(self, output_filename: Optional[str] = None) -> str:
+        """덱을 저장하고 파일 경로 반환"""
+        if not output_filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_filename = f"ai_generated_{timestamp}.pptx"
+        
+        output_dir = self.builder.output_dir
+        output_path = os.path.join(output_dir, output_filename)
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else output_dir, exist_ok=True)
+        
+        self.prs.save(output_path)
+        logger.info(f"📄 저장: {output_path}")
+        return output_path
+
+
 def build_ppt_from_mappings(
     template_path: str,
     mappings: List[Dict[str, Any]],
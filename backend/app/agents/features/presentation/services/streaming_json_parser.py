@@ -0,0 +1,121 @@
+"""
+Streaming JSON Parser - 스트리밍 LLM 응답의 점진적 JSON 파싱
+
+LLM이 토큰 단위로 내보내는 JSON 텍스트에서 지정한 배열(예: "mappings")의
+원소 객체가 닫히는 즉시 하나씩 꺼내는 파서.
+
+핵심 원칙:
+1. 응답 전체를 기다리지 않음 (완성된 원소부터 바로 사용)
+2. 잘린 JSON을 고치지 않음 (닫히지 않은 원소는 버림)
+3. 코드펜스/설명 문구 등 JSON 외 텍스트는 무시
+"""
+
+import json
+import logging
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONArrayParser:
+    """
+    스트리밍 텍스트에서 `"<array_key>": [ {...}, {...} ]` 배열 원소를 점진 추출.
+
+    사용 예:
+        parser = IncrementalJSONArrayParser("mappings")
+        async for chunk in stream:
+            for item in parser.feed(chunk):
+                ...  # 닫힌 원소 객체 즉시 처리
+    """
+
+    def __init__(self, array_key: str = "mappings"):
+        self.array_key = array_key
+        self._text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+        self.complete = False
+        self.item_count = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """청크를 추가하고 이번에 완성된 배열 원소 목록을 반환"""
+        if not chunk or self.complete:
+            return []
+
+        self._text += chunk
+        items: List[Any] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ':':
+                # 객체 안에서 직전 문자열이 키
+                if self._stack and self._stack[-1] == '{':
+                    self._key = self._last_string
+            elif c == ',':
+                self._key = None
+            elif c in '{[':
+                if (
+                    c == '['
+                    and self._array_depth is None
+                    and self._key == self.array_key
+                    and self._stack
+                    and self._stack[-1] == '{'
+                ):
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(c)
+                self._key = None
+                if self._array_depth is not None and len(self._stack) == self._array_depth + 1:
+                    self._element_start = i
+            elif c in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if self._array_depth is None:
+                    continue
+                if len(self._stack) == self._array_depth and self._element_start is not None:
+                    item = self._load(text[self._element_start:i + 1])
+                    self._element_start = None
+                    if item is not None:
+                        items.append(item)
+                elif len(self._stack) < self._array_depth:
+                    # 대상 배열 종료 → 이후 텍스트는 무시
+                    self.complete = True
+                    self._pos = i + 1
+                    return items
+
+        self._pos = len(text)
+        return items
+
+    def _load(self, fragment: str) -> Optional[Any]:
+        try:
+            value = json.loads(fragment)
+        except json.JSONDecodeError as e:
+            logger.warning(f"스트리밍 JSON 원소 파싱 실패 (건너뜀): {e}")
+            return None
+        self.item_count += 1
+        return value
+
+    @property
+    def text(self) -> str:
+        """지금까지 수신한 전체 텍스트"""
+        return self._text
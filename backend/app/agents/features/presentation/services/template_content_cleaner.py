@@ -13,6 +13,8 @@ from pptx.shapes.base import BaseShape
 from pptx.text.text import TextFrame
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 
+from .template_metadata_index import template_metadata_index
+
 logger = logging.getLogger(__name__)
 
 class TemplateContentCleaner:
@@ -38,7 +40,7 @@ class TemplateContentCleaner:
                 logger.info(f"대상 슬라이드: {target_slides}")
             
             # PPTX 로드
-            presentation = Presentation(template_path)
+            presentation = template_metadata_index.open_presentation(template_path)
             
             # 슬라이드별 정리 (전체 또는 지정된 슬라이드만)
             cleaned_slides = 0
@@ -81,7 +83,7 @@ class TemplateContentCleaner:
         try:
             logger.info(f"슬라이드 복사 시작: 슬라이드 {source_slide_num}, 텍스트 클리어: {clear_text}")
             
-            presentation = Presentation(template_path)
+            presentation = template_metadata_index.open_presentation(template_path)
             
             if source_slide_num < 1 or source_slide_num > len(presentation.slides):
                 raise ValueError(f"유효하지 않은 슬라이드 번호: {source_slide_num}")
@@ -404,7 +406,7 @@ class TemplateContentCleaner:
     def create_content_mapping(self, template_path: str) -> Dict[str, Any]:
         """템플릿의 콘텐츠 영역 매핑 정보 생성"""
         try:
-            presentation = Presentation(template_path)
+            presentation = template_metadata_index.open_presentation(template_path)
             mapping = {
                 "slides": [],
                 "total_content_areas": 0
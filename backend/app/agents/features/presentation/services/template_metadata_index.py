@@ -0,0 +1,292 @@
+"""
+PPT 템플릿 메타데이터 인덱스
+템플릿 목록/분석/생성 경로가 같은 .pptx를 반복해서 파싱하지 않도록
+(경로, mtime, 크기) 지문 기준으로 분석 결과를 한 번만 만들어 보관
+
+- 디스크 인덱스: uploads/templates/metadata/template_index.json (재기동 후에도 재파싱 없음)
+- 메모리 인덱스: 목록 API는 파일 stat 1회 + dict 조회만 수행
+- 파일 바이트 캐시: 생성 경로가 디스크 재읽기 없이 Presentation을 여는 용도 (LRU, 용량 제한)
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+from pptx import Presentation
+
+PathLike = Union[str, Path]
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class TemplateIndexEntry:
+    """템플릿 1개의 분석 결과 (JSON 직렬화 가능)"""
+    path: str
+    fingerprint: str
+    file_size: int
+    slide_count: int
+    layouts: List[Dict[str, Any]] = field(default_factory=list)
+    slides: List[Dict[str, Any]] = field(default_factory=list)
+    theme_colors: Dict[str, str] = field(default_factory=dict)
+    default_fonts: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def placeholder_count(self) -> int:
+        return sum(len(s.get('placeholders', [])) for s in self.slides)
+
+
+def _fingerprint(path: Path, stat: os.stat_result) -> str:
+    raw = f"{path}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def analyze_layout(layout, index: int) -> Optional[Dict[str, Any]]:
+    """슬라이드 레이아웃 1개 분석 (TemplateLayoutInfo 필드와 동일한 dict)"""
+    try:
+        placeholders: Dict[str, Any] = {}
+        supports_chart = False
+        supports_table = False
+
+        # 플레이스홀더 분석
+        for shape in layout.placeholders:
+            ph_type = shape.placeholder_format.type
+            placeholders[str(ph_type)] = {
+                'idx': shape.placeholder_format.idx,
+                'type': str(ph_type),
+                'left': int(shape.left) if shape.left is not None else None,
+                'top': int(shape.top) if shape.top is not None else None,
+                'width': int(shape.width) if shape.width is not None else None,
+                'height': int(shape.height) if shape.height is not None else None,
+            }
+
+            # 차트/테이블 지원 여부 확인
+            if 'CHART' in str(ph_type) or 'OBJECT' in str(ph_type):
+                supports_chart = True
+                supports_table = True
+
+        # 레이아웃 타입 간단 결정
+        layout_type = "title-content"  # 기본값
+        if len(placeholders) == 0:
+            layout_type = "blank"
+        elif any('TITLE' in ph_info.get('type', '') for ph_info in placeholders.values()):
+            if any('BODY' in ph_info.get('type', '') or 'OBJECT' in ph_info.get('type', '') for ph_info in placeholders.values()):
+                layout_type = "title-content"
+            else:
+                layout_type = "title-only"
+        elif any('BODY' in ph_info.get('type', '') for ph_info in placeholders.values()):
+            layout_type = "content-only"
+
+        return {
+            'name': layout.name,
+            'slide_index': index,
+            'placeholders': placeholders,
+            'layout_type': layout_type,
+            'max_bullets': 6,
+            'supports_chart': supports_chart,
+            'supports_table': supports_table,
+        }
+    except Exception as e:
+        logger.warning(f"레이아웃 분석 실패: {getattr(layout, 'name', '?')} - {e}")
+        return None
+
+
+def extract_theme_colors(prs: Any) -> Dict[str, str]:
+    """테마 색상 추출"""
+    theme_colors = {}
+    try:
+        theme = prs.slide_masters[0].theme
+        for i, color in enumerate(theme.theme_part.theme.color_scheme):
+            theme_colors[f'accent{i+1}'] = str(color.rgb) if hasattr(color, 'rgb') else '#000000'
+    except Exception:
+        # 기본 색상 사용
+        theme_colors = {
+            'accent1': '#0078D4',
+            'accent2': '#107C10',
+            'accent3': '#FFB900'
+        }
+    return theme_colors
+
+
+def extract_default_fonts(prs: Any) -> Dict[str, str]:
+    """기본 폰트 정보 추출"""
+    try:
+        font_scheme = prs.slide_masters[0].theme.theme_part.theme.font_scheme
+        return {
+            'major': font_scheme.major_font.latin_typeface or 'Calibri',
+            'minor': font_scheme.minor_font.latin_typeface or 'Calibri'
+        }
+    except Exception:
+        return {'major': 'Calibri', 'minor': 'Calibri'}
+
+
+class TemplateMetadataIndex:
+    """템플릿 분석 결과 인덱스 (디스크 영속 + 메모리 서빙)"""
+
+    def __init__(self, index_path: Path, max_cached_bytes: int = 64 * 1024 * 1024):
+        self.index_path = index_path
+        self.max_cached_bytes = max_cached_bytes
+        self._entries: Dict[str, TemplateIndexEntry] = {}
+        self._bytes_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    def get(self, path: PathLike) -> Optional[TemplateIndexEntry]:
+        """템플릿 분석 결과 반환 (지문이 바뀐 경우에만 재파싱)"""
+        file_path = Path(path)
+        key = str(file_path)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.invalidate(key)
+            return None
+
+        fingerprint = _fingerprint(file_path, stat)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.fingerprint == fingerprint:
+                return entry
+
+        entry = self._build(file_path, fingerprint, stat.st_size)
+        if entry is None:
+            return None
+        with self._lock:
+            self._entries[key] = entry
+            self._save()
+        return entry
+
+    def open_presentation(self, path: PathLike):
+        """템플릿 Presentation 열기 (파일 바이트는 지문 기준으로 메모리 캐시)
+
+        python-pptx Presentation은 수정 가능한 객체라 공유할 수 없으므로
+        매번 새 인스턴스를 만들되, 디스크 읽기는 파일이 바뀐 경우에만 수행한다.
+        """
+        file_path = Path(path)
+        key = str(file_path)
+        stat = file_path.stat()
+        fingerprint = _fingerprint(file_path, stat)
+
+        with self._lock:
+            cached = self._bytes_cache.get(key)
+            if cached and cached[0] == fingerprint:
+                self._bytes_cache.move_to_end(key)
+                return Presentation(io.BytesIO(cached[1]))
+
+        data = file_path.read_bytes()
+        self._remember_bytes(key, fingerprint, data)
+        return Presentation(io.BytesIO(data))
+
+    def invalidate(self, path: PathLike) -> None:
+        """템플릿 변경/삭제 시 인덱스와 바이트 캐시에서 제거"""
+        key = str(Path(path))
+        with self._lock:
+            removed = self._entries.pop(key, None)
+            cached = self._bytes_cache.pop(key, None)
+            if cached:
+                self._cached_bytes -= len(cached[1])
+            if removed:
+                self._save()
+
+    # ---------------------------
+    # 내부
+    # ---------------------------
+    def _build(self, file_path: Path, fingerprint: str, file_size: int) -> Optional[TemplateIndexEntry]:
+        try:
+            data = file_path.read_bytes()
+            prs = Presentation(io.BytesIO(data))
+
+            layouts: List[Dict[str, Any]] = []
+            for master in prs.slide_masters:
+                for i, layout in enumerate(master.slide_layouts):
+                    record = analyze_layout(layout, i)
+                    if record:
+                        layouts.append(record)
+
+            slides: List[Dict[str, Any]] = []
+            for idx, slide in enumerate(prs.slides):
+                slides.append({
+                    'index': idx,
+                    'layout_name': slide.slide_layout.name if slide.slide_layout is not None else None,
+                    'placeholders': [
+                        {
+                            'idx': ph.placeholder_format.idx,
+                            'type': str(ph.placeholder_format.type),
+                            'name': ph.name,
+                        }
+                        for ph in slide.placeholders
+                    ],
+                })
+
+            entry = TemplateIndexEntry(
+                path=str(file_path),
+                fingerprint=fingerprint,
+                file_size=file_size,
+                slide_count=len(slides),
+                layouts=layouts,
+                slides=slides,
+                theme_colors=extract_theme_colors(prs),
+                default_fonts=extract_default_fonts(prs),
+            )
+            self._remember_bytes(str(file_path), fingerprint, data)
+            logger.info(f"📇 템플릿 인덱스 생성: {file_path.name} ({entry.slide_count}개 슬라이드, {len(layouts)}개 레이아웃)")
+            return entry
+        except Exception as e:
+            logger.warning(f"템플릿 인덱스 생성 실패: {file_path} - {e}")
+            return None
+
+    def _remember_bytes(self, key: str, fingerprint: str, data: bytes) -> None:
+        if len(data) > self.max_cached_bytes:
+            return
+        with self._lock:
+            previous = self._bytes_cache.pop(key, None)
+            if previous:
+                self._cached_bytes -= len(previous[1])
+            self._bytes_cache[key] = (fingerprint, data)
+            self._cached_bytes += len(data)
+            while self._cached_bytes > self.max_cached_bytes and self._bytes_cache:
+                _, (_, evicted) = self._bytes_cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    def _load(self) -> None:
+        try:
+            if not self.index_path.exists():
+                return
+            raw = json.loads(self.index_path.read_text(encoding='utf-8'))
+            if raw.get('version') != INDEX_VERSION:
+                return
+            for key, value in (raw.get('entries') or {}).items():
+                self._entries[key] = TemplateIndexEntry(**value)
+        except Exception as e:
+            logger.warning(f"템플릿 인덱스 로드 실패 (재생성 예정): {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                'version': INDEX_VERSION,
+                'entries': {key: asdict(entry) for key, entry in self._entries.items()},
+            }
+            tmp_path = self.index_path.with_suffix('.json.tmp')
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+            tmp_path.replace(self.index_path)
+        except Exception as e:
+            logger.warning(f"템플릿 인덱스 저장 실패: {e}")
+
+
+# 전역 인스턴스
+template_metadata_index = TemplateMetadataIndex(
+    Path(__file__).parents[3] / 'uploads' / 'templates' / 'metadata' / 'template_index.json'
+)
@@ -0,0 +1,312 @@
+"""
+PPT 템플릿 슬라이드 썸네일 저장소
+슬라이드별 썸네일을 한 번만 렌더링해 내용 주소 기반 WebP 파일로 보관하고 정적 파일로 서빙
+
+- 내용 주소: 템플릿 파일 SHA-256 다이제스트별 디렉토리 → URL 이 내용과 함께 바뀌므로 장기 캐시(immutable) 가능
+- 지연 생성: 요청된 슬라이드만 렌더링 (PDF 변환은 office_conversion_pool 캐시 공유, 페이지 1장만 래스터화)
+- 고정 크기: 한 번 렌더링한 페이지로 sm/md/lg WebP 를 함께 생성
+- 무효화: 템플릿 내용이 바뀌면 새 다이제스트로 전환하고 더 이상 참조되지 않는 이전 디렉토리 삭제
+
+디렉토리 구조:
+uploads/templates/thumbnails/store/
+├── index.json                  # 원본 경로 → (stat 지문, 다이제스트)
+└── {digest[:2]}/{digest}/
+    └── slide_{n}_{size}.webp
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from loguru import logger
+from PIL import Image
+
+PathLike = Union[str, Path]
+
+INDEX_VERSION = 1
+
+# 썸네일 고정 크기 (가로 px, 비율 유지)
+THUMBNAIL_SIZES: Dict[str, int] = {"sm": 320, "md": 640, "lg": 1280}
+DEFAULT_THUMBNAIL_SIZE = "md"
+RENDER_DPI = 150
+WEBP_QUALITY = 80
+
+# 내용 주소 URL 은 내용이 바뀌면 URL 도 바뀌므로 1년 + immutable
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _stat_fingerprint(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TemplateThumbnailStore:
+    """내용 주소 기반 슬라이드 썸네일 저장소 (지연 생성)"""
+
+    def __init__(self, root: Path, url_prefix: str = "/api/v1/agent/presentation/thumbnails"):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip('/')
+        self._index_path = root / 'index.json'
+        self._lock = threading.Lock()
+        self._render_locks: Dict[str, threading.Lock] = {}
+        # 원본 경로 → (stat 지문, 다이제스트). 파일이 바뀌지 않으면 재해시 없음
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # 다이제스트 / 무효화
+    # ------------------------------------------------------------------
+    def digest_for(self, source: PathLike) -> str:
+        """템플릿 파일 내용 다이제스트. 내용이 바뀌었으면 더 이상 참조되지 않는 이전 썸네일 삭제"""
+        path = Path(source)
+        key = str(path.resolve())
+        fingerprint = _stat_fingerprint(path)
+        with self._lock:
+            self._ensure_loaded()
+            cached = self._entries.get(key)
+            if cached and cached[0] == fingerprint:
+                return cached[1]
+
+        digest = _file_digest(path)
+        stale: Optional[str] = None
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = (fingerprint, digest)
+            if previous and previous[1] != digest and not self._is_referenced(previous[1]):
+                stale = previous[1]
+            self._save()
+
+        if stale:
+            logger.info(f"🖼️ 템플릿 변경 감지 → 이전 썸네일 삭제: {path.name} ({stale[:12]})")
+            self._purge(stale)
+        return digest
+
+    def invalidate(self, source: PathLike) -> None:
+        """템플릿 삭제/교체 시 호출 (같은 내용을 쓰는 다른 템플릿이 없으면 파일도 삭제)"""
+        key = str(Path(source).resolve())
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._entries.pop(key, None)
+            if not previous:
+                return
+            referenced = self._is_referenced(previous[1])
+            self._save()
+
+        if not referenced:
+            self._purge(previous[1])
+
+    def url_for(self, source: PathLike, slide_index: int, size: str = DEFAULT_THUMBNAIL_SIZE) -> str:
+        """슬라이드 썸네일의 내용 주소 URL (이미지는 첫 요청 시 생성)"""
+        return f"{self.url_prefix}/{self.digest_for(source)}/{size}/{slide_index}"
+
+    # ------------------------------------------------------------------
+    # 조회 / 렌더링
+    # ------------------------------------------------------------------
+    def get_path(self, digest: str, slide_index: int, size: str = DEFAULT_THUMBNAIL_SIZE) -> Optional[Path]:
+        """다이제스트 기준 썸네일 파일 경로 (없으면 원본에서 지연 생성, 원본이 바뀌었으면 None)"""
+        if not _DIGEST_RE.match(digest or '') or size not in THUMBNAIL_SIZES or slide_index < 0:
+            return None
+
+        target = self._slide_path(digest, slide_index, size)
+        if target.exists():
+            return target
+
+        source = self._source_for(digest)
+        if not source:
+            return None
+        return self._render(digest, source, slide_index, size)
+
+    def get_or_render(
+        self,
+        source: PathLike,
+        slide_index: int,
+        size: str = DEFAULT_THUMBNAIL_SIZE,
+    ) -> Tuple[Optional[str], Optional[Path]]:
+        """템플릿 현재 내용 기준 (다이제스트, 썸네일 경로)"""
+        if size not in THUMBNAIL_SIZES or slide_index < 0:
+            return None, None
+        digest = self.digest_for(source)
+        target = self._slide_path(digest, slide_index, size)
+        if target.exists():
+            return digest, target
+        return digest, self._render(digest, Path(source), slide_index, size)
+
+    def _render(self, digest: str, source: Path, slide_index: int, size: str) -> Optional[Path]:
+        key = f"{digest}:{slide_index}"
+        with self._lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+
+        # single-flight: 같은 슬라이드 동시 요청은 렌더링 1회
+        with render_lock:
+            try:
+                target = self._slide_path(digest, slide_index, size)
+                if target.exists():
+                    return target
+
+                page = self._rasterize_page(source, slide_index)
+                if page is None:
+                    return None
+
+                slide_dir = target.parent
+                slide_dir.mkdir(parents=True, exist_ok=True)
+                for size_name, width in THUMBNAIL_SIZES.items():
+                    image = page.copy()
+                    if image.width > width:
+                        height = max(1, round(image.height * width / image.width))
+                        image = image.resize((width, height), Image.Resampling.LANCZOS)
+                    self._write_webp(image, self._slide_path(digest, slide_index, size_name))
+
+                logger.info(f"🖼️ 슬라이드 썸네일 생성: {source.name} #{slide_index} ({digest[:12]})")
+                return target if target.exists() else None
+            except Exception as e:
+                logger.error(f"슬라이드 썸네일 생성 실패: {source} #{slide_index}: {e}")
+                return None
+            finally:
+                with self._lock:
+                    self._render_locks.pop(key, None)
+
+    def _rasterize_page(self, source: Path, slide_index: int) -> Optional[Image.Image]:
+        """PDF(변환 캐시 공유)에서 해당 페이지 1장만 래스터화"""
+        from app.services.document.extraction.office_conversion_pool import (
+            OfficeConversionError,
+            office_conversion_pool,
+        )
+
+        if not office_conversion_pool.is_available:
+            logger.warning("LibreOffice를 찾을 수 없습니다")
+            return None
+        try:
+            pdf_file = office_conversion_pool.convert(source, 'pdf')
+        except OfficeConversionError as e:
+            logger.warning(f"PDF 변환 실패: {e}")
+            return None
+
+        page_number = slide_index + 1
+        try:
+            from pdf2image import convert_from_path
+            images = convert_from_path(
+                str(pdf_file), dpi=RENDER_DPI, first_page=page_number, last_page=page_number
+            )
+            return images[0].convert('RGB') if images else None
+        except ImportError:
+            logger.warning("pdf2image 모듈 없음, pdftoppm 시도")
+
+        temp_dir = tempfile.mkdtemp(prefix="ppt_thumb_")
+        try:
+            output_prefix = Path(temp_dir) / "slide"
+            cmd = [
+                'pdftoppm', '-png', '-r', str(RENDER_DPI),
+                '-f', str(page_number), '-l', str(page_number),
+                str(pdf_file), str(output_prefix),
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            if result.returncode != 0:
+                logger.warning(f"pdftoppm 실패: {result.stderr}")
+                return None
+            png_files = sorted(Path(temp_dir).glob("slide*.png"))
+            if not png_files:
+                return None
+            with Image.open(png_files[0]) as img:
+                return img.convert('RGB')
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _write_webp(image: Image.Image, dest: Path) -> None:
+        # 임시 파일 → rename 으로 원자적 기록 (동시 요청이 반쯤 쓴 파일을 읽지 않도록)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.webp', dir=dest.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, 'WEBP', quality=WEBP_QUALITY, method=4)
+            os.replace(tmp_path, dest)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    # ------------------------------------------------------------------
+    # 내부 유틸
+    # ------------------------------------------------------------------
+    def _digest_dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _slide_path(self, digest: str, slide_index: int, size: str) -> Path:
+        return self._digest_dir(digest) / f"slide_{slide_index}_{size}.webp"
+
+    def _source_for(self, digest: str) -> Optional[Path]:
+        with self._lock:
+            self._ensure_loaded()
+            sources = [path for path, entry in self._entries.items() if entry[1] == digest]
+        for source in sources:
+            path = Path(source)
+            try:
+                # 원본이 이미 다른 내용으로 바뀌었으면 이 다이제스트로 렌더링하지 않음
+                if path.exists() and self.digest_for(path) == digest:
+                    return path
+            except OSError:
+                continue
+        return None
+
+    def _is_referenced(self, digest: str) -> bool:
+        return any(entry[1] == digest for entry in self._entries.values())
+
+    def _purge(self, digest: str) -> None:
+        shutil.rmtree(self._digest_dir(digest), ignore_errors=True)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if not self._index_path.exists():
+                return
+            data: Dict[str, Any] = json.loads(self._index_path.read_text(encoding='utf-8'))
+            if data.get('version') != INDEX_VERSION:
+                return
+            self._entries = {
+                path: (entry[0], entry[1])
+                for path, entry in (data.get('entries') or {}).items()
+                if isinstance(entry, list) and len(entry) == 2
+            }
+        except Exception as e:
+            logger.warning(f"썸네일 인덱스 로드 실패 (새로 생성): {e}")
+
+    def _save(self) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            payload = {
+                'version': INDEX_VERSION,
+                'entries': {path: list(entry) for path, entry in self._entries.items()},
+            }
+            fd, tmp_path = tempfile.mkstemp(prefix='.index_', suffix='.json', dir=self.root)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self._index_path)
+        except Exception as e:
+            logger.warning(f"썸네일 인덱스 저장 실패: {e}")
+
+
+# 전역 인스턴스
+template_thumbnail_store = TemplateThumbnailStore(
+    Path(__file__).parents[3] / 'uploads' / 'templates' / 'thumbnails' / 'store'
+)
@@ -23,6 +23,7 @@ from app.core.config import settings
 from app.services.core.ai_service import ai_service
 from .ppt_models import ChartData, DiagramData, SlideSpec, DeckSpec
 from .ppt_template_manager import PPTTemplateManager, template_manager
+from .template_metadata_index import template_metadata_index
 from .enhanced_object_processor import EnhancedPPTObjectProcessor
 # Note: TemplateContentCleaner 사용 안 함 (스타일 손실 방지)
 
@@ -193,7 +194,7 @@ class TemplatedPPTGeneratorService:
         if not template_path or not os.path.exists(template_path):
             raise ValueError(f"Template file not found: {template_id}")
             
-        prs = Presentation(template_path)
+        prs = template_metadata_index.open_presentation(template_path)
         
         # 2. 데이터 적용
         for slide_data in slides_data:
@@ -593,7 +594,7 @@ class TemplatedPPTGeneratorService:
             output_path = self.upload_dir / filename
             
             # 템플릿 로드
-            prs = Presentation(str(template_path))
+            prs = template_metadata_index.open_presentation(template_path)
             logger.info(f"📋 템플릿 로드 완료: {len(prs.slide_layouts)}개 레이아웃")
             
             # 기존 슬라이드 제거 (템플릿 슬라이드만 유지)
@@ -860,7 +861,7 @@ class TemplatedPPTGeneratorService:
             output_path = self.upload_dir / filename
             
             # 템플릿 로드
-            prs = Presentation(str(template_path))
+            prs = template_metadata_index.open_presentation(template_path)
             template_slide_count = len(prs.slides)
             ai_slide_count = len(spec.slides)
             logger.info(f"📋 템플릿 로드 완료: {template_slide_count}개 슬라이드, AI 슬라이드: {ai_slide_count}개")
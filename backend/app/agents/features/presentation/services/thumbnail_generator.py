@@ -8,7 +8,7 @@ import logging
 import subprocess
 import tempfile
 import shutil
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
 import hashlib
 from pptx import Presentation
@@ -32,26 +32,6 @@ class ThumbnailGenerator:
         self.thumbnail_width = 640
         self.thumbnail_height = 480
         self.cache_duration = 86400 * 7  # 7일
-        
-        # LibreOffice 경로 확인
-        self.libreoffice_path = self._find_libreoffice()
-    
-    def _find_libreoffice(self) -> Optional[str]:
-        """LibreOffice 실행 파일 찾기"""
-        for path in ['/usr/bin/libreoffice', '/usr/bin/soffice', 
-                     '/usr/local/bin/libreoffice', '/usr/local/bin/soffice']:
-            if os.path.exists(path):
-                return path
-        
-        # which 명령으로 찾기
-        try:
-            result = subprocess.run(['which', 'libreoffice'], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except Exception:
-            pass
-        
-        return None
     
     def generate_template_thumbnails(self, pptx_file_path: str, template_id: str) -> List[Dict[str, Any]]:
         """템플릿의 모든 슬라이드 썸네일 생성"""
@@ -134,7 +114,8 @@ class ThumbnailGenerator:
     
     def _convert_pptx_to_images(self, pptx_file_path: str, cache_key: str) -> List[Path]:
         """LibreOffice를 사용해 PPTX를 PNG 이미지로 변환 (PDF 경유)"""
-        if not self.libreoffice_path:
+        from app.services.document.extraction.office_conversion_pool import office_conversion_pool
+        if not office_conversion_pool.is_available:
             logger.warning("LibreOffice를 찾을 수 없습니다")
             return []
         
@@ -160,31 +141,15 @@ class ThumbnailGenerator:
     def _convert_via_pdf(self, pptx_file_path: str, temp_dir: str, cache_key: str) -> List[Path]:
         """PDF 중간 변환을 통한 이미지 생성"""
         try:
-            # PDF로 먼저 변환
-            cmd = [
-                self.libreoffice_path,
-                '--headless',
-                '--invisible', 
-                '--convert-to', 'pdf',
-                '--outdir', temp_dir,
-                pptx_file_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                env={**os.environ, 'HOME': temp_dir}
+            # PDF로 먼저 변환 (공유 변환 워커 풀, 내용 해시 캐시)
+            from app.services.document.extraction.office_conversion_pool import (
+                OfficeConversionError,
+                office_conversion_pool,
             )
-            
-            if result.returncode != 0:
-                logger.warning(f"PDF 변환 실패: {result.stderr}")
-                return []
-            
-            # PDF 파일 찾기
-            pdf_file = Path(temp_dir) / f"{Path(pptx_file_path).stem}.pdf"
-            if not pdf_file.exists():
+            try:
+                pdf_file = office_conversion_pool.convert(pptx_file_path, 'pdf')
+            except OfficeConversionError as e:
+                logger.warning(f"PDF 변환 실패: {e}")
                 return []
             
             # PDF를 이미지로 변환 (pdf2image 또는 pdftoppm 사용)
@@ -392,67 +357,68 @@ class ThumbnailGenerator:
         # 구현 시 JSON 파일이나 데이터베이스에 저장
         pass
     
-    def get_slide_thumbnail(self, template_id: str, slide_index: int, user_id: Optional[str] = None) -> Optional[bytes]:
-        """특정 슬라이드 썸네일 이미지 반환"""
+    def resolve_template_path(self, template_id: str, user_id: Optional[str] = None) -> Optional[str]:
+        """template_id 로 템플릿 파일 경로 찾기"""
+        template_path = None
+
+        # 1. user_template_manager에서 찾기 (사용자 ID가 있는 경우)
+        if user_id:
+            try:
+                from app.agents.features.presentation.services.user_template_manager import user_template_manager
+                template_path = user_template_manager.get_template_path(user_id, template_id)
+            except Exception:
+                pass
+
+        # 2. 기존 ppt_template_manager에서 찾기 (fallback)
+        if not template_path:
+            try:
+                from app.agents.features.presentation.services.ppt_template_manager import template_manager
+                template_path = template_manager.get_template_path(template_id)
+            except Exception:
+                pass
+
+        # 3. users 디렉토리 전체에서 찾기 (user_id 모를 때)
+        if not template_path:
+            users_dir = Path(__file__).parents[3] / 'uploads' / 'templates' / 'users'
+            if users_dir.exists():
+                for user_dir in users_dir.iterdir():
+                    if user_dir.is_dir():
+                        for pptx_file in user_dir.glob('*.pptx'):
+                            if pptx_file.stem.lower().replace(' ', '_') == template_id:
+                                template_path = str(pptx_file)
+                                break
+                    if template_path:
+                        break
+
+        if template_path and Path(template_path).exists():
+            return str(template_path)
+        return None
+
+    def get_slide_thumbnail_path(
+        self,
+        template_id: str,
+        slide_index: int,
+        size: str = "md",
+        user_id: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[Path]]:
+        """특정 슬라이드 썸네일 (내용 다이제스트, WebP 파일 경로) - 없으면 해당 슬라이드만 생성"""
         try:
-            # 먼저 정확한 template_id로 캐시에서 찾기
-            cache_files = list(self.thumbnail_cache_dir.glob(f"{template_id}_*_{slide_index}.png"))
-            if cache_files:
-                with open(cache_files[0], 'rb') as f:
-                    return f.read()
-            
-            # 캐시에 없으면 템플릿 경로 찾기
-            template_path = None
-            
-            # 1. user_template_manager에서 찾기 (사용자 ID가 있는 경우)
-            if user_id:
-                try:
-                    from app.agents.features.presentation.services.user_template_manager import user_template_manager
-                    template_path = user_template_manager.get_template_path(user_id, template_id)
-                except Exception:
-                    pass
-            
-            # 2. 기존 ppt_template_manager에서 찾기 (fallback)
-            if not template_path:
-                try:
-                    from app.agents.features.presentation.services.ppt_template_manager import template_manager
-                    template_path = template_manager.get_template_path(template_id)
-                except Exception:
-                    pass
-            
-            # 3. users 디렉토리 전체에서 찾기 (user_id 모를 때)
+            template_path = self.resolve_template_path(template_id, user_id)
             if not template_path:
-                users_dir = Path(__file__).parents[3] / 'uploads' / 'templates' / 'users'
-                if users_dir.exists():
-                    for user_dir in users_dir.iterdir():
-                        if user_dir.is_dir():
-                            for pptx_file in user_dir.glob('*.pptx'):
-                                if pptx_file.stem.lower().replace(' ', '_') == template_id:
-                                    template_path = str(pptx_file)
-                                    break
-                        if template_path:
-                            break
-            
-            if template_path and Path(template_path).exists():
-                logger.info(f"템플릿에서 썸네일 생성: {template_id} from {template_path}")
-                thumbnails = self.generate_template_thumbnails(template_path, template_id)
-                
-                # 생성 후 다시 캐시에서 찾기
-                cache_files = list(self.thumbnail_cache_dir.glob(f"{template_id}_*_{slide_index}.png"))
-                if cache_files:
-                    with open(cache_files[0], 'rb') as f:
-                        return f.read()
-                
-                # 메모리에서 직접 반환
-                if slide_index < len(thumbnails) and 'thumbnail_data' in thumbnails[slide_index]:
-                    import base64
-                    return base64.b64decode(thumbnails[slide_index]['thumbnail_data'])
-            
-            return None
-            
+                return None, None
+
+            from app.agents.features.presentation.services.template_thumbnail_store import template_thumbnail_store
+            return template_thumbnail_store.get_or_render(template_path, slide_index, size)
         except Exception as e:
             logger.error(f"썸네일 이미지 조회 실패: {e}")
+            return None, None
+
+    def get_slide_thumbnail(self, template_id: str, slide_index: int, user_id: Optional[str] = None) -> Optional[bytes]:
+        """특정 슬라이드 썸네일 이미지(WebP) 반환"""
+        _, thumbnail_path = self.get_slide_thumbnail_path(template_id, slide_index, user_id=user_id)
+        if not thumbnail_path:
             return None
+        return thumbnail_path.read_bytes()
 
 # 전역 인스턴스
 thumbnail_generator = ThumbnailGenerator()
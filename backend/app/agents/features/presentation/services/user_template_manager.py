@@ -21,6 +21,8 @@ from typing import Dict, List, Optional, Any
 from loguru import logger
 
 from .ppt_template_extractor import extract_presentation
+from .template_metadata_index import template_metadata_index
+from .template_thumbnail_store import template_thumbnail_store
 
 
 class UserTemplateManager:
@@ -66,6 +68,14 @@ class UserTemplateManager:
         except Exception as e:
             logger.error(f"사용자 설정 저장 실패: {user_id}, {e}")
     
+    def _thumbnail_url(self, pptx_file: Path, template_id: str, slide_index: int, size: str = 'md') -> str:
+        """내용 주소 썸네일 URL (장기 캐시). 다이제스트 계산 실패 시 템플릿 ID 기반 URL"""
+        try:
+            return template_thumbnail_store.url_for(pptx_file, slide_index, size)
+        except OSError as e:
+            logger.warning(f"썸네일 다이제스트 계산 실패: {pptx_file}: {e}")
+            return f'/api/v1/agent/presentation/templates/{template_id}/thumbnails/{slide_index}?size={size}'
+
     def _scan_templates_in_dir(self, directory: Path) -> List[Dict[str, Any]]:
         """디렉토리에서 템플릿 스캔"""
         templates = []
@@ -84,17 +94,9 @@ class UserTemplateManager:
             template_id = pptx_file.stem.lower().replace(' ', '_')
             template_name = pptx_file.stem.replace('_', ' ').title()
             
-            # 메타데이터 파일 확인
-            metadata_dir = directory / 'metadata'
-            metadata_file = metadata_dir / f"{template_id}_metadata.json"
-            
-            slide_count = 0
-            if metadata_file.exists():
-                try:
-                    metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
-                    slide_count = len(metadata.get('slides', []))
-                except Exception:
-                    pass
+            # 슬라이드 수는 메타데이터 인덱스에서 조회 (메타데이터 JSON 재파싱 없음)
+            index_entry = template_metadata_index.get(pptx_file)
+            slide_count = index_entry.slide_count if index_entry else 0
             
             templates.append({
                 'id': template_id,
@@ -102,7 +104,7 @@ class UserTemplateManager:
                 'path': str(pptx_file),
                 'type': 'user-uploaded',
                 'slideCount': slide_count,
-                'thumbnail_url': f'/api/v1/agent/presentation/templates/{template_id}/thumbnails/0',
+                'thumbnail_url': self._thumbnail_url(pptx_file, template_id, 0, 'sm'),
                 'is_user_uploaded': True
             })
         
@@ -144,7 +146,9 @@ class UserTemplateManager:
         safe_name = filename.replace('..', '_').replace('/', '_')
         dest_path = user_dir / safe_name
         
-        # 파일 저장
+        # 파일 저장 (같은 이름 덮어쓰기면 이전 내용의 썸네일 정리)
+        if dest_path.exists():
+            template_thumbnail_store.invalidate(dest_path)
         dest_path.write_bytes(file_content)
         logger.info(f"📄 템플릿 업로드: {dest_path} (user={user_id})")
         
@@ -162,14 +166,9 @@ class UserTemplateManager:
         except Exception as e:
             logger.warning(f"메타데이터 추출 실패: {e}")
         
-        # 슬라이드 수 확인
-        slide_count = 0
-        if metadata_file.exists():
-            try:
-                metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
-                slide_count = len(metadata.get('slides', []))
-            except Exception:
-                pass
+        # 메타데이터 인덱스 등록 (이후 목록 조회는 인덱스에서 처리)
+        index_entry = template_metadata_index.get(dest_path)
+        slide_count = index_entry.slide_count if index_entry else 0
         
         return {
             'id': template_id,
@@ -189,7 +188,9 @@ class UserTemplateManager:
             if pptx_file.stem.lower().replace(' ', '_') == template_id:
                 try:
                     # 파일 삭제
+                    template_thumbnail_store.invalidate(pptx_file)
                     pptx_file.unlink()
+                    template_metadata_index.invalidate(pptx_file)
                     logger.info(f"🗑️ 템플릿 삭제: {pptx_file}")
                     
                     # 메타데이터 파일 삭제
@@ -310,7 +311,7 @@ class UserTemplateManager:
         for i, slide in enumerate(slides):
             thumbnails.append({
                 'index': i,
-                'url': f'/api/v1/agent/presentation/templates/{template_id}/thumbnails/{i}',
+                'url': self._thumbnail_url(Path(template_path), template_id, i),
                 'role': slide.get('role', 'content')
             })
         
@@ -6,18 +6,20 @@ element_id 단위로 직접 매핑하는 단순화된 도구.
 
 핵심 원칙:
 1. AI가 모든 매핑 결정을 함 (코드는 단순 적용만)
-2. 단일 프롬프트로 전체 PPT 콘텐츠 생성
+2. 덱 계획 1회 + 슬라이드별 병렬 생성 (비활성화 시 단일 프롬프트로 전체 생성)
 3. element_id ↔ content 직접 매핑
 """
 
+import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from app.agents.features.presentation.services.streaming_json_parser import IncrementalJSONArrayParser
 from app.services.core.ai_service import MultiVendorAIService as AIService
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,11 @@ logger = logging.getLogger(__name__)
 # 프롬프트 파일 경로 (로컬 prompts 디렉토리)
 PROMPT_DIR = Path(__file__).parent.parent / "prompts"
 AI_DIRECT_MAPPING_PROMPT_FILE = PROMPT_DIR / "ai_direct_mapping_system.prompt"
+AI_DIRECT_MAPPING_PLAN_PROMPT_FILE = PROMPT_DIR / "ai_direct_mapping_plan.prompt"
+AI_DIRECT_MAPPING_SLIDE_PROMPT_FILE = PROMPT_DIR / "ai_direct_mapping_slide.prompt"
+
+# 진행 이벤트 콜백: {'type': 'plan' | 'slide', ...} 를 받는 코루틴 함수
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
 
 
 class AIDirectMappingInput(BaseModel):
@@ -79,9 +86,15 @@ class AIDirectMappingTool(BaseTool):
         self,
         user_query: str,
         template_metadata: Dict[str, Any],
-        additional_context: Optional[str] = None
+        additional_context: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
-        """비동기 실행 - AI가 직접 매핑 생성"""
+        """
+        비동기 실행 - AI가 직접 매핑 생성
+        
+        progress_callback 이 주어지면 슬라이드 병렬 생성 중 덱 계획('plan')과
+        슬라이드 완료('slide') 이벤트를 도착 순서대로 전달한다.
+        """
         
         logger.info(f"🎯 [AIDirectMapping] 시작: query='{user_query[:50]}...'")
         
@@ -108,17 +121,29 @@ class AIDirectMappingTool(BaseTool):
                         'add_count': requested_slides - template_slide_count
                     }
             
-            # 1. 템플릿 구조를 AI에게 전달할 형식으로 변환
-            template_spec = self._create_template_spec(template_metadata)
-            
-            # 2. AI 프롬프트 생성 (🆕 v3.8: slide_count_hint 전달)
-            prompt = self._create_prompt(user_query, template_spec, additional_context, slide_count_hint)
+            generation_mode = "slide_parallel" if self._slide_parallel_enabled() else "single"
             
-            # 3. AI 호출
-            response = await self._call_llm(prompt)
-            
-            # 4. 응답 파싱 (매핑 + 슬라이드 대체 정보 + 동적 슬라이드 정보)
-            parse_result = self._parse_response(response, template_metadata)
+            if generation_mode == "slide_parallel":
+                # 🆕 덱 계획 1회 + 슬라이드별 병렬 생성 (스트리밍 파싱)
+                parse_result = await self._generate_slide_parallel(
+                    user_query,
+                    template_metadata,
+                    additional_context,
+                    slide_count_hint,
+                    progress_callback,
+                )
+            else:
+                # 1. 템플릿 구조를 AI에게 전달할 형식으로 변환
+                template_spec = self._create_template_spec(template_metadata)
+                
+                # 2. AI 프롬프트 생성 (🆕 v3.8: slide_count_hint 전달)
+                prompt = self._create_prompt(user_query, template_spec, additional_context, slide_count_hint)
+                
+                # 3. AI 호출
+                response = await self._call_llm(prompt)
+                
+                # 4. 응답 파싱 (매핑 + 슬라이드 대체 정보 + 동적 슬라이드 정보)
+                parse_result = self._parse_response(response, template_metadata)
             mappings = parse_result.get('mappings', [])
             slide_replacements = parse_result.get('slide_replacements', [])
             content_plan = parse_result.get('content_plan', {})      # 🆕 v3.7
@@ -145,6 +170,8 @@ class AIDirectMappingTool(BaseTool):
                 "slide_replacements": slide_replacements,   # 🆕 v3.4
                 "content_plan": content_plan,               # 🆕 v3.7: 콘텐츠 계획
                 "dynamic_slides": dynamic_slides,           # 🆕 v3.7: 동적 슬라이드
+                "presentation_title": parse_result.get('presentation_title'),
+                "generation_mode": generation_mode,
                 "message": "AI 직접 매핑 완료. simple_ppt_builder로 PPT를 생성하세요."
             }
             
@@ -156,6 +183,262 @@ class AIDirectMappingTool(BaseTool):
                 "mappings": []
             }
     
+    # =========================================================================
+    # 🆕 슬라이드 병렬 생성 (덱 계획 1회 + 슬라이드별 동시 호출)
+    # =========================================================================
+    
+    def _slide_parallel_enabled(self) -> bool:
+        """슬라이드 병렬 생성 사용 여부 (설정 + 프롬프트 파일 존재)"""
+        from app.core.config import settings
+        
+        if not getattr(settings, 'ppt_slide_parallel_enabled', True):
+            return False
+        return AI_DIRECT_MAPPING_PLAN_PROMPT_FILE.exists() and AI_DIRECT_MAPPING_SLIDE_PROMPT_FILE.exists()
+    
+    async def _generate_slide_parallel(
+        self,
+        user_query: str,
+        template_metadata: Dict[str, Any],
+        additional_context: Optional[str],
+        slide_count_hint: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        덱 계획 → 슬라이드별 콘텐츠 병렬 생성.
+        
+        1. 계획 호출 1회: 제목, 목차, 슬라이드별 brief, 슬라이드 대체/동적 슬라이드
+        2. 슬라이드별 호출을 ppt_slide_concurrency 만큼 동시 실행
+        3. 각 응답을 스트리밍으로 받아 mappings 원소가 닫히는 즉시 변환하고,
+           슬라이드가 끝나면 'slide' 이벤트로 전달
+        
+        호출당 출력이 슬라이드 한 장 분량이라 잘림 복구 없이 파싱하며,
+        전체 소요 시간은 계획 + 가장 느린 슬라이드 수준이다.
+        
+        Returns:
+            _parse_response 와 같은 형식
+        """
+        from app.core.config import settings
+        
+        id_to_info, editable_elements = self._index_elements(template_metadata)
+        slides = template_metadata.get('slides', [])
+        
+        # 1. 덱 계획
+        plan = await self._plan_deck(
+            user_query,
+            self._create_template_spec(template_metadata),
+            self._create_additional_section(additional_context, slide_count_hint),
+        )
+        
+        slide_replacements = plan.get('slide_replacements') or []
+        content_plan = plan.get('content_plan') or {}
+        dynamic_slides = plan.get('dynamic_slides')
+        if not isinstance(dynamic_slides, dict):
+            dynamic_slides = {'mode': 'fixed'}
+        if slide_count_hint and dynamic_slides.get('mode') == 'fixed':
+            dynamic_slides = self._auto_generate_dynamic_slides(slide_count_hint, template_metadata)
+        
+        briefs: Dict[int, Dict[str, Any]] = {}
+        for item in plan.get('slides') or []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                briefs[int(item.get('slide'))] = item
+            except (TypeError, ValueError):
+                continue
+        
+        targets = [slide for slide in slides if self._slide_editable_elements(slide)]
+        deck_outline = self._create_deck_outline(slides, briefs, plan.get('presentation_title'))
+        slide_context = self._create_additional_section(additional_context)
+        
+        logger.info(
+            f"🗂️ [AIDirectMapping] 덱 계획 완료: 슬라이드 brief {len(briefs)}개, "
+            f"생성 대상 {len(targets)}/{len(slides)}장"
+        )
+        await self._notify(progress_callback, {
+            'type': 'plan',
+            'presentation_title': plan.get('presentation_title'),
+            'content_plan': content_plan,
+            'slide_replacements': slide_replacements,
+            'dynamic_slides': dynamic_slides,
+            'total': len(targets),
+        })
+        
+        # 2. 슬라이드별 병렬 생성
+        semaphore = asyncio.Semaphore(max(1, int(getattr(settings, 'ppt_slide_concurrency', 4))))
+        max_tokens = int(getattr(settings, 'ppt_slide_max_tokens', 1500))
+        completed = 0
+        
+        async def run(slide: Dict[str, Any]) -> List[Dict[str, Any]]:
+            nonlocal completed
+            async with semaphore:
+                slide_mappings, error = await self._generate_slide(
+                    user_query,
+                    slide,
+                    briefs.get(slide.get('index', 0), {}),
+                    deck_outline,
+                    slide_context,
+                    id_to_info,
+                    max_tokens,
+                )
+            completed += 1
+            event = {
+                'type': 'slide',
+                'slide_index': slide.get('index', 1) - 1,  # 0-based (매핑 slideIndex 와 동일)
+                'mappings': slide_mappings,
+                'completed': completed,
+                'total': len(targets),
+            }
+            if error:
+                event['error'] = error
+            await self._notify(progress_callback, event)
+            return slide_mappings
+        
+        results = await asyncio.gather(*(run(slide) for slide in targets))
+        
+        mappings = [m for slide_mappings in results for m in slide_mappings]
+        
+        # 🆕 AI가 매핑하지 않은 편집 가능 요소 → 빈 문자열로 추가
+        self._append_unmapped(mappings, editable_elements, id_to_info)
+        
+        return {
+            'mappings': mappings,
+            'slide_replacements': slide_replacements,
+            'content_plan': content_plan,
+            'dynamic_slides': dynamic_slides,
+            'presentation_title': plan.get('presentation_title'),
+        }
+    
+    async def _plan_deck(
+        self,
+        user_query: str,
+        template_spec: str,
+        additional_section: str
+    ) -> Dict[str, Any]:
+        """덱 계획 호출. 파싱 실패 시 빈 계획 (슬라이드 생성은 계속)"""
+        from app.core.config import settings
+        
+        prompt = self._load_prompt_template(AI_DIRECT_MAPPING_PLAN_PROMPT_FILE).format(
+            user_query=user_query,
+            template_spec=template_spec,
+            additional_context=additional_section,
+        )
+        response = await self._call_llm(prompt, max_tokens=int(getattr(settings, 'ppt_plan_max_tokens', 2000)))
+        
+        try:
+            plan = json.loads(self._extract_json_block(response))
+        except json.JSONDecodeError as e:
+            logger.warning(f"⚠️ 덱 계획 JSON 파싱 실패 → 계획 없이 슬라이드 생성: {e}")
+            return {}
+        
+        return plan if isinstance(plan, dict) else {}
+    
+    async def _generate_slide(
+        self,
+        user_query: str,
+        slide: Dict[str, Any],
+        brief: Dict[str, Any],
+        deck_outline: str,
+        slide_context: str,
+        id_to_info: Dict[str, Dict[str, Any]],
+        max_tokens: int,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        슬라이드 한 장의 콘텐츠를 스트리밍 생성.
+        
+        실패해도 예외를 올리지 않고 (지금까지 받은 매핑, 오류 메시지)를 반환한다.
+        누락 요소는 _append_unmapped 와 QualityGuard 가 처리한다.
+        """
+        elements = self._slide_editable_elements(slide)
+        allowed_ids = {elem.get('id', '') for elem in elements}
+        
+        prompt = self._load_prompt_template(AI_DIRECT_MAPPING_SLIDE_PROMPT_FILE).format(
+            user_query=user_query,
+            deck_outline=deck_outline,
+            slide_spec=self._create_slide_spec(slide, elements, brief),
+            additional_context=slide_context,
+        )
+        
+        parser = IncrementalJSONArrayParser("mappings")
+        mappings: List[Dict[str, Any]] = []
+        
+        try:
+            async for chunk in self._stream_llm(prompt, max_tokens=max_tokens):
+                for item in parser.feed(chunk):
+                    elem_id = item.get('element_id', '') if isinstance(item, dict) else ''
+                    if elem_id not in allowed_ids:
+                        logger.debug(f"⚠️ 슬라이드 {slide.get('index')} 범위 밖 요소 무시: {elem_id}")
+                        continue
+                    allowed_ids.discard(elem_id)
+                    mappings.append(self._to_mapping(item, id_to_info))
+        except Exception as e:
+            logger.warning(f"⚠️ 슬라이드 {slide.get('index')} 생성 실패 ({len(mappings)}개 요소까지 수신): {e}")
+            return mappings, str(e)
+        
+        if not parser.complete:
+            logger.warning(
+                f"⚠️ 슬라이드 {slide.get('index')} 응답 미완결 "
+                f"({len(mappings)}/{len(elements)}개 요소, max_tokens={max_tokens})"
+            )
+        
+        return mappings, None
+    
+    def _slide_editable_elements(self, slide: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """템플릿 스펙에 노출되는 편집 가능 요소 (고정/장식/빈 요소 제외)"""
+        return [
+            elem for elem in slide.get('elements', [])
+            if not elem.get('is_fixed', False)
+            and not self._is_decoration_element(elem)
+            and elem.get('content', '').strip()
+        ]
+    
+    def _create_deck_outline(
+        self,
+        slides: List[Dict[str, Any]],
+        briefs: Dict[int, Dict[str, Any]],
+        presentation_title: Optional[str]
+    ) -> str:
+        """슬라이드별 프롬프트에 공통으로 넣는 덱 구성 요약"""
+        
+        lines = []
+        if presentation_title:
+            lines.append(f"제목: {presentation_title}")
+        for slide in slides:
+            slide_num = slide.get('index', 0)
+            brief = briefs.get(slide_num, {})
+            summary = " - ".join(part for part in (brief.get('title'), brief.get('brief')) if part)
+            lines.append(f"- 슬라이드 {slide_num} ({slide.get('role', 'unknown')}): {summary or '(계획 없음)'}")
+        return "\n".join(lines)
+    
+    def _create_slide_spec(
+        self,
+        slide: Dict[str, Any],
+        elements: List[Dict[str, Any]],
+        brief: Dict[str, Any]
+    ) -> str:
+        """슬라이드 한 장의 요소 스펙"""
+        
+        slide_num = slide.get('index', 0)
+        role = slide.get('role', 'unknown')
+        viz_style = slide.get('visualization_style', {})
+        
+        lines = [f"## 슬라이드 {slide_num} ({role}) - 스타일: {viz_style.get('name', 'simple_text')}"]
+        if viz_style.get('description'):
+            lines.append(f"   📊 레이아웃: {viz_style.get('description')}")
+        if brief.get('title') or brief.get('brief'):
+            lines.append(f"   📝 계획: {brief.get('title', '')} - {brief.get('brief', '')}")
+        for elem in elements:
+            lines.extend(self._element_spec_lines(elem))
+        return "\n".join(lines)
+    
+    async def _notify(self, progress_callback: Optional[ProgressCallback], event: Dict[str, Any]) -> None:
+        """진행 이벤트 전달 (콜백 오류는 생성에 영향 없음)"""
+        if not progress_callback:
+            return
+        try:
+            await progress_callback(event)
+        except Exception as e:
+            logger.warning(f"⚠️ 진행 이벤트 전달 실패 ({event.get('type')}): {e}")
+    
     def _parse_requested_slide_count(self, query: str) -> Optional[int]:
         """
         🆕 v3.8: 사용자 질의에서 슬라이드 수 요청 파싱
@@ -483,43 +766,7 @@ class AIDirectMappingTool(BaseTool):
                 
                 editable_count += 1
                 
-                # 🆕 표(Table) 요소는 특별 처리
-                if elem_type == 'table':
-                    table_data = elem.get('table_data', {})
-                    rows = table_data.get('rows', 0)
-                    cols = table_data.get('cols', 0)
-                    header_row = table_data.get('header_row', [])
-                    header_texts = [cell.get('text', '') for cell in header_row]
-                    
-                    lines.append(f"  - {elem_id} | {elem_role} | 📊 TABLE ({rows}행 x {cols}열)")
-                    lines.append(f"    헤더: {header_texts}")
-                    lines.append(f"    ⚠️ 표 데이터는 JSON 2D 배열로 생성: [[\"헤더1\", \"헤더2\"], [\"데이터1\", \"데이터2\"], ...]")
-                    
-                    # 현재 테이블 내용 미리보기 (처음 3행만)
-                    cells = table_data.get('cells', [])
-                    if cells:
-                        for row_idx, row in enumerate(cells[:3]):
-                            row_texts = [c.get('text', '')[:15] for c in row]
-                            lines.append(f"    현재 Row{row_idx}: {row_texts}")
-                        if len(cells) > 3:
-                            lines.append(f"    ... ({len(cells) - 3}행 더 있음)")
-                else:
-                    content_preview = current_content[:80].replace('\n', ' / ')
-                    if len(current_content) > 80:
-                        content_preview += "..."
-                    
-                    # 요소 크기 힌트 (shape_width, shape_height 가 있으면)
-                    width = elem.get('width_px', 0)
-                    height = elem.get('height_px', 0)
-                    size_hint = ""
-                    if width > 0 and height > 0:
-                        if width < 100 or height < 50:
-                            size_hint = " [작은 요소 - 짧게]"
-                        elif width > 500:
-                            size_hint = " [넓은 요소 - 상세히]"
-                    
-                    lines.append(f"  - {elem_id} | {elem_role} | len={content_len}{size_hint}")
-                    lines.append(f"    현재: \"{content_preview}\"")
+                lines.extend(self._element_spec_lines(elem))
             
             lines.append("")
         
@@ -542,6 +789,56 @@ class AIDirectMappingTool(BaseTool):
         
         return "\n".join(lines)
     
+    def _element_spec_lines(self, elem: Dict[str, Any]) -> List[str]:
+        """편집 가능 요소 하나를 템플릿 스펙 라인으로 변환"""
+        
+        lines = []
+        elem_id = elem.get('id', '')
+        elem_type = elem.get('type', '')
+        elem_role = elem.get('element_role', 'unknown')
+        current_content = elem.get('content', '')
+        content_len = len(current_content)
+        
+        # 🆕 표(Table) 요소는 특별 처리
+        if elem_type == 'table':
+            table_data = elem.get('table_data', {})
+            rows = table_data.get('rows', 0)
+            cols = table_data.get('cols', 0)
+            header_row = table_data.get('header_row', [])
+            header_texts = [cell.get('text', '') for cell in header_row]
+            
+            lines.append(f"  - {elem_id} | {elem_role} | 📊 TABLE ({rows}행 x {cols}열)")
+            lines.append(f"    헤더: {header_texts}")
+            lines.append(f"    ⚠️ 표 데이터는 JSON 2D 배열로 생성: [[\"헤더1\", \"헤더2\"], [\"데이터1\", \"데이터2\"], ...]")
+            
+            # 현재 테이블 내용 미리보기 (처음 3행만)
+            cells = table_data.get('cells', [])
+            if cells:
+                for row_idx, row in enumerate(cells[:3]):
+                    row_texts = [c.get('text', '')[:15] for c in row]
+                    lines.append(f"    현재 Row{row_idx}: {row_texts}")
+                if len(cells) > 3:
+                    lines.append(f"    ... ({len(cells) - 3}행 더 있음)")
+        else:
+            content_preview = current_content[:80].replace('\n', ' / ')
+            if len(current_content) > 80:
+                content_preview += "..."
+            
+            # 요소 크기 힌트 (shape_width, shape_height 가 있으면)
+            width = elem.get('width_px', 0)
+            height = elem.get('height_px', 0)
+            size_hint = ""
+            if width > 0 and height > 0:
+                if width < 100 or height < 50:
+                    size_hint = " [작은 요소 - 짧게]"
+                elif width > 500:
+                    size_hint = " [넓은 요소 - 상세히]"
+            
+            lines.append(f"  - {elem_id} | {elem_role} | len={content_len}{size_hint}")
+            lines.append(f"    현재: \"{content_preview}\"")
+        
+        return lines
+    
     def _create_style_matching_guide(self, slide_styles: List[Dict]) -> str:
         """슬라이드 스타일별 최적 콘텐츠 유형 가이드 생성"""
         
@@ -606,13 +903,13 @@ class AIDirectMappingTool(BaseTool):
         
         return "\n".join(lines)
     
-    def _load_prompt_template(self) -> str:
+    def _load_prompt_template(self, prompt_file: Path = AI_DIRECT_MAPPING_PROMPT_FILE) -> str:
         """프롬프트 템플릿 파일 로드"""
         try:
-            if AI_DIRECT_MAPPING_PROMPT_FILE.exists():
-                return AI_DIRECT_MAPPING_PROMPT_FILE.read_text(encoding='utf-8')
+            if prompt_file.exists():
+                return prompt_file.read_text(encoding='utf-8')
             else:
-                logger.warning(f"프롬프트 파일 없음: {AI_DIRECT_MAPPING_PROMPT_FILE}, 기본 프롬프트 사용")
+                logger.warning(f"프롬프트 파일 없음: {prompt_file}, 기본 프롬프트 사용")
                 return self._get_default_prompt_template()
         except Exception as e:
             logger.warning(f"프롬프트 파일 로드 실패: {e}, 기본 프롬프트 사용")
@@ -659,6 +956,24 @@ JSON만 출력하세요."""
         # 프롬프트 템플릿 로드
         prompt_template = self._load_prompt_template()
         
+        additional_section = self._create_additional_section(additional_context, slide_count_hint)
+        
+        # 템플릿 변수 치환
+        prompt = prompt_template.format(
+            user_query=user_query,
+            template_spec=template_spec,
+            additional_context=additional_section,
+        )
+        
+        return prompt
+    
+    def _create_additional_section(
+        self,
+        additional_context: Optional[str],
+        slide_count_hint: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """추가 참고 자료 + 슬라이드 수 조정 힌트 섹션 생성"""
+        
         # 추가 컨텍스트 포맷
         additional_section = ""
         if additional_context:
@@ -690,16 +1005,9 @@ dynamic_slides 설정에서:
             
             additional_section = slide_hint_section + "\n" + additional_section
         
-        # 템플릿 변수 치환
-        prompt = prompt_template.format(
-            user_query=user_query,
-            template_spec=template_spec,
-            additional_context=additional_section,
-        )
-        
-        return prompt
+        return additional_section
     
-    async def _call_llm(self, prompt: str) -> str:
+    async def _call_llm(self, prompt: str, max_tokens: int = 4000) -> str:
         """LLM 호출"""
         
         if not self._ai_service:
@@ -713,11 +1021,29 @@ dynamic_slides 설정에서:
         response = await self._ai_service.chat_completion(
             messages=messages,
             temperature=0.7,
-            max_tokens=4000
+            max_tokens=max_tokens
         )
         
         return response.get('response', '')
     
+    async def _stream_llm(self, prompt: str, max_tokens: int):
+        """LLM 스트리밍 호출 (텍스트 청크 단위로 yield)"""
+        
+        if not self._ai_service:
+            self._ai_service = AIService()
+        
+        messages = [
+            {"role": "system", "content": "You are a presentation content expert. Output only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        async for chunk in self._ai_service.chat_stream(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=max_tokens
+        ):
+            yield chunk
+    
     def _repair_json(self, json_str: str) -> str:
         """
         🆕 v3.8: 불완전한 JSON 복구
@@ -826,6 +1152,15 @@ dynamic_slides 설정에서:
         
         return json_str
     
+    def _extract_json_block(self, response: str) -> str:
+        """응답에서 JSON 본문 추출 (코드펜스 제거)"""
+        json_str = response
+        if "```json" in response:
+            json_str = response.split("```json")[1].split("```")[0]
+        elif "```" in response:
+            json_str = response.split("```")[1].split("```")[0]
+        return json_str.strip()
+    
     def _parse_response(
         self, 
         response: str, 
@@ -844,16 +1179,12 @@ dynamic_slides 설정에서:
         """
         
         # JSON 추출
-        json_str = response
-        if "```json" in response:
-            json_str = response.split("```json")[1].split("```")[0]
-        elif "```" in response:
-            json_str = response.split("```")[1].split("```")[0]
+        json_str = self._extract_json_block(response)
         
         data = None
         
         try:
-            data = json.loads(json_str.strip())
+            data = json.loads(json_str)
         except json.JSONDecodeError as e:
             logger.warning(f"JSON 파싱 실패 (첫 번째 시도): {e}")
             
@@ -890,6 +1221,26 @@ dynamic_slides 설정에서:
             logger.info(f"📋 동적 슬라이드: mode={dynamic_slides.get('mode')}, 추가={len(add_slides)}, 삭제={len(remove_slides)}")
         
         # element_id → 상세 정보 매핑 테이블 생성
+        id_to_info, editable_elements = self._index_elements(metadata)
+        
+        # 매핑 리스트 생성
+        mappings = [self._to_mapping(item, id_to_info) for item in data.get('mappings', [])]
+        
+        # 🆕 AI가 매핑하지 않은 편집 가능 요소 → 빈 문자열로 추가
+        self._append_unmapped(mappings, editable_elements, id_to_info)
+        
+        # 🆕 v3.7: 매핑, 슬라이드 대체 정보, 동적 슬라이드 정보 함께 반환
+        return {
+            'mappings': mappings,
+            'slide_replacements': slide_replacements,
+            'content_plan': content_plan,      # 🆕 v3.7: 콘텐츠 계획
+            'dynamic_slides': dynamic_slides,  # 🆕 v3.7: 동적 슬라이드 관리
+            'presentation_title': data.get('presentation_title'),
+        }
+    
+    def _index_elements(self, metadata: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """element_id → 상세 정보 테이블과 편집 가능 요소 목록 생성"""
+        
         id_to_info = {}
         editable_elements = []  # 🆕 편집 가능한 모든 요소 추적
         
@@ -925,66 +1276,74 @@ dynamic_slides 설정에서:
                 if not is_fixed:
                     editable_elements.append(elem_id)
         
-        # AI가 매핑한 element_id 추적
-        ai_mapped_ids = set()
+        return id_to_info, editable_elements
+    
+    def _to_mapping(self, item: Dict[str, Any], id_to_info: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """AI 출력 항목 {element_id, content} → 빌더/UI용 매핑"""
         
-        # 매핑 리스트 생성
-        mappings = []
-        for item in data.get('mappings', []):
-            elem_id = item.get('element_id', '')
-            content = item.get('content', '')
-            
-            info = id_to_info.get(elem_id, {})
-            ai_mapped_ids.add(elem_id)
-            
-            # 🆕 is_fixed 요소는 비활성화 (AI가 잘못 매핑한 경우 방지)
-            is_fixed = info.get('is_fixed', False)
-            is_enabled = not is_fixed
+        elem_id = item.get('element_id', '')
+        content = item.get('content', '')
+        
+        info = id_to_info.get(elem_id, {})
+        
+        # 🆕 is_fixed 요소는 비활성화 (AI가 잘못 매핑한 경우 방지)
+        is_fixed = info.get('is_fixed', False)
+        is_enabled = not is_fixed
+        
+        if is_fixed:
+            logger.debug(f"⚠️ 고정 요소 매핑 비활성화: {elem_id}")
+        
+        # 🆕 표(Table) 요소인 경우 특별 처리
+        if elem_id.startswith('table-') and isinstance(content, list):
+            # 2D 배열을 tableData 형식으로 변환
+            headers = content[0] if content else []
+            rows = content[1:] if len(content) > 1 else []
             
-            if is_fixed:
-                logger.debug(f"⚠️ 고정 요소 매핑 비활성화: {elem_id}")
+            # 🆕 v3.6: 테이블 셀 텍스트를 generatedText에 저장 (QualityGuard 검사용)
+            table_text_for_guard = ' | '.join([' | '.join(row) if isinstance(row, list) else str(row) for row in content])
             
-            # 🆕 표(Table) 요소인 경우 특별 처리
-            if elem_id.startswith('table-') and isinstance(content, list):
-                # 2D 배열을 tableData 형식으로 변환
-                headers = content[0] if content else []
-                rows = content[1:] if len(content) > 1 else []
-                
-                # 🆕 v3.6: 테이블 셀 텍스트를 generatedText에 저장 (QualityGuard 검사용)
-                table_text_for_guard = ' | '.join([' | '.join(row) if isinstance(row, list) else str(row) for row in content])
-                
-                mappings.append({
-                    'slideIndex': info.get('slide_index', 0),
-                    'elementId': elem_id,
-                    'originalName': info.get('original_name', ''),
-                    'objectType': 'table',
-                    'action': 'replace_content',
-                    'generatedText': table_text_for_guard,  # 🆕 v3.6: QualityGuard 검사용 텍스트
-                    'originalText': info.get('original_content', ''),  # 🆕 v3.6: 원본 텍스트
-                    'metadata': {
-                        'tableData': {
-                            'headers': headers,
-                            'rows': rows
-                        },
-                        'originalTableCells': info.get('original_table_cells', [])  # 🆕 v3.6
+            return {
+                'slideIndex': info.get('slide_index', 0),
+                'elementId': elem_id,
+                'originalName': info.get('original_name', ''),
+                'objectType': 'table',
+                'action': 'replace_content',
+                'generatedText': table_text_for_guard,  # 🆕 v3.6: QualityGuard 검사용 텍스트
+                'originalText': info.get('original_content', ''),  # 🆕 v3.6: 원본 텍스트
+                'metadata': {
+                    'tableData': {
+                        'headers': headers,
+                        'rows': rows
                     },
-                    'isEnabled': is_enabled,
-                    'elementRole': info.get('element_role', '')
-                })
-            else:
-                mappings.append({
-                    'slideIndex': info.get('slide_index', 0),
-                    'elementId': elem_id,
-                    'originalName': info.get('original_name', ''),
-                    'objectType': 'textbox',
-                    'action': 'replace_content',
-                    'generatedText': content if isinstance(content, str) else str(content),
-                    'originalText': info.get('original_content', ''),  # 🆕 v3.6: 원본 텍스트
-                    'isEnabled': is_enabled,
-                    'elementRole': info.get('element_role', '')
-                })
+                    'originalTableCells': info.get('original_table_cells', [])  # 🆕 v3.6
+                },
+                'isEnabled': is_enabled,
+                'elementRole': info.get('element_role', '')
+            }
+        
+        return {
+            'slideIndex': info.get('slide_index', 0),
+            'elementId': elem_id,
+            'originalName': info.get('original_name', ''),
+            'objectType': 'textbox',
+            'action': 'replace_content',
+            'generatedText': content if isinstance(content, str) else str(content),
+            'originalText': info.get('original_content', ''),  # 🆕 v3.6: 원본 텍스트
+            'isEnabled': is_enabled,
+            'elementRole': info.get('element_role', '')
+        }
+    
+    def _append_unmapped(
+        self,
+        mappings: List[Dict[str, Any]],
+        editable_elements: List[str],
+        id_to_info: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """AI가 매핑하지 않은 편집 가능 요소를 기본 매핑으로 추가"""
+        
+        # AI가 매핑한 element_id 추적
+        ai_mapped_ids = {m.get('elementId') for m in mappings}
         
-        # 🆕 AI가 매핑하지 않은 편집 가능 요소 → 빈 문자열로 추가
         unmapped_count = 0
         unmapped_tables = []
         
@@ -1036,14 +1395,6 @@ dynamic_slides 설정에서:
         # 🆕 v3.3: 테이블 미매핑 시 강력한 경고
         if unmapped_tables:
             logger.error(f"🚨 AI가 테이블 {len(unmapped_tables)}개를 매핑하지 않음 (원본 유지): {unmapped_tables}")
-        
-        # 🆕 v3.7: 매핑, 슬라이드 대체 정보, 동적 슬라이드 정보 함께 반환
-        return {
-            'mappings': mappings,
-            'slide_replacements': slide_replacements,
-            'content_plan': content_plan,      # 🆕 v3.7: 콘텐츠 계획
-            'dynamic_slides': dynamic_slides   # 🆕 v3.7: 동적 슬라이드 관리
-        }
     
     async def regenerate_elements(
         self,
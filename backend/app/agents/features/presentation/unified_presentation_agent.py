@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 import re
 from contextvars import ContextVar
 from dataclasses import dataclass, field
@@ -46,7 +47,7 @@ from app.agents.features.presentation.tools.ppt_quality_validator_tool import pp
 from app.agents.features.presentation.tools.template_ppt_comparator_tool import template_ppt_comparator_tool
 
 # AI-First Tools (신규)
-from app.agents.features.presentation.tools.ai_direct_mapping_tool import AIDirectMappingTool
+from app.agents.features.presentation.tools.ai_direct_mapping_tool import AIDirectMappingTool, ProgressCallback
 from app.agents.features.presentation.services.simple_ppt_builder import SimplePPTBuilder
 from app.agents.features.presentation.services.ai_ppt_builder import AIPPTBuilder, build_ppt_from_ai_mappings
 
@@ -1515,6 +1516,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
         container_ids: Optional[List[str]] = None,
         use_rag: bool = True,
         use_ai_first: bool = True,  # 🆕 AI-First 모드 (기본값: True)
+        progress_callback: Optional[ProgressCallback] = None,  # 🆕 슬라이드 단위 진행 이벤트
+        build_draft: bool = False,  # 🆕 생성 중 초안 PPT 점진 빌드
     ) -> Dict[str, Any]:
         try:
             _UNIFIED_PPT_CTX.get()
@@ -1532,6 +1535,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
                 container_ids=container_ids,
                 use_rag=use_rag,
                 use_ai_first=use_ai_first,
+                progress_callback=progress_callback,
+                build_draft=build_draft,
             )
 
         ctx_token = _UNIFIED_PPT_CTX.set(_UnifiedPPTRequestContext())
@@ -1545,6 +1550,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
                 container_ids=container_ids,
                 use_rag=use_rag,
                 use_ai_first=use_ai_first,
+                progress_callback=progress_callback,
+                build_draft=build_draft,
             )
         finally:
             _UNIFIED_PPT_CTX.reset(ctx_token)
@@ -1559,6 +1566,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
         container_ids: Optional[List[str]] = None,
         use_rag: bool = True,
         use_ai_first: bool = True,  # 🆕 AI-First 모드 (기본값: True)
+        progress_callback: Optional[ProgressCallback] = None,  # 🆕 슬라이드 단위 진행 이벤트
+        build_draft: bool = False,  # 🆕 생성 중 초안 PPT 점진 빌드
     ) -> Dict[str, Any]:
         """
         UI 편집용 콘텐츠 생성 (Agent 통제 하에 실행).
@@ -1579,6 +1588,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
             container_ids: RAG 검색 범위
             use_rag: RAG 검색 활성화 여부
             use_ai_first: AI-First 모드 사용 여부 (기본값: True)
+            progress_callback: AI-First 슬라이드 병렬 생성 진행 이벤트 콜백
+            build_draft: True면 슬라이드가 완성되는 대로 초안 PPT에 반영 후 저장
             
         Returns:
             UI 편집 가능한 슬라이드 콘텐츠 구조
@@ -1602,6 +1613,8 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
                     session_id=session_id,
                     container_ids=container_ids,
                     use_rag=use_rag,
+                    progress_callback=progress_callback,
+                    build_draft=build_draft,
                 )
                 return self._finalize_execution(result)
             
@@ -2248,12 +2261,16 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
         session_id: Optional[str] = None,
         container_ids: Optional[List[str]] = None,
         use_rag: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
+        build_draft: bool = False,
     ) -> Dict[str, Any]:
         """
-        AI-First 파이프라인: 단일 AI 호출로 모든 매핑 생성.
+        AI-First 파이프라인: AI가 직접 element_id ↔ content 매핑을 생성.
         
         기존 4-Tool 파이프라인의 복잡성을 제거하고,
-        AI가 직접 element_id ↔ content 매핑을 생성.
+        덱 계획 1회 + 슬라이드별 병렬 호출로 매핑을 생성한다.
+        build_draft=True면 슬라이드가 완성되는 대로 python-pptx 덱에 반영하고
+        품질 보정 결과까지 동기화한 초안 PPT를 저장한다.
         """
         logger.info(f"🚀 [{self.name}] AI-First 파이프라인 시작")
         
@@ -2283,11 +2300,24 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
             
             # Step 3: AI Direct Mapping Tool 실행
             logger.info(f"  🤖 AI Direct Mapping 실행 중...")
+            draft_deck = None
+            
+            async def on_progress(event: Dict[str, Any]) -> None:
+                nonlocal draft_deck
+                if build_draft:
+                    if event.get("type") == "plan":
+                        draft_deck = await self._open_draft_deck(template_id, user_id, event)
+                    elif event.get("type") == "slide" and draft_deck is not None:
+                        draft_deck.apply(event.get("mappings") or [])
+                if progress_callback:
+                    await progress_callback(event)
+            
             ai_mapping_tool = AIDirectMappingTool()
             mapping_result = await ai_mapping_tool._arun(
                 user_query=user_query,
                 template_metadata=template_metadata,
                 additional_context=enriched_context,
+                progress_callback=on_progress,
             )
             
             if not mapping_result.get("success", False):
@@ -2391,6 +2421,16 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
             logger.info(f"✅ [{self.name}] AI-First 콘텐츠 생성 완료: {len(ui_slides)} 슬라이드")
             logger.info(f"  📌 프레젠테이션 제목: '{presentation_title}'")
             
+            # 🆕 초안 PPT: 미매핑/부분 재생성 결과만 추가 반영 후 저장
+            draft_file_path = None
+            if draft_deck is not None:
+                try:
+                    draft_deck.sync(mappings)
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    draft_file_path = draft_deck.save(f"draft_{template_id}_{timestamp}.pptx")
+                except Exception as e:
+                    logger.warning(f"  ⚠️ 초안 PPT 저장 실패 (계속 진행): {e}")
+            
             return {
                 "success": True,
                 "slides": ui_slides,
@@ -2403,6 +2443,9 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
                 "dynamic_slides": dynamic_slides,          # 🆕 v3.8: 동적 슬라이드
                 "pipeline": "ai_first",  # 파이프라인 구분자
                 "presentation_title": presentation_title,  # 🆕 파일명용 제목
+                "generation_mode": mapping_result.get("generation_mode"),
+                "draft_file_path": draft_file_path,
+                "draft_file_name": os.path.basename(draft_file_path) if draft_file_path else None,
             }
             
         except Exception as e:
@@ -2413,6 +2456,30 @@ deck_spec이 너무 길다면 빈 객체로 보내도 됩니다 (시스템이 
                 "slides": [],
             }
     
+    async def _open_draft_deck(
+        self,
+        template_id: str,
+        user_id: Optional[str],
+        plan_event: Dict[str, Any],
+    ):
+        """덱 계획(슬라이드 대체/동적 슬라이드)을 반영한 초안 덱 열기. 실패 시 None"""
+        try:
+            template_path = await self._get_template_path(template_id, str(user_id) if user_id else None)
+            if not template_path:
+                logger.warning(f"  ⚠️ 초안 PPT 생략: 템플릿 경로 없음 ({template_id})")
+                return None
+            
+            dynamic_slides = plan_event.get("dynamic_slides") or {}
+            dynamic_slide_ops = dynamic_slides if dynamic_slides.get("mode") in ("expand", "reduce") else None
+            
+            return SimplePPTBuilder(template_path).open(
+                slide_replacements=plan_event.get("slide_replacements") or None,
+                dynamic_slide_ops=dynamic_slide_ops,
+            )
+        except Exception as e:
+            logger.warning(f"  ⚠️ 초안 PPT 열기 실패 (콘텐츠 생성은 계속): {e}")
+            return None
+    
     def _convert_ai_mappings_to_ui_format(
         self,
         slides_info: List[Dict[str, Any]],
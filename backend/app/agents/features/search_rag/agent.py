@@ -3,8 +3,9 @@ Paper Search Agent - 논문/문서 검색 전문 에이전트
 동적 도구 선택과 전략 기반 검색 수행
 """
 import uuid
+import time
 import asyncio
-from typing import List, Dict, Any, Optional, cast
+from typing import List, Dict, Any, Optional, Callable, cast
 from datetime import datetime
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +14,7 @@ from app.core.contracts import (
     AgentIntent, AgentConstraints, AgentResult, AgentStep,
     SearchChunk, ToolResult
 )
+from app.agents.core.db import ToolExecutionContext
 # Search RAG 통합 도구 (feature-pack 내부)
 from app.agents.features.search_rag.tools.retrieval.vector_search_tool import vector_search_tool
 from app.agents.features.search_rag.tools.retrieval.keyword_search_tool import keyword_search_tool
@@ -28,6 +30,9 @@ from app.services.core.korean_nlp_service import korean_nlp_service
 from app.services.core.ai_service import ai_service
 from app.services.document.extraction.text_extractor_service import TextExtractorService
 from app.services.chat.chat_attachment_service import chat_attachment_service
+from app.services.chat.answer_cache_service import answer_cache_service, AnswerCacheScope, CachedAnswer
+from app.services.search.query_plan import QueryPlan
+from app.core.profiling import stage, staged, measure
 
 
 class PaperSearchAgent:
@@ -37,7 +42,7 @@ class PaperSearchAgent:
     역할:
     1. 질의 분석 (의도 분류, 키워드 추출, 언어 감지)
     2. 검색 전략 선택 (의도와 제약에 따라 도구 조합 결정)
-    3. 도구 순차 실행 (각 도구는 독립적)
+    3. 검색 도구 병렬 실행 (도구별 전용 DB 세션) 후 후처리 도구 순차 실행
     4. 컨텍스트 구성 및 답변 생성
     
     도구 목록:
@@ -52,7 +57,12 @@ class PaperSearchAgent:
     description: str = "논문/문서 검색 및 QA 전문 에이전트"
     version: str = "1.0.0"
     
-    def __init__(self):
+    # DB 세션이 필요한 검색 도구 (병렬 실행 시 도구마다 별도 세션 사용)
+    db_tools = {"vector_search", "keyword_search", "fulltext_search", "multimodal_search"}
+    
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        # 병렬 도구용 세션 팩토리 (None이면 앱 기본 풀 사용)
+        self.session_factory = session_factory
         # 도구 등록 (느슨한 결합) - 전역 인스턴스 사용
         self.tools = {
             "vector_search": vector_search_tool,
@@ -108,6 +118,28 @@ class PaperSearchAgent:
         try:
             logger.info(f"🤖 [PaperSearchAgent] 실행 시작: '{query[:50]}...'")
             
+            # 요청 단위 질의 계획 - 키워드/임베딩을 한 번만 계산해 캐시 조회·검색 도구가 공유
+            plan = QueryPlan.build(query)
+            
+            # 🆕 답변 시맨틱 캐시 (멀티턴/이미지/첨부 없는 독립 질문만)
+            cache_scope: Optional[AnswerCacheScope] = None
+            if self.is_answer_cacheable(context, history, images, attachments):
+                plan.prefetch()  # 캐시 미스에 대비해 키워드 분석도 함께 시작
+                with stage("answer_cache"):
+                    cache_scope = await answer_cache_service.resolve_scope(
+                        context["user_emp_no"],
+                        constraints.container_ids,
+                        constraints.document_ids,
+                        variant="paper_search_agent",
+                        params=self.answer_cache_params(constraints),
+                    )
+                    cached = (
+                        await answer_cache_service.lookup(query, cache_scope, embedding=await plan.embedding())
+                        if cache_scope else None
+                    )
+                if cached:
+                    return self._result_from_cache(cached)
+            
             # 🆕 이미지 분석
             image_description = ""
             if images:
@@ -174,9 +206,14 @@ class PaperSearchAgent:
                 if rewritten_query != query:
                     logger.info(f"   ✍️ 질의 재작성: '{query}' → '{rewritten_query}'")
             
-            # Step 1: 질의 분석
-            intent = await self.classify_intent(rewritten_query)
-            keywords = await self._extract_keywords(rewritten_query)
+            # Step 1: 질의 분석 (LLM 의도 분류 ∥ 키워드/임베딩)
+            if not plan.matches(rewritten_query):
+                plan = QueryPlan.build(rewritten_query)
+            plan.prefetch()
+            intent, keywords = await asyncio.gather(
+                self.classify_intent(rewritten_query),
+                self._extract_keywords(rewritten_query, plan),
+            )
             
             logger.info(f"   - 의도: {intent}, 키워드: {keywords}")
             
@@ -199,7 +236,8 @@ class PaperSearchAgent:
                 constraints=constraints,
                 db_session=db_session,
                 context=context,
-                attached_document_context=attached_document_context
+                attached_document_context=attached_document_context,
+                query_plan=plan
             )
 
             all_chunks = retrieval_result["chunks"]
@@ -225,6 +263,21 @@ class PaperSearchAgent:
             
             logger.info(f"✅ [PaperSearchAgent] 완료: {total_latency_ms:.1f}ms, {len(used_chunks)}개 참조")
             
+            if cache_scope and intent != AgentIntent.WEB_SEARCH and self.is_internal_answer(used_chunks):
+                await answer_cache_service.store(
+                    query,
+                    cache_scope,
+                    answer,
+                    payload={
+                        "intent": intent.value,
+                        "strategy_used": strategy,
+                        "references": [chunk.model_dump() for chunk in used_chunks],
+                    },
+                    cited_chunk_ids=[chunk.chunk_id for chunk in used_chunks],
+                    cited_file_ids=[chunk.file_id for chunk in used_chunks],
+                    embedding=await plan.embedding() if plan.matches(query) else None,
+                )
+            
             return AgentResult(
                 answer=answer,
                 references=used_chunks,
@@ -251,6 +304,67 @@ class PaperSearchAgent:
                 errors=[str(e)]
             )
     
+    @staticmethod
+    def is_answer_cacheable(
+        context: Optional[Dict[str, Any]],
+        history: List[Dict[str, str]],
+        images: List[str],
+        attachments: List[Dict[str, Any]],
+    ) -> bool:
+        """답변 캐시 사용 가능 여부 - 대화 맥락/첨부에 따라 답이 달라지는 요청은 제외"""
+        return (
+            answer_cache_service.enabled
+            and bool(context and context.get("user_emp_no"))
+            and not history
+            and not images
+            and not attachments
+        )
+
+    @staticmethod
+    def answer_cache_params(constraints: AgentConstraints) -> Dict[str, Any]:
+        """답변에 영향을 주는 검색 파라미터 (캐시 범위 키에 포함)"""
+        return {
+            "max_chunks": constraints.max_chunks,
+            "max_tokens": constraints.max_tokens,
+            "similarity_threshold": round(float(constraints.similarity_threshold), 2),
+        }
+
+    @staticmethod
+    def is_internal_answer(used_chunks: List[SearchChunk]) -> bool:
+        """사내 문서만 인용한 답변인지 (인터넷 검색 결과는 시점 의존적이라 캐시하지 않음)"""
+        return bool(used_chunks) and all(
+            chunk.match_type != "internet"
+            and (chunk.metadata or {}).get("source") not in ("internet", "tavily", "bing", "duckduckgo")
+            and str(chunk.file_id or "").isdigit()
+            for chunk in used_chunks
+        )
+
+    def _result_from_cache(self, cached: CachedAnswer) -> AgentResult:
+        """캐시 적중 결과 → AgentResult (LLM/검색 호출 없음)"""
+        latency_ms = (datetime.utcnow() - self._start_time).total_seconds() * 1000
+        payload = cached.payload or {}
+        try:
+            intent = AgentIntent(payload.get("intent"))
+        except ValueError:
+            intent = AgentIntent.FACTUAL_QA
+        logger.info(f"⚡ [PaperSearchAgent] 답변 캐시 적중: {latency_ms:.1f}ms (cache_id={cached.cache_id})")
+        return AgentResult(
+            answer=cached.answer,
+            references=[SearchChunk(**chunk) for chunk in payload.get("references", [])],
+            steps=[],
+            metrics={
+                "total_latency_ms": latency_ms,
+                "answer_cache_hit": True,
+                "answer_cache_id": cached.cache_id,
+                "answer_cache_similarity": cached.similarity,
+                "tools_used": 0,
+            },
+            intent=intent,
+            strategy_used=payload.get("strategy_used", []),
+            success=True,
+            errors=[],
+        )
+
     async def analyze_images(self, images: List[str], query: str) -> str:
         """이미지 분석 (VLM 사용)"""
         if not images:
@@ -288,6 +402,7 @@ class PaperSearchAgent:
             logger.error(f"❌ 이미지 분석 실패: {e}")
             return ""
 
+    @staged("query_analysis")
     async def rewrite_query(self, query: str, history: List[Dict[str, str]], image_description: str = "") -> str:
         """
         대화 히스토리 및 이미지 정보를 기반으로 질의 재작성 (Query Rewrite)
@@ -343,6 +458,7 @@ class PaperSearchAgent:
             logger.error(f"❌ Query Rewrite 실패: {e}")
             return query
 
+    @staged("query_analysis")
     async def classify_intent(self, query: str) -> AgentIntent:
         """의도 분류 (LLM 기반 + 룰 기반 백업)"""
         try:
@@ -456,35 +572,49 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
         constraints: AgentConstraints,
         db_session: AsyncSession,
         context: Optional[Dict[str, Any]] = None,
-        attached_document_context: str = ""
+        attached_document_context: str = "",
+        query_plan: Optional[QueryPlan] = None
     ) -> Dict[str, Any]:
-        """선택된 전략을 실행하고 컨텍스트 텍스트를 반환 (Plan-and-Execute Phase 2)"""
+        """
+        선택된 전략을 실행하고 컨텍스트 텍스트를 반환 (Plan-and-Execute Phase 2)
+        
+        query_plan: 요청 단위 질의 계획 - 검색 도구가 임베딩을 다시 만들지 않도록 공유
+        """
         start_time = datetime.utcnow()
         all_chunks: List[SearchChunk] = []
         search_results_by_type: Dict[str, int] = {}
         search_tools = ["vector_search", "keyword_search", "fulltext_search", "internet_search", "multimodal_search"]
         parallel_tasks = []
         parallel_tool_names = []
+        # AsyncSession은 동시 사용 불가 → 병렬 도구마다 풀에서 전용 세션을 빌린다
+        tool_ctx = ToolExecutionContext(session_factory=self.session_factory)
 
         # 🌀 검색 도구 병렬 실행 준비
         for tool_name in strategy:
             if tool_name in search_tools:
                 tool = self.tools.get(tool_name)
                 if tool:
-                    parallel_tasks.append(self._execute_tool(
+                    parallel_tasks.append(self._execute_tool_isolated(
+                        tool_ctx=tool_ctx,
                         tool_name=tool_name,
                         query=query,
-                        db_session=db_session,
                         keywords=keywords,
                         constraints=constraints,
-                        chunks=[],
-                        context=context
+                        context=context,
+                        query_plan=query_plan
                     ))
                     parallel_tool_names.append(tool_name)
 
         if parallel_tasks:
-            logger.info(f"   🚀 검색 도구 병렬 실행: {parallel_tool_names}")
+            logger.info(
+                f"   🚀 검색 도구 병렬 실행: {parallel_tool_names} "
+                f"(커넥션 예산 {tool_ctx.max_connections})"
+            )
             results = await asyncio.gather(*parallel_tasks, return_exceptions=True)
+            logger.info(
+                f"   ⏱️ 병렬 검색 {tool_ctx.critical_path_ms:.1f}ms "
+                f"(도구별: {', '.join(f'{k}={v:.0f}ms' for k, v in tool_ctx.latencies_ms.items())})"
+            )
 
             for tool_name, result in zip(parallel_tool_names, results):
                 if isinstance(result, Exception):
@@ -515,7 +645,8 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
                     keywords=keywords,
                     constraints=constraints,
                     chunks=[],
-                    context=context
+                    context=context,
+                    query_plan=query_plan
                 )
                 if retry_result.success and hasattr(retry_result, 'data'):
                     new_chunks = retry_result.data
@@ -592,6 +723,9 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
             "chunks_found": len(all_chunks),
             "chunks_used": len(used_chunks),
             "search_results_by_type": search_results_by_type,
+            "parallel_search_latency_ms": tool_ctx.critical_path_ms,
+            "tool_latency_ms": dict(tool_ctx.latencies_ms),
+            "tool_queue_wait_ms": dict(tool_ctx.queue_wait_ms),
             "context_tokens": getattr(context_result, 'total_tokens', 0)
         }
 
@@ -602,22 +736,71 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
             "metrics": metrics
         }
 
+    async def _execute_tool_isolated(
+        self,
+        tool_ctx: ToolExecutionContext,
+        tool_name: str,
+        query: str,
+        keywords: List[str],
+        constraints: AgentConstraints,
+        context: Optional[Dict[str, Any]],
+        query_plan: Optional[QueryPlan] = None
+    ) -> ToolResult:
+        """병렬 실행용 도구 헬퍼 - DB 도구는 커넥션 예산 내에서 전용 세션으로 실행"""
+        start = time.perf_counter()
+        try:
+            if tool_name in self.db_tools:
+                async with tool_ctx.session(tool_name) as session:
+                    result = await self._execute_tool(
+                        tool_name=tool_name,
+                        query=query,
+                        db_session=session,
+                        keywords=keywords,
+                        constraints=constraints,
+                        chunks=[],
+                        context=context,
+                        query_plan=query_plan
+                    )
+            else:
+                result = await self._execute_tool(
+                    tool_name=tool_name,
+                    query=query,
+                    db_session=None,
+                    keywords=keywords,
+                    constraints=constraints,
+                    chunks=[],
+                    context=context,
+                    query_plan=query_plan
+                )
+        finally:
+            tool_ctx.record(tool_name, (time.perf_counter() - start) * 1000)
+        
+        if result.metrics is not None:
+            result.metrics.queue_wait_ms = tool_ctx.queue_wait_ms.get(tool_name)
+        return result
+    
     async def _execute_tool(
         self,
         tool_name: str,
         query: str,
-        db_session: AsyncSession,
+        db_session: Optional[AsyncSession],
         keywords: List[str],
         constraints: AgentConstraints,
         chunks: List[SearchChunk],
-        context: Optional[Dict[str, Any]]
+        context: Optional[Dict[str, Any]],
+        query_plan: Optional[QueryPlan] = None
     ) -> ToolResult:
-        """도구 실행 헬퍼"""
+        """도구 실행 헬퍼 (query_plan 이 같은 질의면 임베딩 재사용)"""
         tool = self.tools[tool_name]
         
         if tool_name == "vector_search":
+            query_embedding = None
+            if query_plan is not None and query_plan.matches(query):
+                embedding = await query_plan.embedding()
+                query_embedding = list(embedding) if embedding else None
             tool_input = {
                 "query": query,
+                "query_embedding": query_embedding,
                 "db_session": db_session,
                 "top_k": constraints.max_chunks,
                 "similarity_threshold": constraints.similarity_threshold,
@@ -690,7 +873,9 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
                 "chunks": chunks,
                 "max_tokens": constraints.max_tokens,
                 "include_metadata": True,
-                "format_style": "citation"
+                "format_style": "citation",
+                "query": query,
+                "query_terms": keywords
             }
             reasoning = "토큰 제한 내에서 컨텍스트 구성"
         
@@ -698,7 +883,9 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
             tool_input = {}
             reasoning = f"{tool_name} 실행"
         
-        result = await tool._arun(**tool_input)
+        with stage(f"tool:{tool_name}") as span:
+            result = await tool._arun(**tool_input)
+            measure(span, result.data)
         
         self._log_step(
             tool_name=tool_name,
@@ -709,8 +896,11 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
         
         return result
     
-    async def _extract_keywords(self, query: str) -> List[str]:
-        """키워드 추출"""
+    @staged("query_analysis")
+    async def _extract_keywords(self, query: str, plan: Optional[QueryPlan] = None) -> List[str]:
+        """키워드 추출 (같은 질의의 QueryPlan 이 있으면 그 결과를 사용)"""
+        if plan is not None and plan.matches(query):
+            return list(await plan.keywords())
         try:
             analysis = await self.nlp_service.analyze_text_for_search(query)
             return analysis.get("keywords", [])
@@ -718,6 +908,7 @@ Return ONLY the category name (e.g., FACTUAL_QA)."""
             logger.warning(f"형태소 분석 실패, 공백 분리 사용: {e}")
             return [w.strip() for w in query.split() if len(w.strip()) >= 2]
     
+    @staged("generate")
     async def generate_answer(
         self,
         query: str,
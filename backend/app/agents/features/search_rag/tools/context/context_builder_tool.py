@@ -19,8 +19,8 @@ class ContextBuilderTool(BaseTool):
     컨텍스트 빌더 도구
     
     책임:
-    - 청크를 토큰 제한 내에서 패킹
-    - 우선순위 기반 청크 선택
+    - 청크를 토큰 제한 내에서 패킹 (LLM 토크나이저 기준)
+    - 토큰당 관련도 기반 청크 선택 / 중복 감점 / 관련 문장 축약
     - 포맷팅 (citation 포함)
     
     책임 없음:
@@ -30,19 +30,24 @@ class ContextBuilderTool(BaseTool):
     name: str = "context_builder"
     description: str = """검색된 청크들을 LLM 컨텍스트로 구성합니다. 
 토큰 제한을 고려하여 우선순위 기반으로 청크를 선택하고 포맷팅합니다."""
-    version: str = "1.0.0"
+    version: str = "1.1.0"
     
     def _estimate_tokens(self, text: str) -> int:
-        """
-        간단한 토큰 추정 (실제 토크나이저 대신)
-        한글: 1.5글자당 1토큰, 영어: 4글자당 1토큰
-        """
-        korean_chars = len([c for c in text if '\uac00' <= c <= '\ud7a3'])
-        other_chars = len(text) - korean_chars
-        
-        tokens = int(korean_chars / 1.5) + int(other_chars / 4)
-        return max(tokens, len(text) // 4)  # 최소 보장
-    
+        """LLM 토크나이저 기준 토큰 수"""
+        from app.services.chat.context_packer import token_counter
+        return token_counter.count(text)
+
+    def _format_chunk(self, index: int, chunk: SearchChunk, content: str, format_style: str, include_metadata: bool) -> str:
+        if format_style == "citation":
+            chunk_text = f"[{index}] {content}"
+            if include_metadata:
+                source = chunk.metadata.get("file_name", "Unknown")
+                chunk_text += f"\n(출처: {source})"
+            return chunk_text
+        if format_style == "numbered":
+            return f"{index}. {content}"
+        return content
+
     async def _arun(
         self,
         chunks: List[SearchChunk],
@@ -50,6 +55,8 @@ class ContextBuilderTool(BaseTool):
         include_metadata: bool = True,
         format_style: str = "citation",
         priority_by: str = "similarity",
+        query: str = "",
+        query_terms: Optional[List[str]] = None,
         **kwargs
     ) -> ContextResult:
         """
@@ -61,7 +68,11 @@ class ContextBuilderTool(BaseTool):
             include_metadata: 메타데이터 포함 여부
             format_style: 포맷 스타일 (citation/plain/numbered)
             priority_by: 우선순위 기준 (similarity/position/hybrid)
+            query / query_terms: 긴 청크를 관련 문장으로 축약할 때 사용하는 질의 단어
         """
+        from app.services.chat.context_packer import PackCandidate, context_packer
+        from app.services.chat.context_packer import query_terms as build_query_terms
+
         start_time = datetime.utcnow()
         trace_id = str(uuid.uuid4())
         
@@ -83,58 +94,50 @@ class ContextBuilderTool(BaseTool):
             
             logger.info(f"🔧 [ContextBuilder] 입력: {len(chunks)}개, max_tokens={max_tokens}")
             
-            # 1) 우선순위 정렬
-            if priority_by == "similarity":
-                sorted_chunks = sorted(chunks, key=lambda x: x.similarity_score, reverse=True)
-            elif priority_by == "position":
-                sorted_chunks = sorted(chunks, key=lambda x: x.metadata.get("chunk_index", 999))
-            else:  # hybrid
-                sorted_chunks = sorted(
-                    chunks,
-                    key=lambda x: (x.similarity_score * 0.7 + (1.0 - x.metadata.get("chunk_index", 0) / 1000) * 0.3),
-                    reverse=True
-                )
-            
-            # 2) 토큰 제한 내에서 패킹
-            context_parts = []
-            used_chunks = []
-            total_tokens = 0
-            truncated_count = 0
-            
-            # 헤더 토큰 예약 (약 100 토큰)
-            reserved_tokens = 100
-            available_tokens = max_tokens - reserved_tokens
-            
-            for i, chunk in enumerate(sorted_chunks):
-                # 포맷팅
-                if format_style == "citation":
-                    chunk_text = f"[{i+1}] {chunk.content}"
-                    if include_metadata:
-                        source = chunk.metadata.get("file_name", "Unknown")
-                        chunk_text += f"\n(출처: {source})"
-                elif format_style == "numbered":
-                    chunk_text = f"{i+1}. {chunk.content}"
-                else:  # plain
-                    chunk_text = chunk.content
-                
-                chunk_tokens = self._estimate_tokens(chunk_text)
-                
-                if total_tokens + chunk_tokens <= available_tokens:
-                    context_parts.append(chunk_text)
-                    used_chunks.append(chunk)
-                    total_tokens += chunk_tokens
-                else:
-                    truncated_count += 1
-                    logger.debug(f"   - 토큰 제한으로 청크 {i+1} 생략")
-            
-            # 3) 최종 컨텍스트 구성
-            if format_style == "citation":
-                context_text = "## 참고 문서\n\n" + "\n\n".join(context_parts)
-            else:
-                context_text = "\n\n".join(context_parts)
-            
+            # 1) 우선순위 점수
+            if priority_by == "position":
+                scores = [1.0 / (1 + x.metadata.get("chunk_index", 999)) for x in chunks]
+            elif priority_by == "hybrid":
+                scores = [
+                    x.similarity_score * 0.7 + (1.0 - x.metadata.get("chunk_index", 0) / 1000) * 0.3
+                    for x in chunks
+                ]
+            else:  # similarity
+                scores = [x.similarity_score for x in chunks]
+
+            # 2) 토큰 예산 내 패킹 (토큰당 관련도 + 중복 감점 + 관련 문장 축약)
+            header = "## 참고 문서\n\n" if format_style == "citation" else ""
+            available_tokens = max_tokens - context_packer.counter.count(header)
+            candidates = []
+            for chunk, score in zip(chunks, scores):
+                # 본문 외 번호/출처/구분자 토큰
+                wrapper = self._format_chunk(len(chunks), chunk, "", format_style, include_metadata) + "\n\n"
+                candidates.append(PackCandidate(
+                    key=chunk.chunk_id,
+                    text=chunk.content,
+                    score=score,
+                    overhead_tokens=context_packer.counter.count(wrapper),
+                    payload=chunk,
+                ))
+            packed = context_packer.pack(
+                candidates,
+                budget=available_tokens,
+                query_terms=build_query_terms(query, query_terms),
+                min_relative_score=0.0 if priority_by == "position" else None,
+                source="agent",
+            )
+
+            # 3) 최종 컨텍스트 구성 (번호는 포함된 청크 순서 = used_chunks 순서)
+            used_chunks = [item.candidate.payload for item in packed.chunks]
+            context_parts = [
+                self._format_chunk(i, item.candidate.payload, item.text, format_style, include_metadata)
+                for i, item in enumerate(packed.chunks, 1)
+            ]
+            context_text = header + "\n\n".join(context_parts)
+            truncated_count = packed.dropped + packed.trimmed
+
             # 4) 최종 토큰 계산
-            final_tokens = self._estimate_tokens(context_text)
+            final_tokens = context_packer.counter.count(context_text)
             
             latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
             
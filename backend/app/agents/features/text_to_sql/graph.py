@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, Optional, Sequence
 
 from langchain_core.messages import AIMessage, BaseMessage
 from loguru import logger
@@ -21,10 +21,17 @@ from .tools import (
 )
 
 
+_STORE: Optional[TextToSqlStore] = None
+
+
 def _default_store() -> TextToSqlStore:
     # Keep store outside repo root; aligns with other local caches.
-    path = Path("/tmp") / "abekm" / "text_to_sql" / "text_to_sql_store.sqlite3"
-    return TextToSqlStore(TextToSqlStoreConfig(path=path))
+    # Process-wide instance so the store's single SQLite connection is reused.
+    global _STORE
+    if _STORE is None:
+        path = Path("/tmp") / "abekm" / "text_to_sql" / "text_to_sql_store.sqlite3"
+        _STORE = TextToSqlStore(TextToSqlStoreConfig(path=path))
+    return _STORE
 
 
 def _format_result_as_markdown(columns, rows, *, max_preview_rows: int = 20) -> str:
@@ -101,14 +108,7 @@ async def _bootstrap_schema_cache(
     if not schema_rows:
         try:
             tables = await introspect_public_schema_tables(session)
-            for t in tables:
-                await store.upsert_table_schema(
-                    connection_id=connection_id,
-                    schema_name=t["schema_name"],
-                    table_name=t["table_name"],
-                    columns=t["columns"],
-                    table_comment=t.get("table_comment"),
-                )
+            await store.upsert_table_schemas(connection_id=connection_id, tables=tables)
             logger.info(f"✅ Bootstrapped schema cache with {len(tables)} tables")
         except Exception as e:
             logger.warning(f"⚠️ Schema bootstrap failed: {e}")
@@ -246,8 +246,9 @@ async def text_to_sql_worker_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
         # === ReAct Phase 7: Action - Execute SQL ===
         logger.info("⚡ Action 6: Executing SQL...")
-        execute_tool = ExecuteSQLTool(session=session)
-        execution_result = await execute_tool._arun(sql_query=validated_sql)
+        # 생성 SQL은 앱 세션이 아닌 읽기 전용 전용 풀에서 실행
+        execute_tool = ExecuteSQLTool()
+        execution_result = await execute_tool._arun(sql_query=validated_sql, max_rows=100)
         logger.info(f"📊 Observation 6: Execution completed")
 
         if "❌" in execution_result:
@@ -1,23 +1,205 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
 
+from loguru import logger
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 
-async def execute_sql(session, *, sql: str) -> Tuple[List[str], List[Dict[str, Any]]]:
-    """Execute SQL via an AsyncSession and return (columns, rows-as-dicts)."""
+from .sql_guard import SqlGuardError
 
-    result = await session.execute(text(sql))
 
-    # Use mappings() for dict-like rows when possible.
-    try:
-        mappings = result.mappings().all()
-        rows = [dict(r) for r in mappings]
-        columns = list(rows[0].keys()) if rows else []
-        return columns, rows
-    except Exception:
-        raw = result.all()
-        columns = list(result.keys()) if getattr(result, "keys", None) else []
-        rows = [dict(zip(columns, r)) for r in raw] if columns else []
-        return columns, rows
+class SqlCostLimitError(SqlGuardError):
+    """EXPLAIN 추정 비용/행 수가 상한을 넘어 실행을 거부한 경우."""
+
+
+@dataclass(frozen=True)
+class PlanEstimate:
+    """``EXPLAIN (FORMAT JSON)`` 최상위 노드의 추정치."""
+
+    total_cost: float
+    plan_rows: int
+    node_type: str = ""
+
+
+@dataclass
+class ColumnBatch:
+    """Columnar result batch: one array per column instead of one dict per row."""
+
+    columns: List[str]
+    arrays: List[List[Any]]
+
+    @classmethod
+    def from_rows(cls, columns: List[str], rows: Sequence[Sequence[Any]]) -> "ColumnBatch":
+        if not rows:
+            return cls(columns=columns, arrays=[[] for _ in columns])
+        return cls(columns=columns, arrays=[list(col) for col in zip(*rows)])
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.arrays[0]) if self.arrays else 0
+
+    def column(self, name: str) -> List[Any]:
+        return self.arrays[self.columns.index(name)]
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        for i in range(start, stop):
+            yield tuple(arr[i] for arr in self.arrays)
+
+
+@dataclass
+class SqlExecutionResult:
+    """Streamed query result kept as columnar batches.
+
+    Only ``max_rows`` rows are ever fetched from the server-side cursor; rows
+    are materialized as tuples/dicts only for the slice that is previewed,
+    paged or exported.
+    """
+
+    columns: List[str]
+    batches: List[ColumnBatch] = field(default_factory=list)
+    row_count: int = 0
+    truncated: bool = False
+    estimate: Optional[PlanEstimate] = None
+    elapsed_ms: float = 0.0
+
+    def iter_rows(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        remaining = self.row_count - offset if limit is None else limit
+        for batch in self.batches:
+            if remaining <= 0:
+                return
+            if offset >= batch.num_rows:
+                offset -= batch.num_rows
+                continue
+            stop = min(batch.num_rows, offset + remaining)
+            for row in batch.iter_rows(offset, stop):
+                yield row
+            remaining -= stop - offset
+            offset = 0
+
+    def page(self, offset: int, limit: int) -> List[Tuple[Any, ...]]:
+        return list(self.iter_rows(offset, limit))
+
+    def preview(self, limit: int = 10) -> List[Tuple[Any, ...]]:
+        return self.page(0, limit)
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """dict 행 목록 (미리보기/직렬화 등 필요한 범위만 호출)."""
+        return [dict(zip(self.columns, row)) for row in self.iter_rows(0, limit)]
+
+    def write_csv(self, fp: TextIO) -> int:
+        writer = csv.writer(fp)
+        writer.writerow(self.columns)
+        written = 0
+        for row in self.iter_rows():
+            writer.writerow(row)
+            written += 1
+        return written
+
+
+def _parse_explain(raw: Any) -> PlanEstimate:
+    payload = json.loads(raw) if isinstance(raw, str) else raw
+    plan = payload[0]["Plan"]
+    return PlanEstimate(
+        total_cost=float(plan.get("Total Cost", 0.0)),
+        plan_rows=int(plan.get("Plan Rows", 0)),
+        node_type=str(plan.get("Node Type", "")),
+    )
+
+
+class ReadOnlySqlExecutor:
+    """Cost-gated, streaming executor for generated read-only SQL.
+
+    - runs on the dedicated read-only pool (``get_readonly_session_local``),
+      so analytical queries cannot exhaust the application's OLTP pool
+    - ``EXPLAIN (FORMAT JSON)`` estimate is checked before execution
+    - ``SET LOCAL statement_timeout`` bounds each query server-side
+    - rows are pulled from a server-side cursor in ``batch_size`` partitions
+      and stored column-wise, stopping at ``max_rows``; at most ``max_rows + 1``
+      rows are fetched so ``truncated`` is exact even at a partition boundary
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        *,
+        statement_timeout_ms: Optional[int] = None,
+        max_plan_cost: Optional[float] = None,
+        max_plan_rows: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        self.statement_timeout_ms = int(statement_timeout_ms or settings.text_to_sql_statement_timeout_ms)
+        self.max_plan_cost = float(max_plan_cost if max_plan_cost is not None else settings.text_to_sql_max_plan_cost)
+        self.max_plan_rows = int(max_plan_rows if max_plan_rows is not None else settings.text_to_sql_max_plan_rows)
+        self.batch_size = max(1, int(batch_size or settings.text_to_sql_fetch_batch_size))
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_readonly_session_local
+
+            self._session_factory = get_readonly_session_local()
+        return self._session_factory
+
+    async def explain(self, session: AsyncSession, sql: str) -> PlanEstimate:
+        result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+        return _parse_explain(result.scalar())
+
+    def check_estimate(self, estimate: PlanEstimate) -> None:
+        if self.max_plan_cost > 0 and estimate.total_cost > self.max_plan_cost:
+            raise SqlCostLimitError(
+                f"Estimated query cost {estimate.total_cost:,.0f} exceeds limit {self.max_plan_cost:,.0f}"
+            )
+        if self.max_plan_rows > 0 and estimate.plan_rows > self.max_plan_rows:
+            raise SqlCostLimitError(
+                f"Estimated row count {estimate.plan_rows:,} exceeds limit {self.max_plan_rows:,}"
+            )
+
+    async def execute(self, sql: str, *, max_rows: int = 100) -> SqlExecutionResult:
+        started = time.perf_counter()
+        async with self.session_factory() as session:
+            try:
+                await session.execute(text("SET TRANSACTION READ ONLY"))
+                await session.execute(text(f"SET LOCAL statement_timeout = {self.statement_timeout_ms}"))
+
+                estimate = await self.explain(session, sql)
+                self.check_estimate(estimate)
+
+                stream = await session.stream(text(sql))
+                out = SqlExecutionResult(columns=list(stream.keys()), estimate=estimate)
+                try:
+                    while not out.truncated:
+                        room = max_rows - out.row_count
+                        # one row past the remaining room tells whether more rows exist
+                        partition = await stream.fetchmany(min(self.batch_size, room + 1))
+                        if not partition:
+                            break
+                        if len(partition) > room:
+                            partition = partition[:room]
+                            out.truncated = True
+                        if partition:
+                            out.batches.append(ColumnBatch.from_rows(out.columns, partition))
+                            out.row_count += len(partition)
+                finally:
+                    await stream.close()
+            finally:
+                # 읽기 전용 트랜잭션: 커밋 없이 롤백으로 정리 (SET LOCAL 도 함께 해제)
+                await session.rollback()
+
+        out.elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"🧮 [TextToSQL] rows={out.row_count} truncated={out.truncated} "
+            f"est_cost={estimate.total_cost:.0f} est_rows={estimate.plan_rows} {out.elapsed_ms:.0f}ms"
+        )
+        return out
+
+
+readonly_sql_executor = ReadOnlySqlExecutor()
@@ -45,9 +45,9 @@ def validate_read_only_sql(sql: str, *, config: SqlGuardConfig) -> str:
 
     - Enforces SELECT-only
     - Blocks common mutating keywords
-    - Enforces a LIMIT if missing
+    - Enforces a LIMIT if missing, clamps a trailing LIMIT above ``max_rows``
 
-    Returns normalized SQL (possibly with LIMIT appended).
+    Returns normalized SQL (possibly with LIMIT appended or lowered).
     """
 
     normalized = _normalize_sql(sql)
@@ -85,7 +85,14 @@ def validate_read_only_sql(sql: str, *, config: SqlGuardConfig) -> str:
                 raise SqlGuardError(f"Table not allowlisted: {t}")
 
     # Enforce LIMIT
-    if not re.search(r"(?is)\blimit\s+\d+\b", normalized):
-        normalized = f"{normalized} LIMIT {int(config.max_rows)}"
+    max_rows = int(config.max_rows)
+    trailing = re.search(r"(?is)\blimit\s+(\d+)(\s+offset\s+\d+)?\s*$", normalized)
+    if trailing:
+        if int(trailing.group(1)) > max_rows:
+            normalized = (
+                f"{normalized[:trailing.start(1)]}{max_rows}{normalized[trailing.end(1):]}"
+            )
+    elif not re.search(r"(?is)\blimit\s+\d+\b", normalized):
+        normalized = f"{normalized} LIMIT {max_rows}"
 
     return normalized
@@ -1,70 +1,224 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
 import aiosqlite
 
+# PRAGMA user_version 으로 관리하는 로컬 스키마 버전
+_SCHEMA_VERSION = 2
+
+# bm25() 컬럼 가중치: table_name, column_text, table_comment
+_BM25_WEIGHTS = (10.0, 2.0, 5.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
 
 @dataclass(frozen=True)
 class TextToSqlStoreConfig:
     path: Path
 
 
+def _column_text(columns: Sequence[Dict[str, Any]]) -> str:
+    """FTS 색인용 컬럼 이름/주석 텍스트."""
+    parts: List[str] = []
+    for col in columns:
+        name = col.get("name")
+        if name:
+            parts.append(str(name))
+        comment = col.get("comment")
+        if comment:
+            parts.append(str(comment))
+    return " ".join(parts)
+
+
+def _fts_query(keyword: str) -> Optional[str]:
+    """키워드를 FTS5 MATCH 식으로 변환 (토큰별 접두 검색, OR 결합)."""
+    tokens = _TOKEN_RE.findall(keyword.replace("_", " "))
+    if not tokens:
+        return None
+    return " OR ".join(f'"{t}"*' for t in tokens)
+
+
 class TextToSqlStore:
     """SQLite store for schema metadata + query cache.
 
-    This is intentionally lightweight and safe to initialize lazily.
+    A single long-lived WAL-mode connection is opened lazily and reused by
+    every method; the schema (tables, indexes, FTS5 index and its triggers)
+    is created once per store instead of on every call.
+
+    Table search ranks ``schema_metadata_fts`` (table name, column names and
+    comments) with BM25, so lookups stay index-backed with thousands of
+    tables.
     """
 
     def __init__(self, config: TextToSqlStoreConfig):
         self._path = config.path
+        self._db: Optional[aiosqlite.Connection] = None
+        self._open_lock = asyncio.Lock()
+        # 여러 문장으로 된 쓰기 트랜잭션이 같은 커넥션에서 섞이지 않도록 직렬화
+        self._write_lock = asyncio.Lock()
 
     async def init(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        async with aiosqlite.connect(self._path.as_posix()) as db:
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS schema_metadata (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    connection_id TEXT NOT NULL,
-                    schema_name TEXT,
-                    table_name TEXT NOT NULL,
-                    columns_json TEXT NOT NULL,
-                    table_comment TEXT,
-                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+        await self._connection()
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._db is not None:
+            return self._db
+        async with self._open_lock:
+            if self._db is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                db = await aiosqlite.connect(self._path.as_posix())
+                db.row_factory = aiosqlite.Row
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                await db.execute("PRAGMA busy_timeout=5000")
+                await db.execute("PRAGMA temp_store=MEMORY")
+                await self._migrate(db)
+                self._db = db
+        return self._db
+
+    async def _migrate(self, db: aiosqlite.Connection) -> None:
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_metadata (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                connection_id TEXT NOT NULL,
+                schema_name TEXT,
+                table_name TEXT NOT NULL,
+                columns_json TEXT NOT NULL,
+                table_comment TEXT,
+                column_text TEXT,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS query_sql_cache (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    connection_id TEXT NOT NULL,
-                    question_hash TEXT NOT NULL,
-                    question TEXT NOT NULL,
-                    sql_query TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+            """
+        )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS query_sql_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                connection_id TEXT NOT NULL,
+                question_hash TEXT NOT NULL,
+                question TEXT NOT NULL,
+                sql_query TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS connection_configs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    connection_id TEXT NOT NULL UNIQUE,
-                    display_name TEXT,
-                    db_type TEXT,
-                    connection_info_json TEXT,
-                    is_active INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+            """
+        )
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS connection_configs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                connection_id TEXT NOT NULL UNIQUE,
+                display_name TEXT,
+                db_type TEXT,
+                connection_info_json TEXT,
+                is_active INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            await db.commit()
+            """
+        )
+
+        cur = await db.execute("PRAGMA user_version")
+        version = (await cur.fetchone())[0]
+        await cur.close()
+        if version >= _SCHEMA_VERSION:
+            return
+
+        # v1 (인덱스/FTS 없음) → v2 마이그레이션
+        cur = await db.execute("PRAGMA table_info(schema_metadata)")
+        existing_columns = {row[1] for row in await cur.fetchall()}
+        await cur.close()
+        if "column_text" not in existing_columns:
+            await db.execute("ALTER TABLE schema_metadata ADD COLUMN column_text TEXT")
+
+        # 기존 행의 column_text 채우기 (FTS 트리거 생성 전에 수행)
+        cur = await db.execute("SELECT id, columns_json FROM schema_metadata WHERE column_text IS NULL")
+        backfill = [(_column_text(json.loads(r[1] or "[]")), r[0]) for r in await cur.fetchall()]
+        await cur.close()
+        if backfill:
+            await db.executemany("UPDATE schema_metadata SET column_text=? WHERE id=?", backfill)
+
+        # 유니크 인덱스 생성 전 중복 행 정리 (최신 행 유지)
+        await db.execute(
+            """
+            DELETE FROM schema_metadata
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM schema_metadata
+                GROUP BY connection_id, IFNULL(schema_name, ''), table_name
+            )
+            """
+        )
+        await db.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_schema_metadata_table
+            ON schema_metadata (connection_id, IFNULL(schema_name, ''), table_name)
+            """
+        )
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_schema_metadata_conn_table
+            ON schema_metadata (connection_id, table_name)
+            """
+        )
+        await db.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_query_sql_cache_lookup
+            ON query_sql_cache (connection_id, question_hash, id DESC)
+            """
+        )
+
+        # 테이블명/컬럼/주석 FTS5 색인 (external content, 트리거로 동기화)
+        await db.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS schema_metadata_fts USING fts5(
+                table_name, column_text, table_comment,
+                content='schema_metadata', content_rowid='id',
+                tokenize='unicode61'
+            )
+            """
+        )
+        # 트리거 생성 전에 색인된 적 없는 행을 FTS 에 일괄 반영
+        await db.execute("INSERT INTO schema_metadata_fts(schema_metadata_fts) VALUES ('rebuild')")
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS schema_metadata_ai AFTER INSERT ON schema_metadata BEGIN
+                INSERT INTO schema_metadata_fts(rowid, table_name, column_text, table_comment)
+                VALUES (new.id, new.table_name, new.column_text, new.table_comment);
+            END
+            """
+        )
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS schema_metadata_ad AFTER DELETE ON schema_metadata BEGIN
+                INSERT INTO schema_metadata_fts(schema_metadata_fts, rowid, table_name, column_text, table_comment)
+                VALUES ('delete', old.id, old.table_name, old.column_text, old.table_comment);
+            END
+            """
+        )
+        await db.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS schema_metadata_au AFTER UPDATE ON schema_metadata BEGIN
+                INSERT INTO schema_metadata_fts(schema_metadata_fts, rowid, table_name, column_text, table_comment)
+                VALUES ('delete', old.id, old.table_name, old.column_text, old.table_comment);
+                INSERT INTO schema_metadata_fts(rowid, table_name, column_text, table_comment)
+                VALUES (new.id, new.table_name, new.column_text, new.table_comment);
+            END
+            """
+        )
+
+        await db.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+        await db.commit()
 
     async def upsert_table_schema(
         self,
@@ -75,68 +229,133 @@ class TextToSqlStore:
         columns: List[Dict[str, Any]],
         table_comment: Optional[str] = None,
     ) -> None:
-        await self.init()
-        async with aiosqlite.connect(self._path.as_posix()) as db:
-            await db.execute(
-                "DELETE FROM schema_metadata WHERE connection_id=? AND schema_name=? AND table_name=?",
-                (connection_id, schema_name, table_name),
-            )
-            await db.execute(
-                """
-                INSERT INTO schema_metadata (connection_id, schema_name, table_name, columns_json, table_comment)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (connection_id, schema_name, table_name, json.dumps(columns, ensure_ascii=False), table_comment),
+        await self.upsert_table_schemas(
+            connection_id=connection_id,
+            tables=[
+                {
+                    "schema_name": schema_name,
+                    "table_name": table_name,
+                    "columns": columns,
+                    "table_comment": table_comment,
+                }
+            ],
+        )
+
+    async def upsert_table_schemas(self, *, connection_id: str, tables: Iterable[Dict[str, Any]]) -> int:
+        """여러 테이블 스키마를 한 트랜잭션으로 저장 (introspection 결과 dict 목록)."""
+        rows = [
+            (
+                connection_id,
+                t["schema_name"],
+                t["table_name"],
+                json.dumps(t.get("columns") or [], ensure_ascii=False),
+                t.get("table_comment"),
+                _column_text(t.get("columns") or []),
             )
-            await db.commit()
+            for t in tables
+        ]
+        if not rows:
+            return 0
+
+        db = await self._connection()
+        async with self._write_lock:
+            try:
+                await db.executemany(
+                    """
+                    INSERT INTO schema_metadata
+                        (connection_id, schema_name, table_name, columns_json, table_comment, column_text)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (connection_id, IFNULL(schema_name, ''), table_name) DO UPDATE SET
+                        columns_json=excluded.columns_json,
+                        table_comment=excluded.table_comment,
+                        column_text=excluded.column_text,
+                        last_updated=CURRENT_TIMESTAMP
+                    """,
+                    rows,
+                )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return len(rows)
 
     async def search_tables(self, *, connection_id: str, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
-        await self.init()
-        kw = f"%{keyword}%"
-        async with aiosqlite.connect(self._path.as_posix()) as db:
-            db.row_factory = aiosqlite.Row
+        db = await self._connection()
+        match = _fts_query(keyword or "")
+        if match is None:
             cur = await db.execute(
                 """
                 SELECT schema_name, table_name, table_comment
                 FROM schema_metadata
-                WHERE connection_id=? AND (
-                    table_name LIKE ? OR table_comment LIKE ? OR columns_json LIKE ?
-                )
+                WHERE connection_id=?
                 ORDER BY table_name
                 LIMIT ?
                 """,
-                (connection_id, kw, kw, kw, limit),
+                (connection_id, limit),
             )
             rows = await cur.fetchall()
             await cur.close()
             return [dict(r) for r in rows]
 
+        cur = await db.execute(
+            f"""
+            SELECT m.schema_name, m.table_name, m.table_comment,
+                   bm25(schema_metadata_fts, {', '.join(str(w) for w in _BM25_WEIGHTS)}) AS score
+            FROM schema_metadata_fts
+            JOIN schema_metadata m ON m.id = schema_metadata_fts.rowid
+            WHERE schema_metadata_fts MATCH ? AND m.connection_id=?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, connection_id, limit),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        if rows:
+            return [dict(r) for r in rows]
+
+        # 토큰 중간 부분 일치(예: 한글 복합어)는 FTS로 잡히지 않으므로 부분 문자열 검색으로 보완
+        kw = f"%{keyword}%"
+        cur = await db.execute(
+            """
+            SELECT schema_name, table_name, table_comment
+            FROM schema_metadata
+            WHERE connection_id=? AND (
+                table_name LIKE ? OR table_comment LIKE ? OR column_text LIKE ?
+            )
+            ORDER BY table_name
+            LIMIT ?
+            """,
+            (connection_id, kw, kw, kw, limit),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        return [dict(r) for r in rows]
+
     async def get_table_schema(
         self, *, connection_id: str, schema_name: str, table_name: str
     ) -> Optional[Dict[str, Any]]:
-        await self.init()
-        async with aiosqlite.connect(self._path.as_posix()) as db:
-            db.row_factory = aiosqlite.Row
-            cur = await db.execute(
-                """
-                SELECT schema_name, table_name, columns_json, table_comment
-                FROM schema_metadata
-                WHERE connection_id=? AND schema_name=? AND table_name=?
-                """,
-                (connection_id, schema_name, table_name),
-            )
-            row = await cur.fetchone()
-            await cur.close()
-            if not row:
-                return None
-            d = dict(row)
-            d["columns"] = json.loads(d.pop("columns_json"))
-            return d
+        db = await self._connection()
+        cur = await db.execute(
+            """
+            SELECT schema_name, table_name, columns_json, table_comment
+            FROM schema_metadata
+            WHERE connection_id=? AND IFNULL(schema_name, '')=IFNULL(?, '') AND table_name=?
+            """,
+            (connection_id, schema_name, table_name),
+        )
+        row = await cur.fetchone()
+        await cur.close()
+        if not row:
+            return None
+        d = dict(row)
+        d["columns"] = json.loads(d.pop("columns_json"))
+        return d
 
     async def cache_question_sql(self, *, connection_id: str, question: str, sql_query: str) -> None:
-        await self.init()
         question_hash = hashlib.sha256(question.encode("utf-8")).hexdigest()
-        async with aiosqlite.connect(self._path.as_posix()) as db:
+        db = await self._connection()
+        async with self._write_lock:
             await db.execute(
                 """
                 INSERT INTO query_sql_cache (connection_id, question_hash, question, sql_query)
@@ -147,19 +366,18 @@ class TextToSqlStore:
             await db.commit()
 
     async def get_cached_sql(self, *, connection_id: str, question: str) -> Optional[str]:
-        await self.init()
         question_hash = hashlib.sha256(question.encode("utf-8")).hexdigest()
-        async with aiosqlite.connect(self._path.as_posix()) as db:
-            cur = await db.execute(
-                """
-                SELECT sql_query
-                FROM query_sql_cache
-                WHERE connection_id=? AND question_hash=?
-                ORDER BY id DESC
-                LIMIT 1
-                """,
-                (connection_id, question_hash),
-            )
-            row = await cur.fetchone()
-            await cur.close()
-            return row[0] if row else None
+        db = await self._connection()
+        cur = await db.execute(
+            """
+            SELECT sql_query
+            FROM query_sql_cache
+            WHERE connection_id=? AND question_hash=?
+            ORDER BY id DESC
+            LIMIT 1
+            """,
+            (connection_id, question_hash),
+        )
+        row = await cur.fetchone()
+        await cur.close()
+        return row[0] if row else None
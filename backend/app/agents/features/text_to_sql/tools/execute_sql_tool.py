@@ -6,23 +6,25 @@ from typing import Optional
 
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..services.sql_executor import execute_sql
+from ..services.sql_executor import ReadOnlySqlExecutor, SqlCostLimitError, readonly_sql_executor
 
 
 class ExecuteSQLToolInput(BaseModel):
     sql_query: str = Field(..., description="실행할 SQL 쿼리 (검증 완료된 것)")
+    max_rows: int = Field(default=100, description="최대 결과 행 수")
 
 
 class ExecuteSQLTool(BaseTool):
     """검증된 SQL 쿼리를 데이터베이스에서 실행합니다.
-    
+
     제약사항:
-    - 30초 타임아웃
-    - 100행 결과 제한 (LIMIT)
+    - 읽기 전용 전용 커넥션 풀에서 실행 (앱 DB 풀과 분리)
+    - EXPLAIN 추정 비용/행 수 상한 초과 시 실행 거부
+    - 서버측 statement_timeout (기본 30초)
+    - 최대 행 수까지만 스트리밍 조회
     - SELECT 전용
-    
+
     성공 시 결과를 표 형태로 반환합니다.
     """
 
@@ -33,38 +35,42 @@ class ExecuteSQLTool(BaseTool):
     )
     args_schema: type[BaseModel] = ExecuteSQLToolInput
 
-    session: Optional[AsyncSession] = Field(default=None, exclude=True)
+    executor: Optional[ReadOnlySqlExecutor] = Field(default=None, exclude=True)
+    max_preview: int = 10
 
-    def __init__(self, session: AsyncSession, **kwargs):
-        super().__init__(session=session, **kwargs)
+    def __init__(self, executor: Optional[ReadOnlySqlExecutor] = None, **kwargs):
+        super().__init__(executor=executor or readonly_sql_executor, **kwargs)
 
-    async def _arun(self, sql_query: str) -> str:
+    async def _arun(self, sql_query: str, max_rows: int = 100) -> str:
         """비동기 실행 (권장)."""
         try:
-            columns, rows = await execute_sql(self.session, sql=sql_query)
+            result = await self.executor.execute(sql_query, max_rows=max_rows)
 
-            if not rows:
+            if result.row_count == 0:
                 return "✅ 실행 완료 (결과 없음)"
 
             # Format as simple table
-            lines = [f"✅ 실행 완료 ({len(rows)}개 행):\n"]
-            lines.append(" | ".join(columns))
-            lines.append(" | ".join(["---"] * len(columns)))
+            lines = [f"✅ 실행 완료 ({result.row_count}개 행):\n"]
+            lines.append(" | ".join(result.columns))
+            lines.append(" | ".join(["---"] * len(result.columns)))
 
-            max_preview = 10
-            for row in rows[:max_preview]:
-                lines.append(" | ".join(str(row.get(c, "")) for c in columns))
+            for row in result.preview(self.max_preview):
+                lines.append(" | ".join("" if v is None else str(v) for v in row))
 
-            if len(rows) > max_preview:
-                lines.append(f"... (총 {len(rows)}개 행, 처음 {max_preview}개만 표시)")
+            if result.row_count > self.max_preview:
+                lines.append(f"... (총 {result.row_count}개 행, 처음 {self.max_preview}개만 표시)")
+            if result.truncated:
+                lines.append(f"(최대 {max_rows}행까지만 조회됨)")
 
             return "\n".join(lines)
 
+        except SqlCostLimitError as e:
+            return f"❌ SQL 실행 거부 (예상 비용 초과): {e}"
         except Exception as e:
             return f"❌ SQL 실행 실패: {type(e).__name__}: {str(e)}"
 
-    def _run(self, sql_query: str) -> str:
+    def _run(self, sql_query: str, max_rows: int = 100) -> str:
         """동기 실행 (비권장, 호환성용)."""
         import asyncio
 
-        return asyncio.run(self._arun(sql_query))
+        return asyncio.run(self._arun(sql_query, max_rows))
@@ -821,6 +821,34 @@ async def reprocess_document(
         )
 
 
+@router.post("/patents/stats-cube/rebuild", summary="특허 통계 큐브 재계산")
+async def rebuild_patent_stats_cube(
+    current_user: User = Depends(require_admin),
+):
+    """
+    특허 통계 큐브 전체 재계산 요청
+    - 수집 시 증분 반영은 건수를 늘리기만 하므로 삭제/수정된 서지정보는 재계산으로 반영
+    - Celery 워커가 백그라운드로 처리 (주기 작업: PATENT_STATS_CUBE_REBUILD_HOURS)
+    """
+    from app.tasks.patent_collection_tasks import rebuild_patent_stats_cube as rebuild_task
+
+    try:
+        task = rebuild_task.delay()
+    except Exception as e:
+        logger.error(f"특허 통계 큐브 재계산 요청 실패: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"재계산 요청 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    logger.info(f"✅ 특허 통계 큐브 재계산 요청: task_id={task.id}, user={current_user.emp_no}")
+    return {
+        "success": True,
+        "message": "특허 통계 큐브 재계산이 요청되었습니다",
+        "task_id": task.id,
+    }
+
+
 @router.get("/vector-db/stats", summary="벡터 DB 통계")
 async def get_vector_db_stats(
     current_user: User = Depends(require_admin),
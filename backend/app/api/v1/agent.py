@@ -8,14 +8,18 @@ Feature flag로 점진적 전환 가능
 - /agent/chat/assets - 첨부파일 업로드
 - /agent/chat/assets/{asset_id} - 첨부파일 다운로드
 - /agent/chat/transcribe - 음성→텍스트 변환
+- /agent/chat/transcribe/jobs - 음성 전사 작업 제출/상태 조회
+- /agent/chat/transcribe/stream - 음성 전사 스트리밍 (SSE)
 - /agent/sessions - 세션 관리
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import json
 import uuid
 import os
 import tempfile
@@ -25,17 +29,19 @@ from botocore.exceptions import ClientError
 from urllib.parse import quote
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, debug_profile_allowed
 from app.core.config import settings
+from app.core.profiling import profile_request
 from app.models import User
 from app.agents.features.search_rag.agent import paper_search_agent
+from app.services.search.query_plan import QueryPlan
 from app.agents.supervisor_agent import supervisor_agent
 from langchain_core.messages import HumanMessage
 from app.core.contracts import AgentConstraints, AgentIntent, AgentResult
 from loguru import logger
 from app.services.document.extraction.text_extractor_service import TextExtractorService
 from app.services.chat.chat_attachment_service import chat_attachment_service
-from app.services.core.audio_transcription_service import audio_transcription_service
+from app.services.core.transcription_job_service import transcription_job_manager
 from pathlib import Path
 
 
@@ -84,6 +90,15 @@ def _should_force_text_to_sql(message: str, tool: Optional[str]) -> bool:
     return contains_sql and contains_action
 
 
+async def _profiled_stream(events: AsyncIterator[str], kind: str, force: bool = False) -> AsyncIterator[str]:
+    """SSE 스트림 전체를 요청 프로파일로 측정 (force 시 마지막에 profile 이벤트 전송)"""
+    with profile_request(kind, force=force) as profile:
+        async for event in events:
+            yield event
+        if force and profile is not None:
+            yield f"event: profile\ndata: {json.dumps(profile.to_dict(), ensure_ascii=False)}\n\n"
+
+
 # Request/Response 모델
 class AgentChatRequest(BaseModel):
     """Agent 기반 채팅 요청"""
@@ -105,6 +120,9 @@ class AgentChatRequest(BaseModel):
     
     # 🆕 도구 강제 선택
     tool: Optional[str] = Field(None, description="강제 선택할 도구 (ppt, web-search 등)")
+    
+    # 🆕 단계별 지연 프로파일 (관리자 또는 설정 허용 시 metrics.profile / profile 이벤트로 반환)
+    debug_profile: bool = Field(False, description="단계별 지연 프로파일 포함")
 
 
 class AgentStepResponse(BaseModel):
@@ -366,15 +384,19 @@ async def agent_chat_v2(
             except Exception as e:
                 logger.warning(f"⚠️ 히스토리 로드 실패: {e}")
 
-        result: AgentResult = await paper_search_agent.execute(
-            query=request.message,
-            db_session=db,
-            constraints=constraints_obj,
-            context=context,
-            history=history,
-            images=request.images or [],
-            attachments=request.attachments or [],
-        )
+        debug_profile = request.debug_profile and debug_profile_allowed(current_user)
+        with profile_request("rag", force=debug_profile) as profile:
+            result: AgentResult = await paper_search_agent.execute(
+                query=request.message,
+                db_session=db,
+                constraints=constraints_obj,
+                context=context,
+                history=history,
+                images=request.images or [],
+                attachments=request.attachments or [],
+            )
+        if debug_profile and profile is not None:
+            result.metrics = {**(result.metrics or {}), "profile": profile.to_dict()}
 
         steps_response: List[AgentStepResponse] = []
         for step in result.steps:
@@ -880,16 +902,22 @@ async def agent_chat_stream(
             # Tool이 명시된 경우, 의도 분류(LLM 의존)를 우회하여 실패 가능성을 낮춘다.
             # - prior-art: 첨부 문서 텍스트에서 키워드 추출
             # - patent: 도구가 자체적으로 분석 수행 (키워드는 참고용)
+            # 요청 단위 질의 계획 - 키워드/임베딩을 한 번만 계산해 검색 도구가 공유
+            query_plan = QueryPlan.build(rewritten_query)
             if is_prior_art_tool:
                 intent = AgentIntent.GENERAL
                 keyword_source = (attached_document_raw_text or attached_document_context or rewritten_query or "")
                 keywords = await paper_search_agent._extract_keywords(keyword_source[:8000])
             elif is_patent_tool:
                 intent = AgentIntent.GENERAL
-                keywords = await paper_search_agent._extract_keywords(rewritten_query)
+                keywords = await paper_search_agent._extract_keywords(rewritten_query, query_plan.prefetch(embedding=False))
             else:
-                intent = await paper_search_agent.classify_intent(rewritten_query)
-                keywords = await paper_search_agent._extract_keywords(rewritten_query)
+                # LLM 의도 분류 ∥ 키워드 분석 + 임베딩
+                query_plan.prefetch()
+                intent, keywords = await asyncio.gather(
+                    paper_search_agent.classify_intent(rewritten_query),
+                    paper_search_agent._extract_keywords(rewritten_query, query_plan),
+                )
 
             # 🆕 PPT 강제 모드 (도구 선택 또는 명시적 질의)
             if _should_force_ppt_generation(request.message, request.tool):
@@ -916,7 +944,8 @@ async def agent_chat_stream(
                         constraints=constraints,
                         db_session=db,
                         context=context,
-                        attached_document_context=attached_document_context
+                        attached_document_context=attached_document_context,
+                        query_plan=query_plan
                     )
                     context_text = retrieval_result.get('context_text', '')
                     
@@ -1130,6 +1159,24 @@ async def agent_chat_stream(
                         # Search
                         all_patents: List[Any] = []
                         search_runs: List[Dict[str, Any]] = []
+
+                        # 수집 DB 임베딩 후보 우선 (충분하면 KIPRIS 검색 생략)
+                        local_run = await prior_art_orchestrator.execute_local_candidates(
+                            attached_document_raw_text or attached_document_context or rewritten_query,
+                            ipc_code=ipc_prefix_for_search,
+                            max_results=50,
+                        )
+                        if local_run.get('returned'):
+                            search_runs.append({
+                                'label': local_run.get('label'),
+                                'query': local_run.get('query'),
+                                'total_found': int(local_run.get('total_found') or 0),
+                                'returned': int(local_run.get('returned') or 0),
+                            })
+                            all_patents.extend(local_run.get('patents') or [])
+                        if int(local_run.get('returned') or 0) >= settings.patent_prior_art_local_min_candidates:
+                            planned_queries = []
+
                         for label, q in planned_queries:
                             yield (
                                 "event: reasoning_step\n"
@@ -1644,7 +1691,8 @@ async def agent_chat_stream(
                                 keywords=keywords,
                                 constraints=constraints,
                                 chunks=all_chunks,
-                                context=context
+                                context=context,
+                                query_plan=query_plan
                             )
                         
                         if not getattr(tool_result, 'success', False):
@@ -1957,7 +2005,11 @@ async def agent_chat_stream(
             yield f"event: error\ndata: {json.dumps({'error': error_text}, ensure_ascii=False)}\n\n"
     
     return StreamingResponse(
-        event_generator(),
+        _profiled_stream(
+            event_generator(),
+            "rag_stream",
+            force=request.debug_profile and debug_profile_allowed(current_user),
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -2220,6 +2272,35 @@ async def download_agent_chat_asset(
 # 🎤 음성 변환 엔드포인트 (chat.py에서 통합)
 # =============================================================================
 
+async def _save_transcription_upload(file: UploadFile) -> Path:
+    """업로드 오디오를 임시 파일로 저장 (전사 작업이 소유 후 삭제)"""
+    suffix = Path(file.filename or "audio.webm").suffix or ".webm"
+    temp_fd, temp_path_str = tempfile.mkstemp(suffix=suffix)
+    os.close(temp_fd)
+    temp_path = Path(temp_path_str)
+    try:
+        async with aiofiles.open(temp_path, "wb") as out_file:
+            while True:
+                chunk = await file.read(1024 * 1024)
+                if not chunk:
+                    break
+                await out_file.write(chunk)
+    except Exception:
+        temp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        try:
+            await file.close()
+        except Exception:
+            pass
+    return temp_path
+
+
+def _ensure_transcription_enabled() -> None:
+    if not transcription_job_manager.enabled:
+        raise HTTPException(status_code=503, detail="오디오 전사 기능이 비활성화되어 있습니다.")
+
+
 @router.post("/agent/chat/transcribe")
 async def transcribe_agent_chat_audio(
     file: UploadFile = File(...),
@@ -2228,6 +2309,9 @@ async def transcribe_agent_chat_audio(
 ):
     """음성 파일을 텍스트로 변환 (AWS Transcribe)
     
+    작업을 제출하고 완료를 기다린다. 대기는 공용 폴러의 완료 이벤트로 처리되어
+    요청마다 스레드를 점유하지 않는다. 긴 오디오는 /agent/chat/transcribe/jobs 사용.
+    
     Args:
         file: 오디오 파일 (webm, mp3, wav, m4a 등)
         language: 언어 코드 (ko-KR, en-US, ja-JP, zh-CN 등)
@@ -2236,53 +2320,123 @@ async def transcribe_agent_chat_audio(
     Returns:
         {"success": true, "transcript": "변환된 텍스트"}
     """
-    if not audio_transcription_service.enabled:
-        raise HTTPException(status_code=503, detail="오디오 전사 기능이 비활성화되어 있습니다.")
-
-    suffix = Path(file.filename or "audio.webm").suffix or ".webm"
-    temp_fd, temp_path_str = tempfile.mkstemp(suffix=suffix)
-    os.close(temp_fd)
-    temp_path = Path(temp_path_str)
+    _ensure_transcription_enabled()
 
     try:
-        # 파일 저장
-        async with aiofiles.open(temp_path, "wb") as out_file:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                await out_file.write(chunk)
-
+        temp_path = await _save_transcription_upload(file)
         logger.info(
-            "🎤 [AGENT-TRANSCRIBE] 변환 요청 - user: %s, file: %s, size: %d bytes, language: %s",
+            "🎤 [AGENT-TRANSCRIBE] 변환 요청 - user: {}, file: {}, size: {} bytes, language: {}",
             current_user.username,
             file.filename,
             temp_path.stat().st_size,
             language
         )
 
-        # AWS Transcribe 변환 (동기 → 비동기 래핑)
-        transcript = await asyncio.to_thread(
-            audio_transcription_service.transcribe, 
-            temp_path,
-            language
-        )
+        job = await transcription_job_manager.submit(temp_path, language, owner=current_user.emp_no)
+        await transcription_job_manager.wait(job, timeout=transcription_job_manager.job_timeout + 30)
+        if job.error:
+            raise RuntimeError(job.error)
         
         logger.info(
-            "✅ [AGENT-TRANSCRIBE] 변환 완료 - user: %s, text_length: %d",
+            "✅ [AGENT-TRANSCRIBE] 변환 완료 - user: {}, text_length: {}",
             current_user.username,
-            len(transcript)
+            len(job.transcript or "")
         )
         
-        return {"success": True, "transcript": transcript}
+        return {"success": True, "transcript": job.transcript or ""}
         
     except Exception as exc:
-        logger.error(f"❌ [AGENT-TRANSCRIBE] 변환 실패: {exc}", exc_info=True)
+        logger.opt(exception=exc).error("❌ [AGENT-TRANSCRIBE] 변환 실패: {}", exc)
         raise HTTPException(status_code=500, detail="음성 텍스트 변환 중 오류가 발생했습니다.")
-    finally:
+
+
+@router.post("/agent/chat/transcribe/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_transcription_job(
+    file: UploadFile = File(...),
+    language: str = Form("ko-KR"),
+    current_user: User = Depends(get_current_user)
+):
+    """음성 전사 작업 제출 (즉시 반환, 결과는 상태 조회로 확인)"""
+    _ensure_transcription_enabled()
+
+    temp_path = await _save_transcription_upload(file)
+    job = await transcription_job_manager.submit(temp_path, language, owner=current_user.emp_no)
+    if job.error:
+        raise HTTPException(status_code=500, detail="음성 전사 작업 제출에 실패했습니다.")
+    return {"success": True, **job.to_dict()}
+
+
+@router.get("/agent/chat/transcribe/jobs/{job_id}")
+async def get_transcription_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """음성 전사 작업 상태/결과 조회"""
+    job = transcription_job_manager.get(job_id, owner=current_user.emp_no)
+    if job is None:
+        raise HTTPException(status_code=404, detail="전사 작업을 찾을 수 없습니다.")
+    return {"success": True, **job.to_dict()}
+
+
+@router.post("/agent/chat/transcribe/stream")
+async def stream_transcription(
+    file: UploadFile = File(...),
+    language: str = Form("ko-KR"),
+    sample_rate: int = Form(16000),
+    current_user: User = Depends(get_current_user)
+):
+    """음성 전사 스트리밍 (SSE)
+    
+    스트리밍 SDK 가 지원하는 형식(wav/pcm, flac, ogg-opus)은 부분 결과를 바로 전송하고,
+    그 외 형식은 배치 작업 완료 후 최종 결과만 전송한다.
+    
+    이벤트: transcript {text, is_partial} → done {transcript} | error {error}
+    """
+    import json
+
+    _ensure_transcription_enabled()
+    temp_path = await _save_transcription_upload(file)
+    handed_to_job = False
+
+    def discard_upload() -> None:
+        # 배치 작업에 넘긴 파일은 작업이 종료 시 삭제, 그 외에는 응답 종료 시 삭제
+        # (클라이언트 연결 종료로 생성기가 시작/완료되지 못한 경우도 응답 background 에서 정리)
+        if not handed_to_job:
+            temp_path.unlink(missing_ok=True)
+
+    async def event_generator():
+        nonlocal handed_to_job
         try:
-            await file.close()
-        except Exception:
-            pass
-        temp_path.unlink(missing_ok=True)
+            if transcription_job_manager.supports_streaming(temp_path):
+                finals: List[str] = []
+                async for event in transcription_job_manager.stream(temp_path, language, sample_rate):
+                    if not event["is_partial"]:
+                        finals.append(event["text"])
+                    yield f"event: transcript\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                transcript = " ".join(t for t in finals if t)
+            else:
+                handed_to_job = True
+                job = await transcription_job_manager.submit(temp_path, language, owner=current_user.emp_no)
+                await transcription_job_manager.wait(job, timeout=transcription_job_manager.job_timeout + 30)
+                if job.error:
+                    raise RuntimeError(job.error)
+                transcript = job.transcript or ""
+                yield f"event: transcript\ndata: {json.dumps({'text': transcript, 'is_partial': False}, ensure_ascii=False)}\n\n"
+
+            yield f"event: done\ndata: {json.dumps({'success': True, 'transcript': transcript}, ensure_ascii=False)}\n\n"
+        except Exception as exc:
+            logger.opt(exception=exc).error("❌ [AGENT-TRANSCRIBE] 스트리밍 변환 실패: {}", exc)
+            yield f"event: error\ndata: {json.dumps({'error': '음성 텍스트 변환 중 오류가 발생했습니다.'}, ensure_ascii=False)}\n\n"
+        finally:
+            discard_upload()
 
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        },
+        background=BackgroundTask(discard_upload),
+    )
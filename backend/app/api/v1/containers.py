@@ -3,7 +3,7 @@
 컨테이너별 파일 업로드, 조회, 삭제, 검색 기능
 """
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
 from typing import List, Dict, Any, Optional
@@ -13,6 +13,7 @@ import logging
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.services.auth.permission_service import PermissionService
+from app.services.auth.container_tree_service import container_tree_service
 from app.models import User
 
 logger = logging.getLogger(__name__)
@@ -66,6 +67,27 @@ def _role_display_name(role_id: str) -> str:
     normalized = (role_id or "").upper()
     return ROLE_LABELS.get(normalized, normalized.title())
 
+def _tree_permission_level(role_id: Optional[str]) -> str:
+    """role_id → 트리 표시용 권한 레벨 (OWNER/EDITOR/VIEWER/NONE)"""
+    if not role_id:
+        return 'NONE'
+    if role_id in ['OWNER', 'ADMIN', 'MANAGER']:
+        return 'OWNER'
+    if role_id in ['EDITOR', 'CONTRIBUTOR', 'WRITER', 'MEMBER_DEPT', 'MEMBER_DIVISION']:
+        return 'EDITOR'
+    return 'VIEWER'
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """If-None-Match 가 현재 스냅샷 ETag 와 같으면 304 응답, 아니면 ETag 헤더만 설정"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match") or ""
+    if if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
 # Request/Response 모델들
 class ContainerResponse(BaseModel):
     container_id: str
@@ -149,98 +171,35 @@ class FullContainerTreeResponse(BaseModel):
 # === 전체 컨테이너 트리 조회 (권한 정보 포함) ===
 @router.get("/full-hierarchy", response_model=FullContainerTreeResponse)
 async def get_full_container_hierarchy(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
 ):
     """
     전체 조직 컨테이너 트리를 조회하고 각 노드에 사용자 권한 정보 포함
     - 모든 활성 컨테이너를 트리 구조로 반환
     - 각 노드에 사용자의 접근 권한 레벨 포함 (OWNER/EDITOR/VIEWER/NONE)
+    - 컨테이너 트리 스냅샷 기반 (문서 수 포함, ETag/304 지원)
     """
     try:
-        from app.models import TbKnowledgeContainers as Container
-        from app.models import TbUserPermissions, TbFileBssInfo
-        
-        # 1. 모든 활성 컨테이너 조회
-        containers_query = select(Container).where(
-            Container.is_active == True
-        ).order_by(Container.org_level, Container.container_name)
-        
-        result = await db.execute(containers_query)
-        all_containers = result.scalars().all()
-        
-        # 2. 사용자 권한 조회
-        permissions_query = select(TbUserPermissions).where(
-            and_(
-                TbUserPermissions.user_emp_no == current_user.emp_no,
-                TbUserPermissions.is_active == True
-            )
-        )
-        
-        perm_result = await db.execute(permissions_query)
-        user_permissions = perm_result.scalars().all()
-        
-        # 권한 매핑 (container_id -> role_id)
-        permission_map = {
-            perm.container_id: perm.role_id 
-            for perm in user_permissions
-        }
-        
-        # 3. 트리 구조 생성
-        container_map = {}
-        hierarchy = []
-        
-        for container in all_containers:
-            # 🔢 실제 문서 개수 조회 (del_yn != 'Y' AND processing_status != 'failed')
-            doc_count_query = select(func.count(TbFileBssInfo.file_bss_info_sno)).where(
-                and_(
-                    TbFileBssInfo.knowledge_container_id == container.container_id,
-                    TbFileBssInfo.del_yn != 'Y',
-                    or_(
-                        TbFileBssInfo.processing_status.is_(None),
-                        TbFileBssInfo.processing_status != 'failed'
-                    )
-                )
-            )
-            doc_count_result = await db.execute(doc_count_query)
-            actual_document_count = doc_count_result.scalar() or 0
-            
-            # 사용자 권한 결정
-            role_id = permission_map.get(container.container_id)
-            
-            # role_id를 권한 레벨로 변환
-            if role_id:
-                if role_id in ['OWNER', 'ADMIN', 'MANAGER']:
-                    permission_level = 'OWNER'
-                elif role_id in ['EDITOR', 'CONTRIBUTOR', 'WRITER', 'MEMBER_DEPT', 'MEMBER_DIVISION']:
-                    permission_level = 'EDITOR'
-                elif role_id in ['VIEWER', 'READER']:
-                    permission_level = 'VIEWER'
-                else:
-                    permission_level = 'VIEWER'
-            else:
-                permission_level = 'NONE'
-            
-            container_data = {
-                'id': container.container_id,
-                'name': container.container_name,
-                'container_type': container.container_type,
-                'description': container.description,
-                'org_level': container.org_level,
-                'org_path': container.org_path,
-                'parent_id': container.parent_container_id,
-                'document_count': actual_document_count,  # 🔢 실제 문서 개수 사용
-                'permission': permission_level,  # OWNER, EDITOR, VIEWER, NONE
-                'children': []
-            }
-            
-            container_map[container.container_id] = container_data
-            
-            # 부모-자식 관계 설정
-            if container.parent_container_id and container.parent_container_id in container_map:
-                container_map[container.parent_container_id]['children'].append(container_data)
-            else:
-                hierarchy.append(container_data)
+        snapshot = await container_tree_service.get_snapshot()
+        etag = snapshot.user_etag(current_user.emp_no, "full-hierarchy")
+        cached = _not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+
+        permission_map = snapshot.user_roles.get(current_user.emp_no, {})
+        hierarchy = snapshot.build_tree(None, lambda node: {
+            'id': node.container_id,
+            'name': node.container_name,
+            'container_type': node.container_type,
+            'description': node.description,
+            'org_level': node.org_level,
+            'org_path': node.org_path,
+            'parent_id': node.parent_container_id,
+            'document_count': snapshot.document_count(node.container_id),  # 🔢 실제 문서 개수 사용
+            'permission': _tree_permission_level(permission_map.get(node.container_id)),  # OWNER, EDITOR, VIEWER, NONE
+        })
         
         return FullContainerTreeResponse(
             success=True,
@@ -258,8 +217,9 @@ async def get_full_container_hierarchy(
 # === 사용자 접근 가능한 컨테이너 ID 목록 ===
 @router.get("/user-accessible", response_model=UserAccessibleContainersResponse)
 async def get_user_accessible_containers(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
 ):
     """
     현재 사용자가 접근 가능한 컨테이너 ID 목록 반환
@@ -267,37 +227,21 @@ async def get_user_accessible_containers(
     - 일반 사용자: 권한이 부여된 컨테이너만
     """
     try:
-        from app.models import TbKnowledgeContainers as Container
-        from app.models import TbUserPermissions
-        
+        snapshot = await container_tree_service.get_snapshot()
+        etag = snapshot.user_etag(current_user.emp_no, "user-accessible", str(bool(current_user.is_admin)))
+        cached = _not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+
         # 시스템 관리자는 모든 컨테이너 접근 가능
         if current_user.is_admin:
-            containers_query = select(Container.container_id).where(
-                Container.is_active == True
-            )
-            result = await db.execute(containers_query)
-            container_ids = [row[0] for row in result.fetchall()]
-            
-            return UserAccessibleContainersResponse(
-                success=True,
-                container_ids=container_ids,
-                total_count=len(container_ids)
-            )
-        
-        # 일반 사용자는 권한이 있는 컨테이너만
-        containers_query = select(Container.container_id).join(
-            TbUserPermissions,
-            Container.container_id == TbUserPermissions.container_id
-        ).where(
-            and_(
-                TbUserPermissions.user_emp_no == current_user.emp_no,
-                Container.is_active == True,
-                TbUserPermissions.is_active == True
-            )
-        ).distinct()
-        
-        result = await db.execute(containers_query)
-        container_ids = [row[0] for row in result.fetchall()]
+            container_ids = list(snapshot.nodes.keys())
+        else:
+            # 일반 사용자는 권한이 있는 컨테이너만
+            container_ids = [
+                cid for cid in snapshot.user_roles.get(current_user.emp_no, {})
+                if cid in snapshot.nodes
+            ]
         
         return UserAccessibleContainersResponse(
             success=True,
@@ -316,78 +260,37 @@ async def get_user_accessible_containers(
 # === 컨테이너 목록 조회 ===
 @router.get("/", response_model=ContainerListResponse)
 async def get_user_containers(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
 ):
     """
     사용자가 접근 가능한 지식 컨테이너 목록 조회
     시스템 관리자(is_admin=True)는 모든 컨테이너에 접근 가능
     """
     try:
-        from app.models import TbKnowledgeContainers as Container
-        from app.models import TbUserPermissions
-        
-        # 시스템 관리자는 모든 컨테이너 조회
+        snapshot = await container_tree_service.get_snapshot()
+        etag = snapshot.user_etag(current_user.emp_no, "list", str(bool(current_user.is_admin)))
+        cached = _not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+
+        # 시스템 관리자는 모든 컨테이너, 일반 사용자는 직접 권한이 있는 컨테이너만
         if current_user.is_admin:
-            containers_query = select(Container).where(
-                Container.is_active == True
-            ).order_by(Container.org_level, Container.container_name)
-            
-            result = await db.execute(containers_query)
-            containers = result.scalars().all()
-            
-            container_list = []
-            for container in containers:
-                container_list.append(ContainerResponse(
-                    container_id=container.container_id,
-                    container_name=container.container_name,
-                    description=container.description,
-                    access_level=container.access_level,
-                    document_count=container.document_count or 0
-                ))
-            
-            return ContainerListResponse(
-                success=True,
-                containers=container_list,
-                total_count=len(container_list)
-            )
-        
-        # 일반 사용자는 권한이 있는 컨테이너만 조회
-        containers_query = select(Container).join(
-            TbUserPermissions,
-            Container.container_id == TbUserPermissions.container_id
-        ).where(
-            and_(
-                TbUserPermissions.user_emp_no == current_user.emp_no,
-                Container.is_active == True,
-                TbUserPermissions.is_active == True
-            )
-        ).order_by(Container.org_level, Container.container_name)
-        
-        result = await db.execute(containers_query)
-        containers = result.scalars().all()
-        
-        # 각 컨테이너별 권한 확인
-        container_list = []
-        for container in containers:
-            # 권한 조회
-            permission_query = select(TbUserPermissions).where(
-                and_(
-                    TbUserPermissions.user_emp_no == current_user.emp_no,
-                    TbUserPermissions.container_id == container.container_id
-                )
+            container_ids = snapshot.ordered_ids()
+        else:
+            container_ids = snapshot.ordered_ids(snapshot.user_roles.get(current_user.emp_no, {}))
+
+        container_list = [
+            ContainerResponse(
+                container_id=node.container_id,
+                container_name=node.container_name,
+                description=node.description,
+                access_level=node.access_level or 'internal',
+                document_count=snapshot.document_count(node.container_id)
             )
-            permission_result = await db.execute(permission_query)
-            permission = permission_result.scalar_one_or_none()
-            
-            if permission:
-                container_list.append(ContainerResponse(
-                    container_id=container.container_id,
-                    container_name=container.container_name,
-                    description=container.description,
-                    access_level=container.access_level,
-                    document_count=container.document_count or 0
-                ))
+            for node in (snapshot.nodes[cid] for cid in container_ids)
+        ]
         
         return ContainerListResponse(
             success=True,
@@ -422,6 +325,8 @@ class ContainerTreeResponse(BaseModel):
 
 @router.get("/hierarchy", response_model=ContainerTreeResponse)
 async def get_container_hierarchy(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -432,6 +337,12 @@ async def get_container_hierarchy(
     try:
         from app.services.auth.container_service import ContainerService
         
+        snapshot = await container_tree_service.get_snapshot()
+        etag = snapshot.user_etag(current_user.emp_no, "hierarchy", str(bool(current_user.is_admin)))
+        cached = _not_modified(request, response, etag)
+        if cached is not None:
+            return cached
+        
         service = ContainerService(db)
         hierarchy = await service.get_container_hierarchy(current_user.emp_no)
         
@@ -624,6 +535,7 @@ async def create_container(
             )
         
         await db.commit()
+        container_tree_service.invalidate()
         
         return ContainerCreateResponse(
             success=True,
@@ -727,6 +639,7 @@ async def update_container(
             
             await db.execute(stmt)
             await db.commit()
+            container_tree_service.invalidate()
         
         return ContainerUpdateResponse(
             success=True,
@@ -1119,6 +1032,7 @@ async def delete_container(
         
         await db.execute(stmt)
         await db.commit()
+        container_tree_service.invalidate()
         
         return ContainerDeleteResponse(
             success=True,
@@ -1264,6 +1178,7 @@ async def create_user_container(
         db.add(system_admin_permission)
         
         await db.commit()
+        container_tree_service.invalidate()
         
         logger.info(f"사용자 컨테이너 생성 완료: {container_id} by {current_user.emp_no}")
         logger.info(f"기본 권한 부여: OWNER({current_user.emp_no}), ADMIN(ADMIN001)")
@@ -1369,6 +1284,7 @@ async def delete_user_container(
         
         await db.execute(stmt)
         await db.commit()
+        container_tree_service.invalidate()
         
         logger.info(f"사용자 컨테이너 삭제 완료: {container_id} by {current_user.emp_no}")
         
@@ -382,7 +382,6 @@ async def upload_document(
                 remote_upload_error = f"S3 업로드 실패: {str(s3e)}"
         elif storage_backend == 'azure_blob':
             try:
-                from app.services.core.azure_blob_service import get_azure_blob_service
                 container_prefix = container_id.strip('/') if container_id else 'default'
                 basename = os.path.basename(saved_file_path)
                 if getattr(app_settings, 'use_standard_raw_prefix', False) and build_raw_object_key:
@@ -390,8 +389,8 @@ async def upload_document(
                 else:
                     # 레거시 호환 (container/filename)
                     azure_blob_object_key = f"{container_prefix}/{basename}"
-                azure = get_azure_blob_service()
-                azure.upload_file(saved_file_path, azure_blob_object_key, purpose='raw')
+                from app.services.core.object_storage import get_object_storage
+                await get_object_storage('azure_blob').upload_file(saved_file_path, azure_blob_object_key, purpose='raw')
                 scheme = classify_key_scheme(azure_blob_object_key)
                 logger.info(f"🪣 [UPLOAD-DEBUG] Azure Blob 업로드 완료 - 키: {azure_blob_object_key} (scheme={scheme})")
             except Exception as aze:
@@ -1610,7 +1609,8 @@ async def download_document(
                         # 서버에서 임시 파일로 다운로드 후 스트리밍 응답
                         tmp_fd, tmp_path = tempfile.mkstemp(prefix='dl_azure_', suffix=original_path_for_name.suffix or '')
                         _os.close(tmp_fd)
-                        azure_blob.download_blob_to_file(blob_path, tmp_path, purpose=purpose)
+                        from app.services.core.object_storage import get_object_storage
+                        await get_object_storage('azure_blob').download_file(blob_path, tmp_path, purpose=purpose)
 
                         response = FileResponse(
                             path=str(tmp_path),
@@ -2242,25 +2242,11 @@ async def get_chunk_image(
         from app.core.config import settings
         
         async def _download_intermediate_blob(path: str) -> bytes:
-            loop = asyncio.get_running_loop()
-            
-            if settings.storage_backend == "s3":
-                # AWS S3에서 다운로드
-                # path는 이미 "multimodal/23/objects/image_3940_5.png" 형식
-                # S3Service.download_bytes()는 purpose='intermediate'로 prefix 자동 추가
-                from app.services.core.aws_service import S3Service
-                s3_service = S3Service()
-                return await loop.run_in_executor(
-                    None,
-                    lambda: s3_service.download_bytes(path, purpose="intermediate")
-                )
-            else:
-                # Azure Blob에서 다운로드
-                blob_service = get_azure_blob_service()
-                return await loop.run_in_executor(
-                    None,
-                    lambda: blob_service.download_blob_to_bytes(path, purpose="intermediate")
-                )
+            # path는 "multimodal/23/objects/image_3940_5.png" 형식 - purpose='intermediate' 규칙은 백엔드가 적용
+            # (S3: prefix 자동 추가, Azure: intermediate 컨테이너)
+            from app.services.core.object_storage import get_object_storage
+            backend = "s3" if settings.storage_backend == "s3" else "azure_blob"
+            return await get_object_storage(backend).get_bytes(path, purpose="intermediate")
 
         # blob_key가 있으면 직접 사용 (신규 방식)
         if chunk.blob_key:
@@ -52,6 +52,14 @@ async def get_current_user_ws_optional(token: Optional[str]) -> Optional[User]:
         token_data = AuthUtils.verify_token(token)
         logger.debug(f"✅ [STT-AUTH] 토큰 검증 성공 - emp_no: {token_data.emp_no}")
         
+        # HTTP 인증과 같은 인증 주체 캐시 사용
+        from app.services.auth.principal_cache import principal_cache
+        
+        principal = principal_cache.get(token_data.emp_no, token_data.jti)
+        if principal is not None:
+            logger.debug(f"✅ [STT-AUTH] 사용자 인증 완료 (캐시) - user_id: {principal.user_id}")
+            return principal.to_user()
+        
         # 별도 DB 세션 생성하여 사용자 조회 (동기 방식)
         # WebSocket은 비동기이지만, DB 조회는 선택적이므로 동기 세션 사용
         from app.core.database import get_sync_session_local
@@ -61,12 +69,15 @@ async def get_current_user_ws_optional(token: Optional[str]) -> Optional[User]:
         try:
             user = db.query(User).filter(User.emp_no == token_data.emp_no).first()
             
-            if user:
-                logger.info(f"✅ [STT-AUTH] 사용자 인증 완료 - user_id: {user.id}, username: {user.username}")
-            else:
+            if not user:
                 logger.warning(f"⚠️ [STT-AUTH] 사용자 DB 조회 실패 - emp_no: {token_data.emp_no}")
+                return None
+            if not user.is_active:
+                logger.warning(f"🚫 [STT-AUTH] 비활성 계정 - emp_no: {user.emp_no}")
+                return None
             
-            return user
+            logger.info(f"✅ [STT-AUTH] 사용자 인증 완료 - user_id: {user.id}, username: {user.username}")
+            return principal_cache.put(user.emp_no, token_data.jti, user).to_user()
         finally:
             db.close()
         
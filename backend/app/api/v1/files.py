@@ -569,25 +569,23 @@ async def office_to_pdf(
         storage_backend = getattr(settings, 'storage_backend', 'local')
         
         if storage_backend == 's3' and not os.path.exists(file_path):
-            from app.services.core.aws_service import S3Service
+            from app.services.core.object_storage import get_object_storage
             import tempfile
-            s3 = S3Service()
             tmpdir = tempfile.gettempdir()
             # 원래 확장자를 알 수 없으면 파일 논리명에서 유추
             logical_name = file_info.get("file_logical_name", f"file_{file_id}")
             suffix = Path(logical_name).suffix or Path(file_path).suffix
             local_tmp_path = str(Path(tmpdir) / f"{file_id}_source{suffix}")
             try:
-                await s3.download_file(object_key=file_path, local_path=local_tmp_path)
+                await get_object_storage('s3').download_file(file_path, local_tmp_path)
                 file_path = local_tmp_path
             except Exception as e:
                 logger.error(f"S3 원본 다운로드 실패: {e}")
                 raise HTTPException(status_code=500, detail="S3에서 파일을 가져오는 중 오류가 발생했습니다.")
         
         elif storage_backend == 'azure_blob' and not os.path.exists(file_path):
-            from app.services.core.azure_blob_service import get_azure_blob_service
+            from app.services.core.object_storage import get_object_storage
             import tempfile
-            azure_blob = get_azure_blob_service()
             tmpdir = tempfile.gettempdir()
             # 원래 확장자를 알 수 없으면 파일 논리명에서 유추
             logical_name = file_info.get("file_logical_name", f"file_{file_id}")
@@ -595,7 +593,7 @@ async def office_to_pdf(
             local_tmp_path = str(Path(tmpdir) / f"{file_id}_source{suffix}")
             try:
                 logger.info(f"🔄 Azure Blob에서 파일 다운로드: {file_path} → {local_tmp_path}")
-                azure_blob.download_blob_to_file(blob_path=file_path, local_path=local_tmp_path, purpose='raw')
+                await get_object_storage('azure_blob').download_file(file_path, local_tmp_path, purpose='raw')
                 file_path = local_tmp_path
                 logger.info(f"✅ Azure Blob 파일 다운로드 완료: {local_tmp_path}")
             except Exception as e:
@@ -641,12 +639,16 @@ async def office_to_pdf(
             logger.info(f"📁 PDF 캐시 디렉토리: {pdf_cache_dir}")
             logger.info(f"📄 PDF 파일 경로: {pdf_path}")
             
-            # 이미 변환된 PDF가 있는지 확인
-            if not pdf_path.exists():
-                logger.info(f"PDF 변환 시작: {file_path} → {pdf_path}")
+            # 파일 ID 기준 캐시(pdf_path)는 HWP/HWPX 텍스트 PDF 에만 사용한다.
+            # Office 파일은 변환 풀이 원본 내용 해시 기준으로 캐시하고, 캐시 확인/동시 요청 합류를 풀 잠금 안에서 처리한다.
+            is_hwp = file_extension in ['.hwp', '.hwpx']
+            if is_hwp and pdf_path.exists():
+                logger.info(f"캐시된 PDF 사용: {pdf_path}")
+            else:
+                logger.info(f"PDF 변환 시작: {file_path}")
                 
                 # HWP/HWPX는 LibreOffice 호환성 문제로 텍스트 추출 방식 사용
-                if file_extension in ['.hwp', '.hwpx']:
+                if is_hwp:
                     logger.info(f"HWP/HWPX 파일은 텍스트 추출 방식으로 처리: {filename}")
                     from app.services.document.extraction.text_extractor_service import text_extractor_service
                     
@@ -682,108 +684,44 @@ async def office_to_pdf(
                         
                         # HTML을 임시 파일로 저장하고 wkhtmltopdf로 PDF 변환
                         import tempfile, subprocess, shutil
+                        # 임시 파일에 만든 뒤 원자적으로 교체 (동시 요청이 작성 중인 PDF 를 내려주지 않도록)
+                        partial_pdf_path = pdf_path.with_name(f".{pdf_path.name}.{os.getpid()}.{id(extraction_result)}.part")
                         with tempfile.TemporaryDirectory() as tmpdir:
                             html_file = Path(tmpdir) / "hwp_content.html"
                             with open(html_file, 'w', encoding='utf-8') as f:
                                 f.write(html_content)
                             
                             # wkhtmltopdf로 PDF 변환
-                            cmd = ['wkhtmltopdf', '--encoding', 'UTF-8', str(html_file), str(pdf_path)]
+                            cmd = ['wkhtmltopdf', '--encoding', 'UTF-8', str(html_file), str(partial_pdf_path)]
                             logger.info(f"wkhtmltopdf 변환 명령어: {' '.join(cmd)}")
                             
                             result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
                             if result.returncode == 0:
+                                os.replace(partial_pdf_path, pdf_path)
                                 logger.info(f"HWP 텍스트 PDF 변환 성공: {pdf_path}")
                             else:
                                 logger.error(f"wkhtmltopdf 변환 실패: {result.stderr}")
+                                partial_pdf_path.unlink(missing_ok=True)
                                 raise subprocess.CalledProcessError(result.returncode, cmd)
                     else:
                         logger.error(f"HWP 텍스트 추출 실패: {extraction_result.get('error', 'Unknown error')}")
                         raise Exception("HWP 텍스트 추출 실패")
                 else:
-                    # LibreOffice를 사용한 PDF 변환
-                    import subprocess, tempfile
-                    # 임시 디렉토리 생성
-                    with tempfile.TemporaryDirectory() as temp_dir:
-                        try:
-                            # LibreOffice가 실행 중인 인스턴스가 있으면 종료
-                            subprocess.run(["pkill", "-f", "soffice"], capture_output=True)
-                            
-                            # 환경 변수 설정 (한국어 폰트 지원)
-                            env = os.environ.copy()
-                            # 한국어 로케일 설정 (사용 가능한 경우)
-                            env['LC_ALL'] = 'ko_KR.UTF-8'
-                            env['LANG'] = 'ko_KR.UTF-8'
-                            env['LC_CTYPE'] = 'ko_KR.UTF-8'
-                            # HOME 디렉토리 설정 (LibreOffice 프로필 생성용)
-                            env['HOME'] = os.path.expanduser('~')
-                            
-                            # PowerPoint에 특화된 고품질 PDF 변환 명령어
-                            if file_extension in ['.ppt', '.pptx']:
-                                # PowerPoint 최고 품질 변환을 위한 필터 옵션 (폰트 임베딩 활성화)
-                                filter_options = "SelectPdfVersion=1;UseTaggedPDF=true;ExportFormFields=true;FormsType=0;ExportBookmarks=true;ExportHiddenSlides=false;SinglePageSheets=false;ExportNotes=false;ExportNotesPages=false;EmbedStandardFonts=true;UseTransitionEffects=false;IsSkipEmptyPages=true;IsAddStream=false;ExportPlaceholders=false;IsCollectPresentationModes=false;Quality=100;ReduceImageResolution=false;MaxImageResolution=600"
-                                
-                                cmd = [
-                                    "libreoffice",
-                                    "--headless",
-                                    "--invisible",
-                                    "--nodefault",
-                                    "--nolockcheck",
-                                    "--nologo",
-                                    "--norestore",
-                                    "--convert-to", f"pdf:impress_pdf_Export:{filter_options}",
-                                    "--outdir", temp_dir,
-                                    file_path
-                                ]
-                            else:
-                                # Word, Excel 등 - 폰트 임베딩 활성화
-                                # writer_pdf_Export 필터에서 EmbedStandardFonts=true로 폰트 임베딩
-                                filter_options = "EmbedStandardFonts=true;ExportFormFields=true;UseTaggedPDF=true"
-                                cmd = [
-                                    "libreoffice",
-                                    "--headless",
-                                    "--invisible",
-                                    "--nodefault",
-                                    "--nolockcheck",
-                                    "--nologo",
-                                    "--norestore",
-                                    "--convert-to", f"pdf:writer_pdf_Export:{filter_options}",
-                                    "--outdir", temp_dir,
-                                    file_path
-                                ]
-                            logger.info(f"LibreOffice 변환 명령어: {' '.join(cmd)}")
-                            logger.info(f"변환 설정 - 파일 형식: {file_extension}, 품질: 최고, 이미지 해상도: 600DPI, 한국어 지원: 활성화")
-                            
-                            result = subprocess.run(
-                                cmd,
-                                capture_output=True,
-                                text=True,
-                                timeout=300,  # 5분으로 타임아웃 증가
-                                env=env  # 한국어 로케일 환경 변수 적용
-                            )
-                            if result.returncode == 0:
-                                original_filename = Path(file_path).stem
-                                temp_pdf = Path(temp_dir) / f"{original_filename}.pdf"
-                                logger.info(f"🔍 변환된 PDF 찾기: {temp_pdf}")
-                                if temp_pdf.exists():
-                                    import shutil
-                                    shutil.copy2(temp_pdf, pdf_path)
-                                    logger.info(f"PDF 변환 성공: {pdf_path}")
-                                else:
-                                    logger.error(f"변환된 PDF 파일을 찾을 수 없음: {temp_pdf}")
-                                    logger.info(f"임시 디렉토리 내용: {list(Path(temp_dir).iterdir())}")
-                                    raise FileNotFoundError("PDF 변환 실패")
-                            else:
-                                logger.error(f"LibreOffice 변환 실패: {result.stderr}")
-                                raise subprocess.CalledProcessError(result.returncode, cmd)
-                        except subprocess.TimeoutExpired:
-                            logger.error("LibreOffice 변환 타임아웃")
-                            raise HTTPException(status_code=500, detail="PDF 변환 시간 초과")
-                        except subprocess.CalledProcessError as e:
-                            logger.error(f"LibreOffice 변환 오류: {e}")
-                            raise HTTPException(status_code=500, detail="PDF 변환 실패")
-            else:
-                logger.info(f"캐시된 PDF 사용: {pdf_path}")
+                    # 공유 변환 워커 풀 사용 (pkill 없이 병렬 변환, 이벤트 루프 비차단)
+                    # - 같은 내용의 동시 요청은 변환 1회를 공유, 결과는 내용 해시 기준으로 캐시 (uploads/pdf_cache/converted)
+                    from app.services.document.extraction.office_conversion_pool import (
+                        OfficeConversionError,
+                        office_conversion_pool,
+                        pdf_filter_for,
+                    )
+                    try:
+                        pdf_path = await office_conversion_pool.aconvert(
+                            file_path, 'pdf', pdf_filter_for(file_extension)
+                        )
+                        logger.info(f"PDF 변환 성공: {pdf_path}")
+                    except OfficeConversionError as e:
+                        logger.error(f"LibreOffice 변환 오류: {e}")
+                        raise HTTPException(status_code=500, detail="PDF 변환 실패")
             
             # 변환된 PDF 파일 반환
             if pdf_path.exists():
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Q
 from fastapi.responses import StreamingResponse, FileResponse, HTMLResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Any, Dict
+import asyncio
 import json
 import os
 import urllib.parse
@@ -605,16 +606,32 @@ async def get_template_thumbnails(
 
 
 @router.get("/agent/presentation/templates/{template_id}/thumbnails/{slide_index}", summary="슬라이드 썸네일 이미지")
-async def get_slide_thumbnail(template_id: str, slide_index: int):
+async def get_slide_thumbnail(
+    template_id: str,
+    slide_index: int,
+    request: Request,
+    size: str = Query("md", description="썸네일 크기 (sm|md|lg)"),
+):
+    """템플릿 ID 기반 고정 URL - 내용이 바뀔 수 있으므로 ETag 재검증 (장기 캐시는 내용 주소 URL 사용)"""
+    from app.agents.features.presentation.services.template_thumbnail_store import THUMBNAIL_SIZES
+    from app.agents.features.presentation.services.thumbnail_generator import thumbnail_generator
+
+    if size not in THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 썸네일 크기입니다: {size}")
     try:
-        from app.agents.features.presentation.services.thumbnail_generator import thumbnail_generator
-        logger.info(f"슬라이드 썸네일 이미지 요청: {template_id}/{slide_index}")
-        thumbnail_data = thumbnail_generator.get_slide_thumbnail(template_id, slide_index)
-        if thumbnail_data:
-            from fastapi.responses import Response
-            return Response(content=thumbnail_data, media_type="image/png")
-        else:
+        decoded_template_id = urllib.parse.unquote(template_id)
+        digest, thumbnail_path = await asyncio.to_thread(
+            thumbnail_generator.get_slide_thumbnail_path, decoded_template_id, slide_index, size
+        )
+        if not thumbnail_path:
             raise HTTPException(status_code=404, detail="썸네일 이미지를 찾을 수 없습니다")
+
+        etag = f'"{digest}-{slide_index}-{size}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            from fastapi.responses import Response
+            return Response(status_code=304, headers=headers)
+        return FileResponse(thumbnail_path, media_type="image/webp", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
@@ -622,6 +639,24 @@ async def get_slide_thumbnail(template_id: str, slide_index: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/agent/presentation/thumbnails/{digest}/{size}/{slide_index}", summary="슬라이드 썸네일 이미지 (내용 주소)")
+async def get_content_addressed_thumbnail(digest: str, size: str, slide_index: int):
+    """템플릿 내용 다이제스트 기반 URL - 내용이 같으면 이미지도 같으므로 immutable 장기 캐시"""
+    from app.agents.features.presentation.services.template_thumbnail_store import (
+        IMMUTABLE_CACHE_CONTROL,
+        template_thumbnail_store,
+    )
+
+    thumbnail_path = await asyncio.to_thread(template_thumbnail_store.get_path, digest, slide_index, size)
+    if not thumbnail_path:
+        raise HTTPException(status_code=404, detail="썸네일 이미지를 찾을 수 없습니다")
+    return FileResponse(
+        thumbnail_path,
+        media_type="image/webp",
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{digest}-{slide_index}-{size}"'},
+    )
+
+
 @router.post("/agent/presentation/templates/upload", summary="PPT 템플릿 업로드")
 async def upload_presentation_template(
     file: UploadFile = File(...),
@@ -734,7 +769,7 @@ async def get_presentation_template_file(
         path = template_manager.get_template_file_path(decoded_template_id)
         if not path or not os.path.exists(path):
             raise HTTPException(status_code=404, detail="템플릿 파일을 찾을 수 없습니다")
-        pdf_path = template_manager.get_template_pdf_path(decoded_template_id)
+        pdf_path = await asyncio.to_thread(template_manager.get_template_pdf_path, decoded_template_id)
         if not pdf_path or not os.path.exists(pdf_path):
             # 도구 설치 여부 안내
             try:
@@ -1881,6 +1916,7 @@ class GenerateContentRequest(BaseModel):
     container_ids: Optional[List[str]] = None  # 문서 컨테이너 IDs (RAG 검색용)
     use_rag: bool = True  # RAG 검색 활성화 여부
     use_ai_first: bool = True  # 🆕 AI-First 파이프라인 사용 여부 (기본값: True)
+    build_draft: bool = False  # 🆕 슬라이드 완성 순서대로 초안 PPT 빌드 (AI-First 전용)
 
 class SlideElementData(BaseModel):
     id: str
@@ -1906,6 +1942,84 @@ class BuildFromDataRequest(BaseModel):
     content_plan: Optional[Dict[str, Any]] = None  # 🆕 v3.8: 동적 슬라이드
     dynamic_slides: Optional[Dict[str, Any]] = None  # 🆕 v3.8: 동적 슬라이드 (mode, add_slides, remove_slides)
 
+async def _save_generated_content_state(
+    template_id: str,
+    request: GenerateContentRequest,
+    current_user: User,
+    result: Dict[str, Any],
+) -> None:
+    """생성 결과를 wizard 상태로 저장 (build-from-data 후속 호출용)"""
+    from app.agents.features.presentation.ppt_wizard_checkpoint import (
+        ensure_saved as wizard_cp_ensure_saved,
+        is_enabled as wizard_cp_is_enabled,
+        make_thread_id as wizard_cp_make_thread_id,
+    )
+    from app.agents.features.presentation.services.ppt_wizard_store import PPTWizardKey, ppt_wizard_store
+
+    # Phase 2: persist wizard artifacts via LangGraph checkpointer (preferred).
+    if request.session_id and wizard_cp_is_enabled():
+        try:
+            thread_id = wizard_cp_make_thread_id(
+                user_id=str(current_user.id),
+                session_id=request.session_id,
+                template_id=template_id,
+            )
+
+            await wizard_cp_ensure_saved(
+                thread_id=thread_id,
+                state={
+                    "user_id": str(current_user.id),
+                    "session_id": request.session_id,
+                    "template_id": template_id,
+                    "thread_id": thread_id,
+                    "pipeline": result.get("pipeline") or ("ai_first" if request.use_ai_first else "legacy"),
+                    "deck_spec": result.get("deck_spec"),
+                    "slide_matches": result.get("slide_matches"),
+                    "mappings": result.get("mappings"),
+                    # AI-first extras (safe even if None)
+                    "slide_replacements": result.get("slide_replacements"),
+                    "content_plan": result.get("content_plan"),
+                    "dynamic_slides": result.get("dynamic_slides"),
+                    "presentation_title": result.get("presentation_title"),
+                },
+            )
+
+            # Surface the thread_id to the caller (no UX change required; additive field).
+            if isinstance(result, dict):
+                result["thread_id"] = thread_id
+        except Exception as e:
+            logger.warning(f"🧩 LangGraph wizard checkpoint save failed (fallback to Redis): {e}")
+
+    # Optional legacy fallback: persist wizard artifacts for follow-up build-from-data calls.
+    if request.session_id:
+        try:
+            await ppt_wizard_store.save(
+                key=PPTWizardKey(
+                    user_id=str(current_user.id),
+                    session_id=request.session_id,
+                    template_id=template_id,
+                ),
+                state={
+                    "template_id": template_id,
+                    "deck_spec": result.get("deck_spec"),
+                    "slide_matches": result.get("slide_matches"),
+                    "mappings": result.get("mappings"),
+                    # AI-first extras
+                    "slide_replacements": result.get("slide_replacements"),
+                    "content_plan": result.get("content_plan"),
+                    "dynamic_slides": result.get("dynamic_slides"),
+                },
+            )
+        except Exception as e:
+            logger.warning(f"🧠 PPT wizard state save failed: {e}")
+
+
+def _attach_draft_file_url(result: Dict[str, Any]) -> None:
+    """초안 PPT가 있으면 다운로드 URL 추가"""
+    draft_file_name = result.get("draft_file_name")
+    if draft_file_name:
+        result["draft_file_url"] = f"/api/v1/agent/presentation/download/{urllib.parse.quote(draft_file_name)}"
+
 @router.post("/agent/presentation/templates/{template_id}/generate-content")
 async def generate_template_content(
     template_id: str,
@@ -1922,13 +2036,6 @@ async def generate_template_content(
     4. content_mapping_tool: 콘텐츠-텍스트박스 매핑
     """
     try:
-        from app.agents.features.presentation.ppt_wizard_checkpoint import (
-            ensure_saved as wizard_cp_ensure_saved,
-            is_enabled as wizard_cp_is_enabled,
-            make_thread_id as wizard_cp_make_thread_id,
-        )
-        from app.agents.features.presentation.services.ppt_wizard_store import PPTWizardKey, ppt_wizard_store
-
         user_id = str(current_user.emp_no) if hasattr(current_user, 'emp_no') else str(current_user.id)
         
         logger.info(f"📊 PPT 콘텐츠 생성 요청 (Agent): template={template_id}, user={user_id}, use_rag={request.use_rag}, use_ai_first={request.use_ai_first}")
@@ -1943,6 +2050,7 @@ async def generate_template_content(
             container_ids=request.container_ids,
             use_rag=request.use_rag,
             use_ai_first=request.use_ai_first,  # 🆕 AI-First 파이프라인 옵션
+            build_draft=request.build_draft,
         )
         
         if not result.get("success", False):
@@ -1950,62 +2058,8 @@ async def generate_template_content(
             logger.error(f"Content generation failed: {error_msg}")
             raise HTTPException(status_code=500, detail=error_msg)
 
-        # Phase 2: persist wizard artifacts via LangGraph checkpointer (preferred).
-        if request.session_id and wizard_cp_is_enabled():
-            try:
-                thread_id = wizard_cp_make_thread_id(
-                    user_id=str(current_user.id),
-                    session_id=request.session_id,
-                    template_id=template_id,
-                )
-
-                await wizard_cp_ensure_saved(
-                    thread_id=thread_id,
-                    state={
-                        "user_id": str(current_user.id),
-                        "session_id": request.session_id,
-                        "template_id": template_id,
-                        "thread_id": thread_id,
-                        "pipeline": result.get("pipeline") or ("ai_first" if request.use_ai_first else "legacy"),
-                        "deck_spec": result.get("deck_spec"),
-                        "slide_matches": result.get("slide_matches"),
-                        "mappings": result.get("mappings"),
-                        # AI-first extras (safe even if None)
-                        "slide_replacements": result.get("slide_replacements"),
-                        "content_plan": result.get("content_plan"),
-                        "dynamic_slides": result.get("dynamic_slides"),
-                        "presentation_title": result.get("presentation_title"),
-                    },
-                )
-
-                # Surface the thread_id to the caller (no UX change required; additive field).
-                if isinstance(result, dict):
-                    result["thread_id"] = thread_id
-            except Exception as e:
-                logger.warning(f"🧩 LangGraph wizard checkpoint save failed (fallback to Redis): {e}")
-
-        # Optional legacy fallback: persist wizard artifacts for follow-up build-from-data calls.
-        if request.session_id:
-            try:
-                await ppt_wizard_store.save(
-                    key=PPTWizardKey(
-                        user_id=str(current_user.id),
-                        session_id=request.session_id,
-                        template_id=template_id,
-                    ),
-                    state={
-                        "template_id": template_id,
-                        "deck_spec": result.get("deck_spec"),
-                        "slide_matches": result.get("slide_matches"),
-                        "mappings": result.get("mappings"),
-                        # AI-first extras
-                        "slide_replacements": result.get("slide_replacements"),
-                        "content_plan": result.get("content_plan"),
-                        "dynamic_slides": result.get("dynamic_slides"),
-                    },
-                )
-            except Exception as e:
-                logger.warning(f"🧠 PPT wizard state save failed: {e}")
+        await _save_generated_content_state(template_id, request, current_user, result)
+        _attach_draft_file_url(result)
         
         return JSONResponse(result)
     except HTTPException:
@@ -2017,6 +2071,74 @@ async def generate_template_content(
         logger.error(f"Content generation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"콘텐츠 생성 실패: {str(e)}")
 
+@router.post("/agent/presentation/templates/{template_id}/generate-content/stream")
+async def generate_template_content_stream(
+    template_id: str,
+    request: GenerateContentRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    템플릿 구조에 맞는 콘텐츠 생성 (SSE 스트리밍)
+    
+    generate-content 와 같은 결과를 만들면서 AI-First 슬라이드 병렬 생성 진행 상황을 전달:
+    - plan: 덱 계획 완료 (제목, 목차, 생성 대상 슬라이드 수)
+    - slide: 슬라이드 한 장 완료 (slide_index, mappings, completed/total) — 완성 순서대로
+    - complete: 최종 결과 (generate-content 응답과 동일, build_draft=True면 draft_file_url 포함)
+    """
+    user_id = str(current_user.emp_no) if hasattr(current_user, 'emp_no') else str(current_user.id)
+    logger.info(f"📊 PPT 콘텐츠 생성 요청 (SSE): template={template_id}, user={user_id}, build_draft={request.build_draft}")
+
+    async def stream():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_progress(event: Dict[str, Any]) -> None:
+            await queue.put(event)
+
+        task = asyncio.create_task(
+            unified_presentation_agent.generate_content_for_template(
+                template_id=template_id,
+                user_query=request.user_query,
+                context=request.context or "",
+                user_id=user_id,
+                session_id=request.session_id,
+                container_ids=request.container_ids,
+                use_rag=request.use_rag,
+                use_ai_first=request.use_ai_first,
+                progress_callback=on_progress,
+                build_draft=request.build_draft,
+            )
+        )
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            yield f"data: {json.dumps({'type': 'start', 'template_id': template_id})}\n\n"
+
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+
+            result = task.result()
+            if not result.get("success", False):
+                error_msg = result.get("error", "콘텐츠 생성 실패")
+                logger.error(f"Content generation failed (SSE): {error_msg}")
+                yield f"data: {json.dumps({'type': 'error', 'message': error_msg})}\n\n"
+            else:
+                await _save_generated_content_state(template_id, request, current_user, result)
+                _attach_draft_file_url(result)
+                yield f"data: {json.dumps({'type': 'complete', **result}, default=str)}\n\n"
+        except Exception as e:
+            logger.error(f"Content generation failed (SSE): {e}", exc_info=True)
+            yield f"data: {json.dumps({'type': 'error', 'message': f'콘텐츠 생성 실패: {str(e)}'})}\n\n"
+        finally:
+            if not task.done():
+                task.cancel()
+
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
 @router.post("/agent/presentation/templates/{template_id}/build-from-data")
 async def build_ppt_from_data(
     template_id: str,
@@ -2846,7 +2968,7 @@ async def get_template_pdf(
     """템플릿 PDF 파일 반환 (기존 /file 엔드포인트와 호환)"""
     try:
         decoded_id = urllib.parse.unquote(template_id)
-        pdf_path = template_manager.get_template_pdf_path(decoded_id)
+        pdf_path = await asyncio.to_thread(template_manager.get_template_pdf_path, decoded_id)
         
         if not pdf_path or not os.path.exists(pdf_path):
             raise HTTPException(status_code=404, detail="PDF 파일을 찾을 수 없습니다")
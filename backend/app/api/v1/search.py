@@ -22,7 +22,7 @@ from app.core.database import get_db
 from app.schemas.chat import SearchRequest, SearchResponse
 from app.services.search.search_service import search_service
 from app.services.search import multimodal_search_service
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, debug_profile_allowed
 from app.models import User
 from app.utils.provider_filters import get_provider_summary
 from app.core.config import settings
@@ -39,6 +39,7 @@ class HybridSearchRequest(BaseModel):
     search_type: str = Field("hybrid", description="검색 타입 (hybrid, vector_only, keyword_only)")
     max_results: int = Field(10, ge=1, le=50, description="최대 결과 수")
     filters: Optional[Dict[str, Any]] = Field(None, description="추가 필터")
+    debug_profile: bool = Field(False, description="단계별 지연 프로파일 포함 (관리자 또는 설정 허용 시)")
 
 class HybridSearchResult(BaseModel):
     """하이브리드 검색 결과 모델"""
@@ -73,6 +74,7 @@ class HybridSearchResponse(BaseModel):
     query_processed: Dict[str, Any]
     execution_time: str
     message: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None  # debug_profile 요청 시 단계별 지연
 
 # 통합검색용 모델
 class UnifiedSearchResult(BaseModel):
@@ -323,7 +325,8 @@ async def hybrid_search(
             container_ids=request.container_ids,
             max_results=request.max_results,
             search_type=request.search_type,
-            filters=request.filters
+            filters=request.filters,
+            debug_profile=request.debug_profile and debug_profile_allowed(current_user)
         )
         
         # 🔍 응답 검증 로그 (첫 번째 결과만)
@@ -433,6 +436,31 @@ async def get_search_analytics(
         logger.error(f"검색 분석 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/search/documents/{file_id}/similar")
+async def get_similar_documents(
+    file_id: int,
+    limit: int = Query(10, ge=1, le=50, description="결과 개수"),
+    threshold: float = Query(0.2, ge=0.0, le=1.0, description="청크 유사도 하한"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """유사 문서 조회 (more like this)"""
+    try:
+        result = await search_service.get_similar_documents(
+            file_id=str(file_id),
+            user_emp_no=current_user.emp_no,
+            limit=limit,
+            threshold=threshold
+        )
+        if not result.get("success"):
+            raise HTTPException(status_code=404, detail=result.get("error"))
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"유사 문서 조회 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/documents/reindex/{file_id}")
 async def reindex_document(
     file_id: str,
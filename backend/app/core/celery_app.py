@@ -80,6 +80,15 @@ celery_app.conf.beat_schedule = {
     # },
 }
 
+# 특허 통계 큐브 재계산 (수집 시 증분은 증가만 하므로 서지정보 삭제/수정을 주기적으로 반영)
+from app.core.config import settings as _settings  # noqa: E402
+
+if _settings.patent_stats_cube_rebuild_hours > 0:
+    celery_app.conf.beat_schedule['rebuild-patent-stats-cube'] = {
+        'task': 'rebuild_patent_stats_cube',
+        'schedule': _settings.patent_stats_cube_rebuild_hours * 3600,
+    }
+
 # Celery Worker 프로세스 초기화 시 무거운 서비스 프리로드
 @worker_process_init.connect
 def init_worker_process_handler(**kwargs):
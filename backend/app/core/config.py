@@ -35,6 +35,15 @@ class Settings(BaseSettings):
     db_pool_timeout: int = 60  # 30 → 60 (대기 시간 증가)
     db_pool_recycle: int = 300
     db_pool_pre_ping: bool = True
+
+    # Text-to-SQL 전용 읽기 전용 DB 풀 (앱 OLTP 풀과 분리)
+    text_to_sql_database_url: Optional[str] = None  # 읽기 전용 계정/리플리카 URL (없으면 database_url 사용)
+    text_to_sql_pool_size: int = 4
+    text_to_sql_max_overflow: int = 2
+    text_to_sql_statement_timeout_ms: int = 30000  # 서버측 statement_timeout
+    text_to_sql_max_plan_cost: float = 1_000_000.0  # EXPLAIN 추정 비용 상한 (초과 시 실행 거부)
+    text_to_sql_max_plan_rows: int = 5_000_000  # EXPLAIN 추정 행 수 상한
+    text_to_sql_fetch_batch_size: int = 500  # 스트리밍 배치 크기 (행)
     
     # 디버그 모드 (전역)
     debug: bool = False
@@ -112,6 +121,13 @@ class Settings(BaseSettings):
         description="CORS allowed origins list"
     )
     
+    # 컨테이너 트리 스냅샷 (계층/표시 경로/문서 수/권한 인메모리 공유)
+    container_tree_refresh_seconds: float = 5.0  # 변경 감지(버전) 쿼리 최소 간격 - 다른 워커의 변경 반영 지연 상한
+
+    # 인증 주체 캐시 ((사번, 토큰 jti) → 사용자 스냅샷)
+    auth_principal_cache_ttl_seconds: float = 30.0  # 0 이면 비활성 - 다른 워커의 사용자 변경 반영 지연 상한
+    auth_principal_cache_max_entries: int = 10000
+
     # 파일 업로드 설정
     upload_dir: str = "uploads"
     file_upload_path: str = "uploads"
@@ -145,6 +161,24 @@ class Settings(BaseSettings):
     }
     korean_embedding_model: str = "jhgan/ko-sroberta-multitask"
     
+    # 키워드 검색 (BM25 + pg_trgm)
+    search_keyword_candidate_limit: int = 500  # BM25 점수 계산 전 후보 상한
+    search_bm25_k1: float = 1.2
+    search_bm25_b: float = 0.75
+    search_bm25_keyword_weight: float = 1.5  # 제목/요약에 포함된 질의어 가중치 (idf 배수)
+    search_bm25_normalization: float = 5.0  # score / (score + 값) 으로 0~1 정규화
+    search_keyword_stats_cache_seconds: float = 60.0  # 코퍼스 통계 프로세스 캐시
+    search_keyword_stats_refresh_seconds: int = 3600  # df/평균 길이 재집계 주기
+
+    # 검색 이벤트 기록 (응답 경로 밖 비동기 적재)
+    search_events_enabled: bool = True
+    search_events_queue_size: int = 10000  # 초과 시 새 이벤트는 버림 (검색 응답은 대기하지 않음)
+    search_events_batch_size: int = 500  # 다중 행 INSERT 1회당 최대 이벤트 수
+    search_events_flush_interval_seconds: float = 2.0
+    search_events_rollup_interval_seconds: int = 300  # 일별 롤업 재집계 주기
+    search_events_retention_months: int = 13  # 보관 기간이 지난 월 파티션은 DROP
+    search_suggestion_min_users: int = 2  # 인기 검색어 제안에 노출할 최소 사용자 수
+
     # AWS 설정
     aws_region: str = "ap-northeast-2"
     aws_access_key_id: Optional[str] = None
@@ -157,6 +191,7 @@ class Settings(BaseSettings):
     
     # S3 설정 (storage_backend == 's3' 일 때 필수)
     aws_s3_bucket: Optional[str] = None
+    aws_s3_endpoint_url: Optional[str] = None  # S3 호환 엔드포인트 (MinIO 등, 비우면 AWS)
     s3_presign_expiry_seconds: int = 3600
 
     # Azure Blob Storage 설정 (storage_backend == 'azure_blob' 일 때 사용)
@@ -170,6 +205,14 @@ class Settings(BaseSettings):
     azure_blob_enable_auto_container: bool = True  # 존재하지 않을 경우 자동 생성
     azure_blob_path_style: bool = False  # 사설 에뮬레이터(Azurite) 사용 시 True
     azure_blob_download_mode: str = "proxy"  # redirect: 302 리다이렉트 (CORS 필요), proxy: 서버 프록시 (CORS 불필요)
+
+    # 비동기 오브젝트 스토리지 공통 (app/services/core/object_storage.py)
+    storage_max_pool_connections: int = 32  # 공유 클라이언트 커넥션 풀 크기
+    storage_io_threads: int = 16  # 블로킹 SDK/디스크 호출 전용 스레드 수 (이벤트 루프 비차단)
+    storage_multipart_threshold_mb: int = 16  # 이 크기 이상이면 병렬 multipart 업로드 / Range 다운로드
+    storage_multipart_part_size_mb: int = 8  # 파트 크기 (S3 최소 5MB)
+    storage_transfer_concurrency: int = 8  # 객체 하나당 동시 파트 전송 수
+    storage_local_root: Optional[str] = None  # 로컬 백엔드 루트 (비우면 resolved_upload_dir)
     
     # Azure OpenAI 설정
     azure_openai_endpoint: Optional[str] = None
@@ -265,6 +308,10 @@ class Settings(BaseSettings):
         default=180,
         description="에이전트 실행 타임아웃 (초)"
     )
+    agent_tool_db_connection_budget: int = Field(
+        default=4,
+        description="요청당 병렬 검색 도구가 동시에 점유할 수 있는 DB 커넥션 수"
+    )
     
     # LLM 제공자 설정
     llm_providers: List[str] = Field(default_factory=lambda: ["bedrock", "azure_openai", "openai"])
@@ -281,6 +328,11 @@ class Settings(BaseSettings):
     # AWS Transcribe 음성 변환 설정
     enable_audio_transcription: bool = False  # 오디오 → 텍스트 변환 플래그
     aws_transcribe_language_code: str = "ko-KR"  # 기본 언어 (ko-KR, en-US, ja-JP, zh-CN 등)
+    transcription_backend: str = "aws"  # 전사 작업 백엔드 (aws | local - 테스트/개발용)
+    transcription_poll_interval_seconds: float = 2.0  # 진행 중 작업 일괄 폴링 간격 (폴러 1개가 모든 작업 처리)
+    transcription_job_timeout_seconds: int = 300  # 작업별 최대 대기
+    transcription_job_retention_seconds: int = 600  # 완료 작업 결과 보관 (상태 조회용)
+    transcription_max_concurrent_submits: int = 8  # 동시 업로드/작업 시작 수 (스레드 사용 상한)
     
     # Azure CLIP 멀티모달 임베딩 모델
     azure_openai_multimodal_embedding_endpoint: Optional[str] = None
@@ -294,6 +346,7 @@ class Settings(BaseSettings):
     bedrock_embedding_model_id: str = "amazon.titan-embed-text-v2:0"
     bedrock_alt_embedding_model_id: str = "amazon.titan-embed-text-v1:0"  # 대체 임베딩 모델
     bedrock_embedding_dimension: int = 1024  # Titan V2 기본 차원 (1024, 512, 256 지원)
+    bedrock_embedding_max_concurrency: int = 8  # 배치 임베딩 시 동시 호출 수 (Titan 은 요청당 1건만 지원)
     
     # AWS Bedrock 멀티모달 모델 (Cohere Embed v4)
     bedrock_multimodal_embedding_model_id: str = "twelvelabs.marengo-embed-3-0-v1:0"
@@ -319,6 +372,24 @@ class Settings(BaseSettings):
     aws_vector_dimension: int = 1024           # AWS Titan v2 / Cohere v4
     aws_vector_dimension_small: int = 256      # AWS Titan v2 small
     
+    # 벡터 인덱스 관리 (pgvector HNSW, scripts/vector_indexes.py)
+    vector_index_hnsw_m: int = 16  # 노드당 연결 수 (클수록 recall↑, 인덱스 크기/빌드 시간↑)
+    vector_index_hnsw_ef_construction: int = 128  # 빌드 시 후보 폭 (클수록 그래프 품질↑, 빌드 시간↑)
+    vector_index_maintenance_work_mem: str = "1GB"  # 빌드 세션 메모리 (그래프가 메모리에 들어가야 빌드가 빠름)
+    vector_index_parallel_workers: int = 2  # 빌드 병렬 작업자 수
+    vector_index_recall_sample_size: int = 50  # recall 점검 질의 수 (테이블 벡터 샘플)
+    vector_index_recall_k: int = 10  # recall@k
+    vector_index_min_recall: float = 0.9  # 이 값 미만이면 recall 점검 실패
+    vector_search_hnsw_ef_search: int = 100  # 청크 벡터 검색 HNSW 탐색 폭 (LIMIT 이상이어야 결과가 채워짐)
+    # 필터(컨테이너/권한/문서 범위/임계값)로 ANN 결과가 LIMIT 에 못 미치면 인덱스를 더 탐색 (pgvector 0.8+)
+    # off | relaxed_order | strict_order - 미지원 버전은 결과 부족 시 정확 검색으로 폴백
+    vector_search_hnsw_iterative_scan: str = "relaxed_order"
+    vector_search_hnsw_max_scan_tuples: int = 20000  # iterative scan 최대 탐색 행 수 (지연 상한)
+    # 압축 벡터 후보 검색 (off | halfvec | binary) - 압축 식 인덱스로 후보를 찾고 float32 원본으로 재채점
+    vector_compact_mode: str = "off"
+    vector_compact_rescore_factor: int = 4  # 1단계 후보 수 = 최종 LIMIT × 배수
+    vector_compact_min_candidates: int = 100  # 1단계 최소 후보 수 (binary 는 거리 해상도가 낮아 넉넉히)
+    
     similarity_threshold: float = 0.7
     
     # 이미지(멀티모달) 검색 유사도 임계값
@@ -331,7 +402,27 @@ class Settings(BaseSettings):
     rag_similarity_threshold: float = 0.3
     rag_max_chunks: int = 30
     rag_use_reranking: bool = True
-    
+
+    # RAG 컨텍스트 패킹 (실제 토크나이저 기준 예산 + 토큰당 관련도 선택)
+    rag_context_tokenizer: str = ""  # tiktoken 모델/인코딩 이름 (비우면 현재 LLM 모델, 미지원 모델은 korean_tokenizer_model)
+    rag_context_token_cache_size: int = 20000  # 청크 ID별 토큰 수 캐시 항목 수
+    rag_context_redundancy_penalty: float = 0.7  # 선택된 청크와 겹치는 비율만큼 관련도 감점
+    rag_context_duplicate_overlap: float = 0.9  # 이 비율 이상 겹치면 중복으로 보고 제외
+    rag_context_min_relative_score: float = 0.3  # 최고 점수 대비 이 비율 미만 청크는 후보 제외
+    rag_context_trim_enabled: bool = True  # 긴 청크를 질의 관련 문장으로 축약
+    rag_context_trim_min_tokens: int = 200  # 이 토큰 수 이상인 청크만 축약 대상
+
+    # RAG 답변 시맨틱 캐시 (반복 질문 재사용)
+    rag_answer_cache_enabled: bool = False  # 답변 시맨틱 캐시 (마이그레이션 20260107_001/20260113_001 적용 후 활성화)
+    rag_answer_cache_similarity_threshold: float = 0.95  # 질의 임베딩 코사인 유사도 하한 (높을수록 보수적)
+    rag_answer_cache_ttl_seconds: int = 86400  # 항목 최대 보관 시간
+
+    # 문서 단위 대표 벡터 (연관 문서 추천 / 유사 문서)
+    document_vectors_enabled: bool = True
+    document_vector_medoids: int = 4  # 문서당 medoid 수 (청크 순서 구간별 1개)
+    document_vector_candidates: int = 50  # 대표 벡터 ANN 후보 문서 수 (이 문서들의 청크만 재채점)
+    document_vector_hnsw_ef_search: int = 64  # tb_document_vectors HNSW 탐색 폭
+
     # 리랭킹 제공자 설정
     rag_reranking_provider: str = Field(default="azure_openai")  # azure_openai | bedrock
     
@@ -380,6 +471,14 @@ class Settings(BaseSettings):
     sqlalchemy_echo: bool = False  # 개별 SQL / 파라미터 출력 (기본 비활성화)
     sql_log_slow_threshold_ms: int = 300  # 느린 쿼리 (ms) 이상만 요약 로그, 0 또는 음수면 비활성화
     sql_log_sample_rate: float = 0.0  # 0~1 사이, 느린 쿼리 외 임의 샘플 로그 (부하 분석용)
+
+    # 요청 프로파일링 (검색/RAG 단계별 지연, /metrics)
+    profiling_enabled: bool = True
+    profiling_sample_rate: float = 0.1  # 0~1, 단계별 히스토그램에 반영할 요청 비율
+    profiling_slow_request_ms: int = 5000  # 프로파일된 요청 중 이 값 이상이면 한 줄 요약 로그
+    profiling_debug_response: bool = False  # True면 누구나 debug_profile 요청 가능 (기본: 관리자만)
+    metrics_endpoint_enabled: bool = False  # /metrics 노출 여부 (인증 없는 엔드포인트이므로 기본 비활성화)
+    metrics_endpoint_token: Optional[str] = None  # 설정 시 Authorization: Bearer <token> 요청만 허용 (Prometheus bearer_token)
     
     # 프레젠테이션 산출물 저장 경로
     presentation_output_dir: str = Field(
@@ -393,6 +492,11 @@ class Settings(BaseSettings):
     )
     office_generator_timeout: int = 60  # seconds
 
+    # Office → PDF/PNG 변환 워커 풀 (LibreOffice headless)
+    office_conversion_workers: int = 2  # 동시 변환 워커 수 (워커별 전용 LibreOffice 프로필)
+    office_conversion_timeout_seconds: int = 300  # 변환 1건 타임아웃
+    office_conversion_cache_max_mb: int = 2048  # 변환 결과 캐시 최대 용량 (초과 시 오래된 항목부터 제거)
+
     # 실행 환경
     environment: str = "development"
 
@@ -425,6 +529,22 @@ class Settings(BaseSettings):
     patent_search_max_results: int = 20  # 최대 검색 결과 수
     patent_search_timeout_seconds: int = 30  # API 타임아웃
     patent_search_cache_ttl_seconds: int = 60 * 60 * 24  # 24시간 캐시 (특허 데이터는 변동이 적음)
+    # 특허 대량 수집 (collect_patents_from_kipris)
+    patent_ingest_batch_size: int = 200  # 배치당 서지/문서 레코드 수 (배치당 commit 1회)
+    patent_ingest_embedding_batch_size: int = 100  # 임베딩 API 호출당 텍스트 수
+    patent_pdf_download_concurrency: int = 8  # PDF 동시 다운로드 수
+    patent_progress_update_interval_seconds: float = 2.0  # 진행률 DB 갱신 최소 간격
+    # 로컬 특허 통계 엔진 (트렌드/포트폴리오 분석)
+    patent_analytics_local_enabled: bool = True  # 수집된 서지정보 SQL 집계 우선 사용
+    patent_analytics_min_local_patents: int = 20  # 로컬 보유 건수가 이보다 적으면 실시간 API 폴백
+    patent_stats_cube_rebuild_hours: int = 24  # 통계 큐브 전체 재계산 주기 (삭제/수정 반영, Celery Beat, 0이면 비활성화)
+    # 로컬 특허 유사도 검색 (서지/청구항 임베딩 ANN)
+    patent_similarity_local_enabled: bool = True  # 저장된 임베딩 기반 유사 특허 검색 우선 사용
+    patent_similarity_hnsw_ef_search: int = 64  # 서지/청구항 HNSW 탐색 폭
+    patent_similarity_max_reference_claims: int = 5  # 참조 특허당 청구항 질의 수 (max-sim)
+    patent_claim_backfill_batch_size: int = 100  # 청구항 임베딩 적재 배치당 특허 수
+    patent_claim_backfill_max_batches: int = 50  # 적재 작업 1회당 최대 배치 수
+    patent_prior_art_local_min_candidates: int = 10  # 로컬 후보가 이 이상이면 KIPRIS 검색 생략
 
     # Web page fetch (검색 결과 상세 페이지 추출) 설정
     web_fetch_enabled: bool = True
@@ -613,6 +733,11 @@ class Settings(BaseSettings):
     pptxgenjs_service_url: str = "http://localhost:3001"
     pptxgenjs_api_key: str = ""
     presentation_output_dir: str = "uploads/presentations"
+    # 템플릿 PPT AI-First 생성: 덱 계획 1회 + 슬라이드별 병렬 호출
+    ppt_slide_parallel_enabled: bool = True  # False면 단일 프롬프트로 전체 생성
+    ppt_slide_concurrency: int = 4  # 슬라이드별 LLM 동시 호출 수
+    ppt_slide_max_tokens: int = 1500  # 슬라이드 한 장 생성 토큰 상한
+    ppt_plan_max_tokens: int = 2000  # 덱 계획 호출 토큰 상한
     
     # 질의문 재작성 및 의도 분류 LLM 설정
     query_rewrite_provider: str = "azure_openai"  # azure_openai | bedrock
@@ -22,6 +22,7 @@ class ToolMetrics(BaseModel):
     tokens_used: Optional[int] = Field(default=None, description="사용된 토큰 수")
     items_returned: Optional[int] = Field(default=None, description="반환된 항목 수")
     trace_id: Optional[str] = Field(default=None, description="추적 ID")
+    queue_wait_ms: Optional[float] = Field(default=None, description="DB 커넥션 예산 대기 시간 (밀리초)")
     
     class Config:
         json_schema_extra = {
@@ -15,6 +15,8 @@ _async_engine: Optional[AsyncEngine] = None
 _sync_engine: Optional[Engine] = None
 _async_session_local = None
 _sync_session_local = None
+_readonly_async_engine: Optional[AsyncEngine] = None
+_readonly_session_local = None
 
 # Base 클래스
 Base = declarative_base()
@@ -63,6 +65,48 @@ def get_sync_engine() -> Engine:
         _attach_query_listeners(_sync_engine)
     return _sync_engine
 
+def get_readonly_async_engine() -> AsyncEngine:
+    """Text-to-SQL 등 임의 조회용 읽기 전용 엔진 (앱 풀과 분리된 소형 풀)
+
+    - 세션 기본값을 read-only 트랜잭션으로 고정
+    - 서버측 statement_timeout 으로 장시간 쿼리 차단
+    """
+    global _readonly_async_engine
+    if _readonly_async_engine is None:
+        _readonly_async_engine = create_async_engine(
+            settings.text_to_sql_database_url or settings.database_url,
+            echo=settings.sqlalchemy_echo,
+            future=True,
+            pool_size=settings.text_to_sql_pool_size,
+            max_overflow=settings.text_to_sql_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            connect_args={
+                "server_settings": {
+                    "jit": "off",
+                    "default_transaction_read_only": "on",
+                    "statement_timeout": str(settings.text_to_sql_statement_timeout_ms),
+                    "application_name": "wkms-text-to-sql",
+                },
+                "timeout": 60,
+                "command_timeout": max(1, settings.text_to_sql_statement_timeout_ms // 1000) + 5,
+            }
+        )
+        _attach_query_listeners(_readonly_async_engine.sync_engine)
+    return _readonly_async_engine
+
+def get_readonly_session_local():
+    """읽기 전용 비동기 세션 팩토리 lazy loading"""
+    global _readonly_session_local
+    if _readonly_session_local is None:
+        _readonly_session_local = async_sessionmaker(
+            bind=get_readonly_async_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _readonly_session_local
+
 def get_async_session_local():
     """비동기 세션 팩토리 lazy loading"""
     global _async_session_local
@@ -94,10 +138,13 @@ def _attach_query_listeners(engine: Engine):
     if id(engine) in _INSTRUMENTED_ENGINES:
         return
 
+    from app.core.profiling import record_db_time
+
     slow_threshold_ms = max(0, settings.sql_log_slow_threshold_ms)
     sample_rate = max(0.0, min(1.0, settings.sql_log_sample_rate))
     log_all = settings.sql_query_log_enabled and settings.sql_query_log_all
-    if slow_threshold_ms <= 0 and sample_rate <= 0 and not settings.sqlalchemy_echo and not log_all:
+    profiling = settings.profiling_enabled
+    if slow_threshold_ms <= 0 and sample_rate <= 0 and not settings.sqlalchemy_echo and not log_all and not profiling:
         _INSTRUMENTED_ENGINES.add(id(engine))
         return
 
@@ -113,6 +160,8 @@ def _attach_query_listeners(engine: Engine):
         if start is None:
             return
         elapsed_ms = (time.perf_counter() - start) * 1000
+        if profiling:
+            record_db_time(elapsed_ms)
         log_slow = slow_threshold_ms > 0 and elapsed_ms >= slow_threshold_ms
         log_sample = (not log_slow) and sample_rate > 0 and random.random() < sample_rate
         if log_slow or log_sample:
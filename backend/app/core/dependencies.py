@@ -11,6 +11,7 @@ from app.core.security import AuthUtils
 from app.models import User
 from app.schemas.user_schemas import TokenData
 from app.services.auth.async_user_service import AsyncUserService
+from app.services.auth.principal_cache import principal_cache
 
 # HTTP Bearer 토큰 스킴
 security = HTTPBearer()
@@ -31,10 +32,22 @@ async def get_current_user(
 ) -> User:
     """
     현재 로그인한 사용자 정보 조회 - 사번 기반
+
+    (사번, 토큰 jti) 단위로 짧게 캐시된 사용자 스냅샷을 우선 사용하고,
+    캐시 미스일 때만 tb_user 를 조회한다.
+
+    - 캐시 미스: 요청 세션에 붙은 ORM User 반환
+    - 캐시 적중: 읽기 전용 PrincipalUser 반환 (tb_user 컬럼만 제공, 속성 변경 불가)
+      → 사용자 수정/관계 로딩이 필요한 엔드포인트는 세션에서 다시 조회한다.
     """
     import logging
     logger = logging.getLogger(__name__)
     
+    principal = principal_cache.get(token_data.emp_no, token_data.jti)
+    if principal is not None:
+        logger.debug(f"✅ 사용자 인증 (캐시): emp_no={principal.emp_no}")
+        return principal.to_user()
+    
     user_service = AsyncUserService(db)
     user = await user_service.get_user_by_emp_no(token_data.emp_no)
     
@@ -53,6 +66,7 @@ async def get_current_user(
             detail="비활성화된 계정입니다"
         )
     
+    principal_cache.put(user.emp_no, token_data.jti, user)
     logger.info(f"✅ 사용자 인증 성공: emp_no={user.emp_no}, username={user.username}")
     return user
 
@@ -92,10 +106,15 @@ async def get_optional_current_user(
         token = credentials.credentials
         token_data = AuthUtils.verify_token(token)
         
+        principal = principal_cache.get(token_data.emp_no, token_data.jti)
+        if principal is not None and principal.username == token_data.username:
+            return principal.to_user()
+        
         user_service = AsyncUserService(db)
         user = await user_service.get_user_by_username(token_data.username)
         
         if user and user.is_active:
+            principal_cache.put(user.emp_no, token_data.jti, user)
             return user
         
     except Exception:
@@ -104,6 +123,14 @@ async def get_optional_current_user(
     
     return None
 
+def debug_profile_allowed(current_user: Optional[User]) -> bool:
+    """
+    단계별 지연 프로파일(debug_profile) 응답 포함 허용 여부 - 관리자 또는 설정으로 전체 허용
+    """
+    from app.core.config import settings
+
+    return bool(settings.profiling_debug_response or (current_user is not None and current_user.is_admin))
+
 def require_permissions(*required_roles: str):
     """
     특정 권한이 필요한 데코레이터 팩토리
@@ -0,0 +1,293 @@
+"""
+요청 프로파일러 (검색 / RAG 단계별 지연 분석)
+============================================
+
+요청 하나를 여러 단계(stage)로 나누어 단계별 wall time, DB 시간/쿼리 수, 행 수, 바이트를 기록한다.
+
+- 요청 범위: profile_request(kind) 컨텍스트 - ContextVar 로 전파되므로 asyncio.gather 로
+  병렬 실행되는 하위 태스크의 단계도 같은 요청에 기록된다
+- 단계: stage(name) 컨텍스트 - 프로파일이 없으면(비샘플링 요청) 아무 것도 하지 않는다
+- DB 시간: database.py 의 커서 이벤트가 record_db_time() 으로 현재 단계에 누적
+- 집계: 샘플링된 요청의 단계별 지연을 히스토그램으로 누적 → /metrics (Prometheus 텍스트 형식, metrics_endpoint_enabled 로 활성화 / metrics_endpoint_token 으로 보호)
+- 샘플링: settings.profiling_sample_rate (0~1), 디버그 요청은 항상 프로파일링
+
+로그에는 요청당 한 줄 요약만 남기고(느린 요청만), 상세 내역은 디버그 응답/메트릭으로 확인한다.
+"""
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 (ms)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+@dataclass
+class StageSpan:
+    """단계별 누적 측정값 (같은 이름의 단계가 여러 번 실행되면 합산)"""
+    name: str
+    wall_ms: float = 0.0
+    db_ms: float = 0.0
+    db_queries: int = 0
+    rows: int = 0
+    bytes: int = 0
+    calls: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_ms": round(self.wall_ms, 2),
+            "db_ms": round(self.db_ms, 2),
+            "db_queries": self.db_queries,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "calls": self.calls,
+        }
+
+
+@dataclass
+class RequestProfile:
+    """요청 1건의 프로파일"""
+    kind: str
+    started: float = field(default_factory=time.perf_counter)
+    spans: Dict[str, StageSpan] = field(default_factory=dict)
+    total_ms: float = 0.0
+    status: str = "ok"
+
+    def span(self, name: str) -> StageSpan:
+        span = self.spans.get(name)
+        if span is None:
+            span = self.spans[name] = StageSpan(name)
+        return span
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "total_ms": round(self.total_ms or (time.perf_counter() - self.started) * 1000, 2),
+            "status": self.status,
+            "stages": {name: span.to_dict() for name, span in self.spans.items()},
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+_current_stage: ContextVar[Optional[StageSpan]] = ContextVar("request_profile_stage", default=None)
+
+
+class _Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 의미)"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value_ms: float) -> None:
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if value_ms <= bound:
+                self.counts[index] += 1
+                break
+        self.total += value_ms
+        self.count += 1
+
+
+class MetricsRegistry:
+    """프로세스 단위 지연 히스토그램 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (metric, kind, stage) → 히스토그램
+        self._histograms: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._requests: Dict[Tuple[str, str], int] = {}
+        # (metric, label 문자열) → 카운터 (백그라운드 작업 처리량/유실 등)
+        self._counters: Dict[Tuple[str, str], int] = {}
+
+    def increment(self, metric: str, value: int = 1, **labels: str) -> None:
+        """단순 카운터 증가 (labels 는 Prometheus 라벨)"""
+        key = (metric, ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, metric: str, kind: str, stage: str, value_ms: float) -> None:
+        key = (metric, kind, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.observe(value_ms)
+
+    def record(self, profile: RequestProfile) -> None:
+        """샘플링된 요청 프로파일을 히스토그램에 반영"""
+        with self._lock:
+            key = (profile.kind, profile.status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+        self.observe("request_duration_ms", profile.kind, "total", profile.total_ms)
+        for span in profile.spans.values():
+            self.observe("stage_duration_ms", profile.kind, span.name, span.wall_ms)
+            if span.db_queries:
+                self.observe("stage_db_duration_ms", profile.kind, span.name, span.db_ms)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._counters.clear()
+
+    def render_prometheus(self, prefix: str = "wkms") -> str:
+        """Prometheus 텍스트 노출 형식 (version 0.0.4)"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            requests = sorted(self._requests.items())
+            counters = sorted(self._counters.items())
+
+        lines: List[str] = [
+            f"# HELP {prefix}_profiled_requests_total Sampled requests by kind and status",
+            f"# TYPE {prefix}_profiled_requests_total counter",
+        ]
+        for (kind, status), count in requests:
+            lines.append(f'{prefix}_profiled_requests_total{{kind="{kind}",status="{status}"}} {count}')
+
+        declared = set()
+        for (metric, labels), count in counters:
+            name = f"{prefix}_{metric}"
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{{{labels}}} {count}" if labels else f"{name} {count}")
+
+        for (metric, kind, stage), histogram in histograms:
+            name = f"{prefix}_{metric}"
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# HELP {name} Latency histogram in milliseconds")
+                lines.append(f"# TYPE {name} histogram")
+            labels = f'kind="{kind}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS_MS, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _should_sample() -> bool:
+    rate = settings.profiling_sample_rate
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_request(kind: str, force: bool = False) -> Iterator[Optional[RequestProfile]]:
+    """
+    요청 프로파일 범위
+
+    force=True (디버그 요청) 이거나 샘플링되면 RequestProfile 을, 아니면 None 을 돌려준다.
+    이미 상위 프로파일이 있으면(예: RAG 내부 검색) 새로 만들지 않고 그대로 사용한다.
+    """
+    parent = _current_profile.get()
+    if parent is not None:
+        yield parent
+        return
+    if not settings.profiling_enabled or not (force or _should_sample()):
+        yield None
+        return
+
+    profile = RequestProfile(kind=kind)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    except BaseException:
+        profile.status = "error"
+        raise
+    finally:
+        try:
+            _current_profile.reset(token)
+        except ValueError:
+            # 스트리밍 응답이 다른 컨텍스트에서 정리(aclose)되는 경우
+            _current_profile.set(None)
+        profile.total_ms = (time.perf_counter() - profile.started) * 1000
+        metrics_registry.record(profile)
+        if profile.total_ms >= settings.profiling_slow_request_ms:
+            slowest = max(profile.spans.values(), key=lambda s: s.wall_ms, default=None)
+            logger.warning(
+                f"[PROFILE] 느린 요청 kind={kind} total={profile.total_ms:.0f}ms "
+                f"slowest={slowest.name if slowest else '-'}({slowest.wall_ms if slowest else 0:.0f}ms)"
+            )
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Optional[StageSpan]]:
+    """요청 단계 측정 (프로파일이 없으면 None - 호출 측은 span 이 있을 때만 rows/bytes 기록)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield None
+        return
+
+    span = profile.span(name)
+    token = _current_stage.set(span)
+    started = time.perf_counter()
+    try:
+        yield span
+    finally:
+        span.wall_ms += (time.perf_counter() - started) * 1000
+        span.calls += 1
+        _current_stage.reset(token)
+
+
+def _content_of(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("content") or item.get("content_preview") or "")
+    return str(getattr(item, "content", "") or "")
+
+
+def measure(span: Optional[StageSpan], result: Any) -> Any:
+    """결과 목록의 행 수 / 본문 바이트(content, content_preview 기준 추정)를 단계에 기록"""
+    if span is not None and isinstance(result, list):
+        span.rows += len(result)
+        span.bytes += sum(len(_content_of(item).encode("utf-8")) for item in result)
+    return result
+
+
+async def run_stage(name: str, awaitable: Awaitable[Any]) -> Any:
+    """awaitable 하나를 단계로 측정 (asyncio.gather 인자로 사용)"""
+    with stage(name) as span:
+        return measure(span, await awaitable)
+
+
+def staged(name: str) -> Callable:
+    """async 함수 전체를 단계로 측정하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with stage(name) as span:
+                return measure(span, await func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def record_db_time(elapsed_ms: float) -> None:
+    """DB 커서 실행 시간 → 현재 단계 (database.py 이벤트 리스너에서 호출)"""
+    span = _current_stage.get()
+    if span is not None:
+        span.db_ms += elapsed_ms
+        span.db_queries += 1
+
+
+# 전역 인스턴스
+metrics_registry = MetricsRegistry()
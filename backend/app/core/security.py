@@ -61,6 +61,7 @@ class AuthUtils:
             expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", secrets.token_hex(16))
         
         # JWT 토큰 인코딩
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
@@ -133,7 +134,9 @@ class AuthUtils:
                 emp_no=emp_no,
                 username=username,
                 user_id=user_id,
-                is_admin=is_admin
+                is_admin=is_admin,
+                # jti 가 없는 기존 토큰은 토큰 해시로 대체 (인증 주체 캐시 키)
+                jti=payload.get("jti") or hashlib.sha256(token.encode('utf-8')).hexdigest()[:32],
             )
             return token_data
             
@@ -298,17 +301,23 @@ async def get_current_user_ws(token: str, db):
         db: DB 세션
     
     Returns:
-        User 모델 인스턴스
+        User 모델 인스턴스 (캐시 적중 시 읽기 전용 PrincipalUser)
     
     Raises:
         HTTPException: 인증 실패 시
     """
-    from app.models.user import User
+    from app.models import User
+    from app.services.auth.principal_cache import principal_cache
     
     try:
         # 토큰 검증
         token_data = AuthUtils.verify_token(token)
         
+        # HTTP 인증(get_current_user)과 같은 인증 주체 캐시 사용
+        principal = principal_cache.get(token_data.emp_no, token_data.jti)
+        if principal is not None:
+            return principal.to_user()
+        
         # 사용자 조회
         user = db.query(User).filter(User.emp_no == token_data.emp_no).first()
         
@@ -318,6 +327,13 @@ async def get_current_user_ws(token: str, db):
                 detail="사용자를 찾을 수 없습니다",
             )
         
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="비활성화된 계정입니다",
+            )
+        
+        principal_cache.put(user.emp_no, token_data.jti, user)
         return user
         
     except HTTPException:
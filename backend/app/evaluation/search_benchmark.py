@@ -0,0 +1,478 @@
+"""
+사내 문서 검색 품질/지연 벤치마크
+
+SearchService.hybrid_search, RAGSearchService.search_for_rag_context, 검색 에이전트 전략을
+같은 라벨링 질의 세트로 실행해 recall@k / nDCG@k / MRR 과 동시성 수준별 p50/p95/p99 지연을 측정한다.
+
+- 코퍼스: datasets/search_benchmark.json 의 고정 문서를 로컬 Postgres+pgvector 의 벤치마크 전용
+  컨테이너에 적재 (load_corpus)
+- 임베딩: HashingEmbedder - 외부 API 없이 같은 입력이면 항상 같은 벡터 (문자 n-gram 해싱)
+- 결과: JSON 리포트 (compare_reports 로 기준 리포트 대비 회귀 검출)
+
+실행: scripts/search_benchmark.py
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.evaluation.metrics import calculate_mrr, calculate_ndcg_at_k, calculate_recall_at_k
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASET_PATH = Path(__file__).parent / "datasets" / "search_benchmark.json"
+BENCHMARK_CONTAINER_ID = "BENCH_SEARCH"
+BENCHMARK_USER = "BENCH0001"
+# 적재한 파일 식별용 물리명 접두어 (file_psl_nm = bench_<문서 id>)
+FILE_NAME_PREFIX = "bench_"
+
+# 모드 이름 → 실행 대상 (agent:<intent> 는 에이전트 전략)
+SEARCH_MODES = ("hybrid", "vector", "keyword", "rag", "agent:factual_qa", "agent:keyword_search")
+_SEARCH_TYPES = {"hybrid": "hybrid", "vector": "vector_only", "keyword": "keyword_only"}
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+@dataclass(frozen=True)
+class BenchmarkDocument:
+    """코퍼스 문서 (id 가 라벨 기준 식별자)"""
+    id: str
+    title: str
+    chunks: List[str]
+    keywords: List[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class BenchmarkQuery:
+    """라벨링 질의 - relevance_judgments 는 metrics.calculate_ndcg_at_k 형식 ({doc_id: {"score": n}})"""
+    id: str
+    query: str
+    expected_documents: List[str]
+    relevance_judgments: Dict[str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class BenchmarkDataset:
+    name: str
+    version: str
+    documents: List[BenchmarkDocument]
+    queries: List[BenchmarkQuery]
+
+
+def load_dataset(path: Optional[Path] = None) -> BenchmarkDataset:
+    """벤치마크 JSON 로드 (golden dataset 과 같은 질의 형식 + documents)"""
+    with open(path or DEFAULT_DATASET_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+    documents = [
+        BenchmarkDocument(
+            id=doc["id"], title=doc["title"], chunks=list(doc["chunks"]), keywords=list(doc.get("keywords", []))
+        )
+        for doc in raw.get("documents", [])
+    ]
+    doc_ids = {doc.id for doc in documents}
+    queries = []
+    for item in raw["queries"]:
+        unknown = set(item["expected_documents"]) - doc_ids
+        if unknown:
+            raise ValueError(f"질의 {item['id']} 의 기대 문서가 코퍼스에 없음: {sorted(unknown)}")
+        queries.append(BenchmarkQuery(
+            id=item["id"],
+            query=item["query"],
+            expected_documents=list(item["expected_documents"]),
+            relevance_judgments=dict(item["relevance_judgments"]),
+        ))
+    return BenchmarkDataset(
+        name=raw.get("name", "search_benchmark"), version=raw.get("version", "0"),
+        documents=documents, queries=queries,
+    )
+
+
+class HashingEmbedder:
+    """
+    결정적 가짜 임베딩 - 토큰의 문자 2/3-gram 을 blake2b 로 해싱해 부호 있는 버킷에 누적 후 L2 정규화.
+    조사가 붙은 한국어 어절도 n-gram 이 겹쳐 유사도가 생기므로 검색 경로를 그대로 태울 수 있다.
+    """
+
+    def __init__(self, dimension: int = 1536):
+        self.dimension = dimension
+
+    def _features(self, text: str) -> Iterator[str]:
+        for token in _TOKEN_RE.findall(text.lower()):
+            yield token
+            for n in (2, 3):
+                for i in range(len(token) - n + 1):
+                    yield token[i:i + n]
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for feature in self._features(text or ""):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            # 빈 입력도 NaN 거리가 나오지 않도록 고정 단위 벡터
+            vector[0] = 1.0
+            return vector
+        return [v / norm for v in vector]
+
+    async def __call__(self, text: str) -> List[float]:
+        return self.embed(text)
+
+
+def embedding_dimension_for_provider(provider: str) -> int:
+    """검색 경로의 벡터 컬럼 선택과 같은 기준 (bedrock → aws 1024, 그 외 azure 1536)"""
+    return 1024 if provider == "bedrock" else 1536
+
+
+@contextmanager
+def fake_embeddings(embedder: HashingEmbedder) -> Iterator[None]:
+    """
+    검색 경로의 EmbeddingService 인스턴스(전역 + SearchService 소유)가 외부 API 대신 embedder 를 쓰도록 교체.
+    캐시/in-flight 합치기는 그대로 두고 실제 생성 함수만 바꾼다.
+    """
+    from app.services.core.embedding_service import embedding_service
+    from app.services.search.search_service import search_service
+
+    services = {id(s): s for s in (embedding_service, search_service.embedding_service)}.values()
+    originals = []
+    for service in services:
+        originals.append((service, service.__dict__.get("_generate_embedding")))
+        service._embedding_cache.clear()
+        service._generate_embedding = embedder
+    try:
+        yield
+    finally:
+        for service, original in originals:
+            if original is None:
+                del service._generate_embedding
+            else:
+                service._generate_embedding = original
+            service._embedding_cache.clear()
+
+
+async def load_corpus(
+    dataset: BenchmarkDataset,
+    embedder: HashingEmbedder,
+    container_id: str = BENCHMARK_CONTAINER_ID,
+    user_emp_no: str = BENCHMARK_USER,
+) -> Dict[int, str]:
+    """
+    코퍼스를 벤치마크 컨테이너에 (재)적재하고 벤치마크 사용자에게 VIEWER 권한 부여.
+    반환: file_bss_info_sno → 문서 id
+    """
+    from sqlalchemy import delete, select
+
+    from app.core.database import get_async_session_local
+    from app.models import (
+        TbFileBssInfo, TbKnowledgeContainers, TbSapHrInfo, TbUserPermissions, VsDocContentsChunks,
+    )
+
+    provider, column = ("aws", "aws_embedding_1024") if embedder.dimension == 1024 else ("azure", "azure_embedding_1536")
+    async with get_async_session_local()() as session:
+        if await session.get(TbSapHrInfo, user_emp_no) is None:
+            session.add(TbSapHrInfo(emp_no=user_emp_no, emp_nm="검색 벤치마크", del_yn="N"))
+        if await session.get(TbKnowledgeContainers, container_id) is None:
+            session.add(TbKnowledgeContainers(
+                container_id=container_id, container_name="검색 벤치마크", container_type="team",
+                org_level=1, org_path=f"/{container_id}", description="scripts/search_benchmark.py 적재 코퍼스",
+            ))
+        await session.flush()
+        granted = await session.execute(select(TbUserPermissions.permission_id).where(
+            TbUserPermissions.user_emp_no == user_emp_no, TbUserPermissions.container_id == container_id,
+        ))
+        if granted.first() is None:
+            session.add(TbUserPermissions(
+                user_emp_no=user_emp_no, container_id=container_id, role_id="VIEWER", permission_type="READ",
+                access_scope="CONTAINER", permission_source="benchmark", is_active=True,
+            ))
+
+        # 재적재 - 이전 실행 데이터 제거
+        await session.execute(delete(VsDocContentsChunks).where(VsDocContentsChunks.knowledge_container_id == container_id))
+        await session.execute(delete(TbFileBssInfo).where(TbFileBssInfo.knowledge_container_id == container_id))
+
+        file_map: Dict[int, str] = {}
+        for doc in dataset.documents:
+            extension = doc.title.rsplit(".", 1)[-1] if "." in doc.title else "txt"
+            file_row = TbFileBssInfo(
+                drcy_sno=0, file_lgc_nm=doc.title, file_psl_nm=f"{FILE_NAME_PREFIX}{doc.id}",
+                file_extsn=extension[:10], path=f"benchmark/{container_id}/{doc.id}", del_yn="N",
+                knowledge_container_id=container_id, owner_emp_no=user_emp_no, chunk_count=len(doc.chunks),
+                processing_status="completed", document_type="general", processing_options={},
+            )
+            session.add(file_row)
+            await session.flush()
+            file_map[file_row.file_bss_info_sno] = doc.id
+            for index, chunk_text in enumerate(doc.chunks):
+                session.add(VsDocContentsChunks(
+                    file_bss_info_sno=file_row.file_bss_info_sno, chunk_index=index, chunk_text=chunk_text,
+                    chunk_size=len(chunk_text), embedding_provider=provider,
+                    **{column: embedder.embed(chunk_text)},
+                    page_number=1, section_title=doc.title, keywords=", ".join(doc.keywords),
+                    knowledge_container_id=container_id, del_yn="N",
+                ))
+        await session.commit()
+
+    logger.info(
+        f"[SEARCH-BENCH] 코퍼스 적재: 문서 {len(file_map)}건, "
+        f"청크 {sum(len(d.chunks) for d in dataset.documents)}건 ({provider} {embedder.dimension}d)"
+    )
+    return file_map
+
+
+async def corpus_file_map(container_id: str = BENCHMARK_CONTAINER_ID) -> Dict[int, str]:
+    """적재된 코퍼스의 file_bss_info_sno → 문서 id (load_corpus 없이 run 만 할 때)"""
+    from sqlalchemy import select
+
+    from app.core.database import get_async_session_local
+    from app.models import TbFileBssInfo
+
+    async with get_async_session_local()() as session:
+        rows = await session.execute(
+            select(TbFileBssInfo.file_bss_info_sno, TbFileBssInfo.file_psl_nm).where(
+                TbFileBssInfo.knowledge_container_id == container_id, TbFileBssInfo.del_yn == "N",
+            )
+        )
+        return {
+            row.file_bss_info_sno: row.file_psl_nm[len(FILE_NAME_PREFIX):]
+            for row in rows
+            if (row.file_psl_nm or "").startswith(FILE_NAME_PREFIX)
+        }
+
+
+def ranked_documents(file_ids: Sequence[Any], file_map: Dict[int, str]) -> List[str]:
+    """결과의 파일 ID 순서 → 중복 제거한 문서 id 순위 (코퍼스 밖 파일은 그대로 문자열로 남겨 정밀도에 반영)"""
+    ranked: List[str] = []
+    seen = set()
+    for file_id in file_ids:
+        if file_id is None:
+            continue
+        try:
+            key = file_map.get(int(file_id), str(file_id))
+        except (TypeError, ValueError):
+            key = str(file_id)
+        if key not in seen:
+            seen.add(key)
+            ranked.append(key)
+    return ranked
+
+
+def latency_percentiles(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """nearest-rank 백분위 (표본 수가 적어도 실제 관측값만 보고)"""
+    if not samples_ms:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples_ms)
+
+    def rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        "p50_ms": round(rank(50), 2),
+        "p95_ms": round(rank(95), 2),
+        "p99_ms": round(rank(99), 2),
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def evaluate_rankings(
+    queries: Sequence[BenchmarkQuery], rankings: Dict[str, List[str]], k: int
+) -> Dict[str, float]:
+    """질의별 문서 순위 → 평균 recall@k / nDCG@k / MRR / 결과 없음 비율"""
+    if not queries:
+        return {}
+    recall = ndcg = mrr = 0.0
+    empty = 0
+    for query in queries:
+        ranked = rankings.get(query.id, [])
+        if not ranked:
+            empty += 1
+        recall += calculate_recall_at_k(ranked, query.expected_documents, k=k)
+        ndcg += calculate_ndcg_at_k(ranked, query.relevance_judgments, k=k)
+        mrr += calculate_mrr(ranked, query.expected_documents)
+    n = len(queries)
+    return {
+        f"recall@{k}": round(recall / n, 4),
+        f"ndcg@{k}": round(ndcg / n, 4),
+        "mrr": round(mrr / n, 4),
+        "zero_result_rate": round(empty / n, 4),
+    }
+
+
+SearchFn = Callable[[str], Awaitable[List[Any]]]
+
+
+def build_search_fn(mode: str, k: int, container_id: str, user_emp_no: str) -> SearchFn:
+    """모드 → 질의 하나를 실행해 결과 파일 ID 목록(순위 순)을 돌려주는 함수"""
+    if mode in _SEARCH_TYPES:
+        from app.services.search.search_service import search_service
+
+        async def run_hybrid(query: str) -> List[Any]:
+            result = await search_service.hybrid_search(
+                query, user_emp_no, container_ids=[container_id], max_results=k, search_type=_SEARCH_TYPES[mode],
+            )
+            return [r.get("file_bss_info_sno") or r.get("file_id") for r in result.get("results", [])]
+
+        return run_hybrid
+
+    if mode == "rag":
+        from app.core.database import get_async_session_local
+        from app.services.chat.rag_search_service import RAGSearchParams, rag_search_service
+
+        async def run_rag(query: str) -> List[Any]:
+            params = RAGSearchParams(
+                query=query, container_ids=[container_id], max_chunks=k, use_reranking=False, reranking=False,
+            )
+            async with get_async_session_local()() as session:
+                result = await rag_search_service.search_for_rag_context(
+                    session, params, enable_multiturn_context=False,
+                )
+            return [chunk.get("file_bss_info_sno") for chunk in result.chunks]
+
+        return run_rag
+
+    if mode.startswith("agent:"):
+        from app.agents.features.search_rag.agent import paper_search_agent
+        from app.core.contracts import AgentConstraints, AgentIntent
+        from app.core.database import get_async_session_local
+
+        intent = AgentIntent(mode.split(":", 1)[1])
+
+        async def run_agent(query: str) -> List[Any]:
+            constraints = AgentConstraints(max_chunks=k, container_ids=[container_id])
+            strategy = paper_search_agent.select_strategy(intent, constraints)
+            async with get_async_session_local()() as session:
+                result = await paper_search_agent.execute_strategy(
+                    strategy=strategy, query=query, keywords=[], constraints=constraints, db_session=session,
+                )
+            return [chunk.file_id for chunk in result["chunks"]]
+
+        return run_agent
+
+    raise ValueError(f"알 수 없는 검색 모드: {mode} (가능: {', '.join(SEARCH_MODES)})")
+
+
+async def _run_pass(
+    search: SearchFn, queries: Sequence[BenchmarkQuery], concurrency: int
+) -> tuple[Dict[str, List[Any]], List[float], int, float]:
+    """질의 세트 1회 실행 (동시 실행 수 제한) → 결과, 지연 목록, 오류 수, 총 소요(초)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    results: Dict[str, List[Any]] = {}
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(query: BenchmarkQuery) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                results[query.id] = await search(query.query)
+            except Exception as e:
+                errors += 1
+                logger.warning(f"[SEARCH-BENCH] {query.id} 실패: {e}")
+            finally:
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    return results, latencies, errors, time.perf_counter() - wall_started
+
+
+async def run_benchmark(
+    dataset: BenchmarkDataset,
+    file_map: Dict[int, str],
+    modes: Sequence[str] = ("hybrid", "rag"),
+    concurrency_levels: Sequence[int] = (1, 4),
+    k: int = 10,
+    repeat: int = 3,
+    warmup: bool = True,
+    container_id: str = BENCHMARK_CONTAINER_ID,
+    user_emp_no: str = BENCHMARK_USER,
+) -> Dict[str, Any]:
+    """
+    모드 × 동시성 수준별 실행 → JSON 직렬화 가능한 리포트.
+    품질 지표는 동시성 1(첫 수준) 첫 회차 결과로, 지연은 수준별 repeat 회차 전체로 계산한다.
+    """
+    report: Dict[str, Any] = {
+        "dataset": {"name": dataset.name, "version": dataset.version,
+                    "documents": len(dataset.documents), "queries": len(dataset.queries)},
+        "config": {"k": k, "repeat": repeat, "concurrency": list(concurrency_levels), "warmup": warmup},
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "modes": {},
+    }
+    for mode in modes:
+        search = build_search_fn(mode, k, container_id, user_emp_no)
+        if warmup:
+            # 커넥션 풀 / 캐시 / 지연 import 비용을 측정에서 제외
+            await _run_pass(search, dataset.queries[:3], 1)
+
+        mode_report: Dict[str, Any] = {"quality": {}, "latency": {}}
+        for level in concurrency_levels:
+            latencies: List[float] = []
+            errors = 0
+            wall = 0.0
+            for round_no in range(max(1, repeat)):
+                results, pass_latencies, pass_errors, pass_wall = await _run_pass(search, dataset.queries, level)
+                latencies.extend(pass_latencies)
+                errors += pass_errors
+                wall += pass_wall
+                if not mode_report["quality"] and round_no == 0:
+                    rankings = {qid: ranked_documents(ids, file_map) for qid, ids in results.items()}
+                    mode_report["quality"] = evaluate_rankings(dataset.queries, rankings, k)
+            mode_report["latency"][f"c{level}"] = {
+                **latency_percentiles(latencies),
+                "requests": len(latencies),
+                "errors": errors,
+                "qps": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+            }
+        report["modes"][mode] = mode_report
+        logger.info(f"[SEARCH-BENCH] {mode}: {mode_report['quality']} {mode_report['latency']}")
+    return report
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    max_quality_drop: float = 0.02,
+    max_latency_increase: float = 0.2,
+) -> List[str]:
+    """
+    기준 리포트 대비 회귀 목록 (비어 있으면 통과).
+    품질은 절대 하락폭, 지연은 p50/p95 상대 증가율로 판정 (zero_result_rate 는 증가가 회귀).
+    """
+    regressions: List[str] = []
+    for mode, base in baseline.get("modes", {}).items():
+        cur = current.get("modes", {}).get(mode)
+        if cur is None:
+            regressions.append(f"{mode}: 현재 리포트에 없음")
+            continue
+        for metric, base_value in base.get("quality", {}).items():
+            cur_value = cur.get("quality", {}).get(metric)
+            if cur_value is None:
+                continue
+            drop = (cur_value - base_value) if metric == "zero_result_rate" else (base_value - cur_value)
+            if drop > max_quality_drop:
+                regressions.append(f"{mode} {metric}: {base_value:.4f} → {cur_value:.4f}")
+        for level, base_latency in base.get("latency", {}).items():
+            cur_latency = cur.get("latency", {}).get(level)
+            if cur_latency is None:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                before, after = base_latency.get(metric, 0.0), cur_latency.get(metric, 0.0)
+                if before > 0 and (after - before) / before > max_latency_increase:
+                    regressions.append(f"{mode} {level} {metric}: {before:.1f} → {after:.1f}")
+            if cur_latency.get("errors", 0) > base_latency.get("errors", 0):
+                regressions.append(
+                    f"{mode} {level} errors: {base_latency.get('errors', 0)} → {cur_latency['errors']}"
+                )
+    return regressions
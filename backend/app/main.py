@@ -1,7 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
+import hmac
 import logging
 import os
 import asyncio
@@ -35,6 +36,7 @@ from app.api.v1.admin_ipc_permissions import router as admin_ipc_permissions_rou
 from app.api.v1.ip_portfolio import router as ip_portfolio_router  # 📁 IP 포트폴리오(IPC 중심)
 
 from app.core.config import settings
+from app.core.profiling import metrics_registry
 
 def configure_logging():
     os.makedirs(settings.log_dir, exist_ok=True)
@@ -283,6 +285,18 @@ async def lifespan(app: FastAPI):
     try:
         logger.info("🛑 서버 종료 프로세스 시작...")
         
+        # 음성 전사 폴러 중지 및 진행 중 작업 정리
+        from app.services.core.transcription_job_service import transcription_job_manager
+        await transcription_job_manager.shutdown()
+        
+        # 검색 이벤트 큐에 남은 이벤트 적재
+        from app.services.search.search_event_sink import search_event_sink
+        await search_event_sink.shutdown()
+        
+        # 오브젝트 스토리지 공유 클라이언트 정리
+        from app.services.core.object_storage import close_object_storages
+        await close_object_storages()
+        
         # 진행 중인 비동기 작업들에 짧은 대기 시간 부여
         await asyncio.sleep(0.1)
         
@@ -416,6 +430,16 @@ async def health_check():
         }
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str = Header(default="")):
+    """검색/RAG 단계별 지연 히스토그램 (Prometheus 텍스트 형식, 샘플링된 요청 기준)"""
+    if not settings.metrics_endpoint_enabled:
+        raise HTTPException(status_code=404)
+    token = settings.metrics_endpoint_token
+    if token and not hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(metrics_registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     # nest_asyncio와 호환을 위해 uvloop 비활성화
@@ -35,7 +35,10 @@ from .document import (
     TbFileBssInfo,
     TbFileDtlInfo,
     VsDocContentsChunks,
-    TbDocumentSearchIndex  # 통합검색 모델 추가
+    TbDocumentVectors,
+    TbDocumentSearchIndex,  # 통합검색 모델 추가
+    TbSearchTermStats,
+    TbSearchCorpusStats
 )
 
 # 멀티모달 RAG 모델
@@ -51,7 +54,10 @@ from .document.multimodal_models import (
 from .search import (
     TbKnowledgeAccessLog,
     TbKnowledgeSharingLog,
-    TbSearchAnalytics
+    TbSearchAnalytics,
+    TbSearchEvents,
+    TbSearchDailyRollup,
+    TbSearchQueryRollup,
 )
 
 # 학술 서지정보 모델
@@ -75,6 +81,8 @@ from .patent import (
     TbPatentSearchSessions,
     TbPatentSearchResults,
     TbPatentPriorArtReports,
+    TbPatentStatsCube,
+    TbPatentClaimEmbeddings,
     TbPatentCollectionSettings,
     TbPatentCollectionTasks,
     TbIpcCode,
@@ -86,7 +94,8 @@ from .patent import (
 from .chat import (
     TbChatHistory,
     TbChatSessions,
-    TbChatFeedback
+    TbChatFeedback,
+    TbRagAnswerCache
 )
 
 __all__ = [
@@ -114,12 +123,18 @@ __all__ = [
     "TbFileBssInfo",
     "TbFileDtlInfo", 
     "VsDocContentsChunks",
+    "TbDocumentVectors",
     "TbDocumentSearchIndex",  # 통합검색 모델
+    "TbSearchTermStats",
+    "TbSearchCorpusStats",
     
     # 검색 및 분석 모델
     "TbKnowledgeAccessLog",
     "TbKnowledgeSharingLog",
     "TbSearchAnalytics",
+    "TbSearchEvents",
+    "TbSearchDailyRollup",
+    "TbSearchQueryRollup",
     
     # 학술 서지정보 모델
     "TbAcademicDocumentMetadata",
@@ -139,6 +154,8 @@ __all__ = [
     "TbPatentSearchSessions",
     "TbPatentSearchResults",
     "TbPatentPriorArtReports",
+    "TbPatentStatsCube",
+    "TbPatentClaimEmbeddings",
     "TbPatentCollectionSettings",
     "TbPatentCollectionTasks",
     "TbIpcCode",
@@ -149,4 +166,5 @@ __all__ = [
     "TbChatHistory",
     "TbChatSessions",
     "TbChatFeedback",
+    "TbRagAnswerCache",
 ]
@@ -4,7 +4,8 @@ WKMS 채팅 및 대화 관리 모델 패키지
 from .chat_models import (
     TbChatHistory,
     TbChatSessions,
-    TbChatFeedback
+    TbChatFeedback,
+    TbRagAnswerCache
 )
 
 # Redis 기반 실시간 채팅 스키마
@@ -37,6 +38,7 @@ __all__ = [
     "TbChatHistory",
     "TbChatSessions", 
     "TbChatFeedback",
+    "TbRagAnswerCache",
     
     # Redis 실시간 채팅 스키마
     "RedisChatSession",
@@ -2,7 +2,7 @@
 WKMS 채팅 및 대화 관리 모델
 """
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ARRAY
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, Float, ARRAY, Index
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
 from pgvector.sqlalchemy import Vector
@@ -102,3 +102,52 @@ class TbChatFeedback(Base):
     
     # 시스템 필드
     created_date = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일")
+
+
+class TbRagAnswerCache(Base):
+    """
+    RAG 답변 시맨틱 캐시
+
+    (권한 범위 해시, 권한 버전, 코퍼스 버전) 이 같은 항목 중 질의 임베딩이 충분히 가까우면
+    저장된 답변을 재사용한다. 인용 문서가 삭제/수정되면 조회에서 제외된다.
+    """
+    __tablename__ = "tb_rag_answer_cache"
+
+    cache_id = Column(BigInteger, primary_key=True, autoincrement=True, comment="캐시 ID")
+
+    # 캐시 키
+    scope_hash = Column(String(64), nullable=False, comment="접근 컨테이너/문서 범위 + 검색 파라미터 해시")
+    permission_version = Column(String(32), nullable=False, comment="권한 버전 (변경 시 전체 무효)")
+    corpus_version = Column(String(32), nullable=False, comment="범위 내 문서 구성 버전")
+    query_text = Column(Text, nullable=False, comment="원 질의")
+    azure_embedding_1536 = Column(Vector(1536), nullable=True, comment="질의 임베딩 (Azure OpenAI)")
+    aws_embedding_1024 = Column(Vector(1024), nullable=True, comment="질의 임베딩 (AWS Bedrock)")
+
+    # 캐시 값
+    answer = Column(Text, nullable=False, comment="답변")
+    payload = Column(JSONB, nullable=True, comment="참조/메타데이터 (응답 형식별)")
+    cited_chunk_ids = Column(ARRAY(String(100)), nullable=True, comment="인용 청크 ID")
+    cited_file_ids = Column(ARRAY(BigInteger), nullable=True, comment="인용 문서 ID (file_bss_info_sno)")
+
+    # 통계 / 만료
+    hit_count = Column(Integer, nullable=False, default=0, comment="재사용 횟수")
+    last_hit_date = Column(DateTime(timezone=True), nullable=True, comment="최근 재사용일")
+    expires_at = Column(DateTime(timezone=True), nullable=False, comment="만료 시각")
+    created_date = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일")
+
+
+Index('idx_rag_answer_cache_scope', TbRagAnswerCache.scope_hash, TbRagAnswerCache.permission_version, TbRagAnswerCache.corpus_version)
+Index('idx_rag_answer_cache_files', TbRagAnswerCache.cited_file_ids, postgresql_using='gin')
+Index('idx_rag_answer_cache_expires', TbRagAnswerCache.expires_at)
+Index(
+    'idx_rag_answer_cache_azure_1536',
+    TbRagAnswerCache.azure_embedding_1536,
+    postgresql_using='hnsw',
+    postgresql_ops={'azure_embedding_1536': 'vector_cosine_ops'},
+)
+Index(
+    'idx_rag_answer_cache_aws_1024',
+    TbRagAnswerCache.aws_embedding_1024,
+    postgresql_using='hnsw',
+    postgresql_ops={'aws_embedding_1024': 'vector_cosine_ops'},
+)
@@ -2,8 +2,8 @@
 WKMS 문서 관리 모델 패키지
 """
 from .file_models import TbFileBssInfo, TbFileDtlInfo
-from .vector_models import VsDocContentsChunks
-from .unified_search_models import TbDocumentSearchIndex  # 통합검색 모델 활성화
+from .vector_models import VsDocContentsChunks, TbDocumentVectors
+from .unified_search_models import TbDocumentSearchIndex, TbSearchTermStats, TbSearchCorpusStats  # 통합검색 모델 활성화
 
 __all__ = [
     # 파일 관리 모델
@@ -11,6 +11,10 @@ __all__ = [
     "TbFileDtlInfo",
     # 벡터 청킹 모델
     "VsDocContentsChunks",
+    "TbDocumentVectors",  # 문서 단위 대표 벡터 (연관 문서 추천)
     # 통합검색 모델 (vs_doc_contents_index 대체)
     "TbDocumentSearchIndex",  # 활성화
+    # 키워드 검색 BM25 통계
+    "TbSearchTermStats",
+    "TbSearchCorpusStats",
 ]
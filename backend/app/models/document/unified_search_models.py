@@ -6,7 +6,7 @@
 - kiwipiepy 관련 필드 제거 (keywords, proper_nouns, corp_names)
 - textsearch_ko 중심 검색으로 전환
 """
-from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Index, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Index, ForeignKey, Float
 from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -93,3 +93,28 @@ Index('idx_search_status', TbDocumentSearchIndex.indexing_status)
 Index('idx_search_has_images', TbDocumentSearchIndex.has_images)
 Index('idx_search_multimodal', TbDocumentSearchIndex.has_images, TbDocumentSearchIndex.image_count)
 Index('idx_search_images_metadata', TbDocumentSearchIndex.images_metadata, postgresql_using='gin')
+
+# 트라이그램 인덱스 (ILIKE 부분 일치 보조 검색, pg_trgm)
+Index('idx_search_full_content_trgm', TbDocumentSearchIndex.full_content,
+      postgresql_using='gin', postgresql_ops={'full_content': 'gin_trgm_ops'})
+Index('idx_search_document_title_trgm', TbDocumentSearchIndex.document_title,
+      postgresql_using='gin', postgresql_ops={'document_title': 'gin_trgm_ops'})
+
+
+class TbSearchTermStats(Base):
+    """키워드 검색 BM25 용 질의어 문서 빈도 (ts_stat 주기 집계)"""
+    __tablename__ = "tb_search_term_stats"
+
+    profile = Column(String(10), primary_key=True, comment="검색 프로필 (ko: 한국어+simple, en: English)")
+    term = Column(Text, primary_key=True, comment="어휘 (tsvector lexeme)")
+    doc_freq = Column(Integer, nullable=False, default=0, comment="어휘가 포함된 문서 수")
+
+
+class TbSearchCorpusStats(Base):
+    """키워드 검색 BM25 용 코퍼스 통계"""
+    __tablename__ = "tb_search_corpus_stats"
+
+    profile = Column(String(10), primary_key=True, comment="검색 프로필")
+    doc_count = Column(Integer, nullable=False, default=0, comment="색인 완료 문서 수")
+    avg_doc_length = Column(Float, nullable=False, default=0.0, comment="평균 문서 길이 (tsvector 고유 어휘 수)")
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, comment="집계 일시")
@@ -2,7 +2,7 @@
 통합 벡터 청킹 모델 - VS 접두사 명명 규칙 적용
 기존 VsDocContentsChunks만 유지 (VsDocContentsIndex는 TbDocumentSearchIndex로 대체)
 """
-from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Float, Index, Boolean
+from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, Float, Index, Boolean, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
@@ -61,9 +61,71 @@ class VsDocContentsChunks(Base):
     last_modified_date = Column('last_modified_date', DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 # 인덱스 정의 (벡터 검색 최적화)
-Index('idx_vs_doc_chunks_embedding', VsDocContentsChunks.chunk_embedding, postgresql_using='ivfflat')
+Index('idx_vs_doc_chunks_embedding', VsDocContentsChunks.chunk_embedding, postgresql_using='hnsw', postgresql_ops={'chunk_embedding': 'vector_cosine_ops'})
+# 프로바이더별 부분 HNSW 인덱스 (검색 질의의 embedding_provider 필터와 같은 조건, vector_index_manager 참고)
+Index(
+    'idx_vs_chunks_azure_1536_hnsw',
+    VsDocContentsChunks.azure_embedding_1536,
+    postgresql_using='hnsw',
+    postgresql_with={'m': 16, 'ef_construction': 128},
+    postgresql_ops={'azure_embedding_1536': 'vector_cosine_ops'},
+    postgresql_where=VsDocContentsChunks.embedding_provider == 'azure',
+)
+Index(
+    'idx_vs_chunks_aws_1024_hnsw',
+    VsDocContentsChunks.aws_embedding_1024,
+    postgresql_using='hnsw',
+    postgresql_with={'m': 16, 'ef_construction': 128},
+    postgresql_ops={'aws_embedding_1024': 'vector_cosine_ops'},
+    postgresql_where=VsDocContentsChunks.embedding_provider == 'aws',
+)
+Index(
+    'idx_vs_chunks_multimodal_512_hnsw',
+    VsDocContentsChunks.multimodal_embedding,
+    postgresql_using='hnsw',
+    postgresql_with={'m': 16, 'ef_construction': 128},
+    postgresql_ops={'multimodal_embedding': 'vector_cosine_ops'},
+)
 Index('idx_vs_doc_chunks_file_sno', VsDocContentsChunks.file_bss_info_sno)
 Index('idx_vs_doc_chunks_container_id', VsDocContentsChunks.knowledge_container_id)
 Index('idx_vs_doc_chunks_del_yn', VsDocContentsChunks.del_yn)
 Index('idx_vs_doc_chunks_page_number', VsDocContentsChunks.page_number)
 
+
+
+class TbDocumentVectors(Base):
+    """문서 단위 대표 벡터 (centroid 1개 + 구간별 medoid 여러 개)
+
+    연관 문서 추천 / 유사 문서 조회가 청크 전체를 훑지 않도록 문서당 몇 개의 벡터만 유지한다.
+    청크 임베딩이 저장/삭제될 때 document_vector_service 가 해당 문서 행만 다시 계산한다.
+    """
+    __tablename__ = "tb_document_vectors"
+
+    vector_sno = Column('vector_sno', Integer, primary_key=True, autoincrement=True)
+    file_bss_info_sno = Column('file_bss_info_sno', Integer, nullable=False, comment="문서 ID")
+    knowledge_container_id = Column('knowledge_container_id', String(50), nullable=True, comment="지식 컨테이너 ID")
+    vector_kind = Column('vector_kind', String(10), nullable=False, comment="centroid | medoid")
+    member_rank = Column('member_rank', Integer, nullable=False, default=0, comment="medoid 구간 번호 (centroid 는 0)")
+    chunk_count = Column('chunk_count', Integer, nullable=False, default=0, comment="대표하는 청크 수")
+    azure_embedding_1536 = Column('azure_embedding_1536', Vector(1536), nullable=True, comment="Azure 청크 임베딩 대표값")
+    aws_embedding_1024 = Column('aws_embedding_1024', Vector(1024), nullable=True, comment="AWS 청크 임베딩 대표값")
+    updated_at = Column('updated_at', DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('file_bss_info_sno', 'vector_kind', 'member_rank', name='uq_document_vectors_member'),
+    )
+
+
+Index('idx_document_vectors_container', TbDocumentVectors.knowledge_container_id)
+Index(
+    'idx_document_vectors_azure_1536',
+    TbDocumentVectors.azure_embedding_1536,
+    postgresql_using='hnsw',
+    postgresql_ops={'azure_embedding_1536': 'vector_cosine_ops'},
+)
+Index(
+    'idx_document_vectors_aws_1024',
+    TbDocumentVectors.aws_embedding_1024,
+    postgresql_using='hnsw',
+    postgresql_ops={'aws_embedding_1024': 'vector_cosine_ops'},
+)
@@ -12,6 +12,8 @@ from .patent_models import (
     TbPatentSearchSessions,
     TbPatentSearchResults,
     TbPatentPriorArtReports,
+    TbPatentStatsCube,
+    TbPatentClaimEmbeddings,
 )
 from .collection_models import (
     TbPatentCollectionSettings,
@@ -34,6 +36,8 @@ __all__ = [
     "TbPatentSearchSessions",
     "TbPatentSearchResults",
     "TbPatentPriorArtReports",
+    "TbPatentStatsCube",
+    "TbPatentClaimEmbeddings",
     "TbPatentCollectionSettings",
     "TbPatentCollectionTasks",
     "TbIpcCode",
@@ -149,7 +149,7 @@ Index('idx_patent_application_date', TbPatentBibliographicInfo.application_date)
 Index('idx_patent_container', TbPatentBibliographicInfo.knowledge_container_id)
 Index('idx_patent_family', TbPatentBibliographicInfo.family_id)
 Index('idx_patent_del_yn', TbPatentBibliographicInfo.del_yn)
-Index('idx_patent_embedding', TbPatentBibliographicInfo.embedding_vector, postgresql_using='ivfflat', postgresql_ops={'embedding_vector': 'vector_cosine_ops'})
+Index('idx_patent_embedding_hnsw', TbPatentBibliographicInfo.embedding_vector, postgresql_using='hnsw', postgresql_ops={'embedding_vector': 'vector_cosine_ops'})
 
 
 # =============================================================================
@@ -480,3 +480,72 @@ class TbPatentPriorArtReports(Base):
 
 Index('idx_report_session', TbPatentPriorArtReports.session_id)
 Index('idx_report_date', TbPatentPriorArtReports.created_date)
+
+
+# =============================================================================
+# 11. 특허 통계 큐브 (트렌드/포트폴리오 분석용)
+# =============================================================================
+
+class TbPatentStatsCube(Base):
+    """
+    (관할권, IPC 서브클래스, 출원연도, 출원인) 단위 특허 건수 집계
+
+    특허는 주 IPC 서브클래스와 제1 출원인 기준으로 한 번만 집계된다.
+    수집 시 증분 갱신되며, 트렌드/포트폴리오 분석은 원본 테이블 대신 이 큐브를 GROUP BY 한다.
+    빈 값은 NULL 대신 '' / 0 으로 저장한다 (유니크 키 충돌 처리용).
+    """
+    __tablename__ = "tb_patent_stats_cube"
+
+    cube_id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    jurisdiction = Column(String(10), nullable=False, default='KR', comment="관할권 코드")
+    ipc_subclass = Column(String(4), nullable=False, default='', comment="주 IPC 서브클래스 (예: G06N)")
+    application_year = Column(Integer, nullable=False, default=0, comment="출원연도 (미상=0)")
+    applicant_name = Column(String(300), nullable=False, default='', comment="제1 출원인")
+
+    patent_count = Column(Integer, nullable=False, default=0, comment="특허 건수")
+    last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+Index(
+    'ux_patent_stats_cube_key',
+    TbPatentStatsCube.jurisdiction,
+    TbPatentStatsCube.ipc_subclass,
+    TbPatentStatsCube.application_year,
+    TbPatentStatsCube.applicant_name,
+    unique=True,
+)
+Index('idx_patent_stats_cube_applicant', TbPatentStatsCube.applicant_name)
+
+
+# =============================================================================
+# 12. 청구항 임베딩 테이블 (청구항 단위 유사도 검색)
+# =============================================================================
+
+class TbPatentClaimEmbeddings(Base):
+    """
+    청구항 단위 임베딩
+
+    유사 특허 검색 시 참조 청구항별 최근접 청구항을 찾고 특허 단위 max-sim 으로 집계한다.
+    """
+    __tablename__ = "tb_patent_claim_embeddings"
+
+    claim_embedding_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    patent_id = Column(BigInteger, ForeignKey('tb_patent_bibliographic_info.patent_id', ondelete='CASCADE'), nullable=False)
+
+    claim_no = Column(Integer, nullable=False, comment="청구항 번호")
+    is_independent = Column(Boolean, nullable=False, default=False, comment="독립항 여부")
+    claim_text = Column(Text, nullable=False, comment="청구항 본문")
+    embedding_vector = Column(Vector(1536), nullable=False, comment="청구항 임베딩")
+
+    created_date = Column(DateTime(timezone=True), server_default=func.now())
+
+
+Index('ux_patent_claim_embedding', TbPatentClaimEmbeddings.patent_id, TbPatentClaimEmbeddings.claim_no, unique=True)
+# 점진적으로 채워지는 테이블이라 빌드 시점 데이터에 의존하는 ivfflat 대신 hnsw 사용
+Index(
+    'idx_patent_claim_embedding',
+    TbPatentClaimEmbeddings.embedding_vector,
+    postgresql_using='hnsw',
+    postgresql_ops={'embedding_vector': 'vector_cosine_ops'},
+)
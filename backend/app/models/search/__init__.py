@@ -4,7 +4,10 @@ WKMS 검색 및 분석 모델 패키지
 from .analytics_models import (
     TbKnowledgeAccessLog,
     TbKnowledgeSharingLog,
-    TbSearchAnalytics
+    TbSearchAnalytics,
+    TbSearchEvents,
+    TbSearchDailyRollup,
+    TbSearchQueryRollup,
 )
 
 __all__ = [
@@ -12,4 +15,7 @@ __all__ = [
     "TbKnowledgeAccessLog",
     "TbKnowledgeSharingLog", 
     "TbSearchAnalytics",
+    "TbSearchEvents",
+    "TbSearchDailyRollup",
+    "TbSearchQueryRollup",
 ]
@@ -2,7 +2,7 @@
 WKMS 검색 및 분석 로그 모델
 """
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ARRAY
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Date, Boolean, Float, ARRAY, Index
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
 from app.core.database import Base
@@ -94,3 +94,53 @@ class TbSearchAnalytics(Base):
     # 시스템 필드
     created_date = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일")
     last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="마지막 업데이트")
+
+
+class TbSearchEvents(Base):
+    """검색 이벤트 원본 (월 단위 RANGE 파티션, search_event_sink 가 배치 적재)"""
+    __tablename__ = "tb_search_events"
+    __table_args__ = (
+        Index("idx_search_events_occurred_at", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    # 파티션 키는 기본키에 포함되어야 함
+    event_id = Column(BigInteger, primary_key=True, autoincrement=True, comment="이벤트 ID")
+    occurred_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), comment="검색 일시")
+    user_emp_no = Column(String(20), nullable=False, comment="사용자 사번")
+    query_text = Column(Text, nullable=False, comment="검색 쿼리 원문")
+    query_norm = Column(String(200), nullable=False, comment="정규화 쿼리 (소문자, 공백 정리)")
+    search_type = Column(String(20), nullable=False, comment="검색 타입 (hybrid/vector_only/keyword_only)")
+    result_count = Column(Integer, nullable=False, default=0, comment="검색 결과 수")
+    latency_ms = Column(Float, nullable=True, comment="검색 처리 시간 (밀리초)")
+    container_ids = Column(ARRAY(String(50)), nullable=True, comment="검색 대상 컨테이너")
+    top_file_ids = Column(ARRAY(Integer), nullable=True, comment="상위 결과 파일 일련번호")
+
+
+class TbSearchDailyRollup(Base):
+    """일별/사용자별 검색 집계 (검색 분석용)"""
+    __tablename__ = "tb_search_daily_rollup"
+
+    rollup_date = Column(Date, primary_key=True, comment="집계 일자")
+    user_emp_no = Column(String(20), primary_key=True, comment="사용자 사번")
+    search_count = Column(Integer, nullable=False, default=0, comment="검색 수")
+    success_count = Column(Integer, nullable=False, default=0, comment="결과가 있었던 검색 수")
+    total_latency_ms = Column(Float, nullable=False, default=0.0, comment="검색 처리 시간 합계 (밀리초)")
+
+
+class TbSearchQueryRollup(Base):
+    """일별/검색어별 집계 (인기 검색어, 검색어 제안용)"""
+    __tablename__ = "tb_search_query_rollup"
+    __table_args__ = (
+        Index(
+            "idx_search_query_rollup_prefix", "query_norm",
+            postgresql_ops={"query_norm": "text_pattern_ops"},
+        ),
+    )
+
+    rollup_date = Column(Date, primary_key=True, comment="집계 일자")
+    query_norm = Column(String(200), primary_key=True, comment="정규화 쿼리")
+    search_count = Column(Integer, nullable=False, default=0, comment="검색 수")
+    user_count = Column(Integer, nullable=False, default=0, comment="검색한 사용자 수")
+    hit_count = Column(Integer, nullable=False, default=0, comment="결과가 있었던 검색 수")
+    last_searched_at = Column(DateTime(timezone=True), nullable=True, comment="마지막 검색 일시")
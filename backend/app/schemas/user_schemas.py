@@ -168,6 +168,7 @@ class TokenData(BaseModel):
     username: Optional[str] = None
     user_id: Optional[int] = None
     is_admin: Optional[bool] = False
+    jti: Optional[str] = None  # 토큰 식별자 (jti 클레임, 없으면 토큰 해시) - 인증 주체 캐시 키
 
 # === SAP 동기화 스키마 ===
 class SapSyncRequest(BaseModel):
@@ -8,6 +8,8 @@ Auth Services Package
 - user_service: 사용자 관리 서비스
 - container_service: 컨테이너 관리 서비스
 - permission_request_service: 권한 요청 서비스
+- container_tree_service: 컨테이너 트리 스냅샷 (계층/문서 수/권한 공유 캐시)
+- principal_cache: 인증 주체 캐시 ((사번, 토큰 jti) → 사용자 스냅샷)
 """
 
 # 현재 import는 하지 않음 (순환 참조 방지)
@@ -20,4 +22,6 @@ __all__ = [
     "container_service",
     "permission_request_service",
     "ipc_permission_service",
+    "container_tree_service",
+    "principal_cache",
 ]
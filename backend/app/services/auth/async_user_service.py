@@ -16,6 +16,7 @@ from app.schemas.user_schemas import (
     SapSyncRequest, SapSyncResponse
 )
 from app.core.security import AuthUtils, SecurityUtils, PasswordPolicy
+from app.services.auth.principal_cache import principal_cache
 
 class AsyncUserService:
     """비동기 사용자 관리 서비스"""
@@ -172,6 +173,7 @@ class AsyncUserService:
         db_user.last_modified_date = datetime.now(timezone.utc)
         
         await self.db.commit()
+        principal_cache.invalidate(db_user.emp_no)
         await self.db.refresh(db_user)
         
         return db_user
@@ -209,6 +211,7 @@ class AsyncUserService:
         db_user.last_modified_date = datetime.now(timezone.utc)
         
         await self.db.commit()
+        principal_cache.invalidate(db_user.emp_no)
         
         return True
     
@@ -242,6 +245,7 @@ class AsyncUserService:
         db_user.last_modified_date = datetime.now(timezone.utc)
         
         await self.db.commit()
+        principal_cache.invalidate(db_user.emp_no)
         
         return new_password
     
@@ -283,6 +287,7 @@ class AsyncUserService:
         user.last_login = datetime.now(timezone.utc)
         
         await self.db.commit()
+        principal_cache.invalidate(user.emp_no)
         
         return user
     
@@ -387,6 +392,7 @@ class AsyncUserService:
         db_user.last_modified_date = datetime.now(timezone.utc)
         
         await self.db.commit()
+        principal_cache.invalidate(db_user.emp_no)
         
         return True
     
@@ -395,6 +401,7 @@ class AsyncUserService:
         processed = 0
         failed = 0
         errors = []
+        changed_emp_nos = []
         
         for user_id in user_ids:
             try:
@@ -405,6 +412,7 @@ class AsyncUserService:
                     continue
                 
                 db_user.is_active = False
+                changed_emp_nos.append(db_user.emp_no)
                 db_user.last_modified_date = datetime.now(timezone.utc)
                 processed += 1
             except Exception as e:
@@ -412,6 +420,7 @@ class AsyncUserService:
                 failed += 1
         
         await self.db.commit()
+        principal_cache.invalidate(*changed_emp_nos)
         return processed, failed, errors
     
     async def bulk_update_role(self, user_ids: List[int], is_admin: bool) -> Tuple[int, int, List[str]]:
@@ -419,6 +428,7 @@ class AsyncUserService:
         processed = 0
         failed = 0
         errors = []
+        changed_emp_nos = []
         
         for user_id in user_ids:
             try:
@@ -429,6 +439,7 @@ class AsyncUserService:
                     continue
                 
                 db_user.is_admin = is_admin
+                changed_emp_nos.append(db_user.emp_no)
                 db_user.last_modified_date = datetime.now(timezone.utc)
                 processed += 1
             except Exception as e:
@@ -436,6 +447,7 @@ class AsyncUserService:
                 failed += 1
         
         await self.db.commit()
+        principal_cache.invalidate(*changed_emp_nos)
         return processed, failed, errors
     
     async def get_all_departments(self) -> List[dict]:
@@ -606,6 +618,7 @@ class AsyncSapHrService:
                     errors.append(f"사번 {sap_user.EMP_NO} 동기화 실패: {str(e)}")
             
             await self.db.commit()
+            principal_cache.clear()
             
             return SapSyncResponse(
                 success=True,
@@ -16,6 +16,7 @@ from app.models import (
     User
 )
 from app.services.auth.permission_service import PermissionService
+from app.services.auth.container_tree_service import container_tree_service
 from app.core.database import get_db
 from datetime import datetime
 import logging
@@ -150,6 +151,7 @@ class ContainerService:
                     )
             
             await self.session.commit()
+            container_tree_service.invalidate()
             
             logger.info(f"컨테이너 생성 완료: {container_id}")
             return True
@@ -164,7 +166,7 @@ class ContainerService:
         user_emp_no: str,
         root_container_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """사용자가 접근 가능한 컨테이너 계층 구조 조회"""
+        """사용자가 접근 가능한 컨테이너 계층 구조 조회 (컨테이너 트리 스냅샷 기반)"""
         try:
             # 사용자가 관리자인지 확인 (User 테이블의 is_admin 플래그 체크)
             user_query = select(User).where(User.emp_no == user_emp_no)
@@ -174,115 +176,40 @@ class ContainerService:
             is_admin = user.is_admin if user else False
             logger.info(f"Container hierarchy request - user: {user_emp_no}, is_admin: {is_admin}")
             
+            snapshot = await container_tree_service.get_snapshot()
             if is_admin:
                 # 관리자는 모든 컨테이너에 접근 가능
-                query = select(TbKnowledgeContainers).where(
-                    TbKnowledgeContainers.is_active == True
-                ).order_by(TbKnowledgeContainers.org_level, TbKnowledgeContainers.container_name)
-                
-                if root_container_id:
-                    query = query.where(
-                        or_(
-                            TbKnowledgeContainers.container_id == root_container_id,
-                            TbKnowledgeContainers.org_path.like(f"%/{root_container_id}/%")
-                        )
-                    )
-                
-                result = await self.session.execute(query)
-                containers = result.scalars().all()
-                logger.info(f"Admin query returned {len(containers)} containers")
-                
-                # 계층 구조 생성 (관리자용)
-                container_map = {}
-                hierarchy = []
-                
-                for container in containers:
-                    container_data = {
-                        'container_id': container.container_id,
-                        'container_name': container.container_name,
-                        'container_type': container.container_type,
-                        'description': container.description,
-                        'knowledge_category': container.knowledge_category,
-                        'access_level': container.access_level,
-                        'org_level': container.org_level,
-                        'org_path': container.org_path,
-                        'parent_container_id': container.parent_container_id,
-                        'document_count': container.document_count,
-                        'user_count': container.user_count,
-                        'permission_level': 'ADMIN',  # 관리자는 모든 권한
-                        'children': []
-                    }
-                    
-                    container_map[container.container_id] = container_data
-                    
-                    if container.parent_container_id and container.parent_container_id in container_map:
-                        container_map[container.parent_container_id]['children'].append(container_data)
-                    else:
-                        hierarchy.append(container_data)
-                
-                logger.info(f"Final hierarchy has {len(hierarchy)} root containers")
-                return hierarchy
-            
+                permission_map = {cid: 'ADMIN' for cid in snapshot.nodes}
             else:
-                # 일반 사용자는 권한 기반 접근
-                accessible_containers = await self.permission_service.get_accessible_containers(user_emp_no)
-                accessible_ids = [c['container_id'] for c in accessible_containers]
-                
-                if not accessible_ids:
-                    return []
-                
-                # 컨테이너 상세 정보 조회
-                query = select(TbKnowledgeContainers).where(
-                    and_(
-                        TbKnowledgeContainers.container_id.in_(accessible_ids),
-                        TbKnowledgeContainers.is_active == True
-                    )
-                ).order_by(TbKnowledgeContainers.org_level, TbKnowledgeContainers.container_name)
-                
-                if root_container_id:
-                    query = query.where(
-                        or_(
-                            TbKnowledgeContainers.container_id == root_container_id,
-                            TbKnowledgeContainers.org_path.like(f"%/{root_container_id}/%")
-                        )
-                    )
-                
-                result = await self.session.execute(query)
-                containers = result.scalars().all()
-                
-                # 계층 구조 생성
-                container_map = {}
-                hierarchy = []
-                
-                # 권한 정보 매핑
+                # 일반 사용자는 권한 기반 접근 (직접 권한 + 하위 상속)
                 # permission_level 키는 role_id 별칭(호환) - 내부적으로 role_id로 간주
-                permission_map = {c['container_id']: c.get('permission_level') for c in accessible_containers}
-                
-                for container in containers:
-                    container_data = {
-                        'container_id': container.container_id,
-                        'container_name': container.container_name,
-                        'container_type': container.container_type,
-                        'description': container.description,
-                        'knowledge_category': container.knowledge_category,
-                        'access_level': container.access_level,
-                        'org_level': container.org_level,
-                        'org_path': container.org_path,
-                        'parent_container_id': container.parent_container_id,
-                        'document_count': container.document_count,
-                        'user_count': container.user_count,
-                        'permission_level': permission_map.get(container.container_id, 'VIEWER'),
-                        'children': []
-                    }
-                    
-                    container_map[container.container_id] = container_data
-                    
-                    if container.parent_container_id and container.parent_container_id in container_map:
-                        container_map[container.parent_container_id]['children'].append(container_data)
-                    else:
-                        hierarchy.append(container_data)
-                
-                return hierarchy
+                permission_map = {
+                    cid: role for cid, (role, _source) in snapshot.accessible_containers(user_emp_no).items()
+                }
+                if not permission_map:
+                    return []
+            
+            container_ids = [
+                cid for cid in permission_map
+                if not root_container_id
+                or cid == root_container_id
+                or f"/{root_container_id}/" in (snapshot.nodes[cid].org_path or "")
+            ]
+            
+            return snapshot.build_tree(container_ids, lambda node: {
+                'container_id': node.container_id,
+                'container_name': node.container_name,
+                'container_type': node.container_type,
+                'description': node.description,
+                'knowledge_category': node.knowledge_category,
+                'access_level': node.access_level,
+                'org_level': node.org_level,
+                'org_path': node.org_path,
+                'parent_container_id': node.parent_container_id,
+                'document_count': snapshot.document_count(node.container_id),
+                'user_count': node.user_count,
+                'permission_level': permission_map.get(node.container_id, 'VIEWER'),
+            })
             
         except Exception as e:
             logger.error(f"컨테이너 계층 조회 실패: {user_emp_no}, {str(e)}")
@@ -404,6 +331,7 @@ class ContainerService:
             
             await self.session.execute(update_query)
             await self.session.commit()
+            container_tree_service.invalidate("containers")
             
             logger.info(f"컨테이너 업데이트 완료: {container_id}")
             return True
@@ -579,17 +507,12 @@ class ContainerService:
             result = await session.execute(query)
             rows = result.all()
             
+            # 🔢 컨테이너별 실제 문서 수는 트리 스냅샷에서 (컨테이너당 COUNT 쿼리 제거)
+            snapshot = await container_tree_service.get_snapshot()
+            
             container_list = []
             for container, role_id, permission_type, access_scope in rows:
-                # 🔢 각 컨테이너별 실제 문서 수 조회
-                doc_count_query = select(func.count(TbFileBssInfo.file_bss_info_sno)).where(
-                    and_(
-                        TbFileBssInfo.knowledge_container_id == container.container_id,
-                        TbFileBssInfo.del_yn != 'Y'
-                    )
-                )
-                doc_count_result = await session.execute(doc_count_query)
-                actual_document_count = doc_count_result.scalar() or 0
+                actual_document_count = snapshot.document_count(container.container_id)
                 
                 container_info = {
                     "container_id": container.container_id,
@@ -658,6 +581,7 @@ class ContainerService:
             )
             await self.session.execute(update_query)
             await self.session.commit()
+            container_tree_service.invalidate("documents")
             
             logger.info(f"컨테이너 문서 개수 업데이트: {container_id} -> {actual_count}개")
             return actual_count
@@ -0,0 +1,417 @@
+"""
+컨테이너 트리 스냅샷 서비스
+
+컨테이너 계층/표시 경로/문서 수/권한 요약을 프로세스 메모리에 한 벌 유지하고
+컨테이너 API, 검색 결과 포맷팅, 권한 확인이 같은 스냅샷을 공유한다.
+
+- 변경 감지: 트리거가 관리하는 파트별 변경 카운터(fingerprint)를 1회 조회해 컨테이너/권한/문서
+  변경 여부를 확인하고 바뀐 부분만 다시 적재한다 (최소 간격 container_tree_refresh_seconds).
+- 같은 프로세스의 변경은 invalidate() 이벤트로 즉시 반영한다.
+- ETag 는 fingerprint 에서 계산하므로 워커가 달라도 동일하다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import TbFileBssInfo, TbKnowledgeContainers, TbUserPermissions
+
+logger = logging.getLogger(__name__)
+
+
+PART_CONTAINERS = "containers"
+PART_PERMISSIONS = "permissions"
+PART_DOCUMENTS = "documents"
+ALL_PARTS = (PART_CONTAINERS, PART_PERMISSIONS, PART_DOCUMENTS)
+
+# 부모 권한 → 하위 컨테이너 상속 권한 (PermissionService._calculate_inherited_permission 과 동일)
+INHERITED_ROLE = {
+    'ADMIN': 'MANAGER',
+    'MANAGER': 'EDITOR',
+    'EDITOR': 'VIEWER',
+    'VIEWER': 'VIEWER',
+    'FULL_ACCESS': 'ADMIN',
+}
+ROLE_PRIORITY = {'FULL_ACCESS': 0, 'ADMIN': 1, 'MANAGER': 2, 'EDITOR': 3, 'VIEWER': 4}
+
+# 파트별 변경 카운터 (트리거가 스냅샷 컬럼 변경 시 증가 - 마이그레이션 20260112_001)
+# 이름 변경/이동/삭제 표시/권한 변경/처리 실패 전환까지 반영되고, 조회는 3행 PK 조회 1회
+FINGERPRINT_SQL = text("""
+    SELECT
+        max(version) FILTER (WHERE part = 'containers') AS containers_version,
+        max(version) FILTER (WHERE part = 'permissions') AS permissions_version,
+        max(version) FILTER (WHERE part = 'documents') AS documents_version
+    FROM tb_container_tree_versions
+""")
+
+
+def strip_container_emoji(name: str) -> str:
+    """표시 경로용 이름 (앞쪽 폴더/조직 이모지 제거)"""
+    if name.startswith(('🏢', '📁', '📂')):
+        return name[2:].strip()
+    return name
+
+
+@dataclass
+class ContainerNode:
+    """컨테이너 1건 (스냅샷 내부 표현)"""
+    container_id: str
+    container_name: str
+    container_type: Optional[str] = None
+    description: Optional[str] = None
+    knowledge_category: Optional[str] = None
+    access_level: Optional[str] = None
+    org_level: int = 1
+    org_path: Optional[str] = None
+    parent_container_id: Optional[str] = None
+    inherit_parent_permissions: bool = False
+    user_count: int = 0
+    display_path: str = ""
+    children: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ContainerTreeSnapshot:
+    """불변 스냅샷 - 변경 시 새 객체로 교체된다"""
+    nodes: Dict[str, ContainerNode]
+    root_ids: List[str]
+    document_counts: Dict[str, int]
+    user_roles: Dict[str, Dict[str, str]]  # emp_no → {container_id: role_id} (활성 직접 권한)
+    role_summary: Dict[str, Dict[str, int]]  # container_id → {role_id: 사용자 수}
+    fingerprint: Tuple[Any, ...] = ()
+    built_at: float = 0.0
+
+    def user_etag(self, user_emp_no: str, *scope: str) -> str:
+        """사용자별 응답용 ETag (권한이 응답에 포함되므로 사번/범위 포함)"""
+        digest = hashlib.sha1(
+            "|".join((repr(self.fingerprint), user_emp_no, *scope)).encode("utf-8")
+        ).hexdigest()[:16]
+        return f'W/"ct-{digest}"'
+
+    def part_version(self, part: str) -> str:
+        """파트별 버전 (fingerprint 조각 해시) - 다른 캐시의 무효화 키로 사용"""
+        piece = ContainerTreeService._split(self.fingerprint)[ALL_PARTS.index(part)]
+        return hashlib.sha1(repr(piece).encode("utf-8")).hexdigest()[:16]
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    def get(self, container_id: str) -> Optional[ContainerNode]:
+        return self.nodes.get(container_id)
+
+    def names(self) -> Dict[str, str]:
+        return {cid: node.container_name for cid, node in self.nodes.items()}
+
+    def document_count(self, container_id: str) -> int:
+        return self.document_counts.get(container_id, 0)
+
+    def effective_role(self, user_emp_no: str, container_id: str) -> Optional[str]:
+        """
+        직접 권한 → 상속 권한 (inherit_parent_permissions 인 동안 부모를 거슬러 올라감)
+        PermissionService.get_user_permission_level 과 같은 규칙.
+        """
+        roles = self.user_roles.get(user_emp_no, {})
+        seen: Set[str] = set()
+        current = container_id
+        while current and current not in seen:
+            seen.add(current)
+            role = roles.get(current)
+            if role:
+                return role
+            node = self.nodes.get(current)
+            if not node or not node.inherit_parent_permissions:
+                return None
+            current = node.parent_container_id
+        return None
+
+    def accessible_containers(self, user_emp_no: str) -> Dict[str, Tuple[str, str]]:
+        """
+        접근 가능한 컨테이너 → (role_id, 'direct'|'inherited')
+        PermissionService.get_accessible_containers 와 같은 규칙 (직접 권한 + 그 하위 1단계 상속).
+        """
+        result: Dict[str, Tuple[str, str]] = {}
+
+        def _offer(cid: str, role: str, source: str) -> None:
+            current = result.get(cid)
+            if current is None or ROLE_PRIORITY.get(role, 999) < ROLE_PRIORITY.get(current[0], 999):
+                result[cid] = (role, source)
+
+        for cid, role in self.user_roles.get(user_emp_no, {}).items():
+            node = self.nodes.get(cid)
+            if node is None:
+                continue
+            _offer(cid, role, "direct")
+            for child_id in node.children:
+                _offer(child_id, INHERITED_ROLE.get(role, 'VIEWER'), "inherited")
+        return result
+
+    def accessible_container_infos(self, user_emp_no: str) -> List[Dict[str, Any]]:
+        """접근 가능한 컨테이너 목록 (PermissionService.get_accessible_containers 응답 형태)"""
+        infos: List[Dict[str, Any]] = []
+        for container_id, (role_id, source) in self.accessible_containers(user_emp_no).items():
+            node = self.nodes[container_id]
+            infos.append({
+                'container_id': container_id,
+                'container_name': node.container_name,
+                'permission_level': role_id,
+                'permission_source': source,
+                'container_type': node.container_type,
+                'access_level': node.access_level,
+                'parent_container_id': node.parent_container_id,
+            })
+        return infos
+
+    def ordered_ids(self, container_ids: Optional[Iterable[str]] = None) -> List[str]:
+        """(org_level, container_name) 순서 - 기존 API 정렬과 동일"""
+        ids = self.nodes.keys() if container_ids is None else [c for c in container_ids if c in self.nodes]
+        return sorted(ids, key=lambda cid: (self.nodes[cid].org_level or 0, self.nodes[cid].container_name or ""))
+
+    def build_tree(
+        self,
+        container_ids: Optional[Iterable[str]],
+        to_dict: Callable[[ContainerNode], Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        컨테이너 목록 → 중첩 트리 (부모가 목록에 없으면 루트로 취급)
+        to_dict 로 응답 형태를 정하고, 'children' 리스트는 여기서 채운다.
+        """
+        items: Dict[str, Dict[str, Any]] = {}
+        ordered = self.ordered_ids(container_ids)
+        for cid in ordered:
+            data = to_dict(self.nodes[cid])
+            data["children"] = []
+            items[cid] = data
+        roots: List[Dict[str, Any]] = []
+        for cid in ordered:
+            parent = self.nodes[cid].parent_container_id
+            if parent and parent in items and parent != cid:
+                items[parent]["children"].append(items[cid])
+            else:
+                roots.append(items[cid])
+        return roots
+
+
+def build_snapshot(
+    container_rows: Iterable[Any],
+    permission_rows: Iterable[Any],
+    document_counts: Dict[str, int],
+    fingerprint: Tuple[Any, ...] = (),
+) -> ContainerTreeSnapshot:
+    """DB 행 → 스냅샷"""
+    nodes = _build_nodes(container_rows)
+    user_roles, role_summary = _build_permissions(permission_rows)
+    return ContainerTreeSnapshot(
+        nodes=nodes,
+        root_ids=_root_ids(nodes),
+        document_counts=dict(document_counts),
+        user_roles=user_roles,
+        role_summary=role_summary,
+        fingerprint=fingerprint,
+        built_at=time.time(),
+    )
+
+
+def _build_nodes(container_rows: Iterable[Any]) -> Dict[str, ContainerNode]:
+    nodes: Dict[str, ContainerNode] = {}
+    for row in container_rows:
+        nodes[row.container_id] = ContainerNode(
+            container_id=row.container_id,
+            container_name=row.container_name,
+            container_type=row.container_type,
+            description=row.description,
+            knowledge_category=row.knowledge_category,
+            access_level=row.access_level,
+            org_level=row.org_level or 1,
+            org_path=row.org_path,
+            parent_container_id=row.parent_container_id,
+            inherit_parent_permissions=bool(row.inherit_parent_permissions),
+            user_count=row.user_count or 0,
+        )
+
+    names = {cid: node.container_name for cid, node in nodes.items()}
+    for node in nodes.values():
+        parts = [p.strip() for p in (node.org_path or "").strip("/").split("/") if p.strip()]
+        node.display_path = "/".join(strip_container_emoji(names.get(p, p)) for p in parts) or node.container_name
+        parent = nodes.get(node.parent_container_id) if node.parent_container_id else None
+        if parent is not None and parent is not node:
+            parent.children.append(node.container_id)
+    return nodes
+
+
+def _root_ids(nodes: Dict[str, ContainerNode]) -> List[str]:
+    return [
+        cid for cid, node in nodes.items()
+        if not node.parent_container_id or node.parent_container_id not in nodes
+    ]
+
+
+def _build_permissions(permission_rows: Iterable[Any]) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, int]]]:
+    user_roles: Dict[str, Dict[str, str]] = {}
+    role_summary: Dict[str, Dict[str, int]] = {}
+    for row in permission_rows:
+        user_roles.setdefault(row.user_emp_no, {})[row.container_id] = row.role_id
+        summary = role_summary.setdefault(row.container_id, {})
+        summary[row.role_id] = summary.get(row.role_id, 0) + 1
+    return user_roles, role_summary
+
+
+class ContainerTreeService:
+    """컨테이너 트리 스냅샷 관리 (프로세스 전역 1개)"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        refresh_seconds: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self._refresh_seconds = refresh_seconds
+        self._snapshot: Optional[ContainerTreeSnapshot] = None
+        self._checked_at = 0.0
+        self._dirty: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    @property
+    def refresh_seconds(self) -> float:
+        if self._refresh_seconds is not None:
+            return self._refresh_seconds
+        return float(settings.container_tree_refresh_seconds)
+
+    def invalidate(self, *parts: str) -> None:
+        """변경 이벤트 - 다음 조회 시 해당 파트를 다시 적재 (인자 없으면 전체)"""
+        self._dirty.update(parts or ALL_PARTS)
+
+    async def get_snapshot(self) -> ContainerTreeSnapshot:
+        """최신 스냅샷 (변경이 없으면 쿼리 0~1회)"""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._dirty and time.monotonic() - self._checked_at < self.refresh_seconds:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not self._dirty and time.monotonic() - self._checked_at < self.refresh_seconds:
+                return snapshot
+            self._snapshot = await self._refresh(snapshot)
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    async def _refresh(self, snapshot: Optional[ContainerTreeSnapshot]) -> ContainerTreeSnapshot:
+        dirty, self._dirty = self._dirty, set()
+        started = time.perf_counter()
+        async with self.session_factory() as session:
+            fingerprint = await self._load_fingerprint(session)
+            if snapshot is None:
+                changed = set(ALL_PARTS)
+            else:
+                changed = {
+                    part for part, old, new in zip(ALL_PARTS, self._split(snapshot.fingerprint), self._split(fingerprint))
+                    if old != new
+                } | dirty
+            if not changed:
+                return snapshot
+
+            nodes = snapshot.nodes if snapshot else {}
+            root_ids = snapshot.root_ids if snapshot else []
+            user_roles = snapshot.user_roles if snapshot else {}
+            role_summary = snapshot.role_summary if snapshot else {}
+            document_counts = snapshot.document_counts if snapshot else {}
+
+            if PART_CONTAINERS in changed:
+                nodes = _build_nodes(await self._load_containers(session))
+                root_ids = _root_ids(nodes)
+            if PART_PERMISSIONS in changed:
+                user_roles, role_summary = _build_permissions(await self._load_permissions(session))
+            if PART_DOCUMENTS in changed:
+                document_counts = await self._load_document_counts(session)
+
+        logger.info(
+            "컨테이너 트리 스냅샷 갱신: parts=%s, containers=%d, %.0fms",
+            sorted(changed), len(nodes), (time.perf_counter() - started) * 1000,
+        )
+        return ContainerTreeSnapshot(
+            nodes=nodes,
+            root_ids=root_ids,
+            document_counts=document_counts,
+            user_roles=user_roles,
+            role_summary=role_summary,
+            fingerprint=fingerprint,
+            built_at=time.time(),
+        )
+
+    @staticmethod
+    def _split(fingerprint: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """fingerprint → 파트별 조각 (ALL_PARTS 순서)"""
+        fp = tuple(fingerprint) + (None,) * max(0, len(ALL_PARTS) - len(fingerprint))
+        return [fp[i:i + 1] for i in range(len(ALL_PARTS))]
+
+    # ---------------------------
+    # 적재 쿼리
+    # ---------------------------
+    async def _load_fingerprint(self, session: AsyncSession) -> Tuple[Any, ...]:
+        row = (await session.execute(FINGERPRINT_SQL)).one()
+        return tuple(row)
+
+    async def _load_containers(self, session: AsyncSession) -> List[Any]:
+        result = await session.execute(
+            select(
+                TbKnowledgeContainers.container_id,
+                TbKnowledgeContainers.container_name,
+                TbKnowledgeContainers.container_type,
+                TbKnowledgeContainers.description,
+                TbKnowledgeContainers.knowledge_category,
+                TbKnowledgeContainers.access_level,
+                TbKnowledgeContainers.org_level,
+                TbKnowledgeContainers.org_path,
+                TbKnowledgeContainers.parent_container_id,
+                TbKnowledgeContainers.inherit_parent_permissions,
+                TbKnowledgeContainers.user_count,
+            )
+            .where(TbKnowledgeContainers.is_active == True)
+            .order_by(TbKnowledgeContainers.org_level, TbKnowledgeContainers.container_name)
+        )
+        return result.all()
+
+    async def _load_permissions(self, session: AsyncSession) -> List[Any]:
+        result = await session.execute(
+            select(
+                TbUserPermissions.user_emp_no,
+                TbUserPermissions.container_id,
+                TbUserPermissions.role_id,
+            ).where(TbUserPermissions.is_active == True)
+        )
+        return result.all()
+
+    async def _load_document_counts(self, session: AsyncSession) -> Dict[str, int]:
+        # 삭제되지 않고 처리 실패가 아닌 문서 (전체 트리 API 의 기존 집계 기준)
+        result = await session.execute(
+            select(TbFileBssInfo.knowledge_container_id, func.count(TbFileBssInfo.file_bss_info_sno))
+            .where(
+                and_(
+                    TbFileBssInfo.del_yn != 'Y',
+                    or_(
+                        TbFileBssInfo.processing_status.is_(None),
+                        TbFileBssInfo.processing_status != 'failed',
+                    ),
+                )
+            )
+            .group_by(TbFileBssInfo.knowledge_container_id)
+        )
+        return {container_id: int(count) for container_id, count in result.all() if container_id}
+
+
+container_tree_service = ContainerTreeService()
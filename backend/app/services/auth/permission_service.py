@@ -16,6 +16,7 @@ from app.models import (
     TbSapHrInfo
 )
 from app.core.database import get_db
+from app.services.auth.container_tree_service import ContainerTreeSnapshot, container_tree_service
 from datetime import datetime, timedelta
 import logging
 
@@ -107,6 +108,13 @@ class PermissionService:
             return self._permission_level_cache[cache_key]
 
         try:
+            # 0. 컨테이너 트리 스냅샷 (직접/상속 권한을 쿼리 없이 판정, 스냅샷에 없는 컨테이너는 DB 조회)
+            snapshot = await self._get_tree_snapshot()
+            if snapshot is not None and container_id in snapshot.nodes:
+                permission = snapshot.effective_role(user_emp_no, container_id)
+                self._permission_level_cache[cache_key] = permission
+                return permission
+
             # 1. 직접 권한
             direct_permission = await self._get_direct_permission(user_emp_no, container_id)
             if direct_permission:
@@ -131,6 +139,14 @@ class PermissionService:
             logger.error(f"권한 레벨 조회 실패: {user_emp_no}, {container_id}, {str(e)}")
             return None
 
+    async def _get_tree_snapshot(self) -> Optional[ContainerTreeSnapshot]:
+        """공유 컨테이너 트리 스냅샷 (적재 실패 시 None → 기존 DB 조회 경로)"""
+        try:
+            return await container_tree_service.get_snapshot()
+        except Exception as e:
+            logger.warning(f"컨테이너 트리 스냅샷 조회 실패 - DB 조회로 대체: {str(e)}")
+            return None
+
     async def _get_direct_permission(
         self, 
         user_emp_no: str, 
@@ -289,6 +305,10 @@ class PermissionService:
         """사용자가 접근 가능한 모든 컨테이너 조회 (하위 컨테이너 상속 포함)"""
         try:
             logger.info(f"권한 조회 시작: user_emp_no={user_emp_no}")
+
+            snapshot = await self._get_tree_snapshot()
+            if snapshot is not None:
+                return snapshot.accessible_container_infos(user_emp_no)
             
             # 1. 직접 권한이 있는 컨테이너들
             direct_query = select(TbUserPermissions, TbKnowledgeContainers).join(
@@ -451,7 +471,15 @@ class PermissionService:
         except Exception as e:
             logger.error(f"역할 기반 컨테이너 조회 실패: {user_emp_no}, {str(e)}")
             return []
-    
+
+    async def _purge_answer_cache(self) -> None:
+        """권한 변경 후 이전 권한 버전의 RAG 답변 캐시 정리 (조회 시에도 버전으로 걸러지므로 실패해도 무방)"""
+        try:
+            from app.services.chat.answer_cache_service import answer_cache_service
+            await answer_cache_service.purge_stale()
+        except Exception as e:
+            logger.warning(f"RAG 답변 캐시 정리 실패 (무시): {e}")
+
     async def grant_permission(
         self,
         *,
@@ -552,6 +580,8 @@ class PermissionService:
                 )
 
             await self.session.commit()
+            container_tree_service.invalidate("permissions")
+            await self._purge_answer_cache()
             return True
         except Exception as e:
             await self.session.rollback()
@@ -674,6 +704,8 @@ class PermissionService:
             )
 
             await self.session.commit()
+            container_tree_service.invalidate("permissions")
+            await self._purge_answer_cache()
             return True
         except Exception as e:
             await self.session.rollback()
@@ -969,6 +1001,12 @@ class GlobalPermissionService:
         min_permission: str = "VIEWER"
     ) -> List[Dict[str, Any]]:
         """사용자가 접근 가능한 컨테이너 목록 반환"""
+        # 트리 스냅샷 기반 캐시 - 스냅샷을 쓸 수 없을 때만 DB 세션 사용
+        from app.services.auth.principal_cache import principal_cache
+
+        accessible = await principal_cache.accessible_containers(user_emp_no)
+        if accessible is not None:
+            return accessible
         async for db in get_db():
             service = PermissionService(db)
             return await service.get_accessible_containers(user_emp_no)
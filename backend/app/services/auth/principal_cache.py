@@ -0,0 +1,211 @@
+"""
+인증 주체(Principal) 캐시
+
+get_current_user 는 모든 인증 요청마다 tb_user 를 조회한다. 같은 토큰으로 짧은 시간 안에
+반복되는 요청(검색 → 스트리밍 → 이력 조회 등)에서는 결과가 바뀌지 않으므로
+(사번, 토큰 jti) 키로 사용자 스냅샷을 짧게 보관한다.
+
+- 사용자 스냅샷: tb_user 컬럼 값 (활성/관리자 여부 포함) - TTL 이내 재사용
+- 접근 가능 컨테이너: 컨테이너 트리 스냅샷에서 계산, 스냅샷 객체가 바뀌면 재계산
+- 무효화: 사용자 변경 경로에서 invalidate(emp_no), 권한/컨테이너 변경은 트리 스냅샷 교체로 반영
+
+캐시 미스에는 조회한 ORM User 를 그대로 돌려주고, 캐시 적중에는 읽기 전용 PrincipalUser 를
+돌려준다. PrincipalUser 는 tb_user 컬럼과 조회 시점에 이미 로드돼 있던 SAP 인사 정보
+(name/department/position)만 제공하며, 속성 변경은 예외로 막는다 - 수정/관계 로딩이 필요하면
+세션에서 사용자를 다시 조회한다.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+
+from app.core.config import settings
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷으로 보관할 tb_user 컬럼 (관계/지연 로딩 속성 제외)
+USER_COLUMNS = tuple(column.key for column in User.__table__.columns)
+
+# sap_hr_info 관계에서 파생되는 User 프로퍼티 (조회 시점에 관계가 로드돼 있을 때만 보관)
+HR_PROPERTIES = ("name", "department", "position")
+
+
+class PrincipalUser:
+    """
+    캐시 적중 시 반환하는 읽기 전용 사용자 뷰
+
+    tb_user 컬럼 + 스냅샷 시점에 로드돼 있던 name/department/position 만 제공한다.
+    세션에 붙은 ORM 객체가 아니므로 속성 대입은 AttributeError - DB 에 반영되지 않는
+    변경이 조용히 사라지는 것을 막는다.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Dict[str, Any]):
+        object.__setattr__(self, "_values", MappingProxyType(dict(values)))
+
+    def __getattr__(self, name: str) -> Any:
+        values = object.__getattribute__(self, "_values")
+        if name in values:
+            return values[name]
+        raise AttributeError(
+            f"캐시된 인증 사용자에는 '{name}' 속성이 없습니다 (tb_user 컬럼만 제공 - 필요하면 DB 에서 다시 조회)"
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"캐시된 인증 사용자는 읽기 전용입니다: '{name}' 변경은 DB 에서 조회한 User 로 수행")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"캐시된 인증 사용자는 읽기 전용입니다: '{name}'")
+
+    # User 의 FastAPI Users 호환 프로퍼티 (컬럼만으로 계산 가능한 것)
+    @property
+    def is_superuser(self) -> bool:
+        return bool(self.is_admin)
+
+    @property
+    def is_verified(self) -> bool:
+        return True
+
+    @property
+    def hashed_password(self) -> str:
+        return self.password_hash
+
+    def __repr__(self) -> str:
+        return f"<PrincipalUser emp_no={self.emp_no} username={self.username}>"
+
+
+@dataclass
+class Principal:
+    """인증된 사용자 스냅샷"""
+    emp_no: str
+    user_id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+    columns: Dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+    @classmethod
+    def from_user(cls, user: User, ttl_seconds: float) -> "Principal":
+        columns = {key: getattr(user, key) for key in USER_COLUMNS}
+        # 이미 로드된 관계만 사용 (비동기 세션에서 지연 로딩을 일으키지 않음)
+        if "sap_hr_info" not in sa_inspect(user).unloaded:
+            columns.update({key: getattr(user, key) for key in HR_PROPERTIES})
+        return cls(
+            emp_no=user.emp_no,
+            user_id=user.id,
+            username=user.username,
+            is_active=bool(user.is_active),
+            is_admin=bool(user.is_admin),
+            columns=columns,
+            expires_at=time.monotonic() + ttl_seconds,
+        )
+
+    def to_user(self) -> PrincipalUser:
+        """캐시 적중 시 엔드포인트에 넘기는 읽기 전용 사용자 뷰"""
+        return PrincipalUser(self.columns)
+
+
+class PrincipalCache:
+    """(사번, 토큰 jti) → Principal TTL 캐시 + 사번별 접근 컨테이너 캐시"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = float(settings.auth_principal_cache_ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self.max_entries = int(settings.auth_principal_cache_max_entries if max_entries is None else max_entries)
+        self._entries: "OrderedDict[Tuple[str, str], Principal]" = OrderedDict()
+        # 사번 → (계산에 사용한 트리 스냅샷, 접근 컨테이너 목록)
+        self._accessible: Dict[str, Tuple[Any, List[Dict[str, Any]]]] = {}
+        # 동기 WebSocket 인증 경로(스레드풀)에서도 호출되므로 스레드 락 사용
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, emp_no: Optional[str], token_id: Optional[str]) -> Optional[Principal]:
+        """유효한 캐시 항목 반환 (만료 시 제거)"""
+        if not self.enabled or not emp_no or not token_id:
+            return None
+        key = (emp_no, token_id)
+        with self._lock:
+            principal = self._entries.get(key)
+            if principal is None:
+                return None
+            if principal.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, emp_no: str, token_id: Optional[str], user: User) -> Principal:
+        """DB 에서 조회한 활성 사용자를 캐시에 저장하고 Principal 반환"""
+        principal = Principal.from_user(user, self.ttl_seconds)
+        if not self.enabled or not token_id:
+            return principal
+        with self._lock:
+            self._entries[(emp_no, token_id)] = principal
+            self._entries.move_to_end((emp_no, token_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, *emp_nos: Optional[str]) -> None:
+        """사용자 변경 시 해당 사번의 모든 토큰 항목 제거"""
+        targets: Set[str] = {emp_no for emp_no in emp_nos if emp_no}
+        if not targets:
+            return
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in targets]:
+                del self._entries[key]
+            for emp_no in targets:
+                self._accessible.pop(emp_no, None)
+        logger.debug(f"인증 주체 캐시 무효화: {sorted(targets)}")
+
+    def clear(self) -> None:
+        """전체 무효화 (일괄 동기화 등 대상 사번을 특정하기 어려운 경우)"""
+        with self._lock:
+            self._entries.clear()
+            self._accessible.clear()
+
+    async def accessible_containers(self, emp_no: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        접근 가능한 컨테이너 목록 (트리 스냅샷 기준)
+
+        권한/컨테이너 변경은 container_tree_service.invalidate() 로 스냅샷이 교체되므로
+        스냅샷 객체가 바뀌면 다시 계산한다. 스냅샷을 쓸 수 없으면 None (호출 측 DB 경로).
+        """
+        from app.services.auth.container_tree_service import container_tree_service
+
+        try:
+            snapshot = await container_tree_service.get_snapshot()
+        except Exception as e:
+            logger.warning(f"컨테이너 트리 스냅샷 조회 실패 - 접근 컨테이너 캐시 생략: {e}")
+            return None
+
+        cached = self._accessible.get(emp_no)
+        if cached is not None and cached[0] is snapshot:
+            return list(cached[1])
+
+        infos = snapshot.accessible_container_infos(emp_no)
+        with self._lock:
+            self._accessible[emp_no] = (snapshot, infos)
+        return list(infos)
+
+    async def accessible_container_ids(self, emp_no: str) -> Optional[Set[str]]:
+        infos = await self.accessible_containers(emp_no)
+        if infos is None:
+            return None
+        return {info['container_id'] for info in infos}
+
+
+# 전역 인스턴스
+principal_cache = PrincipalCache()
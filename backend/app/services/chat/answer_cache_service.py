@@ -0,0 +1,335 @@
+"""
+RAG 답변 시맨틱 캐시
+====================
+
+온보딩 FAQ 처럼 여러 사용자가 거의 같은 질문을 반복하면 질의 분석 → 하이브리드 검색 →
+리랭킹 → LLM 생성을 매번 다시 수행한다. 다음 조건이 모두 같으면 저장된 답변을 재사용한다.
+
+- 범위: 사용자가 실제 접근 가능한 컨테이너 집합(요청 컨테이너와 교집합) + 지정 문서 + 검색 파라미터
+- 권한 버전: 권한이 하나라도 바뀌면 이전 항목은 사용하지 않는다
+- 코퍼스 버전: 범위 내 컨테이너별 문서 변경 카운터 + 문서 수 (업로드/삭제/이동/재처리 시 트리거가 증가)
+- 질의 임베딩 ANN 최근접 항목의 유사도 ≥ 임계값
+- 인용 문서가 삭제/수정되지 않았을 것 (조회 쿼리에서 함께 확인)
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 차원 → 질의 벡터 컬럼 (vs_doc_contents_chunks 와 같은 규칙)
+VECTOR_COLUMNS = {
+    1536: "azure_embedding_1536",
+    1024: "aws_embedding_1024",
+}
+
+LOOKUP_SQL = """
+    SELECT c.cache_id, c.query_text, c.answer, c.payload, c.cited_chunk_ids, c.cited_file_ids,
+           1 - (c.{column} <=> CAST(:query_vec AS vector)) AS similarity
+    FROM tb_rag_answer_cache c
+    WHERE c.scope_hash = :scope_hash
+      AND c.permission_version = :permission_version
+      AND c.corpus_version = :corpus_version
+      AND c.expires_at > now()
+      AND c.{column} IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM tb_file_bss_info f
+          WHERE f.file_bss_info_sno = ANY(c.cited_file_ids)
+            AND (f.del_yn <> 'N' OR f.last_modified_date > c.created_date)
+      )
+    ORDER BY c.{column} <=> CAST(:query_vec AS vector)
+    LIMIT 1
+"""
+
+# 컨테이너별 문서 변경 카운터 (tb_file_bss_info 트리거가 관리 - 마이그레이션 20260113_001)
+CORPUS_VERSIONS_SQL = """
+    SELECT container_id, version
+    FROM tb_container_corpus_versions
+    WHERE container_id = ANY(:container_ids)
+"""
+
+
+@dataclass
+class AnswerCacheScope:
+    """캐시 키 중 질의 임베딩을 제외한 부분"""
+    scope_hash: str
+    permission_version: str
+    corpus_version: str
+    container_ids: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CachedAnswer:
+    """캐시 적중 결과"""
+    cache_id: int
+    query_text: str
+    answer: str
+    payload: Dict[str, Any]
+    similarity: float
+    cited_chunk_ids: List[str] = field(default_factory=list)
+    cited_file_ids: List[int] = field(default_factory=list)
+
+
+class AnswerCacheService:
+    """RAG 답변 시맨틱 캐시"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        embedder: Any = None,
+        tree_service: Any = None,
+    ):
+        self._session_factory = session_factory
+        self._embedder = embedder
+        self._tree_service = tree_service
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.rag_answer_cache_enabled)
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            from app.services.core.embedding_service import embedding_service
+
+            self._embedder = embedding_service
+        return self._embedder
+
+    @property
+    def tree_service(self):
+        if self._tree_service is None:
+            from app.services.auth.container_tree_service import container_tree_service
+
+            self._tree_service = container_tree_service
+        return self._tree_service
+
+    # ---------------------------
+    # 키 구성
+    # ---------------------------
+    async def resolve_scope(
+        self,
+        user_emp_no: str,
+        container_ids: Optional[Iterable[str]] = None,
+        document_ids: Optional[Iterable[Any]] = None,
+        variant: str = "default",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[AnswerCacheScope]:
+        """사용자 권한 범위 기준 캐시 범위 (스냅샷/코퍼스 버전을 쓸 수 없으면 None → 캐시 사용 안 함)"""
+        from app.services.auth.container_tree_service import PART_PERMISSIONS
+
+        try:
+            snapshot = await self.tree_service.get_snapshot()
+        except Exception as e:
+            logger.warning(f"[ANSWER-CACHE] 컨테이너 스냅샷 조회 실패 - 캐시 생략: {e}")
+            return None
+
+        accessible = set(snapshot.accessible_containers(user_emp_no))
+        effective = sorted(accessible & {str(c) for c in container_ids}) if container_ids else sorted(accessible)
+        documents = sorted(str(d) for d in document_ids or [])
+
+        scope_hash = hashlib.sha256(
+            json.dumps(
+                {"variant": variant, "containers": effective, "documents": documents, "params": params or {}},
+                sort_keys=True,
+                ensure_ascii=False,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+        try:
+            versions = await self._corpus_versions(effective)
+        except Exception as e:
+            logger.warning(f"[ANSWER-CACHE] 코퍼스 버전 조회 실패 - 캐시 생략: {e}")
+            return None
+        corpus_version = hashlib.sha1(
+            repr([(cid, snapshot.document_count(cid), versions.get(cid, 0)) for cid in effective]).encode("utf-8")
+        ).hexdigest()[:16]
+
+        return AnswerCacheScope(
+            scope_hash=scope_hash,
+            permission_version=snapshot.part_version(PART_PERMISSIONS),
+            corpus_version=corpus_version,
+            container_ids=effective,
+        )
+
+    async def _corpus_versions(self, container_ids: List[str]) -> Dict[str, int]:
+        """컨테이너별 문서 변경 카운터 (행이 없으면 0 - 문서가 한 번도 바뀌지 않은 컨테이너)"""
+        if not container_ids:
+            return {}
+        async with self.session_factory() as session:
+            result = await session.execute(text(CORPUS_VERSIONS_SQL), {"container_ids": container_ids})
+            return {container_id: int(version) for container_id, version in result.all()}
+
+    async def _embed(self, query: str, embedding: Optional[Sequence[float]] = None) -> Optional[List[float]]:
+        """질의 임베딩 (요청의 QueryPlan 이 이미 계산한 값이 있으면 재사용)"""
+        vector = list(embedding) if embedding else await self.embedder.get_embedding(query)
+        if not vector or len(vector) not in VECTOR_COLUMNS:
+            return None
+        return vector
+
+    # ---------------------------
+    # 조회 / 저장
+    # ---------------------------
+    async def lookup(
+        self, query: str, scope: AnswerCacheScope, embedding: Optional[Sequence[float]] = None
+    ) -> Optional[CachedAnswer]:
+        """가장 가까운 유효 항목이 임계값 이상이면 반환"""
+        if not self.enabled or not query.strip():
+            return None
+        try:
+            vector = await self._embed(query, embedding)
+            if vector is None:
+                return None
+            column = VECTOR_COLUMNS[len(vector)]
+
+            async with self.session_factory() as session:
+                row = (await session.execute(
+                    text(LOOKUP_SQL.format(column=column)),
+                    {
+                        "query_vec": "[" + ",".join(map(str, vector)) + "]",
+                        "scope_hash": scope.scope_hash,
+                        "permission_version": scope.permission_version,
+                        "corpus_version": scope.corpus_version,
+                    },
+                )).first()
+
+                if row is None or float(row.similarity) < settings.rag_answer_cache_similarity_threshold:
+                    return None
+
+                await session.execute(
+                    text(
+                        "UPDATE tb_rag_answer_cache SET hit_count = hit_count + 1, last_hit_date = now() "
+                        "WHERE cache_id = :cache_id"
+                    ),
+                    {"cache_id": row.cache_id},
+                )
+                await session.commit()
+
+            logger.info(
+                f"[ANSWER-CACHE] 적중 cache_id={row.cache_id}, similarity={float(row.similarity):.3f}, "
+                f"원 질의='{row.query_text[:40]}'"
+            )
+            return CachedAnswer(
+                cache_id=row.cache_id,
+                query_text=row.query_text,
+                answer=row.answer,
+                payload=row.payload or {},
+                similarity=float(row.similarity),
+                cited_chunk_ids=list(row.cited_chunk_ids or []),
+                cited_file_ids=[int(f) for f in row.cited_file_ids or []],
+            )
+        except Exception as e:
+            logger.warning(f"[ANSWER-CACHE] 조회 실패 - 캐시 생략: {e}")
+            return None
+
+    async def store(
+        self,
+        query: str,
+        scope: AnswerCacheScope,
+        answer: str,
+        payload: Optional[Dict[str, Any]] = None,
+        cited_chunk_ids: Optional[Iterable[Any]] = None,
+        cited_file_ids: Optional[Iterable[Any]] = None,
+        embedding: Optional[Sequence[float]] = None,
+    ) -> Optional[int]:
+        """답변 저장 (인용 청크/문서 ID 포함) - 실패해도 호출 흐름에는 영향 없음"""
+        if not self.enabled or not answer or not query.strip():
+            return None
+        try:
+            vector = await self._embed(query, embedding)
+            if vector is None:
+                return None
+            column = VECTOR_COLUMNS[len(vector)]
+            file_ids = sorted({int(f) for f in cited_file_ids or [] if str(f).isdigit() and int(f) > 0})
+
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    text(f"""
+                        INSERT INTO tb_rag_answer_cache (
+                            scope_hash, permission_version, corpus_version, query_text, {column},
+                            answer, payload, cited_chunk_ids, cited_file_ids, hit_count, expires_at
+                        ) VALUES (
+                            :scope_hash, :permission_version, :corpus_version, :query_text,
+                            CAST(:query_vec AS vector), :answer, CAST(:payload AS jsonb),
+                            :cited_chunk_ids, :cited_file_ids, 0, :expires_at
+                        )
+                        RETURNING cache_id
+                    """),
+                    {
+                        "scope_hash": scope.scope_hash,
+                        "permission_version": scope.permission_version,
+                        "corpus_version": scope.corpus_version,
+                        "query_text": query,
+                        "query_vec": "[" + ",".join(map(str, vector)) + "]",
+                        "answer": answer,
+                        "payload": json.dumps(payload or {}, ensure_ascii=False, default=str),
+                        "cited_chunk_ids": [str(c) for c in cited_chunk_ids or []],
+                        "cited_file_ids": file_ids,
+                        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=settings.rag_answer_cache_ttl_seconds),
+                    },
+                )
+                cache_id = result.scalar()
+                await session.commit()
+            logger.debug(f"[ANSWER-CACHE] 저장 cache_id={cache_id}, 인용 문서 {len(file_ids)}개")
+            return cache_id
+        except Exception as e:
+            logger.warning(f"[ANSWER-CACHE] 저장 실패: {e}")
+            return None
+
+    # ---------------------------
+    # 무효화
+    # ---------------------------
+    async def invalidate_documents(self, file_ids: Iterable[Any]) -> int:
+        """문서가 삭제/재처리되면 해당 문서를 인용한 항목 삭제"""
+        ids = sorted({int(f) for f in file_ids if str(f).isdigit()})
+        if not ids:
+            return 0
+        try:
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    text("DELETE FROM tb_rag_answer_cache WHERE cited_file_ids && CAST(:file_ids AS bigint[])"),
+                    {"file_ids": ids},
+                )
+                await session.commit()
+            if result.rowcount:
+                logger.info(f"[ANSWER-CACHE] 문서 변경으로 {result.rowcount}개 항목 무효화: {ids}")
+            return result.rowcount or 0
+        except Exception as e:
+            logger.warning(f"[ANSWER-CACHE] 문서 무효화 실패: {e}")
+            return 0
+
+    async def purge_stale(self) -> int:
+        """만료 항목 및 현재 권한 버전과 다른 항목 정리 (주기 작업용)"""
+        from app.services.auth.container_tree_service import PART_PERMISSIONS
+
+        snapshot = await self.tree_service.get_snapshot()
+        async with self.session_factory() as session:
+            result = await session.execute(
+                text(
+                    "DELETE FROM tb_rag_answer_cache "
+                    "WHERE expires_at <= now() OR permission_version <> :permission_version"
+                ),
+                {"permission_version": snapshot.part_version(PART_PERMISSIONS)},
+            )
+            await session.commit()
+        return result.rowcount or 0
+
+
+# 전역 인스턴스
+answer_cache_service = AnswerCacheService()
@@ -0,0 +1,350 @@
+"""
+RAG 컨텍스트 패킹
+=================
+
+검색 청크를 LLM 프롬프트 예산 안에 담는 공통 엔진 (RAGSearchService / 에이전트 context_builder 공용).
+
+- 토큰 수: 글자 수 추정 대신 LLM 모델의 tiktoken 인코딩으로 계산
+  - Claude 등 tiktoken 이 모르는 모델은 korean_tokenizer_model(cl100k_base) 사용
+  - 같은 청크는 다시 인코딩하지 않도록 청크 ID별로 캐시 (LRU)
+- 선택: 남은 예산에서 "토큰당 한계 관련도"가 가장 큰 청크를 차례로 선택
+  - 첫 청크는 관련도가 가장 높은 것 (답변 근거 우선)
+  - 이미 선택된 청크와 단어가 겹치는 비율만큼 관련도 감점, 거의 같으면 제외
+- 축약: 긴 청크는 질의 키워드가 들어 있는 문장만 남기고, 예산이 부족한 마지막 청크도
+  관련 문장 우선으로 남은 예산에 맞춤
+
+사용 예시:
+    result = context_packer.pack(
+        [PackCandidate(key=chunk_id, text=content, score=score)], budget=3000, query_terms=["연차"]
+    )
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。？！])\s+|\n+")
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+_ELLIPSIS = "…"
+
+
+def _heuristic_tokens(text: str) -> int:
+    """tiktoken 이 없을 때의 추정치 (한글 1.5자, 그 외 4자당 1토큰)"""
+    korean_chars = sum(1 for c in text if '가' <= c <= '힣')
+    tokens = int(korean_chars / 1.5) + int((len(text) - korean_chars) / 4)
+    return max(tokens, len(text) // 4, 1)
+
+
+def _word_set(text: str) -> FrozenSet[str]:
+    return frozenset(w.lower() for w in _WORD.findall(text) if len(w) > 1)
+
+
+def _overlap(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """작은 쪽 기준 단어 포함 비율 (한 청크가 다른 청크를 거의 포함하면 1에 가까움)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def query_terms(query: str = "", keywords: Optional[Iterable[str]] = None) -> List[str]:
+    """문장 축약에 쓸 질의 단어 (키워드가 있으면 키워드, 없으면 질의 단어)"""
+    source = [k for k in keywords or () if k] or _WORD.findall(query or "")
+    return list(dict.fromkeys(t.lower() for t in source if len(t) > 1))
+
+
+class TokenCounter:
+    """LLM 토크나이저 기준 토큰 수 (청크 ID별 캐시)"""
+
+    def __init__(self, model: Optional[str] = None, cache_size: Optional[int] = None, encoding: Any = None):
+        self._model = model
+        self._cache_size = cache_size
+        # encoding 을 직접 넘기면 (tiktoken.Encoding 호환 객체) 모델 기준 해석을 건너뜀
+        self._encoding: Any = encoding
+        self._resolved = encoding is not None
+        self._cache: "OrderedDict[Tuple[Any, int, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def encoding(self) -> Any:
+        if not self._resolved:
+            self._encoding = self._resolve()
+            self._resolved = True
+        return self._encoding
+
+    @property
+    def name(self) -> str:
+        return self.encoding.name if self.encoding is not None else "heuristic"
+
+    def _resolve(self) -> Any:
+        try:
+            import tiktoken
+        except ImportError:
+            logger.warning("[CONTEXT-PACK] tiktoken 미설치 - 글자 수 기반 토큰 추정 사용")
+            return None
+
+        name = self._model or settings.rag_context_tokenizer or settings.get_current_llm_model()
+        if name:
+            for resolve in (tiktoken.encoding_for_model, tiktoken.get_encoding):
+                try:
+                    return resolve(name)
+                except Exception:
+                    continue
+        try:
+            return tiktoken.get_encoding(settings.korean_tokenizer_model)
+        except Exception as e:
+            logger.warning(f"[CONTEXT-PACK] 토크나이저 로드 실패 - 추정치 사용: {e}")
+            return None
+
+    def _encode_len(self, text: str) -> int:
+        encoding = self.encoding
+        if encoding is None:
+            return _heuristic_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def count(self, text: str, key: Any = None) -> int:
+        """토큰 수 (key 가 있으면 같은 key/본문은 캐시 사용)"""
+        if not text:
+            return 0
+        if key is None:
+            return self._encode_len(text)
+
+        cache_key = (key, len(text), hash(text))
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return cached
+        tokens = self._encode_len(text)
+        with self._lock:
+            self.misses += 1
+            self._cache[cache_key] = tokens
+            limit = max(1, self._cache_size or settings.rag_context_token_cache_size)
+            while len(self._cache) > limit:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞에서부터 max_tokens 이내로 자름"""
+        if max_tokens <= 0:
+            return ""
+        encoding = self.encoding
+        if encoding is None:
+            while text and _heuristic_tokens(text) > max_tokens:
+                text = text[: int(len(text) * 0.9)]
+            return text
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        # 멀티바이트 문자가 토큰 경계에서 잘리면 대체 문자가 생기므로 제거
+        return encoding.decode(tokens[:max_tokens]).rstrip("�")
+
+
+@dataclass
+class PackCandidate:
+    """패킹 후보 청크"""
+    key: Any
+    text: str
+    score: float
+    overhead_tokens: int = 0  # 헤더/구분자 등 본문 외 토큰
+    payload: Any = None
+
+
+@dataclass
+class PackedChunk:
+    """선택된 청크 (축약되었으면 text 가 원문과 다름)"""
+    candidate: PackCandidate
+    text: str
+    tokens: int
+    trimmed: bool = False
+
+
+@dataclass
+class PackResult:
+    chunks: List[PackedChunk] = field(default_factory=list)
+    total_tokens: int = 0  # 선택된 청크 본문 + overhead
+    candidate_tokens: int = 0  # 후보 전체를 그대로 넣었을 때
+    dropped: int = 0
+    trimmed: int = 0
+
+
+@dataclass
+class _Prepared:
+    candidate: PackCandidate
+    text: str
+    tokens: int
+    trimmed: bool
+    relevance: float
+    words: FrozenSet[str]
+
+    @property
+    def cost(self) -> int:
+        return self.tokens + self.candidate.overhead_tokens
+
+
+class ContextPacker:
+    """토큰 예산 안에서 토큰당 관련도가 높은 청크 조합을 선택"""
+
+    def __init__(self, counter: Optional[TokenCounter] = None):
+        self.counter = counter or TokenCounter()
+
+    def pack(
+        self,
+        candidates: Sequence[PackCandidate],
+        budget: int,
+        query_terms: Sequence[str] = (),
+        trim: Optional[bool] = None,
+        min_relative_score: Optional[float] = None,
+        source: str = "rag",
+    ) -> PackResult:
+        """후보 청크를 budget 토큰 안에 패킹 (결과는 관련도 내림차순)"""
+        trim = settings.rag_context_trim_enabled if trim is None else trim
+        floor_ratio = settings.rag_context_min_relative_score if min_relative_score is None else min_relative_score
+        terms = [t.lower() for t in query_terms if t]
+        result = PackResult()
+
+        top = max((c.score for c in candidates), default=0.0)
+        scale = top if top > 0 else 1.0
+        pool: List[_Prepared] = []
+        for candidate in candidates:
+            if not candidate.text or not candidate.text.strip():
+                continue
+            full_tokens = self.counter.count(candidate.text, key=candidate.key)
+            result.candidate_tokens += full_tokens + candidate.overhead_tokens
+            if top > 0 and candidate.score < top * floor_ratio:
+                result.dropped += 1
+                continue
+            text, tokens, trimmed = candidate.text, full_tokens, False
+            if trim and terms and full_tokens >= settings.rag_context_trim_min_tokens:
+                text, tokens, trimmed = self.trim_to_relevant(candidate.text, terms, full_tokens=full_tokens)
+            pool.append(_Prepared(candidate, text, tokens, trimmed, candidate.score / scale, _word_set(text)))
+
+        selected: List[_Prepared] = []
+        remaining = max(0, int(budget))
+        pool.sort(key=lambda p: p.relevance, reverse=True)
+        while pool and remaining > 0:
+            best, best_value = None, float("-inf")
+            for prepared in list(pool):
+                overlap = max((_overlap(prepared.words, s.words) for s in selected), default=0.0)
+                if overlap >= settings.rag_context_duplicate_overlap:
+                    pool.remove(prepared)
+                    result.dropped += 1
+                    continue
+                gain = prepared.relevance * (1.0 - settings.rag_context_redundancy_penalty * overlap)
+                # 첫 청크는 관련도 최상위, 이후는 토큰당 한계 관련도
+                value = gain if not selected else gain / max(prepared.cost, 1)
+                if value > best_value:
+                    best, best_value = prepared, value
+            if best is None:
+                break
+            pool.remove(best)
+
+            if best.cost > remaining:
+                room = remaining - best.candidate.overhead_tokens
+                if not trim or room < min(64, best.tokens):
+                    result.dropped += 1
+                    continue
+                text, tokens, _ = self.trim_to_relevant(
+                    best.candidate.text, terms, max_tokens=room,
+                    full_tokens=self.counter.count(best.candidate.text, key=best.candidate.key),
+                )
+                if not text:
+                    result.dropped += 1
+                    continue
+                best = _Prepared(best.candidate, text, tokens, True, best.relevance, _word_set(text))
+            selected.append(best)
+            remaining -= best.cost
+
+        result.dropped += len(pool)
+        selected.sort(key=lambda p: p.relevance, reverse=True)
+        result.chunks = [PackedChunk(p.candidate, p.text, p.tokens, p.trimmed) for p in selected]
+        result.total_tokens = sum(p.cost for p in selected)
+        result.trimmed = sum(1 for p in selected if p.trimmed)
+        self._record(result, source)
+        return result
+
+    def trim_to_relevant(
+        self,
+        text: str,
+        terms: Sequence[str],
+        max_tokens: Optional[int] = None,
+        full_tokens: Optional[int] = None,
+    ) -> Tuple[str, int, bool]:
+        """질의 단어가 들어 있는 문장 위주로 축약 → (본문, 토큰 수, 축약 여부)
+
+        max_tokens 가 없으면 관련 문장(+ 첫 문장)만 남기고, 관련 문장이 없으면 원문 유지.
+        max_tokens 가 있으면 관련 문장 → 앞 문장 순으로 예산까지 채움.
+        """
+        if full_tokens is None:
+            full_tokens = self.counter.count(text)
+        if max_tokens is not None and full_tokens <= max_tokens:
+            return text, full_tokens, False
+
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s and s.strip()]
+        if len(sentences) <= 1:
+            if max_tokens is None:
+                return text, full_tokens, False
+            cut = self.counter.truncate(text, max_tokens - 1)
+            cut = cut + _ELLIPSIS if cut else ""
+            return cut, self.counter.count(cut), bool(cut)
+
+        hits = [sum(1 for t in terms if t in s.lower()) for s in sentences]
+        if max_tokens is None:
+            keep = {i for i, h in enumerate(hits) if h > 0}
+            if not keep:
+                return text, full_tokens, False
+            keep.add(0)
+            if len(keep) == len(sentences):
+                return text, full_tokens, False
+        else:
+            keep, used = set(), 0
+            for i in sorted(range(len(sentences)), key=lambda i: (-hits[i], i)):
+                sentence_tokens = self.counter.count(sentences[i]) + 1
+                if used + sentence_tokens <= max_tokens - 1:
+                    keep.add(i)
+                    used += sentence_tokens
+            if not keep:
+                cut = self.counter.truncate(sentences[0], max_tokens - 1)
+                return (cut + _ELLIPSIS, self.counter.count(cut + _ELLIPSIS), True) if cut else ("", 0, True)
+
+        pieces: List[str] = []
+        previous = -1
+        for i in sorted(keep):
+            if i != previous + 1:
+                pieces.append(_ELLIPSIS)
+            pieces.append(sentences[i])
+            previous = i
+        if previous < len(sentences) - 1:
+            pieces.append(_ELLIPSIS)
+        trimmed = " ".join(pieces)
+        tokens = self.counter.count(trimmed)
+        if max_tokens is not None and tokens > max_tokens:
+            trimmed = self.counter.truncate(trimmed, max_tokens)
+            tokens = self.counter.count(trimmed)
+        return trimmed, tokens, True
+
+    @staticmethod
+    def _record(result: PackResult, source: str) -> None:
+        from app.core.profiling import metrics_registry
+
+        metrics_registry.increment("context_packs_total", source=source)
+        metrics_registry.increment("context_tokens_total", result.total_tokens, source=source, kind="packed")
+        metrics_registry.increment("context_tokens_total", result.candidate_tokens, source=source, kind="candidate")
+        logger.info(
+            f"[CONTEXT-PACK] {source}: {len(result.chunks)}개 선택 (축약 {result.trimmed}, 제외 {result.dropped}), "
+            f"{result.total_tokens}/{result.candidate_tokens} 토큰"
+        )
+
+
+# 전역 인스턴스
+token_counter = TokenCounter()
+context_packer = ContextPacker(token_counter)
@@ -27,7 +27,9 @@ from sqlalchemy import text, and_, or_
 from app.services.core.ai_service import ai_service
 from app.services.core.korean_nlp_service import korean_nlp_service
 from app.services.chat.conversation_context_service import conversation_context_service
+from app.services.chat.context_packer import query_terms
 from app.services.search.query_pipeline import process_user_query  # 통합 파이프라인
+from app.services.search.query_plan import QueryPlan
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -253,7 +255,8 @@ class RAGSearchService:
             context_text, total_tokens, used_chunks = await self._build_context(
                 chunks=search_results,
                 max_tokens=search_params.context_window,
-                ppt_mode=ppt_intent
+                ppt_mode=ppt_intent,
+                query_terms=query_terms(search_params.query, query_analysis.get("korean_keywords"))
             )
             
             # 6단계: 결과 통계 (멀티턴 컨텍스트 정보 포함)
@@ -346,6 +349,9 @@ class RAGSearchService:
         """
         질의 분석 - 통합 파이프라인 사용
         
+        변경 사항 (2026-01-10):
+        - QueryPlan 1회 생성: 형태소 키워드와 임베딩을 동시에 계산 (임베딩 입력은 정규화 문장)
+        
         변경 사항 (2025-10-17):
         - 통합 파이프라인 (process_user_query) 사용
         - 일관된 불용어 제거 (UNIFIED_STOPWORDS)
@@ -353,7 +359,8 @@ class RAGSearchService:
         """
         try:
             # 통합 파이프라인으로 질의 처리 (RAG 모드)
-            processed = await process_user_query(query, search_type="rag")
+            plan = QueryPlan.build(query)
+            processed = await process_user_query(query, search_type="rag", plan=plan)
             
             logger.info(f"✅ RAG 파이프라인 처리 완료: {processed.processing_time_ms:.1f}ms")
             logger.info(f"  - 의도: {processed.intent} (confidence: {processed.intent_confidence:.2f})")
@@ -368,7 +375,8 @@ class RAGSearchService:
                 "pos_tags": [],  # TODO: 품사 태깅 추가
                 "embedding": processed.vector_embedding,
                 "query_type": self._classify_query_type_from_intent(processed.intent),
-                "intent_keywords": processed.filtered_keywords
+                "intent_keywords": processed.filtered_keywords,
+                "query_plan": plan
             }
             
         except Exception as e:
@@ -479,12 +487,12 @@ class RAGSearchService:
         if provider == 'bedrock' or embedding_dim == 1024:
             # AWS Bedrock: Titan 1024d
             vector_column = "tdc.aws_embedding_1024"
-            vector_not_null = "tdc.aws_embedding_1024 IS NOT NULL"
+            vector_not_null = "tdc.aws_embedding_1024 IS NOT NULL AND tdc.embedding_provider = 'aws'"
             logger.info(f"[RAG-SEARCH] 🟧 AWS Bedrock 벡터 검색 (aws_embedding_1024, {embedding_dim}d)")
         elif provider == 'azure_openai' or embedding_dim == 1536:
             # Azure OpenAI: text-embedding-3-small 1536d
             vector_column = "tdc.azure_embedding_1536"
-            vector_not_null = "tdc.azure_embedding_1536 IS NOT NULL"
+            vector_not_null = "tdc.azure_embedding_1536 IS NOT NULL AND tdc.embedding_provider = 'azure'"
             logger.info(f"[RAG-SEARCH] 🔷 Azure OpenAI 벡터 검색 (azure_embedding_1536, {embedding_dim}d)")
         else:
             # 레거시 폴백
@@ -492,6 +500,25 @@ class RAGSearchService:
             vector_not_null = "tdc.chunk_embedding IS NOT NULL"
             logger.warning(f"[RAG-SEARCH] ⚠️ 레거시 벡터 컬럼 폴백 ({embedding_dim}d)")
 
+        # 압축 모드: halfvec/binary 인덱스로 후보를 먼저 찾고 float32 원본으로 재채점
+        from app.services.search.vector_index_manager import (
+            CHUNK_LIVE_FILE_FILTER, active_compact_spec, rescore_candidate_limit, run_ann_query,
+        )
+        ann_limit = search_params.max_chunks * 2
+        chunk_source = "vs_doc_contents_chunks tdc"
+        compact = active_compact_spec("vs_doc_contents_chunks", vector_column.split(".", 1)[1])
+        if compact is not None:
+            ann_limit = rescore_candidate_limit(search_params.max_chunks * 2)
+            # 범위/삭제 필터를 후보 단계에 적용 (재채점 뒤에 걸러져 결과가 줄지 않도록)
+            candidate_filters = ["del_yn = 'N'", CHUNK_LIVE_FILE_FILTER]
+            if search_params.container_ids:
+                candidate_filters.append("knowledge_container_id = ANY(:container_ids)")
+            if search_params.document_ids:
+                candidate_filters.append("file_bss_info_sno = ANY(:document_ids)")
+            chunk_source = compact.candidate_subquery(
+                ":embedding_vector", ann_limit, "tdc", extra_where=" AND ".join(candidate_filters)
+            )
+
         while attempts < 3:
             base_query = f"""
                 SELECT 
@@ -505,7 +532,7 @@ class RAGSearchService:
                     tdc.knowledge_container_id,
                     1 - ({vector_column} <=> :embedding_vector) as similarity_score,
                     fbi.file_lgc_nm as file_name
-                FROM vs_doc_contents_chunks tdc
+                FROM {chunk_source}
                 JOIN tb_file_bss_info fbi ON tdc.file_bss_info_sno = fbi.file_bss_info_sno
                 WHERE {vector_not_null}
                 AND tdc.del_yn = 'N'
@@ -521,7 +548,8 @@ class RAGSearchService:
                 logger.info(f"🔍 문서 ID 필터링 적용: {search_params.document_ids}")
             if conditions:
                 base_query += " " + " ".join(conditions)
-            base_query += " ORDER BY similarity_score DESC LIMIT :limit"
+            # 거리 오름차순 + LIMIT → 프로바이더별 부분 HNSW 인덱스 사용
+            base_query += f" ORDER BY {vector_column} <=> :embedding_vector LIMIT :limit"
 
             query_sql = text(base_query)
             params = {
@@ -537,8 +565,11 @@ class RAGSearchService:
                 except ValueError:
                     params["document_ids"] = search_params.document_ids
 
-            result = await session.execute(query_sql, params)
-            rows = result.fetchall()
+            # 범위 필터로 LIMIT 미달이 되지 않도록 iterative scan / 정확 검색 폴백 (설정은 호출자 세션에 남지 않음)
+            rows = await run_ann_query(
+                session, query_sql, params, ann_limit=ann_limit, limit=params["limit"],
+                sort_key=lambda row: -float(row[8]),
+            )
             logger.info(f"🔍 의미적 검색 SQL 실행 결과 (attempt {attempts+1}, threshold={attempt_threshold:.2f}): {len(rows)}개 행")
 
             all_results = []
@@ -1414,120 +1445,75 @@ class RAGSearchService:
         self,
         chunks: List[Dict[str, Any]],
         max_tokens: int,
-        ppt_mode: bool = False
+        ppt_mode: bool = False,
+        query_terms: Optional[List[str]] = None
     ) -> Tuple[str, int, List[Dict[str, Any]]]:
-        """RAG 컨텍스트 구성 - 토큰 제한 내에서 최대한 많은 청크 활용
+        """RAG 컨텍스트 구성 - LLM 토크나이저 기준 예산 안에서 토큰당 관련도가 높은 청크 조합 선택
         Returns: (context_text, total_tokens, used_chunks)
         """
+        from app.services.chat.context_packer import PackCandidate, context_packer
+
         if not chunks:
             return "", 0, []
-        
-        context_parts = []
-        current_tokens = 0
-        used_chunks: List[Dict[str, Any]] = []
-        
-        # 청크별 토큰 수 미리 계산 (한국어 텍스트 기준으로 보정)
-        chunk_tokens = []
-        for chunk in chunks:
+
+        def _score(ch: Dict[str, Any]) -> float:
+            return float(ch.get("combined_score", ch.get("similarity_score", 0.0)) or 0.0)
+
+        # PPT 모드: 템플릿/PPT 파일, 목차/개요/요약 성격 청크에 가산점 (짧은 청크 우대는 토큰당 선택이 담당)
+        def _ppt_bonus(ch: Dict[str, Any]) -> float:
+            fname = (ch.get("file_name") or "").lower()
+            sec = (ch.get("section_title") or "").lower()
+            txt = (ch.get("content") or "").lower()
+            bonus = 0.0
+            if any(k in fname for k in [".ppt", ".pptx", "template", "샘플", "sample", "템플릿", "소개서"]):
+                bonus += 1.0
+            if any(k in sec for k in ["목차", "개요", "요약", "outline", "overview", "title", "제목"]):
+                bonus += 0.6
+            elif any(k in txt for k in ["목차", "개요", "요약", "outline", "overview"]):
+                bonus += 0.3
+            return bonus
+
+        def _label(index: int, ch: Dict[str, Any], trimmed: bool) -> str:
+            label = f"[문서 {index}: {ch.get('file_name', 'Unknown')} - 유사도: {_score(ch):.2f}]"
+            return label + " (일부 내용)" if trimmed else label
+
+        candidates = []
+        for position, chunk in enumerate(chunks):
             content = chunk.get("content", "")
             if not content:
                 continue
-            # 한국어 텍스트: 글자 수 / 3 정도가 토큰 수에 가까움
-            estimated_tokens = len(content) // 3
-            metadata_tokens = 50
-            chunk_tokens.append({
-                "chunk": chunk,
-                "content": content,
-                "tokens": estimated_tokens + metadata_tokens
-            })
+            score = _score(chunk) + (_ppt_bonus(chunk) if ppt_mode else 0.0)
+            candidates.append(PackCandidate(
+                key=chunk.get("chunk_id") or f"{chunk.get('file_bss_info_sno')}:{chunk.get('chunk_index', position)}",
+                text=content,
+                score=score,
+                # 헤더 + 본문 앞뒤 줄바꿈
+                overhead_tokens=context_packer.counter.count(f"{_label(len(chunks), chunk, True)}\n\n\n"),
+                payload=chunk,
+            ))
+
+        packed = context_packer.pack(
+            candidates,
+            budget=max_tokens,
+            query_terms=query_terms or (),
+            min_relative_score=0.0 if ppt_mode else None,
+            source="rag",
+        )
 
-        # PPT 모드: 헤더/목차/요약 성격의 짧은 청크들을 우선 배치해 다양성 확보
-        if ppt_mode and chunk_tokens:
-            def _ppt_priority(ct: Dict[str, Any]) -> float:
-                ch = ct["chunk"]
-                fname = (ch.get("file_name") or "").lower()
-                sec = (ch.get("section_title") or "").lower()
-                txt = (ct.get("content") or "").lower()
-                pri = 0.0
-                # 파일 유형 우선 (템플릿/샘플/PPT)
-                if any(k in fname for k in [".ppt", ".pptx", "template", "샘플", "sample", "템플릿", "소개서"]):
-                    pri += 1.0
-                # 헤더/목차/요약
-                if any(k in sec for k in ["목차", "개요", "요약", "outline", "overview", "title", "제목"]):
-                    pri += 0.6
-                elif any(k in txt for k in ["목차", "개요", "요약", "outline", "overview"]):
-                    pri += 0.3
-                # 짧을수록 더 우선
-                pri += max(0.0, 0.6 - (ct["tokens"] / max_tokens))
-                # 기본 유사도 점수도 약간 반영
-                pri += float(ch.get("combined_score", ch.get("similarity_score", 0.0))) * 0.3
-                return pri
-            chunk_tokens = sorted(chunk_tokens, key=_ppt_priority, reverse=True)
-        
-        # 첫 번째 청크가 너무 크면 잘라서 사용
-        if chunk_tokens and chunk_tokens[0]["tokens"] > max_tokens * 0.8:
-            first_chunk = chunk_tokens[0]
-            # 첫 번째 청크를 최대 토큰의 60%까지만 사용 (나머지 청크들을 위해 여유 확보)
-            max_first_tokens = int(max_tokens * 0.6)
-            content_limit = int(max_first_tokens * 3)  # 토큰 -> 글자 수 변환 (한국어 기준)
-            
-            truncated_content = first_chunk["content"][:content_limit] + "..."
-            chunk_info = f"[문서 1: {first_chunk['chunk'].get('file_name', 'Unknown')} - 유사도: {first_chunk['chunk'].get('combined_score', first_chunk['chunk'].get('similarity_score', 0)):.2f}] (일부 내용)"
-            context_part = f"{chunk_info}\n{truncated_content}\n\n"
-            
-            context_parts.append(context_part)
-            current_tokens = max_first_tokens
-            used_chunks.append(first_chunk["chunk"])  # 실제 사용된 청크 기록
-            
-            logger.info(f"⚠️ 첫 번째 청크가 큼 (원본 {first_chunk['tokens']}토큰) → {max_first_tokens}토큰으로 축소")
-            
-            # 나머지 청크들도 추가
-            for i, chunk_data in enumerate(chunk_tokens[1:], 2):
-                if current_tokens + chunk_data["tokens"] > max_tokens:
-                    logger.info(f"⚠️ 토큰 제한 도달: {current_tokens + chunk_data['tokens']} > {max_tokens}, 청크 {i}부터 생략")
-                    break
-                    
-                chunk_info = f"[문서 {i}: {chunk_data['chunk'].get('file_name', 'Unknown')} - 유사도: {chunk_data['chunk'].get('combined_score', chunk_data['chunk'].get('similarity_score', 0)):.2f}]"
-                context_part = f"{chunk_info}\n{chunk_data['content']}\n\n"
-                
-                context_parts.append(context_part)
-                current_tokens += chunk_data["tokens"]
-                used_chunks.append(chunk_data["chunk"])  # 실제 사용된 청크 기록
-        else:
-            # 일반적인 경우: 모든 청크를 순서대로 추가
-            for i, chunk_data in enumerate(chunk_tokens):
-                required_tokens = chunk_data["tokens"]
-                if current_tokens + required_tokens > max_tokens and i > 0:
-                    remaining = max_tokens - current_tokens
-                    if remaining <= 80:
-                        logger.info(f"⚠️ 토큰 제한 도달: {current_tokens + required_tokens} > {max_tokens}, 청크 {i+1}부터 생략")
-                        break
-
-                    logger.info(
-                        f"✂️ 토큰 한도 초과로 청크 {i+1} 축소: 필요 {required_tokens}토큰 → 가용 {remaining}토큰"
-                    )
-                    content_limit = max(remaining * 3, 0)
-                    truncated_content = chunk_data["content"][:content_limit] + "..."
-                    chunk_info = f"[문서 {i+1}: {chunk_data['chunk'].get('file_name', 'Unknown')} - 유사도: {chunk_data['chunk'].get('combined_score', chunk_data['chunk'].get('similarity_score', 0)):.2f}] (일부 내용)"
-                    context_part = f"{chunk_info}\n{truncated_content}\n\n"
-
-                    context_parts.append(context_part)
-                    current_tokens += remaining
-                    used_chunks.append(chunk_data["chunk"])  # 실제 사용된 청크 기록
-                    break
-                
-                chunk_info = f"[문서 {i+1}: {chunk_data['chunk'].get('file_name', 'Unknown')} - 유사도: {chunk_data['chunk'].get('combined_score', chunk_data['chunk'].get('similarity_score', 0)):.2f}]"
-                context_part = f"{chunk_info}\n{chunk_data['content']}\n\n"
-                
-                context_parts.append(context_part)
-                current_tokens += required_tokens
-                used_chunks.append(chunk_data["chunk"])  # 실제 사용된 청크 기록
-        
+        context_parts = [
+            f"{_label(i, item.candidate.payload, item.trimmed)}\n{item.text}\n\n"
+            for i, item in enumerate(packed.chunks, 1)
+        ]
+        used_chunks = [item.candidate.payload for item in packed.chunks]
         context_text = "".join(context_parts)
+        total_tokens = context_packer.counter.count(context_text)
+
+        logger.info(
+            f"📝 컨텍스트 구성 완료: {len(context_parts)}개 청크 (전체 {len(chunks)}개 중, 축약 {packed.trimmed}), "
+            f"{total_tokens}토큰 (후보 전체 {packed.candidate_tokens}토큰)"
+        )
         
-        logger.info(f"📝 컨텍스트 구성 완료: {len(context_parts)}개 청크 (전체 {len(chunks)}개 중), 약 {current_tokens}토큰")
-        
-        return context_text, int(current_tokens), used_chunks
+        return context_text, total_tokens, used_chunks
     
     async def search_with_rag(
         self,
@@ -1663,119 +1649,35 @@ class RAGSearchService:
         exclude_document_ids: Optional[List[str]] = None,
         limit: int = 5,
         threshold: float = 0.2,
-        db_session: Optional[AsyncSession] = None
+        db_session: Optional[AsyncSession] = None,
+        query_embedding: Optional[List[float]] = None,
+        container_ids: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
         """검색 실패 시 질의와 연관된 문서를 추천 (문서 전체 스코프).
 
         전략:
-        1) 질의 임베딩 생성
-        2) 낮은 threshold 로 전체 청크에서 후보 추출 (상한 넉넉히)
-        3) 문서 단위로 max(similarity), 매칭 청크 수를 기준 정렬
+        1) 질의 임베딩 (QueryPlan 이 계산한 값이 있으면 재사용)
+        2) 문서 대표 벡터(centroid/medoid) ANN 으로 후보 문서 추출 - 청크 전체를 훑지 않음
+        3) 후보 문서의 청크만 재채점: max(similarity), 임계값 초과 청크 수 기준 정렬
         4) 상위 N개 반환
         """
-        from app.core.database import get_db
         try:
-            # 임베딩 생성 - 설정된 서비스 사용
-            from app.services.core.embedding_service import EmbeddingService
-            embedding_service = EmbeddingService()
-            embedding_vector = await embedding_service.get_embedding(query)
+            embedding_vector = list(query_embedding) if query_embedding else None
+            if not embedding_vector:
+                from app.services.core.embedding_service import embedding_service
+                embedding_vector = await embedding_service.get_embedding(query)
             if not embedding_vector:
                 return []
 
-            # 세션 확보
-            if db_session:
-                session = db_session
-                close_after = False
-            else:
-                # 비동기 제너레이터에서 하나 꺼냄
-                session_gen = get_db()
-                session = None
-                async for s in session_gen:
-                    session = s
-                    break
-                close_after = True
-
-            if session is None:
-                return []
-
-            # 🔷🟧 프로바이더별 벡터 컬럼 동적 선택
-            provider = settings.get_current_embedding_provider()
-            embedding_dim = len(embedding_vector)
-            
-            if provider == 'bedrock' or embedding_dim == 1024:
-                # AWS Bedrock: Titan 1024d
-                vector_column = "tdc.aws_embedding_1024"
-                vector_not_null = "tdc.aws_embedding_1024 IS NOT NULL"
-                logger.info(f"[RAG-DOC-SEARCH] 🟧 AWS Bedrock 벡터 검색 (aws_embedding_1024, {embedding_dim}d)")
-            elif provider == 'azure_openai' or embedding_dim == 1536:
-                # Azure OpenAI: text-embedding-3-small 1536d
-                vector_column = "tdc.azure_embedding_1536"
-                vector_not_null = "tdc.azure_embedding_1536 IS NOT NULL"
-                logger.info(f"[RAG-DOC-SEARCH] 🔷 Azure OpenAI 벡터 검색 (azure_embedding_1536, {embedding_dim}d)")
-            else:
-                # 레거시 폴백
-                vector_column = "tdc.chunk_embedding"
-                vector_not_null = "tdc.chunk_embedding IS NOT NULL"
-                logger.warning(f"[RAG-DOC-SEARCH] ⚠️ 레거시 벡터 컬럼 폴백 ({embedding_dim}d)")
-
-            # 후보 청크에서 문서 단위 집계
-            base_sql = f"""
-                SELECT 
-                    fbi.file_bss_info_sno AS file_id,
-                    fbi.file_lgc_nm AS file_name,
-                    MAX(1 - ({vector_column} <=> :embedding_vector)) AS max_similarity,
-                    COUNT(*) AS matched_chunks
-                FROM vs_doc_contents_chunks tdc
-                JOIN tb_file_bss_info fbi ON tdc.file_bss_info_sno = fbi.file_bss_info_sno
-                WHERE {vector_not_null}
-                  AND fbi.del_yn = 'N'
-                  AND 1 - ({vector_column} <=> :embedding_vector) > :threshold
-            """
-            conditions = []
-            params: Dict[str, Any] = {
-                "embedding_vector": f"[{','.join(map(str, embedding_vector))}]",
-                "threshold": threshold,
-                "candidate_limit": max(limit * 5, 25)  # 충분한 후보 확보
-            }
-            if exclude_document_ids:
-                try:
-                    exclude_int = [int(x) for x in exclude_document_ids]
-                except ValueError:
-                    exclude_int = []
-                if exclude_int:
-                    conditions.append("AND NOT (fbi.file_bss_info_sno = ANY(:exclude_ids))")
-                    params["exclude_ids"] = exclude_int
-
-            if conditions:
-                base_sql += " " + " ".join(conditions)
-
-            # 그룹 & 정렬
-            base_sql += """
-                GROUP BY fbi.file_bss_info_sno, fbi.file_lgc_nm
-                ORDER BY max_similarity DESC, matched_chunks DESC
-                LIMIT :candidate_limit
-            """
-            from sqlalchemy import text
-            result = await session.execute(text(base_sql), params)
-            rows = result.fetchall()
-
-            recommendations = []
-            for row in rows[:limit]:
-                import math
-                max_sim = float(row.max_similarity)
-                matched_count = int(row.matched_chunks)
-                
-                # NaN 값 필터링
-                if math.isnan(max_sim) or math.isinf(max_sim):
-                    logger.debug(f"연관 문서 추천에서 NaN 점수 스킵: {row.file_name}")
-                    continue
-                    
-                recommendations.append({
-                    "file_id": row.file_id,
-                    "file_name": row.file_name,
-                    "max_similarity": max_sim,
-                    "matched_chunks": matched_count
-                })
+            from app.services.search.document_vector_service import document_vector_service
+            recommendations = await document_vector_service.recommend(
+                embedding_vector,
+                limit=limit,
+                threshold=threshold,
+                exclude_file_ids=exclude_document_ids,
+                container_ids=container_ids,
+                session=db_session,
+            )
 
             logger.info(f"🔗 연관 문서 추천: {len(recommendations)}개 (limit={limit})")
             return recommendations
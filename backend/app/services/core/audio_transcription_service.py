@@ -2,7 +2,7 @@ import logging
 import time
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
@@ -78,7 +78,10 @@ class AudioTranscriptionService:
         return self._enabled and self._transcribe_client is not None
 
     def transcribe(self, audio_path: Path, language_code: str = "ko-KR") -> str:
-        """오디오 파일을 텍스트로 변환
+        """오디오 파일을 텍스트로 변환 (완료까지 블로킹)
+        
+        API 경로는 transcription_job_service 의 작업 관리자를 사용한다.
+        이 메서드는 스레드를 작업 시간 내내 점유하므로 배치 스크립트 등에서만 사용한다.
         
         Args:
             audio_path: 오디오 파일 경로
@@ -87,6 +90,43 @@ class AudioTranscriptionService:
         Returns:
             변환된 텍스트
         """
+        job_name, s3_key = self.start_job(audio_path, language_code)
+        
+        try:
+            # 작업 완료 대기 (폴링)
+            max_wait_time = 300  # 5분
+            poll_interval = 2  # 2초
+            elapsed_time = 0
+            
+            while elapsed_time < max_wait_time:
+                job_status, transcript_uri, failure_reason = self.get_job_state(job_name)
+                
+                if job_status == 'COMPLETED':
+                    logger.info("✅ [AWS-TRANSCRIBE] 변환 완료 - elapsed: %ds", elapsed_time)
+                    return self.download_transcript(transcript_uri)
+                
+                elif job_status == 'FAILED':
+                    logger.error("❌ [AWS-TRANSCRIBE] 변환 실패 - reason: %s", failure_reason)
+                    raise RuntimeError(f"Transcription job failed: {failure_reason}")
+                
+                # 진행 중
+                logger.debug("⏳ [AWS-TRANSCRIBE] 변환 중... status: %s (elapsed: %ds)", job_status, elapsed_time)
+                time.sleep(poll_interval)
+                elapsed_time += poll_interval
+            
+            # 타임아웃
+            logger.error("⏰ [AWS-TRANSCRIBE] 타임아웃 - max_wait: %ds", max_wait_time)
+            raise RuntimeError(f"Transcription job timed out after {max_wait_time}s")
+        
+        finally:
+            self.cleanup_job(job_name, s3_key)
+
+    def start_job(self, audio_path: Path, language_code: str = "ko-KR") -> Tuple[str, str]:
+        """S3 업로드 후 배치 변환 작업 시작 (대기하지 않음)
+        
+        Returns:
+            (job_name, s3_key)
+        """
         if not self.enabled or not self._transcribe_client or not self._s3_client:
             raise RuntimeError("Audio transcription service is not configured.")
 
@@ -121,47 +161,35 @@ class AudioTranscriptionService:
                     'MaxSpeakerLabels': 1
                 }
             )
-            
-            # 3. 작업 완료 대기 (폴링)
-            max_wait_time = 300  # 5분
-            poll_interval = 2  # 2초
-            elapsed_time = 0
-            
-            while elapsed_time < max_wait_time:
-                status = self._transcribe_client.get_transcription_job(
-                    TranscriptionJobName=job_name
-                )
-                job_status = status['TranscriptionJob']['TranscriptionJobStatus']
-                
-                if job_status == 'COMPLETED':
-                    logger.info("✅ [AWS-TRANSCRIBE] 변환 완료 - elapsed: %ds", elapsed_time)
-                    
-                    # 4. 결과 다운로드
-                    transcript_uri = status['TranscriptionJob']['Transcript']['TranscriptFileUri']
-                    text = self._download_transcript(transcript_uri)
-                    
-                    return text
-                
-                elif job_status == 'FAILED':
-                    failure_reason = status['TranscriptionJob'].get('FailureReason', 'Unknown')
-                    logger.error("❌ [AWS-TRANSCRIBE] 변환 실패 - reason: %s", failure_reason)
-                    raise RuntimeError(f"Transcription job failed: {failure_reason}")
-                
-                # 진행 중
-                logger.debug("⏳ [AWS-TRANSCRIBE] 변환 중... status: %s (elapsed: %ds)", job_status, elapsed_time)
-                time.sleep(poll_interval)
-                elapsed_time += poll_interval
-            
-            # 타임아웃
-            logger.error("⏰ [AWS-TRANSCRIBE] 타임아웃 - max_wait: %ds", max_wait_time)
-            raise RuntimeError(f"Transcription job timed out after {max_wait_time}s")
+            return job_name, s3_key
             
         except ClientError as exc:
             logger.error("❌ [AWS-TRANSCRIBE] AWS 클라이언트 오류: %s", exc)
+            self.cleanup_job(None, s3_key)
             raise RuntimeError(f"AWS Transcribe error: {exc}")
+
+    def get_job_state(self, job_name: str) -> Tuple[str, Optional[str], Optional[str]]:
+        """작업 상태 1회 조회
         
-        finally:
-            # 정리: S3에서 임시 파일 삭제
+        Returns:
+            (status, transcript_uri, failure_reason) - status: QUEUED/IN_PROGRESS/COMPLETED/FAILED
+        """
+        try:
+            job = self._transcribe_client.get_transcription_job(
+                TranscriptionJobName=job_name
+            )['TranscriptionJob']
+        except ClientError as exc:
+            logger.error("❌ [AWS-TRANSCRIBE] 작업 조회 오류 - job: %s, error: %s", job_name, exc)
+            raise RuntimeError(f"AWS Transcribe error: {exc}")
+        
+        job_status = job['TranscriptionJobStatus']
+        transcript_uri = job.get('Transcript', {}).get('TranscriptFileUri') if job_status == 'COMPLETED' else None
+        failure_reason = job.get('FailureReason', 'Unknown') if job_status == 'FAILED' else None
+        return job_status, transcript_uri, failure_reason
+
+    def cleanup_job(self, job_name: Optional[str], s3_key: Optional[str]) -> None:
+        """S3 임시 파일 및 변환 작업 삭제 (실패는 경고만)"""
+        if s3_key:
             try:
                 self._s3_client.delete_object(
                     Bucket=settings.aws_s3_bucket,
@@ -170,8 +198,9 @@ class AudioTranscriptionService:
                 logger.info("🗑️ [AWS-TRANSCRIBE] S3 임시 파일 삭제 완료")
             except Exception as cleanup_exc:
                 logger.warning("⚠️ [AWS-TRANSCRIBE] S3 정리 실패: %s", cleanup_exc)
-            
-            # Transcribe 작업 삭제 (선택사항)
+        
+        # Transcribe 작업 삭제 (선택사항)
+        if job_name:
             try:
                 self._transcribe_client.delete_transcription_job(
                     TranscriptionJobName=job_name
@@ -194,7 +223,7 @@ class AudioTranscriptionService:
         }
         return format_map.get(suffix.lower(), 'mp4')
 
-    def _download_transcript(self, transcript_uri: str) -> str:
+    def download_transcript(self, transcript_uri: str) -> str:
         """Transcribe 결과 JSON 다운로드 및 텍스트 추출"""
         import json
         import urllib.request
@@ -1,52 +1,92 @@
 import boto3
 import os
+from functools import lru_cache
 from typing import List, Optional, Any
 from loguru import logger
 from app.core.config import settings
 
+S3_PURPOSE_PREFIX = {
+    'raw': 'raw',
+    'intermediate': 'intermediate',
+    'derived': 'derived'
+}
+
+
+@lru_cache(maxsize=1)
+def shared_aws_session() -> boto3.Session:
+    """프로세스 공용 boto3 세션 (서비스 인스턴스마다 세션/자격증명 해석을 반복하지 않도록)"""
+    # 환경 변수와 settings(소문자 필드) 모두 지원
+    aws_access_key_id = getattr(settings, 'aws_access_key_id', None) or os.getenv('AWS_ACCESS_KEY_ID')
+    aws_secret_access_key = getattr(settings, 'aws_secret_access_key', None) or os.getenv('AWS_SECRET_ACCESS_KEY')
+    aws_region = getattr(settings, 'aws_region', None) or os.getenv('AWS_REGION', 'ap-northeast-2')
+    return boto3.Session(
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=aws_region
+    )
+
+
+@lru_cache(maxsize=1)
+def shared_s3_client():
+    """
+    프로세스 공용 S3 클라이언트 (스레드 안전, 커넥션 풀 공유).
+    풀 크기는 스토리지 I/O 스레드 수 이상이어야 병렬 파트 전송이 풀 대기로 직렬화되지 않는다.
+    """
+    from botocore.config import Config
+
+    pool_size = max(settings.storage_max_pool_connections, settings.storage_io_threads)
+    return shared_aws_session().client(
+        's3',
+        endpoint_url=settings.aws_s3_endpoint_url or None,
+        config=Config(max_pool_connections=pool_size, retries={'max_attempts': 5, 'mode': 'adaptive'}),
+    )
+
+
+def build_s3_key(blob_path: str, purpose: str = 'raw') -> str:
+    """스토리지 purpose에 맞는 S3 키 생성"""
+    prefix = S3_PURPOSE_PREFIX.get(purpose, 'raw')
+    normalized = blob_path.lstrip('/')
+    if normalized.startswith(f"{prefix}/"):
+        return normalized
+    return f"{prefix}/{normalized}"
+
+
+def s3_object_url(bucket_name: Optional[str], object_key: str) -> str:
+    region = getattr(settings, 'aws_region', None) or os.getenv('AWS_REGION', 'ap-northeast-2')
+    return f"https://{bucket_name}.s3.{region}.amazonaws.com/{object_key}"
+
+
 class AWSService:
     """AWS 서비스 기본 클래스"""
     
     def __init__(self):
-        # 환경 변수와 settings(소문자 필드) 모두 지원
-        aws_access_key_id = getattr(settings, 'aws_access_key_id', None) or os.getenv('AWS_ACCESS_KEY_ID')
-        aws_secret_access_key = getattr(settings, 'aws_secret_access_key', None) or os.getenv('AWS_SECRET_ACCESS_KEY')
-        aws_region = getattr(settings, 'aws_region', None) or os.getenv('AWS_REGION', 'ap-northeast-2')
-
-        self.session = boto3.Session(
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=aws_region
-        )
+        self.session = shared_aws_session()
 
 class S3Service(AWSService):
-    """AWS S3 서비스 클래스"""
+    """
+    AWS S3 서비스 클래스
+    
+    동기 메서드(upload_bytes/download_bytes/...)는 스레드/동기 코드용이다.
+    비동기 코드에서는 object_storage.get_object_storage() (병렬 multipart, 스트리밍) 를 사용한다.
+    """
     
     def __init__(self):
         super().__init__()
-        self.s3_client = self.session.client('s3')
+        self.s3_client = shared_s3_client()
         # settings의 소문자 필드 또는 환경 변수 사용
         self.bucket_name = getattr(settings, 'aws_s3_bucket', None) or os.getenv('AWS_S3_BUCKET')
-        self._purpose_prefix = {
-            'raw': 'raw',
-            'intermediate': 'intermediate',
-            'derived': 'derived'
-        }
+        self._purpose_prefix = S3_PURPOSE_PREFIX
 
     def _build_key(self, blob_path: str, purpose: str = 'raw') -> str:
         """스토리지 purpose에 맞는 S3 키 생성"""
-        prefix = self._purpose_prefix.get(purpose, 'raw')
-        normalized = blob_path.lstrip('/')
-        if normalized.startswith(f"{prefix}/"):
-            return normalized
-        return f"{prefix}/{normalized}"
+        return build_s3_key(blob_path, purpose)
     
     async def upload_file(self, file_path: str, object_key: str) -> str:
-        """파일을 S3에 업로드"""
+        """파일을 S3에 업로드 (대용량은 병렬 multipart, 이벤트 루프 비차단)"""
+        from app.services.core.object_storage import get_object_storage
+
         try:
-            self.s3_client.upload_file(file_path, self.bucket_name, object_key)
-            region = getattr(settings, 'aws_region', None) or os.getenv('AWS_REGION', 'ap-northeast-2')
-            url = f"https://{self.bucket_name}.s3.{region}.amazonaws.com/{object_key}"
+            url = await get_object_storage('s3').upload_file(file_path, object_key)
             logger.info(f"File uploaded to S3: {url}")
             return url
         except Exception as e:
@@ -54,9 +94,11 @@ class S3Service(AWSService):
             raise e
     
     async def download_file(self, object_key: str, local_path: str) -> str:
-        """S3에서 파일 다운로드"""
+        """S3에서 파일 다운로드 (대용량은 병렬 Range GET, 이벤트 루프 비차단)"""
+        from app.services.core.object_storage import get_object_storage
+
         try:
-            self.s3_client.download_file(self.bucket_name, object_key, local_path)
+            await get_object_storage('s3').download_file(object_key, local_path)
             logger.info(f"File downloaded from S3: {object_key}")
             return local_path
         except Exception as e:
@@ -65,8 +107,10 @@ class S3Service(AWSService):
     
     async def delete_file(self, object_key: str) -> bool:
         """S3에서 파일 삭제"""
+        from app.services.core.object_storage import get_object_storage
+
         try:
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=object_key)
+            await get_object_storage('s3').delete(object_key)
             logger.info(f"File deleted from S3: {object_key}")
             return True
         except Exception as e:
@@ -98,8 +142,7 @@ class S3Service(AWSService):
             
             self.s3_client.put_object(**put_params)
             
-            region = getattr(settings, 'aws_region', None) or os.getenv('AWS_REGION', 'ap-northeast-2')
-            url = f"https://{self.bucket_name}.s3.{region}.amazonaws.com/{full_key}"
+            url = s3_object_url(self.bucket_name, full_key)
             logger.info(f"Bytes uploaded to S3: {url} ({len(data)} bytes, purpose={purpose})")
             return url
         except Exception as e:
@@ -204,15 +204,17 @@ class EmbeddingService:
                     "inputText": text
                 })
                 
-                response = self.bedrock_client.invoke_model(
-                    modelId=embedding_model_id,
-                    body=request_body,
-                    contentType="application/json",
-                    accept="application/json"
-                )
-                
-                response_body = json.loads(response['body'].read())
-                embedding = response_body['embedding']
+                # boto3 호출은 블로킹 → 스레드에서 실행 (배치 임베딩의 동시 호출이 이벤트 루프를 막지 않도록)
+                def _invoke() -> List[float]:
+                    response = self.bedrock_client.invoke_model(
+                        modelId=embedding_model_id,
+                        body=request_body,
+                        contentType="application/json",
+                        accept="application/json"
+                    )
+                    return json.loads(response['body'].read())['embedding']
+
+                embedding = await asyncio.to_thread(_invoke)
                 # 로그 추가: 일반 텍스트 임베딩임을 명시
                 logger.debug(f"✅ Bedrock 텍스트 임베딩 (RAG용): {len(embedding)}d ({embedding_model_id})")
                 return embedding
@@ -266,14 +268,9 @@ class EmbeddingService:
             elif self.default_provider == 'openai' and self.openai_client:
                 return await self._get_openai_embeddings_batch(texts, batch_size)
             
-            # Bedrock은 배치 API가 없으므로 개별 처리 (폴백)
+            # Bedrock (Titan) 은 요청당 1건 → 동시 호출 수를 제한해 병렬 처리
             elif self.default_provider == 'bedrock' and self.bedrock_client:
-                logger.warning(f"[BATCH-EMB] Bedrock은 배치 API 미지원 - {len(texts)}개 개별 처리")
-                embeddings = []
-                for text in texts:
-                    embedding = await self.get_embedding(text)
-                    embeddings.append(embedding)
-                return embeddings
+                return await self._get_bedrock_embeddings_batch(texts)
             
             # 폴백: 사용 가능한 다른 클라이언트 사용
             if self.azure_openai_client:
@@ -281,12 +278,7 @@ class EmbeddingService:
             elif self.openai_client:
                 return await self._get_openai_embeddings_batch(texts, batch_size)
             elif self.bedrock_client:
-                logger.warning(f"[BATCH-EMB] Bedrock은 배치 API 미지원 - {len(texts)}개 개별 처리")
-                embeddings = []
-                for text in texts:
-                    embedding = await self.get_embedding(text)
-                    embeddings.append(embedding)
-                return embeddings
+                return await self._get_bedrock_embeddings_batch(texts)
             
             # 모든 클라이언트가 없는 경우 더미 벡터 반환
             logger.warning(f"[BATCH-EMB] 임베딩 서비스 없음 - {len(texts)}개 더미 벡터 반환")
@@ -297,6 +289,22 @@ class EmbeddingService:
             # 오류 발생 시 더미 벡터들 반환
             return [[0.0] * settings.vector_dimension for _ in texts]
     
+    async def _get_bedrock_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Bedrock 배치 임베딩 - Titan 은 다건 입력 API 가 없어 요청을 동시에 보낸다 (순서 유지).
+
+        get_embedding 을 거치므로 캐시/동일 텍스트 중복 제거와 실패 시 더미 벡터 규칙이 같다.
+        """
+        semaphore = asyncio.Semaphore(max(1, int(getattr(settings, "bedrock_embedding_max_concurrency", 8))))
+
+        async def _one(text: str) -> List[float]:
+            async with semaphore:
+                return await self.get_embedding(text)
+
+        started = time.perf_counter()
+        embeddings = await asyncio.gather(*(_one(text) for text in texts))
+        logger.debug(f"[BATCH-EMB][Bedrock] {len(texts)}개 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return list(embeddings)
+
     async def _get_azure_openai_embeddings_batch(self, texts: List[str], batch_size: int) -> List[List[float]]:
         """Azure OpenAI 배치 임베딩 (최대 100개씩)"""
         all_embeddings: List[List[float]] = []
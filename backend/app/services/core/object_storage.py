@@ -0,0 +1,824 @@
+"""
+비동기 오브젝트 스토리지 계층
+
+S3 / Azure Blob / 로컬 파일시스템 / 메모리(테스트용)를 같은 비동기 인터페이스로 다룬다.
+
+- 공유 클라이언트: 백엔드별 인스턴스 1개 (get_object_storage). S3 는 프로세스 공용 boto3 클라이언트,
+  Azure 는 이벤트 루프별 aio BlobServiceClient 하나를 재사용해 커넥션 풀을 공유한다.
+- 이벤트 루프 비차단: 블로킹 SDK/디스크 호출은 전용 스레드 풀(storage_io_threads)에서 실행한다.
+- 대용량 전송: storage_multipart_threshold_mb 이상은 파트 단위 병렬 업로드(S3 multipart / Azure block)와
+  병렬 Range 다운로드. 객체당 동시 파트 수(storage_transfer_concurrency)만큼만 버퍼를 잡는다.
+- 스트리밍: open_reader (청크 비동기 이터레이터, 다음 청크 선행 수신), open_writer (파트 단위 업로드 writer)
+
+키 규칙: purpose 가 None 이면 키 그대로, 'raw' / 'intermediate' / 'derived' 면 백엔드 규칙을 적용한다
+(S3: 키 접두어, Azure: 용도별 컨테이너, 로컬/메모리: 하위 디렉터리) - 기존 S3Service / AzureBlobService 와 같은 규칙.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+S3_MIN_PART_SIZE = 5 * MB
+
+
+class ObjectNotFoundError(FileNotFoundError):
+    """스토리지에 객체가 없음"""
+
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.storage_io_threads), thread_name_prefix="storage-io"
+                )
+    return _io_executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """블로킹 호출을 스토리지 전용 스레드 풀에서 실행 (기본 executor 를 다른 작업과 나눠 쓰지 않도록)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor(), partial(fn, *args, **kwargs))
+
+
+class MultipartUpload(ABC):
+    """파트 단위 업로드 세션 - upload_part 는 여러 파트가 동시에 호출된다 (part_number 는 1부터)"""
+
+    async def start(self) -> None:
+        return None
+
+    @abstractmethod
+    async def upload_part(self, part_number: int, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    async def complete(self) -> None:
+        ...
+
+    @abstractmethod
+    async def abort(self) -> None:
+        ...
+
+
+class ObjectWriter:
+    """
+    스트리밍 writer - write 로 받은 데이터를 파트 크기로 잘라 백그라운드에서 병렬 업로드.
+    동시 업로드가 가득 차면 write 가 대기한다 (backpressure). 파트 하나도 안 찬 작은 객체는 단일 PUT.
+    """
+
+    def __init__(self, storage: "ObjectStorage", key: str, purpose: Optional[str], content_type: Optional[str]):
+        self._storage = storage
+        self._key = key
+        self._purpose = purpose
+        self._content_type = content_type
+        self._buffer = bytearray()
+        self._upload: Optional[MultipartUpload] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._slots = asyncio.Semaphore(storage.concurrency)
+        self._part_number = 0
+        self.bytes_written = 0
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        self.bytes_written += len(data)
+        part_size = self._storage.part_size
+        while len(self._buffer) >= part_size:
+            part = bytes(self._buffer[:part_size])
+            del self._buffer[:part_size]
+            await self._submit(part)
+
+    async def _submit(self, data: bytes) -> None:
+        if self._upload is None:
+            self._upload = self._storage._multipart(self._key, self._purpose, self._content_type)
+            await self._upload.start()
+        self._raise_failed()
+        await self._slots.acquire()
+        self._part_number += 1
+        task = asyncio.create_task(self._upload.upload_part(self._part_number, data))
+        task.add_done_callback(lambda _task: self._slots.release())
+        self._tasks.append(task)
+
+    def _raise_failed(self) -> None:
+        for task in self._tasks:
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()  # type: ignore[misc]
+
+    async def _commit(self) -> None:
+        if self._upload is None:
+            await self._storage._put(self._key, self._purpose, bytes(self._buffer), self._content_type)
+            return
+        if self._buffer:
+            await self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        await asyncio.gather(*self._tasks)
+        await self._upload.complete()
+
+    async def _abort(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._upload is not None:
+            try:
+                await self._upload.abort()
+            except Exception as e:
+                logger.warning(f"[STORAGE] multipart 중단 실패: {self._key} - {e}")
+
+
+class ObjectStorage(ABC):
+    """
+    오브젝트 스토리지 공통 인터페이스.
+    백엔드는 _put / _read / _size / _delete / _multipart / location 만 구현하고,
+    병렬 파트 전송·스트리밍·임시 파일 교체는 여기서 공통 처리한다.
+    """
+
+    backend: str = ""
+    min_part_size: int = 1
+
+    def __init__(
+        self,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        threshold: Optional[int] = None,
+    ):
+        self.part_size = max(part_size or settings.storage_multipart_part_size_mb * MB, self.min_part_size)
+        self.concurrency = max(1, concurrency or settings.storage_transfer_concurrency)
+        self.threshold = max(threshold or settings.storage_multipart_threshold_mb * MB, self.part_size)
+
+    # ---- 백엔드 구현 ----
+    @abstractmethod
+    def location(self, key: str, purpose: Optional[str] = None) -> str:
+        """객체 위치 (URL 또는 경로) - 업로드 결과로 반환"""
+
+    @abstractmethod
+    async def _put(self, key: str, purpose: Optional[str], data: bytes, content_type: Optional[str]) -> None:
+        ...
+
+    @abstractmethod
+    async def _read(self, key: str, purpose: Optional[str], offset: int = 0, length: Optional[int] = None) -> bytes:
+        """객체(또는 범위) 읽기 - 없으면 ObjectNotFoundError"""
+
+    @abstractmethod
+    async def _size(self, key: str, purpose: Optional[str]) -> int:
+        """객체 크기 - 없으면 ObjectNotFoundError"""
+
+    @abstractmethod
+    async def _delete(self, key: str, purpose: Optional[str]) -> None:
+        """삭제 - 없는 객체는 무시"""
+
+    @abstractmethod
+    def _multipart(self, key: str, purpose: Optional[str], content_type: Optional[str]) -> MultipartUpload:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+    # ---- 공통 API ----
+    async def put_bytes(
+        self, key: str, data: bytes, purpose: Optional[str] = None, content_type: Optional[str] = None
+    ) -> str:
+        if len(data) < self.threshold:
+            await self._put(key, purpose, bytes(data), content_type)
+        else:
+            async with self.open_writer(key, purpose, content_type) as writer:
+                view = memoryview(data)
+                for offset in range(0, len(data), self.part_size):
+                    await writer.write(view[offset:offset + self.part_size])
+        return self.location(key, purpose)
+
+    async def get_bytes(self, key: str, purpose: Optional[str] = None) -> bytes:
+        """객체 전체를 메모리로 (대용량은 download_file / open_reader 사용)"""
+        return await self._read(key, purpose)
+
+    async def size(self, key: str, purpose: Optional[str] = None) -> int:
+        return await self._size(key, purpose)
+
+    async def exists(self, key: str, purpose: Optional[str] = None) -> bool:
+        try:
+            await self._size(key, purpose)
+            return True
+        except ObjectNotFoundError:
+            return False
+
+    async def delete(self, key: str, purpose: Optional[str] = None) -> bool:
+        try:
+            await self._delete(key, purpose)
+            return True
+        except Exception as e:
+            logger.warning(f"[STORAGE] 삭제 실패 ({self.backend}): {key} - {e}")
+            return False
+
+    async def upload_file(
+        self, local_path: str, key: str, purpose: Optional[str] = None, content_type: Optional[str] = None
+    ) -> str:
+        """로컬 파일 업로드 - 임계값 이상이면 파일을 파트별로 pread 해 병렬 업로드 (전체를 메모리에 올리지 않음)"""
+        size = await run_blocking(os.path.getsize, local_path)
+        if size < self.threshold:
+            data = await run_blocking(Path(local_path).read_bytes)
+            await self._put(key, purpose, data, content_type)
+            return self.location(key, purpose)
+
+        upload = self._multipart(key, purpose, content_type)
+        await upload.start()
+        fd = await run_blocking(os.open, local_path, os.O_RDONLY)
+        try:
+            async def send(part_number: int, offset: int) -> None:
+                data = await run_blocking(os.pread, fd, min(self.part_size, size - offset), offset)
+                await upload.upload_part(part_number, data)
+
+            await self._bounded([
+                partial(send, index + 1, offset) for index, offset in enumerate(range(0, size, self.part_size))
+            ])
+            await upload.complete()
+        except BaseException:
+            try:
+                await upload.abort()
+            except Exception as e:
+                logger.warning(f"[STORAGE] multipart 중단 실패: {key} - {e}")
+            raise
+        finally:
+            os.close(fd)
+        logger.info(f"[STORAGE] 병렬 업로드 완료 ({self.backend}): {key} {size / MB:.1f}MB")
+        return self.location(key, purpose)
+
+    async def download_file(self, key: str, local_path: str, purpose: Optional[str] = None) -> str:
+        """
+        로컬 파일로 다운로드 - 임계값 이상이면 Range 요청을 병렬로 받아 위치별로 pwrite.
+        같은 디렉터리의 임시 파일에 받은 뒤 교체하므로 실패해도 기존 파일이 깨지지 않는다.
+        """
+        size = await self._size(key, purpose)
+        target = Path(local_path)
+        await run_blocking(target.parent.mkdir, parents=True, exist_ok=True)
+        fd, tmp_path = await run_blocking(
+            tempfile.mkstemp, dir=str(target.parent), prefix=f".{target.name}.", suffix=".part"
+        )
+        try:
+            step = self.part_size if size >= self.threshold else max(size, 1)
+
+            async def fetch(offset: int) -> None:
+                data = await self._read(key, purpose, offset, min(step, size - offset))
+                await run_blocking(os.pwrite, fd, data, offset)
+
+            await self._bounded([partial(fetch, offset) for offset in range(0, size, step)])
+        except BaseException:
+            os.close(fd)
+            await run_blocking(_unlink_quietly, tmp_path)
+            raise
+        os.close(fd)
+        await run_blocking(os.replace, tmp_path, target)
+        return str(target)
+
+    async def open_reader(
+        self, key: str, purpose: Optional[str] = None, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """객체를 chunk_size 단위로 순서대로 스트리밍 (소비하는 동안 다음 청크를 미리 받아 둔다)"""
+        chunk_size = chunk_size or self.part_size
+        size = await self._size(key, purpose)
+        pending: Optional["asyncio.Task[bytes]"] = None
+        try:
+            for offset in range(0, size, chunk_size):
+                following = asyncio.create_task(self._read(key, purpose, offset, min(chunk_size, size - offset)))
+                if pending is not None:
+                    yield await pending
+                pending = following
+            if pending is not None:
+                chunk, pending = await pending, None
+                yield chunk
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    @asynccontextmanager
+    async def open_writer(
+        self, key: str, purpose: Optional[str] = None, content_type: Optional[str] = None
+    ) -> AsyncIterator[ObjectWriter]:
+        """스트리밍 업로드 - 블록을 정상 종료하면 커밋, 예외 시 업로드 중단"""
+        writer = ObjectWriter(self, key, purpose, content_type)
+        try:
+            yield writer
+            await writer._commit()
+        except BaseException:
+            await writer._abort()
+            raise
+
+    async def _bounded(self, jobs: List[Callable[[], Awaitable[Any]]]) -> List[Any]:
+        """최대 concurrency 개씩 실행 (하나라도 실패하면 나머지 취소)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(job: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await job()
+
+        tasks = [asyncio.create_task(run(job)) for job in jobs]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# =============================================================================
+# S3 (S3 호환 - MinIO 포함)
+# =============================================================================
+
+def _s3_missing(error: Exception) -> bool:
+    code = str(getattr(error, "response", {}).get("Error", {}).get("Code", ""))
+    return code in ("NoSuchKey", "404", "NotFound")
+
+
+class _S3MultipartUpload(MultipartUpload):
+    def __init__(self, client: Any, bucket: str, key: str, content_type: Optional[str]):
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._content_type = content_type
+        self._upload_id: Optional[str] = None
+        self._etags: Dict[int, str] = {}
+
+    async def start(self) -> None:
+        params: Dict[str, Any] = {"Bucket": self._bucket, "Key": self._key}
+        if self._content_type:
+            params["ContentType"] = self._content_type
+        response = await run_blocking(self._client.create_multipart_upload, **params)
+        self._upload_id = response["UploadId"]
+
+    async def upload_part(self, part_number: int, data: bytes) -> None:
+        response = await run_blocking(
+            self._client.upload_part,
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=part_number, Body=data,
+        )
+        self._etags[part_number] = response["ETag"]
+
+    async def complete(self) -> None:
+        parts = [{"PartNumber": number, "ETag": self._etags[number]} for number in sorted(self._etags)]
+        await run_blocking(
+            self._client.complete_multipart_upload,
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, MultipartUpload={"Parts": parts},
+        )
+
+    async def abort(self) -> None:
+        if self._upload_id:
+            await run_blocking(
+                self._client.abort_multipart_upload, Bucket=self._bucket, Key=self._key, UploadId=self._upload_id,
+            )
+
+
+class S3ObjectStorage(ObjectStorage):
+    """S3 백엔드 - 공용 boto3 클라이언트(aws_service.shared_s3_client)를 스토리지 스레드 풀에서 호출"""
+
+    backend = "s3"
+    min_part_size = S3_MIN_PART_SIZE
+
+    def __init__(self, bucket_name: Optional[str] = None, client: Any = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.bucket_name = bucket_name or settings.aws_s3_bucket or os.getenv("AWS_S3_BUCKET")
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            from app.services.core.aws_service import shared_s3_client
+            self._client = shared_s3_client()
+        return self._client
+
+    def _key(self, key: str, purpose: Optional[str]) -> str:
+        from app.services.core.aws_service import build_s3_key
+        return build_s3_key(key, purpose) if purpose else key
+
+    def location(self, key: str, purpose: Optional[str] = None) -> str:
+        object_key = self._key(key, purpose)
+        if settings.aws_s3_endpoint_url:
+            return f"{settings.aws_s3_endpoint_url.rstrip('/')}/{self.bucket_name}/{object_key}"
+        from app.services.core.aws_service import s3_object_url
+        return s3_object_url(self.bucket_name, object_key)
+
+    async def _put(self, key: str, purpose: Optional[str], data: bytes, content_type: Optional[str]) -> None:
+        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": self._key(key, purpose), "Body": data}
+        if content_type:
+            params["ContentType"] = content_type
+        await run_blocking(self.client.put_object, **params)
+
+    async def _read(self, key: str, purpose: Optional[str], offset: int = 0, length: Optional[int] = None) -> bytes:
+        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": self._key(key, purpose)}
+        if offset or length is not None:
+            end = "" if length is None else offset + length - 1
+            params["Range"] = f"bytes={offset}-{end}"
+
+        def read() -> bytes:
+            try:
+                return self.client.get_object(**params)["Body"].read()
+            except Exception as e:
+                if _s3_missing(e):
+                    raise ObjectNotFoundError(params["Key"]) from e
+                raise
+
+        return await run_blocking(read)
+
+    async def _size(self, key: str, purpose: Optional[str]) -> int:
+        object_key = self._key(key, purpose)
+
+        def head() -> int:
+            try:
+                return int(self.client.head_object(Bucket=self.bucket_name, Key=object_key)["ContentLength"])
+            except Exception as e:
+                if _s3_missing(e):
+                    raise ObjectNotFoundError(object_key) from e
+                raise
+
+        return await run_blocking(head)
+
+    async def _delete(self, key: str, purpose: Optional[str]) -> None:
+        await run_blocking(self.client.delete_object, Bucket=self.bucket_name, Key=self._key(key, purpose))
+
+    def _multipart(self, key: str, purpose: Optional[str], content_type: Optional[str]) -> MultipartUpload:
+        return _S3MultipartUpload(self.client, self.bucket_name, self._key(key, purpose), content_type)
+
+
+# =============================================================================
+# Azure Blob (azure.storage.blob.aio - 네이티브 비동기)
+# =============================================================================
+
+class _AzureBlockUpload(MultipartUpload):
+    """stage_block 병렬 → commit_block_list (커밋 안 된 블록은 서비스가 자동 정리)"""
+
+    def __init__(self, blob: Any, content_type: Optional[str], prepare: Optional[Callable[[], Awaitable[None]]] = None):
+        self._blob = blob
+        self._content_type = content_type
+        self._prepare = prepare
+        self._block_ids: Dict[int, str] = {}
+
+    async def start(self) -> None:
+        if self._prepare is not None:
+            await self._prepare()
+
+    async def upload_part(self, part_number: int, data: bytes) -> None:
+        block_id = base64.b64encode(f"{part_number:08d}".encode()).decode()
+        await self._blob.stage_block(block_id, data, length=len(data))
+        self._block_ids[part_number] = block_id
+
+    async def complete(self) -> None:
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        blocks = [BlobBlock(block_id=self._block_ids[number]) for number in sorted(self._block_ids)]
+        content_settings = ContentSettings(content_type=self._content_type) if self._content_type else None
+        await self._blob.commit_block_list(blocks, content_settings=content_settings)
+
+    async def abort(self) -> None:
+        return None
+
+
+class AzureBlobObjectStorage(ObjectStorage):
+    """Azure Blob 백엔드 - 이벤트 루프별 aio BlobServiceClient 하나를 공유 (aiohttp 세션/커넥션 재사용)"""
+
+    backend = "azure_blob"
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._containers = {
+            "raw": settings.azure_blob_container_raw,
+            "intermediate": settings.azure_blob_container_intermediate,
+            "derived": settings.azure_blob_container_derived,
+        }
+        # aio 클라이언트는 생성한 이벤트 루프에 묶이므로 루프별로 보관 (Celery/스크립트의 asyncio.run 대응)
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+        # azure_blob_enable_auto_container: 컨테이너별 첫 쓰기 전에 한 번만 생성 시도
+        self._ready_containers: Set[str] = set()
+
+    def _service(self) -> Any:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            from azure.storage.blob.aio import BlobServiceClient
+
+            conn_str = settings.azure_blob_connection_string or os.getenv("AZURE_BLOB_CONNECTION_STRING")
+            options = {"max_single_put_size": self.part_size, "max_block_size": self.part_size}
+            if conn_str:
+                client = BlobServiceClient.from_connection_string(conn_str, **options)
+            else:
+                account_name = settings.azure_blob_account_name or os.getenv("AZURE_BLOB_ACCOUNT_NAME")
+                account_key = settings.azure_blob_account_key or os.getenv("AZURE_BLOB_ACCOUNT_KEY")
+                if not account_name or not account_key:
+                    raise RuntimeError("Azure Blob 인증 정보가 부족합니다 (account_name/account_key or connection string)")
+                account_url = (
+                    f"http://127.0.0.1:10000/{account_name}" if settings.azure_blob_path_style
+                    else f"https://{account_name}.blob.core.windows.net"
+                )
+                client = BlobServiceClient(account_url=account_url, credential=account_key, **options)
+            self._clients[loop] = client
+        return client
+
+    def _container(self, purpose: Optional[str]) -> str:
+        container = self._containers.get(purpose or "raw")
+        if container is None:
+            raise ValueError(f"Unknown purpose: {purpose}")
+        return container
+
+    def _blob(self, key: str, purpose: Optional[str]) -> Any:
+        return self._service().get_blob_client(container=self._container(purpose), blob=key)
+
+    async def _ensure_container(self, purpose: Optional[str]) -> None:
+        container = self._container(purpose)
+        if not settings.azure_blob_enable_auto_container or container in self._ready_containers:
+            return
+        from azure.core.exceptions import ResourceExistsError
+
+        try:
+            await self._service().create_container(container)
+            logger.info(f"[STORAGE] Azure 컨테이너 생성: {container}")
+        except ResourceExistsError:
+            pass  # 이미 존재
+        except Exception as e:
+            # 권한 부족 등 - 다음 쓰기에서 다시 시도하고, 실제 업로드 오류는 호출자에게 전달
+            logger.warning(f"[STORAGE] Azure 컨테이너 생성 실패: {container} - {e}")
+            return
+        self._ready_containers.add(container)
+
+    def location(self, key: str, purpose: Optional[str] = None) -> str:
+        from urllib.parse import quote
+
+        account_name = settings.azure_blob_account_name or os.getenv("AZURE_BLOB_ACCOUNT_NAME") or ""
+        return f"https://{account_name}.blob.core.windows.net/{self._container(purpose)}/{quote(key, safe='/')}"
+
+    async def _put(self, key: str, purpose: Optional[str], data: bytes, content_type: Optional[str]) -> None:
+        from azure.storage.blob import ContentSettings
+
+        await self._ensure_container(purpose)
+        content_settings = ContentSettings(content_type=content_type) if content_type else None
+        await self._blob(key, purpose).upload_blob(data, overwrite=True, content_settings=content_settings)
+
+    async def _read(self, key: str, purpose: Optional[str], offset: int = 0, length: Optional[int] = None) -> bytes:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            downloader = await self._blob(key, purpose).download_blob(
+                offset=offset if (offset or length is not None) else None, length=length,
+            )
+            return await downloader.readall()
+        except ResourceNotFoundError as e:
+            raise ObjectNotFoundError(key) from e
+
+    async def _size(self, key: str, purpose: Optional[str]) -> int:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            properties = await self._blob(key, purpose).get_blob_properties()
+        except ResourceNotFoundError as e:
+            raise ObjectNotFoundError(key) from e
+        return int(properties.size)
+
+    async def _delete(self, key: str, purpose: Optional[str]) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            await self._blob(key, purpose).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+    def _multipart(self, key: str, purpose: Optional[str], content_type: Optional[str]) -> MultipartUpload:
+        return _AzureBlockUpload(
+            self._blob(key, purpose), content_type, prepare=partial(self._ensure_container, purpose)
+        )
+
+    async def close(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+
+# =============================================================================
+# 로컬 파일시스템
+# =============================================================================
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+
+
+def _read_range(path: Path, offset: int, length: Optional[int]) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read() if length is None else f.read(length)
+    except FileNotFoundError as e:
+        raise ObjectNotFoundError(str(path)) from e
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError as e:
+        raise ObjectNotFoundError(str(path)) from e
+
+
+def _copy_atomic(source: str, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".part")
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+    except FileNotFoundError as e:
+        _unlink_quietly(tmp_path)
+        raise ObjectNotFoundError(source) from e
+    except BaseException:
+        _unlink_quietly(tmp_path)
+        raise
+
+
+class _LocalMultipartUpload(MultipartUpload):
+    """임시 파일에 파트 위치별 pwrite → 완료 시 교체"""
+
+    def __init__(self, path: Path, part_size: int):
+        self._path = path
+        self._part_size = part_size
+        self._fd: Optional[int] = None
+        self._tmp_path = ""
+
+    async def start(self) -> None:
+        await run_blocking(self._path.parent.mkdir, parents=True, exist_ok=True)
+        self._fd, self._tmp_path = await run_blocking(
+            tempfile.mkstemp, dir=str(self._path.parent), prefix=f".{self._path.name}.", suffix=".part"
+        )
+
+    async def upload_part(self, part_number: int, data: bytes) -> None:
+        await run_blocking(os.pwrite, self._fd, data, (part_number - 1) * self._part_size)
+
+    async def complete(self) -> None:
+        os.close(self._fd)
+        self._fd = None
+        await run_blocking(os.replace, self._tmp_path, self._path)
+
+    async def abort(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        await run_blocking(_unlink_quietly, self._tmp_path)
+
+
+class LocalObjectStorage(ObjectStorage):
+    """로컬 디스크 백엔드 (storage_local_root, 기본 업로드 디렉터리) - 모든 디스크 I/O 는 스토리지 스레드 풀에서"""
+
+    backend = "local"
+
+    def __init__(self, root: Optional[str] = None, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.root = Path(root or settings.storage_local_root or settings.resolved_upload_dir).resolve()
+
+    def _path(self, key: str, purpose: Optional[str]) -> Path:
+        base = self.root / purpose if purpose else self.root
+        path = (base / key.lstrip("/")).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"스토리지 루트 밖 경로: {key}")
+        return path
+
+    def location(self, key: str, purpose: Optional[str] = None) -> str:
+        return str(self._path(key, purpose))
+
+    async def _put(self, key: str, purpose: Optional[str], data: bytes, content_type: Optional[str]) -> None:
+        await run_blocking(_atomic_write, self._path(key, purpose), data)
+
+    async def _read(self, key: str, purpose: Optional[str], offset: int = 0, length: Optional[int] = None) -> bytes:
+        return await run_blocking(_read_range, self._path(key, purpose), offset, length)
+
+    async def _size(self, key: str, purpose: Optional[str]) -> int:
+        return await run_blocking(_file_size, self._path(key, purpose))
+
+    async def _delete(self, key: str, purpose: Optional[str]) -> None:
+        await run_blocking(_unlink_quietly, str(self._path(key, purpose)))
+
+    def _multipart(self, key: str, purpose: Optional[str], content_type: Optional[str]) -> MultipartUpload:
+        return _LocalMultipartUpload(self._path(key, purpose), self.part_size)
+
+    async def upload_file(
+        self, local_path: str, key: str, purpose: Optional[str] = None, content_type: Optional[str] = None
+    ) -> str:
+        # 같은 디스크 - 파트 분할 없이 커널 복사
+        await run_blocking(_copy_atomic, local_path, self._path(key, purpose))
+        return self.location(key, purpose)
+
+    async def download_file(self, key: str, local_path: str, purpose: Optional[str] = None) -> str:
+        await run_blocking(_copy_atomic, str(self._path(key, purpose)), Path(local_path))
+        return local_path
+
+
+# =============================================================================
+# 메모리 (테스트용)
+# =============================================================================
+
+class _MemoryMultipartUpload(MultipartUpload):
+    def __init__(self, storage: "InMemoryObjectStorage", object_id: Tuple[Optional[str], str]):
+        self._storage = storage
+        self._object_id = object_id
+        self._parts: Dict[int, bytes] = {}
+
+    async def upload_part(self, part_number: int, data: bytes) -> None:
+        await asyncio.sleep(0)  # 다른 파트와 실제로 교차 실행되도록
+        self._parts[part_number] = bytes(data)
+
+    async def complete(self) -> None:
+        self._storage.objects[self._object_id] = b"".join(self._parts[n] for n in sorted(self._parts))
+
+    async def abort(self) -> None:
+        self._parts.clear()
+
+
+class InMemoryObjectStorage(ObjectStorage):
+    """테스트용 - 프로세스 메모리에 저장 (파트 분할 / 병렬 / 스트리밍 경로는 다른 백엔드와 동일)"""
+
+    backend = "memory"
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.objects: Dict[Tuple[Optional[str], str], bytes] = {}
+
+    def location(self, key: str, purpose: Optional[str] = None) -> str:
+        return f"memory://{purpose or '_'}/{key}"
+
+    async def _put(self, key: str, purpose: Optional[str], data: bytes, content_type: Optional[str]) -> None:
+        self.objects[(purpose, key)] = bytes(data)
+
+    async def _read(self, key: str, purpose: Optional[str], offset: int = 0, length: Optional[int] = None) -> bytes:
+        if (purpose, key) not in self.objects:
+            raise ObjectNotFoundError(key)
+        data = self.objects[(purpose, key)]
+        return data[offset:] if length is None else data[offset:offset + length]
+
+    async def _size(self, key: str, purpose: Optional[str]) -> int:
+        if (purpose, key) not in self.objects:
+            raise ObjectNotFoundError(key)
+        return len(self.objects[(purpose, key)])
+
+    async def _delete(self, key: str, purpose: Optional[str]) -> None:
+        self.objects.pop((purpose, key), None)
+
+    def _multipart(self, key: str, purpose: Optional[str], content_type: Optional[str]) -> MultipartUpload:
+        return _MemoryMultipartUpload(self, (purpose, key))
+
+
+_BACKENDS: Dict[str, Callable[[], ObjectStorage]] = {
+    "s3": S3ObjectStorage,
+    "azure_blob": AzureBlobObjectStorage,
+    "local": LocalObjectStorage,
+    "memory": InMemoryObjectStorage,
+}
+
+
+def get_object_storage(backend: Optional[str] = None) -> ObjectStorage:
+    """백엔드별 공유 인스턴스 (기본: settings.storage_backend)"""
+    name = backend or getattr(settings, "storage_backend", None) or "local"
+    storage = _object_storages.get(name)
+    if storage is None:
+        if name not in _BACKENDS:
+            raise ValueError(f"알 수 없는 스토리지 백엔드: {name}")
+        storage = _object_storages.setdefault(name, _BACKENDS[name]())
+    return storage
+
+
+async def close_object_storages() -> None:
+    """종료 시 공유 클라이언트 정리 (Azure aio 세션)"""
+    for storage in list(_object_storages.values()):
+        try:
+            await storage.close()
+        except Exception as e:
+            logger.warning(f"[STORAGE] 종료 실패 ({storage.backend}): {e}")
+
+
+# 전역 인스턴스 (백엔드 이름 → 공유 스토리지)
+_object_storages: Dict[str, ObjectStorage] = {}
@@ -0,0 +1,457 @@
+"""
+음성 전사 작업 관리
+
+AWS Transcribe 배치 작업은 수 초~수 분이 걸린다. 요청마다 스레드에서 완료까지 폴링하면
+동시 음성 입력 몇 건으로 기본 스레드풀이 고갈되므로 다음과 같이 나눈다.
+
+1. 제출: 업로드 + 작업 시작만 수행 (짧은 블로킹 호출, 동시 제출 수 제한)
+2. 폴링: 프로세스당 폴러 태스크 1개가 진행 중인 모든 작업 상태를 주기적으로 일괄 조회
+3. 완료: 결과 후처리(stt_post_processor) → 대기 중인 요청/상태 조회에 전달
+
+스트리밍 모드는 amazon-transcribe 스트리밍 SDK로 부분 결과를 바로 내보낸다.
+백엔드는 교체 가능하며 (aws | local), local 백엔드는 테스트/개발용이다.
+
+작업 목록은 프로세스 메모리에만 있다 (단일 프로세스 가정). 여러 워커로 띄우면 상태 조회
+(GET /agent/chat/transcribe/jobs/{job_id})가 제출한 워커로 가야 하므로 세션 고정 라우팅이 필요하고,
+재시작 시 진행 중 작업은 사라진다. 완료 작업은 보관 기간(transcription_job_retention_seconds)이
+지나면 제출/조회/폴링 시점에 정리된다.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import settings
+from app.utils.stt_post_processor import post_process_transcript, should_post_process
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+# 스트리밍 SDK 가 직접 받을 수 있는 형식 (webm/mp3/m4a 등은 배치 작업으로 처리)
+STREAMING_ENCODINGS = {
+    ".wav": "pcm",
+    ".pcm": "pcm",
+    ".flac": "flac",
+    ".ogg": "ogg-opus",
+    ".opus": "ogg-opus",
+}
+STREAM_CHUNK_BYTES = 8 * 1024
+
+
+def apply_post_processing(text: str, is_partial: bool = False) -> str:
+    """확정 결과에만 오인식 보정 적용 (WebSocket 스트리밍과 같은 규칙)"""
+    if text and should_post_process(text, is_partial):
+        return post_process_transcript(text)
+    return text
+
+
+@dataclass
+class BackendStatus:
+    """백엔드 작업 상태 1회 조회 결과"""
+    state: str  # running / completed / failed
+    transcript: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class TranscriptionJob:
+    """전사 작업"""
+    job_id: str
+    owner: Optional[str]
+    language: str
+    audio_path: Path
+    status: str = JOB_QUEUED
+    transcript: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    deadline: float = 0.0  # time.monotonic 기준
+    handle: Any = None  # 백엔드 작업 식별 정보
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "language": self.language,
+            "transcript": self.transcript,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class TranscriptionBackend(ABC):
+    """전사 백엔드 인터페이스"""
+
+    name = "base"
+
+    @property
+    def enabled(self) -> bool:
+        return False
+
+    @abstractmethod
+    async def submit(self, job: TranscriptionJob) -> Any:
+        """작업 시작 후 폴링에 필요한 핸들 반환 (완료까지 기다리지 않는다)"""
+
+    @abstractmethod
+    async def poll(self, job: TranscriptionJob) -> BackendStatus:
+        """작업 상태 1회 조회"""
+
+    async def cleanup(self, job: TranscriptionJob) -> None:
+        """원격 임시 자원 정리 (완료/실패/타임아웃 후 1회)"""
+
+    def supports_streaming(self, audio_path: Path) -> bool:
+        return False
+
+    @abstractmethod
+    def stream(
+        self, audio_path: Path, language: str, sample_rate: int = 16000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """{'text', 'is_partial'} 이벤트를 순서대로 내보내는 비동기 이터레이터"""
+
+
+class AwsTranscribeBackend(TranscriptionBackend):
+    """AWS Transcribe 배치 작업 + 스트리밍 SDK"""
+
+    name = "aws"
+
+    def __init__(self, service=None):
+        if service is None:
+            from app.services.core.audio_transcription_service import audio_transcription_service
+            service = audio_transcription_service
+        self.service = service
+
+    @property
+    def enabled(self) -> bool:
+        return self.service.enabled
+
+    async def submit(self, job: TranscriptionJob) -> Any:
+        job_name, s3_key = await asyncio.to_thread(self.service.start_job, job.audio_path, job.language)
+        return {"job_name": job_name, "s3_key": s3_key}
+
+    async def poll(self, job: TranscriptionJob) -> BackendStatus:
+        job_status, transcript_uri, failure_reason = await asyncio.to_thread(
+            self.service.get_job_state, job.handle["job_name"]
+        )
+        if job_status == "COMPLETED":
+            text = await asyncio.to_thread(self.service.download_transcript, transcript_uri)
+            return BackendStatus(JOB_COMPLETED, transcript=text)
+        if job_status == "FAILED":
+            return BackendStatus(JOB_FAILED, error=f"Transcription job failed: {failure_reason}")
+        return BackendStatus(JOB_RUNNING)
+
+    async def cleanup(self, job: TranscriptionJob) -> None:
+        if job.handle:
+            await asyncio.to_thread(self.service.cleanup_job, job.handle["job_name"], job.handle["s3_key"])
+
+    def supports_streaming(self, audio_path: Path) -> bool:
+        return self.enabled and audio_path.suffix.lower() in STREAMING_ENCODINGS
+
+    async def stream(
+        self, audio_path: Path, language: str, sample_rate: int = 16000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        from amazon_transcribe.client import TranscribeStreamingClient
+        from amazon_transcribe.handlers import TranscriptResultStreamHandler
+
+        encoding = STREAMING_ENCODINGS[audio_path.suffix.lower()]
+        data_offset = 0
+        if audio_path.suffix.lower() == ".wav":
+            # WAV 헤더에서 실제 샘플레이트/데이터 시작 위치 확인 (PCM 본문만 전송)
+            with wave.open(str(audio_path), "rb") as wav:
+                sample_rate = wav.getframerate()
+                data_offset = wav.getfp().tell()
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        class _QueueHandler(TranscriptResultStreamHandler):
+            async def handle_transcript_event(self, transcript_event):
+                for result in transcript_event.transcript.results or []:
+                    for alt in result.alternatives or []:
+                        await queue.put({"text": alt.transcript or "", "is_partial": result.is_partial})
+
+        client = TranscribeStreamingClient(region=settings.aws_region)
+        stream = await client.start_stream_transcription(
+            language_code="ko-KR" if language == "auto" else language,
+            media_sample_rate_hz=sample_rate,
+            media_encoding=encoding,
+            enable_partial_results_stabilization=True,
+            partial_results_stability="high",
+        )
+
+        async def _feed() -> None:
+            with audio_path.open("rb") as audio_file:
+                audio_file.seek(data_offset)
+                while True:
+                    chunk = audio_file.read(STREAM_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    await stream.input_stream.send_audio_event(audio_chunk=chunk)
+            await stream.input_stream.end_stream()
+
+        async def _handle() -> None:
+            try:
+                await _QueueHandler(stream.output_stream).handle_events()
+            finally:
+                await queue.put(None)
+
+        feeder = asyncio.create_task(_feed())
+        handler = asyncio.create_task(_handle())
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await feeder
+        finally:
+            for task in (feeder, handler):
+                if not task.done():
+                    task.cancel()
+
+
+class LocalTranscriptionBackend(TranscriptionBackend):
+    """
+    로컬 대체 백엔드 (테스트/개발용)
+
+    오디오 파일과 같은 이름의 .txt 파일 내용 또는 transcripts[파일명] 을 결과로 사용하며,
+    polls_until_done 회 조회 후 완료된다.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        transcripts: Optional[Dict[str, str]] = None,
+        polls_until_done: int = 1,
+        default_text: str = "",
+    ):
+        self.transcripts = transcripts or {}
+        self.polls_until_done = polls_until_done
+        self.default_text = default_text
+        self.submitted: List[str] = []
+        self.cleaned: List[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def _text_for(self, audio_path: Path) -> str:
+        if audio_path.name in self.transcripts:
+            return self.transcripts[audio_path.name]
+        sidecar = audio_path.with_suffix(".txt")
+        if sidecar.exists():
+            return sidecar.read_text(encoding="utf-8")
+        return self.default_text
+
+    async def submit(self, job: TranscriptionJob) -> Any:
+        self.submitted.append(job.job_id)
+        return {"remaining": self.polls_until_done, "text": self._text_for(job.audio_path)}
+
+    async def poll(self, job: TranscriptionJob) -> BackendStatus:
+        job.handle["remaining"] -= 1
+        if job.handle["remaining"] > 0:
+            return BackendStatus(JOB_RUNNING)
+        return BackendStatus(JOB_COMPLETED, transcript=job.handle["text"])
+
+    async def cleanup(self, job: TranscriptionJob) -> None:
+        self.cleaned.append(job.job_id)
+
+    def supports_streaming(self, audio_path: Path) -> bool:
+        return True
+
+    async def stream(
+        self, audio_path: Path, language: str, sample_rate: int = 16000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        words = self._text_for(audio_path).split()
+        for i in range(1, len(words)):
+            yield {"text": " ".join(words[:i]), "is_partial": True}
+        if words:
+            yield {"text": " ".join(words), "is_partial": False}
+
+
+def create_backend(name: Optional[str] = None) -> TranscriptionBackend:
+    name = (name or settings.transcription_backend or "aws").lower()
+    if name == "local":
+        return LocalTranscriptionBackend()
+    return AwsTranscribeBackend()
+
+
+class TranscriptionJobManager:
+    """전사 작업 제출/상태/대기 + 단일 폴러 (작업 목록은 프로세스 메모리 - 단일 프로세스 가정)"""
+
+    def __init__(
+        self,
+        backend: Optional[TranscriptionBackend] = None,
+        poll_interval: Optional[float] = None,
+        job_timeout: Optional[float] = None,
+        retention: Optional[float] = None,
+        max_concurrent_submits: Optional[int] = None,
+    ):
+        self._backend = backend
+        self.poll_interval = settings.transcription_poll_interval_seconds if poll_interval is None else poll_interval
+        self.job_timeout = settings.transcription_job_timeout_seconds if job_timeout is None else job_timeout
+        self.retention = settings.transcription_job_retention_seconds if retention is None else retention
+        self.max_concurrent_submits = max_concurrent_submits or settings.transcription_max_concurrent_submits
+        self._jobs: Dict[str, TranscriptionJob] = {}
+        self._submit_semaphore: Optional[asyncio.Semaphore] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    @property
+    def backend(self) -> TranscriptionBackend:
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend.enabled
+
+    def supports_streaming(self, audio_path: Path) -> bool:
+        return self.backend.supports_streaming(audio_path)
+
+    def get(self, job_id: str, owner: Optional[str] = None) -> Optional[TranscriptionJob]:
+        """작업 조회 (owner 지정 시 소유자 일치 작업만, 보관 기간이 지난 완료 작업은 None)"""
+        self._evict_finished()
+        job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+
+    async def submit(self, audio_path: Path, language: str, owner: Optional[str] = None) -> TranscriptionJob:
+        """
+        작업 제출 - 업로드/시작까지만 기다린다.
+
+        audio_path 는 작업이 소유하며 작업 종료 시 삭제된다.
+        """
+        self._evict_finished()
+        job = TranscriptionJob(
+            job_id=uuid.uuid4().hex,
+            owner=owner,
+            language=language,
+            audio_path=audio_path,
+            deadline=time.monotonic() + self.job_timeout,
+        )
+        self._jobs[job.job_id] = job
+
+        if self._submit_semaphore is None:
+            self._submit_semaphore = asyncio.Semaphore(self.max_concurrent_submits)
+        try:
+            async with self._submit_semaphore:
+                job.handle = await self.backend.submit(job)
+        except Exception as exc:
+            logger.error("❌ [TRANSCRIBE-JOB] 작업 제출 실패 - job: %s, error: %s", job.job_id, exc)
+            await self._finish(job, error=str(exc))
+            return job
+
+        job.status = JOB_RUNNING
+        logger.info("🎤 [TRANSCRIBE-JOB] 작업 제출 - job: %s, backend: %s", job.job_id, self.backend.name)
+        self._ensure_poller()
+        return job
+
+    async def wait(self, job: TranscriptionJob, timeout: Optional[float] = None) -> TranscriptionJob:
+        """작업 완료 대기 (스레드를 점유하지 않음)"""
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job
+
+    async def stream(
+        self, audio_path: Path, language: str, sample_rate: int = 16000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 전사 - 부분/확정 결과를 후처리하여 내보낸다"""
+        async for event in self.backend.stream(audio_path, language, sample_rate):
+            yield {**event, "text": apply_post_processing(event["text"], event["is_partial"])}
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        """진행 중인 모든 작업을 주기적으로 일괄 조회 - 작업이 없으면 종료"""
+        while True:
+            self._evict_finished()
+            running = [job for job in self._jobs.values() if job.status == JOB_RUNNING]
+            if not running:
+                return
+            await asyncio.sleep(self.poll_interval)
+            await asyncio.gather(*(self._poll_one(job) for job in running))
+
+    async def _poll_one(self, job: TranscriptionJob) -> None:
+        if job.finished:
+            return
+        if time.monotonic() > job.deadline:
+            logger.error("⏰ [TRANSCRIBE-JOB] 타임아웃 - job: %s", job.job_id)
+            await self._finish(job, error=f"Transcription job timed out after {self.job_timeout}s")
+            return
+        try:
+            status = await self.backend.poll(job)
+        except Exception as exc:
+            logger.error("❌ [TRANSCRIBE-JOB] 상태 조회 실패 - job: %s, error: %s", job.job_id, exc)
+            await self._finish(job, error=str(exc))
+            return
+
+        if status.state == JOB_COMPLETED:
+            await self._finish(job, transcript=apply_post_processing(status.transcript or ""))
+        elif status.state == JOB_FAILED:
+            await self._finish(job, error=status.error or "Transcription job failed")
+
+    async def _finish(
+        self, job: TranscriptionJob, transcript: Optional[str] = None, error: Optional[str] = None
+    ) -> None:
+        if job.finished:
+            return
+        job.status = JOB_FAILED if error else JOB_COMPLETED
+        job.transcript = transcript
+        job.error = error
+        job.finished_at = datetime.now()
+        job.done.set()
+        logger.info("✅ [TRANSCRIBE-JOB] 작업 종료 - job: %s, status: %s", job.job_id, job.status)
+
+        if job.handle is not None:
+            try:
+                await self.backend.cleanup(job)
+            except Exception as exc:
+                logger.warning("⚠️ [TRANSCRIBE-JOB] 정리 실패 - job: %s, error: %s", job.job_id, exc)
+        job.audio_path.unlink(missing_ok=True)
+
+    def _evict_finished(self) -> None:
+        """보관 기간이 지난 완료 작업 제거"""
+        now = datetime.now()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at and (now - job.finished_at).total_seconds() > self.retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """서버 종료 시 폴러 중지 및 진행 중 작업 정리"""
+        if self._poller and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+        for job in list(self._jobs.values()):
+            if not job.finished:
+                await self._finish(job, error="Server shutting down")
+
+
+# 전역 인스턴스
+transcription_job_manager = TranscriptionJobManager()
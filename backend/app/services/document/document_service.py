@@ -483,6 +483,9 @@ class DocumentService:
                     
                     if rag_result.get("success", False):
                         logger.info(f"✅ [DOC-SERVICE-DEBUG] 기존 RAG 파이프라인 성공")
+                        # 문서 대표 벡터(centroid/medoid) 갱신 - 파이프라인이 커밋한 청크 임베딩 기준, 실패해도 적재는 계속
+                        from app.services.search.document_vector_service import document_vector_service
+                        await document_vector_service.refresh_document(int(getattr(file_bss_info, 'file_bss_info_sno')))
                     else:
                         error_msg = rag_result.get('error', '알 수 없는 오류')
                         logger.error(f"❌ [DOC-SERVICE-DEBUG] 기존 RAG 파이프라인 실패: {error_msg}")
@@ -665,6 +668,14 @@ class DocumentService:
                 )
             
             logger.info(f"문서 삭제 완료 - ID: {document_id}, 사용자: {user_emp_no}")
+
+            # 6. 이 문서를 인용한 RAG 답변 캐시 무효화
+            from app.services.chat.answer_cache_service import answer_cache_service
+            await answer_cache_service.invalidate_documents([document_id])
+
+            # 7. 문서 대표 벡터 제거 (연관 문서 추천 대상에서 제외)
+            from app.services.search.document_vector_service import document_vector_service
+            await document_vector_service.remove_documents([document_id])
             
             # 🔢 컨테이너의 document_count 업데이트
             if container_id:
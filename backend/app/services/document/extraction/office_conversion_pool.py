@@ -0,0 +1,275 @@
+"""
+Office 문서 변환 워커 풀
+LibreOffice headless 변환을 공유 워커 풀에서 수행
+
+- 워커별 전용 LibreOffice 사용자 프로필(-env:UserInstallation): 프로필 잠금 충돌이 없으므로
+  다른 사용자의 변환을 pkill 로 끊지 않고 병렬 변환 가능, 프로필 초기화 비용은 워커당 1회
+- 작업 큐: 고정 크기 스레드 풀 (이벤트 루프를 막지 않음, 동시 변환 수 = 워커 수)
+- single-flight: 같은 내용/포맷의 변환 요청은 진행 중인 작업 1개를 공유
+- 결과 캐시: 원본 내용 해시 기준 파일 캐시, 총 용량 초과 시 가장 오래 사용되지 않은 항목부터 제거
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from loguru import logger
+
+from app.core.config import settings
+
+PathLike = Union[str, Path]
+
+# PowerPoint 고품질 PDF 내보내기 옵션 (폰트 임베딩, 600DPI)
+IMPRESS_PDF_FILTER = (
+    "pdf:impress_pdf_Export:SelectPdfVersion=1;UseTaggedPDF=true;ExportFormFields=true;FormsType=0;"
+    "ExportBookmarks=true;ExportHiddenSlides=false;SinglePageSheets=false;ExportNotes=false;"
+    "ExportNotesPages=false;EmbedStandardFonts=true;UseTransitionEffects=false;IsSkipEmptyPages=true;"
+    "IsAddStream=false;ExportPlaceholders=false;IsCollectPresentationModes=false;Quality=100;"
+    "ReduceImageResolution=false;MaxImageResolution=600"
+)
+# Word/Excel 등 PDF 내보내기 옵션 (폰트 임베딩)
+WRITER_PDF_FILTER = "pdf:writer_pdf_Export:EmbedStandardFonts=true;ExportFormFields=true;UseTaggedPDF=true"
+
+
+class OfficeConversionError(Exception):
+    """LibreOffice 변환 실패"""
+
+
+def pdf_filter_for(extension: str) -> str:
+    """원본 확장자에 맞는 PDF 변환 필터 반환"""
+    if extension.lower() in ('.ppt', '.pptx', '.odp'):
+        return IMPRESS_PDF_FILTER
+    return WRITER_PDF_FILTER
+
+
+def find_soffice() -> Optional[str]:
+    """LibreOffice 실행 파일 경로 찾기 (없으면 None)"""
+    found = shutil.which('soffice') or shutil.which('libreoffice')
+    if found:
+        return found
+    for path in ('/usr/bin/soffice', '/usr/bin/libreoffice',
+                 '/opt/libreoffice/program/soffice', '/usr/local/bin/soffice'):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+@dataclass
+class _WorkerSlot:
+    """변환 워커 1개 (전용 LibreOffice 프로필)"""
+    index: int
+    profile_dir: Path
+
+    @property
+    def profile_uri(self) -> str:
+        return self.profile_dir.resolve().as_uri()
+
+
+class OfficeConversionPool:
+    """LibreOffice 변환 워커 풀 + 내용 해시 기반 결과 캐시"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        workers: Optional[int] = None,
+        max_cache_bytes: Optional[int] = None,
+        timeout_seconds: Optional[int] = None,
+        soffice_path: Optional[str] = None,
+    ):
+        self.cache_dir = cache_dir
+        self.workers = max(1, int(workers or settings.office_conversion_workers))
+        self.max_cache_bytes = int(
+            max_cache_bytes if max_cache_bytes is not None
+            else settings.office_conversion_cache_max_mb * 1024 * 1024
+        )
+        self.timeout_seconds = int(timeout_seconds or settings.office_conversion_timeout_seconds)
+        self._soffice_path = soffice_path
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: "queue.Queue[_WorkerSlot]" = queue.Queue()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()
+
+    # ---------------------------
+    # 공개 API
+    # ---------------------------
+    @property
+    def soffice_path(self) -> Optional[str]:
+        if self._soffice_path is None:
+            self._soffice_path = find_soffice()
+        return self._soffice_path
+
+    @property
+    def is_available(self) -> bool:
+        return self.soffice_path is not None
+
+    def convert(self, source: PathLike, target_format: str = 'pdf', convert_filter: Optional[str] = None) -> Path:
+        """동기 변환 (동기 호출 경로용). 캐시된 결과 경로 반환, 실패 시 OfficeConversionError"""
+        return self.submit(source, target_format, convert_filter).result()
+
+    async def aconvert(self, source: PathLike, target_format: str = 'pdf', convert_filter: Optional[str] = None) -> Path:
+        """비동기 변환 (이벤트 루프를 막지 않음)"""
+        future = await asyncio.to_thread(self.submit, source, target_format, convert_filter)
+        return await asyncio.wrap_future(future)
+
+    def submit(self, source: PathLike, target_format: str = 'pdf', convert_filter: Optional[str] = None) -> Future:
+        """변환 작업 등록. 캐시 적중 시 완료된 Future, 동일 작업 진행 중이면 그 Future 반환"""
+        source_path = Path(source)
+        if not source_path.exists():
+            raise OfficeConversionError(f"원본 파일 없음: {source_path}")
+
+        key, cached_path = self._cache_entry(source_path, target_format, convert_filter)
+        if cached_path.exists():
+            self._touch(cached_path)
+            done: Future = Future()
+            done.set_result(cached_path)
+            return done
+
+        with self._lock:
+            running = self._inflight.get(key)
+            if running is not None:
+                logger.debug(f"변환 작업 합류 (single-flight): {source_path.name}")
+                return running
+            # 잠금 밖 확인 이후 직전 작업이 끝났을 수 있다 (결과 파일은 작업 완료 전에 기록됨)
+            if cached_path.exists():
+                self._touch(cached_path)
+                done = Future()
+                done.set_result(cached_path)
+                return done
+            if not self.is_available:
+                raise OfficeConversionError("PDF 변환 도구(soffice/libreoffice)가 설치되어 있지 않습니다")
+            future = self._get_executor().submit(
+                self._run_job, source_path, target_format, convert_filter, cached_path
+            )
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f, k=key: self._forget(k))
+        return future
+
+    def cached_path(self, source: PathLike, target_format: str = 'pdf', convert_filter: Optional[str] = None) -> Optional[Path]:
+        """이미 변환된 결과가 있으면 경로 반환 (변환은 하지 않음)"""
+        _, path = self._cache_entry(Path(source), target_format, convert_filter)
+        return path if path.exists() else None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    # ---------------------------
+    # 내부
+    # ---------------------------
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            profiles_root = self.cache_dir / '.profiles'
+            for i in range(self.workers):
+                profile_dir = profiles_root / f"worker_{i}"
+                profile_dir.mkdir(parents=True, exist_ok=True)
+                self._slots.put(_WorkerSlot(index=i, profile_dir=profile_dir))
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='office-convert')
+            logger.info(f"📄 Office 변환 워커 풀 시작: {self.workers}개 워커 ({self.soffice_path})")
+        return self._executor
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _cache_entry(self, source_path: Path, target_format: str, convert_filter: Optional[str]) -> Tuple[str, Path]:
+        digest = hashlib.sha256()
+        with open(source_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        variant = hashlib.sha1((convert_filter or target_format).encode('utf-8')).hexdigest()[:8]
+        key = f"{digest.hexdigest()[:32]}_{variant}"
+        return key, self.cache_dir / f"{key}.{target_format}"
+
+    def _run_job(self, source_path: Path, target_format: str, convert_filter: Optional[str], cached_path: Path) -> Path:
+        slot = self._slots.get()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # 작업 디렉토리를 캐시 디렉토리 안에 두어 결과를 원자적으로 이동
+            with tempfile.TemporaryDirectory(prefix='.work_', dir=self.cache_dir) as work_dir:
+                cmd = [
+                    self.soffice_path,
+                    f"-env:UserInstallation={slot.profile_uri}",
+                    '--headless', '--invisible', '--nodefault', '--nolockcheck',
+                    '--nologo', '--norestore',
+                    '--convert-to', convert_filter or target_format,
+                    '--outdir', work_dir,
+                    str(source_path),
+                ]
+                env = os.environ.copy()
+                # 한국어 로케일 (한글 폰트 렌더링)
+                env.update({'LC_ALL': 'ko_KR.UTF-8', 'LANG': 'ko_KR.UTF-8', 'LC_CTYPE': 'ko_KR.UTF-8'})
+
+                logger.info(f"📄 [worker {slot.index}] 변환 시작: {source_path.name} → {target_format}")
+                try:
+                    result = subprocess.run(
+                        cmd, capture_output=True, text=True, timeout=self.timeout_seconds, env=env
+                    )
+                except subprocess.TimeoutExpired as e:
+                    raise OfficeConversionError(f"변환 시간 초과 ({self.timeout_seconds}s): {source_path.name}") from e
+                if result.returncode != 0:
+                    raise OfficeConversionError(f"LibreOffice 변환 실패 (코드 {result.returncode}): {result.stderr.strip()}")
+
+                produced = Path(work_dir) / f"{source_path.stem}.{target_format}"
+                if not produced.exists():
+                    candidates = sorted(Path(work_dir).glob(f"*.{target_format}"))
+                    if not candidates:
+                        raise OfficeConversionError(f"변환 결과 파일 없음: {source_path.name}")
+                    produced = candidates[0]
+                os.replace(produced, cached_path)
+
+            logger.info(f"✅ [worker {slot.index}] 변환 완료: {cached_path.name}")
+        finally:
+            self._slots.put(slot)
+
+        self._evict()
+        return cached_path
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """캐시 총 용량이 상한을 넘으면 가장 오래 사용되지 않은 결과부터 제거"""
+        try:
+            entries = []
+            total = 0
+            for path in self.cache_dir.iterdir():
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total <= self.max_cache_bytes:
+                return
+            entries.sort(key=lambda e: e[0])
+            for _, size, path in entries:
+                if total <= self.max_cache_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    continue
+            logger.info(f"🧹 변환 캐시 정리: {total / (1024 * 1024):.1f}MB 유지")
+        except Exception as e:
+            logger.warning(f"변환 캐시 정리 실패: {e}")
+
+
+# 전역 인스턴스
+office_conversion_pool = OfficeConversionPool(
+    Path(__file__).parents[4] / 'uploads' / 'pdf_cache' / 'converted'
+)
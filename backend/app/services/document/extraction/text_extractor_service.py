@@ -94,7 +94,7 @@ class TextExtractorService:
                         
                     elif storage_backend == 'azure_blob':
                         # Azure Blob에서 다운로드
-                        from app.services.core.azure_blob_service import get_azure_blob_service
+                        from app.services.core.object_storage import get_object_storage
                         
                         logger.info(f"📥 Azure Blob에서 파일 다운로드 시작: {file_path}")
                         
@@ -103,15 +103,8 @@ class TextExtractorService:
                         temp_fd, temp_file_path = tempfile.mkstemp(suffix=file_ext)
                         os.close(temp_fd)
                         
-                        # Blob에서 다운로드
-                        azure = get_azure_blob_service()
-                        blob_data = azure.download_blob_to_bytes(file_path, purpose='raw')
-                        if not blob_data:
-                            raise Exception(f"Azure Blob 다운로드 실패: {file_path}")
-                        
-                        # 임시 파일에 저장
-                        with open(temp_file_path, 'wb') as f:
-                            f.write(blob_data)
+                        # Blob에서 임시 파일로 바로 다운로드 (대용량은 병렬 Range)
+                        await get_object_storage('azure_blob').download_file(file_path, temp_file_path, purpose='raw')
                         
                         actual_file_path = temp_file_path
                         logger.info(f"✅ Azure Blob 다운로드 완료: {file_path} → {temp_file_path}")
@@ -45,17 +45,8 @@ from app.services.document.chunking.structure_aware_chunker import StructureAwar
 from app.services.document.extraction.adaptive_section_detector import AdaptiveSectionDetector
 from app.services.document.storage.search_index_store import SearchIndexStoreService
 
-# Azure Blob Storage 통합
-try:
-    from app.services.core.azure_blob_service import get_azure_blob_service
-except ImportError:
-    get_azure_blob_service = None
-
-# AWS S3 Storage (멀티모달 파이프라인에서 사용)
-try:
-    from app.services.core.aws_service import S3Service
-except ImportError:  # pragma: no cover
-    S3Service = None  # type: ignore
+# Blob Storage (Azure Blob / S3) - 비동기 오브젝트 스토리지 (이벤트 루프 비차단)
+from app.services.core.object_storage import get_object_storage
 
 # 이미지 특징 추출 서비스
 try:
@@ -75,7 +66,6 @@ class MultimodalDocumentService:
         self.search_index_service = SearchIndexStoreService()
         # 인스턴스 주입이 없으면 기본 전역 서비스를 사용
         self.image_embedding_service = image_embedding_service or default_image_embedding_service
-        self._s3_service: Optional['S3Service'] = None
         # 적응형 섹션 감지 서비스 (모든 헤더 감지 + 의미 매핑)
         self.section_detector = AdaptiveSectionDetector()
     
@@ -814,15 +804,7 @@ class MultimodalDocumentService:
                     _start_stage("blob_intermediate_save")
                     performed_blob_intermediate = True
                     
-                    if settings.storage_backend == 'azure_blob':
-                        azure_factory = get_azure_blob_service if callable(get_azure_blob_service) else None
-                        if not azure_factory:
-                            raise RuntimeError("Azure Blob service factory not available")
-                        storage = azure_factory()
-                    else:  # s3
-                        storage = self._get_s3_service()
-                        if not storage:
-                            raise RuntimeError("S3 service not available")
+                    storage = get_object_storage(settings.storage_backend)
                     
                     # 전체 추출 텍스트 저장 (intermediate 컨테이너)
                     full_text_key = f"multimodal/{file_bss_info_sno}/extraction_full_text.txt"
@@ -831,10 +813,11 @@ class MultimodalDocumentService:
                     if not full_text_content.strip():
                         full_text_content = _assemble_full_text(extracted_objects)
                     if full_text_content.strip():
-                        storage.upload_bytes(
-                            full_text_content.encode('utf-8'), 
-                            full_text_key, 
-                            purpose='intermediate'
+                        await storage.put_bytes(
+                            full_text_key,
+                            full_text_content.encode('utf-8'),
+                            purpose='intermediate',
+                            content_type='text/plain; charset=utf-8',
                         )
                         logger.info(f"[MULTIMODAL-BLOB] 전체 텍스트 저장: {full_text_key} (len={len(full_text_content)})")
                     else:
@@ -844,10 +827,11 @@ class MultimodalDocumentService:
                     markdown_content = extraction_result.get("markdown", "") or metadata.get("markdown", "")
                     if markdown_content and markdown_content.strip():
                         markdown_key = f"multimodal/{file_bss_info_sno}/extraction_full_text.md"
-                        storage.upload_bytes(
-                            markdown_content.encode('utf-8'),
+                        await storage.put_bytes(
                             markdown_key,
-                            purpose='intermediate'
+                            markdown_content.encode('utf-8'),
+                            purpose='intermediate',
+                            content_type='text/markdown; charset=utf-8',
                         )
                         logger.info(f"[MULTIMODAL-BLOB] Markdown 저장: {markdown_key} (len={len(markdown_content)})")
                     
@@ -867,10 +851,11 @@ class MultimodalDocumentService:
                         "has_full_text": bool(full_text_content.strip()),
                         "timestamp": datetime.now().isoformat()
                     }
-                    storage.upload_bytes(
-                        json.dumps(metadata_content, ensure_ascii=False).encode('utf-8'),
+                    await storage.put_bytes(
                         metadata_key,
-                        purpose='intermediate'
+                        json.dumps(metadata_content, ensure_ascii=False).encode('utf-8'),
+                        purpose='intermediate',
+                        content_type='application/json',
                     )
                     logger.info(f"[MULTIMODAL-BLOB] 메타데이터 저장: {metadata_key}")
                     
@@ -905,10 +890,11 @@ class MultimodalDocumentService:
                             blob_key = None
                             if getattr(obj, 'object_type', None) == 'TEXT_BLOCK' and (obj.content_text or '').strip():
                                 blob_key = f"multimodal/{file_bss_info_sno}/objects/text_block_{idx}_{obj.page_no or 0}.txt"
-                                storage.upload_bytes(
-                                    (obj.content_text or '').encode('utf-8'),
+                                await storage.put_bytes(
                                     blob_key,
-                                    purpose='intermediate'
+                                    (obj.content_text or '').encode('utf-8'),
+                                    purpose='intermediate',
+                                    content_type='text/plain; charset=utf-8',
                                 )
                             elif getattr(obj, 'object_type', None) in ['TABLE', 'IMAGE', 'FIGURE']:
                                 blob_key = f"multimodal/{file_bss_info_sno}/objects/{obj.object_type.lower()}_{idx}_{obj.page_no or 0}.json"
@@ -930,10 +916,11 @@ class MultimodalDocumentService:
                                     "bbox": obj.bbox
                                 }
                                 try:
-                                    storage.upload_bytes(
-                                        json.dumps(obj_content, ensure_ascii=False).encode('utf-8'),
+                                    await storage.put_bytes(
                                         blob_key,
-                                        purpose='intermediate'
+                                        json.dumps(obj_content, ensure_ascii=False).encode('utf-8'),
+                                        purpose='intermediate',
+                                        content_type='application/json',
                                     )
                                 except TypeError as te:
                                     # 디버깅용 로그: 어떤 필드 때문에 실패했는지 확인
@@ -941,10 +928,11 @@ class MultimodalDocumentService:
                                     # 강제 fallback: structure_json 제거 후 저장
                                     fallback_content = dict(obj_content)
                                     fallback_content.pop('structure_json', None)
-                                    storage.upload_bytes(
-                                        json.dumps(fallback_content, ensure_ascii=False).encode('utf-8'),
+                                    await storage.put_bytes(
                                         blob_key,
-                                        purpose='intermediate'
+                                        json.dumps(fallback_content, ensure_ascii=False).encode('utf-8'),
+                                        purpose='intermediate',
+                                        content_type='application/json',
                                     )
                                 # 이미지 또는 FIGURE인 경우 바이너리 저장 및 특징 추출
                                 if getattr(obj, 'object_type', None) in ['IMAGE', 'FIGURE']:
@@ -1257,7 +1245,7 @@ class MultimodalDocumentService:
                                             # object_id를 사용하여 일관된 blob 키 생성
                                             obj_id = getattr(obj, 'object_id', idx)
                                             img_blob_key = f"multimodal/{file_bss_info_sno}/objects/image_{obj_id}_{page_no_val}.png"
-                                            storage.upload_bytes(img_bytes, img_blob_key, purpose='intermediate')
+                                            await storage.put_bytes(img_blob_key, img_bytes, purpose='intermediate', content_type='image/png')
                                             image_ids_with_binary.add(obj_id)
                                             
                                             # B/C. Extract image features (pHash, dimensions)
@@ -1279,10 +1267,11 @@ class MultimodalDocumentService:
                                                     
                                                     # C. Save enhanced feature JSON
                                                     feature_key = f"multimodal/{file_bss_info_sno}/objects/image_{obj_id}_{page_no_val}_features.json"
-                                                    storage.upload_bytes(
-                                                        json.dumps(features, ensure_ascii=False, indent=2).encode('utf-8'),
+                                                    await storage.put_bytes(
                                                         feature_key,
-                                                        purpose='intermediate'
+                                                        json.dumps(features, ensure_ascii=False, indent=2).encode('utf-8'),
+                                                        purpose='intermediate',
+                                                        content_type='application/json',
                                                     )
                                                 except Exception as feat_err:
                                                     logger.debug(f"[MULTIMODAL-BLOB] 이미지 특징 추출 실패 obj_id={obj_id}: {feat_err}")
@@ -1337,10 +1326,11 @@ class MultimodalDocumentService:
                     
                     # 객체 매니페스트 저장
                     manifest_key = f"multimodal/{file_bss_info_sno}/objects_manifest.json"
-                    storage.upload_bytes(
-                        json.dumps(objects_manifest, ensure_ascii=False, indent=2).encode('utf-8'),
+                    await storage.put_bytes(
                         manifest_key,
-                        purpose='intermediate'
+                        json.dumps(objects_manifest, ensure_ascii=False, indent=2).encode('utf-8'),
+                        purpose='intermediate',
+                        content_type='application/json',
                     )
                     logger.info(f"[MULTIMODAL-BLOB] objects_manifest 저장: {manifest_key} ({len(objects_manifest)} entries)")
                     
@@ -1664,22 +1654,20 @@ class MultimodalDocumentService:
                             "total_detected": len(section_chunking_meta["detected_sections"]),
                         }
 
-                        if settings.storage_backend == 'azure_blob' and get_azure_blob_service and file_bss_info_sno:
+                        if settings.storage_backend == 'azure_blob' and file_bss_info_sno:
                             try:
-                                azure_factory2 = get_azure_blob_service if callable(get_azure_blob_service) else None
-                                if not azure_factory2:
-                                    raise RuntimeError("Azure Blob service factory not available")
-                                azure_sections_service = azure_factory2()
+                                sections_storage = get_object_storage('azure_blob')
                                 sections_blob_path = f"multimodal/{file_bss_info_sno}/sections.json"
                                 sections_payload = {
                                     "sections": sections_info,
                                     "summary": section_summary,
                                     "detected_at": datetime.now().isoformat(),
                                 }
-                                azure_sections_service.upload_bytes(
-                                    json.dumps(sections_payload, ensure_ascii=False, indent=2).encode("utf-8"),
+                                await sections_storage.put_bytes(
                                     sections_blob_path,
-                                    purpose='intermediate'
+                                    json.dumps(sections_payload, ensure_ascii=False, indent=2).encode("utf-8"),
+                                    purpose='intermediate',
+                                    content_type='application/json',
                                 )
                                 section_chunking_meta["stored_to_blob"] = True
                                 logger.info(f"[SECTION-DETECT] 섹션 정보 저장: {sections_blob_path}")
@@ -2038,15 +2026,7 @@ class MultimodalDocumentService:
                     _start_stage("blob_derived_save")
                     performed_blob_derived = True
                     
-                    if settings.storage_backend == 'azure_blob':
-                        azure_factory3 = get_azure_blob_service if callable(get_azure_blob_service) else None
-                        if not azure_factory3:
-                            raise RuntimeError("Azure Blob service factory not available")
-                        storage = azure_factory3()
-                    else:  # s3
-                        storage = self._get_s3_service()
-                        if not storage:
-                            raise RuntimeError("S3 service not available")
+                    storage = get_object_storage(settings.storage_backend)
                     
                     # 청킹 메타데이터 저장
                     chunk_metadata_key = f"multimodal/{file_bss_info_sno}/chunking_metadata.json"
@@ -2062,10 +2042,11 @@ class MultimodalDocumentService:
                         },
                         "timestamp": datetime.now().isoformat()
                     }
-                    storage.upload_bytes(
-                        json.dumps(chunk_metadata, ensure_ascii=False).encode('utf-8'),
+                    await storage.put_bytes(
                         chunk_metadata_key,
-                        purpose='derived'
+                        json.dumps(chunk_metadata, ensure_ascii=False).encode('utf-8'),
+                        purpose='derived',
+                        content_type='application/json',
                     )
                     
                     # 개별 청크 저장
@@ -2081,10 +2062,11 @@ class MultimodalDocumentService:
                             "modality": chunk_modality,
                             "source_object_ids": getattr(chunk, 'source_object_ids', [])
                         }
-                        storage.upload_bytes(
-                            json.dumps(chunk_content, ensure_ascii=False).encode('utf-8'),
+                        await storage.put_bytes(
                             chunk_key,
-                            purpose='derived'
+                            json.dumps(chunk_content, ensure_ascii=False).encode('utf-8'),
+                            purpose='derived',
+                            content_type='application/json',
                         )
                         chunk_manifest.append({
                             "chunk_index": idx,
@@ -2096,10 +2078,11 @@ class MultimodalDocumentService:
                     
                     # 청크 매니페스트 저장
                     manifest_key = f"multimodal/{file_bss_info_sno}/chunks_manifest.json"
-                    storage.upload_bytes(
-                        json.dumps(chunk_manifest, ensure_ascii=False).encode('utf-8'),
+                    await storage.put_bytes(
                         manifest_key,
-                        purpose='derived'
+                        json.dumps(chunk_manifest, ensure_ascii=False).encode('utf-8'),
+                        purpose='derived',
+                        content_type='application/json',
                     )
                     
                     logger.info(f"[MULTIMODAL-BLOB] {len(doc_chunks)}개 청크 및 매니페스트 저장 완료")
@@ -2201,18 +2184,10 @@ class MultimodalDocumentService:
                                     img_bytes: Optional[bytes] = None
 
                                     try:
-                                        if settings.storage_backend == 'azure_blob':
-                                            azure_factory4 = get_azure_blob_service if callable(get_azure_blob_service) else None
-                                            if not azure_factory4:
-                                                raise RuntimeError("Azure Blob service factory not available")
-                                            azure = azure_factory4()
-                                            img_bytes = azure.download_blob_to_bytes(img_blob_key, purpose='intermediate')
-                                        elif settings.storage_backend == 's3':
-                                            s3_service = self._get_s3_service()
-                                            if s3_service:
-                                                img_bytes = s3_service.download_bytes(img_blob_key, purpose='intermediate')
-                                            else:
-                                                logger.warning("[MULTIMODAL][IMAGE-EMB] S3Service unavailable for image download")
+                                        if settings.storage_backend in ['azure_blob', 's3']:
+                                            img_bytes = await get_object_storage(settings.storage_backend).get_bytes(
+                                                img_blob_key, purpose='intermediate'
+                                            )
                                         else:
                                             logger.debug(f"[MULTIMODAL][IMAGE-EMB] Storage backend '{settings.storage_backend}' does not support blob downloads")
                                     except Exception as storage_err:
@@ -2419,7 +2394,11 @@ class MultimodalDocumentService:
                 
                 await session.flush()
                 logger.info(f"[MULTIMODAL][RAG] ✅ vs_doc_contents_chunks 임베딩 업데이트 완료 - {len(chunk_embeddings)}개")
-                
+
+                # 문서 대표 벡터(centroid/medoid) 갱신 - 같은 트랜잭션, 실패해도 적재는 계속
+                from app.services.search.document_vector_service import document_vector_service
+                await document_vector_service.refresh_document(file_bss_info_sno, session=session)
+
             except Exception as emb_err:
                 logger.error(f"[MULTIMODAL][RAG] ❌ vs_doc_contents_chunks 임베딩 업데이트 실패: {emb_err}")
                 # 실패해도 계속 진행
@@ -2433,15 +2412,7 @@ class MultimodalDocumentService:
                     _start_stage("blob_embedding_save")
                     performed_blob_embedding = True
                     
-                    if settings.storage_backend == 'azure_blob':
-                        azure_factory5 = get_azure_blob_service if callable(get_azure_blob_service) else None
-                        if not azure_factory5:
-                            raise RuntimeError("Azure Blob service factory not available")
-                        storage = azure_factory5()
-                    else:  # s3
-                        storage = self._get_s3_service()
-                        if not storage:
-                            raise RuntimeError("S3 service not available")
+                    storage = get_object_storage(settings.storage_backend)
                     
                     # 임베딩 메타데이터 저장
                     embedding_metadata_key = f"multimodal/{file_bss_info_sno}/embedding_metadata.json"
@@ -2452,10 +2423,11 @@ class MultimodalDocumentService:
                         "total_chunks": len(doc_chunks),
                         "timestamp": datetime.now().isoformat()
                     }
-                    storage.upload_bytes(
-                        json.dumps(embedding_metadata, ensure_ascii=False).encode('utf-8'),
+                    await storage.put_bytes(
                         embedding_metadata_key,
-                        purpose='derived'
+                        json.dumps(embedding_metadata, ensure_ascii=False).encode('utf-8'),
+                        purpose='derived',
+                        content_type='application/json',
                     )
                     
                     logger.info(f"[MULTIMODAL-BLOB] 임베딩 메타데이터 저장 완료 - {embed_success}/{len(doc_chunks)} 임베딩")
@@ -2670,18 +2642,6 @@ class MultimodalDocumentService:
                 except Exception as cleanup_err:
                     logger.warning(f"[MULTIMODAL] 임시 파일 삭제 실패: {cleanup_err}")
 
-    def _get_s3_service(self) -> Optional['S3Service']:
-        """지연 로딩 방식으로 S3Service 인스턴스를 반환"""
-        if S3Service is None:
-            return None
-        if self._s3_service is None:
-            try:
-                self._s3_service = S3Service()
-            except Exception as err:
-                logger.warning(f"[MULTIMODAL] S3Service 초기화 실패: {err}")
-                self._s3_service = None
-        return self._s3_service
-
     def _derive_core_content_page_set(
         self,
         sections: List[Dict[str, Any]],
@@ -21,10 +21,7 @@ import tiktoken
 
 from app.services.document.extraction.text_extractor_service import text_extractor_service
 from app.core.config import settings
-try:
-    from app.services.core.azure_blob_service import get_azure_blob_service
-except Exception:  # pragma: no cover
-    get_azure_blob_service = None  # type: ignore
+from app.services.core.object_storage import get_object_storage
 try:
     from app.utils.storage_paths import (
         build_intermediate_page_key,
@@ -203,15 +200,17 @@ class DocumentPreprocessingService:
 
             # Azure Blob intermediate 저장 (옵션)
             try:
-                if settings.storage_backend == 'azure_blob' and get_azure_blob_service and build_intermediate_page_key:
-                    azure = get_azure_blob_service()
+                if settings.storage_backend == 'azure_blob' and build_intermediate_page_key:
+                    storage = get_object_storage('azure_blob')
                     # file_bss_info_sno는 아직 모를 수 있으므로 0 placeholder (추후 dual-write 연결 후 교체 가능)
                     file_id_placeholder = result_payload['extraction_metadata'].get('file_id') or 0
                     
                     # 1. 전체 텍스트를 단일 파일로 저장
                     full_text_key = f"{container_id}/{file_id_placeholder}/full_text.txt"
                     full_text_bytes = result_payload['extracted_text'].encode('utf-8')
-                    azure.upload_bytes(full_text_bytes, full_text_key, purpose='intermediate')
+                    await storage.put_bytes(
+                        full_text_key, full_text_bytes, purpose='intermediate', content_type='text/plain; charset=utf-8'
+                    )
                     logger.info(f"[BLOB] 전체 텍스트 저장: {full_text_key} ({len(full_text_bytes)} bytes)")
                     
                     # 2. 페이지/슬라이드/시트 정보가 extraction_metadata 안에 구조화 되어 있다면 페이지별 저장
@@ -223,20 +222,29 @@ class DocumentPreprocessingService:
                     for page in pages:
                         pno = page.get('page_no') or page.get('page_number') or 0
                         key = build_intermediate_page_key(container_id, file_id_placeholder, int(pno))
-                        azure.upload_bytes(json.dumps(page, ensure_ascii=False).encode('utf-8'), key, purpose='intermediate')
+                        await storage.put_bytes(
+                            key, json.dumps(page, ensure_ascii=False).encode('utf-8'),
+                            purpose='intermediate', content_type='application/json',
+                        )
                     
                     # PPTX 슬라이드별 저장
                     for slide in slides:
                         sno = slide.get('slide_no') or 0
                         key = f"{container_id}/{file_id_placeholder}/slide_{sno}.json"
-                        azure.upload_bytes(json.dumps(slide, ensure_ascii=False).encode('utf-8'), key, purpose='intermediate')
+                        await storage.put_bytes(
+                            key, json.dumps(slide, ensure_ascii=False).encode('utf-8'),
+                            purpose='intermediate', content_type='application/json',
+                        )
                     
                     # XLSX 시트별 저장
                     for sheet in sheets:
                         sheet_no = sheet.get('sheet_no') or 0
                         sheet_name = sheet.get('sheet_name', f'sheet_{sheet_no}')
                         key = f"{container_id}/{file_id_placeholder}/sheet_{sheet_no}_{sheet_name}.json"
-                        azure.upload_bytes(json.dumps(sheet, ensure_ascii=False).encode('utf-8'), key, purpose='intermediate')
+                        await storage.put_bytes(
+                            key, json.dumps(sheet, ensure_ascii=False).encode('utf-8'),
+                            purpose='intermediate', content_type='application/json',
+                        )
                     
                     # 3. 요약 정보 저장
                     if build_intermediate_extraction_summary_key:
@@ -250,7 +258,10 @@ class DocumentPreprocessingService:
                             'total_chars': len(result_payload['extracted_text']),
                             'extraction_method': result_payload['extraction_metadata'].get('extraction_method', 'unknown')
                         }
-                        azure.upload_bytes(json.dumps(summary_doc, ensure_ascii=False).encode('utf-8'), summary_key, purpose='intermediate')
+                        await storage.put_bytes(
+                            summary_key, json.dumps(summary_doc, ensure_ascii=False).encode('utf-8'),
+                            purpose='intermediate', content_type='application/json',
+                        )
                     
                     logger.info(f"[BLOB] 중간 산출물 저장 완료 - 페이지:{len(pages)}, 슬라이드:{len(slides)}, 시트:{len(sheets)}")
             except Exception as e_blob:
@@ -14,6 +14,7 @@ from app.models import TbFileBssInfo, TbFileDtlInfo
 from app.core.config import settings
 from app.services.core.aws_service import S3Service
 from app.services.core.azure_blob_service import get_azure_blob_service, AzureBlobService
+from app.services.core.object_storage import get_object_storage
 
 logger = logging.getLogger(__name__)
 
@@ -69,7 +70,7 @@ class FileStorageService:
                     # raw 컨테이너: {container_id}/raw/{file_physical_name}
                     blob_path = f"{knowledge_container_id}/raw/{file_physical_name}"
                     try:
-                        self.azure_blob.upload_file(local_path=file_path, blob_path=blob_path, purpose='raw')
+                        await get_object_storage('azure_blob').upload_file(file_path, blob_path, purpose='raw')
                         # 원본 로컬 삭제 (옵션)
                         try:
                             if os.path.exists(file_path):
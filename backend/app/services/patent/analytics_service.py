@@ -0,0 +1,582 @@
+"""
+특허 로컬 통계 엔진
+
+수집되어 DB에 저장된 서지정보를 SQL 집계로 분석한다.
+- 수집 시: 출원인/IPC 하위 테이블 적재 + (관할권, IPC 서브클래스, 출원연도, 출원인) 건수 큐브 증분 갱신
+- 조회 시: 큐브 GROUPING SETS 집계 1회로 연도별 추이/IPC 분포/출원인 순위를 계산
+- 키워드 조건은 원본 테이블을 필터링해 큐브와 같은 규칙(주 IPC 서브클래스 1개 + 제1 출원인)의 행을 만든 뒤
+  큐브 경로와 같은 GROUPING SETS 집계를 적용 → 키워드 유무에 따라 같은 차원의 건수 기준이 달라지지 않는다
+- 큐브는 수집 시 증가만 하므로 서지정보 삭제(del_yn)/수정은 주기 재계산(rebuild_patent_stats_cube 작업)으로 반영
+- 로컬 보유 건수가 부족하면 None 을 반환 → 호출측(분석 도구)이 실시간 API 로 폴백
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import bindparam, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.patent import (
+    TbPatentApplicants,
+    TbPatentBibliographicInfo,
+    TbPatentIpcClassifications,
+    TbPatentStatsCube,
+)
+
+
+# =============================================================================
+# 수집 데이터 정규화 (KIPRIS 응답 → 출원인/IPC 행)
+# =============================================================================
+
+_IPC_SPLIT = re.compile(r"[|;,]")
+_APPLICANT_SPLIT = re.compile(r"[|;]")
+_IPC_VERSION = re.compile(r"\(.*?\)")
+_IPC_PATTERN = re.compile(r"^([A-H])(\d{2})([A-Z])?\s*(\d+)?(?:/(\d+))?")
+
+
+def split_ipc_numbers(raw: Optional[str]) -> List[str]:
+    """KIPRIS ipcNumber ("H01M 10/052(2010.01)|H01M 4/13") → 정규화된 IPC 코드 목록"""
+    if not raw:
+        return []
+    codes: List[str] = []
+    for part in _IPC_SPLIT.split(raw):
+        code = " ".join(_IPC_VERSION.sub("", part).split()).upper()
+        if code and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def split_applicants(raw: Optional[str]) -> List[str]:
+    """KIPRIS applicantName → 출원인 목록 (순서 유지, 중복 제거)"""
+    if not raw:
+        return []
+    names: List[str] = []
+    for part in _APPLICANT_SPLIT.split(raw):
+        name = " ".join(part.split())[:300]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def ipc_subclass(code: Optional[str]) -> str:
+    """IPC 코드 → 서브클래스 키 (예: "G06N 3/08" → "G06N", 해석 불가 시 "")"""
+    if not code:
+        return ""
+    match = _IPC_PATTERN.match(code.replace(" ", "").upper())
+    if not match:
+        return ""
+    return f"{match.group(1)}{match.group(2)}{match.group(3) or ''}"
+
+
+def build_dimension_rows(
+    patent_id: int,
+    patent_data: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """특허 1건의 출원인/IPC 하위 테이블 INSERT 파라미터"""
+    applicants = [
+        {"patent_id": patent_id, "applicant_name": name, "applicant_order": order}
+        for order, name in enumerate(split_applicants(patent_data.get("applicantName")), 1)
+    ]
+    ipcs: List[Dict[str, Any]] = []
+    for order, code in enumerate(split_ipc_numbers(patent_data.get("ipcNumber")), 1):
+        match = _IPC_PATTERN.match(code.replace(" ", ""))
+        ipcs.append({
+            "patent_id": patent_id,
+            "classification_type": "IPC",
+            "classification_code": code[:50],
+            "section": match.group(1) if match else None,
+            "class_code": match.group(2) if match else None,
+            "subclass": (match.group(3) or None) if match else None,
+            "main_group": (match.group(4) or None) if match else None,
+            "subgroup": (match.group(5) or None) if match else None,
+            "classification_order": order,
+            "is_main_classification": order == 1,
+        })
+    return applicants, ipcs
+
+
+def cube_key(
+    jurisdiction: Optional[str],
+    application_date: Optional[date],
+    applicants: Sequence[str],
+    ipc_codes: Sequence[str],
+) -> Tuple[str, str, int, str]:
+    """큐브 키: 주 IPC 서브클래스 + 제1 출원인 기준 (특허당 1행)"""
+    return (
+        (jurisdiction or "KR")[:10],
+        ipc_subclass(ipc_codes[0]) if ipc_codes else "",
+        application_date.year if application_date else 0,
+        applicants[0] if applicants else "",
+    )
+
+
+async def index_new_patents(
+    session: AsyncSession,
+    patents: Sequence[Tuple[TbPatentBibliographicInfo, Dict[str, Any]]],
+) -> None:
+    """
+    신규 서지정보의 출원인/IPC 행을 적재하고 통계 큐브를 증분 갱신한다.
+
+    서지정보가 flush 되어 patent_id 가 할당된 뒤, 같은 트랜잭션 안에서 호출한다.
+    큐브는 증가만 한다 - 서지정보 삭제(del_yn='Y')나 출원인/IPC/출원일 수정은 다음 재계산
+    (rebuild_stats_cube: 주기 작업 patent_stats_cube_rebuild_hours / 관리자 API) 전까지 반영되지 않는다.
+    """
+    if not patents:
+        return
+
+    applicant_rows: List[Dict[str, Any]] = []
+    ipc_rows: List[Dict[str, Any]] = []
+    deltas: Counter = Counter()
+    for biblio, patent_data in patents:
+        applicants, ipcs = build_dimension_rows(biblio.patent_id, patent_data)
+        applicant_rows.extend(applicants)
+        ipc_rows.extend(ipcs)
+        deltas[cube_key(
+            biblio.jurisdiction,
+            biblio.application_date,
+            [row["applicant_name"] for row in applicants],
+            [row["classification_code"] for row in ipcs],
+        )] += 1
+
+    if applicant_rows:
+        await session.execute(insert(TbPatentApplicants), applicant_rows)
+    if ipc_rows:
+        await session.execute(insert(TbPatentIpcClassifications), ipc_rows)
+
+    # 키 정렬 → 동시 수집 작업 간 행 잠금 순서 고정 (데드락 방지)
+    cube_rows = [
+        {
+            "jurisdiction": key[0],
+            "ipc_subclass": key[1],
+            "application_year": key[2],
+            "applicant_name": key[3],
+            "patent_count": count,
+        }
+        for key, count in sorted(deltas.items())
+    ]
+    stmt = pg_insert(TbPatentStatsCube).values(cube_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            TbPatentStatsCube.jurisdiction,
+            TbPatentStatsCube.ipc_subclass,
+            TbPatentStatsCube.application_year,
+            TbPatentStatsCube.applicant_name,
+        ],
+        set_={
+            "patent_count": TbPatentStatsCube.patent_count + stmt.excluded.patent_count,
+            "last_updated": func.now(),
+        },
+    )
+    await session.execute(stmt)
+
+
+# 서지정보 → 큐브 행 (cube_key 와 같은 규칙: 주 IPC 서브클래스 1개 + 제1 출원인, 특허당 1행)
+# 큐브 재계산과 키워드 경로가 같은 정의를 쓴다.
+CUBE_ROWS_SQL = """
+SELECT b.jurisdiction AS jurisdiction,
+       COALESCE(ipc.sub, '') AS ipc_subclass,
+       COALESCE(EXTRACT(YEAR FROM b.application_date)::int, 0) AS application_year,
+       COALESCE(app.applicant_name, '') AS applicant_name,
+       COUNT(*) AS patent_count
+FROM tb_patent_bibliographic_info b
+LEFT JOIN LATERAL (
+    SELECT LEFT(c.section || COALESCE(c.class_code, '') || COALESCE(c.subclass, ''), 4) AS sub
+    FROM tb_patent_ipc_classifications c
+    WHERE c.patent_id = b.patent_id
+    ORDER BY c.is_main_classification DESC, c.classification_order
+    LIMIT 1
+) ipc ON TRUE
+LEFT JOIN LATERAL (
+    SELECT a.applicant_name
+    FROM tb_patent_applicants a
+    WHERE a.patent_id = b.patent_id
+    ORDER BY a.applicant_order
+    LIMIT 1
+) app ON TRUE
+WHERE {where}
+GROUP BY 1, 2, 3, 4
+"""
+
+REBUILD_CUBE_SQL = (
+    "INSERT INTO tb_patent_stats_cube (jurisdiction, ipc_subclass, application_year, applicant_name, patent_count)"
+    + CUBE_ROWS_SQL.format(where="b.del_yn = 'N'")
+)
+
+# 연도별 추이 / IPC 클래스 분포 / 출원인 순위 (큐브 테이블 또는 키워드로 필터링한 큐브 행에 동일하게 적용)
+TREND_SQL = """
+SELECT CASE
+         WHEN GROUPING(application_year) = 0 THEN 'year'
+         WHEN GROUPING(LEFT(ipc_subclass, 3)) = 0 THEN 'ipc'
+         WHEN GROUPING(applicant_name) = 0 THEN 'applicant'
+         ELSE 'total'
+       END AS dim,
+       COALESCE(application_year::text, LEFT(ipc_subclass, 3), applicant_name, '') AS key,
+       SUM(patent_count) AS cnt
+FROM {source}
+WHERE {where}
+GROUP BY GROUPING SETS ((application_year), (LEFT(ipc_subclass, 3)), (applicant_name), ())
+"""
+
+
+async def rebuild_stats_cube(session: AsyncSession) -> None:
+    """큐브 전체 재계산 (삭제/수정된 서지정보 반영, 정합성 복구용)
+
+    EXCLUSIVE 잠금으로 재계산 중 수집 작업의 증분 갱신만 막는다 (조회는 이전 값으로 계속 가능).
+    """
+    await session.execute(text("LOCK TABLE tb_patent_stats_cube IN EXCLUSIVE MODE"))
+    await session.execute(text("DELETE FROM tb_patent_stats_cube"))
+    await session.execute(text(REBUILD_CUBE_SQL))
+
+
+# =============================================================================
+# 조회 모델
+# =============================================================================
+
+@dataclass
+class AnalyticsFilter:
+    """분석 조건 (날짜 조건은 큐브 경로에서 연도 단위로 적용)"""
+    keyword: Optional[str] = None
+    applicant: Optional[str] = None
+    ipc_code: Optional[str] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    jurisdictions: Sequence[str] = ("KR",)
+
+
+@dataclass
+class TrendSummary:
+    """트렌드 집계 결과"""
+    total: int
+    yearly: List[Tuple[int, int]] = field(default_factory=list)
+    ipc_classes: List[Tuple[str, int]] = field(default_factory=list)
+    applicants: List[Tuple[str, int]] = field(default_factory=list)
+    applicant_titles: Dict[str, List[str]] = field(default_factory=dict)
+    ipc_total: int = 0  # 상위 N 절단 전 합계 (점유율 분모)
+    applicant_total: int = 0
+    source: str = "cube"
+    elapsed_ms: float = 0.0
+
+
+@dataclass
+class ApplicantProfile:
+    """출원인 포트폴리오 집계 결과"""
+    applicant: str
+    total: int
+    yearly: List[Tuple[int, int]] = field(default_factory=list)
+    year_sections: Dict[int, Counter] = field(default_factory=dict)
+    section_counts: Counter = field(default_factory=Counter)
+    ipc_classes: List[Tuple[str, int]] = field(default_factory=list)
+    class_titles: Dict[str, List[str]] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+
+
+def _like_contains(value: str) -> str:
+    escaped = value.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _ipc_prefix(code: str) -> str:
+    return code.replace(" ", "").upper()[:4] + "%"
+
+
+def _year_of(value: Optional[str]) -> Optional[int]:
+    if value and len(value) >= 4 and value[:4].isdigit():
+        return int(value[:4])
+    return None
+
+
+def _date_of(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    digits = value.replace("-", "").replace(".", "")
+    try:
+        return date(int(digits[:4]), int(digits[4:6] or 1), int(digits[6:8] or 1))
+    except ValueError:
+        return None
+
+
+# =============================================================================
+# 분석 서비스
+# =============================================================================
+
+class PatentAnalyticsService:
+    """
+    로컬 특허 통계 서비스
+
+    구조화 조건(출원인/IPC/연도)은 통계 큐브만 읽고, 키워드 조건은 서지정보를
+    필터링해 만든 큐브 행에 같은 집계(TREND_SQL)를 적용한다.
+    보유 건수가 ``min_local_patents`` 미만이면 None 을 반환한다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        *,
+        min_local_patents: Optional[int] = None,
+        top_n: int = 10,
+    ):
+        self._session_factory = session_factory
+        self.min_local_patents = int(
+            min_local_patents if min_local_patents is not None else settings.patent_analytics_min_local_patents
+        )
+        self.top_n = top_n
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.patent_analytics_local_enabled)
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    # ---------------------------
+    # 조건 → WHERE 절
+    # ---------------------------
+    @staticmethod
+    def _cube_where(
+        f: AnalyticsFilter,
+        params: Dict[str, Any],
+    ) -> str:
+        clauses = ["jurisdiction IN :jurisdictions"]
+        params["jurisdictions"] = list(f.jurisdictions or ("KR",))
+        if f.applicant:
+            clauses.append("applicant_name ILIKE :applicant")
+            params["applicant"] = _like_contains(f.applicant)
+        if f.ipc_code:
+            clauses.append("ipc_subclass LIKE :ipc_prefix")
+            params["ipc_prefix"] = _ipc_prefix(f.ipc_code)
+        year_from, year_to = _year_of(f.date_from), _year_of(f.date_to)
+        if year_from:
+            clauses.append("application_year >= :year_from")
+            params["year_from"] = year_from
+        if year_to:
+            clauses.append("application_year <= :year_to")
+            params["year_to"] = year_to
+        return " AND ".join(clauses)
+
+    @staticmethod
+    def _biblio_where(f: AnalyticsFilter, params: Dict[str, Any]) -> str:
+        """키워드/출원일 조건 (출원인/IPC 조건은 만들어진 큐브 행에 _cube_where 로 적용)"""
+        clauses = ["b.del_yn = 'N'", "b.jurisdiction IN :jurisdictions"]
+        params["jurisdictions"] = list(f.jurisdictions or ("KR",))
+        if f.keyword:
+            clauses.append("(b.title ILIKE :keyword OR b.abstract ILIKE :keyword)")
+            params["keyword"] = _like_contains(f.keyword)
+        date_from, date_to = _date_of(f.date_from), _date_of(f.date_to)
+        if date_from:
+            clauses.append("b.application_date >= :date_from")
+            params["date_from"] = date_from
+        if date_to:
+            clauses.append("b.application_date <= :date_to")
+            params["date_to"] = date_to
+        return " AND ".join(clauses)
+
+    @staticmethod
+    def _expanding(sql: str, *names: str):
+        return text(sql).bindparams(*(bindparam(n, expanding=True) for n in names))
+
+    # ---------------------------
+    # 트렌드
+    # ---------------------------
+    async def trend_summary(self, f: AnalyticsFilter) -> Optional[TrendSummary]:
+        """연도별 추이/IPC 분포/출원인 순위. 로컬 커버리지 부족 시 None."""
+        started = time.perf_counter()
+        params: Dict[str, Any] = {}
+        if f.keyword:
+            # 키워드에 맞는 서지정보만으로 큐브와 같은 규칙의 행을 만들어 동일하게 집계
+            source = "sql"
+            table = f"({CUBE_ROWS_SQL.format(where=self._biblio_where(f, params))}) matched"
+        else:
+            source = "cube"
+            table = "tb_patent_stats_cube"
+        sql = TREND_SQL.format(source=table, where=self._cube_where(f, params))
+
+        async with self.session_factory() as session:
+            result = await session.execute(self._expanding(sql, "jurisdictions"), params)
+            summary = self._fold_trend_rows(result.all(), source)
+            if summary.total < max(1, self.min_local_patents):
+                logger.info(f"📉 [PatentAnalytics] 로컬 커버리지 부족 ({summary.total}건) → 실시간 API 폴백")
+                return None
+            if summary.applicants:
+                summary.applicant_titles = await self._recent_titles_by_applicant(
+                    session, [name for name, _ in summary.applicants], f
+                )
+
+        summary.elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"📊 [PatentAnalytics] trend source={source} total={summary.total} {summary.elapsed_ms:.0f}ms")
+        return summary
+
+    def _fold_trend_rows(self, rows: Sequence[Tuple[str, str, Any]], source: str) -> TrendSummary:
+        yearly: Dict[int, int] = {}
+        ipcs: List[Tuple[str, int]] = []
+        applicants: List[Tuple[str, int]] = []
+        total = 0
+        for dim, key, cnt in rows:
+            cnt = int(cnt or 0)
+            if dim == "total":
+                total = cnt
+            elif dim == "year" and key and key != "0":
+                yearly[int(key)] = cnt
+            elif dim == "ipc" and key:
+                ipcs.append((key, cnt))
+            elif dim == "applicant" and key:
+                applicants.append((key, cnt))
+        ipcs.sort(key=lambda x: (-x[1], x[0]))
+        applicants.sort(key=lambda x: (-x[1], x[0]))
+        return TrendSummary(
+            total=total,
+            yearly=sorted(yearly.items()),
+            ipc_classes=ipcs[: self.top_n],
+            applicants=applicants[: self.top_n],
+            ipc_total=sum(c for _, c in ipcs),
+            applicant_total=sum(c for _, c in applicants),
+            source=source,
+        )
+
+    async def _recent_titles_by_applicant(
+        self,
+        session: AsyncSession,
+        names: List[str],
+        f: AnalyticsFilter,
+        per_applicant: int = 3,
+    ) -> Dict[str, List[str]]:
+        params: Dict[str, Any] = {"names": names, "jurisdictions": list(f.jurisdictions or ("KR",)), "n": per_applicant}
+        sql = """
+            SELECT applicant_name, title FROM (
+                SELECT a.applicant_name, b.title,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY a.applicant_name
+                           ORDER BY b.application_date DESC NULLS LAST, b.patent_id DESC
+                       ) AS rn
+                FROM tb_patent_applicants a
+                JOIN tb_patent_bibliographic_info b ON b.patent_id = a.patent_id
+                WHERE a.applicant_order = 1
+                  AND a.applicant_name IN :names
+                  AND b.del_yn = 'N'
+                  AND b.jurisdiction IN :jurisdictions
+            ) t
+            WHERE rn <= :n
+        """
+        result = await session.execute(self._expanding(sql, "names", "jurisdictions"), params)
+        titles: Dict[str, List[str]] = defaultdict(list)
+        for name, title in result.all():
+            titles[name].append(title)
+        return dict(titles)
+
+    # ---------------------------
+    # 포트폴리오
+    # ---------------------------
+    async def applicant_profile(
+        self,
+        applicant: str,
+        *,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        jurisdictions: Sequence[str] = ("KR",),
+        with_examples: bool = True,
+    ) -> Optional[ApplicantProfile]:
+        """출원인의 연도×섹션 / IPC 클래스 분포. 로컬 커버리지 부족 시 None."""
+        started = time.perf_counter()
+        f = AnalyticsFilter(applicant=applicant, date_from=date_from, date_to=date_to, jurisdictions=jurisdictions)
+        params: Dict[str, Any] = {}
+        sql = f"""
+            SELECT CASE
+                     WHEN GROUPING(application_year) = 0 THEN 'year_section'
+                     WHEN GROUPING(LEFT(ipc_subclass, 3)) = 0 THEN 'ipc'
+                     ELSE 'total'
+                   END AS dim,
+                   application_year,
+                   COALESCE(LEFT(ipc_subclass, 1), LEFT(ipc_subclass, 3)) AS ipc_key,
+                   SUM(patent_count) AS cnt
+            FROM tb_patent_stats_cube
+            WHERE {self._cube_where(f, params)}
+            GROUP BY GROUPING SETS ((application_year, LEFT(ipc_subclass, 1)), (LEFT(ipc_subclass, 3)), ())
+        """
+        async with self.session_factory() as session:
+            result = await session.execute(self._expanding(sql, "jurisdictions"), params)
+            profile = self._fold_profile_rows(applicant, result.all())
+            if profile.total < max(1, self.min_local_patents):
+                return None
+            if with_examples and profile.ipc_classes:
+                profile.class_titles = await self._example_titles_by_class(
+                    session, [cls for cls, _ in profile.ipc_classes], f
+                )
+
+        profile.elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"📊 [PatentAnalytics] portfolio '{applicant}' total={profile.total} {profile.elapsed_ms:.0f}ms")
+        return profile
+
+    def _fold_profile_rows(self, applicant: str, rows: Sequence[Tuple[str, Any, Any, Any]]) -> ApplicantProfile:
+        profile = ApplicantProfile(applicant=applicant, total=0)
+        yearly: Counter = Counter()
+        classes: List[Tuple[str, int]] = []
+        for dim, year, key, cnt in rows:
+            cnt = int(cnt or 0)
+            if dim == "total":
+                profile.total = cnt
+            elif dim == "year_section":
+                if key:
+                    profile.section_counts[key] += cnt
+                if year:
+                    yearly[int(year)] += cnt
+                    if key:
+                        profile.year_sections.setdefault(int(year), Counter())[key] += cnt
+            elif dim == "ipc" and key:
+                classes.append((key, cnt))
+        classes.sort(key=lambda x: (-x[1], x[0]))
+        profile.yearly = sorted(yearly.items())
+        profile.ipc_classes = classes[:8]
+        return profile
+
+    async def _example_titles_by_class(
+        self,
+        session: AsyncSession,
+        classes: List[str],
+        f: AnalyticsFilter,
+        per_class: int = 3,
+    ) -> Dict[str, List[str]]:
+        params: Dict[str, Any] = {
+            "classes": classes,
+            "jurisdictions": list(f.jurisdictions or ("KR",)),
+            "applicant": _like_contains(f.applicant or ""),
+            "n": per_class,
+        }
+        sql = """
+            SELECT ipc_class, title FROM (
+                SELECT c.section || COALESCE(c.class_code, '') AS ipc_class, b.title,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY c.section || COALESCE(c.class_code, '')
+                           ORDER BY b.application_date DESC NULLS LAST, b.patent_id DESC
+                       ) AS rn
+                FROM tb_patent_applicants a
+                JOIN tb_patent_bibliographic_info b ON b.patent_id = a.patent_id
+                JOIN tb_patent_ipc_classifications c
+                  ON c.patent_id = a.patent_id AND c.is_main_classification
+                WHERE a.applicant_order = 1
+                  AND a.applicant_name ILIKE :applicant
+                  AND b.del_yn = 'N'
+                  AND b.jurisdiction IN :jurisdictions
+                  AND c.section || COALESCE(c.class_code, '') IN :classes
+            ) t
+            WHERE rn <= :n
+        """
+        result = await session.execute(self._expanding(sql, "classes", "jurisdictions"), params)
+        titles: Dict[str, List[str]] = defaultdict(list)
+        for ipc_class, title in result.all():
+            titles[ipc_class].append(title[:50])
+        return dict(titles)
+
+
+patent_analytics_service = PatentAnalyticsService()
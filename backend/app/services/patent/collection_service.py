@@ -5,7 +5,9 @@
 - 특허 데이터 저장 (서지정보 + 문서 레코드)
 """
 from __future__ import annotations
-from typing import List, Optional, Dict, Any
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, or_
@@ -22,10 +24,22 @@ from app.models.document.multimodal_models import DocEmbedding, DocChunk, DocChu
 # S3 및 임베딩 서비스
 from app.services.core.aws_service import S3Service
 from app.services.core.embedding_service import EmbeddingService
+# 특허 통계 큐브 (출원인/IPC 적재)
+from app.services.patent.analytics_service import index_new_patents
+from app.core.config import settings
 import os
 from pathlib import Path
 
 
+@dataclass
+class PatentSaveOutcome:
+    """대량 저장 결과 (특허 1건)"""
+    application_number: str
+    file_sno: Optional[int]
+    is_new: bool
+    file_extsn: str = "url"
+
+
 class PatentCollectionService:
     """특허 수집 서비스"""
 
@@ -353,6 +367,7 @@ class PatentCollectionService:
                 )
                 self.session.add(biblio)
                 await self.session.flush()
+                await index_new_patents(self.session, [(biblio, patent_data)])
             else:
                 # 기존 서지정보에 URL/컨테이너/수집자 정보가 비어있으면 보강
                 await self.session.execute(
@@ -395,12 +410,16 @@ class PatentCollectionService:
             
             # 3. 임베딩 생성 (제목 + 초록)
             if auto_generate_embeddings:
-                await self._generate_patent_embeddings(
+                vectors = await self._generate_patent_embeddings(
                     file_record.file_bss_info_sno,
                     patent_data,
                     container_id,
                     user_emp_no
                 )
+                patent_id = biblio.patent_id if not existing_biblio else existing_biblio.patent_id
+                vector = vectors.get(file_record.file_bss_info_sno)
+                if vector:
+                    await self._store_biblio_vectors({patent_id: vector})
             
             await self.session.commit()
             await self.session.refresh(file_record)
@@ -413,13 +432,212 @@ class PatentCollectionService:
             await self.session.rollback()
             return (None, False)
 
+    async def save_patents_bulk(
+        self,
+        patents: List[Dict[str, Any]],
+        container_id: str,
+        user_emp_no: str,
+        auto_generate_embeddings: bool = True,
+    ) -> List[PatentSaveOutcome]:
+        """
+        특허 배치 저장 (대량 수집용)
+        
+        save_patent_to_database와 동일한 결과를 배치 단위로 만든다:
+        1) 기존 문서/서지정보를 출원번호 IN 조회 1회씩으로 확인
+        2) 서지정보/문서 메타를 add_all + flush로 다건 INSERT
+        3) 제목+초록 임베딩을 배치 API로 생성
+        4) 배치당 commit 1회
+        
+        배치 처리 중 오류가 나면 롤백 후 건별 저장으로 폴백하여
+        한 건의 오류가 배치 전체를 잃게 하지 않는다.
+        
+        Returns:
+            출원번호별 저장 결과 (입력 순서, 출원번호 중복/누락 제거)
+        """
+        unique: Dict[str, Dict[str, Any]] = {}
+        for patent in patents:
+            app_no = patent.get("applicationNumber")
+            if not app_no:
+                logger.warning("⚠️ applicationNumber 누락으로 스킵")
+                continue
+            unique.setdefault(app_no, patent)
+        if not unique:
+            return []
+
+        try:
+            return await self._save_patents_bulk(unique, container_id, user_emp_no, auto_generate_embeddings)
+        except Exception as e:
+            logger.error(f"❌ 특허 배치 저장 실패 ({len(unique)}건) → 건별 저장으로 폴백: {e}")
+            await self.session.rollback()
+
+        outcomes: List[PatentSaveOutcome] = []
+        for app_no, patent in unique.items():
+            file_sno, is_new = await self.save_patent_to_database(
+                patent_data=patent,
+                container_id=container_id,
+                user_emp_no=user_emp_no,
+                auto_generate_embeddings=auto_generate_embeddings,
+            )
+            file_extsn = "url"
+            if file_sno and not is_new:
+                file_row = await self.session.get(TbFileBssInfo, int(file_sno))
+                file_extsn = (getattr(file_row, "file_extsn", "") or "").lower() if file_row else ""
+            outcomes.append(PatentSaveOutcome(app_no, file_sno, is_new, file_extsn))
+        return outcomes
+
+    async def _save_patents_bulk(
+        self,
+        unique: Dict[str, Dict[str, Any]],
+        container_id: str,
+        user_emp_no: str,
+        auto_generate_embeddings: bool,
+    ) -> List[PatentSaveOutcome]:
+        app_numbers = list(unique.keys())
+
+        # 1. 사용자 기준 전역 중복 체크 (.url / .pdf 모두) - 1 query
+        psl_names = [f"{n}.url" for n in app_numbers] + [f"{n}.pdf" for n in app_numbers]
+        existing_files_result = await self.session.execute(
+            select(
+                TbFileBssInfo.file_bss_info_sno,
+                TbFileBssInfo.file_psl_nm,
+                TbFileBssInfo.file_extsn,
+            ).where(
+                TbFileBssInfo.document_type == 'patent',
+                TbFileBssInfo.owner_emp_no == user_emp_no,
+                TbFileBssInfo.del_yn != 'Y',
+                TbFileBssInfo.file_psl_nm.in_(psl_names),
+            )
+        )
+        existing_files: Dict[str, Tuple[int, str]] = {}
+        for file_sno, psl_nm, extsn in existing_files_result.all():
+            app_no = psl_nm.rsplit(".", 1)[0]
+            existing_files.setdefault(app_no, (int(file_sno), (extsn or "").lower()))
+
+        pending = [n for n in app_numbers if n not in existing_files]
+
+        # 2. 서지정보 존재 여부 - 1 query
+        existing_biblios: Dict[str, TbPatentBibliographicInfo] = {}
+        if pending:
+            biblio_result = await self.session.execute(
+                select(TbPatentBibliographicInfo).where(
+                    TbPatentBibliographicInfo.application_number.in_(pending)
+                )
+            )
+            for biblio in biblio_result.scalars().all():
+                existing_biblios.setdefault(biblio.application_number, biblio)
+
+        new_biblios: List[TbPatentBibliographicInfo] = []
+        biblio_updates: List[Dict[str, Any]] = []
+        file_records: Dict[str, TbFileBssInfo] = {}
+        for app_no in pending:
+            patent_data = unique[app_no]
+            pub_no = str(patent_data.get('publicationNumber') or '').strip()
+            source_url = f"https://patents.google.com/?q=KR{pub_no or app_no}"
+
+            existing_biblio = existing_biblios.get(app_no)
+            if not existing_biblio:
+                new_biblios.append(TbPatentBibliographicInfo(
+                    application_number=app_no,
+                    publication_number=patent_data.get("publicationNumber"),
+                    title=patent_data.get("inventionTitle") or app_no,
+                    abstract=patent_data.get("abstract"),
+                    application_date=self._parse_date(patent_data.get("applicationDate")),
+                    publication_date=self._parse_date(patent_data.get("publicationDate")),
+                    registration_date=self._parse_date(patent_data.get("registrationDate")),
+                    jurisdiction=patent_data.get("country", "KR"),
+                    legal_status=patent_data.get("legalStatus", "APPLICATION"),
+                    data_source="KIPRIS",
+                    source_url=source_url,
+                    knowledge_container_id=container_id,
+                    imported_by=user_emp_no,
+                ))
+            elif not (
+                existing_biblio.knowledge_container_id
+                and existing_biblio.imported_by
+                and existing_biblio.source_url
+            ):
+                biblio_updates.append({
+                    "patent_id": existing_biblio.patent_id,
+                    "knowledge_container_id": existing_biblio.knowledge_container_id or container_id,
+                    "imported_by": existing_biblio.imported_by or user_emp_no,
+                    "source_url": existing_biblio.source_url or source_url,
+                })
+
+            title = (patent_data.get("inventionTitle") or "").strip() or app_no
+            file_records[app_no] = TbFileBssInfo(
+                drcy_sno=1,
+                file_lgc_nm=title,
+                file_psl_nm=f"{app_no}.url",
+                file_extsn="url",
+                path=source_url,
+                knowledge_container_id=container_id,
+                document_type="patent",
+                owner_emp_no=user_emp_no,
+                created_by=user_emp_no,
+                processing_status="completed",
+                processing_completed_at=datetime.utcnow(),
+                korean_metadata={
+                    "applicationNumber": app_no,
+                    "publicationNumber": pub_no or None,
+                    "data_source": "KIPRIS",
+                    "source_url": source_url,
+                },
+            )
+
+        # 3. 다건 INSERT/UPDATE (insertmanyvalues → 배치당 수 회 왕복)
+        if new_biblios:
+            self.session.add_all(new_biblios)
+        if biblio_updates:
+            await self.session.execute(update(TbPatentBibliographicInfo), biblio_updates)
+        if file_records:
+            self.session.add_all(list(file_records.values()))
+        await self.session.flush()
+
+        # 출원인/IPC 하위 테이블 + 통계 큐브 증분 갱신 (같은 트랜잭션)
+        if new_biblios:
+            await index_new_patents(
+                self.session,
+                [(biblio, unique[biblio.application_number]) for biblio in new_biblios],
+            )
+
+        # 4. 임베딩 (배치 API)
+        if auto_generate_embeddings and file_records:
+            vectors = await self._generate_patent_embeddings_bulk(
+                [(record.file_bss_info_sno, unique[app_no]) for app_no, record in file_records.items()],
+                container_id,
+            )
+            # 같은 벡터를 서지 embedding_vector 에도 저장 (로컬 유사도 검색 인덱스)
+            patent_ids = {b.application_number: b.patent_id for b in new_biblios}
+            patent_ids.update({app_no: b.patent_id for app_no, b in existing_biblios.items()})
+            await self._store_biblio_vectors({
+                patent_ids[app_no]: vectors[record.file_bss_info_sno]
+                for app_no, record in file_records.items()
+                if app_no in patent_ids and record.file_bss_info_sno in vectors
+            })
+
+        await self.session.commit()
+
+        outcomes: List[PatentSaveOutcome] = []
+        for app_no in app_numbers:
+            if app_no in existing_files:
+                file_sno, extsn = existing_files[app_no]
+                outcomes.append(PatentSaveOutcome(app_no, file_sno, False, extsn))
+            else:
+                outcomes.append(PatentSaveOutcome(app_no, int(file_records[app_no].file_bss_info_sno), True, "url"))
+
+        logger.info(
+            f"✅ 특허 배치 저장 완료: 신규={len(file_records)}, 기존={len(existing_files)} "
+            f"(서지 신규={len(new_biblios)}, 서지 보강={len(biblio_updates)})"
+        )
+        return outcomes
+
     async def _generate_patent_embeddings(
         self,
         file_sno: int,
         patent_data: Dict[str, Any],
         container_id: str,
         user_emp_no: str,
-    ) -> None:
+    ) -> Dict[int, List[float]]:
         """
         특허 서지정보(제목+초록)로부터 임베딩 생성 및 검색 인덱스 저장
         
@@ -429,124 +647,175 @@ class PatentCollectionService:
             container_id: 컨테이너 ID
             user_emp_no: 사용자 사번
         """
+        return await self._generate_patent_embeddings_bulk([(file_sno, patent_data)], container_id)
+
+    async def _generate_patent_embeddings_bulk(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]],
+        container_id: str,
+    ) -> Dict[int, List[float]]:
+        """
+        여러 특허의 임베딩/청크/검색 인덱스를 한 번에 생성
+        
+        임베딩은 get_embeddings_batch 한 번으로 요청하고, 세션 → 청크 → 임베딩
+        FK 체인은 단계별 add_all + flush로 저장한다 (특허 수와 무관하게 flush 3회).
+        
+        Args:
+            items: (file_sno, patent_data) 목록
+            container_id: 컨테이너 ID
+        
+        Returns:
+            file_sno → 임베딩 벡터 (서지 embedding_vector 저장용, 실패 시 빈 dict)
+        """
         try:
             # 1. 텍스트 결합 (제목 + 초록)
-            title = patent_data.get("inventionTitle", "")
-            abstract = patent_data.get("abstract", "")
-            
-            if not title and not abstract:
-                logger.warning(f"⚠️ 특허 {file_sno}: 제목과 초록이 모두 비어있어 임베딩 스킵")
-                return
-            
-            combined_text = f"{title}\n\n{abstract}".strip()
+            prepared: List[Tuple[int, str, str]] = []
+            for file_sno, patent_data in items:
+                title = patent_data.get("inventionTitle", "") or ""
+                abstract = patent_data.get("abstract", "") or ""
+                if not title and not abstract:
+                    logger.warning(f"⚠️ 특허 {file_sno}: 제목과 초록이 모두 비어있어 임베딩 스킵")
+                    continue
+                prepared.append((file_sno, title, f"{title}\n\n{abstract}".strip()))
+            if not prepared:
+                return {}
             
             # 2. 임베딩 생성 (EmbeddingService 기본 설정 사용)
             embedding_service = EmbeddingService()
             try:
                 embeddings = await embedding_service.get_embeddings_batch(
-                    texts=[combined_text]
+                    texts=[text for _, _, text in prepared],
+                    batch_size=settings.patent_ingest_embedding_batch_size,
                 )
-                embedding_vector = embeddings[0] if embeddings else None
             except Exception as e:
                 logger.error(f"❌ 임베딩 생성 실패: {e}")
-                embedding_vector = None
+                embeddings = []
             
-            if not embedding_vector:
-                logger.error(f"❌ 특허 {file_sno}: 임베딩 생성 실패")
-                return
+            # 배치 API는 실패 시 0-벡터를 돌려주므로 유효한 벡터만 저장
+            valid = [
+                (file_sno, title, text, vector)
+                for (file_sno, title, text), vector in zip(prepared, embeddings)
+                if vector and any(vector)
+            ]
+            if len(valid) < len(prepared):
+                logger.error(f"❌ 특허 임베딩 생성 실패: {len(prepared) - len(valid)}/{len(prepared)}건")
+            if not valid:
+                return {}
             
             # 3. 추출 세션 생성 (특허용 - 청크 세션 FK 충족)
             from datetime import datetime as dt
             from app.models.document.multimodal_models import DocExtractionSession
             
-            extraction_session = DocExtractionSession(
-                file_bss_info_sno=file_sno,
-                provider="kipris",  # 특허 데이터 제공자
-                model_profile="patent_bibliographic",
-                pipeline_type="patent",
-                started_at=dt.now(),
-                completed_at=dt.now(),
-                status="success",
-                page_count_detected=1,
-            )
-            self.session.add(extraction_session)
+            now = dt.now()
+            extraction_sessions = [
+                DocExtractionSession(
+                    file_bss_info_sno=file_sno,
+                    provider="kipris",  # 특허 데이터 제공자
+                    model_profile="patent_bibliographic",
+                    pipeline_type="patent",
+                    started_at=now,
+                    completed_at=now,
+                    status="success",
+                    page_count_detected=1,
+                )
+                for file_sno, _, _, _ in valid
+            ]
+            self.session.add_all(extraction_sessions)
             await self.session.flush()
             
             # 4. 청크 세션 생성 (문서 처리 파이프라인 호환)
-            chunk_session = DocChunkSession(
-                file_bss_info_sno=file_sno,
-                extraction_session_id=extraction_session.extraction_session_id,  # FK 연결
-                strategy_name="patent_bibliographic",
-                params_json={"source": "KIPRIS", "fields": ["title", "abstract"]},
-                started_at=dt.now(),
-                completed_at=dt.now(),
-                status="success",
-                chunk_count=1,
-            )
-            self.session.add(chunk_session)
+            chunk_sessions = [
+                DocChunkSession(
+                    file_bss_info_sno=file_sno,
+                    extraction_session_id=extraction_session.extraction_session_id,  # FK 연결
+                    strategy_name="patent_bibliographic",
+                    params_json={"source": "KIPRIS", "fields": ["title", "abstract"]},
+                    started_at=now,
+                    completed_at=now,
+                    status="success",
+                    chunk_count=1,
+                )
+                for (file_sno, _, _, _), extraction_session in zip(valid, extraction_sessions)
+            ]
+            self.session.add_all(chunk_sessions)
             await self.session.flush()
             
             # 5. 청크 생성
-            chunk = DocChunk(
-                chunk_session_id=chunk_session.chunk_session_id,
-                file_bss_info_sno=file_sno,
-                chunk_index=0,
-                source_object_ids=[],  # 특허는 객체 추출 없음
-                content_text=combined_text,
-                token_count=len(combined_text.split()),
-                modality="text",
-                section_heading=title,
-            )
-            self.session.add(chunk)
+            chunks = [
+                DocChunk(
+                    chunk_session_id=chunk_session.chunk_session_id,
+                    file_bss_info_sno=file_sno,
+                    chunk_index=0,
+                    source_object_ids=[],  # 특허는 객체 추출 없음
+                    content_text=text,
+                    token_count=len(text.split()),
+                    modality="text",
+                    section_heading=title,
+                )
+                for (file_sno, title, text, _), chunk_session in zip(valid, chunk_sessions)
+            ]
+            self.session.add_all(chunks)
             await self.session.flush()
             
-            # 6. 임베딩 저장 (DocEmbedding)
-            from app.core.config import settings
+            # 6. 임베딩 저장 (DocEmbedding) + 7. 검색 인덱스 저장 (TbDocumentSearchIndex)
             provider = getattr(settings, 'default_embedding_provider', 'bedrock')
-            dimension = len(embedding_vector)
-            
-            # 벤더별 컬럼 할당
-            embedding_data = {
-                "chunk_id": chunk.chunk_id,
-                "file_bss_info_sno": file_sno,
-                "provider": provider,
-                "model_name": "amazon.titan-embed-text-v2:0" if provider == "bedrock" else "text-embedding-3-small",
-                "modality": "text",
-                "dimension": dimension,
-            }
-            
-            if provider == "bedrock" and dimension == 1024:
-                embedding_data["aws_vector_1024"] = embedding_vector
-            elif provider == "azure_openai" and dimension == 1536:
-                embedding_data["azure_vector_1536"] = embedding_vector
-            else:
-                # 레거시 동적 벡터
-                embedding_data["vector"] = embedding_vector
-            
-            doc_embedding = DocEmbedding(**embedding_data)
-            self.session.add(doc_embedding)
-            
-            # 7. 검색 인덱스 저장 (TbDocumentSearchIndex)
-            search_index = TbDocumentSearchIndex(
-                file_bss_info_sno=file_sno,
-                knowledge_container_id=container_id,
-                document_title=title[:500] if title else "",  # 제목 (최대 500자)
-                full_content=combined_text,  # 전체 내용
-                content_summary=combined_text[:1000],  # 요약 (최대 1000자)
-                document_type="patent",  # 문서 유형
-                language_code="ko",
-                has_images=False,  # 특허 서지정보는 이미지 없음
-                has_tables=False,
-                indexing_status="indexed",
-                access_level="normal",
-            )
-            self.session.add(search_index)
+            model_name = "amazon.titan-embed-text-v2:0" if provider == "bedrock" else "text-embedding-3-small"
+            rows: List[Any] = []
+            for (file_sno, title, text, vector), chunk in zip(valid, chunks):
+                dimension = len(vector)
+                embedding_data = {
+                    "chunk_id": chunk.chunk_id,
+                    "file_bss_info_sno": file_sno,
+                    "provider": provider,
+                    "model_name": model_name,
+                    "modality": "text",
+                    "dimension": dimension,
+                }
+                # 벤더별 컬럼 할당
+                if provider == "bedrock" and dimension == 1024:
+                    embedding_data["aws_vector_1024"] = vector
+                elif provider == "azure_openai" and dimension == 1536:
+                    embedding_data["azure_vector_1536"] = vector
+                else:
+                    # 레거시 동적 벡터
+                    embedding_data["vector"] = vector
+                rows.append(DocEmbedding(**embedding_data))
+                rows.append(TbDocumentSearchIndex(
+                    file_bss_info_sno=file_sno,
+                    knowledge_container_id=container_id,
+                    document_title=title[:500] if title else "",  # 제목 (최대 500자)
+                    full_content=text,  # 전체 내용
+                    content_summary=text[:1000],  # 요약 (최대 1000자)
+                    document_type="patent",  # 문서 유형
+                    language_code="ko",
+                    has_images=False,  # 특허 서지정보는 이미지 없음
+                    has_tables=False,
+                    indexing_status="indexed",
+                    access_level="normal",
+                ))
+            self.session.add_all(rows)
             
-            logger.info(f"✅ 특허 임베딩 생성 완료: file_sno={file_sno}, dim={len(embedding_vector)}")
+            logger.info(f"✅ 특허 임베딩 생성 완료: {len(valid)}건")
+            return {file_sno: vector for file_sno, _, _, vector in valid}
             
         except Exception as e:
             logger.error(f"❌ 임베딩 생성 중 오류: {e}")
             # 임베딩 실패해도 특허 저장은 유지 (rollback 하지 않음)
+            return {}
+
+    async def _store_biblio_vectors(self, vectors: Dict[int, List[float]]) -> None:
+        """
+        서지 embedding_vector 저장 (patent_id → 벡터, 로컬 유사도 검색용)
+        
+        Vector(1536) 컬럼이므로 차원이 다른 임베딩 프로바이더 결과는 저장하지 않는다.
+        """
+        rows = [
+            {"patent_id": patent_id, "embedding_vector": vector}
+            for patent_id, vector in vectors.items()
+            if vector and len(vector) == 1536
+        ]
+        if rows:
+            await self.session.execute(update(TbPatentBibliographicInfo), rows)
 
     async def download_and_upload_patent_pdf(
         self,
@@ -572,47 +841,11 @@ class PatentCollectionService:
             성공 여부
         """
         try:
-            # 1. 로컬 경로 생성
-            upload_dir = Path("uploads/patents")
-            upload_dir.mkdir(parents=True, exist_ok=True)
-            local_path = upload_dir / f"{application_number}.pdf"
-            
-            # 2. KIPRIS에서 공개전문 PDF 다운로드 (새 API 사용)
-            success = await kipris_client.download_full_text_pdf(
-                application_number=application_number,
-                save_path=str(local_path)
-            )
-            
-            if not success or not local_path.exists():
-                logger.warning(f"⚠️ PDF 다운로드 실패 (공개 전문 없을 수 있음): {application_number}")
+            final_path = await self._fetch_patent_pdf(application_number, kipris_client, self._get_s3_service())
+            if not final_path:
                 return False
             
-            file_size = local_path.stat().st_size
-            logger.info(f"📥 PDF 다운로드 완료: {application_number} ({file_size/1024:.1f} KB)")
-            
-            # 3. S3 업로드 시도 (S3 설정이 없으면 로컬 경로 사용)
-            final_path = str(local_path)
-            try:
-                s3_service = S3Service()
-                s3_key = f"patents/{application_number}.pdf"
-                s3_url = await s3_service.upload_file(
-                    file_path=str(local_path),
-                    object_key=s3_key
-                )
-                if s3_url:
-                    final_path = s3_url
-                    # S3 업로드 성공 시 로컬 파일 삭제
-                    try:
-                        local_path.unlink()
-                    except Exception:
-                        pass
-                    logger.info(f"☁️ S3 업로드 완료: {application_number} → {s3_url}")
-            except Exception as s3_err:
-                logger.warning(f"⚠️ S3 업로드 실패 (로컬 파일 유지): {s3_err}")
-                # S3 실패 시 로컬 경로 사용
-                final_path = f"/uploads/patents/{application_number}.pdf"
-            
-            # 4. DB 업데이트 (PDF 경로, 확장자 변경)
+            # DB 업데이트 (PDF 경로, 확장자 변경)
             stmt = (
                 update(TbFileBssInfo)
                 .where(TbFileBssInfo.file_bss_info_sno == file_sno)
@@ -632,3 +865,123 @@ class PatentCollectionService:
         except Exception as e:
             logger.error(f"❌ PDF 다운로드/업로드 실패: {application_number}, {e}")
             return False
+
+    async def download_and_upload_patent_pdfs(
+        self,
+        targets: List[Tuple[str, int]],
+        kipris_client,
+        concurrency: Optional[int] = None,
+    ) -> Dict[str, bool]:
+        """
+        여러 특허의 공개전문 PDF를 제한된 동시성으로 다운로드/업로드 후 DB를 한 번에 갱신
+        
+        다운로드/업로드는 DB 세션을 쓰지 않으므로 병렬로 수행하고,
+        결과 경로는 PK 기준 bulk UPDATE 1회로 반영한다.
+        
+        Args:
+            targets: (출원번호, file_sno) 목록
+            kipris_client: KIPRIS API 클라이언트
+            concurrency: 동시 다운로드 수 (None이면 설정값)
+        
+        Returns:
+            출원번호 → 성공 여부
+        """
+        if not targets:
+            return {}
+
+        limit = max(1, concurrency or settings.patent_pdf_download_concurrency)
+        semaphore = asyncio.Semaphore(limit)
+        s3_service = self._get_s3_service()
+
+        async def _fetch(app_no: str, file_sno: int) -> Tuple[str, int, Optional[str]]:
+            async with semaphore:
+                return app_no, file_sno, await self._fetch_patent_pdf(app_no, kipris_client, s3_service)
+
+        logger.info(f"📥 PDF 병렬 다운로드 시작: {len(targets)}건 (동시성 {limit})")
+        results = await asyncio.gather(
+            *(_fetch(app_no, file_sno) for app_no, file_sno in targets),
+            return_exceptions=True,
+        )
+
+        outcome: Dict[str, bool] = {app_no: False for app_no, _ in targets}
+        rows: List[Dict[str, Any]] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ PDF 다운로드/업로드 실패: {result}")
+                continue
+            app_no, file_sno, final_path = result
+            if not final_path:
+                continue
+            rows.append({
+                "file_bss_info_sno": file_sno,
+                "file_psl_nm": f"{app_no}.pdf",
+                "file_extsn": "pdf",
+                "path": final_path,
+                "processing_status": "completed",
+            })
+            outcome[app_no] = True
+
+        if rows:
+            # ORM bulk UPDATE by primary key (executemany)
+            await self.session.execute(update(TbFileBssInfo), rows)
+            await self.session.commit()
+
+        logger.info(f"✅ PDF 병렬 처리 완료: 성공={len(rows)}, 실패={len(targets) - len(rows)}")
+        return outcome
+
+    @staticmethod
+    def _get_s3_service() -> Optional[S3Service]:
+        try:
+            return S3Service()
+        except Exception as e:
+            logger.warning(f"⚠️ S3 클라이언트 초기화 실패 (로컬 저장 사용): {e}")
+            return None
+
+    async def _fetch_patent_pdf(
+        self,
+        application_number: str,
+        kipris_client,
+        s3_service: Optional[S3Service],
+    ) -> Optional[str]:
+        """PDF 다운로드 + S3 업로드 (DB 미사용). 최종 경로 또는 None 반환"""
+        # 1. 로컬 경로 생성
+        upload_dir = Path("uploads/patents")
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        local_path = upload_dir / f"{application_number}.pdf"
+        
+        # 2. KIPRIS에서 공개전문 PDF 다운로드 (새 API 사용)
+        success = await kipris_client.download_full_text_pdf(
+            application_number=application_number,
+            save_path=str(local_path)
+        )
+        
+        if not success or not local_path.exists():
+            logger.warning(f"⚠️ PDF 다운로드 실패 (공개 전문 없을 수 있음): {application_number}")
+            return None
+        
+        file_size = local_path.stat().st_size
+        logger.info(f"📥 PDF 다운로드 완료: {application_number} ({file_size/1024:.1f} KB)")
+        
+        # 3. S3 업로드 시도 (S3 설정이 없으면 로컬 경로 사용)
+        # 경로 형식은 기존과 동일: 업로드 결과 없음 → 상대 경로, 클라이언트 초기화/업로드 예외 → /uploads 경로
+        final_path = str(local_path)
+        if s3_service is None:
+            return f"/uploads/patents/{application_number}.pdf"
+        try:
+            s3_key = f"patents/{application_number}.pdf"
+            s3_url = await s3_service.upload_file(
+                file_path=str(local_path),
+                object_key=s3_key
+            )
+            if s3_url:
+                final_path = s3_url
+                # S3 업로드 성공 시 로컬 파일 삭제
+                try:
+                    local_path.unlink()
+                except Exception:
+                    pass
+                logger.info(f"☁️ S3 업로드 완료: {application_number} → {s3_url}")
+        except Exception as s3_err:
+            logger.warning(f"⚠️ S3 업로드 실패 (로컬 파일 유지): {s3_err}")
+            final_path = f"/uploads/patents/{application_number}.pdf"
+        return final_path
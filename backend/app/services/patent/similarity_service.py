@@ -0,0 +1,458 @@
+"""
+특허 유사도 검색 엔진 (로컬 임베딩 ANN)
+
+수집 시 저장된 임베딩으로 유사 특허를 찾는다.
+- 문서 단위: tb_patent_bibliographic_info.embedding_vector (제목+초록, idx_patent_embedding_hnsw)
+- 청구항 단위: tb_patent_claim_embeddings (hnsw), 참조 청구항별 최근접 청구항을 특허 단위 max-sim 으로 집계
+- IPC 서브클래스 사전 필터
+- 여러 참조 특허를 한 번에: 임베딩 API 1회 + 참조당 인덱스 쿼리 1회
+"""
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.patent import TbPatentBibliographicInfo, TbPatentClaimEmbeddings
+from app.services.patent.analytics_service import ipc_subclass
+
+
+PATENT_VECTOR_DIM = 1536  # TbPatentBibliographicInfo / TbPatentClaimEmbeddings 벡터 차원
+
+
+# =============================================================================
+# 청구항 분리
+# =============================================================================
+
+_CLAIM_MARKER = re.compile(
+    r"(?:【\s*청구항\s*(\d+)\s*】|\[\s*청구항\s*(\d+)\s*\]|^\s*청구항\s*(\d+)\s*[.:)]?|^\s*(\d{1,3})\s*[.)]\s)",
+    re.MULTILINE,
+)
+_DEPENDENT_CLAIM = re.compile(r"제\s*\d+\s*항|청구항\s*\d+\s*에|claim\s+\d+", re.IGNORECASE)
+
+
+def split_claims(claims_text: Optional[str]) -> List[Tuple[int, str]]:
+    """청구항 전문 → [(청구항 번호, 본문)] (번호 표기가 없으면 전체를 1항으로 취급)"""
+    if not claims_text or not claims_text.strip():
+        return []
+    markers = list(_CLAIM_MARKER.finditer(claims_text))
+    if not markers:
+        return [(1, claims_text.strip())]
+
+    claims: List[Tuple[int, str]] = []
+    for i, m in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(claims_text)
+        body = claims_text[m.end():end].strip()
+        if body:
+            claim_no = int(next(g for g in m.groups() if g))
+            claims.append((claim_no, body))
+    return claims
+
+
+def is_dependent_claim(claim: str) -> bool:
+    return bool(_DEPENDENT_CLAIM.search(claim[:200]))
+
+
+def vector_literal(vector: Sequence[float]) -> str:
+    return "[" + ",".join(map(str, vector)) + "]"
+
+
+def _usable(vector: Optional[Sequence[float]]) -> bool:
+    return bool(vector) and len(vector) == PATENT_VECTOR_DIM and any(vector)
+
+
+# =============================================================================
+# 모델
+# =============================================================================
+
+@dataclass
+class SimilarityReference:
+    """참조 특허 (유사 특허를 찾을 기준)"""
+    title: str = ""
+    abstract: str = ""
+    claims: Sequence[str] = ()
+    ipc_codes: Sequence[str] = ()
+    exclude_application_number: Optional[str] = None
+
+    def document_text(self) -> str:
+        # 수집 시 임베딩 입력과 동일한 형식 (제목 + 초록)
+        return f"{self.title or ''}\n\n{self.abstract or ''}".strip()
+
+
+@dataclass
+class SimilarityHit:
+    """유사 특허 1건"""
+    patent_id: int
+    application_number: str
+    title: str
+    abstract: str = ""
+    applicant: str = ""
+    application_date: Optional[date] = None
+    jurisdiction: str = "KR"
+    ipc_codes: List[str] = field(default_factory=list)
+    document_similarity: Optional[float] = None
+    claim_similarity: Optional[float] = None
+    matched_claim_no: Optional[int] = None
+
+    @property
+    def score(self) -> float:
+        return max(self.document_similarity or 0.0, self.claim_similarity or 0.0)
+
+
+# =============================================================================
+# 서비스
+# =============================================================================
+
+class PatentSimilarityService:
+    """
+    저장된 서지/청구항 임베딩 기반 유사 특허 검색
+
+    참조 특허 1건당 SQL 1회: 문서 ANN 과 참조 청구항별 청구항 ANN 을 UNION ALL 로 묶고
+    특허 단위로 MAX 집계한 뒤 서지/출원인/IPC 를 붙여 반환한다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        embedder: Optional[Any] = None,
+    ):
+        self._session_factory = session_factory
+        self._embedder = embedder
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.patent_similarity_local_enabled)
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            from app.services.core.embedding_service import EmbeddingService
+
+            self._embedder = EmbeddingService()
+        return self._embedder
+
+    async def _embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """배치 임베딩 (실패/차원 불일치 벡터는 None)"""
+        if not texts:
+            return []
+        vectors = await self.embedder.get_embeddings_batch(
+            texts=texts,
+            batch_size=settings.patent_ingest_embedding_batch_size,
+        )
+        return [v if _usable(v) else None for v in vectors]
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    async def find_similar(
+        self,
+        reference: SimilarityReference,
+        *,
+        top_k: int = 20,
+        jurisdictions: Sequence[str] = ("KR",),
+        ipc_prefilter: bool = True,
+    ) -> List[SimilarityHit]:
+        return (await self.find_similar_batch(
+            [reference], top_k=top_k, jurisdictions=jurisdictions, ipc_prefilter=ipc_prefilter
+        ))[0]
+
+    async def find_similar_batch(
+        self,
+        references: Sequence[SimilarityReference],
+        *,
+        top_k: int = 20,
+        jurisdictions: Sequence[str] = ("KR",),
+        ipc_prefilter: bool = True,
+    ) -> List[List[SimilarityHit]]:
+        """
+        N건의 참조 특허에 대해 유사 특허를 찾는다 (선행기술 스크리닝용).
+
+        임베딩은 모든 참조의 문서/청구항 텍스트를 모아 배치 API 1회로 만들고,
+        DB 는 세션 1개에서 참조당 인덱스 쿼리 1회를 실행한다.
+        """
+        if not references:
+            return []
+        started = time.perf_counter()
+        max_claims = max(0, int(settings.patent_similarity_max_reference_claims))
+
+        texts: List[str] = []
+        slots: List[Tuple[Optional[int], List[int]]] = []
+        for ref in references:
+            doc_text = ref.document_text()
+            doc_slot = None
+            if doc_text:
+                doc_slot = len(texts)
+                texts.append(doc_text)
+            claim_slots = []
+            for claim in [c for c in ref.claims if c and c.strip()][:max_claims]:
+                claim_slots.append(len(texts))
+                texts.append(claim.strip())
+            slots.append((doc_slot, claim_slots))
+
+        vectors = await self._embed(texts)
+
+        results: List[List[SimilarityHit]] = []
+        async with self.session_factory() as session:
+            try:
+                for ref, (doc_slot, claim_slots) in zip(references, slots):
+                    doc_vec = vectors[doc_slot] if doc_slot is not None else None
+                    claim_vecs = [vectors[i] for i in claim_slots if vectors[i] is not None]
+                    if doc_vec is None and not claim_vecs:
+                        results.append([])
+                        continue
+                    ipc_prefixes = self._ipc_prefixes(ref.ipc_codes) if ipc_prefilter else []
+                    results.append(await self._query_reference(
+                        session, doc_vec, claim_vecs, ipc_prefixes, ref.exclude_application_number,
+                        top_k, jurisdictions,
+                    ))
+            finally:
+                await session.rollback()
+
+        logger.info(
+            f"🧭 [PatentSimilarity] refs={len(references)} hits={sum(len(r) for r in results)} "
+            f"{(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return results
+
+    @staticmethod
+    def _ipc_prefixes(ipc_codes: Sequence[str]) -> List[str]:
+        prefixes: List[str] = []
+        for code in ipc_codes or ():
+            sub = ipc_subclass(code)
+            if sub and sub not in prefixes:
+                prefixes.append(sub)
+        return prefixes[:5]
+
+    @staticmethod
+    def _reference_sql(has_doc: bool, n_claims: int, n_ipc: int, exclude: bool) -> str:
+        filters = ["b.del_yn = 'N'", "b.jurisdiction IN :jurisdictions"]
+        if n_ipc:
+            ipc_match = " OR ".join(
+                f"(c.section || COALESCE(c.class_code, '') || COALESCE(c.subclass, '')) LIKE :ipc_{i}"
+                for i in range(n_ipc)
+            )
+            filters.append(
+                "EXISTS (SELECT 1 FROM tb_patent_ipc_classifications c "
+                f"WHERE c.patent_id = b.patent_id AND ({ipc_match}))"
+            )
+        if exclude:
+            filters.append("b.application_number <> :exclude_app_no")
+        where = " AND ".join(filters)
+
+        branches: List[str] = []
+        if has_doc:
+            branches.append(f"""(
+                SELECT b.patent_id,
+                       1 - (b.embedding_vector <=> CAST(:doc_vec AS vector)) AS doc_sim,
+                       NULL::float8 AS claim_sim,
+                       NULL::int AS claim_no
+                FROM tb_patent_bibliographic_info b
+                WHERE b.embedding_vector IS NOT NULL AND {where}
+                ORDER BY b.embedding_vector <=> CAST(:doc_vec AS vector)
+                LIMIT :k
+            )""")
+        for i in range(n_claims):
+            branches.append(f"""(
+                SELECT ce.patent_id,
+                       NULL::float8,
+                       1 - (ce.embedding_vector <=> CAST(:claim_vec_{i} AS vector)),
+                       ce.claim_no
+                FROM tb_patent_claim_embeddings ce
+                JOIN tb_patent_bibliographic_info b ON b.patent_id = ce.patent_id
+                WHERE {where}
+                ORDER BY ce.embedding_vector <=> CAST(:claim_vec_{i} AS vector)
+                LIMIT :claim_k
+            )""")
+
+        return f"""
+            WITH hits AS (
+                {" UNION ALL ".join(branches)}
+            ),
+            merged AS (
+                SELECT patent_id,
+                       MAX(doc_sim) AS doc_sim,
+                       MAX(claim_sim) AS claim_sim,
+                       (ARRAY_AGG(claim_no ORDER BY claim_sim DESC NULLS LAST))[1] AS claim_no
+                FROM hits
+                GROUP BY patent_id
+            )
+            SELECT b.patent_id, b.application_number, b.title, b.abstract, b.application_date, b.jurisdiction,
+                   m.doc_sim, m.claim_sim, m.claim_no,
+                   (SELECT a.applicant_name FROM tb_patent_applicants a
+                     WHERE a.patent_id = b.patent_id ORDER BY a.applicant_order LIMIT 1) AS applicant,
+                   ARRAY(SELECT c2.classification_code FROM tb_patent_ipc_classifications c2
+                          WHERE c2.patent_id = b.patent_id ORDER BY c2.classification_order) AS ipc_codes
+            FROM merged m
+            JOIN tb_patent_bibliographic_info b ON b.patent_id = m.patent_id
+            WHERE {where}
+            ORDER BY GREATEST(COALESCE(m.doc_sim, 0), COALESCE(m.claim_sim, 0)) DESC
+            LIMIT :k
+        """
+
+    async def _query_reference(
+        self,
+        session: AsyncSession,
+        doc_vec: Optional[List[float]],
+        claim_vecs: List[List[float]],
+        ipc_prefixes: List[str],
+        exclude_application_number: Optional[str],
+        top_k: int,
+        jurisdictions: Sequence[str],
+    ) -> List[SimilarityHit]:
+        params: Dict[str, Any] = {
+            "jurisdictions": list(jurisdictions or ("KR",)),
+            "k": int(top_k),
+            "claim_k": int(top_k) * 3,
+        }
+        if doc_vec is not None:
+            params["doc_vec"] = vector_literal(doc_vec)
+        for i, vec in enumerate(claim_vecs):
+            params[f"claim_vec_{i}"] = vector_literal(vec)
+        for i, prefix in enumerate(ipc_prefixes):
+            params[f"ipc_{i}"] = f"{prefix}%"
+        if exclude_application_number:
+            params["exclude_app_no"] = exclude_application_number
+
+        sql = self._reference_sql(doc_vec is not None, len(claim_vecs), len(ipc_prefixes), bool(exclude_application_number))
+        # 삭제/관할/IPC/제외 필터는 서지·청구항 ANN 분기 안에 있다 - iterative scan(미지원 시 정확 검색 폴백)으로
+        # 필터 통과 행이 각 분기 LIMIT 를 채우게 한다 (탐색 설정은 세이브포인트 안에서만 적용)
+        from app.services.search.vector_index_manager import run_ann_query
+
+        rows = await run_ann_query(
+            session,
+            text(sql).bindparams(bindparam("jurisdictions", expanding=True)),
+            params,
+            ann_limit=params["claim_k"] if claim_vecs else params["k"],
+            limit=params["k"],
+            ef_search=int(settings.patent_similarity_hnsw_ef_search),
+        )
+        return [
+            SimilarityHit(
+                patent_id=row.patent_id,
+                application_number=row.application_number,
+                title=row.title,
+                abstract=row.abstract or "",
+                applicant=row.applicant or "",
+                application_date=row.application_date,
+                jurisdiction=row.jurisdiction,
+                ipc_codes=list(row.ipc_codes or []),
+                document_similarity=float(row.doc_sim) if row.doc_sim is not None else None,
+                claim_similarity=float(row.claim_sim) if row.claim_sim is not None else None,
+                matched_claim_no=row.claim_no,
+            )
+            for row in rows
+        ]
+
+    # ---------------------------
+    # 청구항 임베딩 적재
+    # ---------------------------
+    async def index_claims(
+        self,
+        session: AsyncSession,
+        patent_id: int,
+        claims: Sequence[Tuple[int, str]],
+    ) -> int:
+        """청구항 임베딩 저장 (같은 번호는 갱신). 호출측이 commit 한다."""
+        claims = [(no, body) for no, body in claims if body]
+        if not claims:
+            return 0
+        vectors = await self._embed([body for _, body in claims])
+        rows = [
+            {
+                "patent_id": patent_id,
+                "claim_no": no,
+                "is_independent": not is_dependent_claim(body),
+                "claim_text": body,
+                "embedding_vector": vec,
+            }
+            for (no, body), vec in zip(claims, vectors)
+            if vec is not None
+        ]
+        if not rows:
+            return 0
+        stmt = pg_insert(TbPatentClaimEmbeddings).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TbPatentClaimEmbeddings.patent_id, TbPatentClaimEmbeddings.claim_no],
+            set_={
+                "is_independent": stmt.excluded.is_independent,
+                "claim_text": stmt.excluded.claim_text,
+                "embedding_vector": stmt.excluded.embedding_vector,
+            },
+        )
+        await session.execute(stmt)
+        return len(rows)
+
+    async def backfill_claim_embeddings(self, limit: int = 100, after_patent_id: int = 0) -> int:
+        """청구항 전문이 있으나 청구항 임베딩이 없는 특허를 채운다 (배치 작업용)."""
+        indexed, _, _ = await self._backfill_claims_after(after_patent_id, limit)
+        return indexed
+
+    async def _backfill_claims_after(self, after_patent_id: int, limit: int) -> Tuple[int, int, int]:
+        """
+        patent_id 가 커서보다 큰 대상 특허를 순서대로 limit 건 적재한다.
+
+        Returns:
+            (적재한 청구항 수, 다음 커서 = 마지막으로 고른 patent_id, 고른 특허 수)
+        """
+        indexed = 0
+        cursor = after_patent_id
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(TbPatentBibliographicInfo.patent_id, TbPatentBibliographicInfo.claims_text)
+                .where(
+                    TbPatentBibliographicInfo.patent_id > after_patent_id,
+                    TbPatentBibliographicInfo.claims_text.isnot(None),
+                    func.length(func.trim(TbPatentBibliographicInfo.claims_text)) > 0,
+                    TbPatentBibliographicInfo.del_yn == 'N',
+                    ~select(TbPatentClaimEmbeddings.claim_embedding_id)
+                    .where(TbPatentClaimEmbeddings.patent_id == TbPatentBibliographicInfo.patent_id)
+                    .exists(),
+                )
+                .order_by(TbPatentBibliographicInfo.patent_id)
+                .limit(limit)
+            )
+            rows = result.all()
+            for patent_id, claims_text in rows:
+                indexed += await self.index_claims(session, patent_id, split_claims(claims_text))
+                cursor = patent_id
+            await session.commit()
+        logger.info(f"✅ [PatentSimilarity] 청구항 임베딩 {indexed}건 적재 (patent_id {after_patent_id}~{cursor})")
+        return indexed, cursor, len(rows)
+
+    async def backfill_pending_claims(
+        self, batch_size: Optional[int] = None, max_batches: Optional[int] = None
+    ) -> int:
+        """
+        더 채울 특허가 없을 때까지 patent_id 순으로 배치 적재 (배치당 commit, 수집 후 작업 / CLI 용)
+
+        커서가 항상 앞으로 가므로 임베딩에 실패하거나 청구항이 비어 적재되지 않은 특허가
+        다음 배치의 LIMIT 창을 막지 않는다 (다음 실행에서 다시 시도).
+        """
+        batch_size = max(1, int(batch_size or settings.patent_claim_backfill_batch_size))
+        max_batches = max(1, int(max_batches or settings.patent_claim_backfill_max_batches))
+        total = 0
+        cursor = 0
+        for _ in range(max_batches):
+            indexed, cursor, picked = await self._backfill_claims_after(cursor, batch_size)
+            total += indexed
+            if picked < batch_size:
+                break
+        return total
+
+patent_similarity_service = PatentSimilarityService()
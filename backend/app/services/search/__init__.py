@@ -6,20 +6,25 @@
 
 통합 질의 처리 파이프라인:
 - query_pipeline.process_user_query(): 일반 검색 + RAG 검색 공통 사용
+- query_plan.QueryPlan: 요청당 1회 계산되는 질의 분석/임베딩 (검색기·에이전트 도구 공유)
 - query_config.UNIFIED_STOPWORDS: 통합 불용어 리스트
 - query_models.ProcessedQuery: 처리된 질의 모델
 """
 
 from .search_service import search_service
 from .multimodal_search_service import multimodal_search_service
+from .document_vector_service import document_vector_service
 from .query_pipeline import process_user_query
+from .query_plan import QueryPlan
 from .query_config import UNIFIED_STOPWORDS, INTENT_SEARCH_STRATEGIES, RAG_SEARCH_STRATEGIES
 from .query_models import ProcessedQuery, IntentType
 
 __all__ = [
     "search_service",
     "multimodal_search_service",
+    "document_vector_service",
     "process_user_query",
+    "QueryPlan",
     "UNIFIED_STOPWORDS",
     "INTENT_SEARCH_STRATEGIES",
     "RAG_SEARCH_STRATEGIES",
@@ -0,0 +1,321 @@
+"""
+문서 단위 대표 벡터 (연관 문서 추천 / 유사 문서)
+================================================
+
+연관 문서 추천은 "질의와 가장 가까운 청크를 가진 문서"를 찾는 문제지만, 청크 전체에 대해
+MAX(similarity) GROUP BY 를 하면 임계값이 WHERE 절에 있어 인덱스 정렬을 쓸 수 없고 매번
+청크 테이블 전체를 읽게 된다. 문서마다 몇 개의 대표 벡터만 tb_document_vectors 에 유지한다.
+
+- centroid: 문서 청크 임베딩 평균 (1개)
+- medoid: 청크 순서를 N 구간으로 나누고 구간 평균에 가장 가까운 실제 청크 벡터 (구간별 1개)
+  → 주제가 여러 개인 긴 문서도 평균 하나에 묻히지 않게 함
+
+조회는 2단계:
+1) 대표 벡터 HNSW ANN 1회로 후보 문서 N개 (코퍼스 크기와 무관)
+2) 후보 문서의 청크만 재채점 (MAX 유사도 / 임계값 초과 청크 수)
+
+청크 임베딩이 저장·재처리·삭제될 때 해당 문서 행만 다시 계산한다.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 임베딩 차원 → 벡터 컬럼 (vs_doc_contents_chunks 와 같은 규칙)
+VECTOR_COLUMNS = {
+    1536: "azure_embedding_1536",
+    1024: "aws_embedding_1024",
+}
+
+CENTROID_SQL = """
+    INSERT INTO tb_document_vectors (
+        file_bss_info_sno, knowledge_container_id, vector_kind, member_rank, chunk_count, {column}, updated_at
+    )
+    SELECT c.file_bss_info_sno, MAX(c.knowledge_container_id), 'centroid', 0, COUNT(*), AVG(c.{column}), now()
+    FROM vs_doc_contents_chunks c
+    WHERE c.file_bss_info_sno = :file_id AND c.del_yn = 'N' AND c.{column} IS NOT NULL
+    GROUP BY c.file_bss_info_sno
+    ON CONFLICT (file_bss_info_sno, vector_kind, member_rank) DO UPDATE
+        SET {column} = EXCLUDED.{column},
+            chunk_count = EXCLUDED.chunk_count,
+            knowledge_container_id = EXCLUDED.knowledge_container_id,
+            updated_at = now()
+"""
+
+# 청크 순서 기준 NTILE 구간별로 구간 평균에 가장 가까운 청크 1개 (청크가 1개뿐이면 centroid 와 같으므로 생략)
+MEDOID_SQL = """
+    WITH members AS (
+        SELECT c.knowledge_container_id, c.{column} AS vec,
+               NTILE(:medoids) OVER (ORDER BY c.chunk_index, c.chunk_sno) AS part
+        FROM vs_doc_contents_chunks c
+        WHERE c.file_bss_info_sno = :file_id AND c.del_yn = 'N' AND c.{column} IS NOT NULL
+    ),
+    parts AS (
+        SELECT part, AVG(vec) AS center, COUNT(*) AS member_count
+        FROM members
+        GROUP BY part
+    ),
+    ranked AS (
+        SELECT m.part, m.vec, m.knowledge_container_id, p.member_count,
+               ROW_NUMBER() OVER (PARTITION BY m.part ORDER BY m.vec <=> p.center) AS rn
+        FROM members m
+        JOIN parts p ON p.part = m.part
+    )
+    INSERT INTO tb_document_vectors (
+        file_bss_info_sno, knowledge_container_id, vector_kind, member_rank, chunk_count, {column}, updated_at
+    )
+    SELECT :file_id, knowledge_container_id, 'medoid', part, member_count, vec, now()
+    FROM ranked
+    WHERE rn = 1 AND (SELECT COUNT(*) FROM members) > 1
+    ON CONFLICT (file_bss_info_sno, vector_kind, member_rank) DO UPDATE
+        SET {column} = EXCLUDED.{column},
+            chunk_count = EXCLUDED.chunk_count,
+            knowledge_container_id = EXCLUDED.knowledge_container_id,
+            updated_at = now()
+"""
+
+# 1) 권한/삭제/제외 필터를 통과한 대표 벡터 ANN → 2) 문서별 최근접 거리로 후보 축소 → 3) 후보 문서 청크만 재채점
+RECOMMEND_SQL = """
+    WITH ann AS (
+        SELECT dv.file_bss_info_sno, dv.{column} <=> CAST(:query_vec AS vector) AS distance
+        FROM tb_document_vectors dv
+        WHERE dv.{column} IS NOT NULL
+          AND EXISTS (
+              SELECT 1 FROM tb_file_bss_info f
+              WHERE f.file_bss_info_sno = dv.file_bss_info_sno AND f.del_yn = 'N'{filters}
+          )
+        ORDER BY dv.{column} <=> CAST(:query_vec AS vector)
+        LIMIT :ann_limit
+    ),
+    candidates AS (
+        SELECT ann.file_bss_info_sno, MIN(ann.distance) AS distance
+        FROM ann
+        GROUP BY ann.file_bss_info_sno
+        ORDER BY MIN(ann.distance)
+        LIMIT :candidate_limit
+    )
+    SELECT f.file_bss_info_sno AS file_id, f.file_lgc_nm AS file_name,
+           f.knowledge_container_id AS container_id,
+           1 - cand.distance AS document_similarity,
+           best.max_similarity, best.matched_chunks
+    FROM candidates cand
+    JOIN tb_file_bss_info f ON f.file_bss_info_sno = cand.file_bss_info_sno
+    CROSS JOIN LATERAL (
+        SELECT MAX(1 - (c.{column} <=> CAST(:query_vec AS vector))) AS max_similarity,
+               COUNT(*) FILTER (WHERE 1 - (c.{column} <=> CAST(:query_vec AS vector)) > :threshold) AS matched_chunks
+        FROM vs_doc_contents_chunks c
+        WHERE c.file_bss_info_sno = cand.file_bss_info_sno AND c.del_yn = 'N' AND c.{column} IS NOT NULL
+    ) best
+    WHERE best.max_similarity > :threshold
+    ORDER BY best.max_similarity DESC, best.matched_chunks DESC
+    LIMIT :limit
+"""
+
+
+def _vector_literal(vector: Sequence[float]) -> str:
+    return "[" + ",".join(map(str, vector)) + "]"
+
+
+def _int_ids(ids: Optional[Iterable[Any]]) -> List[int]:
+    return sorted({int(i) for i in ids or () if str(i).strip().isdigit()})
+
+
+class DocumentVectorService:
+    """문서 단위 대표 벡터 유지 및 조회"""
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._session_factory = session_factory
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.document_vectors_enabled)
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    # ---------------------------
+    # 유지 (적재 / 삭제)
+    # ---------------------------
+    async def refresh_document(self, file_id: Any, session: Optional[AsyncSession] = None) -> bool:
+        """문서의 대표 벡터를 현재 청크 임베딩으로 다시 계산
+
+        session 을 넘기면 적재 트랜잭션 안에서(세이브포인트) 실행하고 커밋은 호출자에게 맡긴다.
+        """
+        ids = _int_ids([file_id])
+        if not self.enabled or not ids:
+            return False
+        try:
+            if session is not None:
+                async with session.begin_nested():
+                    await self._refresh(session, ids[0])
+            else:
+                async with self.session_factory() as own_session:
+                    await self._refresh(own_session, ids[0])
+                    await own_session.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"[DOC-VECTORS] 대표 벡터 갱신 실패 file_id={file_id}: {e}")
+            return False
+
+    async def _refresh(self, session: AsyncSession, file_id: int) -> None:
+        await session.execute(
+            text("DELETE FROM tb_document_vectors WHERE file_bss_info_sno = :file_id"),
+            {"file_id": file_id},
+        )
+        params = {"file_id": file_id, "medoids": max(1, int(settings.document_vector_medoids))}
+        for column in VECTOR_COLUMNS.values():
+            await session.execute(text(CENTROID_SQL.format(column=column)), params)
+            if settings.document_vector_medoids > 0:
+                await session.execute(text(MEDOID_SQL.format(column=column)), params)
+
+    async def remove_documents(self, file_ids: Iterable[Any], session: Optional[AsyncSession] = None) -> int:
+        """삭제/재처리 대상 문서의 대표 벡터 제거"""
+        ids = _int_ids(file_ids)
+        if not ids:
+            return 0
+        statement = text("DELETE FROM tb_document_vectors WHERE file_bss_info_sno = ANY(:file_ids)")
+        try:
+            if session is not None:
+                result = await session.execute(statement, {"file_ids": ids})
+            else:
+                async with self.session_factory() as own_session:
+                    result = await own_session.execute(statement, {"file_ids": ids})
+                    await own_session.commit()
+            return result.rowcount or 0
+        except Exception as e:
+            logger.warning(f"[DOC-VECTORS] 대표 벡터 삭제 실패 {ids}: {e}")
+            return 0
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    async def recommend(
+        self,
+        embedding: Sequence[float],
+        limit: int = 5,
+        threshold: float = 0.2,
+        exclude_file_ids: Optional[Iterable[Any]] = None,
+        container_ids: Optional[Sequence[str]] = None,
+        session: Optional[AsyncSession] = None,
+    ) -> List[Dict[str, Any]]:
+        """질의 벡터와 가까운 문서 (대표 벡터 ANN → 후보 문서 청크 재채점)
+
+        container_ids 가 None 이면 컨테이너 제한 없음, 빈 목록이면 결과 없음.
+        """
+        column = VECTOR_COLUMNS.get(len(embedding or ()))
+        if column is None or limit <= 0 or container_ids is not None and not container_ids:
+            return []
+        return await self._query(
+            column, _vector_literal(embedding), limit, threshold, exclude_file_ids, container_ids, session
+        )
+
+    async def similar_to_document(
+        self,
+        file_id: Any,
+        limit: int = 10,
+        threshold: float = 0.2,
+        container_ids: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """문서와 비슷한 문서 ("more like this") - 문서 centroid 를 질의 벡터로 사용"""
+        ids = _int_ids([file_id])
+        if not ids or container_ids is not None and not container_ids:
+            return []
+        async with self.session_factory() as session:
+            centroid = await self._centroid(session, ids[0])
+            if centroid is None and await self.refresh_document(ids[0], session=session):
+                await session.commit()
+                centroid = await self._centroid(session, ids[0])
+            if centroid is None:
+                return []
+            column, literal = centroid
+            return await self._query(column, literal, limit, threshold, ids, container_ids, session)
+
+    async def _centroid(self, session: AsyncSession, file_id: int) -> Optional[tuple]:
+        """문서 centroid (컬럼명, 벡터 리터럴) - 현재 프로바이더 컬럼 우선"""
+        preferred = "aws_embedding_1024" if settings.get_current_embedding_provider() == "bedrock" else "azure_embedding_1536"
+        for column in [preferred] + [c for c in VECTOR_COLUMNS.values() if c != preferred]:
+            literal = (await session.execute(
+                text(
+                    f"SELECT CAST({column} AS text) FROM tb_document_vectors "
+                    f"WHERE file_bss_info_sno = :file_id AND vector_kind = 'centroid' AND {column} IS NOT NULL"
+                ),
+                {"file_id": file_id},
+            )).scalar()
+            if literal:
+                return column, literal
+        return None
+
+    async def _query(
+        self,
+        column: str,
+        vector_literal: str,
+        limit: int,
+        threshold: float,
+        exclude_file_ids: Optional[Iterable[Any]],
+        container_ids: Optional[Sequence[str]],
+        session: Optional[AsyncSession],
+    ) -> List[Dict[str, Any]]:
+        candidate_limit = max(int(settings.document_vector_candidates), limit)
+        params: Dict[str, Any] = {
+            "query_vec": vector_literal,
+            "threshold": threshold,
+            "limit": limit,
+            "candidate_limit": candidate_limit,
+            # 문서당 대표 벡터가 (1 + medoid 수)개이므로 그만큼 더 가져와서 문서 단위로 접음
+            "ann_limit": candidate_limit * (1 + max(0, int(settings.document_vector_medoids))),
+        }
+        filters = ""
+        exclude = _int_ids(exclude_file_ids)
+        if exclude:
+            filters += " AND f.file_bss_info_sno <> ALL(:exclude_ids)"
+            params["exclude_ids"] = exclude
+        if container_ids is not None:
+            filters += " AND f.knowledge_container_id = ANY(:container_ids)"
+            params["container_ids"] = list(container_ids)
+        # 삭제/컨테이너/제외 필터는 ANN 단계(EXISTS)에 두고, 탐색 폭은 ann_limit 이상 + iterative scan 으로
+        # 필터 통과 대표 벡터가 ann_limit 을 채우게 한다. 설정은 세이브포인트 안에서만 적용 (호출자 세션에 남지 않음)
+        statement = text(RECOMMEND_SQL.format(column=column, filters=filters))
+
+        async def run(s: AsyncSession):
+            from app.services.search.vector_index_manager import run_ann_query
+
+            return await run_ann_query(
+                s, statement, params, ann_limit=params["ann_limit"], limit=limit,
+                ef_search=int(settings.document_vector_hnsw_ef_search),
+            )
+
+        if session is not None:
+            rows = await run(session)
+        else:
+            async with self.session_factory() as own_session:
+                try:
+                    rows = await run(own_session)
+                finally:
+                    await own_session.rollback()
+
+        return [
+            {
+                "file_id": row.file_id,
+                "file_name": row.file_name,
+                "container_id": row.container_id,
+                "max_similarity": float(row.max_similarity),
+                "document_similarity": float(row.document_similarity),
+                "matched_chunks": int(row.matched_chunks),
+            }
+            for row in rows
+        ]
+
+
+# 전역 인스턴스
+document_vector_service = DocumentVectorService()
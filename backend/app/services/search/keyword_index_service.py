@@ -0,0 +1,328 @@
+"""
+키워드 검색 엔진 (BM25 + 트라이그램 보조 인덱스)
+================================================
+
+tb_document_search_index 키워드 검색에서 문서 수에 비례해 느려지던 부분을 대체한다.
+
+- 후보 생성: tsvector GIN 인덱스(@@) + pg_trgm GIN 인덱스(ILIKE 부분 일치)만 사용
+  (3자 미만 질의는 트라이그램을 만들 수 없으므로 부분 일치 보조 검색 생략)
+- 후보 상한: 키워드(제목/요약) 일치 문서 우선으로 candidate_limit 개까지만 점수 계산
+- 점수: BM25 - 질의어별 문서 빈도(df)와 평균 문서 길이는 tb_search_term_stats /
+  tb_search_corpus_stats 에 미리 집계해 두고, 질의 시에는 질의어 몇 개만 PK 조회
+
+통계는 질의와 무관하므로 주기적으로(search_keyword_stats_refresh_seconds) 백그라운드에서
+ts_stat() 으로 재집계한다. 통계가 조금 오래되어도 순위에만 영향이 있고 결과 누락은 없다.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 통계 재집계 중복 실행 방지용 advisory lock 키
+STATS_REFRESH_LOCK_KEY = 73810038
+
+
+@dataclass(frozen=True)
+class KeywordProfile:
+    """언어별 tsvector 컬럼 / 텍스트 검색 설정 묶음"""
+    name: str
+    content_column: str
+    keyword_column: str
+    configs: Tuple[str, ...]
+
+    def tsvector_sql(self, param: str) -> str:
+        """질의 텍스트 → 컬럼과 같은 규칙의 tsvector"""
+        return " || ".join(f"to_tsvector('{config}', :{param})" for config in self.configs)
+
+    def match_sql(self, alias: str, param: str) -> str:
+        """후보 조건 (GIN 인덱스 사용)"""
+        clauses = []
+        for config in self.configs:
+            tsquery = f"plainto_tsquery('{config}', :{param})"
+            clauses.append(f"{alias}.{self.content_column} @@ {tsquery}")
+            clauses.append(f"{alias}.{self.keyword_column} @@ {tsquery}")
+        return " OR ".join(clauses)
+
+
+# content_tsvector/keyword_tsvector 는 simple + korean 혼합 트리거로 생성된다
+PROFILES: Dict[str, KeywordProfile] = {
+    "ko": KeywordProfile("ko", "content_tsvector", "keyword_tsvector", ("simple", "korean")),
+    "en": KeywordProfile("en", "content_tsvector_en", "keyword_tsvector_en", ("english",)),
+}
+
+
+@dataclass
+class CorpusStats:
+    """프로필별 코퍼스 통계"""
+    profile: str
+    doc_count: int
+    avg_doc_length: float
+    refreshed_at: float = 0.0  # epoch seconds (DB 집계 시각)
+    loaded_at: float = 0.0  # 프로세스 캐시 적재 시각 (monotonic)
+
+
+def resolve_profiles(language: Optional[str]) -> List[KeywordProfile]:
+    """감지 언어 → 사용할 프로필 (mixed 는 양쪽 모두 후보/점수 계산)"""
+    if language == "en":
+        return [PROFILES["en"]]
+    if language == "ko":
+        return [PROFILES["ko"]]
+    return [PROFILES["ko"], PROFILES["en"]]
+
+
+def bm25_idf(doc_count: int, doc_freq: int) -> float:
+    """BM25 IDF (Lucene 방식, 항상 양수)"""
+    if doc_count <= 0:
+        return 1.0
+    doc_freq = min(max(doc_freq, 0), doc_count)
+    return math.log(1.0 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def normalize_bm25(score: float) -> float:
+    """BM25 원점수(상한 없음) → 0~1 (벡터 유사도와 같은 척도로 하이브리드 결합)"""
+    if not score or score <= 0 or math.isnan(score) or math.isinf(score):
+        return 0.0
+    return score / (score + settings.search_bm25_normalization)
+
+
+def bm25_score_sql(profile: KeywordProfile, alias: str, index: int) -> str:
+    """
+    후보 1건의 BM25 점수 식
+
+    tf = 위치 배열 길이 (strip 된 벡터면 1), 문서 길이 = length(tsvector) (고유 어휘 수,
+    통계의 평균 길이도 같은 기준). 제목/요약(keyword 벡터)에 포함된 질의어는 idf × 가중치 가산.
+    """
+    terms, idfs = f":terms_{index}", f":idfs_{index}"
+    content = f"{alias}.{profile.content_column}"
+    keyword = f"{alias}.{profile.keyword_column}"
+    return f"""(
+        COALESCE((
+            SELECT SUM(
+                q.idf * (COALESCE(array_length(u.positions, 1), 1) * (:bm25_k1 + 1.0))
+                / (COALESCE(array_length(u.positions, 1), 1)
+                   + :bm25_k1 * (1.0 - :bm25_b + :bm25_b * length({content}) / :avgdl_{index}))
+            )
+            FROM unnest({content}) AS u
+            JOIN unnest(CAST({terms} AS text[]), CAST({idfs} AS float8[])) AS q(term, idf)
+              ON u.lexeme = q.term
+        ), 0.0)
+        + :keyword_weight * COALESCE((
+            SELECT SUM(q.idf)
+            FROM unnest({keyword}) AS k
+            JOIN unnest(CAST({terms} AS text[]), CAST({idfs} AS float8[])) AS q(term, idf)
+              ON k.lexeme = q.term
+        ), 0.0)
+    )"""
+
+
+class KeywordIndexService:
+    """BM25 키워드 검색 + 코퍼스 통계 관리"""
+
+    def __init__(self, session_factory: Optional[Callable[[], AsyncSession]] = None):
+        self._session_factory = session_factory
+        self._stats: Dict[str, CorpusStats] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    # ---------------------------
+    # 통계
+    # ---------------------------
+    async def get_corpus_stats(self, db: AsyncSession, profile: KeywordProfile) -> CorpusStats:
+        """프로세스 캐시 → DB 순 조회, 오래됐으면 백그라운드 재집계 예약"""
+        cached = self._stats.get(profile.name)
+        if cached and time.monotonic() - cached.loaded_at < settings.search_keyword_stats_cache_seconds:
+            return cached
+
+        row = (await db.execute(
+            text(
+                "SELECT doc_count, avg_doc_length, EXTRACT(EPOCH FROM refreshed_at) AS refreshed_at "
+                "FROM tb_search_corpus_stats WHERE profile = :profile"
+            ),
+            {"profile": profile.name},
+        )).first()
+        stats = CorpusStats(
+            profile=profile.name,
+            doc_count=int(row.doc_count) if row else 0,
+            avg_doc_length=float(row.avg_doc_length or 0.0) if row else 0.0,
+            refreshed_at=float(row.refreshed_at or 0.0) if row else 0.0,
+            loaded_at=time.monotonic(),
+        )
+        self._stats[profile.name] = stats
+
+        if time.time() - stats.refreshed_at > settings.search_keyword_stats_refresh_seconds:
+            self.schedule_refresh()
+        return stats
+
+    async def query_terms(self, db: AsyncSession, profile: KeywordProfile, query_text: str) -> List[Tuple[str, int]]:
+        """질의어 어휘(lexeme) + 문서 빈도 (컬럼과 동일한 정규화를 DB 에서 수행)"""
+        result = await db.execute(
+            text(f"""
+                SELECT q.term, COALESCE(t.doc_freq, 0) AS doc_freq
+                FROM (SELECT DISTINCT lexeme AS term FROM unnest({profile.tsvector_sql('query_text')})) q
+                LEFT JOIN tb_search_term_stats t ON t.profile = :profile AND t.term = q.term
+            """),
+            {"query_text": query_text, "profile": profile.name},
+        )
+        return [(row.term, int(row.doc_freq)) for row in result.fetchall()]
+
+    def schedule_refresh(self) -> None:
+        """통계 재집계를 백그라운드로 1회만 실행"""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self.refresh_stats())
+        except RuntimeError:
+            pass
+
+    async def refresh_stats(self) -> bool:
+        """ts_stat() 기반 df / 평균 길이 재집계 (다른 워커가 집계 중이면 건너뜀)"""
+        try:
+            async with self.session_factory() as db:
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": STATS_REFRESH_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    return False
+                # 다른 워커가 방금 집계를 끝냈으면 생략
+                age = (await db.execute(
+                    text("SELECT EXTRACT(EPOCH FROM now() - MIN(refreshed_at)) FROM tb_search_corpus_stats")
+                )).scalar()
+                if age is not None and float(age) < settings.search_keyword_stats_refresh_seconds:
+                    self._stats.clear()
+                    return False
+
+                started = time.perf_counter()
+                for profile in PROFILES.values():
+                    source = (
+                        f"SELECT {profile.content_column} FROM tb_document_search_index "
+                        f"WHERE indexing_status = ''indexed'' AND {profile.content_column} IS NOT NULL"
+                    )
+                    await db.execute(text("DELETE FROM tb_search_term_stats WHERE profile = :profile"), {"profile": profile.name})
+                    await db.execute(
+                        text(f"""
+                            INSERT INTO tb_search_term_stats (profile, term, doc_freq)
+                            SELECT :profile, word, ndoc FROM ts_stat('{source}')
+                        """),
+                        {"profile": profile.name},
+                    )
+                    await db.execute(
+                        text(f"""
+                            INSERT INTO tb_search_corpus_stats (profile, doc_count, avg_doc_length, refreshed_at)
+                            SELECT :profile, COUNT(*), COALESCE(AVG(length({profile.content_column})), 0), now()
+                            FROM tb_document_search_index
+                            WHERE indexing_status = 'indexed' AND {profile.content_column} IS NOT NULL
+                            ON CONFLICT (profile) DO UPDATE
+                               SET doc_count = EXCLUDED.doc_count,
+                                   avg_doc_length = EXCLUDED.avg_doc_length,
+                                   refreshed_at = EXCLUDED.refreshed_at
+                        """),
+                        {"profile": profile.name},
+                    )
+                await db.commit()
+
+            self._stats.clear()
+            logger.info(f"[KEYWORD-STATS] 코퍼스 통계 재집계 완료 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            return True
+        except Exception as e:
+            logger.warning(f"[KEYWORD-STATS] 코퍼스 통계 재집계 실패: {e}")
+            return False
+
+    # ---------------------------
+    # 검색
+    # ---------------------------
+    async def search(
+        self,
+        db: AsyncSession,
+        query_text: str,
+        container_ids: Sequence[str],
+        max_results: int,
+        language: Optional[str] = None,
+    ) -> List[Any]:
+        """후보 생성(인덱스) → 상한 → BM25 정렬. 반환 행은 기존 키워드 검색 컬럼 + keyword_score"""
+        query_text = (query_text or "").strip()
+        if not query_text:
+            return []
+
+        profiles = resolve_profiles(language)
+        params: Dict[str, Any] = {
+            "query_text": query_text,
+            "container_ids": list(container_ids),
+            "candidate_limit": max(settings.search_keyword_candidate_limit, max_results),
+            "max_results": max_results,
+            "bm25_k1": settings.search_bm25_k1,
+            "bm25_b": settings.search_bm25_b,
+            "keyword_weight": settings.search_bm25_keyword_weight,
+        }
+        scores = []
+        for index, profile in enumerate(profiles):
+            stats = await self.get_corpus_stats(db, profile)
+            terms = await self.query_terms(db, profile, query_text)
+            params[f"terms_{index}"] = [term for term, _ in terms]
+            params[f"idfs_{index}"] = [bm25_idf(stats.doc_count, df) for _, df in terms]
+            params[f"avgdl_{index}"] = stats.avg_doc_length or 1.0
+            scores.append(bm25_score_sql(profile, "c", index))
+
+        match_conditions = [profile.match_sql("s", "query_text") for profile in profiles]
+        keyword_hit = " OR ".join(
+            f"s.{profile.keyword_column} @@ plainto_tsquery('{config}', :query_text)"
+            for profile in profiles for config in profile.configs
+        )
+        # 부분 일치 보조 검색: pg_trgm GIN 인덱스를 탈 수 있는 3자 이상만
+        if len(query_text) >= 3:
+            match_conditions.append("s.full_content ILIKE :like_pattern OR s.document_title ILIKE :like_pattern")
+            params["like_pattern"] = f"%{query_text}%"
+            title_bonus = "CASE WHEN c.document_title ILIKE :like_pattern THEN :keyword_weight ELSE 0.0 END"
+        else:
+            title_bonus = "0.0"
+        score_sql = scores[0] if len(scores) == 1 else f"GREATEST({', '.join(scores)})"
+
+        result = await db.execute(
+            text(f"""
+                WITH candidates AS (
+                    SELECT s.search_doc_id, s.file_bss_info_sno, s.knowledge_container_id,
+                           s.full_content, s.content_summary, s.document_title, s.has_images, s.image_count,
+                           {', '.join(f's.{p.content_column}, s.{p.keyword_column}' for p in profiles)},
+                           f.file_lgc_nm, f.path
+                    FROM tb_document_search_index s
+                    JOIN tb_file_bss_info f ON s.file_bss_info_sno = f.file_bss_info_sno
+                    WHERE (s.knowledge_container_id = 'DEFAULT_CONTAINER' OR s.knowledge_container_id = ANY(:container_ids))
+                      AND f.del_yn = 'N'
+                      AND s.indexing_status = 'indexed'
+                      AND ({' OR '.join(f'({condition})' for condition in match_conditions)})
+                    ORDER BY ({keyword_hit}) DESC
+                    LIMIT :candidate_limit
+                )
+                SELECT c.search_doc_id, c.file_bss_info_sno, c.knowledge_container_id,
+                       0 AS chunk_index,
+                       c.full_content AS content,
+                       c.content_summary AS main_text,
+                       c.document_title, c.has_images, c.image_count, c.file_lgc_nm, c.path,
+                       {score_sql} + {title_bonus} AS keyword_score
+                FROM candidates c
+                ORDER BY keyword_score DESC
+                LIMIT :max_results
+            """),
+            params,
+        )
+        return result.fetchall()
+
+
+# 전역 인스턴스
+keyword_index_service = KeywordIndexService()
@@ -17,6 +17,7 @@ import logging
 from typing import Dict, Any, Optional, List
 
 from .query_models import ProcessedQuery, IntentType
+from .query_plan import QueryPlan
 from .query_config import (
     UNIFIED_STOPWORDS, 
     INTENT_SEARCH_STRATEGIES, 
@@ -25,8 +26,6 @@ from .query_config import (
     LANGUAGE_SETTINGS
 )
 from ..core.korean_nlp_service import korean_nlp_service
-from ..core.embedding_service import embedding_service
-from .spell_checker import apply_spell_correction
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +33,8 @@ logger = logging.getLogger(__name__)
 async def process_user_query(
     query: str,
     search_type: str = "general",  # "general" or "rag"
+    plan: Optional[QueryPlan] = None,
+    with_embedding: bool = True,
     **kwargs
 ) -> ProcessedQuery:
     """
@@ -42,94 +43,39 @@ async def process_user_query(
     Args:
         query: 사용자 질의 텍스트
         search_type: "general" (일반 검색) or "rag" (RAG 검색)
+        plan: 이미 만들어 둔 요청 단위 QueryPlan (없으면 새로 생성)
+        with_embedding: False 면 임베딩을 기다리지 않음 (필요한 검색기가 plan.embedding() 으로 사용)
     
     Returns:
         ProcessedQuery: 처리된 질의
     
-    처리 단계:
-        1. 입력 정규화 (공백, 특수문자 제거)
-        2. 의도 분류 (keyword_search, document_search, qa_question, ...)
-        3. 형태소 분석 및 키워드 추출
-        4. 불용어 제거 (UNIFIED_STOPWORDS 사용)
-        5. 검색 쿼리 생성 (fulltext, keyword, vector)
-        6. 검색 전략 설정 (가중치, 임계값)
+    처리 단계 (QueryPlan):
+        1. 입력 정규화 / 언어 감지 / 스펠링 교정 / 의도 분류 (동기)
+        2. 형태소 키워드 추출 ∥ 벡터 임베딩 (동시 실행, 요청당 1회)
+        3. 불용어 제거 (UNIFIED_STOPWORDS 사용) 및 검색 쿼리 생성
+        4. 검색 전략 설정 (가중치, 임계값)
+    
+    변경 사항 (2026-01-10):
+        - 임베딩 입력을 필터링된 키워드 나열 → 정규화 문장으로 변경
+          (SearchService 벡터 검색과 같은 입력이므로 임베딩을 한 번만 생성해 공유)
     """
     start_time = time.time()
     
     try:
         logger.info(f"🔍 [QueryPipeline] 질의 처리 시작: '{query[:50]}...' (type: {search_type})")
         
-        # Step 1: 입력 정규화
-        normalized_text = _normalize_text(query)
-        language = _detect_language(normalized_text)
-        logger.info(f"✓ 정규화 완료: '{normalized_text}' (언어: {language})")
-        
-        # Step 2: 스펠링 교정 (영어/혼합 어절만 대상)
-        spell_corrections = {}
-        if language in ("en", "mixed"):
-            corrected_text, spell_corrections = apply_spell_correction(normalized_text)
-            if spell_corrections:
-                logger.info(f"✓ 오탈자 보정: {spell_corrections}")
-                normalized_text = corrected_text
-
-        # Step 3: 의도 분류
-        intent_type, intent_confidence = _classify_intent(normalized_text)
-        logger.info(f"✓ 의도 분류: {intent_type} (confidence: {intent_confidence:.2f})")
-        
-        # Step 4: 형태소 분석 및 키워드 추출
-        keywords = await _extract_keywords(normalized_text)
-        logger.info(f"✓ 키워드 추출: {len(keywords)}개 → {keywords}")
-        
-        # Step 5: 불용어 제거
-        filtered_keywords = _filter_stopwords(keywords, intent_type, language)
-        logger.info(f"✓ 불용어 제거: {len(keywords)}개 → {len(filtered_keywords)}개 → {filtered_keywords}")
-
-        if spell_corrections:
-            # 교정된 단어를 키워드에 보강 (중복 제거)
-            corrected_terms = list(spell_corrections.values())
-            filtered_keywords = list(dict.fromkeys(filtered_keywords + corrected_terms))
-            keywords = list(dict.fromkeys(keywords + corrected_terms))
-            logger.info(f"✓ 교정 단어 보강 후 키워드: {filtered_keywords}")
-        
-        # Step 6: 검색 쿼리 생성
-        fulltext_query = _generate_fulltext_query(filtered_keywords)
-        keyword_query = _generate_keyword_query(filtered_keywords)
-        logger.info(f"✓ 검색 쿼리 생성: fulltext='{fulltext_query}'")
-        
-        # Step 7: 벡터 임베딩 생성 (옵션)
-        vector_embedding = None
-        if filtered_keywords and search_type in ["rag", "general"]:
-            try:
-                embedding_text = " ".join(filtered_keywords)
-                vector_embedding = await embedding_service.get_embedding(embedding_text)
-                logger.info(f"✓ 벡터 임베딩 생성 완료")
-            except Exception as e:
-                logger.warning(f"⚠ 벡터 임베딩 생성 실패: {e}")
-        
-        # Step 8: 검색 전략 설정
-        strategy = _get_search_strategy(intent_type, search_type)
+        if plan is None or not plan.matches(query):
+            plan = QueryPlan.build(query)
+        if plan.spell_corrections:
+            logger.info(f"✓ 오탈자 보정: {dict(plan.spell_corrections)}")
         
-        processing_time = (time.time() - start_time) * 1000
+        result = await plan.to_processed_query(search_type, with_embedding=with_embedding and search_type in ["rag", "general"])
+        result.processing_time_ms = (time.time() - start_time) * 1000
         
-        result = ProcessedQuery(
-            original_text=query,
-            normalized_text=normalized_text,
-            language=language,
-            intent=intent_type,
-            intent_confidence=intent_confidence,
-            keywords=keywords,
-            filtered_keywords=filtered_keywords,
-            fulltext_query=fulltext_query,
-            keyword_query=keyword_query,
-            vector_embedding=vector_embedding,
-            weights=strategy["weights"],
-            similarity_threshold=strategy["similarity_threshold"],
-            max_results=strategy.get("max_results", 15),
-            processing_time_ms=processing_time,
-            spell_corrections=spell_corrections
+        logger.info(
+            f"✅ [QueryPipeline] 처리 완료: {result.processing_time_ms:.1f}ms "
+            f"(의도: {result.intent}, 키워드: {result.filtered_keywords})"
         )
-        
-        logger.info(f"✅ [QueryPipeline] 처리 완료: {processing_time:.1f}ms")
         logger.debug(f"📊 처리 결과: {result.to_dict()}")
         
         return result
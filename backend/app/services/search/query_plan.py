@@ -0,0 +1,160 @@
+"""
+요청 단위 질의 계획 (QueryPlan)
+==============================
+
+사용자 질의 1건에 대한 NLP/임베딩 결과를 한 번만 계산하고 검색기/에이전트 도구가 공유한다.
+
+- 생성 시(동기, 저비용): 정규화 → 언어 감지 → 스펠링 교정 → 규칙 기반 의도 분류
+- 지연 계산(비동기, 고비용): 형태소 키워드 / 질의 임베딩
+  - 필드별로 최초 요청 시 한 번만 실행되고, 동시에 여러 곳에서 기다려도 작업은 하나
+  - prefetch() 로 두 작업을 동시에 시작 (임베딩 입력은 정규화 문장이므로 키워드를 기다리지 않음)
+- 계산 결과는 tuple 로 돌려주어 공유 중 변경되지 않게 한다
+
+사용 예시:
+    plan = QueryPlan.build("연차 신청 방법").prefetch()
+    keywords = await plan.keywords()
+    embedding = await plan.embedding()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from .query_models import ProcessedQuery
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """질의 1건의 공유 분석 결과 (불변)"""
+    text: str
+    normalized_text: str
+    language: str
+    intent: str
+    intent_confidence: float
+    spell_corrections: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    # 지연 계산 작업 (필드명 → Task) - 공개 필드가 아니므로 비교/출력에서 제외
+    _tasks: Dict[str, "asyncio.Future[Any]"] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def build(cls, query: str) -> "QueryPlan":
+        """저비용 분석만 즉시 수행 (형태소 분석/임베딩은 하지 않음)"""
+        from .query_pipeline import _classify_intent, _detect_language, _normalize_text
+        from .spell_checker import apply_spell_correction
+
+        normalized_text = _normalize_text(query or "")
+        language = _detect_language(normalized_text)
+        spell_corrections: Dict[str, str] = {}
+        if language in ("en", "mixed"):
+            corrected_text, spell_corrections = apply_spell_correction(normalized_text)
+            if spell_corrections:
+                normalized_text = corrected_text
+        intent, confidence = _classify_intent(normalized_text)
+        return cls(
+            text=query or "",
+            normalized_text=normalized_text,
+            language=language,
+            intent=intent,
+            intent_confidence=confidence,
+            spell_corrections=MappingProxyType(dict(spell_corrections)),
+        )
+
+    def matches(self, query: str) -> bool:
+        """같은 질의에 대한 계획인지 (다른 질의에는 재사용하지 않음)"""
+        return query == self.text or query == self.normalized_text
+
+    # ---------------------------
+    # 지연 계산 필드
+    # ---------------------------
+    def _shared(self, name: str, factory: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+        task = self._tasks.get(name)
+        if task is None:
+            task = self._tasks[name] = asyncio.ensure_future(factory())
+        # 기다리던 호출자가 취소되어도 다른 호출자가 쓰는 작업은 유지
+        return asyncio.shield(task)
+
+    def prefetch(self, embedding: bool = True) -> "QueryPlan":
+        """키워드 분석과 임베딩을 동시에 시작 (결과는 각 필드 호출 시 사용)"""
+        if embedding:
+            self._shared("embedding", self._compute_embedding)
+        self._shared("keywords", self._compute_keywords)
+        return self
+
+    async def keywords(self) -> Tuple[str, ...]:
+        """형태소 분석 키워드 (불용어 제거 전)"""
+        return await self._shared("keywords", self._compute_keywords)
+
+    async def filtered_keywords(self) -> Tuple[str, ...]:
+        """불용어/길이 필터 + 스펠링 교정 단어 보강"""
+        from .query_pipeline import _filter_stopwords
+
+        keywords = list(await self.keywords())
+        filtered = _filter_stopwords(keywords, self.intent, self.language)
+        if self.spell_corrections:
+            filtered = list(dict.fromkeys(filtered + list(self.spell_corrections.values())))
+        return tuple(filtered)
+
+    async def embedding(self) -> Optional[Tuple[float, ...]]:
+        """정규화 문장의 질의 임베딩 (실패 시 None)"""
+        return await self._shared("embedding", self._compute_embedding)
+
+    async def _compute_keywords(self) -> Tuple[str, ...]:
+        from .query_pipeline import _extract_keywords
+
+        keywords = await _extract_keywords(self.normalized_text)
+        if self.spell_corrections:
+            keywords = list(dict.fromkeys(list(keywords) + list(self.spell_corrections.values())))
+        return tuple(keywords)
+
+    async def _compute_embedding(self) -> Optional[Tuple[float, ...]]:
+        from app.services.core.embedding_service import embedding_service
+
+        if not self.normalized_text:
+            return None
+        try:
+            vector = await embedding_service.get_embedding(self.normalized_text)
+            return tuple(vector) if vector else None
+        except Exception as e:
+            logger.warning(f"[QueryPlan] 질의 임베딩 생성 실패: {e}")
+            return None
+
+    # ---------------------------
+    # 기존 인터페이스 변환
+    # ---------------------------
+    async def to_processed_query(self, search_type: str = "general", with_embedding: bool = True) -> ProcessedQuery:
+        """ProcessedQuery (검색 전략 포함) - 키워드와 임베딩을 동시에 기다림"""
+        from .query_pipeline import _generate_fulltext_query, _generate_keyword_query, _get_search_strategy
+
+        started = time.perf_counter()
+        if with_embedding:
+            self.prefetch()
+            keywords, filtered, embedding = await asyncio.gather(
+                self.keywords(), self.filtered_keywords(), self.embedding()
+            )
+        else:
+            keywords, filtered = await asyncio.gather(self.keywords(), self.filtered_keywords())
+            embedding = None
+        strategy = _get_search_strategy(self.intent, search_type)
+
+        return ProcessedQuery(
+            original_text=self.text,
+            normalized_text=self.normalized_text,
+            language=self.language,
+            intent=self.intent,
+            intent_confidence=self.intent_confidence,
+            keywords=list(keywords),
+            filtered_keywords=list(filtered),
+            fulltext_query=_generate_fulltext_query(list(filtered)),
+            keyword_query=_generate_keyword_query(list(filtered)),
+            vector_embedding=list(embedding) if embedding else None,
+            weights=strategy["weights"],
+            similarity_threshold=strategy["similarity_threshold"],
+            max_results=strategy.get("max_results", 15),
+            processing_time_ms=(time.perf_counter() - started) * 1000,
+            spell_corrections=dict(self.spell_corrections),
+        )
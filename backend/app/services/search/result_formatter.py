@@ -0,0 +1,165 @@
+"""
+검색 결과 포맷팅 단계 (검색 후처리 CPU 경로)
+
+- 하이라이트: 검색어별 키워드를 하나의 정규식으로 합쳐 쿼리당 1회만 컴파일 (LRU 캐시)
+- 컨테이너 경로: 컨테이너 트리 스냅샷의 표시 경로 → 아이콘 경로 변환을 캐시
+- 파일 그룹화: 결과 dict 를 매번 복사하지 않고 슬롯 레코드로 집계한 뒤 파일당 1회만 복사
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Sequence
+
+NO_PATH_LABEL = "📂 경로 없음"
+HIGHLIGHT_MIN_WORD_LENGTH = 2  # 2글자 이상 단어만 하이라이트
+
+
+def chunk_score(result: Dict[str, Any]) -> float:
+    """청크 점수 (combined_score 우선, 없으면 개별 점수 가중 합)"""
+    if "combined_score" in result:
+        score = result["combined_score"]
+    else:
+        score = (
+            result.get("similarity_score", 0.0) * 0.6 +
+            result.get("keyword_score", 0.0) * 0.3 +
+            result.get("fulltext_score", 0.0) * 0.1
+        )
+    if score is None or math.isnan(score):
+        return 0.0
+    return score
+
+
+def match_type_for(search_methods: Sequence[str]) -> str:
+    """검색 방법 목록 → 대표 match_type"""
+    if len(search_methods) == 1:
+        method = search_methods[0] or ""
+        for name in ("vector", "keyword", "fulltext"):
+            if name in method:
+                return name
+    return "hybrid"
+
+
+class KeywordHighlighter:
+    """검색어 키워드를 한 번에 하이라이트하는 컴파일된 정규식 (쿼리당 1개)"""
+
+    __slots__ = ("terms", "_pattern")
+
+    def __init__(self, terms: Iterable[str]):
+        # 긴 키워드 우선 매칭 (짧은 키워드가 긴 키워드 일부를 먼저 잡지 않도록)
+        self.terms = tuple(sorted({t for t in terms if t}, key=lambda t: (-len(t), t)))
+        self._pattern: Optional[Pattern[str]] = None
+        if self.terms:
+            self._pattern = re.compile(
+                r'\b(' + '|'.join(re.escape(t) for t in self.terms) + r')\b',
+                re.IGNORECASE,
+            )
+
+    @classmethod
+    def from_query(cls, query: str, keywords: Optional[Iterable[str]] = None) -> "KeywordHighlighter":
+        query = (query or "").strip()
+        terms = {query.lower()} if query else set()
+        terms.update(w.lower() for w in query.split() if len(w) >= HIGHLIGHT_MIN_WORD_LENGTH)
+        if keywords:
+            terms.update(k.strip().lower() for k in keywords if k and k.strip())
+        return cls(terms)
+
+    def highlight(self, text: str) -> str:
+        if not text or self._pattern is None:
+            return text
+        return self._pattern.sub(r'<mark>\1</mark>', text)
+
+
+@lru_cache(maxsize=256)
+def highlighter_for(query: str) -> KeywordHighlighter:
+    """같은 검색어는 컴파일된 하이라이터 재사용"""
+    return KeywordHighlighter.from_query(query)
+
+
+@lru_cache(maxsize=4096)
+def container_path_with_icons(container_path: str) -> str:
+    """
+    컨테이너 경로에 아이콘 추가 (예: "/웅진/CEO직속/인사전략팀" → "📁 웅진 📁 CEO직속 📂 인사전략팀")
+    컨테이너 트리 스냅샷의 표시 경로는 거의 바뀌지 않으므로 결과를 캐시한다.
+    """
+    if not container_path:
+        return NO_PATH_LABEL
+
+    if '/' in container_path:
+        parts = [part.strip() for part in container_path.split('/') if part.strip()]
+    elif ' > ' in container_path:
+        parts = [part.strip() for part in container_path.split(' > ') if part.strip()]
+    else:
+        return f"📂 {container_path}"
+
+    if not parts:
+        return NO_PATH_LABEL
+    # 상위 컨테이너는 닫힌 폴더, 마지막(현재) 컨테이너는 열린 폴더
+    return " ".join([f"📁 {part}" for part in parts[:-1]] + [f"📂 {parts[-1]}"])
+
+
+@dataclass(slots=True)
+class FileGroup:
+    """파일 단위 집계 레코드 (대표 청크는 참조만 유지, 복사는 마지막에 1회)"""
+    file_id: Any
+    score: float
+    result: Dict[str, Any]
+    chunk_count: int = 0
+    thumbnail_blob_key: Optional[str] = None
+    thumbnail_chunk_id: Optional[Any] = None
+
+    def to_result(self) -> Dict[str, Any]:
+        grouped = dict(self.result)
+        grouped["combined_score"] = self.score
+        grouped["chunk_count"] = self.chunk_count
+        grouped["file_level_result"] = True  # 파일 레벨 결과임을 표시
+        if self.thumbnail_blob_key:
+            grouped["thumbnail_blob_key"] = self.thumbnail_blob_key
+            grouped["thumbnail_chunk_id"] = self.thumbnail_chunk_id
+        return grouped
+
+
+def _image_thumbnail(file_id: Any, result: Dict[str, Any]) -> Optional[str]:
+    """이미지 청크면 파이프라인 blob 키 패턴으로 썸네일 키 생성"""
+    meta = result.get("metadata") or {}
+    modality = result.get("modality") or (meta.get("modality") if isinstance(meta, dict) else None)
+    if modality != "image" or not isinstance(meta, dict):
+        return None
+    obj_id = meta.get("object_id") or meta.get("objectIdx") or result.get("chunk_index")
+    page_no = meta.get("page_no", 1)
+    return f"multimodal/{file_id}/objects/image_{obj_id}_{page_no}.png"
+
+
+def group_results_by_file(results: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    청크 결과를 파일 단위로 그룹화 (1회 순회)
+    - 파일별 최고 점수 청크를 대표로 선택
+    - 같은 파일의 청크 수 집계
+    - 같은 파일의 첫 이미지 청크를 썸네일로 선택
+    """
+    groups: Dict[Any, FileGroup] = {}
+    for result in results:
+        file_id = result.get("file_bss_info_sno")
+        if not file_id:
+            continue
+        score = chunk_score(result)
+        group = groups.get(file_id)
+        if group is None:
+            group = groups[file_id] = FileGroup(file_id=file_id, score=score, result=result)
+        elif score > group.score:
+            group.score = score
+            group.result = result
+        group.chunk_count += 1
+
+        if group.thumbnail_blob_key is None:
+            blob_key = _image_thumbnail(file_id, result)
+            if blob_key:
+                group.thumbnail_blob_key = blob_key
+                group.thumbnail_chunk_id = (
+                    result.get("chunk_id") or result.get("search_doc_id") or result.get("document_id")
+                )
+
+    ordered = sorted(groups.values(), key=lambda g: g.score, reverse=True)
+    return [group.to_result() for group in ordered]
@@ -0,0 +1,320 @@
+"""
+검색 이벤트 싱크 (검색 기록 / 분석용 비동기 적재)
+================================================
+
+검색 응답 경로에서는 record() 로 이벤트를 메모리 큐에 넣기만 하고 바로 반환한다.
+
+- 큐: 크기 제한(search_events_queue_size). 가득 차면 새 이벤트를 버리고 카운트만 올린다
+  (분석 데이터 일부 유실 < 검색 지연)
+- 적재: 백그라운드 태스크가 batch_size 개 또는 flush_interval 마다 모아서
+  unnest() 기반 다중 행 INSERT 1회로 tb_search_events 에 기록
+- 파티션: tb_search_events 는 월 단위 RANGE 파티션 - 다음 달 파티션을 미리 만들고
+  보관 기간(search_events_retention_months)이 지난 파티션은 DROP
+- 롤업: 주기적으로 최근 이틀치 이벤트를 일별 사용자/검색어 롤업 테이블에 재집계
+  (검색 분석 / 검색어 제안은 롤업만 조회)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.profiling import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# 롤업/파티션 관리 동시 실행 방지용 advisory lock 키 (워커 여러 개)
+ROLLUP_LOCK_KEY = 73810039
+PARTITION_PREFIX = "tb_search_events_"
+MAX_QUERY_NORM_LENGTH = 200
+# 큐 유실 경고 로그 최소 간격 (초)
+DROP_WARNING_INTERVAL = 60.0
+
+
+def normalize_query(query: str) -> str:
+    """검색어 집계 키 - 소문자 + 연속 공백 정리"""
+    return " ".join((query or "").lower().split())[:MAX_QUERY_NORM_LENGTH]
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    """day 가 속한 월의 1일 (offset 개월 이동)"""
+    month_index = day.year * 12 + (day.month - 1) + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+@dataclass
+class SearchEvent:
+    """검색 1건"""
+    user_emp_no: str
+    query_text: str
+    search_type: str
+    result_count: int
+    latency_ms: Optional[float] = None
+    container_ids: List[str] = field(default_factory=list)
+    top_file_ids: List[int] = field(default_factory=list)
+    occurred_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+INSERT_EVENTS_SQL = """
+    INSERT INTO tb_search_events (
+        occurred_at, user_emp_no, query_text, query_norm, search_type,
+        result_count, latency_ms, container_ids, top_file_ids
+    )
+    SELECT
+        u.occurred_at, u.user_emp_no, u.query_text, u.query_norm, u.search_type,
+        u.result_count, u.latency_ms,
+        string_to_array(NULLIF(u.container_ids, ''), ','),
+        string_to_array(NULLIF(u.top_file_ids, ''), ',')::integer[]
+    FROM unnest(
+        CAST(:occurred_at AS timestamptz[]),
+        CAST(:user_emp_no AS varchar[]),
+        CAST(:query_text AS text[]),
+        CAST(:query_norm AS varchar[]),
+        CAST(:search_type AS varchar[]),
+        CAST(:result_count AS integer[]),
+        CAST(:latency_ms AS double precision[]),
+        CAST(:container_ids AS text[]),
+        CAST(:top_file_ids AS text[])
+    ) AS u(
+        occurred_at, user_emp_no, query_text, query_norm, search_type,
+        result_count, latency_ms, container_ids, top_file_ids
+    )
+"""
+
+
+class SearchEventSink:
+    """크기 제한 큐 + 백그라운드 배치 적재"""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self.queue_size = queue_size or settings.search_events_queue_size
+        self.batch_size = batch_size or settings.search_events_batch_size
+        self.flush_interval = flush_interval or settings.search_events_flush_interval_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._partitions_ready: Optional[date] = None  # 파티션을 확인한 마지막 월
+        self._last_rollup = 0.0
+        self._last_drop_warning = 0.0
+        self.dropped = 0
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        if self._session_factory is None:
+            from app.core.database import get_async_session_local
+
+            self._session_factory = get_async_session_local()
+        return self._session_factory
+
+    # ---------------------------
+    # 기록 (검색 응답 경로)
+    # ---------------------------
+    def record(self, event: SearchEvent) -> bool:
+        """큐에 넣고 즉시 반환 (대기/DB 접근 없음). 큐가 가득 차면 버리고 False"""
+        if not settings.search_events_enabled or self._stopping:
+            return False
+        try:
+            self._ensure_worker()
+        except RuntimeError:
+            # 실행 중인 이벤트 루프 없음 (동기 컨텍스트)
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            metrics_registry.increment("search_events_total", outcome="dropped")
+            now = time.monotonic()
+            if now - self._last_drop_warning >= DROP_WARNING_INTERVAL:
+                self._last_drop_warning = now
+                logger.warning(f"[SEARCH-EVENTS] 큐 포화로 이벤트 유실 (누적 {self.dropped}건, 큐 {self.queue_size})")
+            return False
+        metrics_registry.increment("search_events_total", outcome="enqueued")
+        return True
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    # ---------------------------
+    # 백그라운드 적재
+    # ---------------------------
+    async def _run(self) -> None:
+        while not (self._stopping and self._queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                await self.flush(batch)
+            if time.monotonic() - self._last_rollup >= settings.search_events_rollup_interval_seconds:
+                self._last_rollup = time.monotonic()
+                await self.refresh_rollups()
+
+    async def _next_batch(self) -> List[SearchEvent]:
+        """첫 이벤트를 기다린 뒤 batch_size 또는 flush_interval 까지 모음"""
+        queue = self._queue
+        try:
+            batch = [await asyncio.wait_for(queue.get(), timeout=self.flush_interval)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stopping:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def flush(self, batch: Sequence[SearchEvent]) -> bool:
+        """다중 행 INSERT 1회로 적재 (파티션 누락 시 생성 후 1회 재시도)"""
+        params = {
+            "occurred_at": [e.occurred_at for e in batch],
+            "user_emp_no": [e.user_emp_no for e in batch],
+            "query_text": [e.query_text for e in batch],
+            "query_norm": [normalize_query(e.query_text) for e in batch],
+            "search_type": [e.search_type for e in batch],
+            "result_count": [int(e.result_count) for e in batch],
+            "latency_ms": [e.latency_ms for e in batch],
+            "container_ids": [",".join(e.container_ids) for e in batch],
+            "top_file_ids": [",".join(str(f) for f in e.top_file_ids) for e in batch],
+        }
+        for attempt in range(2):
+            try:
+                async with self.session_factory() as db:
+                    if attempt or self._partitions_ready != month_start(date.today()):
+                        await self.ensure_partitions(db)
+                    await db.execute(text(INSERT_EVENTS_SQL), params)
+                    await db.commit()
+                metrics_registry.increment("search_events_total", len(batch), outcome="written")
+                return True
+            except Exception as e:
+                self._partitions_ready = None
+                if attempt:
+                    metrics_registry.increment("search_events_total", len(batch), outcome="failed")
+                    logger.warning(f"[SEARCH-EVENTS] 이벤트 {len(batch)}건 적재 실패: {e}")
+        return False
+
+    # ---------------------------
+    # 파티션 관리
+    # ---------------------------
+    async def ensure_partitions(self, db: AsyncSession) -> None:
+        """현재/다음 달 파티션 생성 + 보관 기간 지난 파티션 삭제"""
+        today = date.today()
+        for offset in (0, 1):
+            start = month_start(today, offset)
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF tb_search_events "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+            ))
+
+        oldest_kept = partition_name(month_start(today, -settings.search_events_retention_months))
+        rows = await db.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = 'tb_search_events'
+        """))
+        for (name,) in rows.fetchall():
+            # 이름이 tb_search_events_YYYYMM 이므로 문자열 비교 = 월 비교
+            if name.startswith(PARTITION_PREFIX) and len(name) == len(oldest_kept) and name < oldest_kept:
+                await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                logger.info(f"[SEARCH-EVENTS] 보관 기간 만료 파티션 삭제: {name}")
+        await db.commit()
+        self._partitions_ready = month_start(today)
+
+    # ---------------------------
+    # 롤업
+    # ---------------------------
+    async def refresh_rollups(self, days: int = 2) -> bool:
+        """최근 days 일 이벤트를 일별 롤업으로 재집계 (다른 워커가 집계 중이면 건너뜀)"""
+        since = date.today() - timedelta(days=days - 1)
+        try:
+            async with self.session_factory() as db:
+                locked = (await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY}
+                )).scalar()
+                if not locked:
+                    return False
+                await db.execute(
+                    text("""
+                        INSERT INTO tb_search_daily_rollup (
+                            rollup_date, user_emp_no, search_count, success_count, total_latency_ms
+                        )
+                        SELECT occurred_at::date, user_emp_no, COUNT(*),
+                               COUNT(*) FILTER (WHERE result_count > 0),
+                               COALESCE(SUM(latency_ms), 0)
+                        FROM tb_search_events
+                        WHERE occurred_at >= CAST(:since AS date)
+                        GROUP BY 1, 2
+                        ON CONFLICT (rollup_date, user_emp_no) DO UPDATE
+                           SET search_count = EXCLUDED.search_count,
+                               success_count = EXCLUDED.success_count,
+                               total_latency_ms = EXCLUDED.total_latency_ms
+                    """),
+                    {"since": since},
+                )
+                await db.execute(
+                    text("""
+                        INSERT INTO tb_search_query_rollup (
+                            rollup_date, query_norm, search_count, user_count, hit_count, last_searched_at
+                        )
+                        SELECT occurred_at::date, query_norm, COUNT(*), COUNT(DISTINCT user_emp_no),
+                               COUNT(*) FILTER (WHERE result_count > 0), MAX(occurred_at)
+                        FROM tb_search_events
+                        WHERE occurred_at >= CAST(:since AS date) AND query_norm <> ''
+                        GROUP BY 1, 2
+                        ON CONFLICT (rollup_date, query_norm) DO UPDATE
+                           SET search_count = EXCLUDED.search_count,
+                               user_count = EXCLUDED.user_count,
+                               hit_count = EXCLUDED.hit_count,
+                               last_searched_at = EXCLUDED.last_searched_at
+                    """),
+                    {"since": since},
+                )
+                await db.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"[SEARCH-EVENTS] 롤업 재집계 실패: {e}")
+            return False
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """서버 종료 시 남은 이벤트 적재 후 중지"""
+        self._stopping = True
+        if self._worker is None or self._worker.done():
+            return
+        try:
+            await asyncio.wait_for(self._worker, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[SEARCH-EVENTS] 종료 대기 시간 초과 - 미적재 {self._queue.qsize()}건 유실")
+        except asyncio.CancelledError:
+            pass
+
+
+# 전역 인스턴스
+search_event_sink = SearchEventSink()
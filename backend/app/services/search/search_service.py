@@ -24,9 +24,25 @@ try:
 except ImportError:  # pragma: no cover - 선택 구성 요소가 없을 때를 대비한 방어 코드
     image_embedding_service = None
 from app.services.auth.permission_service import permission_service
+from app.services.auth.container_tree_service import container_tree_service
 from .natural_language_query_processor import natural_language_processor
+from .keyword_index_service import keyword_index_service, normalize_bm25
+from .search_event_sink import SearchEvent, normalize_query, search_event_sink
 from .query_pipeline import process_user_query  # 통합 파이프라인
+from .query_plan import QueryPlan
+from .result_formatter import (
+    NO_PATH_LABEL,
+    KeywordHighlighter,
+    container_path_with_icons,
+    group_results_by_file,
+    highlighter_for,
+    match_type_for,
+)
+from .vector_index_manager import (
+    CHUNK_LIVE_FILE_FILTER, active_compact_spec, rescore_candidate_limit, run_ann_query,
+)
 from app.core.config import settings
+from app.core.profiling import profile_request, stage, measure, run_stage
 
 logger = logging.getLogger(__name__)
 
@@ -42,9 +58,6 @@ class SearchService:
         # 환경설정 기반 임계값 사용 (.env → settings.similarity_threshold)
         self.similarity_threshold = settings.similarity_threshold  # 기본값은 config.py의 기본값 사용
         self.async_session_local = get_async_session_local()
-        self._container_details_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
-        self._all_container_name_cache: Tuple[float, Dict[str, str]] = (0.0, {})
-        self._container_cache_ttl = getattr(settings, "container_cache_ttl_seconds", 300)
         
     async def hybrid_search(
         self,
@@ -53,7 +66,8 @@ class SearchService:
         container_ids: Optional[List[str]] = None,
         max_results: int = 10,
         search_type: str = "hybrid",  # hybrid, vector_only, keyword_only
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        debug_profile: bool = False
     ) -> Dict[str, Any]:
         """
         하이브리드 검색 수행
@@ -65,15 +79,37 @@ class SearchService:
             max_results: 최대 결과 수
             search_type: 검색 타입
             filters: 추가 필터
+            debug_profile: True면 단계별 지연 프로파일을 응답의 "profile" 에 포함
             
         Returns:
             검색 결과
         """
+        with profile_request("search", force=debug_profile) as profile:
+            result = await self._hybrid_search_staged(
+                query, user_emp_no, container_ids, max_results, search_type, filters
+            )
+            if debug_profile and profile is not None:
+                result["profile"] = profile.to_dict()
+            return result
+    
+    async def _hybrid_search_staged(
+        self,
+        query: str,
+        user_emp_no: str,
+        container_ids: Optional[List[str]],
+        max_results: int,
+        search_type: str,
+        filters: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """hybrid_search 본체 - 각 단계를 프로파일러 stage 로 측정"""
+        started = time.perf_counter()
         try:
             # 1. 사용자 권한 확인 및 검색 가능한 컨테이너 확인
-            accessible_containers = await self._get_accessible_containers(
-                user_emp_no, container_ids
-            )
+            with stage("permissions") as span:
+                accessible_containers = await self._get_accessible_containers(
+                    user_emp_no, container_ids
+                )
+                measure(span, accessible_containers)
             
             if not accessible_containers:
                 return {
@@ -84,35 +120,41 @@ class SearchService:
                 }
             
             # 2. 쿼리 전처리
-            processed_query = await self._preprocess_query(query)
+            with stage("preprocess"):
+                processed_query = await self._preprocess_query(
+                    query, with_embedding=search_type != "keyword_only"
+                )
             
             # 3. 검색 타입에 따른 검색 수행
             if search_type == "vector_only":
-                results = await self._vector_search(
+                results = await run_stage("vector", self._vector_search(
                     processed_query, accessible_containers, max_results, filters
-                )
+                ))
             elif search_type == "keyword_only":
-                results = await self._keyword_search(
+                results = await run_stage("keyword", self._keyword_search(
                     processed_query, accessible_containers, max_results, filters
-                )
+                ))
             else:  # hybrid
                 results = await self._hybrid_search_combined(
                     processed_query, accessible_containers, max_results, filters
                 )
             
-            # 4. 검색 기록 저장
-            await self._save_search_history(
-                user_emp_no, query, results, search_type, accessible_containers
-            )
+            # 4. 파일 단위로 그룹화 (검색 화면용)
+            with stage("group") as span:
+                grouped_results = measure(span, await self._group_results_by_file(results))
             
-            # 5. 파일 단위로 그룹화 (검색 화면용)
-            grouped_results = await self._group_results_by_file(results)
+            # 5. 결과 후처리
+            with stage("format") as span:
+                formatted_results = measure(span, await self._format_search_results(grouped_results, user_emp_no, query))
             
-            # 6. 결과 후처리
-            formatted_results = await self._format_search_results(grouped_results, user_emp_no, query)
+            # 6. 컨테이너 이름 매핑
+            with stage("container_names"):
+                accessible_container_names = await self._get_container_friendly_names(accessible_containers)
             
-            # 7. 컨테이너 이름 매핑
-            accessible_container_names = await self._get_container_friendly_names(accessible_containers)
+            # 7. 검색 기록 - 큐에 넣기만 하고 응답은 기다리지 않음 (적재는 search_event_sink)
+            self._record_search_event(
+                user_emp_no, query, search_type, formatted_results, accessible_containers, started
+            )
             
             return {
                 "results": formatted_results,
@@ -120,7 +162,7 @@ class SearchService:
                 "search_type": search_type,
                 "accessible_containers": accessible_containers,
                 "accessible_container_names": accessible_container_names,
-                "query_processed": processed_query,
+                "query_processed": {k: v for k, v in processed_query.items() if k != "query_plan"},
                 "execution_time": datetime.now().isoformat()
             }
             
@@ -140,9 +182,9 @@ class SearchService:
         """
         # 병렬로 각 검색 방식 실행
         vector_results, keyword_results, fulltext_results = await asyncio.gather(
-            self._vector_search(processed_query, container_ids, max_results * 2, filters),
-            self._keyword_search(processed_query, container_ids, max_results * 2, filters),
-            self._fulltext_search(processed_query, container_ids, max_results * 2, filters),
+            run_stage("vector", self._vector_search(processed_query, container_ids, max_results * 2, filters)),
+            run_stage("keyword", self._keyword_search(processed_query, container_ids, max_results * 2, filters)),
+            run_stage("fulltext", self._fulltext_search(processed_query, container_ids, max_results * 2, filters)),
             return_exceptions=True
         )
         
@@ -277,7 +319,15 @@ class SearchService:
                 f"벡터 검색 시작: '{query_text}', 임계값: {dyn_threshold} (기본: {self.similarity_threshold})"
             )
             
-            query_embedding = await self.embedding_service.get_embedding(query_text)
+            # 전처리에서 만든 QueryPlan 의 임베딩 재사용 (요청당 1회)
+            plan = processed_query.get("query_plan")
+            if plan is not None and plan.matches(query_text):
+                query_embedding = await plan.embedding()
+            else:
+                query_embedding = await self.embedding_service.get_embedding(query_text)
+            if not query_embedding:
+                logger.warning("벡터 검색 생략: 질의 임베딩 없음")
+                return []
             
             async with self.async_session_local() as db:
                 # vs_doc_contents_chunks 테이블을 사용한 벡터 검색 (청킹된 임베딩)
@@ -304,6 +354,22 @@ class SearchService:
                     vector_column = "c.chunk_embedding"
                     logger.warning(f"[VECTOR-SEARCH] ⚠️ 레거시 벡터 컬럼 폴백 ({embedding_dim}d)")
                 
+                # 압축 모드: halfvec/binary 인덱스로 후보를 먼저 찾고 아래 쿼리가 float32 원본으로 재채점
+                ann_limit = max_results * 2
+                chunk_source = "vs_doc_contents_chunks c"
+                compact = active_compact_spec("vs_doc_contents_chunks", vector_column.split(".", 1)[1])
+                if compact is not None:
+                    ann_limit = rescore_candidate_limit(max_results * 2)
+                    chunk_source = compact.candidate_subquery(
+                        f"'{embedding_str}'", ann_limit, "c",
+                        # 컨테이너/삭제 필터를 후보 단계에 적용 (재채점 뒤에 걸러져 결과가 줄지 않도록)
+                        extra_where=(
+                            f"(knowledge_container_id = 'DEFAULT_CONTAINER' "
+                            f"OR knowledge_container_id IN ('{container_id_list}')) "
+                            f"AND {CHUNK_LIVE_FILE_FILTER}"
+                        ),
+                    )
+                
                 query_sql = f"""
                     SELECT 
                         c.chunk_sno as id,
@@ -319,7 +385,7 @@ class SearchService:
                         f.path,
                         f.korean_metadata,
                         1 - ({vector_column} <=> '{embedding_str}'::vector) as similarity_score
-                    FROM vs_doc_contents_chunks c
+                    FROM {chunk_source}
                     JOIN tb_file_bss_info f ON c.file_bss_info_sno = f.file_bss_info_sno
                     WHERE c.knowledge_container_id IS NOT NULL 
                         AND c.knowledge_container_id != '' 
@@ -329,14 +395,19 @@ class SearchService:
                         AND {vector_column} IS NOT NULL
                         {provider_filter}
                         AND 1 - ({vector_column} <=> '{embedding_str}'::vector) >= {dyn_threshold}
-                    ORDER BY similarity_score DESC
+                    ORDER BY {vector_column} <=> '{embedding_str}'::vector
                     LIMIT {max_results * 2}
                 """
                 
-                result = await db.execute(text(query_sql))
+                # 거리 오름차순 + LIMIT → 프로바이더별 부분 HNSW 인덱스 사용
+                # (컨테이너/삭제/임계값 필터로 LIMIT 미달이 되지 않도록 iterative scan 또는 정확 검색 폴백)
+                rows = await run_ann_query(
+                    db, text(query_sql), ann_limit=ann_limit, limit=max_results * 2,
+                    sort_key=lambda row: -float(row.similarity_score),
+                )
                 
                 results = []
-                for row in result.fetchall():
+                for row in rows:
                     similarity_score = float(row.similarity_score)
                     
                     # NaN 값 필터링
@@ -416,162 +487,36 @@ class SearchService:
         filters: Optional[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """
-        키워드 검색 (Multilingual textsearch 기반)
+        키워드 검색 (BM25 + pg_trgm 보조 인덱스)
+        
+        변경 사항 (2026-01-08):
+        - ILIKE 전체 스캔 + 행마다 ts_rank() 4회 계산 → keyword_index_service 로 위임
+        - 후보는 tsvector/트라이그램 GIN 인덱스로만 생성, 상한 후 BM25 로 정렬
+        - df/평균 길이는 tb_search_term_stats / tb_search_corpus_stats 사전 집계값 사용
         
         변경 사항 (2025-10-24):
         - 한국어 + 영어 dual tsvector 검색 지원
         - language 감지하여 적절한 tsvector 컬럼 선택
-        - ts_rank()로 정확한 순위 계산
-        
-        변경 사항 (2025-10-16):
-        - kiwipiepy 제거
-        - textsearch_ko를 키워드 검색에도 활용
-        - ts_rank()로 정확한 순위 계산
         """
         try:
             query_text = processed_query["original_text"]
             language = processed_query.get("language", "mixed")  # 언어 정보 가져오기
             
-            # textsearch 쿼리 생성
-            # 예: "인슐린 펌프" → "인슐린 & 펌프"
-            # 예: "Figure 1" → "Figure & 1"
-            ts_query = query_text.replace(' ', ' & ')
-            
-            container_id_list = "', '".join(container_ids)
-            
             logger.info(f"[KEYWORD-SEARCH] 쿼리: '{query_text}', 언어: {language}, 컨테이너: {len(container_ids)}개")
             
             async with self.async_session_local() as db:
-                # 🌍 Multilingual textsearch 기반 키워드 검색
-                # 한국어(korean) + 영어(english) dual configuration 지원
-                
-                # 언어별 검색 조건 구성
-                if language == "en":
-                    # 영어 전용 검색
-                    tsvector_condition = """
-                        s.content_tsvector_en @@ to_tsquery('english', :ts_query)
-                        OR s.keyword_tsvector_en @@ to_tsquery('english', :ts_query)
-                    """
-                    rank_calculation = """
-                        COALESCE(
-                            ts_rank(
-                                s.content_tsvector_en, 
-                                to_tsquery('english', :ts_query)
-                            ) * 2.0,
-                            0.0
-                        ) +
-                        COALESCE(
-                            ts_rank(
-                                s.keyword_tsvector_en, 
-                                to_tsquery('english', :ts_query)
-                            ) * 3.0,
-                            0.0
-                        )
-                    """
-                elif language == "ko":
-                    # 한국어 전용 검색
-                    tsvector_condition = """
-                        s.content_tsvector @@ to_tsquery('korean', :ts_query)
-                        OR s.keyword_tsvector @@ to_tsquery('korean', :ts_query)
-                    """
-                    rank_calculation = """
-                        COALESCE(
-                            ts_rank(
-                                s.content_tsvector, 
-                                to_tsquery('korean', :ts_query)
-                            ) * 2.0,
-                            0.0
-                        ) +
-                        COALESCE(
-                            ts_rank(
-                                s.keyword_tsvector, 
-                                to_tsquery('korean', :ts_query)
-                            ) * 3.0,
-                            0.0
-                        )
-                    """
-                else:  # mixed 또는 language 정보 없음
-                    # 한국어 + 영어 동시 검색 (OR 조건)
-                    tsvector_condition = """
-                        s.content_tsvector @@ to_tsquery('korean', :ts_query)
-                        OR s.keyword_tsvector @@ to_tsquery('korean', :ts_query)
-                        OR s.content_tsvector_en @@ to_tsquery('english', :ts_query)
-                        OR s.keyword_tsvector_en @@ to_tsquery('english', :ts_query)
-                    """
-                    rank_calculation = """
-                        GREATEST(
-                            COALESCE(
-                                ts_rank(s.content_tsvector, to_tsquery('korean', :ts_query)) * 2.0,
-                                0.0
-                            ) +
-                            COALESCE(
-                                ts_rank(s.keyword_tsvector, to_tsquery('korean', :ts_query)) * 3.0,
-                                0.0
-                            ),
-                            COALESCE(
-                                ts_rank(s.content_tsvector_en, to_tsquery('english', :ts_query)) * 2.0,
-                                0.0
-                            ) +
-                            COALESCE(
-                                ts_rank(s.keyword_tsvector_en, to_tsquery('english', :ts_query)) * 3.0,
-                                0.0
-                            )
-                        )
-                    """
-                
-                query_sql = f"""
-                    SELECT 
-                        s.search_doc_id,
-                        s.file_bss_info_sno,
-                        s.knowledge_container_id,
-                        0 as chunk_index,
-                        s.full_content as content,
-                        s.content_summary as main_text,
-                        s.document_title,
-                        s.has_images,
-                        s.image_count,
-                        f.file_lgc_nm,
-                        f.path,
-                        -- ✅ 언어별 ts_rank() 계산
-                        {rank_calculation} as keyword_score
-                    FROM tb_document_search_index s
-                    JOIN tb_file_bss_info f ON s.file_bss_info_sno = f.file_bss_info_sno
-                    WHERE s.knowledge_container_id IS NOT NULL 
-                        AND s.knowledge_container_id != '' 
-                        AND s.knowledge_container_id NOT IN ('NONE', 'None', 'null', 'NULL')
-                        AND (s.knowledge_container_id = 'DEFAULT_CONTAINER' OR s.knowledge_container_id IN ('{container_id_list}'))
-                        AND f.del_yn = 'N'
-                        AND s.indexing_status = 'indexed'
-                        AND (
-                            -- ✅ Multilingual textsearch 매칭 (메인)
-                            {tsvector_condition}
-                            OR 
-                            -- ✅ 보조: 직접 문자열 매칭 (단순 키워드)
-                            s.full_content ILIKE :like_pattern
-                            OR s.document_title ILIKE :like_pattern
-                        )
-                    ORDER BY keyword_score DESC
-                    LIMIT :max_results
-                """
-                
-                like_pattern = f"%{query_text}%"
-                
-                result = await db.execute(
-                    text(query_sql),
-                    {
-                        "ts_query": ts_query,
-                        "like_pattern": like_pattern,
-                        "max_results": max_results * 2
-                    }
+                rows = await keyword_index_service.search(
+                    db,
+                    query_text,
+                    container_ids,
+                    max_results=max_results * 2,
+                    language=language,
                 )
                 
                 results = []
-                for row in result.fetchall():
-                    keyword_score = float(row.keyword_score) if row.keyword_score else 0.0
-                    
-                    # NaN 필터링
-                    if math.isnan(keyword_score) or math.isinf(keyword_score):
-                        keyword_score = 0.0
+                for row in rows:
+                    # BM25 원점수 → 0~1 (NaN/inf 는 0)
+                    keyword_score = normalize_bm25(float(row.keyword_score or 0.0))
                     
                     results.append({
                         "search_doc_id": row.search_doc_id,
@@ -586,7 +531,7 @@ class SearchService:
                         "keyword_score": keyword_score,
                         "file_name": row.file_lgc_nm,
                         "file_path": row.path,
-                        "search_method": "keyword_textsearch",
+                        "search_method": "keyword_bm25",
                         "modality": "text"  # 문서 레벨 검색
                     })
                 
@@ -813,10 +758,15 @@ class SearchService:
             logger.error(f"전문검색 실패: {str(e)}")
             return []
     
-    async def _preprocess_query(self, query: str) -> Dict[str, Any]:
+    async def _preprocess_query(self, query: str, with_embedding: bool = True) -> Dict[str, Any]:
         """
         🚀 통합 질의 처리 파이프라인 사용
         
+        변경 사항 (2026-01-10):
+        - 요청당 QueryPlan 1개 생성 → 결과 dict 의 "query_plan" 으로 검색기에 전달
+        - 임베딩은 키워드 분석과 동시에 백그라운드로 시작하고, 벡터 검색이 plan.embedding() 으로 사용
+          (전처리 단계는 임베딩을 기다리지 않음)
+        
         변경 사항 (2025-10-17):
         - 통합 파이프라인 (query_pipeline.process_user_query) 사용
         - 일관된 불용어 제거 (UNIFIED_STOPWORDS)
@@ -824,7 +774,8 @@ class SearchService:
         """
         try:
             # 통합 파이프라인으로 질의 처리
-            processed = await process_user_query(query, search_type="general")
+            plan = QueryPlan.build(query).prefetch(embedding=with_embedding)
+            processed = await process_user_query(query, search_type="general", plan=plan, with_embedding=False)
             
             logger.info(f"✅ 통합 파이프라인 처리 완료: {processed.processing_time_ms:.1f}ms")
             logger.info(f"  - 의도: {processed.intent} (confidence: {processed.intent_confidence:.2f})")
@@ -849,7 +800,8 @@ class SearchService:
                 # 기존 필드 유지 (하위 호환성)
                 "context_keywords": [],
                 "optimized_keywords": processed.filtered_keywords,
-                "expanded_keywords": processed.filtered_keywords
+                "expanded_keywords": processed.filtered_keywords,
+                "query_plan": plan
             }
             
         except Exception as e:
@@ -896,47 +848,30 @@ class SearchService:
             logger.error(f"접근 가능한 컨테이너 조회 실패: {str(e)}")
             return []
     
-    async def _save_search_history(
+    def _record_search_event(
         self,
         user_emp_no: str,
         query: str,
-        results: List[Dict[str, Any]],
         search_type: str,
-        container_ids: List[str]
-    ):
-        """검색 기록 저장 - 실제 테이블 스키마에 맞춤"""
-        try:
-            async with self.async_session_local() as db:
-                # 실제 테이블 컬럼에 맞춰 검색 기록 저장
-                await db.execute(
-                    text("""
-                        INSERT INTO tb_chat_history (
-                            session_id, user_emp_no, user_message, assistant_response,
-                            search_results, accessible_containers
-                        ) VALUES (
-                            :session_id, :user_emp_no, :user_message, :assistant_response,
-                            :search_results, :accessible_containers
-                        )
-                    """),
-                    {
-                        "session_id": f"search_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                        "user_emp_no": user_emp_no,
-                        "user_message": query,
-                        "assistant_response": f"검색 결과 {len(results)}건 발견",
-                        "search_results": json.dumps({
-                            "search_type": search_type,
-                            "result_count": len(results),
-                            "container_ids": container_ids,
-                            "results": self._clean_results_for_json(results[:5])  # 최대 5개 결과만 저장
-                        }, default=str),  # NaN 등의 값을 문자열로 변환
-                        "accessible_containers": container_ids
-                    }
-                )
-                await db.commit()
-                
-        except Exception as e:
-            logger.error(f"검색 기록 저장 실패: {str(e)}")
-            # 검색 기록 저장 실패해도 검색 자체는 계속 진행
+        results: List[Dict[str, Any]],
+        container_ids: List[str],
+        started: float
+    ) -> None:
+        """검색 이벤트 기록 (논블로킹, 큐 포화 시 유실될 수 있음)"""
+        top_file_ids = []
+        for r in results[:5]:
+            file_id = r.get("file_id") or r.get("file_bss_info_sno")
+            if str(file_id or "").isdigit():
+                top_file_ids.append(int(file_id))
+        search_event_sink.record(SearchEvent(
+            user_emp_no=user_emp_no,
+            query_text=query,
+            search_type=search_type,
+            result_count=len(results),
+            latency_ms=(time.perf_counter() - started) * 1000,
+            container_ids=list(container_ids),
+            top_file_ids=top_file_ids,
+        ))
     
     async def _format_search_results(
         self,
@@ -945,41 +880,38 @@ class SearchService:
         query: str = ""
     ) -> List[Dict[str, Any]]:
         """검색 결과 포맷팅 - API 스키마에 맞게 포맷팅"""
-        formatted = []
+        if not results:
+            return []
         
-        # 컨테이너 상세 정보 가져오기 (데이터베이스에서 실제 이름과 경로 조회)
-        container_ids = []
-        for r in results:
-            container_id = r.get("knowledge_container_id") or r.get("container_id")
-            if container_id:
-                container_ids.append(container_id)
-                logger.info(f"🔍 FORMAT_SEARCH_RESULTS - 결과에서 발견된 container_id: {container_id}")
+        # 컨테이너 표시 정보는 결과가 아닌 컨테이너 단위로 1회만 계산 (트리 스냅샷 기반)
+        container_ids = {
+            r.get("knowledge_container_id") or r.get("container_id")
+            for r in results
+        }
+        container_ids.discard(None)
+        container_ids.discard("")
+        container_details = await self._get_container_details(list(container_ids))
+        container_display: Dict[str, Tuple[str, str]] = {}
+        for container_id, detail in container_details.items():
+            container_name = detail.get("container_name", container_id)
+            # 계층 경로 (full_path 우선, 없으면 container_name)
+            container_path = detail.get("full_path") or container_name
+            container_display[container_id] = (container_name, container_path_with_icons(container_path))
         
-        logger.info(f"🔍 FORMAT_SEARCH_RESULTS - 수집된 container_ids: {container_ids}")
-        container_details = await self._get_container_details(list(set(container_ids)))
-        logger.info(f"🔍 FORMAT_SEARCH_RESULTS - 조회된 container_details: {container_details}")
+        # 하이라이트 정규식은 쿼리당 1회 컴파일
+        highlighter = highlighter_for(query) if query else None
         
+        formatted = []
+        missing_container = 0
         for result in results:
             # 검색 방법 결정
             search_methods = result.get("search_methods", [])
             if not search_methods:
                 search_methods = [result.get("search_method", "unknown")]
+            match_type = match_type_for(search_methods)
             
-            # match_type 결정 (primary search method)
-            match_type = "hybrid"
-            if len(search_methods) == 1:
-                if "vector" in search_methods[0]:
-                    match_type = "vector"
-                elif "keyword" in search_methods[0]:
-                    match_type = "keyword"
-                elif "fulltext" in search_methods[0]:
-                    match_type = "fulltext"
-            
-            # similarity_score 계산 및 추출
-            similarity_score = 0.0
+            # similarity_score 추출 (combined_score → scores.similarity_score → similarity_score → 가중 합)
             scores = result.get("scores", {})
-            
-            # 먼저 combined_score 확인
             if result.get("combined_score"):
                 similarity_score = result.get("combined_score", 0.0)
             elif isinstance(scores, dict) and scores.get("similarity_score"):
@@ -987,100 +919,55 @@ class SearchService:
             elif result.get("similarity_score"):
                 similarity_score = result.get("similarity_score", 0.0)
             else:
-                # 개별 점수들을 조합하여 계산
                 similarity_score = (
-                    result.get("similarity_score", 0.0) * 0.6 +
                     result.get("keyword_score", 0.0) * 0.3 +
                     result.get("fulltext_score", 0.0) * 0.1
                 )
             
-            # NaN 체크
-            if math.isnan(similarity_score):
-                similarity_score = 0.0
-            
-            # ✅ 유사도 점수 정규화: 0.0-1.0 범위로 강제 조정
+            # ✅ 유사도 점수 정규화: 0.0-1.0 범위로 강제 조정 (NaN → 0.0)
             similarity_score = self._normalize_similarity_score(similarity_score)
             
-            # 백분율로 변환 (0-100%)
-            similarity_percentage = similarity_score * 100
-            
             # file_id를 문자열로 변환
             file_id = result.get("file_bss_info_sno") or result.get("file_id")
-            if file_id is not None:
-                file_id = str(file_id)
-            else:
-                file_id = ""
+            file_id = str(file_id) if file_id is not None else ""
             
-            # 제목 결정 - 파일 단위 결과에 맞게 개선
+            # 제목 결정 - 파일명 우선, 없으면 내용 앞부분
+            content = result.get("content", "")
             title = result.get("file_name", "")
             if not title:
-                # 파일명이 없는 경우 내용의 첫 부분을 제목으로 사용
-                content = result.get("content", "")
                 if content:
                     title = content[:50] + "..." if len(content) > 50 else content
                 else:
                     title = "제목 없음"
             
-            # 파일 확장자에 따른 제목 정리
-            if title and "." in title:
-                # 확장자가 있는 경우 확장자 제거하여 표시
-                title_without_ext = title.rsplit(".", 1)[0]
-                if len(title_without_ext) > 100:
-                    title = title_without_ext[:100] + "..."
-                else:
-                    title = title_without_ext
-            elif title and len(title) > 100:
+            # 확장자가 있으면 제거하여 표시 (최대 100자)
+            if "." in title:
+                title = title.rsplit(".", 1)[0]
+            if len(title) > 100:
                 title = title[:100] + "..."
             
-            # 내용 미리보기 - 파일 단위에 맞게 개선
-            content = result.get("content", "")
+            # 내용 미리보기 + 검색 키워드 하이라이트
             content_preview = content[:300] + "..." if len(content) > 300 else content
-            
-            # 검색 키워드 하이라이트 적용
-            if content_preview and query:
-                content_preview = self._highlight_keywords(content_preview, query)
+            if content_preview and highlighter is not None:
+                content_preview = highlighter.highlight(content_preview)
             
             # 청크 정보 추가
             chunk_info = ""
             if result.get("file_level_result") and result.get("chunk_count", 0) > 1:
                 chunk_info = f" (총 {result.get('chunk_count')}개 관련 섹션)"
             
-            # 컨테이너 상세 정보 가져오기
+            # 컨테이너 정보 (미리 계산된 표시 경로)
             container_id = result.get("knowledge_container_id") or result.get("container_id", "")
-            logger.info(f"🔍 하이브리드 검색 결과 처리: doc_id={result.get('search_doc_id')}, container_id={container_id}")
-            logger.info(f"🔍 전체 result 키들: {list(result.keys())}")
-            logger.info(f"🔍 사용 가능한 컨테이너 details: {list(container_details.keys())}")
-            
-            container_detail = container_details.get(container_id, {})
-            logger.info(f"🔍 컨테이너 {container_id}에 대한 detail: {container_detail}")
-            
-            container_name = container_detail.get("container_name", container_id)
-            
-            # 계층 경로 구성 (org_path 우선 사용, 없으면 container_name)
-            container_path = container_detail.get("full_path", "")
-            if not container_path:
-                # full_path가 없으면 container_name 사용
-                container_path = container_name
-            
-            # 경로를 아이콘과 함께 구성
-            container_path_with_icons = self._build_container_path_with_icons(container_path)
-            
-            logger.info(f"🔍 최종 컨테이너 정보: name={container_name}, path={container_path}, with_icons={container_path_with_icons}")
-            
-            # 디버깅 로그 추가
-            logger.info(f"하이브리드 검색 - 컨테이너 정보 - ID: {container_id}, 이름: {container_name}, 경로: {container_path}")
-            logger.info(f"하이브리드 검색 - 아이콘 포함 경로: {container_path_with_icons}")
-            logger.info(f"하이브리드 검색 - container_detail 전체: {container_detail}")
-            
-            # 컨테이너 정보가 비어있는 경우 특별 처리
-            if not container_id:
-                logger.warning(f"컨테이너 ID가 없는 결과: {result}")
-                container_path_with_icons = "📂 경로 없음"
+            if container_id:
+                container_name, container_path = container_display.get(
+                    container_id, (container_id, container_path_with_icons(container_id))
+                )
+            else:
+                missing_container += 1
+                container_name, container_path = container_id, NO_PATH_LABEL
             
-            # 멀티모달 필드 추가
+            # 멀티모달 필드
             modality = result.get("modality", "text")
-            has_images = result.get("has_images", False)
-            image_count = result.get("image_count", 0)
             clip_score = result.get("clip_score")
             
             # document_id 결정 (file_bss_info_sno 사용)
@@ -1095,7 +982,7 @@ class SearchService:
                 "match_type": match_type,
                 "container_id": container_id,
                 "container_name": container_name,  # 사용자 친화적인 컨테이너 이름
-                "container_path": container_path_with_icons,  # 아이콘 포함 계층 경로
+                "container_path": container_path,  # 아이콘 포함 계층 경로
                 "container_icon": "📂",  # 기본 폴더 아이콘
                 "file_path": result.get("file_path"),
                 "metadata": {
@@ -1113,8 +1000,8 @@ class SearchService:
                     "file_name": result.get("file_name")
                 },
                 # 멀티모달 검색 추가 필드
-                "has_images": has_images,
-                "image_count": image_count,
+                "has_images": result.get("has_images", False),
+                "image_count": result.get("image_count", 0),
                 "modality": modality,
             }
             
@@ -1130,7 +1017,6 @@ class SearchService:
                 if chunk_id:
                     formatted_result["chunk_id"] = chunk_id
                     
-                    # blob_key가 있으면 직접 사용 (신규 방식)
                     if blob_key:
                         formatted_result["image_blob_key"] = blob_key
                     else:
@@ -1139,11 +1025,10 @@ class SearchService:
                         page_number = result.get("page_number")
                         doc_id = result.get("file_bss_info_sno") or result.get("document_id")
                         
-                        if doc_id and source_object_ids and len(source_object_ids) > 0:
+                        if doc_id and source_object_ids:
                             # Azure Blob Storage 키 패턴: multimodal/{doc_id}/objects/image_{object_id}_{page_number}.png
-                            object_id = source_object_ids[0]
                             page_num = page_number if page_number is not None else 1
-                            formatted_result["image_blob_key"] = f"multimodal/{doc_id}/objects/image_{object_id}_{page_num}.png"
+                            formatted_result["image_blob_key"] = f"multimodal/{doc_id}/objects/image_{source_object_ids[0]}_{page_num}.png"
 
             # 파일 그룹화 단계에서 선정된 썸네일(있을 경우)을 그대로 노출
             thumb_blob = result.get("thumbnail_blob_key") or result.get("image_blob_key")
@@ -1153,9 +1038,10 @@ class SearchService:
             if thumb_chunk:
                 formatted_result["thumbnail_chunk_id"] = thumb_chunk
             
-            logger.info(f"포맷된 결과: {formatted_result}")
             formatted.append(formatted_result)
         
+        if missing_container:
+            logger.warning(f"컨테이너 ID가 없는 검색 결과 {missing_container}건")
         return formatted
 
 
@@ -1166,48 +1052,70 @@ class SearchService:
         limit: int = 10
     ) -> List[str]:
         """
-        검색 자동완성 제안 - full_content와 document_title에서 추출
+        검색 자동완성 제안
         
-        변경 사항 (2025-10-16):
-        - keywords 컬럼 제거로 인해 full_content와 document_title에서 직접 추출
-        - pg_trgm 인덱스를 활용한 유사도 기반 제안
+        1. 인기 검색어: tb_search_query_rollup (최근 30일, 접두어 일치)
+           - 여러 사용자가 검색한 검색어만 노출 (search_suggestion_min_users)
+        2. 부족하면 접근 가능한 문서 제목 (pg_trgm 인덱스)
         """
         try:
-            accessible_containers = await self._get_accessible_containers(user_emp_no)
-            
-            if not accessible_containers:
-                return []
+            suggestions: List[str] = []
+            prefix = normalize_query(query)
             
             async with self.async_session_local() as db:
-                # full_content와 document_title에서 쿼리와 유사한 단어 추출
-                container_id_list = "', '".join(accessible_containers)
-                query_sql = f"""
-                    SELECT DISTINCT 
-                        s.document_title as suggestion
-                    FROM tb_document_search_index s
-                    JOIN tb_file_bss_info f ON s.file_bss_info_sno = f.file_bss_info_sno
-                    WHERE s.knowledge_container_id IS NOT NULL 
-                        AND s.knowledge_container_id != '' 
-                        AND s.knowledge_container_id NOT IN ('NONE', 'None', 'null', 'NULL')
-                        AND (s.knowledge_container_id = 'DEFAULT_CONTAINER' OR s.knowledge_container_id IN ('{container_id_list}'))
-                        AND f.del_yn = 'N'
-                        AND s.indexing_status = 'indexed'
-                        AND s.document_title IS NOT NULL
-                        AND s.document_title ILIKE :query_pattern
-                    ORDER BY suggestion
-                    LIMIT :limit_count
-                """
+                if prefix:
+                    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    result = await db.execute(
+                        text("""
+                            SELECT query_norm AS suggestion
+                            FROM tb_search_query_rollup
+                            WHERE rollup_date >= CURRENT_DATE - 30
+                                AND query_norm LIKE :prefix_pattern
+                                AND hit_count > 0
+                            GROUP BY query_norm
+                            HAVING SUM(user_count) >= :min_users
+                            ORDER BY SUM(search_count) DESC
+                            LIMIT :limit_count
+                        """),
+                        {
+                            "prefix_pattern": f"{escaped}%",
+                            "min_users": settings.search_suggestion_min_users,
+                            "limit_count": limit
+                        }
+                    )
+                    suggestions = [row.suggestion for row in result.fetchall() if row.suggestion]
+                
+                if len(suggestions) >= limit:
+                    return suggestions
+                
+                accessible_containers = await self._get_accessible_containers(user_emp_no)
+                if not accessible_containers:
+                    return suggestions
                 
                 result = await db.execute(
-                    text(query_sql),
+                    text("""
+                        SELECT DISTINCT 
+                            s.document_title as suggestion
+                        FROM tb_document_search_index s
+                        JOIN tb_file_bss_info f ON s.file_bss_info_sno = f.file_bss_info_sno
+                        WHERE (s.knowledge_container_id = 'DEFAULT_CONTAINER' OR s.knowledge_container_id = ANY(:container_ids))
+                            AND f.del_yn = 'N'
+                            AND s.indexing_status = 'indexed'
+                            AND s.document_title IS NOT NULL
+                            AND s.document_title ILIKE :query_pattern
+                        ORDER BY suggestion
+                        LIMIT :limit_count
+                    """),
                     {
+                        "container_ids": accessible_containers,
                         "query_pattern": f"%{query}%",
                         "limit_count": limit
                     }
                 )
-                
-                suggestions = [row.suggestion for row in result.fetchall() if row.suggestion]
-                return suggestions
+                for row in result.fetchall():
+                    if row.suggestion and row.suggestion not in suggestions:
+                        suggestions.append(row.suggestion)
+                return suggestions[:limit]
                 
         except Exception as e:
             logger.error(f"검색 제안 실패: {str(e)}")
@@ -1219,126 +1127,57 @@ class SearchService:
         각 파일당 최고 점수의 청크만 선택하여 파일 단위 결과 생성
         """
         try:
-            file_groups = {}
-            
-            for result in results:
-                file_id = result.get("file_bss_info_sno")
-                if not file_id:
-                    continue
-                
-                # 점수 계산 (combined_score 또는 개별 점수 사용)
-                score = 0.0
-                if "combined_score" in result:
-                    score = result["combined_score"]
-                else:
-                    # 개별 점수들을 조합
-                    score = (
-                        result.get("similarity_score", 0.0) * 0.6 +
-                        result.get("keyword_score", 0.0) * 0.3 +
-                        result.get("fulltext_score", 0.0) * 0.1
-                    )
-                
-                # NaN 체크
-                if math.isnan(score):
-                    score = 0.0
-                
-                # 파일별로 최고 점수 청크만 유지
-                if file_id not in file_groups or score > file_groups[file_id]["max_score"]:
-                    # 대표 청크 내용 생성 (여러 청크의 내용을 합칠 수도 있음)
-                    representative_content = result.get("content", "")
-                    
-                    file_groups[file_id] = {
-                        "max_score": score,
-                        "representative_result": {
-                            **result,
-                            "combined_score": score,
-                            "content": representative_content,
-                            "chunk_count": 1,  # 나중에 동일 파일의 청크 수를 카운트
-                            "file_level_result": True  # 파일 레벨 결과임을 표시
-                        }
-                    }
-            
-            # 파일별 청크 개수 계산
-            file_chunk_counts = {}
-            for result in results:
-                file_id = result.get("file_bss_info_sno")
-                if file_id:
-                    file_chunk_counts[file_id] = file_chunk_counts.get(file_id, 0) + 1
-            
-            # 청크 개수 정보 추가
-            grouped_results = []
-            for file_id, group_data in file_groups.items():
-                result = group_data["representative_result"]
-                result["chunk_count"] = file_chunk_counts.get(file_id, 1)
-
-                # Thumbnail selection: prefer an image chunk within the same file group
-                # Scan original results for same file_id and find an image modality chunk
-                thumbnail_blob_key = None
-                thumbnail_chunk_id = None
-                for r in results:
-                    if r.get("file_bss_info_sno") != file_id:
-                        continue
-                    # modality may be present or inside metadata_json
-                    modality = r.get("modality")
-                    if not modality and r.get("metadata"):
-                        modality = r.get("metadata", {}).get("modality")
-                    if modality == "image":
-                        # prefer explicit chunk-level blob key if available
-                        # check metadata for blob key/object id/page no
-                        meta = r.get("metadata") or {}
-                        obj_id = meta.get("object_id") or meta.get("objectIdx") or r.get("chunk_index")
-                        page_no = meta.get("page_no", 1)
-                        # common blob key patterns used by pipeline
-                        if file_id:
-                            thumbnail_blob_key = f"multimodal/{file_id}/objects/image_{obj_id}_{page_no}.png"
-                            thumbnail_chunk_id = r.get("chunk_id") or r.get("search_doc_id") or r.get("document_id")
-                            break
-
-                if thumbnail_blob_key:
-                    result["thumbnail_blob_key"] = thumbnail_blob_key
-                    result["thumbnail_chunk_id"] = thumbnail_chunk_id
-
-                grouped_results.append(result)
-            
-            # 점수순으로 정렬
-            grouped_results.sort(key=lambda x: x.get("combined_score", 0.0), reverse=True)
-            
-            logger.info(f"파일 그룹화 완료: {len(results)}개 청크 -> {len(grouped_results)}개 파일")
+            grouped_results = group_results_by_file(results)
+            logger.debug(f"파일 그룹화 완료: {len(results)}개 청크 -> {len(grouped_results)}개 파일")
             return grouped_results
-            
         except Exception as e:
             logger.error(f"파일 그룹화 실패: {str(e)}")
             return results  # 실패시 원본 결과 반환
     
     async def _get_search_analytics(self, period: str = "7d") -> Dict[str, Any]:
-        """검색 분석 정보"""
+        """검색 분석 정보 - 일별 롤업 테이블만 조회 (이벤트 원본 스캔 없음)"""
         try:
             days = {"1d": 1, "7d": 7, "30d": 30, "90d": 90}[period]
             
             async with self.async_session_local() as db:
-                # 검색 통계 쿼리 - 실제 테이블 컬럼 사용
-                analytics_sql = """
-                    SELECT 
-                        COUNT(*) as total_searches,
-                        COUNT(DISTINCT user_emp_no) as unique_users,
-                        0.1 as avg_response_time,
-                        COUNT(CASE WHEN search_results IS NOT NULL 
-                                   AND search_results::jsonb->>'result_count' != '0' 
-                                   THEN 1 END) as successful_searches
-                    FROM tb_chat_history 
-                    WHERE user_message IS NOT NULL
-                        AND search_results IS NOT NULL
-                """
-                
-                result = await db.execute(text(analytics_sql))
+                result = await db.execute(
+                    text("""
+                        SELECT 
+                            COALESCE(SUM(search_count), 0) as total_searches,
+                            COUNT(DISTINCT user_emp_no) as unique_users,
+                            COALESCE(SUM(success_count), 0) as successful_searches,
+                            COALESCE(SUM(total_latency_ms), 0) as total_latency_ms
+                        FROM tb_search_daily_rollup
+                        WHERE rollup_date > CURRENT_DATE - CAST(:days AS integer)
+                    """),
+                    {"days": days}
+                )
                 stats = result.fetchone()
                 
+                top_result = await db.execute(
+                    text("""
+                        SELECT query_norm, SUM(search_count) as search_count
+                        FROM tb_search_query_rollup
+                        WHERE rollup_date > CURRENT_DATE - CAST(:days AS integer)
+                        GROUP BY query_norm
+                        HAVING SUM(user_count) >= :min_users
+                        ORDER BY search_count DESC
+                        LIMIT 10
+                    """),
+                    {"days": days, "min_users": settings.search_suggestion_min_users}
+                )
+                
+                total_searches = int(stats.total_searches or 0)
                 return {
                     "period": period,
-                    "total_searches": stats.total_searches or 0,
+                    "total_searches": total_searches,
                     "unique_users": stats.unique_users or 0,
-                    "avg_response_time_ms": float(stats.avg_response_time or 0) * 1000,  # 초를 밀리초로 변환
-                    "success_rate": (stats.successful_searches / max(stats.total_searches, 1)) * 100,
+                    "avg_response_time_ms": float(stats.total_latency_ms or 0) / max(total_searches, 1),
+                    "success_rate": (int(stats.successful_searches or 0) / max(total_searches, 1)) * 100,
+                    "top_queries": [
+                        {"query": row.query_norm, "count": int(row.search_count)}
+                        for row in top_result.fetchall()
+                    ],
                     "generated_at": datetime.now().isoformat()
                 }
                 
@@ -1415,6 +1254,43 @@ class SearchService:
         """검색 분석 메서드"""
         return await self._get_search_analytics(period)
     
+    async def get_similar_documents(
+        self,
+        file_id: str,
+        user_emp_no: str,
+        limit: int = 10,
+        threshold: float = 0.2
+    ) -> Dict[str, Any]:
+        """유사 문서 ("more like this") - 문서 대표 벡터 기준, 사용자가 볼 수 있는 컨테이너만"""
+        from app.services.search.document_vector_service import document_vector_service
+
+        accessible_containers = await self._get_accessible_containers(user_emp_no)
+        async with self.async_session_local() as db:
+            source = (await db.execute(
+                text(
+                    "SELECT file_bss_info_sno, file_lgc_nm, knowledge_container_id "
+                    "FROM tb_file_bss_info WHERE file_bss_info_sno = :file_id AND del_yn = 'N'"
+                ),
+                {"file_id": int(file_id)},
+            )).fetchone()
+
+        if not source or source.knowledge_container_id not in accessible_containers:
+            return {"success": False, "file_id": file_id, "error": "파일을 찾을 수 없습니다.", "results": []}
+
+        results = await document_vector_service.similar_to_document(
+            source.file_bss_info_sno,
+            limit=limit,
+            threshold=threshold,
+            container_ids=accessible_containers,
+        )
+        return {
+            "success": True,
+            "file_id": file_id,
+            "file_name": source.file_lgc_nm,
+            "results": self._clean_results_for_json(results),
+            "total_count": len(results),
+        }
+
     async def reindex_document(
         self,
         file_id: str,
@@ -1452,7 +1328,11 @@ class SearchService:
                     text("DELETE FROM vs_doc_contents_chunks WHERE file_bss_info_sno = :file_id"),
                     {"file_id": file_id}
                 )
-                
+
+                # 문서 대표 벡터도 함께 제거 (재처리 후 다시 계산)
+                from app.services.search.document_vector_service import document_vector_service
+                await document_vector_service.remove_documents([file_id], session=db)
+
                 await db.commit()
             
             # 4. 문서 처리 파이프라인 재실행
@@ -1466,6 +1346,7 @@ class SearchService:
             )
             
             if pipeline_result.get("success"):
+                await document_vector_service.refresh_document(file_id)
                 logger.info(f"문서 재인덱싱 완료: {file_id}")
                 return {
                     "success": True,
@@ -1751,89 +1632,46 @@ class SearchService:
 
     async def _get_container_details(self, container_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        컨테이너 상세 정보 조회 - 사용자별 권한 정보와 계층 경로 포함
+        컨테이너 상세 정보 조회 - 계층 경로 포함 (공유 컨테이너 트리 스냅샷 기반)
         """
         try:
             if not container_ids:
                 logger.info("컨테이너 ID 목록이 비어있습니다.")
                 return {}
 
-            now = time.time()
+            snapshot = await container_tree_service.get_snapshot()
             container_details: Dict[str, Dict[str, Any]] = {}
-            uncached_ids: List[str] = []
-
             for container_id in container_ids:
-                cache_entry = self._container_details_cache.get(container_id)
-                if cache_entry and now - cache_entry[0] <= self._container_cache_ttl:
-                    container_details[container_id] = cache_entry[1]
+                node = snapshot.get(container_id)
+                if node is not None:
+                    container_details[container_id] = {
+                        "container_id": node.container_id,
+                        "container_name": node.container_name,
+                        "parent_container_id": node.parent_container_id,
+                        "full_path": node.display_path or node.container_name,
+                        "hierarchy_level": node.org_level or 1,
+                        "container_type": node.container_type,
+                    }
+                elif container_id == "DEFAULT_CONTAINER":
+                    # 기본 컨테이너 정보 추가
+                    container_details[container_id] = {
+                        "container_id": "DEFAULT_CONTAINER",
+                        "container_name": "기본 문서",
+                        "parent_container_id": None,
+                        "full_path": "기본 문서",
+                        "hierarchy_level": 1,
+                        "container_type": "DEFAULT"
+                    }
                 else:
-                    uncached_ids.append(container_id)
-
-            if not uncached_ids:
-                logger.info("컨테이너 정보 캐시 적중: %s", list(container_details.keys()))
-                return container_details
-
-            logger.info(f"컨테이너 정보 조회 시작(미캐시): {uncached_ids}")
-            container_id_to_name = await self._get_all_container_names()
-
-            async with self.async_session_local() as db:
-                stmt = select(
-                    TbKnowledgeContainers.container_id,
-                    TbKnowledgeContainers.container_name,
-                    TbKnowledgeContainers.parent_container_id,
-                    TbKnowledgeContainers.org_level,
-                    TbKnowledgeContainers.org_path,
-                    TbKnowledgeContainers.container_type
-                ).where(
-                    TbKnowledgeContainers.is_active == True,
-                    TbKnowledgeContainers.container_id.in_(uncached_ids)
-                )
-
-                result = await db.execute(stmt)
-                rows = result.fetchall()
-
-            fetched_ids = set()
-            for row in rows:
-                friendly_path = self._convert_path_ids_to_names(row.org_path, container_id_to_name)
-                detail = {
-                    "container_id": row.container_id,
-                    "container_name": row.container_name,
-                    "parent_container_id": row.parent_container_id,
-                    "full_path": friendly_path or row.container_name,
-                    "hierarchy_level": row.org_level or 1,
-                    "container_type": row.container_type,
-                }
-                container_details[row.container_id] = detail
-                self._container_details_cache[row.container_id] = (now, detail)
-                fetched_ids.add(row.container_id)
-
-            for container_id in uncached_ids:
-                if container_id in fetched_ids:
-                    continue
-                logger.warning(f"컨테이너 {container_id}를 데이터베이스에서 찾을 수 없습니다.")
-                detail = {
-                    "container_id": container_id,
-                    "container_name": container_id,
-                    "parent_container_id": None,
-                    "full_path": container_id,
-                    "hierarchy_level": 1,
-                    "container_type": "UNKNOWN"
-                }
-                container_details[container_id] = detail
-                self._container_details_cache[container_id] = (now, detail)
-
-            # 기본 컨테이너 정보 추가
-            if "DEFAULT_CONTAINER" in container_ids and "DEFAULT_CONTAINER" not in container_details:
-                default_detail = {
-                    "container_id": "DEFAULT_CONTAINER",
-                    "container_name": "기본 문서",
-                    "parent_container_id": None,
-                    "full_path": "기본 문서",
-                    "hierarchy_level": 1,
-                    "container_type": "DEFAULT"
-                }
-                container_details["DEFAULT_CONTAINER"] = default_detail
-                self._container_details_cache["DEFAULT_CONTAINER"] = (now, default_detail)
+                    logger.warning(f"컨테이너 {container_id}를 데이터베이스에서 찾을 수 없습니다.")
+                    container_details[container_id] = {
+                        "container_id": container_id,
+                        "container_name": container_id,
+                        "parent_container_id": None,
+                        "full_path": container_id,
+                        "hierarchy_level": 1,
+                        "container_type": "UNKNOWN"
+                    }
 
             return container_details
 
@@ -1852,22 +1690,9 @@ class SearchService:
             return fallback
 
     async def _get_all_container_names(self) -> Dict[str, str]:
-        """컨테이너 ID → 이름 매핑 (TTL 캐싱)"""
-        cached_ts, cached_map = self._all_container_name_cache
-        now = time.time()
-        if cached_map and now - cached_ts <= self._container_cache_ttl:
-            return cached_map
-
-        async with self.async_session_local() as db:
-            stmt = select(
-                TbKnowledgeContainers.container_id,
-                TbKnowledgeContainers.container_name
-            ).where(TbKnowledgeContainers.is_active == True)
-            result = await db.execute(stmt)
-            mapping = {row.container_id: row.container_name for row in result.fetchall()}
-
-        self._all_container_name_cache = (now, mapping)
-        return mapping
+        """컨테이너 ID → 이름 매핑 (공유 컨테이너 트리 스냅샷)"""
+        snapshot = await container_tree_service.get_snapshot()
+        return snapshot.names()
 
     async def _get_container_friendly_names(self, container_ids: List[str]) -> List[str]:
         """컨테이너 ID들을 사용자 친화적인 이름으로 변환"""
@@ -2034,63 +1859,11 @@ class SearchService:
 
     def _highlight_keywords(self, text: str, query: str, keywords: List[str] = None) -> str:
         """텍스트에서 검색 키워드를 하이라이트 처리"""
-        try:
-            if not text or not query:
-                return text
-            
-            import re
-            
-            # 하이라이트할 키워드 목록 생성
-            highlight_terms = set()
-            
-            # 1. 원본 쿼리 추가
-            highlight_terms.add(query.strip().lower())
-            
-            # 2. 추가 키워드가 있으면 포함
-            if keywords:
-                for keyword in keywords:
-                    if keyword and keyword.strip():
-                        highlight_terms.add(keyword.strip().lower())
-            
-            # 3. 쿼리를 공백으로 분할한 개별 단어들 추가
-            query_words = query.strip().split()
-            for word in query_words:
-                if len(word) >= 2:  # 2글자 이상만 하이라이트
-                    highlight_terms.add(word.lower())
-            
-            # 4. 한국어 형태소 분석 결과가 있으면 활용
-            try:
-                morphemes = korean_nlp_service.extract_morphemes(query)
-                for morpheme in morphemes:
-                    if len(morpheme) >= 2:
-                        highlight_terms.add(morpheme.lower())
-            except:
-                pass
-            
-            # 빈 문자열 제거
-            highlight_terms = {term for term in highlight_terms if term}
-            
-            if not highlight_terms:
-                return text
-            
-            # 정규식 패턴 생성 (대소문자 구분 안함)
-            # 특수문자 이스케이프 처리
-            escaped_terms = [re.escape(term) for term in highlight_terms]
-            pattern = r'\b(' + '|'.join(escaped_terms) + r')\b'
-            
-            # 하이라이트 적용
-            highlighted_text = re.sub(
-                pattern, 
-                r'<mark>\1</mark>', 
-                text, 
-                flags=re.IGNORECASE
-            )
-            
-            return highlighted_text
-            
-        except Exception as e:
-            logger.warning(f"키워드 하이라이트 처리 실패: {e}")
+        if not text or not query:
             return text
+        if keywords:
+            return KeywordHighlighter.from_query(query, keywords).highlight(text)
+        return highlighter_for(query).highlight(text)
 
     def _normalize_similarity_score(self, score: float) -> float:
         """
@@ -2130,84 +1903,10 @@ class SearchService:
     def _build_container_path_with_icons(self, container_path: str) -> str:
         """
         컨테이너 경로에 아이콘을 추가하여 사용자 친화적인 경로 문자열 생성
-        
-        Args:
-            container_path: 원본 컨테이너 경로 (예: "/웅진/CEO직속/인사전략팀")
-            
-        Returns:
-            str: 아이콘이 포함된 경로 (예: "📁 웅진 📁 CEO직속 📂 인사전략팀")
+        (예: "/웅진/CEO직속/인사전략팀" → "📁 웅진 📁 CEO직속 📂 인사전략팀")
         """
-        try:
-            if not container_path:
-                return "📂 경로 없음"
-            
-            # 경로를 '/' 또는 ' > ' 기준으로 분할
-            if '/' in container_path:
-                path_parts = [part.strip() for part in container_path.split('/') if part.strip()]
-            elif ' > ' in container_path:
-                path_parts = [part.strip() for part in container_path.split(' > ') if part.strip()]
-            else:
-                # 단일 컨테이너인 경우
-                return f"📂 {container_path}"
-            
-            if not path_parts:
-                return "📂 경로 없음"
-            
-            # 각 경로 부분에 아이콘 추가
-            icon_path_parts = []
-            for i, part in enumerate(path_parts):
-                if i == len(path_parts) - 1:
-                    # 마지막 (현재) 컨테이너는 열린 폴더 아이콘
-                    icon_path_parts.append(f"📂 {part}")
-                else:
-                    # 상위 컨테이너들은 닫힌 폴더 아이콘
-                    icon_path_parts.append(f"📁 {part}")
-            
-            return " ".join(icon_path_parts)
-            
-        except Exception as e:
-            logger.error(f"컨테이너 경로 아이콘 구성 오류: {e}")
-            return f"📂 {container_path}" if container_path else "📂 경로 없음"
+        return container_path_with_icons(container_path)
 
-    def _convert_path_ids_to_names(self, org_path: str, container_id_to_name: Dict[str, str]) -> str:
-        """
-        컨테이너 ID 경로를 사용자 친화적인 이름 경로로 변환
-        
-        Args:
-            org_path: 컨테이너 ID 경로 (예: "/WJ_ROOT/WJ_CEO/WJ_HR")
-            container_id_to_name: 컨테이너 ID -> 이름 매핑
-            
-        Returns:
-            str: 변환된 경로 (예: "웅진/CEO직속/인사전략팀")
-        """
-        try:
-            if not org_path:
-                return ""
-                
-            # 경로 구분자로 분할
-            if org_path.startswith('/'):
-                org_path = org_path[1:]  # 맨 앞의 '/' 제거
-                
-            path_parts = [part.strip() for part in org_path.split('/') if part.strip()]
-            
-            # 각 컨테이너 ID를 이름으로 변환
-            friendly_parts = []
-            for container_id in path_parts:
-                container_name = container_id_to_name.get(container_id, container_id)
-                # 이모지 제거 (이미 이름에 포함되어 있으면)
-                if container_name.startswith(('🏢', '📁', '📂')):
-                    # 이모지와 공백 제거하여 순수한 이름만 추출
-                    clean_name = container_name[2:].strip()
-                    friendly_parts.append(clean_name)
-                else:
-                    friendly_parts.append(container_name)
-            
-            return "/".join(friendly_parts)
-            
-        except Exception as e:
-            logger.error(f"컨테이너 경로 변환 오류: {e}")
-            return org_path or ""
-    
     def _apply_quality_filter(self, results: List[Dict[str, Any]], processed_query: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         검색 결과 품질 필터링
@@ -0,0 +1,688 @@
+"""
+벡터 인덱스 관리 (pgvector HNSW)
+================================
+
+여러 마이그레이션에서 IVFFlat/HNSW 가 섞여 만들어진 벡터 인덱스를 한 곳에서 관리한다.
+
+- 선언: VECTOR_INDEX_SPECS 에 테이블/컬럼별 목표 인덱스(HNSW, m/ef_construction, 프로바이더 부분 인덱스)를 정의
+- 인벤토리: 카탈로그(pg_attribute/pg_index)에서 벡터 컬럼과 인덱스 현황 조회
+- 계획: 목표와 현황 비교 → 빌드가 필요한 인덱스 / 대체되어 삭제할 인덱스
+- 빌드: CREATE INDEX CONCURRENTLY 로 임시 이름에 온라인 빌드 → 유효성 확인 → 교체 (쓰기 차단 없음)
+- recall 점검: 테이블의 벡터를 질의로 샘플링해 ANN 결과와 정확 검색(인덱스 미사용) 결과의 recall@k 비교
+- 압축 모드(vector_compact_mode=halfvec|binary): 청크 벡터를 halfvec / binary_quantize 식 인덱스로 1단계 후보만
+  찾고 float32 원본으로 재채점. 테이블은 그대로 두고 인덱스 메모리만 줄인다 (halfvec 2배, bit 32배).
+
+IVFFlat 은 빌드 시점 데이터로 리스트를 학습한 뒤 다시 학습하지 않으므로 데이터가 늘수록 recall 이
+떨어진다. HNSW 는 증분 삽입에도 그래프 품질이 유지되어 코퍼스가 커져도 recall/지연이 안정적이다.
+
+CLI: python scripts/vector_indexes.py {inventory|plan|build|recall}
+"""
+from __future__ import annotations
+
+import logging
+import re
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# opclass → 거리 연산자
+DISTANCE_OPERATORS = {
+    "vector_cosine_ops": "<=>",
+    "vector_l2_ops": "<->",
+    "vector_ip_ops": "<#>",
+    "halfvec_cosine_ops": "<=>",
+    "halfvec_l2_ops": "<->",
+    "halfvec_ip_ops": "<#>",
+    "bit_hamming_ops": "<~>",
+}
+
+COMPACT_MODES = ("halfvec", "binary")
+# pgvector hnsw.ef_search 최대값 (1단계 후보 수 상한)
+MAX_EF_SEARCH = 1000
+# 청크 후보 단계용 원본 파일 삭제 필터 - 재채점 쿼리의 파일 JOIN 필터가 압축 후보를 깎아 LIMIT 미달이 되지 않도록
+# 후보 서브쿼리(candidate_subquery extra_where) 안에서 먼저 거른다
+CHUNK_LIVE_FILE_FILTER = (
+    "EXISTS (SELECT 1 FROM tb_file_bss_info lf "
+    "WHERE lf.file_bss_info_sno = vs_doc_contents_chunks.file_bss_info_sno AND lf.del_yn = 'N')"
+)
+# hnsw.iterative_scan 모드 (pgvector 0.8.0 부터)
+ITERATIVE_SCAN_MODES = ("off", "relaxed_order", "strict_order")
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+# PostgreSQL 식별자 최대 길이
+MAX_IDENTIFIER_LENGTH = 63
+REBUILD_SUFFIX = "_rebuild"
+
+VECTOR_COLUMNS_SQL = text("""
+    SELECT c.relname AS table_name,
+           a.attname AS column_name,
+           format_type(a.atttypid, a.atttypmod) AS column_type,
+           GREATEST(c.reltuples, 0)::bigint AS estimated_rows
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_type t ON t.oid = a.atttypid
+    WHERE n.nspname = current_schema()
+      AND c.relkind IN ('r', 'p')
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND t.typname IN ('vector', 'halfvec', 'sparsevec')
+    ORDER BY c.relname, a.attnum
+""")
+
+VECTOR_INDEXES_SQL = text("""
+    SELECT ic.relname AS index_name,
+           c.relname AS table_name,
+           am.amname AS method,
+           a.attname AS column_name,
+           ix.indisvalid AS is_valid,
+           pg_get_expr(ix.indpred, ix.indrelid) AS predicate,
+           ic.reloptions AS options,
+           pg_relation_size(ic.oid) AS size_bytes,
+           pg_get_indexdef(ic.oid) AS definition
+    FROM pg_index ix
+    JOIN pg_class ic ON ic.oid = ix.indexrelid
+    JOIN pg_class c ON c.oid = ix.indrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_am am ON am.oid = ic.relam
+    LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ix.indkey[0]
+    WHERE n.nspname = current_schema()
+      AND am.amname IN ('hnsw', 'ivfflat')
+    ORDER BY c.relname, ic.relname
+""")
+
+INDEX_VALID_SQL = text("""
+    SELECT ix.indisvalid
+    FROM pg_index ix
+    JOIN pg_class ic ON ic.oid = ix.indexrelid
+    JOIN pg_namespace n ON n.oid = ic.relnamespace
+    WHERE n.nspname = current_schema() AND ic.relname = :name
+""")
+
+
+@dataclass(frozen=True)
+class VectorIndexSpec:
+    """목표 벡터 인덱스 1건"""
+    name: str
+    table: str
+    column: str
+    key_column: str  # recall 점검 시 결과 비교용 행 식별 컬럼
+    opclass: str = "vector_cosine_ops"
+    where: Optional[str] = None  # 부분 인덱스 조건 (프로바이더 필터 등) - 질의 WHERE 에 같은 조건이 있어야 사용됨
+    m: Optional[int] = None  # None 이면 settings.vector_index_hnsw_m
+    ef_construction: Optional[int] = None  # None 이면 settings.vector_index_hnsw_ef_construction
+    replaces: Tuple[str, ...] = ()  # 이 인덱스가 만들어지면 삭제할 기존 인덱스
+    quantization: Optional[str] = None  # None(원본 벡터) | halfvec | binary - 압축 식 인덱스
+    dimensions: Optional[int] = None  # 압축 캐스팅 차원 (halfvec(n) / bit(n))
+    variant_of: Optional[str] = None  # 압축 모드에서 대체하는 원본 정밀도 인덱스
+
+    @property
+    def options(self) -> Dict[str, int]:
+        return {
+            "m": int(self.m or settings.vector_index_hnsw_m),
+            "ef_construction": int(self.ef_construction or settings.vector_index_hnsw_ef_construction),
+        }
+
+    @property
+    def distance_operator(self) -> str:
+        return DISTANCE_OPERATORS[self.opclass]
+
+    @property
+    def rescore_operator(self) -> str:
+        """원본 float32 거리 연산자 (압축 인덱스는 원본 인덱스와 같은 코사인 거리로 재채점)"""
+        return "<=>" if self.quantization else self.distance_operator
+
+    @property
+    def indexed_expression(self) -> str:
+        """인덱스 대상 식 - 질의의 ORDER BY 식이 이것과 같아야 인덱스를 사용한다"""
+        if self.quantization == "halfvec":
+            return f"({self.column}::halfvec({self.dimensions}))"
+        if self.quantization == "binary":
+            return f"(binary_quantize({self.column})::bit({self.dimensions}))"
+        return self.column
+
+    def query_expression(self, query_sql: str) -> str:
+        """질의 벡터(SQL 리터럴/바인드 파라미터)를 인덱스 식과 같은 타입으로 변환"""
+        if self.quantization == "halfvec":
+            return f"CAST({query_sql} AS halfvec({self.dimensions}))"
+        if self.quantization == "binary":
+            return f"binary_quantize(CAST({query_sql} AS vector))::bit({self.dimensions})"
+        return f"CAST({query_sql} AS vector)"
+
+    def order_sql(self, query_sql: str) -> str:
+        return f"{self.indexed_expression} {self.distance_operator} {self.query_expression(query_sql)}"
+
+    def candidate_subquery(self, query_sql: str, limit: int, alias: str, extra_where: Optional[str] = None) -> str:
+        """
+        1단계 후보 서브쿼리 (압축 인덱스로 limit 개) - FROM 절의 테이블 자리에 그대로 넣는다.
+        extra_where 는 별칭 없는 컬럼명으로 작성 (컨테이너/문서 필터를 후보 단계에도 적용)
+        """
+        where = f"{self.column} IS NOT NULL"
+        if self.where:
+            where += f" AND {self.where}"
+        if extra_where:
+            where += f" AND ({extra_where})"
+        return (
+            f"(SELECT * FROM {self.table} WHERE {where} "
+            f"ORDER BY {self.order_sql(query_sql)} LIMIT {int(limit)}) {alias}"
+        )
+
+    def create_sql(self, index_name: Optional[str] = None, concurrently: bool = True) -> str:
+        options = ", ".join(f"{key} = {value}" for key, value in self.options.items())
+        sql = (
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{index_name or self.name} "
+            f"ON {self.table} USING hnsw ({self.indexed_expression} {self.opclass}) WITH ({options})"
+        )
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql
+
+    @property
+    def rebuild_name(self) -> str:
+        return self.name[:MAX_IDENTIFIER_LENGTH - len(REBUILD_SUFFIX)] + REBUILD_SUFFIX
+
+
+def _provider_spec(name: str, table: str, column: str, key_column: str, provider_column: str,
+                   provider: str, replaces: Tuple[str, ...] = ()) -> VectorIndexSpec:
+    return VectorIndexSpec(
+        name=name, table=table, column=column, key_column=key_column,
+        where=f"{provider_column} = '{provider}'", replaces=replaces,
+    )
+
+
+def _compact_spec(variant_of: VectorIndexSpec, quantization: str, dimensions: int) -> VectorIndexSpec:
+    suffix = "halfvec" if quantization == "halfvec" else "bq"
+    return VectorIndexSpec(
+        name=variant_of.name.replace("_hnsw", f"_{suffix}"),
+        table=variant_of.table,
+        column=variant_of.column,
+        key_column=variant_of.key_column,
+        opclass="halfvec_cosine_ops" if quantization == "halfvec" else "bit_hamming_ops",
+        where=variant_of.where,
+        quantization=quantization,
+        dimensions=dimensions,
+        variant_of=variant_of.name,
+    )
+
+
+# 검색 경로에서 실제로 조회하는 벡터 컬럼의 목표 인덱스
+VECTOR_INDEX_SPECS: Tuple[VectorIndexSpec, ...] = (
+    # 청크 텍스트 임베딩 - 검색 질의가 embedding_provider 필터를 항상 포함하므로 프로바이더별 부분 인덱스
+    _provider_spec("idx_vs_chunks_azure_1536_hnsw", "vs_doc_contents_chunks", "azure_embedding_1536",
+                   "chunk_sno", "embedding_provider", "azure", replaces=("idx_vs_chunks_azure_1536_ivfflat",)),
+    _provider_spec("idx_vs_chunks_aws_1024_hnsw", "vs_doc_contents_chunks", "aws_embedding_1024",
+                   "chunk_sno", "embedding_provider", "aws", replaces=("idx_vs_chunks_aws_1024_ivfflat",)),
+    VectorIndexSpec("idx_vs_chunks_multimodal_512_hnsw", "vs_doc_contents_chunks", "multimodal_embedding",
+                    "chunk_sno", replaces=("idx_vs_doc_chunks_multimodal_embedding",)),
+    # 멀티모달 임베딩 테이블
+    _provider_spec("idx_doc_embedding_azure_1536_hnsw", "doc_embedding", "azure_vector_1536",
+                   "embedding_id", "provider", "azure", replaces=("idx_doc_embedding_azure_1536_ivfflat",)),
+    _provider_spec("idx_doc_embedding_aws_1024_hnsw", "doc_embedding", "aws_vector_1024",
+                   "embedding_id", "provider", "aws", replaces=("idx_doc_embedding_aws_1024_ivfflat",)),
+    VectorIndexSpec("idx_doc_embedding_azure_clip_hnsw", "doc_embedding", "azure_clip_vector",
+                    "embedding_id", replaces=("idx_doc_embedding_azure_clip_ivfflat",)),
+    VectorIndexSpec("idx_doc_embedding_aws_marengo_512_hnsw", "doc_embedding", "aws_marengo_vector_512",
+                    "embedding_id", replaces=("idx_doc_embedding_aws_marengo_vector_512",)),
+    VectorIndexSpec("idx_doc_embedding_clip_vector", "doc_embedding", "clip_vector", "embedding_id",
+                    m=16, ef_construction=64),
+    # 문서 대표 벡터 / 답변 캐시 / 특허
+    VectorIndexSpec("idx_document_vectors_azure_1536", "tb_document_vectors", "azure_embedding_1536",
+                    "vector_sno", m=16, ef_construction=64),
+    VectorIndexSpec("idx_document_vectors_aws_1024", "tb_document_vectors", "aws_embedding_1024",
+                    "vector_sno", m=16, ef_construction=64),
+    VectorIndexSpec("idx_rag_answer_cache_azure_1536", "tb_rag_answer_cache", "azure_embedding_1536",
+                    "cache_id", m=16, ef_construction=64),
+    VectorIndexSpec("idx_rag_answer_cache_aws_1024", "tb_rag_answer_cache", "aws_embedding_1024",
+                    "cache_id", m=16, ef_construction=64),
+    VectorIndexSpec("idx_patent_embedding_hnsw", "tb_patent_bibliographic_info", "embedding_vector",
+                    "patent_id", replaces=("idx_patent_embedding",)),
+    VectorIndexSpec("idx_patent_claim_embedding", "tb_patent_claim_embeddings", "embedding_vector",
+                    "claim_embedding_id", m=16, ef_construction=64),
+)
+
+# 청크 텍스트 벡터 압축 인덱스 (vector_compact_mode 에 해당하는 것만 활성, 원본 정밀도 인덱스를 대체)
+VECTOR_INDEX_SPECS += tuple(
+    _compact_spec(spec, quantization, dimensions)
+    for spec, dimensions in ((VECTOR_INDEX_SPECS[0], 1536), (VECTOR_INDEX_SPECS[1], 1024))
+    for quantization in COMPACT_MODES
+)
+
+
+@dataclass
+class VectorIndexInfo:
+    name: str
+    table: str
+    column: Optional[str]
+    method: str
+    is_valid: bool
+    predicate: Optional[str] = None
+    options: Dict[str, str] = field(default_factory=dict)
+    size_bytes: int = 0
+    definition: str = ""
+
+
+@dataclass
+class VectorColumnInfo:
+    table: str
+    column: str
+    column_type: str
+    estimated_rows: int = 0
+    indexes: List[VectorIndexInfo] = field(default_factory=list)
+
+
+@dataclass
+class IndexAction:
+    """계획 1건 - build(목표 인덱스 생성/재빌드) 또는 drop(대체된 인덱스 삭제)"""
+    action: str
+    index_name: str
+    table: str
+    reason: str
+    spec: Optional[VectorIndexSpec] = None
+
+
+@dataclass
+class RecallReport:
+    index_name: str
+    k: int
+    ef_search: int
+    samples: int
+    mean_recall: float
+    min_recall: float
+    ann_p50_ms: float
+    exact_p50_ms: float
+
+    @property
+    def passed(self) -> bool:
+        return self.samples > 0 and self.mean_recall >= settings.vector_index_min_recall
+
+
+def _parse_options(raw: Optional[Sequence[str]]) -> Dict[str, str]:
+    options: Dict[str, str] = {}
+    for item in raw or ():
+        key, _, value = str(item).partition("=")
+        options[key] = value
+    return options
+
+
+def _normalize_predicate(predicate: Optional[str]) -> str:
+    """pg_get_expr 출력과 선언 조건 비교용 (괄호/캐스팅/공백 무시)"""
+    if not predicate:
+        return ""
+    normalized = predicate.replace("::text", "").replace("::character varying", "")
+    return "".join(ch for ch in normalized if ch not in "() ").lower()
+
+
+def build_inventory(column_rows: Iterable[Any], index_rows: Iterable[Any]) -> List[VectorColumnInfo]:
+    """카탈로그 조회 결과 → 컬럼별 인덱스 현황"""
+    columns: Dict[Tuple[str, str], VectorColumnInfo] = {}
+    for row in column_rows:
+        columns[(row.table_name, row.column_name)] = VectorColumnInfo(
+            table=row.table_name,
+            column=row.column_name,
+            column_type=row.column_type,
+            estimated_rows=int(row.estimated_rows or 0),
+        )
+    for row in index_rows:
+        info = VectorIndexInfo(
+            name=row.index_name,
+            table=row.table_name,
+            column=row.column_name,
+            method=row.method,
+            is_valid=bool(row.is_valid),
+            predicate=row.predicate,
+            options=_parse_options(row.options),
+            size_bytes=int(row.size_bytes or 0),
+            definition=row.definition or "",
+        )
+        column_name = row.column_name or _expression_column(columns, row.table_name, info.definition)
+        column = columns.setdefault(
+            (row.table_name, column_name or ""),
+            VectorColumnInfo(table=row.table_name, column=column_name or "", column_type="expression"),
+        )
+        column.indexes.append(info)
+    return list(columns.values())
+
+
+def _expression_column(
+    columns: Dict[Tuple[str, str], VectorColumnInfo], table: str, definition: str
+) -> Optional[str]:
+    """식 인덱스(halfvec / binary_quantize)는 indkey 가 0 이라 정의문에서 원본 벡터 컬럼을 찾는다"""
+    for table_name, column_name in columns:
+        if table_name == table and re.search(rf"\b{re.escape(column_name)}\b", definition):
+            return column_name
+    return None
+
+
+def plan_actions(
+    inventory: Sequence[VectorColumnInfo],
+    specs: Sequence[VectorIndexSpec] = VECTOR_INDEX_SPECS,
+    retired: Sequence[VectorIndexSpec] = (),
+) -> List[IndexAction]:
+    """목표 인덱스와 현황 비교 → 빌드/삭제 계획 (없는 테이블/컬럼의 목표는 건너뜀, retired 는 있으면 삭제)"""
+    columns = {(c.table, c.column): c for c in inventory}
+    indexes = {i.name: i for c in inventory for i in c.indexes}
+    actions: List[IndexAction] = []
+
+    for spec in specs:
+        if (spec.table, spec.column) not in columns:
+            continue
+        current = indexes.get(spec.name)
+        reason = None
+        if current is None:
+            reason = "missing"
+        elif not current.is_valid:
+            reason = "invalid (중단된 CONCURRENTLY 빌드)"
+        elif current.method != "hnsw":
+            reason = f"method {current.method} → hnsw"
+        elif _normalize_predicate(current.predicate) != _normalize_predicate(spec.where):
+            reason = f"predicate {current.predicate!r} → {spec.where!r}"
+        else:
+            wanted = {key: str(value) for key, value in spec.options.items()}
+            # WITH 절 없이 만든 인덱스는 pgvector 기본값 (m=16, ef_construction=64)
+            actual = {"m": "16", "ef_construction": "64", **current.options}
+            if any(actual.get(key) != value for key, value in wanted.items()):
+                reason = f"options {current.options or 'default'} → {wanted}"
+        if reason:
+            actions.append(IndexAction("build", spec.name, spec.table, reason, spec))
+
+        for old_name in spec.replaces:
+            if old_name in indexes and old_name != spec.name:
+                actions.append(IndexAction(
+                    "drop", old_name, spec.table, f"{spec.name} 로 대체 ({indexes[old_name].method})", spec
+                ))
+
+    for spec in retired:
+        if spec.name in indexes:
+            actions.append(IndexAction(
+                "drop", spec.name, spec.table,
+                f"vector_compact_mode={settings.vector_compact_mode} 에서 사용하지 않음", spec,
+            ))
+    return actions
+
+
+def _is_active(spec: VectorIndexSpec, mode: str) -> bool:
+    """현재 압축 모드 기준 사용 중인 인덱스인지 (압축 모드면 해당 압축 인덱스가 원본 정밀도 인덱스를 대체)"""
+    if spec.quantization:
+        return spec.quantization == mode
+    return not any(
+        other.variant_of == spec.name and other.quantization == mode for other in VECTOR_INDEX_SPECS
+    )
+
+
+def retired_specs() -> List[VectorIndexSpec]:
+    """현재 압축 모드에서 사용하지 않는 인덱스 (있으면 삭제 대상)"""
+    mode = settings.vector_compact_mode
+    return [spec for spec in VECTOR_INDEX_SPECS if not _is_active(spec, mode)]
+
+
+def select_specs(names: Optional[Iterable[str]] = None) -> List[VectorIndexSpec]:
+    """이름으로 목표 인덱스 선택 (없으면 현재 압축 모드에서 사용하는 전체)"""
+    if not names:
+        mode = settings.vector_compact_mode
+        return [spec for spec in VECTOR_INDEX_SPECS if _is_active(spec, mode)]
+    wanted = set(names)
+    unknown = wanted - {spec.name for spec in VECTOR_INDEX_SPECS}
+    if unknown:
+        raise ValueError(f"알 수 없는 벡터 인덱스: {', '.join(sorted(unknown))}")
+    return [spec for spec in VECTOR_INDEX_SPECS if spec.name in wanted]
+
+
+def active_compact_spec(table: str, column: str) -> Optional[VectorIndexSpec]:
+    """검색 경로용: 현재 압축 모드에서 이 컬럼의 1단계 후보 인덱스 (없으면 None → 원본 벡터 직접 검색)"""
+    mode = settings.vector_compact_mode
+    if mode not in COMPACT_MODES:
+        return None
+    for spec in VECTOR_INDEX_SPECS:
+        if spec.quantization == mode and spec.table == table and spec.column == column:
+            return spec
+    return None
+
+
+def rescore_candidate_limit(limit: int) -> int:
+    """1단계 후보 수 (최종 LIMIT × 배수, 최소값 보장, ef_search 상한 이내)"""
+    candidates = max(limit * max(1, int(settings.vector_compact_rescore_factor)),
+                     int(settings.vector_compact_min_candidates))
+    return min(candidates, MAX_EF_SEARCH)
+
+
+_iterative_scan_supported: Optional[bool] = None
+
+
+def _version_tuple(version: Optional[str]) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version or "")[:3])
+
+
+async def iterative_scan_supported(db: Any) -> bool:
+    """설치된 pgvector 가 hnsw.iterative_scan 을 지원하는지 (프로세스당 1회 조회)"""
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        row = (await db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))).first()
+        _iterative_scan_supported = row is not None and _version_tuple(row[0]) >= ITERATIVE_SCAN_MIN_VERSION
+    return _iterative_scan_supported
+
+
+async def run_ann_query(
+    db: Any,
+    statement: Any,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    ann_limit: int,
+    limit: int,
+    sort_key: Optional[Callable[[Any], Any]] = None,
+    ef_search: Optional[int] = None,
+) -> List[Any]:
+    """
+    HNSW 인덱스를 타는 검색 질의 실행.
+
+    HNSW 스캔은 ef_search 개 후보만 내놓고 컨테이너/권한/문서 범위/임계값 필터는 그 뒤에 적용되므로,
+    범위가 좁은 사용자는 결과가 LIMIT 보다 적거나 비어 버린다. 이를 막기 위해
+    - pgvector 0.8+: hnsw.iterative_scan 으로 필터를 통과한 행이 LIMIT 를 채울 때까지 인덱스를 더 탐색
+      (hnsw.max_scan_tuples 까지). relaxed_order 는 순서가 조금 어긋날 수 있어 sort_key 로 다시 정렬
+    - 미지원 버전: 결과가 limit 미만이면 인덱스 스캔을 끄고 정확 검색으로 1회 재실행 (HNSW 도입 전과 같은 결과)
+
+    설정은 savepoint 안에서 SET LOCAL 하고 savepoint 를 롤백해 되돌리므로 호출자가 넘긴 세션/트랜잭션에 남지 않는다
+    (읽기 전용 질의만 넘길 것). ef_search 는 기본 탐색 폭(없으면 vector_search_hnsw_ef_search) - ann_limit 이상으로 올린다.
+    """
+    base_ef = int(ef_search if ef_search is not None else settings.vector_search_hnsw_ef_search)
+    ef_search = min(max(base_ef, int(ann_limit)), MAX_EF_SEARCH)
+    mode = settings.vector_search_hnsw_iterative_scan
+    savepoint = await db.begin_nested()
+    try:
+        await db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+        iterative = mode in ITERATIVE_SCAN_MODES[1:] and await iterative_scan_supported(db)
+        if iterative:
+            await db.execute(text(f"SET LOCAL hnsw.iterative_scan = {mode}"))
+            await db.execute(text(
+                f"SET LOCAL hnsw.max_scan_tuples = {int(settings.vector_search_hnsw_max_scan_tuples)}"
+            ))
+        rows = list((await db.execute(statement, params)).fetchall())
+        if iterative:
+            if mode == "relaxed_order" and sort_key is not None:
+                rows.sort(key=sort_key)
+        elif len(rows) < limit:
+            logger.debug(f"[VECTOR-INDEX] ANN 결과 부족 ({len(rows)}/{limit}) → 정확 검색 재실행")
+            await db.execute(text("SET LOCAL enable_indexscan = off"))
+            rows = list((await db.execute(statement, params)).fetchall())
+    finally:
+        await savepoint.rollback()
+    return rows
+
+
+def recall_at_k(approx_ids: Sequence[Any], exact_ids: Sequence[Any], k: int) -> float:
+    """정확 검색 상위 k 중 ANN 상위 k 에 포함된 비율"""
+    truth = list(exact_ids)[:k]
+    if not truth:
+        return 1.0
+    found = set(list(approx_ids)[:k])
+    return sum(1 for item in truth if item in found) / len(truth)
+
+
+class VectorIndexManager:
+    """벡터 인덱스 인벤토리 / 온라인 빌드 / recall 점검"""
+
+    def __init__(self, engine: Optional[AsyncEngine] = None):
+        self._engine = engine
+
+    @property
+    def engine(self) -> AsyncEngine:
+        # CREATE INDEX CONCURRENTLY 는 트랜잭션 밖에서 실행해야 하고 수 분 이상 걸릴 수 있으므로
+        # 요청 경로 풀(command_timeout 60초)과 분리된 AUTOCOMMIT 전용 엔진 사용
+        if self._engine is None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            from sqlalchemy.pool import NullPool
+
+            self._engine = create_async_engine(
+                settings.database_url,
+                poolclass=NullPool,
+                isolation_level="AUTOCOMMIT",
+                connect_args={"command_timeout": None, "server_settings": {"jit": "off"}},
+            )
+        return self._engine
+
+    async def inventory(self) -> List[VectorColumnInfo]:
+        async with self.engine.connect() as conn:
+            column_rows = (await conn.execute(VECTOR_COLUMNS_SQL)).fetchall()
+            index_rows = (await conn.execute(VECTOR_INDEXES_SQL)).fetchall()
+        return build_inventory(column_rows, index_rows)
+
+    async def plan(self, names: Optional[Iterable[str]] = None) -> List[IndexAction]:
+        # 이름을 지정하면 해당 인덱스만 (압축 인덱스를 미리 빌드해 recall 을 재 본 뒤 모드 전환 가능)
+        retired = () if names else retired_specs()
+        return plan_actions(await self.inventory(), select_specs(names), retired)
+
+    async def apply(self, names: Optional[Iterable[str]] = None) -> List[IndexAction]:
+        """계획 실행: 목표 인덱스를 먼저 만들고 대체된 인덱스는 그 다음에 삭제"""
+        actions = await self.plan(names)
+        for action in actions:
+            if action.action == "build":
+                await self.build_index(action.spec)
+        for action in actions:
+            if action.action == "drop":
+                await self._drop_concurrently(action.index_name)
+        return actions
+
+    async def build_index(self, spec: VectorIndexSpec) -> None:
+        """임시 이름으로 CONCURRENTLY 빌드 → 유효성 확인 → 기존 인덱스와 교체"""
+        temp_name = spec.rebuild_name
+        async with self.engine.connect() as conn:
+            await self._drop_concurrently(temp_name, conn)  # 이전 실패 잔여물
+            await conn.execute(text(f"SET maintenance_work_mem = '{settings.vector_index_maintenance_work_mem}'"))
+            await conn.execute(text(
+                f"SET max_parallel_maintenance_workers = {int(settings.vector_index_parallel_workers)}"
+            ))
+
+            started = time.perf_counter()
+            logger.info(f"[VECTOR-INDEX] 빌드 시작: {spec.name} ({spec.table}.{spec.column}, {spec.options})")
+            try:
+                await conn.execute(text(spec.create_sql(temp_name)))
+            except Exception:
+                await self._drop_concurrently(temp_name, conn)
+                raise
+
+            if not (await conn.execute(INDEX_VALID_SQL, {"name": temp_name})).scalar():
+                await self._drop_concurrently(temp_name, conn)
+                raise RuntimeError(f"인덱스 빌드 결과가 유효하지 않습니다: {temp_name}")
+
+            # 교체: 기존 삭제 + 이름 변경은 짧은 잠금만 필요
+            await self._drop_concurrently(spec.name, conn)
+            await conn.execute(text(f"ALTER INDEX {temp_name} RENAME TO {spec.name}"))
+            await conn.execute(text(f"ANALYZE {spec.table}"))
+            logger.info(f"[VECTOR-INDEX] 빌드 완료: {spec.name} ({time.perf_counter() - started:.1f}s)")
+
+    async def check_recall(
+        self,
+        spec: VectorIndexSpec,
+        sample_size: Optional[int] = None,
+        k: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> RecallReport:
+        """
+        테이블 벡터를 질의로 샘플링해 ANN(인덱스) vs 정확 검색 recall@k.
+        압축 인덱스는 검색 경로와 같은 2단계(압축 후보 → float32 재채점)로 측정한다.
+        """
+        sample_size = int(sample_size or settings.vector_index_recall_sample_size)
+        k = int(k or settings.vector_index_recall_k)
+        ef_search = max(int(ef_search or settings.vector_search_hnsw_ef_search), k)
+        where = f"{spec.column} IS NOT NULL" + (f" AND {spec.where}" if spec.where else "")
+        sample_sql = text(
+            f"SELECT {spec.key_column} AS key, {spec.column}::text AS vec FROM {spec.table} "
+            f"WHERE {where} ORDER BY random() LIMIT :limit"
+        )
+        # 자기 자신은 제외 (질의 벡터가 항상 1위가 되어 recall 이 부풀려지지 않도록)
+        exclude_self = f"{spec.key_column} <> :key"
+        exact_order = f"{spec.column} {spec.rescore_operator} CAST(:vec AS vector)"
+        if spec.quantization:
+            candidates = rescore_candidate_limit(k)
+            ef_search = min(max(ef_search, candidates), MAX_EF_SEARCH)
+            source = spec.candidate_subquery(":vec", candidates, "c", extra_where=exclude_self)
+            ann_sql = text(f"SELECT {spec.key_column} AS key FROM {source} ORDER BY {exact_order} LIMIT :k")
+        else:
+            ann_sql = text(
+                f"SELECT {spec.key_column} AS key FROM {spec.table} "
+                f"WHERE {where} AND {exclude_self} ORDER BY {spec.order_sql(':vec')} LIMIT :k"
+            )
+        # 정확 검색 기준: 원본 float32 거리 (압축 인덱스도 원본 대비 recall)
+        exact_sql = text(
+            f"SELECT {spec.key_column} AS key FROM {spec.table} "
+            f"WHERE {where} AND {exclude_self} ORDER BY {exact_order} LIMIT :k"
+        )
+
+        recalls: List[float] = []
+        ann_ms: List[float] = []
+        exact_ms: List[float] = []
+        async with self.engine.connect() as conn:
+            samples = (await conn.execute(sample_sql, {"limit": sample_size})).fetchall()
+            await conn.execute(text(f"SET hnsw.ef_search = {ef_search}"))
+            for sample in samples:
+                params = {"key": sample.key, "vec": sample.vec, "k": k}
+
+                await conn.execute(text("SET enable_indexscan = on"))
+                started = time.perf_counter()
+                approx = [row.key for row in (await conn.execute(ann_sql, params)).fetchall()]
+                ann_ms.append((time.perf_counter() - started) * 1000)
+
+                await conn.execute(text("SET enable_indexscan = off"))
+                started = time.perf_counter()
+                exact = [row.key for row in (await conn.execute(exact_sql, params)).fetchall()]
+                exact_ms.append((time.perf_counter() - started) * 1000)
+
+                recalls.append(recall_at_k(approx, exact, k))
+            await conn.execute(text("RESET enable_indexscan"))
+
+        report = RecallReport(
+            index_name=spec.name,
+            k=k,
+            ef_search=ef_search,
+            samples=len(recalls),
+            mean_recall=statistics.fmean(recalls) if recalls else 0.0,
+            min_recall=min(recalls) if recalls else 0.0,
+            ann_p50_ms=statistics.median(ann_ms) if ann_ms else 0.0,
+            exact_p50_ms=statistics.median(exact_ms) if exact_ms else 0.0,
+        )
+        log = logger.info if report.passed else logger.warning
+        log(
+            f"[VECTOR-INDEX] recall@{k} {spec.name}: mean={report.mean_recall:.3f} min={report.min_recall:.3f} "
+            f"(n={report.samples}, ef_search={ef_search}, ann p50={report.ann_p50_ms:.1f}ms, "
+            f"exact p50={report.exact_p50_ms:.1f}ms)"
+        )
+        return report
+
+    async def _drop_concurrently(self, index_name: str, conn: Optional[AsyncConnection] = None) -> None:
+        sql = text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        if conn is not None:
+            await conn.execute(sql)
+            return
+        async with self.engine.connect() as own:
+            await own.execute(sql)
+
+
+# 전역 인스턴스
+vector_index_manager = VectorIndexManager()
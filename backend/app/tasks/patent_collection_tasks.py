@@ -2,6 +2,7 @@
 Celery 특허 수집 작업
 """
 import asyncio
+import time
 from celery import shared_task
 from loguru import logger
 
@@ -9,7 +10,21 @@ from app.core.database import get_async_session_local
 from app.core.config import settings
 from app.services.patent.kipris_client import KIPRISClient
 from app.services.patent.collection_service import PatentCollectionService
-from app.models.document import TbFileBssInfo
+
+
+class _ProgressThrottle:
+    """진행률 갱신 간격 제한 (매 건 DB UPDATE 대신 시간 간격 기준)"""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = max(0.0, interval_seconds)
+        self._last = 0.0
+
+    def due(self, current: int, total: int) -> bool:
+        now = time.monotonic()
+        if current >= total or now - self._last >= self.interval_seconds:
+            self._last = now
+            return True
+        return False
 
 
 @shared_task(bind=True, name="collect_patents_from_kipris")
@@ -50,57 +65,22 @@ def collect_patents_from_kipris(
                 new_count = 0      # 신규 저장된 특허
                 skipped_count = 0  # 이미 존재하여 스킵된 특허
                 errors = 0
+                pdf_targets: list[tuple[str, int]] = []
+                progress = _ProgressThrottle(settings.patent_progress_update_interval_seconds)
 
-                for idx, patent in enumerate(patents, 1):
-                    try:
-                        doc_id, is_new = await service.save_patent_to_database(
-                            patent_data=patent,
-                            container_id=container_id,
-                            user_emp_no=user_emp_no,
-                            auto_generate_embeddings=auto_generate_embeddings,
-                        )
-                        if doc_id:
-                            app_no = patent.get("applicationNumber")
-                            if is_new:
-                                new_count += 1
-                            else:
-                                skipped_count += 1
-
-                            # PDF 다운로드 옵션: 신규뿐 아니라, 기존 URL 특허도 PDF로 업그레이드 가능
-                            if auto_download_pdf and app_no:
-                                try:
-                                    file_row = await session.get(TbFileBssInfo, int(doc_id))
-                                    current_ext = (getattr(file_row, "file_extsn", "") or "").lower() if file_row else ""
-                                    if current_ext != "pdf":
-                                        pdf_success = await service.download_and_upload_patent_pdf(
-                                        application_number=app_no,
-                                        file_sno=doc_id,
-                                        kipris_client=client,
-                                    )
-                                    if pdf_success:
-                                            logger.info(f"✅ PDF 처리 완료: {app_no} (file_sno={doc_id})")
-                                    else:
-                                            logger.warning(f"⚠️ PDF 처리 실패 (서지정보는 유지): {app_no} (file_sno={doc_id})")
-                                except Exception as e:  # noqa: BLE001
-                                    logger.warning(f"⚠️ PDF 업그레이드 체크 중 오류: {app_no} (file_sno={doc_id}): {e}")
-                    except Exception as e:  # noqa: BLE001
-                        logger.error(f"❌ 특허 처리 실패: {e}")
-                        errors += 1
-
-                    # 진행률 업데이트
-                    collected = new_count + skipped_count
+                async def _report(current: int) -> None:
                     await service.update_task_progress(
                         task_id=task_id,
-                        progress_current=idx,
+                        progress_current=current,
                         progress_total=total,
-                        collected_count=collected,
+                        collected_count=new_count + skipped_count,
                         error_count=errors,
                         status="running",
                     )
                     self.update_state(
                         state="PROGRESS",
                         meta={
-                            "current": idx, 
+                            "current": current, 
                             "total": total, 
                             "new": new_count, 
                             "skipped": skipped_count, 
@@ -108,6 +88,51 @@ def collect_patents_from_kipris(
                         },
                     )
 
+                # 2) 배치 저장: 중복 조회/INSERT/임베딩을 배치 단위로 수행
+                batch_size = max(1, settings.patent_ingest_batch_size)
+                for start in range(0, total, batch_size):
+                    batch = patents[start:start + batch_size]
+                    try:
+                        outcomes = await service.save_patents_bulk(
+                            patents=batch,
+                            container_id=container_id,
+                            user_emp_no=user_emp_no,
+                            auto_generate_embeddings=auto_generate_embeddings,
+                        )
+                    except Exception as e:  # noqa: BLE001
+                        logger.error(f"❌ 특허 배치 처리 실패 ({start + 1}~{start + len(batch)}): {e}")
+                        errors += len(batch)
+                        outcomes = []
+
+                    for outcome in outcomes:
+                        if not outcome.file_sno:
+                            errors += 1
+                            continue
+                        if outcome.is_new:
+                            new_count += 1
+                        else:
+                            skipped_count += 1
+                        # PDF 다운로드 옵션: 신규뿐 아니라, 기존 URL 특허도 PDF로 업그레이드 가능
+                        if auto_download_pdf and outcome.file_extsn != "pdf":
+                            pdf_targets.append((outcome.application_number, outcome.file_sno))
+
+                    current = min(start + len(batch), total)
+                    if progress.due(current, total):
+                        await _report(current)
+
+                # 3) PDF 다운로드/업로드: 제한된 동시성으로 병렬 처리 후 DB 일괄 갱신
+                if pdf_targets:
+                    try:
+                        pdf_results = await service.download_and_upload_patent_pdfs(
+                            targets=pdf_targets,
+                            kipris_client=client,
+                        )
+                        failed = [app_no for app_no, ok in pdf_results.items() if not ok]
+                        if failed:
+                            logger.warning(f"⚠️ PDF 처리 실패 (서지정보는 유지): {len(failed)}건")
+                    except Exception as e:  # noqa: BLE001
+                        logger.warning(f"⚠️ PDF 일괄 처리 중 오류: {e}")
+
                 # 완료 처리
                 await service.update_task_progress(
                     task_id=task_id,
@@ -119,6 +144,12 @@ def collect_patents_from_kipris(
                     status="completed",
                 )
                 logger.info(f"✅ 특허 수집 완료: 신규={new_count}, 스킵={skipped_count}, 오류={errors}")
+                # 청구항 단위 유사도 인덱스 적재는 별도 작업으로 (수집 작업 시간에 임베딩 호출을 더하지 않도록)
+                if auto_generate_embeddings and new_count:
+                    try:
+                        backfill_patent_claim_embeddings.delay()
+                    except Exception as e:  # noqa: BLE001
+                        logger.warning(f"⚠️ 청구항 임베딩 적재 작업 등록 실패: {e}")
                 return {
                     "status": "completed", 
                     "new": new_count,
@@ -142,3 +173,40 @@ def collect_patents_from_kipris(
                 await client.close()
 
     return asyncio.run(_run())
+
+
+@shared_task(name="backfill_patent_claim_embeddings")
+def backfill_patent_claim_embeddings(batch_size: int = 0, max_batches: int = 0):
+    """청구항 전문이 있으나 청구항 임베딩이 없는 특허 적재 (유사 특허 청구항 단위 검색용)"""
+
+    async def _run() -> int:
+        from app.services.patent.similarity_service import patent_similarity_service
+
+        if not patent_similarity_service.enabled:
+            logger.info("⏭️ 로컬 특허 유사도 비활성 - 청구항 임베딩 적재 생략")
+            return 0
+        return await patent_similarity_service.backfill_pending_claims(
+            batch_size=batch_size or None, max_batches=max_batches or None,
+        )
+
+    indexed = asyncio.run(_run())
+    return {"status": "completed", "indexed": indexed}
+
+
+@shared_task(name="rebuild_patent_stats_cube")
+def rebuild_patent_stats_cube():
+    """특허 통계 큐브 전체 재계산 (삭제/수정된 서지정보 반영 - Beat 주기 작업 / 관리자 API)"""
+
+    async def _run() -> None:
+        from app.services.patent.analytics_service import rebuild_stats_cube
+
+        async_session_local = get_async_session_local()
+        async with async_session_local() as session:
+            await rebuild_stats_cube(session)
+            await session.commit()
+
+    started = time.monotonic()
+    asyncio.run(_run())
+    elapsed = time.monotonic() - started
+    logger.info(f"📊 특허 통계 큐브 재계산 완료 ({elapsed:.1f}s)")
+    return {"status": "completed", "elapsed_seconds": round(elapsed, 1)}
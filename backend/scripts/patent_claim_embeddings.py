@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Patent Claim Embedding Backfill Script
+
+청구항 전문(tb_patent_bibliographic_info.claims_text)은 있으나 청구항 임베딩
+(tb_patent_claim_embeddings)이 없는 특허를 배치로 적재한다. 유사 특허 검색의 청구항 단위 경로가 이 테이블을 사용한다.
+수집 작업(collect_patents_from_kipris)이 끝나면 같은 작업(backfill_patent_claim_embeddings)이 자동 등록되며,
+이 스크립트는 최초 적재 / 수동 재실행용이다.
+
+사용 예시:
+  python scripts/patent_claim_embeddings.py
+  python scripts/patent_claim_embeddings.py --batch-size 50 --max-batches 200
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.patent.similarity_service import patent_similarity_service
+
+logger = logging.getLogger("patent_claim_embeddings")
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill patent claim embeddings")
+    parser.add_argument('--batch-size', type=int, help='배치당 특허 수 (기본: patent_claim_backfill_batch_size)')
+    parser.add_argument('--max-batches', type=int, help='최대 배치 수 (기본: patent_claim_backfill_max_batches)')
+    return parser.parse_args()
+
+
+async def main_async(args) -> int:
+    indexed = await patent_similarity_service.backfill_pending_claims(
+        batch_size=args.batch_size, max_batches=args.max_batches,
+    )
+    print(f"청구항 임베딩 적재: {indexed}건")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main_async(parse_args())))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""Search Benchmark Script
+
+기능:
+  - load:    고정 코퍼스(app/evaluation/datasets/search_benchmark.json)를 벤치마크 컨테이너에 적재
+             (결정적 해싱 임베딩, 외부 임베딩 API 불필요)
+  - run:     검색 모드 × 동시성 수준별 recall@k / nDCG@k / MRR, p50/p95/p99 지연 측정 → JSON 리포트
+  - compare: 기준 리포트 대비 품질 하락 / 지연 증가 검출 (회귀 있으면 종료 코드 1)
+
+검색 모드: hybrid, vector, keyword (SearchService.hybrid_search), rag (RAGSearchService),
+          agent:<intent> (검색 에이전트 전략, 예: agent:factual_qa)
+
+사용 예시:
+  python scripts/search_benchmark.py load
+  python scripts/search_benchmark.py run --mode hybrid --mode rag --concurrency 1 --concurrency 8 --output bench.json
+  python scripts/search_benchmark.py compare baseline.json bench.json --max-latency-increase 0.3
+
+로컬 Postgres+pgvector 전용 - 운영 DB 에 실행하지 말 것 (벤치마크 컨테이너/사용자 데이터를 생성·삭제)
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.evaluation.search_benchmark import (
+    BENCHMARK_CONTAINER_ID,
+    BENCHMARK_USER,
+    SEARCH_MODES,
+    HashingEmbedder,
+    compare_reports,
+    corpus_file_map,
+    embedding_dimension_for_provider,
+    fake_embeddings,
+    load_corpus,
+    load_dataset,
+    run_benchmark,
+)
+
+logger = logging.getLogger("search_benchmark")
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+
+def _embedder(args) -> HashingEmbedder:
+    dimension = args.dimension or embedding_dimension_for_provider(settings.get_current_embedding_provider())
+    return HashingEmbedder(dimension)
+
+
+async def run_load(args) -> int:
+    dataset = load_dataset(args.dataset)
+    file_map = await load_corpus(dataset, _embedder(args), args.container, args.user)
+    print(f"적재 완료: 문서 {len(file_map)}건 → 컨테이너 {args.container} (사용자 {args.user})")
+    return 0
+
+
+async def run_run(args) -> int:
+    dataset = load_dataset(args.dataset)
+    file_map = await corpus_file_map(args.container)
+    if not file_map:
+        logger.error(f"컨테이너 {args.container} 에 코퍼스가 없습니다 - 먼저 load 를 실행하세요")
+        return 1
+
+    with fake_embeddings(_embedder(args)):
+        report = await run_benchmark(
+            dataset,
+            file_map,
+            modes=args.mode or ["hybrid", "rag"],
+            concurrency_levels=args.concurrency or [1, 4],
+            k=args.k,
+            repeat=args.repeat,
+            warmup=not args.no_warmup,
+            container_id=args.container,
+            user_emp_no=args.user,
+        )
+
+    for mode, result in report["modes"].items():
+        quality = " ".join(f"{key}={value:.3f}" for key, value in result["quality"].items())
+        print(f"{mode}: {quality}")
+        for level, latency in result["latency"].items():
+            print(
+                f"    {level}: p50={latency['p50_ms']:.1f}ms p95={latency['p95_ms']:.1f}ms "
+                f"p99={latency['p99_ms']:.1f}ms qps={latency['qps']:.1f} errors={latency['errors']}"
+            )
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"리포트 저장: {args.output}")
+    return 0
+
+
+def run_compare(args) -> int:
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    regressions = compare_reports(baseline, current, args.max_quality_drop, args.max_latency_increase)
+    if not regressions:
+        print("회귀 없음")
+        return 0
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Internal search quality / latency benchmark")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(p):
+        p.add_argument('--dataset', type=Path, help='벤치마크 JSON (기본: app/evaluation/datasets/search_benchmark.json)')
+        p.add_argument('--container', default=BENCHMARK_CONTAINER_ID, help='벤치마크 컨테이너 ID')
+        p.add_argument('--user', default=BENCHMARK_USER, help='벤치마크 사용자 사번')
+        p.add_argument('--dimension', type=int, choices=[1024, 1536],
+                       help='해싱 임베딩 차원 (기본: 현재 임베딩 공급자 기준)')
+
+    load = sub.add_parser('load', help='코퍼스 적재')
+    add_common(load)
+
+    run = sub.add_parser('run', help='벤치마크 실행')
+    add_common(run)
+    run.add_argument('--mode', action='append', choices=list(SEARCH_MODES), help='검색 모드 (여러 번 지정 가능)')
+    run.add_argument('--concurrency', action='append', type=int, help='동시 실행 수준 (여러 번 지정 가능)')
+    run.add_argument('--k', type=int, default=10, help='recall@k / nDCG@k')
+    run.add_argument('--repeat', type=int, default=3, help='동시성 수준별 질의 세트 반복 횟수')
+    run.add_argument('--no-warmup', action='store_true', help='워밍업 생략')
+    run.add_argument('--output', help='JSON 리포트 저장 경로')
+
+    compare = sub.add_parser('compare', help='리포트 비교')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--max-quality-drop', type=float, default=0.02, help='허용 품질 하락폭 (절대값)')
+    compare.add_argument('--max-latency-increase', type=float, default=0.2, help='허용 p50/p95 증가율')
+    return parser.parse_args()
+
+
+async def main_async(args) -> int:
+    if args.command == "load":
+        return await run_load(args)
+    return await run_run(args)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.command == "compare":
+        sys.exit(run_compare(args))
+    sys.exit(asyncio.run(main_async(args)))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Vector Index Management Script
+
+기능:
+  - inventory: 벡터 컬럼 / 인덱스(ivfflat·hnsw) 현황, 크기, 유효성
+  - plan:      목표 HNSW 인덱스(vector_index_manager.VECTOR_INDEX_SPECS)와 비교한 빌드/삭제 계획
+  - build:     계획 실행 (CREATE INDEX CONCURRENTLY 온라인 빌드 → 교체 → 대체된 인덱스 삭제)
+  - recall:    샘플 질의로 ANN vs 정확 검색 recall@k / 지연 비교
+               (압축 인덱스는 압축 후보 → float32 재채점 2단계로 측정)
+
+압축 모드 (vector_compact_mode = halfvec | binary):
+  청크 벡터의 halfvec / binary_quantize 식 인덱스(*_halfvec, *_bq)로 후보만 찾고 원본으로 재채점한다.
+  전환 순서: 압축 인덱스를 --index 로 미리 빌드 → recall 확인 → 모드 변경 → plan/build 로 원본 인덱스 삭제
+
+사용 예시:
+  python scripts/vector_indexes.py inventory
+  python scripts/vector_indexes.py plan
+  python scripts/vector_indexes.py build --index idx_vs_chunks_azure_1536_hnsw
+  python scripts/vector_indexes.py recall --sample 100 --k 10 --ef-search 80
+  python scripts/vector_indexes.py build --index idx_vs_chunks_azure_1536_halfvec
+  python scripts/vector_indexes.py recall --index idx_vs_chunks_azure_1536_halfvec --index idx_vs_chunks_azure_1536_bq
+
+recall 결과가 vector_index_min_recall 미만이면 종료 코드 1 (배포 후 점검 / 주기 작업용)
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.search.vector_index_manager import select_specs, vector_index_manager
+
+logger = logging.getLogger("vector_indexes")
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+
+async def show_inventory() -> int:
+    for column in await vector_index_manager.inventory():
+        print(f"{column.table}.{column.column} {column.column_type} (~{column.estimated_rows:,} rows)")
+        if not column.indexes:
+            print("    (인덱스 없음 - 순차 검색)")
+        for index in column.indexes:
+            flags = "" if index.is_valid else " INVALID"
+            where = f" WHERE {index.predicate}" if index.predicate else ""
+            options = ", ".join(f"{k}={v}" for k, v in index.options.items()) or "default"
+            print(f"    {index.name}: {index.method} ({options}){where} {index.size_bytes / 1024 / 1024:.1f}MB{flags}")
+    return 0
+
+
+async def show_plan(names) -> int:
+    actions = await vector_index_manager.plan(names)
+    if not actions:
+        print("변경 없음 - 모든 목표 인덱스가 최신입니다")
+    for action in actions:
+        print(f"{action.action.upper():5} {action.index_name} ({action.table}): {action.reason}")
+    return 0
+
+
+async def run_build(names) -> int:
+    actions = await vector_index_manager.apply(names)
+    logger.info(f"완료: {len(actions)}건 ({', '.join(a.index_name for a in actions) or '변경 없음'})")
+    return 0
+
+
+async def run_recall(names, sample, k, ef_search) -> int:
+    inventory = await vector_index_manager.inventory()
+    existing = {index.name for column in inventory for index in column.indexes if index.is_valid}
+    failed = 0
+    for spec in select_specs(names):
+        if spec.name not in existing:
+            logger.warning(f"건너뜀 (인덱스 없음): {spec.name}")
+            continue
+        report = await vector_index_manager.check_recall(spec, sample, k, ef_search)
+        status = "OK" if report.passed else "LOW"
+        print(
+            f"{status:4} {spec.name}: recall@{report.k}={report.mean_recall:.3f} (min {report.min_recall:.3f}, "
+            f"n={report.samples}) ann p50={report.ann_p50_ms:.1f}ms exact p50={report.exact_p50_ms:.1f}ms"
+        )
+        if report.samples and not report.passed:
+            failed += 1
+    return 1 if failed else 0
+
+
+async def main_async(args) -> int:
+    if args.command == "inventory":
+        return await show_inventory()
+    if args.command == "plan":
+        return await show_plan(args.index)
+    if args.command == "build":
+        return await run_build(args.index)
+    return await run_recall(args.index, args.sample, args.k, args.ef_search)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="pgvector HNSW index management")
+    parser.add_argument('command', choices=['inventory', 'plan', 'build', 'recall'])
+    parser.add_argument('--index', action='append', help='대상 인덱스 이름 (여러 번 지정 가능, 기본: 전체)')
+    parser.add_argument('--sample', type=int, help='recall 점검 질의 수')
+    parser.add_argument('--k', type=int, help='recall@k')
+    parser.add_argument('--ef-search', type=int, help='recall 점검 시 hnsw.ef_search')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main_async(parse_args())))
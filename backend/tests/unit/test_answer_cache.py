@@ -0,0 +1,142 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+class _FakeSession:
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        return SimpleNamespace(first=lambda: self.row)
+
+    async def commit(self):
+        pass
+
+
+class _VersionSession(_FakeSession):
+    """컨테이너별 문서 변경 카운터 조회 대역"""
+
+    def __init__(self, versions):
+        super().__init__(None)
+        self.versions = versions
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params))
+        rows = [(cid, self.versions[cid]) for cid in params["container_ids"] if cid in self.versions]
+        return SimpleNamespace(all=lambda: rows)
+
+
+class _FakeEmbedder:
+    async def get_embedding(self, text):
+        return [0.1] * 1024
+
+
+def _container(cid, parent=None, inherit=True):
+    return SimpleNamespace(
+        container_id=cid, container_name=cid, container_type="department", description=None,
+        knowledge_category=None, access_level="internal", org_level=2 if parent else 1,
+        org_path=f"/{cid}", parent_container_id=parent, inherit_parent_permissions=inherit, user_count=0,
+    )
+
+
+def _tree_service(fingerprint):
+    from app.services.auth.container_tree_service import build_snapshot
+
+    snapshot = build_snapshot(
+        [_container("HR"), _container("HR_A", "HR"), _container("SEC", inherit=False)],
+        [
+            SimpleNamespace(user_emp_no="E1", container_id="HR", role_id="MANAGER"),
+            SimpleNamespace(user_emp_no="E2", container_id="SEC", role_id="VIEWER"),
+        ],
+        {"HR": 3, "SEC": 1},
+        fingerprint=fingerprint,
+    )
+
+    class _Tree:
+        async def get_snapshot(self):
+            return snapshot
+
+    return _Tree()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scope_follows_accessible_containers_and_permission_version():
+    from app.services.chat.answer_cache_service import AnswerCacheService
+
+    versions = _VersionSession({"HR": 5})
+    service = AnswerCacheService(
+        session_factory=lambda: versions, embedder=_FakeEmbedder(), tree_service=_tree_service((4, 2, 4)),
+    )
+
+    e1 = await service.resolve_scope("E1", variant="agent")
+    # 요청 컨테이너 중 접근 불가한 것은 범위에서 제외 → 같은 접근 집합이면 같은 키
+    e1_requested = await service.resolve_scope("E1", ["HR", "HR_A", "SEC"], variant="agent")
+    e2 = await service.resolve_scope("E2", variant="agent")
+
+    assert e1.container_ids == ["HR", "HR_A"]
+    assert e1_requested.scope_hash == e1.scope_hash
+    assert e2.scope_hash != e1.scope_hash
+    assert (await service.resolve_scope("E1", variant="agent", params={"max_chunks": 5})).scope_hash != e1.scope_hash
+
+    changed = AnswerCacheService(
+        session_factory=lambda: versions, embedder=_FakeEmbedder(), tree_service=_tree_service((4, 3, 4)),
+    )
+    assert (await changed.resolve_scope("E1", variant="agent")).permission_version != e1.permission_version
+
+    # 문서 수가 같아도 재처리/교체로 컨테이너 변경 카운터가 오르면 코퍼스 버전이 바뀐다
+    versions.versions["HR"] = 6
+    reprocessed = await service.resolve_scope("E1", variant="agent")
+    assert reprocessed.scope_hash == e1.scope_hash and reprocessed.corpus_version != e1.corpus_version
+    assert versions.statements[-1][1] == {"container_ids": ["HR", "HR_A"]}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_scope_is_skipped_when_corpus_versions_are_unavailable():
+    from app.services.chat.answer_cache_service import AnswerCacheService
+
+    class _Broken:
+        async def __aenter__(self):
+            raise RuntimeError("relation tb_container_corpus_versions does not exist")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    service = AnswerCacheService(session_factory=_Broken, embedder=_FakeEmbedder(), tree_service=_tree_service((4, 2, 4)))
+    assert await service.resolve_scope("E1", variant="agent") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_lookup_applies_similarity_threshold(monkeypatch):
+    from app.core.config import settings
+    from app.services.chat.answer_cache_service import AnswerCacheScope, AnswerCacheService
+
+    monkeypatch.setattr(settings, "rag_answer_cache_enabled", True)
+
+    scope = AnswerCacheScope(scope_hash="s", permission_version="p", corpus_version="c")
+    row = SimpleNamespace(
+        cache_id=7, query_text="연차 신청 방법", answer="포털에서 신청합니다.", payload={"intent": "factual_qa"},
+        cited_chunk_ids=["10"], cited_file_ids=[3], similarity=settings.rag_answer_cache_similarity_threshold + 0.01,
+    )
+    session = _FakeSession(row)
+    service = AnswerCacheService(session_factory=lambda: session, embedder=_FakeEmbedder())
+
+    hit = await service.lookup("연차는 어떻게 신청하나요", scope)
+    assert hit.cache_id == 7 and hit.cited_file_ids == [3]
+    sql, params = session.statements[0]
+    assert "aws_embedding_1024" in sql and params["scope_hash"] == "s"
+    assert "hit_count = hit_count + 1" in session.statements[1][0]
+
+    row.similarity = settings.rag_answer_cache_similarity_threshold - 0.05
+    assert await service.lookup("연차는 어떻게 신청하나요", scope) is None
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+def _container(cid, name, parent=None, path=None, level=1, inherit=True):
+    return SimpleNamespace(
+        container_id=cid, container_name=name, container_type="department", description=None,
+        knowledge_category=None, access_level="internal", org_level=level,
+        org_path=path or f"/{cid}", parent_container_id=parent,
+        inherit_parent_permissions=inherit, user_count=0,
+    )
+
+
+def _permission(emp_no, cid, role):
+    return SimpleNamespace(user_emp_no=emp_no, container_id=cid, role_id=role)
+
+
+CONTAINERS = [
+    _container("ROOT", "🏢 웅진"),
+    _container("HR", "인사팀", "ROOT", "/ROOT/HR", 2),
+    _container("HR_A", "채용파트", "HR", "/ROOT/HR/HR_A", 3),
+    _container("SEC", "보안팀", "ROOT", "/ROOT/SEC", 2, inherit=False),
+]
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _counting_service(fingerprint):
+    """DB 적재 메서드를 메모리 데이터로 대체하고 호출 횟수를 센다"""
+    from app.services.auth.container_tree_service import ContainerTreeService
+
+    class _Service(ContainerTreeService):
+        loads = []
+
+        async def _load_fingerprint(self, session):
+            return tuple(fingerprint)
+
+        async def _load_containers(self, session):
+            self.loads.append("containers")
+            return CONTAINERS
+
+        async def _load_permissions(self, session):
+            self.loads.append("permissions")
+            return [_permission("E1", "HR", "MANAGER")]
+
+        async def _load_document_counts(self, session):
+            self.loads.append("documents")
+            return {"HR": 3}
+
+    return _Service(session_factory=_FakeSession, refresh_seconds=0)
+
+
+@pytest.mark.unit
+def test_snapshot_resolves_paths_permissions_and_tree():
+    from app.services.auth.container_tree_service import build_snapshot
+
+    snapshot = build_snapshot(
+        CONTAINERS,
+        [_permission("E1", "ROOT", "ADMIN"), _permission("E2", "HR", "EDITOR")],
+        {"HR": 4},
+    )
+
+    assert snapshot.get("HR_A").display_path == "웅진/인사팀/채용파트"
+    # 상속: inherit_parent_permissions 인 동안 부모의 직접 권한을 그대로 사용
+    assert snapshot.effective_role("E1", "HR_A") == "ADMIN"
+    assert snapshot.effective_role("E1", "SEC") is None
+    # 접근 목록: 직접 권한 + 하위 1단계 상속 (상속 권한은 한 단계 낮아짐)
+    assert snapshot.accessible_containers("E2") == {"HR": ("EDITOR", "direct"), "HR_A": ("VIEWER", "inherited")}
+    assert snapshot.role_summary["HR"] == {"EDITOR": 1}
+
+    tree = snapshot.build_tree(None, lambda n: {"id": n.container_id, "docs": snapshot.document_count(n.container_id)})
+    assert [n["id"] for n in tree] == ["ROOT"]
+    assert [n["id"] for n in tree[0]["children"]] == ["SEC", "HR"]  # (org_level, 이름) 순
+    hr = tree[0]["children"][1]
+    assert hr["docs"] == 4 and hr["children"][0]["id"] == "HR_A"
+
+    # 부분 트리: 부모가 목록에 없으면 루트로 올라온다
+    assert [n["id"] for n in snapshot.build_tree(["HR_A"], lambda n: {"id": n.container_id})] == ["HR_A"]
+    assert snapshot.user_etag("E1", "list") != snapshot.user_etag("E2", "list")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_reloads_only_changed_parts():
+    fingerprint = [4, 1, 100]  # 파트별 변경 카운터 (containers, permissions, documents)
+    service = _counting_service(fingerprint)
+
+    first = await service.get_snapshot()
+    assert sorted(service.loads) == ["containers", "documents", "permissions"]
+
+    service.loads.clear()
+    assert await service.get_snapshot() is first  # fingerprint 동일 → 재적재 없음
+    assert service.loads == []
+
+    fingerprint[2] = 101  # 문서 삭제 표시/이동/업로드 → 트리거가 documents 카운터 증가
+    second = await service.get_snapshot()
+    assert service.loads == ["documents"] and second.nodes is first.nodes
+    assert second.user_etag("E1") != first.user_etag("E1")
+
+    service.loads.clear()
+    service.invalidate("permissions")  # 같은 프로세스의 권한 변경 이벤트
+    await service.get_snapshot()
+    assert service.loads == ["permissions"]
+
+
+@pytest.mark.unit
+def test_version_triggers_cover_every_snapshot_column():
+    import importlib.util
+    from pathlib import Path
+
+    from app.services.auth import container_tree_service as module
+
+    path = Path(__file__).resolve().parents[2] / "alembic" / "versions" / "20260112_001_container_tree_versions.py"
+    spec = importlib.util.spec_from_file_location("container_tree_versions", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    events = {(table, part): ev for _name, table, part, ev, _when in migration.TRIGGERS if "UPDATE" in ev}
+
+    # 스냅샷에 적재하는 컬럼(이름 변경/이동/비활성화 포함)이 바뀌면 해당 파트 카운터가 증가해야 한다
+    loaded = (
+        "container_name", "container_type", "description", "knowledge_category", "access_level", "org_level",
+        "org_path", "parent_container_id", "inherit_parent_permissions", "user_count", "is_active",
+    )
+    assert all(col in events[("tb_knowledge_containers", "containers")] for col in loaded)
+    assert all(col in events[("tb_user_permissions", "permissions")]
+               for col in ("user_emp_no", "container_id", "role_id", "is_active"))
+    assert all(col in events[("tb_file_bss_info", "documents")]
+               for col in ("knowledge_container_id", "del_yn", "processing_status"))
+    # 변경 감지는 카운터 행만 읽고 권한 테이블을 스캔하지 않는다
+    sql = str(module.FINGERPRINT_SQL)
+    assert "tb_container_tree_versions" in sql and "tb_user_permissions" not in sql
@@ -0,0 +1,62 @@
+import pytest
+
+
+class _CharEncoding:
+    """글자 1개 = 토큰 1개 인 결정적 인코딩 (tiktoken.Encoding 호환 최소 구현)"""
+    name = "char"
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+@pytest.mark.unit
+def test_pack_prefers_relevance_per_token_and_skips_duplicates():
+    from app.services.chat.context_packer import ContextPacker, PackCandidate, TokenCounter
+
+    encoding = _CharEncoding()
+    packer = ContextPacker(TokenCounter(encoding=encoding))
+    best = "연차 신청은 인사 시스템에서 합니다. " * 3
+    candidates = [
+        PackCandidate(key="a", text=best, score=0.9, overhead_tokens=5),
+        PackCandidate(key="dup", text=best.strip(), score=0.88, overhead_tokens=5),
+        # 관련도는 조금 높지만 매우 긴 청크 vs 짧고 관련 있는 청크
+        PackCandidate(key="long", text="휴가 규정 " + "부록 내용 " * 60, score=0.8, overhead_tokens=5),
+        PackCandidate(key="short", text="반차는 오전/오후 단위로 신청합니다.", score=0.7, overhead_tokens=5),
+        PackCandidate(key="low", text="무관한 공지", score=0.1, overhead_tokens=5),
+    ]
+
+    result = packer.pack(candidates, budget=150, trim=False, source="test")
+
+    keys = [item.candidate.key for item in result.chunks]
+    assert keys[0] == "a" and "short" in keys
+    assert "dup" not in keys and "low" not in keys and "long" not in keys
+    assert result.total_tokens <= 150
+    assert result.total_tokens == sum(item.tokens + 5 for item in result.chunks)
+
+    # 같은 청크 ID 는 다시 인코딩하지 않음
+    calls = encoding.calls
+    packer.pack(candidates, budget=150, trim=False, source="test")
+    assert encoding.calls == calls
+
+
+@pytest.mark.unit
+def test_trim_keeps_sentences_matching_query_terms():
+    from app.services.chat.context_packer import ContextPacker, TokenCounter
+
+    packer = ContextPacker(TokenCounter(encoding=_CharEncoding()))
+    text = "인사 규정 안내입니다. 복리후생은 별도 문서를 참고하세요. 연차는 입사 1년 후 15일이 부여됩니다. 출장비 정산은 재무팀 소관입니다."
+
+    trimmed, tokens, changed = packer.trim_to_relevant(text, ["연차"])
+    assert changed and "연차는 입사 1년 후 15일이 부여됩니다." in trimmed
+    assert "출장비" not in trimmed and tokens < len(text)
+
+    # 예산이 주어지면 관련 문장부터 예산 안에서 채움
+    fitted, fitted_tokens, _ = packer.trim_to_relevant(text, ["연차"], max_tokens=30)
+    assert fitted_tokens <= 30 and "연차" in fitted
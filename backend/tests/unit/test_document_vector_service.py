@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+class _Result:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.rowcount = len(self.rows)
+
+    def fetchall(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows[0] if self.rows else None
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class _FakeSession:
+    """실행된 SQL 을 기록하는 AsyncSession 대용"""
+
+    def __init__(self, statements, rows=()):
+        self.statements = statements
+        self.rows = rows
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def begin_nested(self):
+        session = self
+
+        class _Savepoint:
+            async def rollback(self):
+                session.statements.append(("ROLLBACK TO SAVEPOINT", {}))
+
+        return _Savepoint()
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        if "pg_extension" in sql:
+            return _Result([("0.8.0",)])
+        return _Result(self.rows if "CROSS JOIN LATERAL" in sql else ())
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_recommend_runs_one_ann_query_and_refines_only_candidates(monkeypatch):
+    from app.services.search import vector_index_manager as vim
+    from app.services.search.document_vector_service import DocumentVectorService
+
+    monkeypatch.setattr(vim, "_iterative_scan_supported", None)
+
+    statements = []
+    row = SimpleNamespace(
+        file_id=7, file_name="휴가 규정.pdf", container_id="HR",
+        document_similarity=0.61, max_similarity=0.74, matched_chunks=3,
+    )
+    service = DocumentVectorService(session_factory=lambda: _FakeSession(statements, [row]))
+
+    results = await service.recommend(
+        [0.1] * 1024, limit=3, threshold=0.3, exclude_file_ids=["5", "x"], container_ids=["HR", "IT"]
+    )
+
+    assert results == [{
+        "file_id": 7, "file_name": "휴가 규정.pdf", "container_id": "HR",
+        "max_similarity": 0.74, "document_similarity": 0.61, "matched_chunks": 3,
+    }]
+    queries = [(sql, params) for sql, params in statements if "tb_document_vectors" in sql]
+    assert len(queries) == 1
+    sql, params = queries[0]
+    # 대표 벡터 ANN 은 임계값 없이 거리 정렬 + LIMIT (HNSW 사용 가능), 청크는 후보 문서만 재채점
+    assert "ORDER BY dv.aws_embedding_1024 <=> CAST(:query_vec AS vector)" in sql
+    assert "c.file_bss_info_sno = cand.file_bss_info_sno" in sql
+    assert params["exclude_ids"] == [5] and params["container_ids"] == ["HR", "IT"]
+    assert params["ann_limit"] > params["candidate_limit"] >= 3
+    # 권한/삭제/제외 필터는 ANN LIMIT 전에 적용되고, 탐색 폭은 ann_limit 이상 (세이브포인트 롤백으로 설정 복원)
+    assert sql.index("f.knowledge_container_id = ANY(:container_ids)") < sql.index("LIMIT :ann_limit")
+    settings_sql = [s for s, _ in statements if s.startswith("SET LOCAL")]
+    assert f"SET LOCAL hnsw.ef_search = {params['ann_limit']}" in settings_sql
+    assert statements[-1][0] == "ROLLBACK TO SAVEPOINT"
+
+    # 접근 가능한 컨테이너가 없거나 지원하지 않는 차원이면 DB 를 조회하지 않음
+    statements.clear()
+    assert await service.recommend([0.1] * 1024, container_ids=[]) == []
+    assert await service.recommend([0.1] * 3) == []
+    assert statements == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_refresh_document_rebuilds_centroid_and_medoids_for_each_provider_column():
+    from app.services.search.document_vector_service import DocumentVectorService
+
+    statements = []
+    service = DocumentVectorService(session_factory=lambda: _FakeSession(statements))
+
+    assert await service.refresh_document("42")
+    assert "DELETE FROM tb_document_vectors" in statements[0][0]
+    inserts = [sql for sql, _ in statements if "INSERT INTO tb_document_vectors" in sql]
+    assert len(inserts) == 4  # (centroid, medoid) × (azure 1536, aws 1024)
+    assert all(params["file_id"] == 42 for _, params in statements)
+    assert not await service.refresh_document("not-a-number")
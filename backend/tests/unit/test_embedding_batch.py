@@ -0,0 +1,49 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+
+class _FakeBedrock:
+    """요청당 1건만 받는 Titan invoke_model 대역 - 동시 호출 수를 기록한다"""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body, contentType, accept):
+        text = json.loads(body)["inputText"]
+        with self._lock:
+            self.calls.append(text)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return {"body": io.BytesIO(json.dumps({"embedding": [float(len(text))] * 1024}).encode())}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_bedrock_batch_runs_bounded_concurrent_requests_in_order(monkeypatch):
+    from app.core.config import settings
+    from app.services.core.embedding_service import embedding_service
+
+    bedrock = _FakeBedrock()
+    monkeypatch.setattr(embedding_service, "default_provider", "bedrock")
+    monkeypatch.setattr(embedding_service, "bedrock_client", bedrock)
+    monkeypatch.setattr(embedding_service, "_embedding_cache", {})
+    monkeypatch.setattr(embedding_service, "_normalize_embedding_dimension", lambda vector: vector)
+    monkeypatch.setattr(type(settings), "get_current_embedding_model", lambda self: "amazon.titan-embed-text-v2:0")
+    monkeypatch.setattr(settings, "bedrock_embedding_max_concurrency", 3)
+
+    texts = ["a" * (i + 1) for i in range(9)] + ["a"]
+    vectors = await embedding_service.get_embeddings_batch(texts)
+
+    assert [v[0] for v in vectors] == [float(len(t)) for t in texts]  # 입력 순서 유지
+    assert sorted(bedrock.calls) == sorted(set(texts))  # 같은 텍스트는 한 번만 호출
+    assert 1 < bedrock.peak <= 3  # 동시 호출 (상한 적용)
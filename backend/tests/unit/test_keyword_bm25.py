@@ -0,0 +1,67 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class _FakeDb:
+    """통계/질의어 조회에 고정 값을 돌려주고 실행된 SQL 을 기록"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append((sql, params or {}))
+        if "FROM tb_search_corpus_stats" in sql:
+            return _Result([SimpleNamespace(doc_count=1000, avg_doc_length=250.0, refreshed_at=time.time())])
+        if "LEFT JOIN tb_search_term_stats" in sql:
+            return _Result([SimpleNamespace(term="연차", doc_freq=10), SimpleNamespace(term="신청", doc_freq=900)])
+        return _Result([])
+
+
+@pytest.mark.unit
+def test_bm25_idf_and_normalization():
+    from app.services.search.keyword_index_service import bm25_idf, normalize_bm25, resolve_profiles
+
+    assert bm25_idf(1000, 10) > bm25_idf(1000, 900) > 0
+    assert bm25_idf(0, 0) == 1.0  # 통계 미집계 시 균등 가중치
+    assert normalize_bm25(0.0) == 0.0 and normalize_bm25(float("nan")) == 0.0
+    assert 0.0 < normalize_bm25(3.0) < normalize_bm25(30.0) < 1.0
+    assert [p.name for p in resolve_profiles("en")] == ["en"]
+    assert [p.name for p in resolve_profiles(None)] == ["ko", "en"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_uses_precomputed_stats_and_caps_candidates():
+    from app.services.search.keyword_index_service import KeywordIndexService, bm25_idf
+
+    service = KeywordIndexService()
+    db = _FakeDb()
+    await service.search(db, "연차", ["HR"], max_results=10, language="ko")
+
+    sql, params = db.statements[-1]
+    assert "ts_rank" not in sql and "LIMIT :candidate_limit" in sql
+    assert params["terms_0"] == ["연차", "신청"]
+    assert params["idfs_0"] == [bm25_idf(1000, 10), bm25_idf(1000, 900)]
+    assert params["avgdl_0"] == 250.0 and params["container_ids"] == ["HR"]
+    # 3자 미만 질의는 트라이그램 인덱스를 쓸 수 없으므로 부분 일치 조건 생략
+    assert "ILIKE" not in sql
+
+    await service.search(db, "인슐린 펌프", ["HR"], max_results=10, language="ko")
+    sql, params = db.statements[-1]
+    assert "s.full_content ILIKE :like_pattern" in sql and params["like_pattern"] == "%인슐린 펌프%"
+    # 코퍼스 통계는 프로세스 캐시에서 재사용
+    assert sum("FROM tb_search_corpus_stats" in s for s, _ in db.statements) == 1
@@ -0,0 +1,131 @@
+import asyncio
+import os
+
+import pytest
+
+
+def _payload(size: int) -> bytes:
+    return bytes((i * 7 + i // 251) % 256 for i in range(size))
+
+
+@pytest.mark.unit
+def test_in_memory_multipart_writer_and_parallel_ranged_download(tmp_path):
+    from app.services.core.object_storage import InMemoryObjectStorage, ObjectNotFoundError
+
+    storage = InMemoryObjectStorage(part_size=1000, threshold=4000, concurrency=3)
+    data = _payload(10_500)
+    parts = []
+
+    async def scenario():
+        original = storage._multipart
+
+        def tracking(key, purpose, content_type):
+            upload = original(key, purpose, content_type)
+            upload_part = upload.upload_part
+
+            async def record(number, chunk):
+                parts.append((number, len(chunk)))
+                await upload_part(number, chunk)
+
+            upload.upload_part = record
+            return upload
+
+        storage._multipart = tracking
+        assert await storage.put_bytes("doc/a.bin", data, purpose="raw") == "memory://raw/doc/a.bin"
+        assert await storage.get_bytes("doc/a.bin", purpose="raw") == data
+
+        # 임계값 미만은 단일 PUT
+        await storage.put_bytes("small.txt", b"hello")
+        assert await storage.exists("small.txt") and not await storage.exists("small.txt", purpose="raw")
+
+        target = tmp_path / "out" / "a.bin"
+        await storage.download_file("doc/a.bin", str(target), purpose="raw")
+        chunks = [chunk async for chunk in storage.open_reader("doc/a.bin", purpose="raw", chunk_size=4096)]
+
+        with pytest.raises(ObjectNotFoundError):
+            await storage.download_file("missing", str(tmp_path / "missing.bin"))
+
+        # 예외로 빠져나온 writer 는 커밋되지 않는다
+        with pytest.raises(RuntimeError):
+            async with storage.open_writer("aborted.bin") as writer:
+                await writer.write(_payload(2500))
+                raise RuntimeError("boom")
+        return target, chunks
+
+    target, chunks = asyncio.run(scenario())
+    assert sorted(parts) == [(n, 1000) for n in range(1, 11)] + [(11, 500)]
+    assert target.read_bytes() == data
+    assert [len(c) for c in chunks] == [4096, 4096, 2308] and b"".join(chunks) == data
+    assert not list(tmp_path.glob("*.part")) and not (tmp_path / "missing.bin").exists()
+    assert ("raw", "doc/a.bin") in storage.objects and (None, "aborted.bin") not in storage.objects
+
+
+@pytest.mark.unit
+def test_local_storage_round_trip_and_path_guard(tmp_path):
+    from app.services.core.object_storage import LocalObjectStorage, ObjectNotFoundError
+
+    storage = LocalObjectStorage(root=str(tmp_path / "store"), part_size=1000, threshold=2000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(_payload(5000))
+
+    async def scenario():
+        location = await storage.upload_file(str(source), "c1/raw/source.bin", purpose="raw")
+        async with storage.open_writer("c1/streamed.bin", purpose="derived") as writer:
+            for offset in range(0, 5000, 700):
+                await writer.write(source.read_bytes()[offset:offset + 700])
+        streamed = await storage.get_bytes("c1/streamed.bin", purpose="derived")
+        ranged = await storage._read("c1/raw/source.bin", "raw", 4990, 100)
+        assert await storage.delete("c1/raw/source.bin", purpose="raw")
+        with pytest.raises(ObjectNotFoundError):
+            await storage.size("c1/raw/source.bin", purpose="raw")
+        return location, streamed, ranged
+
+    location, streamed, ranged = asyncio.run(scenario())
+    assert location == str((tmp_path / "store" / "raw" / "c1/raw/source.bin").resolve())
+    assert streamed == source.read_bytes() and ranged == source.read_bytes()[4990:]
+    assert not [p for p in (tmp_path / "store").rglob("*") if p.name.endswith(".part")]
+
+    with pytest.raises(ValueError):
+        storage.location("../../etc/passwd", purpose="raw")
+    assert os.path.basename(storage.location("/abs/key.txt")) == "key.txt"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("auto_container", [True, False])
+def test_azure_storage_creates_missing_container_once(monkeypatch, auto_container):
+    from azure.core.exceptions import ResourceExistsError
+
+    from app.core.config import settings
+    from app.services.core.object_storage import AzureBlobObjectStorage
+
+    monkeypatch.setattr(settings, "azure_blob_enable_auto_container", auto_container)
+    created, uploaded = [], []
+
+    class FakeBlob:
+        def __init__(self, container, blob):
+            self.target = (container, blob)
+
+        async def upload_blob(self, data, overwrite, content_settings):
+            uploaded.append(self.target)
+
+    class FakeService:
+        async def create_container(self, name):
+            created.append(name)
+            if created.count(name) > 1:
+                raise ResourceExistsError("exists")
+
+        def get_blob_client(self, container, blob):
+            return FakeBlob(container, blob)
+
+    storage = AzureBlobObjectStorage(threshold=1000, part_size=1000)
+
+    async def scenario():
+        storage._clients[asyncio.get_running_loop()] = FakeService()
+        await storage.put_bytes("a.json", b"{}", purpose="intermediate")
+        await storage.put_bytes("b.json", b"{}", purpose="intermediate")
+        await storage.put_bytes("c.bin", b"x", purpose="raw")
+
+    asyncio.run(scenario())
+    expected = [settings.azure_blob_container_intermediate, settings.azure_blob_container_raw] if auto_container else []
+    assert created == expected
+    assert len(uploaded) == 3
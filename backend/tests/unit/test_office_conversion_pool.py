@@ -0,0 +1,86 @@
+import asyncio
+import stat
+
+import pytest
+
+
+def _fake_soffice(tmp_path, delay: float = 0.3):
+    """호출 횟수를 기록하고 원본을 --outdir 에 .pdf 로 복사하는 변환기"""
+    calls = tmp_path / "calls.log"
+    script = tmp_path / "soffice"
+    script.write_text(
+        "#!/bin/sh\n"
+        f"echo run >> '{calls}'\n"
+        f"sleep {delay}\n"
+        "while [ $# -gt 0 ]; do\n"
+        "  case \"$1\" in --outdir) out=\"$2\"; shift;; *) src=\"$1\";; esac\n"
+        "  shift\n"
+        "done\n"
+        "name=$(basename \"$src\")\n"
+        "cp \"$src\" \"$out/${name%.*}.pdf\"\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script), lambda: len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+def _pool_class():
+    try:
+        from app.services.document.extraction.office_conversion_pool import OfficeConversionPool
+    except FileNotFoundError as e:  # 패키지 __init__ 의 OfficeConverterService 가 LibreOffice 설치를 요구
+        pytest.skip(str(e))
+    return OfficeConversionPool
+
+
+@pytest.mark.unit
+def test_concurrent_requests_share_one_conversion(tmp_path):
+    OfficeConversionPool = _pool_class()
+
+    soffice, call_count = _fake_soffice(tmp_path)
+    pool = OfficeConversionPool(cache_dir=tmp_path / "cache", workers=2, soffice_path=soffice)
+    source = tmp_path / "report.docx"
+    source.write_bytes(b"docx-content")
+
+    async def scenario():
+        return await asyncio.gather(*(pool.aconvert(source, 'pdf') for _ in range(5)))
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    assert call_count() == 1
+    assert len(set(results)) == 1 and results[0].read_bytes() == b"docx-content"
+    assert results[0].parent == tmp_path / "cache"
+    assert not pool._inflight
+
+
+@pytest.mark.unit
+def test_cache_hit_is_keyed_by_content_and_filter(tmp_path):
+    OfficeConversionPool = _pool_class()
+
+    soffice, call_count = _fake_soffice(tmp_path, delay=0)
+    pool = OfficeConversionPool(cache_dir=tmp_path / "cache", workers=1, soffice_path=soffice)
+    first = tmp_path / "a.pptx"
+    first.write_bytes(b"same")
+    renamed_copy = tmp_path / "b.pptx"
+    renamed_copy.write_bytes(b"same")
+    other = tmp_path / "c.pptx"
+    other.write_bytes(b"other")
+
+    try:
+        assert pool.cached_path(first) is None
+        converted = pool.convert(first)
+        assert call_count() == 1
+
+        # 같은 내용은 파일명이 달라도 변환 없이 완료된 Future 로 반환
+        hit = pool.submit(renamed_copy)
+        assert hit.done() and hit.result() == converted
+        assert pool.cached_path(renamed_copy) == converted
+        assert call_count() == 1
+
+        # 내용 / 변환 필터가 다르면 별도 결과
+        assert pool.convert(other) != converted
+        assert pool.convert(first, 'pdf', 'pdf:impress_pdf_Export') != converted
+        assert call_count() == 3
+    finally:
+        pool.shutdown()
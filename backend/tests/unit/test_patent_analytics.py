@@ -0,0 +1,196 @@
+from collections import Counter
+from datetime import date
+
+import pytest
+
+
+class _FakeAnalytics:
+    enabled = True
+
+    def __init__(self, summary=None, profiles=None):
+        self._summary = summary
+        self._profiles = profiles or {}
+        self.profile_calls = []
+
+    async def trend_summary(self, f):
+        return self._summary
+
+    async def applicant_profile(self, applicant, **kwargs):
+        self.profile_calls.append(applicant)
+        return self._profiles.get(applicant)
+
+
+@pytest.mark.unit
+def test_kipris_fields_map_to_dimension_rows_and_cube_key():
+    from app.services.patent.analytics_service import build_dimension_rows, cube_key, split_ipc_numbers
+
+    assert split_ipc_numbers("H01M 10/052(2010.01)|H01M 4/13(2010.01)| h01m 10/052") == ["H01M 10/052", "H01M 4/13"]
+
+    applicants, ipcs = build_dimension_rows(7, {"applicantName": "삼성전자주식회사|서울대학교", "ipcNumber": "G06N 3/08|H04W 4/00"})
+    assert [a["applicant_name"] for a in applicants] == ["삼성전자주식회사", "서울대학교"]
+    assert ipcs[0]["section"] == "G" and ipcs[0]["class_code"] == "06" and ipcs[0]["is_main_classification"]
+    assert ipcs[1]["main_group"] == "4" and not ipcs[1]["is_main_classification"]
+
+    key = cube_key("KR", date(2023, 6, 14), [a["applicant_name"] for a in applicants], [i["classification_code"] for i in ipcs])
+    assert key == ("KR", "G06N", 2023, "삼성전자주식회사")
+    assert cube_key(None, None, [], []) == ("KR", "", 0, "")
+
+
+@pytest.mark.unit
+def test_grouping_set_rows_fold_into_trend_summary():
+    from app.services.patent.analytics_service import PatentAnalyticsService
+
+    service = PatentAnalyticsService(session_factory=lambda: None, min_local_patents=1, top_n=2)
+    rows = [
+        ("year", "2022", 4), ("year", "2023", 6), ("year", "0", 3),
+        ("ipc", "G06", 7), ("ipc", "H04", 4), ("ipc", "A61", 2), ("ipc", "", 1),
+        ("applicant", "A사", 8), ("applicant", "B사", 5),
+        ("total", "", 13),
+    ]
+    summary = service._fold_trend_rows(rows, "cube")
+
+    assert summary.total == 13
+    assert summary.yearly == [(2022, 4), (2023, 6)]
+    assert summary.ipc_classes == [("G06", 7), ("H04", 4)] and summary.ipc_total == 13
+    assert summary.applicants[0] == ("A사", 8)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_trend_tool_answers_from_local_store_without_live_api():
+    from app.agents.features.patent.tools.analysis.trend_analysis_tool import PatentTrendAnalysisTool
+    from app.services.patent.analytics_service import TrendSummary
+
+    summary = TrendSummary(
+        total=30,
+        yearly=[(2022, 10), (2023, 20)],
+        ipc_classes=[("G06", 18), ("H04", 12)],
+        applicants=[("A사", 20), ("B사", 10)],
+        applicant_titles={"A사": ["배터리 관리 장치"]},
+        ipc_total=30,
+        applicant_total=30,
+    )
+    tool = PatentTrendAnalysisTool()
+    tool._get_analytics = lambda: _FakeAnalytics(summary=summary)
+
+    def _no_live():
+        raise AssertionError("live API must not be called")
+
+    tool._get_aggregator = _no_live
+
+    out = await tool._arun(applicant="A사")
+
+    assert out.success and out.data_source == "local" and out.metrics.provider == "local_db"
+    assert out.yearly_trends[1].growth_rate == 100.0
+    assert out.top_applicants[0].recent_patents == ["배터리 관리 장치"]
+    assert out.tool_name == "patent_trend_analysis" and out.trace_id
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_portfolio_falls_back_to_live_only_for_uncovered_competitor():
+    from app.agents.features.patent.core import PatentData, PatentJurisdiction
+    from app.agents.features.patent.tools.analysis.portfolio_analysis_tool import PatentPortfolioAnalysisTool
+    from app.services.patent.analytics_service import ApplicantProfile
+
+    main = ApplicantProfile(
+        applicant="A사", total=40, yearly=[(2022, 15), (2023, 25)],
+        year_sections={2022: Counter(G=15), 2023: Counter(G=20, H=5)},
+        section_counts=Counter(G=35, H=5), ipc_classes=[("G06", 30), ("H04", 5)],
+    )
+    comp = ApplicantProfile(applicant="B사", total=50, section_counts=Counter(H=50))
+    analytics = _FakeAnalytics(profiles={"A사": main, "B사": comp})
+
+    live_calls = []
+
+    class _Aggregator:
+        async def search(self, query):
+            live_calls.append(query.applicant)
+
+            class _Result:
+                patents = [PatentData(
+                    patent_number="1", title="t", abstract="", applicant="C사",
+                    jurisdiction=PatentJurisdiction.KR, ipc_codes=["G06F 3/01"],
+                )]
+            return _Result()
+
+    tool = PatentPortfolioAnalysisTool()
+    tool._get_analytics = lambda: analytics
+    tool._get_aggregator = lambda: _Aggregator()
+
+    out = await tool._arun(applicant="A사", compare_with=["B사", "C사"])
+
+    assert out.success and out.data_source == "local" and out.total_patents == 40
+    assert live_calls == ["C사"]
+    assert [c.applicant for c in out.competitor_comparison] == ["B사", "C사"]
+    assert out.competitor_comparison[0].total_patents == 50
+    assert out.competitor_comparison[1].overlap_areas == ["물리학"]
+
+
+class _CapturingSession:
+    """실행된 SQL 을 기록하고 첫 조회에 미리 정한 GROUPING SETS 행을 돌려주는 세션 대역"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        rows = self.rows if len(self.statements) == 1 else []
+
+        class _Result:
+            def all(self):
+                return rows
+
+        return _Result()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_keyword_and_cube_paths_count_dimensions_with_the_same_rule():
+    from app.services.patent import analytics_service as module
+
+    # 같은 특허 묶음 - IPC/출원인이 여러 개여도 특허당 주 IPC 1개 + 제1 출원인 1개만 센다
+    fixture = [
+        ("KR", date(2022, 3, 1), ["A사", "B사"], ["G06N 3/08", "H04W 4/00", "A61B 5/00"]),
+        ("KR", date(2023, 5, 2), ["A사"], ["G06F 16/00"]),
+        ("KR", date(2023, 7, 9), ["B사", "A사"], ["H04L 9/32", "G06N 20/00"]),
+    ]
+    cube = Counter(module.cube_key(*patent) for patent in fixture)
+    rows = [("total", "", sum(cube.values()))]
+    for dim, index, fmt in (("year", 2, str), ("ipc", 1, lambda v: v[:3]), ("applicant", 3, str)):
+        grouped = Counter()
+        for key, count in cube.items():
+            grouped[fmt(key[index])] += count
+        rows.extend((dim, k, v) for k, v in grouped.items())
+
+    summaries = {}
+    statements = {}
+    for keyword in (None, "배터리"):
+        session = _CapturingSession(rows)
+        service = module.PatentAnalyticsService(session_factory=lambda: session, min_local_patents=1)
+        summaries[keyword] = await service.trend_summary(module.AnalyticsFilter(keyword=keyword, applicant="A"))
+        statements[keyword] = session.statements[0]
+
+    # 두 경로 모두 같은 집계 쿼리를 쓰고, 키워드 경로의 원천 행은 큐브 재계산과 같은 정의
+    trend_head = module.TREND_SQL.split("FROM")[0]
+    assert all(sql.startswith(trend_head) for sql in statements.values())
+    assert "FROM tb_patent_stats_cube" in statements[None]
+    rows_sql = module.CUBE_ROWS_SQL.split("WHERE {where}")[0]
+    assert rows_sql in statements["배터리"] and rows_sql in module.REBUILD_CUBE_SQL
+    assert "classification_order <=" not in statements["배터리"]
+    assert "applicant_name ILIKE :applicant" in statements["배터리"]
+
+    cube_summary, keyword_summary = summaries[None], summaries["배터리"]
+    assert (cube_summary.source, keyword_summary.source) == ("cube", "sql")
+    for field in ("total", "yearly", "ipc_classes", "applicants", "ipc_total", "applicant_total"):
+        assert getattr(cube_summary, field) == getattr(keyword_summary, field)
+    # 특허 수와 IPC/출원인 차원 합계가 일치 (보조 IPC·공동 출원인 중복 집계 없음)
+    assert cube_summary.total == cube_summary.ipc_total == cube_summary.applicant_total == 3
+    assert cube_summary.ipc_classes[0] == ("G06", 2) and cube_summary.applicants[0] == ("A사", 2)
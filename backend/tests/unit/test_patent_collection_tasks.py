@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+def test_progress_throttle_limits_updates_but_always_reports_completion(monkeypatch):
+    from app.tasks import patent_collection_tasks as tasks
+
+    clock = _Clock()
+    monkeypatch.setattr(tasks, "time", clock)
+    throttle = tasks._ProgressThrottle(10)
+
+    assert throttle.due(1, 5)           # 첫 갱신
+    clock.now += 4
+    assert not throttle.due(2, 5)       # 간격 미달 - 생략
+    clock.now += 6
+    assert throttle.due(3, 5)           # 간격 경과
+    clock.now += 1
+    assert not throttle.due(4, 5)
+    assert throttle.due(5, 5)           # 마지막 건은 간격과 무관하게 강제 갱신
+    assert throttle.due(5, 5)
+
+    unthrottled = tasks._ProgressThrottle(-1)
+    assert unthrottled.interval_seconds == 0.0
+    assert all(unthrottled.due(i, 10) for i in range(1, 4))
+
+
+class _FakeCollectionService:
+    """배치별 결과를 미리 정해 두고 호출을 기록하는 PatentCollectionService 대역"""
+
+    def __init__(self, batch_outcomes):
+        self.batch_outcomes = list(batch_outcomes)
+        self.batches = []
+        self.progress = []
+        self.pdf_targets = None
+
+    async def create_task_record(self, task_id, setting_id, user_emp_no):
+        return None
+
+    async def save_patents_bulk(self, patents, container_id, user_emp_no, auto_generate_embeddings):
+        self.batches.append([p["application_number"] for p in patents])
+        outcome = self.batch_outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def update_task_progress(self, **kwargs):
+        self.progress.append(kwargs)
+
+    async def download_and_upload_patent_pdfs(self, targets, kipris_client):
+        self.pdf_targets = list(targets)
+        return {app_no: True for app_no, _ in targets}
+
+
+def _outcome(app_no, file_sno, is_new=True, file_extsn="url"):
+    return SimpleNamespace(application_number=app_no, file_sno=file_sno, is_new=is_new, file_extsn=file_extsn)
+
+
+def _run_collection(monkeypatch, service, patents, *, batch_size, interval, auto_download_pdf=True):
+    from app.core.config import settings
+    from app.tasks import patent_collection_tasks as tasks
+
+    class _Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class _Client:
+        closed = False
+
+        def __init__(self, api_key):
+            pass
+
+        async def search_patents(self, **kwargs):
+            return patents
+
+        async def close(self):
+            _Client.closed = True
+
+    delayed = []
+    states = []
+    monkeypatch.setattr(tasks, "get_async_session_local", lambda: _Session)
+    monkeypatch.setattr(tasks, "PatentCollectionService", lambda session: service)
+    monkeypatch.setattr(tasks, "KIPRISClient", _Client)
+    monkeypatch.setattr(tasks, "time", _Clock())
+    monkeypatch.setattr(tasks.backfill_patent_claim_embeddings, "delay", lambda *a, **k: delayed.append(a))
+    monkeypatch.setattr(tasks.collect_patents_from_kipris, "update_state", lambda **kwargs: states.append(kwargs))
+    monkeypatch.setattr(settings, "patent_ingest_batch_size", batch_size)
+    monkeypatch.setattr(settings, "patent_progress_update_interval_seconds", interval)
+
+    result = tasks.collect_patents_from_kipris.run(
+        setting_id=1,
+        user_emp_no="E001",
+        container_id="C1",
+        search_config={"ipc_codes": ["H01L"]},
+        max_results=100,
+        auto_download_pdf=auto_download_pdf,
+    )
+    assert _Client.closed
+    return result, states, delayed
+
+
+@pytest.mark.unit
+def test_bulk_collection_counts_partial_failures_and_throttles_progress(monkeypatch):
+    patents = [{"application_number": f"10-{i}"} for i in range(7)]
+    service = _FakeCollectionService([
+        [_outcome("10-0", 11), _outcome("10-1", 12, is_new=False, file_extsn="pdf"), _outcome("10-2", None)],
+        RuntimeError("db down"),
+        [_outcome("10-6", 17, is_new=False)],
+    ])
+
+    result, states, delayed = _run_collection(monkeypatch, service, patents, batch_size=3, interval=60)
+
+    assert service.batches == [["10-0", "10-1", "10-2"], ["10-3", "10-4", "10-5"], ["10-6"]]
+    # 저장 결과 없는 1건 + 실패한 배치 3건
+    assert result == {"status": "completed", "new": 1, "skipped": 2, "errors": 4, "total": 7}
+    # 이미 PDF 인 특허는 다운로드 대상에서 제외
+    assert service.pdf_targets == [("10-0", 11), ("10-6", 17)]
+
+    running = [p for p in service.progress if p["status"] == "running"]
+    # 시계가 멈춰 있으므로 첫 배치 이후 중간 갱신은 생략되고 마지막 배치는 강제 갱신
+    assert [p["progress_current"] for p in running] == [3, 7]
+    assert running[-1]["error_count"] == 4 and running[-1]["collected_count"] == 3
+    assert [s["meta"]["current"] for s in states] == [3, 7]
+    assert service.progress[-1]["status"] == "completed" and service.progress[-1]["collected_count"] == 1
+    assert len(delayed) == 1
+
+
+@pytest.mark.unit
+def test_bulk_collection_reports_every_batch_without_throttle(monkeypatch):
+    patents = [{"application_number": f"10-{i}"} for i in range(5)]
+    service = _FakeCollectionService([
+        [_outcome("10-0", 1, is_new=False), _outcome("10-1", 2, is_new=False)],
+        [_outcome("10-2", 3, is_new=False), _outcome("10-3", 4, is_new=False)],
+        [_outcome("10-4", 5, is_new=False)],
+    ])
+
+    result, states, delayed = _run_collection(
+        monkeypatch, service, patents, batch_size=2, interval=0, auto_download_pdf=False,
+    )
+
+    assert result["new"] == 0 and result["skipped"] == 5 and result["errors"] == 0
+    assert [s["meta"]["current"] for s in states] == [2, 4, 5]
+    assert service.pdf_targets is None
+    # 신규 특허가 없으면 청구항 임베딩 적재 작업을 등록하지 않음
+    assert delayed == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("s3_result, expected", [
+    ("https://bucket.s3/patents/10-1.pdf", "https://bucket.s3/patents/10-1.pdf"),
+    (None, "uploads/patents/10-1.pdf"),            # 업로드 결과 없음 → 기존 상대 경로
+    (RuntimeError("denied"), "/uploads/patents/10-1.pdf"),
+])
+async def test_pdf_fetch_keeps_previous_path_forms(tmp_path, monkeypatch, s3_result, expected):
+    from app.services.patent.collection_service import PatentCollectionService
+
+    monkeypatch.chdir(tmp_path)
+
+    class _Kipris:
+        async def download_full_text_pdf(self, application_number, save_path):
+            with open(save_path, "wb") as f:
+                f.write(b"%PDF")
+            return True
+
+    class _S3:
+        async def upload_file(self, file_path, object_key):
+            if isinstance(s3_result, Exception):
+                raise s3_result
+            return s3_result
+
+    service = PatentCollectionService(session=None)
+    assert await service._fetch_patent_pdf("10-1", _Kipris(), _S3()) == expected
+    assert await service._fetch_patent_pdf("10-1", _Kipris(), None) == "/uploads/patents/10-1.pdf"
@@ -0,0 +1,185 @@
+from datetime import date
+
+import pytest
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+    def fetchall(self):
+        return self._rows
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class _FakeSession:
+    def __init__(self):
+        self.statements = []
+        self.params = []
+        self.rolled_back = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def begin_nested(self):
+        class _Savepoint:
+            async def rollback(self):
+                pass
+
+        return _Savepoint()
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt))
+        self.params.append(params)
+        if "pg_extension" in str(stmt):
+            return _FakeResult([("0.8.0",)])
+        return _FakeResult([])
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def get_embeddings_batch(self, texts, batch_size=100):
+        self.calls.append(list(texts))
+        return [[0.1] * 1536 if t != "bad" else [0.0] * 1536 for t in texts]
+
+
+@pytest.mark.unit
+def test_split_claims_handles_kipris_markers_and_dependency():
+    from app.services.patent.similarity_service import is_dependent_claim, split_claims
+
+    text = "【청구항 1】\n배터리 셀과 제어부를 포함하는 장치.\n【청구항 2】\n제 1 항에 있어서, 상기 제어부는 온도를 측정하는 장치."
+    claims = split_claims(text)
+
+    assert [no for no, _ in claims] == [1, 2]
+    assert not is_dependent_claim(claims[0][1]) and is_dependent_claim(claims[1][1])
+    assert split_claims("번호 없는 청구항") == [(1, "번호 없는 청구항")]
+    assert split_claims("   ") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batch_search_embeds_once_and_runs_one_query_per_reference(monkeypatch):
+    from app.services.patent.similarity_service import PatentSimilarityService, SimilarityReference
+    from app.services.search import vector_index_manager as vim
+
+    monkeypatch.setattr(vim, "_iterative_scan_supported", None)
+
+    session = _FakeSession()
+    embedder = _FakeEmbedder()
+    service = PatentSimilarityService(session_factory=lambda: session, embedder=embedder)
+
+    refs = [
+        SimilarityReference(title="배터리", abstract="셀 관리", claims=["청구항 A", "bad"], ipc_codes=["H01M 10/42"]),
+        SimilarityReference(title="무선 통신", exclude_application_number="1020230000001"),
+    ]
+    results = await service.find_similar_batch(refs, top_k=5)
+
+    assert results == [[], []]
+    assert len(embedder.calls) == 1 and len(embedder.calls[0]) == 4
+    # 세션 설정문 개수와 무관하게 참조별 검색 쿼리와 그 파라미터를 짝지어 확인
+    queries = [(s, p) for s, p in zip(session.statements, session.params) if "WITH hits" in s]
+    assert len(queries) == 2
+    # 유효하지 않은(0-벡터) 청구항은 제외되고 IPC 서브클래스 사전 필터가 적용된다
+    assert "claim_vec_0" in queries[0][0] and "claim_vec_1" not in queries[0][0]
+    assert queries[0][1]["ipc_0"] == "H01M%" and queries[1][1]["exclude_app_no"] == "1020230000001"
+    assert any("hnsw.ef_search" in s for s in session.statements) and session.rolled_back
+    # 청구항 ANN 분기에도 삭제/관할/IPC/제외 필터가 LIMIT 전에 적용된다
+    claim_branch = queries[0][0].split("FROM tb_patent_claim_embeddings ce", 1)[1]
+    assert claim_branch.index("b.del_yn = 'N'") < claim_branch.index("LIMIT :claim_k")
+    assert claim_branch.index("LIKE :ipc_0") < claim_branch.index("LIMIT :claim_k")
+    assert "hnsw.iterative_scan" in " ".join(session.statements)
+
+
+class _BackfillSession(_FakeSession):
+    """patent_id 커서 조건을 적용해 대상 특허를 돌려주는 세션 대역 (임베딩 적재 INSERT 는 기록만)"""
+
+    def __init__(self, patents):
+        super().__init__()
+        self.patents = patents
+        self.selects = []
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        if "tb_patent_bibliographic_info.claims_text" not in sql:
+            return await super().execute(stmt, params)
+        compiled = stmt.compile().params
+        after = next(v for k, v in compiled.items() if k.startswith("patent_id"))
+        limit = next(v for k, v in compiled.items() if k.startswith("param"))
+        self.selects.append((sql, after))
+        picked = sorted((pid, text) for pid, text in self.patents.items() if pid > after)[:limit]
+        return _FakeResult(picked)
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_backfill_skips_blank_claims_and_advances_past_failed_embeddings():
+    from app.services.patent.similarity_service import PatentSimilarityService
+
+    # 1~3: 임베딩 실패(0-벡터)만 나오는 청구항, 4: 정상 - 실패한 특허가 LIMIT 창을 막으면 4에 도달하지 못한다
+    patents = {1: "bad", 2: "bad", 3: "bad", 4: "【청구항 1】\n배터리 셀 관리 장치."}
+    session = _BackfillSession(patents)
+    service = PatentSimilarityService(session_factory=lambda: session, embedder=_FakeEmbedder())
+
+    assert await service.backfill_pending_claims(batch_size=2, max_batches=10) == 1
+    sql = session.selects[0][0]
+    # 공백뿐인 청구항은 후보에서 제외, patent_id 순 커서로 진행
+    assert "length(trim(tb_patent_bibliographic_info.claims_text)) >" in sql
+    assert "ORDER BY tb_patent_bibliographic_info.patent_id" in sql
+    assert [after for _, after in session.selects] == [0, 2, 4]
+    assert sum("tb_patent_claim_embeddings" in s and "INSERT" in s for s in session.statements) == 1
+
+    # 배치 수 제한
+    session.selects.clear()
+    assert await service.backfill_pending_claims(batch_size=1, max_batches=2) == 0
+    assert [after for _, after in session.selects] == [0, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_similarity_tool_prefers_local_vectors():
+    from app.agents.features.patent.tools.search.similarity_search_tool import PatentSimilaritySearchTool
+    from app.services.patent.similarity_service import SimilarityHit
+
+    class _FakeSimilarity:
+        enabled = True
+
+        async def find_similar(self, reference, **kwargs):
+            return [
+                SimilarityHit(
+                    patent_id=1, application_number="1020220000001", title="배터리 관리 장치",
+                    applicant="A사", application_date=date(2022, 3, 1), ipc_codes=["H01M 10/42"],
+                    document_similarity=0.81, claim_similarity=0.9, matched_claim_no=1,
+                ),
+                SimilarityHit(patent_id=2, application_number="2", title="무관", document_similarity=0.1),
+            ]
+
+    tool = PatentSimilaritySearchTool()
+    tool._get_similarity = lambda: _FakeSimilarity()
+
+    def _no_live():
+        raise AssertionError("live API must not be called")
+
+    tool._get_aggregator = _no_live
+
+    out = await tool._arun(title="배터리 관리", abstract="배터리 셀 상태 추정", ipc_codes=["H01M 10/48"])
+
+    assert out.success and out.data_source == "local" and out.metrics.provider == "local_db"
+    assert [p.patent_number for p in out.similar_patents] == ["1020220000001"]
+    assert out.similar_patents[0].similarity_score == 0.9
+    assert out.similar_patents[0].matching_ipc_codes == ["H01M 10/42"]
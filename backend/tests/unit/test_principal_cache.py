@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+
+
+def _user(emp_no="E1", is_admin=False):
+    from app.models import User
+
+    now = datetime.now(timezone.utc)
+    return User(
+        id=7, emp_no=emp_no, username="홍길동", email=f"{emp_no}@example.com", password_hash="x",
+        is_active=True, is_admin=is_admin, failed_login_attempts=0,
+        created_date=now, last_modified_date=now,
+    )
+
+
+@pytest.mark.unit
+def test_principal_cache_ttl_and_invalidation(monkeypatch):
+    from app.services.auth import principal_cache as module
+
+    clock = [100.0]
+    monkeypatch.setattr(module.time, "monotonic", lambda: clock[0])
+    cache = module.PrincipalCache(ttl_seconds=30, max_entries=2)
+
+    cache.put("E1", "jti-a", _user(is_admin=True))
+    hit = cache.get("E1", "jti-a")
+    assert hit is not None and hit.is_admin
+    user = hit.to_user()
+    assert user.emp_no == "E1" and user.email == "E1@example.com" and user.id == 7
+    assert cache.get("E1", "jti-b") is None  # 다른 토큰은 별도 항목
+
+    clock[0] += 31
+    assert cache.get("E1", "jti-a") is None  # TTL 만료
+
+    cache.put("E1", "jti-a", _user())
+    cache.put("E1", "jti-b", _user())
+    cache.invalidate("E1")
+    assert cache.get("E1", "jti-a") is None and cache.get("E1", "jti-b") is None
+
+    for i in range(3):
+        cache.put(f"E{i}", "jti", _user(f"E{i}"))
+    assert cache.get("E0", "jti") is None and cache.get("E2", "jti") is not None  # 최대 항목 수 (LRU)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_accessible_containers_follow_tree_snapshot(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services.auth import container_tree_service as tree_module
+    from app.services.auth.principal_cache import PrincipalCache
+
+    def _snapshot(role):
+        container = SimpleNamespace(
+            container_id="HR", container_name="인사팀", container_type="department", description=None,
+            knowledge_category=None, access_level="internal", org_level=1, org_path="/HR",
+            parent_container_id=None, inherit_parent_permissions=True, user_count=0,
+        )
+        return tree_module.build_snapshot([container], [SimpleNamespace(user_emp_no="E1", container_id="HR", role_id=role)], {})
+
+    current = [_snapshot("VIEWER")]
+
+    class _Tree:
+        async def get_snapshot(self):
+            return current[0]
+
+    monkeypatch.setattr(tree_module, "container_tree_service", _Tree())
+    cache = PrincipalCache(ttl_seconds=30)
+
+    first = await cache.accessible_containers("E1")
+    assert [(c["container_id"], c["permission_level"]) for c in first] == [("HR", "VIEWER")]
+
+    current[0] = _snapshot("EDITOR")  # 권한 변경 → 스냅샷 교체
+    assert await cache.accessible_container_ids("E1") == {"HR"}
+    assert (await cache.accessible_containers("E1"))[0]["permission_level"] == "EDITOR"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_get_current_user_returns_orm_user_on_miss_and_read_only_view_on_hit(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.core import dependencies
+    from app.models import TbSapHrInfo
+    from app.services.auth.principal_cache import PrincipalCache, PrincipalUser
+
+    user = _user(is_admin=True)
+    user.sap_hr_info = TbSapHrInfo(emp_no="E1", emp_nm="홍길동", dept_nm="인사팀", postn_nm="과장")
+    lookups = []
+
+    class _UserService:
+        def __init__(self, db):
+            pass
+
+        async def get_user_by_emp_no(self, emp_no):
+            lookups.append(emp_no)
+            return user
+
+    monkeypatch.setattr(dependencies, "AsyncUserService", _UserService)
+    monkeypatch.setattr(dependencies, "principal_cache", PrincipalCache(ttl_seconds=30))
+    token = SimpleNamespace(emp_no="E1", jti="jti-a", username="홍길동")
+
+    # 캐시 미스 - 세션에서 조회한 ORM 객체 그대로 (관계/변경 사용 가능)
+    assert await dependencies.get_current_user(token, db=None) is user
+    # 캐시 적중 - DB 조회 없이 읽기 전용 뷰
+    cached = await dependencies.get_current_user(token, db=None)
+    assert lookups == ["E1"] and isinstance(cached, PrincipalUser)
+    assert (cached.id, cached.emp_no, cached.email, cached.is_admin) == (7, "E1", "E1@example.com", True)
+    assert cached.is_superuser and cached.hashed_password == "x"
+    assert (cached.name, cached.department, cached.position) == ("홍길동", "인사팀", "과장")
+    with pytest.raises(AttributeError):
+        cached.email = "new@example.com"
+    with pytest.raises(AttributeError):
+        cached.sap_hr_info  # 관계는 제공하지 않음 - 필요하면 DB 에서 다시 조회
+    assert getattr(cached, "sap_hr_info", None) is None
+
+
+@pytest.mark.unit
+def test_principal_omits_hr_properties_when_relationship_was_not_loaded():
+    from app.services.auth.principal_cache import Principal
+
+    view = Principal.from_user(_user(), ttl_seconds=30).to_user()
+    assert view.username == "홍길동"
+    assert not hasattr(view, "name") and not hasattr(view, "department")
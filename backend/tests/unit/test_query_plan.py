@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_query_plan_computes_each_field_once_and_concurrently(monkeypatch):
+    from app.services.core.embedding_service import embedding_service
+    from app.services.search import query_pipeline
+    from app.services.search.query_plan import QueryPlan
+
+    calls = {"keywords": 0, "embedding": 0}
+    started = []
+
+    async def fake_keywords(text):
+        calls["keywords"] += 1
+        started.append("keywords")
+        await asyncio.sleep(0.01)
+        return ["연차", "신청", "방법"]
+
+    async def fake_embedding(text):
+        calls["embedding"] += 1
+        started.append("embedding")
+        # 키워드 분석이 끝나기 전에 임베딩도 시작되어 있어야 함
+        await asyncio.sleep(0.01)
+        assert text == "연차 신청 방법은?"
+        return [0.1, 0.2, 0.3]
+
+    monkeypatch.setattr(query_pipeline, "_extract_keywords", fake_keywords)
+    monkeypatch.setattr(embedding_service, "get_embedding", fake_embedding)
+
+    plan = QueryPlan.build("  연차 신청   방법은? 😀")
+    assert plan.normalized_text == "연차 신청 방법은?" and plan.matches("  연차 신청   방법은? 😀")
+
+    plan.prefetch()
+    results = await asyncio.gather(plan.keywords(), plan.embedding(), plan.keywords(), plan.embedding())
+    assert results[0] == ("연차", "신청", "방법") and results[1] == (0.1, 0.2, 0.3)
+    assert sorted(started) == ["embedding", "keywords"]
+
+    processed = await query_pipeline.process_user_query(plan.text, search_type="rag", plan=plan)
+    assert processed.vector_embedding == [0.1, 0.2, 0.3]
+    assert processed.fulltext_query == " | ".join(processed.filtered_keywords)
+    # 여러 소비자가 요청해도 형태소 분석/임베딩은 각 1회
+    assert calls == {"keywords": 1, "embedding": 1}
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_profile_collects_parallel_stages_and_db_time():
+    from app.core.profiling import MetricsRegistry, profile_request, record_db_time, run_stage, stage
+
+    async def retrieval(rows):
+        await asyncio.sleep(0)
+        record_db_time(4.0)
+        return [{"content": "가" * 10}] * rows
+
+    with profile_request("search", force=True) as profile:
+        with stage("permissions"):
+            record_db_time(1.5)
+        vector, keyword = await asyncio.gather(run_stage("vector", retrieval(3)), run_stage("keyword", retrieval(2)))
+
+    assert len(vector) == 3 and len(keyword) == 2
+    stages = profile.to_dict()["stages"]
+    assert stages["permissions"]["db_queries"] == 1 and stages["permissions"]["db_ms"] == 1.5
+    # gather 로 병렬 실행된 하위 태스크도 같은 요청 프로파일에 기록
+    assert stages["vector"]["rows"] == 3 and stages["vector"]["bytes"] == 90
+    assert stages["keyword"]["db_ms"] == 4.0
+
+    # 프로파일 범위 밖에서는 기록하지 않음
+    with stage("orphan") as span:
+        record_db_time(1.0)
+    assert span is None and "orphan" not in profile.spans
+
+    registry = MetricsRegistry()
+    registry.record(profile)
+    text = registry.render_prometheus()
+    assert 'wkms_profiled_requests_total{kind="search",status="ok"} 1' in text
+    assert 'wkms_stage_duration_ms_count{kind="search",stage="vector"} 1' in text
+    assert 'wkms_stage_db_duration_ms_bucket{kind="search",stage="keyword",le="5"} 1' in text
+
+    registry.increment("search_events_total", 3, outcome="dropped")
+    assert 'wkms_search_events_total{outcome="dropped"} 3' in registry.render_prometheus()
+
+
+@pytest.mark.unit
+def test_sampling_knob(monkeypatch):
+    from app.core.config import settings
+    from app.core.profiling import profile_request
+
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    with profile_request("search") as profile:
+        assert profile is None
+    with profile_request("search", force=True) as profile:
+        assert profile is not None
+        # 중첩 요청(RAG 내부 검색)은 상위 프로파일을 그대로 사용
+        with profile_request("search") as inner:
+            assert inner is profile
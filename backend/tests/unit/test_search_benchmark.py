@@ -0,0 +1,61 @@
+import math
+
+import pytest
+
+
+@pytest.mark.unit
+def test_hashing_embedder_is_deterministic_and_overlap_sensitive():
+    from app.evaluation.search_benchmark import HashingEmbedder
+
+    embedder = HashingEmbedder(1024)
+    a = embedder.embed("연차휴가 신청 절차")
+    assert a == HashingEmbedder(1024).embed("연차휴가 신청 절차")
+    assert len(a) == 1024 and math.isclose(sum(v * v for v in a), 1.0, rel_tol=1e-9)
+
+    def cosine(x, y):
+        return sum(p * q for p, q in zip(x, y))
+
+    # 조사만 다른 질의가 무관한 문장보다 가깝다
+    assert cosine(a, embedder.embed("연차휴가는 언제 신청하나")) > cosine(a, embedder.embed("EUV 노광 장비"))
+    assert embedder.embed("")[0] == 1.0
+
+
+@pytest.mark.unit
+def test_dataset_rankings_percentiles_and_regression_compare():
+    from app.evaluation.search_benchmark import (
+        compare_reports,
+        evaluate_rankings,
+        latency_percentiles,
+        load_dataset,
+        ranked_documents,
+    )
+
+    dataset = load_dataset()
+    assert dataset.queries and {d for q in dataset.queries for d in q.expected_documents} <= {
+        doc.id for doc in dataset.documents
+    }
+
+    file_map = {11: "hr-annual-leave", 12: "it-vpn"}
+    assert ranked_documents([11, "11", None, 99, 12], file_map) == ["hr-annual-leave", "99", "it-vpn"]
+
+    queries = [q for q in dataset.queries if q.id in ("q001", "q004")]
+    quality = evaluate_rankings(queries, {"q001": ["hr-annual-leave"], "q004": ["hr-remote-work"]}, k=10)
+    assert quality["recall@10"] == pytest.approx(0.75)
+    assert quality["mrr"] == pytest.approx(1.0)
+    assert quality["zero_result_rate"] == 0.0
+
+    latency = latency_percentiles([float(v) for v in range(1, 101)])
+    assert (latency["p50_ms"], latency["p95_ms"], latency["p99_ms"]) == (50.0, 95.0, 99.0)
+
+    baseline = {"modes": {"hybrid": {
+        "quality": {"recall@10": 0.9, "zero_result_rate": 0.0},
+        "latency": {"c1": {"p50_ms": 100.0, "p95_ms": 200.0, "errors": 0}},
+    }}}
+    current = {"modes": {"hybrid": {
+        "quality": {"recall@10": 0.89, "zero_result_rate": 0.1},
+        "latency": {"c1": {"p50_ms": 110.0, "p95_ms": 300.0, "errors": 0}},
+    }}}
+    regressions = compare_reports(baseline, current)
+    assert len(regressions) == 2
+    assert any("zero_result_rate" in r for r in regressions) and any("p95_ms" in r for r in regressions)
+    assert compare_reports(baseline, baseline) == []
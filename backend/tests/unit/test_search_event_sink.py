@@ -0,0 +1,76 @@
+import time
+from datetime import date
+
+import pytest
+
+
+class _Result:
+    def scalar(self):
+        return True
+
+    def fetchall(self):
+        return []
+
+
+class _FakeSession:
+    """실행된 SQL 을 기록하는 AsyncSession 대용"""
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params or {}))
+        return _Result()
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_record_is_non_blocking_and_flushes_one_multi_row_insert():
+    from app.services.search.search_event_sink import SearchEvent, SearchEventSink
+
+    statements = []
+    sink = SearchEventSink(
+        session_factory=lambda: _FakeSession(statements), queue_size=2, batch_size=10, flush_interval=0.05
+    )
+    sink._last_rollup = time.monotonic()  # 롤업 주기 밖
+
+    events = [
+        SearchEvent("E001", "  연차  신청 ", "hybrid", 3, 12.5, ["HR"], [10, 11]),
+        SearchEvent("E002", "VPN", "keyword_only", 0),
+        SearchEvent("E003", "유실", "hybrid", 1),
+    ]
+    accepted = [sink.record(event) for event in events]
+
+    # 큐 크기 초과분은 버리고, 기록 자체는 DB 를 건드리지 않음
+    assert accepted == [True, True, False] and sink.dropped == 1
+    assert statements == []
+
+    await sink.shutdown(timeout=1.0)
+
+    inserts = [(sql, params) for sql, params in statements if "INSERT INTO tb_search_events" in sql]
+    assert len(inserts) == 1
+    params = inserts[0][1]
+    assert params["user_emp_no"] == ["E001", "E002"]
+    assert params["query_norm"] == ["연차 신청", "vpn"]
+    assert params["container_ids"] == ["HR", ""] and params["top_file_ids"] == ["10,11", ""]
+    # 적재 전에 현재/다음 달 파티션 확인
+    assert any("PARTITION OF tb_search_events" in sql for sql, _ in statements)
+    assert not sink.record(events[2])  # 종료 후에는 받지 않음
+
+
+@pytest.mark.unit
+def test_partition_months():
+    from app.services.search.search_event_sink import month_start, partition_name
+
+    assert month_start(date(2026, 12, 15), 1) == date(2027, 1, 1)
+    assert month_start(date(2026, 1, 31), -13) == date(2024, 12, 1)
+    assert partition_name(date(2026, 3, 1)) == "tb_search_events_202603"
@@ -0,0 +1,53 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_group_results_by_file_keeps_best_chunk_counts_and_picks_thumbnail():
+    from app.services.search.result_formatter import group_results_by_file
+
+    chunk_low = {"file_bss_info_sno": 1, "combined_score": 0.4, "content": "낮은 점수"}
+    results = [
+        chunk_low,
+        {"file_bss_info_sno": 2, "similarity_score": 1.0, "keyword_score": 0.0, "content": "B"},
+        {"file_bss_info_sno": 1, "combined_score": 0.9, "content": "높은 점수", "chunk_id": "c2"},
+        {"file_bss_info_sno": 1, "combined_score": float("nan"), "modality": "image",
+         "metadata": {"object_id": 7, "page_no": 3}, "chunk_id": "img"},
+        {"content": "파일 없음"},
+    ]
+
+    grouped = group_results_by_file(results)
+
+    assert [g["file_bss_info_sno"] for g in grouped] == [1, 2]
+    best = grouped[0]
+    assert best["content"] == "높은 점수" and best["combined_score"] == 0.9
+    assert best["chunk_count"] == 3 and best["file_level_result"] is True
+    assert best["thumbnail_blob_key"] == "multimodal/1/objects/image_7_3.png"
+    assert best["thumbnail_chunk_id"] == "img"
+    assert grouped[1]["combined_score"] == pytest.approx(0.6)
+    # 입력 결과는 변경하지 않음
+    assert "chunk_count" not in chunk_low
+
+
+@pytest.mark.unit
+def test_highlighter_and_container_path_are_built_once_and_cached():
+    from app.services.search.result_formatter import (
+        container_path_with_icons,
+        highlighter_for,
+        match_type_for,
+    )
+
+    highlighter = highlighter_for("Patent 분석 a")
+    assert highlighter_for("Patent 분석 a") is highlighter
+    assert highlighter.highlight("PATENT 분석 결과, patent analysis") == (
+        "<mark>PATENT</mark> <mark>분석</mark> 결과, <mark>patent</mark> analysis"
+    )
+    # 긴 키워드(원본 검색어 전체)가 우선
+    assert highlighter.highlight("patent 분석 a") == "<mark>patent 분석 a</mark>"
+
+    assert container_path_with_icons("/웅진/CEO직속/인사전략팀") == "📁 웅진 📁 CEO직속 📂 인사전략팀"
+    assert container_path_with_icons("본부 > 팀") == "📁 본부 📂 팀"
+    assert container_path_with_icons("인사팀") == "📂 인사팀"
+    assert container_path_with_icons("") == "📂 경로 없음"
+
+    assert match_type_for(["vector_search"]) == "vector"
+    assert match_type_for(["vector", "keyword"]) == "hybrid"
@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.mark.unit
+def test_incremental_parser_emits_each_mapping_as_soon_as_it_closes():
+    from app.agents.features.presentation.services.streaming_json_parser import IncrementalJSONArrayParser
+
+    payload = (
+        '```json\n{"note": "mappings: [ignored]", "mappings": ['
+        '{"element_id": "textbox-0-0", "content": "중괄호 } 와 \\"따옴표\\""},'
+        '{"element_id": "table-0-1", "content": [["항목", "값"], ["A", "1"]]}'
+        ']}\n```'
+    )
+    parser = IncrementalJSONArrayParser("mappings")
+
+    emitted = []
+    for i in range(0, len(payload), 7):
+        emitted.append(parser.feed(payload[i:i + 7]))
+
+    items = [item for batch in emitted for item in batch]
+    assert items == [
+        {"element_id": "textbox-0-0", "content": "중괄호 } 와 \"따옴표\""},
+        {"element_id": "table-0-1", "content": [["항목", "값"], ["A", "1"]]},
+    ]
+    # 첫 원소는 두 번째 원소가 닫히기 전에 이미 나옴
+    first_batch = next(i for i, batch in enumerate(emitted) if batch)
+    assert len(emitted[first_batch]) == 1
+    assert parser.complete
+
+    # 잘린 응답은 닫힌 원소만 반환 (복구 시도 없음)
+    truncated = IncrementalJSONArrayParser("mappings")
+    assert truncated.feed('{"mappings": [{"element_id": "a", "content": "x"}, {"element_id": "b", "con') == [
+        {"element_id": "a", "content": "x"}
+    ]
+    assert not truncated.complete
+
+
+class _FakeAIService:
+    """계획은 chat_completion, 슬라이드는 chat_stream 으로 응답"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def chat_completion(self, messages, temperature=None, max_tokens=None):
+        plan = {
+            "presentation_title": "자동차 특허 분석",
+            "slides": [{"slide": n, "title": f"주제 {n}", "brief": "요약"} for n in (1, 2, 3)],
+            "dynamic_slides": {"mode": "fixed"},
+        }
+        return {"response": f"```json\n{json.dumps(plan, ensure_ascii=False)}\n```"}
+
+    async def chat_stream(self, messages, temperature=None, max_tokens=None):
+        prompt = messages[-1]["content"]
+        slide = next(n for n in (1, 2, 3) if f"## 슬라이드 {n} (" in prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            # 슬라이드 1이 가장 느림 → 완료 이벤트는 도착 순서대로
+            await asyncio.sleep(0.03 if slide == 1 else 0.01)
+            body = json.dumps({"mappings": [
+                {"element_id": f"textbox-{slide - 1}-0", "content": f"슬라이드 {slide} 제목"},
+                {"element_id": "textbox-9-9", "content": "다른 슬라이드 요소"},
+            ]}, ensure_ascii=False)
+            for i in range(0, len(body), 5):
+                yield body[i:i + 5]
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_slide_parallel_generation_streams_slides_with_bounded_concurrency(monkeypatch):
+    from app.agents.features.presentation.tools.ai_direct_mapping_tool import AIDirectMappingTool
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ppt_slide_parallel_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "ppt_slide_concurrency", 2, raising=False)
+
+    metadata = {"slides": [
+        {
+            "index": n,
+            "role": "content",
+            "elements": [
+                {"id": f"textbox-{n - 1}-0", "type": "textbox", "element_role": "slide_title",
+                 "original_name": f"Title {n}", "content": "원본 제목"},
+                {"id": f"textbox-{n - 1}-1", "type": "textbox", "element_role": "body_content",
+                 "original_name": f"Body {n}", "content": "원본 본문"},
+            ],
+        }
+        for n in (1, 2, 3)
+    ]}
+
+    tool = AIDirectMappingTool()
+    fake = _FakeAIService()
+    tool._ai_service = fake
+    monkeypatch.setattr(tool, "_repair_json", lambda *_: pytest.fail("잘림 복구를 사용하면 안 됨"))
+
+    events = []
+
+    async def on_progress(event):
+        events.append(event)
+
+    result = await tool._arun("자동차 특허 분석 PPT", metadata, progress_callback=on_progress)
+
+    assert result["success"] and result["generation_mode"] == "slide_parallel"
+    assert fake.max_active == 2
+    assert [e["type"] for e in events] == ["plan", "slide", "slide", "slide"]
+    slide_events = events[1:]
+    assert slide_events[-1]["slide_index"] == 0  # 가장 느린 슬라이드가 마지막
+    assert [e["completed"] for e in slide_events] == [1, 2, 3]
+    assert all(
+        [m["elementId"] for m in e["mappings"]] == [f"textbox-{e['slide_index']}-0"] for e in slide_events
+    )
+
+    by_id = {m["elementId"]: m for m in result["mappings"]}
+    assert by_id["textbox-0-0"]["generatedText"] == "슬라이드 1 제목"
+    assert by_id["textbox-0-0"]["originalName"] == "Title 1"
+    # 슬라이드 응답에 없던 요소는 기존 규칙대로 빈 매핑으로 보충
+    assert by_id["textbox-2-1"]["generatedText"] == ""
+    assert "textbox-9-9" not in by_id
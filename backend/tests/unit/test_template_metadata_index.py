@@ -0,0 +1,143 @@
+import json
+import os
+
+import pytest
+
+
+def _make_deck(path, slide_count):
+    from pptx import Presentation
+
+    prs = Presentation()
+    for _ in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = "title"
+    prs.save(str(path))
+
+
+def _count_parses(monkeypatch, module):
+    parsed = []
+    original = module.Presentation
+
+    def counting(source):
+        parsed.append(source)
+        return original(source)
+
+    monkeypatch.setattr(module, "Presentation", counting)
+    return parsed
+
+
+@pytest.mark.unit
+def test_index_reuses_entry_until_fingerprint_changes(tmp_path, monkeypatch):
+    from app.agents.features.presentation.services import template_metadata_index as module
+
+    deck = tmp_path / "deck.pptx"
+    _make_deck(deck, 2)
+    index_path = tmp_path / "metadata" / "template_index.json"
+    parsed = _count_parses(monkeypatch, module)
+
+    index = module.TemplateMetadataIndex(index_path)
+    entry = index.get(deck)
+    assert entry.slide_count == 2 and entry.layouts and entry.placeholder_count == 4
+    assert index.get(deck) is entry  # 지문 일치 - 재파싱 없음
+    assert len(parsed) == 1
+
+    # 재시작 후에도 디스크 인덱스로 조회 (재파싱 없음)
+    reloaded = module.TemplateMetadataIndex(index_path)
+    assert reloaded.get(deck).fingerprint == entry.fingerprint
+    assert len(parsed) == 1
+
+    # 내용 변경 → 지문 불일치 → 재분석 후 디스크에도 반영
+    _make_deck(deck, 3)
+    stat = deck.stat()
+    os.utime(deck, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    updated = reloaded.get(deck)
+    assert updated.slide_count == 3 and updated.fingerprint != entry.fingerprint
+    assert len(parsed) == 2
+    saved = json.loads(index_path.read_text(encoding="utf-8"))
+    assert saved["entries"][str(deck)]["slide_count"] == 3
+
+
+@pytest.mark.unit
+def test_invalidate_and_missing_file_drop_entries(tmp_path, monkeypatch):
+    from app.agents.features.presentation.services import template_metadata_index as module
+
+    deck = tmp_path / "deck.pptx"
+    other = tmp_path / "other.pptx"
+    _make_deck(deck, 1)
+    _make_deck(other, 1)
+    index_path = tmp_path / "template_index.json"
+    index = module.TemplateMetadataIndex(index_path)
+    index.get(deck)
+    index.get(other)
+    parsed = _count_parses(monkeypatch, module)
+
+    index.invalidate(deck)
+    assert str(deck) not in json.loads(index_path.read_text(encoding="utf-8"))["entries"]
+    assert index.get(deck).slide_count == 1
+    assert len(parsed) == 1  # 무효화된 항목만 재분석
+
+    other.unlink()
+    assert index.get(other) is None
+    assert str(other) not in json.loads(index_path.read_text(encoding="utf-8"))["entries"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("index_content", [
+    "{not json",
+    json.dumps({"version": 0, "entries": {"x": {"path": "x"}}}),
+    json.dumps({"version": 1, "entries": {"x": {"unexpected": 1}}}),
+])
+def test_unusable_index_falls_back_to_full_parse(tmp_path, monkeypatch, index_content):
+    from app.agents.features.presentation.services import template_metadata_index as module
+
+    deck = tmp_path / "deck.pptx"
+    _make_deck(deck, 2)
+    index_path = tmp_path / "template_index.json"
+    index_path.write_text(index_content, encoding="utf-8")
+    parsed = _count_parses(monkeypatch, module)
+
+    index = module.TemplateMetadataIndex(index_path)
+    assert index.get(deck).slide_count == 2
+    assert len(parsed) == 1
+    # 재생성된 인덱스는 현재 버전으로 저장
+    saved = json.loads(index_path.read_text(encoding="utf-8"))
+    assert saved["version"] == module.INDEX_VERSION and list(saved["entries"]) == [str(deck)]
+
+    # 파싱할 수 없는 파일은 인덱스에 넣지 않음
+    broken = tmp_path / "broken.pptx"
+    broken.write_bytes(b"not a zip")
+    assert index.get(broken) is None
+    assert str(broken) not in json.loads(index_path.read_text(encoding="utf-8"))["entries"]
+
+
+@pytest.mark.unit
+def test_open_presentation_serves_cached_bytes_within_budget(tmp_path, monkeypatch):
+    from app.agents.features.presentation.services import template_metadata_index as module
+
+    small = tmp_path / "small.pptx"
+    _make_deck(small, 1)
+    big = tmp_path / "big.pptx"
+    _make_deck(big, 4)
+    budget = small.stat().st_size + 1
+    index = module.TemplateMetadataIndex(tmp_path / "template_index.json", max_cached_bytes=budget)
+
+    reads = []
+    original_read = module.Path.read_bytes
+
+    def counting_read(self):
+        reads.append(self.name)
+        return original_read(self)
+
+    monkeypatch.setattr(module.Path, "read_bytes", counting_read)
+
+    first = index.open_presentation(small)
+    second = index.open_presentation(small)
+    assert first is not second and len(second.slides) == 1  # 매번 새 인스턴스
+    assert reads == ["small.pptx"]
+
+    # 예산을 넘는 파일은 캐시하지 않고 매번 읽음 (기존 캐시도 유지)
+    index.open_presentation(big)
+    index.open_presentation(big)
+    index.open_presentation(small)
+    assert reads == ["small.pptx", "big.pptx", "big.pptx"]
+    assert index._cached_bytes <= budget
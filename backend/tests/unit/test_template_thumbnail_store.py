@@ -0,0 +1,58 @@
+import pytest
+from PIL import Image
+
+
+@pytest.mark.unit
+def test_thumbnail_store_renders_lazily_and_invalidates_on_change(tmp_path, monkeypatch):
+    from app.agents.features.presentation.services.template_thumbnail_store import (
+        THUMBNAIL_SIZES,
+        TemplateThumbnailStore,
+    )
+
+    template = tmp_path / "deck.pptx"
+    template.write_bytes(b"deck-v1")
+    copy = tmp_path / "copy.pptx"
+    copy.write_bytes(b"deck-v1")
+
+    store = TemplateThumbnailStore(tmp_path / "store")
+    rendered = []
+
+    def fake_rasterize(source, slide_index):
+        rendered.append((source.name, slide_index))
+        return Image.new("RGB", (2000, 1500), "white")
+
+    monkeypatch.setattr(store, "_rasterize_page", fake_rasterize)
+
+    url = store.url_for(template, 2, "sm")
+    digest = url.split("/")[-3]
+    assert url == f"/api/v1/agent/presentation/thumbnails/{digest}/sm/2"
+    assert rendered == []  # URL 발급만으로는 렌더링하지 않음
+
+    # 같은 내용이면 같은 주소
+    assert store.digest_for(copy) == digest
+
+    path = store.get_path(digest, 2, "sm")
+    assert path.suffix == ".webp"
+    with Image.open(path) as img:
+        assert img.format == "WEBP" and img.width == THUMBNAIL_SIZES["sm"]
+    # 한 번 렌더링한 페이지로 모든 크기를 생성 → 다른 크기 요청은 재렌더링 없음
+    assert store.get_path(digest, 2, "lg").exists()
+    assert rendered == [("deck.pptx", 2)]
+
+    # 디스크 인덱스로 재시작 후에도 재해시/재렌더링 없이 조회
+    reloaded = TemplateThumbnailStore(tmp_path / "store")
+    monkeypatch.setattr(reloaded, "_rasterize_page", fake_rasterize)
+    assert reloaded.get_or_render(template, 2, "md") == (digest, path.with_name("slide_2_md.webp"))
+    assert len(rendered) == 1
+
+    # 잘못된 다이제스트/크기는 거부
+    assert reloaded.get_path("../etc", 0, "sm") is None
+    assert reloaded.get_path(digest, 0, "xl") is None
+
+    # 내용 변경: 복사본이 아직 참조하므로 이전 파일 유지, 복사본 삭제 후 정리
+    template.write_bytes(b"deck-v2-changed")
+    new_digest = reloaded.digest_for(template)
+    assert new_digest != digest and path.exists()
+    reloaded.invalidate(copy)
+    assert not path.exists()
+    assert reloaded.get_path(digest, 2, "sm") is None  # 원본이 사라진 이전 주소는 404
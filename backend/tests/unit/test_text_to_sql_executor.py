@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+
+class _FakeScalarResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+
+class _FakeStream:
+    def __init__(self, columns, rows):
+        self._columns = columns
+        self._rows = rows
+        self.closed = False
+        self.fetch_sizes = []
+
+    def keys(self):
+        return self._columns
+
+    async def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeSession:
+    def __init__(self, plan, rows):
+        self.statements = []
+        self._plan = plan
+        self._rows = rows
+        self.rolled_back = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.statements.append(str(stmt))
+        return _FakeScalarResult(json.dumps([{"Plan": self._plan}]))
+
+    async def stream(self, stmt):
+        self.statements.append(str(stmt))
+        self.stream_result = _FakeStream(["id", "name"], list(self._rows))
+        return self.stream_result
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_executor_streams_columnar_batches_up_to_max_rows():
+    from app.agents.features.text_to_sql.services.sql_executor import ReadOnlySqlExecutor
+
+    rows = [(i, f"n{i}") for i in range(25)]
+    session = _FakeSession({"Total Cost": 12.5, "Plan Rows": 25, "Node Type": "Seq Scan"}, rows)
+    executor = ReadOnlySqlExecutor(lambda: session, statement_timeout_ms=1500, batch_size=10)
+
+    result = await executor.execute("SELECT id, name FROM t", max_rows=15)
+
+    assert result.row_count == 15 and result.truncated
+    assert [b.num_rows for b in result.batches] == [10, 5]
+    assert result.batches[0].column("name")[:2] == ["n0", "n1"]
+    assert result.page(9, 3) == [(9, "n9"), (10, "n10"), (11, "n11")]
+    assert result.to_records(1) == [{"id": 0, "name": "n0"}]
+    assert "SET LOCAL statement_timeout = 1500" in session.statements
+    assert session.rolled_back
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("total, truncated", [(20, False), (21, True)])
+async def test_executor_truncation_is_exact_at_partition_boundary(total, truncated):
+    from app.agents.features.text_to_sql.services.sql_executor import ReadOnlySqlExecutor
+
+    rows = [(i, f"n{i}") for i in range(total)]
+    session = _FakeSession({"Total Cost": 1.0, "Plan Rows": total}, rows)
+    executor = ReadOnlySqlExecutor(lambda: session, batch_size=10)
+
+    # max_rows 가 배치 경계(10 × 2)와 정확히 일치해도 남은 행 유무로 truncated 판정
+    result = await executor.execute("SELECT id, name FROM t", max_rows=20)
+
+    assert result.row_count == 20 and result.truncated is truncated
+    assert [b.num_rows for b in result.batches] == [10, 10]
+    # 최대 max_rows + 1 행만 가져온다
+    assert session.stream_result.fetch_sizes == [10, 10, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_executor_rejects_expensive_plan_before_running():
+    from app.agents.features.text_to_sql.services.sql_executor import ReadOnlySqlExecutor, SqlCostLimitError
+
+    session = _FakeSession({"Total Cost": 9e9, "Plan Rows": 10}, [])
+    executor = ReadOnlySqlExecutor(lambda: session, max_plan_cost=1000, max_plan_rows=1000)
+
+    with pytest.raises(SqlCostLimitError):
+        await executor.execute("SELECT * FROM big")
+    assert not any(s == "SELECT * FROM big" for s in session.statements)
+
+
+@pytest.mark.unit
+def test_guard_clamps_trailing_limit():
+    from app.agents.features.text_to_sql.services.sql_guard import SqlGuardConfig, validate_read_only_sql
+
+    config = SqlGuardConfig(max_rows=100)
+    assert validate_read_only_sql("SELECT * FROM t LIMIT 100000", config=config) == "SELECT * FROM t LIMIT 100"
+    assert validate_read_only_sql("SELECT * FROM t LIMIT 5", config=config) == "SELECT * FROM t LIMIT 5"
+    assert validate_read_only_sql("SELECT * FROM t", config=config) == "SELECT * FROM t LIMIT 100"
@@ -0,0 +1,63 @@
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_store_bulk_upsert_and_bm25_search(tmp_path):
+    from app.agents.features.text_to_sql.storage.sqlite_store import TextToSqlStore, TextToSqlStoreConfig
+
+    store = TextToSqlStore(TextToSqlStoreConfig(path=tmp_path / "store.sqlite3"))
+    try:
+        tables = [
+            {
+                "schema_name": "public",
+                "table_name": f"tb_filler_{i}",
+                "columns": [{"name": "id", "type": "integer", "nullable": False, "comment": None}],
+                "table_comment": None,
+            }
+            for i in range(50)
+        ]
+        tables.append(
+            {
+                "schema_name": "public",
+                "table_name": "tb_user_documents",
+                "columns": [{"name": "document_id", "type": "integer", "nullable": False, "comment": "문서 번호"}],
+                "table_comment": "사용자 문서",
+            }
+        )
+        tables.append(
+            {
+                "schema_name": "public",
+                "table_name": "tb_audit_log",
+                "columns": [{"name": "document_ref", "type": "text", "nullable": True, "comment": None}],
+                "table_comment": None,
+            }
+        )
+        assert await store.upsert_table_schemas(connection_id="app_db", tables=tables) == 52
+
+        # 재저장은 중복 행을 만들지 않고 갱신
+        await store.upsert_table_schema(
+            connection_id="app_db",
+            schema_name="public",
+            table_name="tb_audit_log",
+            columns=[{"name": "document_ref", "type": "text", "nullable": True, "comment": None}],
+            table_comment="감사 로그",
+        )
+        assert len(await store.search_tables(connection_id="app_db", keyword="", limit=100)) == 52
+
+        # 테이블명 매칭이 컬럼명 매칭보다 앞선다
+        results = await store.search_tables(connection_id="app_db", keyword="document", limit=5)
+        assert [r["table_name"] for r in results][:2] == ["tb_user_documents", "tb_audit_log"]
+
+        results = await store.search_tables(connection_id="app_db", keyword="감사", limit=5)
+        assert [r["table_name"] for r in results] == ["tb_audit_log"]
+
+        schema = await store.get_table_schema(connection_id="app_db", schema_name="public", table_name="tb_audit_log")
+        assert schema["table_comment"] == "감사 로그"
+        assert schema["columns"][0]["name"] == "document_ref"
+
+        await store.cache_question_sql(connection_id="app_db", question="q", sql_query="SELECT 1")
+        await store.cache_question_sql(connection_id="app_db", question="q", sql_query="SELECT 2")
+        assert await store.get_cached_sql(connection_id="app_db", question="q") == "SELECT 2"
+    finally:
+        await store.close()
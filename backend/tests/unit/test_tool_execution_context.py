@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+
+class _FakeSession:
+    def __init__(self, tracker):
+        self._tracker = tracker
+        self.rolled_back = False
+
+    async def __aenter__(self):
+        self._tracker["open"] += 1
+        self._tracker["peak"] = max(self._tracker["peak"], self._tracker["open"])
+        self._tracker["sessions"].append(self)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._tracker["open"] -= 1
+        return False
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_parallel_tools_get_distinct_sessions_within_budget():
+    from app.agents.core.db import ToolExecutionContext
+
+    tracker = {"open": 0, "peak": 0, "sessions": []}
+    ctx = ToolExecutionContext(session_factory=lambda: _FakeSession(tracker), max_connections=2)
+
+    async def run(name: str, delay: float):
+        async with ctx.session(name) as session:
+            await asyncio.sleep(delay)
+            ctx.record(name, delay * 1000)
+            return session
+
+    sessions = await asyncio.gather(
+        run("vector_search", 0.03),
+        run("keyword_search", 0.01),
+        run("fulltext_search", 0.02),
+    )
+
+    assert len({id(s) for s in sessions}) == 3
+    assert tracker["peak"] == 2
+    assert all(s.rolled_back for s in sessions)
+    assert set(ctx.queue_wait_ms) == {"vector_search", "keyword_search", "fulltext_search"}
+    assert ctx.critical_path_ms == pytest.approx(30.0)
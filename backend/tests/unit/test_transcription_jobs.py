@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_single_poller_completes_many_jobs_with_post_processing(tmp_path):
+    from app.services.core.transcription_job_service import (
+        JOB_COMPLETED,
+        LocalTranscriptionBackend,
+        TranscriptionJobManager,
+    )
+
+    backend = LocalTranscriptionBackend(default_text="인설린 투여 기록", polls_until_done=2)
+    manager = TranscriptionJobManager(backend=backend, poll_interval=0.01, job_timeout=5, retention=60)
+
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"voice{i}.webm"
+        path.write_bytes(b"\x00")
+        paths.append(path)
+    jobs = await asyncio.gather(*(manager.submit(p, "ko-KR", owner="E1") for p in paths))
+
+    await asyncio.gather(*(manager.wait(job, timeout=2) for job in jobs))
+
+    assert all(job.status == JOB_COMPLETED for job in jobs)
+    assert jobs[0].transcript == "인슐린 투여 기록"  # stt_post_processor 보정
+    assert sorted(backend.cleaned) == sorted(job.job_id for job in jobs)
+    assert not any(p.exists() for p in paths)  # 작업 종료 시 임시 파일 삭제
+    assert manager.get(jobs[0].job_id, owner="E2") is None
+    assert manager._poller.done()  # 진행 중 작업이 없으면 폴러 종료
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_timeout_and_streaming_events(tmp_path):
+    from app.services.core.transcription_job_service import (
+        JOB_FAILED,
+        LocalTranscriptionBackend,
+        TranscriptionJobManager,
+    )
+
+    backend = LocalTranscriptionBackend(default_text="데이타 분석 결과", polls_until_done=1000)
+    manager = TranscriptionJobManager(backend=backend, poll_interval=0.01, job_timeout=0.05)
+
+    audio = tmp_path / "long.webm"
+    audio.write_bytes(b"\x00")
+    job = await manager.submit(audio, "ko-KR")
+    await manager.wait(job, timeout=2)
+    assert job.status == JOB_FAILED and "timed out" in job.error
+
+    clip = tmp_path / "clip.wav"
+    clip.write_bytes(b"\x00")
+    events = [event async for event in manager.stream(clip, "ko-KR")]
+    assert [e["is_partial"] for e in events] == [True, True, False]
+    assert events[-1]["text"] == "데이터 분석 결과" and events[0]["text"] == "데이타"
+
+
+@pytest.mark.unit
+def test_backend_interface_requires_submit_poll_and_stream():
+    from app.services.core.transcription_job_service import LocalTranscriptionBackend, TranscriptionBackend
+
+    with pytest.raises(TypeError):
+        TranscriptionBackend()
+
+    class BatchOnlyBackend(TranscriptionBackend):
+        async def submit(self, job):
+            return None
+
+        async def poll(self, job):
+            return None
+
+    with pytest.raises(TypeError, match="stream"):
+        BatchOnlyBackend()
+    assert isinstance(LocalTranscriptionBackend(), TranscriptionBackend)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_finished_jobs_are_evicted_on_lookup_without_new_submissions(tmp_path):
+    from datetime import datetime, timedelta
+
+    from app.services.core.transcription_job_service import LocalTranscriptionBackend, TranscriptionJobManager
+
+    manager = TranscriptionJobManager(
+        backend=LocalTranscriptionBackend(default_text="회의록", polls_until_done=1), poll_interval=0.01, retention=60,
+    )
+    audio = tmp_path / "voice.webm"
+    audio.write_bytes(b"\x00")
+    job = await manager.wait(await manager.submit(audio, "ko-KR", owner="E1"), timeout=2)
+    other = tmp_path / "other.webm"
+    other.write_bytes(b"\x00")
+    stale = await manager.wait(await manager.submit(other, "ko-KR", owner="E1"), timeout=2)
+
+    assert manager.get(job.job_id, owner="E1") is job  # 보관 기간 이내
+    stale.finished_at = datetime.now() - timedelta(seconds=61)
+
+    # 제출이 더 없어도 조회 시점에 보관 기간이 지난 작업을 정리
+    assert manager.get(job.job_id, owner="E1") is job
+    assert manager.get(stale.job_id, owner="E1") is None
+    assert list(manager._jobs) == [job.job_id]
@@ -0,0 +1,238 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+def _column(table, column, column_type="vector(1536)"):
+    return SimpleNamespace(table_name=table, column_name=column, column_type=column_type, estimated_rows=1000)
+
+
+def _index(name, table, column, method="hnsw", predicate=None, options=None, valid=True):
+    return SimpleNamespace(
+        index_name=name, table_name=table, column_name=column, method=method, is_valid=valid,
+        predicate=predicate, options=options, size_bytes=0, definition="",
+    )
+
+
+@pytest.mark.unit
+def test_plan_builds_missing_or_outdated_indexes_and_drops_replaced_ivfflat():
+    from app.services.search.vector_index_manager import VectorIndexSpec, build_inventory, plan_actions
+
+    specs = (
+        VectorIndexSpec("idx_chunks_azure_hnsw", "chunks", "azure_embedding_1536", "chunk_sno",
+                        where="embedding_provider = 'azure'", m=16, ef_construction=128,
+                        replaces=("idx_chunks_azure_ivfflat",)),
+        VectorIndexSpec("idx_chunks_aws_hnsw", "chunks", "aws_embedding_1024", "chunk_sno",
+                        where="embedding_provider = 'aws'", m=16, ef_construction=128),
+        VectorIndexSpec("idx_cache_hnsw", "cache", "embedding", "cache_id", m=16, ef_construction=64),
+        VectorIndexSpec("idx_missing_table", "no_such_table", "embedding", "id"),
+    )
+    inventory = build_inventory(
+        [
+            _column("chunks", "azure_embedding_1536"),
+            _column("chunks", "aws_embedding_1024", "vector(1024)"),
+            _column("cache", "embedding"),
+        ],
+        [
+            _index("idx_chunks_azure_ivfflat", "chunks", "azure_embedding_1536", method="ivfflat",
+                   options=["lists=100"]),
+            # 조건 표기는 pg_get_expr 출력 형태
+            _index("idx_chunks_aws_hnsw", "chunks", "aws_embedding_1024",
+                   predicate="((embedding_provider)::text = 'aws'::text)", options=["m=16", "ef_construction=64"]),
+            # WITH 절 없이 만든 인덱스 = pgvector 기본값 (m=16, ef_construction=64)
+            _index("idx_cache_hnsw", "cache", "embedding"),
+        ],
+    )
+
+    actions = [(a.action, a.index_name, a.reason) for a in plan_actions(inventory, specs)]
+
+    assert actions[0][:2] == ("build", "idx_chunks_azure_hnsw") and actions[0][2] == "missing"
+    assert actions[1][:2] == ("drop", "idx_chunks_azure_ivfflat")
+    assert actions[2][:2] == ("build", "idx_chunks_aws_hnsw") and "ef_construction" in actions[2][2]
+    assert len(actions) == 3  # 기본값과 같은 cache 인덱스 / 없는 테이블은 계획 없음
+
+    spec = specs[0]
+    assert spec.create_sql(spec.rebuild_name) == (
+        "CREATE INDEX CONCURRENTLY idx_chunks_azure_hnsw_rebuild ON chunks USING hnsw "
+        "(azure_embedding_1536 vector_cosine_ops) WITH (m = 16, ef_construction = 128) "
+        "WHERE embedding_provider = 'azure'"
+    )
+    assert len(VectorIndexSpec("x" * 80, "t", "c", "id").rebuild_name) == 63
+
+
+@pytest.mark.unit
+def test_recall_at_k_and_spec_selection():
+    from app.services.search.vector_index_manager import VECTOR_INDEX_SPECS, recall_at_k, select_specs
+
+    assert recall_at_k([1, 2, 3, 9], [1, 2, 3, 4], k=4) == 0.75
+    assert recall_at_k([5, 1], [1, 2, 3], k=2) == 0.5
+    assert recall_at_k([], [], k=10) == 1.0
+
+    assert select_specs() == [s for s in VECTOR_INDEX_SPECS if s.quantization is None]
+    assert [s.name for s in select_specs(["idx_vs_chunks_aws_1024_hnsw"])] == ["idx_vs_chunks_aws_1024_hnsw"]
+    with pytest.raises(ValueError):
+        select_specs(["idx_unknown"])
+    # 모든 목표 인덱스 이름은 식별자 길이 제한 안
+    assert all(len(s.rebuild_name) <= 63 for s in VECTOR_INDEX_SPECS)
+
+
+@pytest.mark.unit
+def test_compact_mode_swaps_chunk_indexes_for_quantized_expression_indexes(monkeypatch):
+    from app.core.config import settings
+    from app.services.search import vector_index_manager as vim
+
+    spec = vim.select_specs(["idx_vs_chunks_aws_1024_bq"])[0]
+    assert spec.create_sql(concurrently=False) == (
+        "CREATE INDEX idx_vs_chunks_aws_1024_bq ON vs_doc_contents_chunks USING hnsw "
+        "((binary_quantize(aws_embedding_1024)::bit(1024)) bit_hamming_ops) WITH (m = 16, ef_construction = 128) "
+        "WHERE embedding_provider = 'aws'"
+    )
+    assert spec.candidate_subquery(":q", 200, "tdc", extra_where="del_yn = 'N'") == (
+        "(SELECT * FROM vs_doc_contents_chunks WHERE aws_embedding_1024 IS NOT NULL "
+        "AND embedding_provider = 'aws' AND (del_yn = 'N') "
+        "ORDER BY (binary_quantize(aws_embedding_1024)::bit(1024)) <~> "
+        "binary_quantize(CAST(:q AS vector))::bit(1024) LIMIT 200) tdc"
+    )
+    assert spec.rescore_operator == "<=>"
+
+    monkeypatch.setattr(settings, "vector_compact_mode", "off")
+    assert vim.active_compact_spec("vs_doc_contents_chunks", "azure_embedding_1536") is None
+
+    monkeypatch.setattr(settings, "vector_compact_mode", "halfvec")
+    monkeypatch.setattr(settings, "vector_compact_rescore_factor", 4)
+    monkeypatch.setattr(settings, "vector_compact_min_candidates", 100)
+    halfvec = vim.active_compact_spec("vs_doc_contents_chunks", "azure_embedding_1536")
+    assert halfvec.name == "idx_vs_chunks_azure_1536_halfvec"
+    assert halfvec.order_sql(":q") == (
+        "(azure_embedding_1536::halfvec(1536)) <=> CAST(:q AS halfvec(1536))"
+    )
+    assert vim.rescore_candidate_limit(10) == 100
+    assert vim.rescore_candidate_limit(60) == 240
+    assert vim.rescore_candidate_limit(5000) == vim.MAX_EF_SEARCH
+
+    active = {s.name for s in vim.select_specs()}
+    assert "idx_vs_chunks_azure_1536_halfvec" in active and "idx_vs_chunks_azure_1536_hnsw" not in active
+    assert "idx_vs_chunks_aws_1024_bq" not in active
+
+    # 압축 인덱스를 만들었으면 원본 정밀도 인덱스는 삭제 계획, 식 인덱스는 정의문으로 컬럼 판별
+    inventory = vim.build_inventory(
+        [_column("vs_doc_contents_chunks", "azure_embedding_1536")],
+        [
+            _index("idx_vs_chunks_azure_1536_hnsw", "vs_doc_contents_chunks", "azure_embedding_1536",
+                   predicate="((embedding_provider)::text = 'azure'::text)",
+                   options=["m=16", "ef_construction=128"]),
+            SimpleNamespace(
+                index_name="idx_vs_chunks_azure_1536_halfvec", table_name="vs_doc_contents_chunks",
+                column_name=None, method="hnsw", is_valid=True,
+                predicate="((embedding_provider)::text = 'azure'::text)",
+                options=["m=16", "ef_construction=128"], size_bytes=0,
+                definition="CREATE INDEX idx_vs_chunks_azure_1536_halfvec ON public.vs_doc_contents_chunks "
+                           "USING hnsw (((azure_embedding_1536)::halfvec(1536)) halfvec_cosine_ops)",
+            ),
+        ],
+    )
+    assert len(inventory) == 1 and len(inventory[0].indexes) == 2
+    specs = [s for s in vim.select_specs() if s.table == "vs_doc_contents_chunks" and "azure" in s.name]
+    actions = [(a.action, a.index_name) for a in vim.plan_actions(inventory, specs, vim.retired_specs())]
+    assert actions == [("drop", "idx_vs_chunks_azure_1536_hnsw")]
+
+
+class _FakeRows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+
+class _AnnSession:
+    """HNSW 흉내 - 인덱스 스캔은 거리순 ef_search 개(iterative 면 max_scan_tuples 개)만 본 뒤 컨테이너 필터 적용"""
+
+    def __init__(self, pgvector_version, chunks, scope, limit):
+        self.version = pgvector_version
+        self.chunks = sorted(chunks)
+        self.scope = scope
+        self.limit = limit
+        self.settings = {}
+        self.statements = []
+
+    async def begin_nested(self):
+        session = self
+
+        class _Savepoint:
+            async def rollback(self):
+                session.settings.clear()
+
+        return _Savepoint()
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.statements.append(sql)
+        if sql.startswith("SET LOCAL"):
+            name, value = sql[len("SET LOCAL "):].split(" = ")
+            self.settings[name] = value
+            return _FakeRows([])
+        if "pg_extension" in sql:
+            return _FakeRows([(self.version,)])
+        scanned = self.chunks
+        if self.settings.get("enable_indexscan") != "off":
+            if "hnsw.iterative_scan" in self.settings:
+                scanned = scanned[:int(self.settings["hnsw.max_scan_tuples"])]
+            else:
+                scanned = scanned[:int(self.settings["hnsw.ef_search"])]
+        return _FakeRows([c for c in scanned if c[1] in self.scope][:self.limit])
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version", ["0.7.4", "0.8.0"])
+async def test_ann_query_fills_limit_for_narrowly_scoped_user(monkeypatch, version):
+    from app.core.config import settings
+    from app.services.search import vector_index_manager as vim
+
+    monkeypatch.setattr(vim, "_iterative_scan_supported", None)
+    monkeypatch.setattr(settings, "vector_search_hnsw_ef_search", 100)
+    monkeypatch.setattr(settings, "vector_search_hnsw_iterative_scan", "relaxed_order")
+    monkeypatch.setattr(settings, "vector_search_hnsw_max_scan_tuples", 20000)
+
+    # 전체 300개 청크 중 사용자 컨테이너 청크 5개는 모두 ef_search(100) 바깥 거리에 있다
+    chunks = [(i / 1000, "OTHER") for i in range(295)] + [(0.5 + i / 1000, "MINE") for i in range(5)]
+    session = _AnnSession(version, chunks, scope={"MINE"}, limit=10)
+
+    rows = await vim.run_ann_query(session, "SELECT ... ORDER BY distance LIMIT 10", ann_limit=10, limit=10,
+                                   sort_key=lambda row: row[0])
+
+    assert [row[1] for row in rows] == ["MINE"] * 5
+    assert rows == sorted(rows)
+    if version == "0.8.0":
+        assert "SET LOCAL hnsw.iterative_scan = relaxed_order" in session.statements
+        assert not any("enable_indexscan" in s for s in session.statements)
+    else:
+        assert "SET LOCAL enable_indexscan = off" in session.statements
+    # 설정은 savepoint 롤백으로 되돌려져 세션에 남지 않는다
+    assert session.settings == {}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_compact_candidates_are_filtered_before_the_quantized_limit(monkeypatch):
+    from app.core.config import settings
+    from app.services.search import vector_index_manager as vim
+
+    monkeypatch.setattr(settings, "vector_compact_mode", "halfvec")
+    monkeypatch.setattr(vim, "_iterative_scan_supported", None)
+    monkeypatch.setattr(settings, "vector_search_hnsw_iterative_scan", "strict_order")
+    spec = vim.active_compact_spec("vs_doc_contents_chunks", "azure_embedding_1536")
+    source = spec.candidate_subquery(":q", 200, "c", extra_where=f"container = 'C1' AND {vim.CHUNK_LIVE_FILE_FILTER}")
+    # 범위/삭제 필터는 압축 후보 LIMIT 전에 적용된다
+    assert source.index("lf.del_yn = 'N'") < source.index("ORDER BY") < source.index("LIMIT 200")
+
+    chunks = [(i / 1000, "OTHER") for i in range(400)] + [(0.9, "MINE")]
+    session = _AnnSession("0.8.1", chunks, scope={"MINE"}, limit=20)
+    rows = await vim.run_ann_query(session, source, ann_limit=200, limit=20)
+    assert rows == [(0.9, "MINE")]
+    assert "SET LOCAL hnsw.ef_search = 200" in session.statements
+    assert "SET LOCAL hnsw.iterative_scan = strict_order" in session.statements